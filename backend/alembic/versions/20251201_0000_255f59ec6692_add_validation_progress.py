@@ -0,0 +1,30 @@
+"""add validation progress
+
+Revision ID: 255f59ec6692
+Revises: b1c2d3e4f5a6
+Create Date: 2025-12-01 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '255f59ec6692'
+down_revision: Union[str, None] = 'b1c2d3e4f5a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add progress_percentage to factor_validation_results"""
+    op.add_column(
+        'factor_validation_results',
+        sa.Column('progress_percentage', sa.Float(), server_default='0', nullable=False, comment='Progress percentage (0-100)')
+    )
+
+
+def downgrade() -> None:
+    """Drop progress_percentage from factor_validation_results"""
+    op.drop_column('factor_validation_results', 'progress_percentage')
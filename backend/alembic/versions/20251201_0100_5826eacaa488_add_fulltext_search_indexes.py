@@ -0,0 +1,45 @@
+"""add fulltext search indexes
+
+Revision ID: 5826eacaa488
+Revises: 255f59ec6692
+Create Date: 2025-12-01 01:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '5826eacaa488'
+down_revision: Union[str, None] = '255f59ec6692'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Searchable tables and their text columns (see app.database.search.searchable)
+SEARCH_INDEXES = {
+    'indicator_components': ['code', 'name_zh', 'name_en'],
+    'custom_factors': ['factor_name', 'description'],
+    'strategy_templates': ['name', 'description'],
+    'node_templates': ['name', 'display_name', 'description'],
+}
+
+
+def upgrade() -> None:
+    """Add MySQL FULLTEXT (ngram) indexes used by ranked search"""
+    # Other databases search with the in-process index
+    if op.get_context().dialect.name != 'mysql':
+        return
+    for table, columns in SEARCH_INDEXES.items():
+        op.create_index(
+            f'ft_{table}_search', table, columns, unique=False,
+            mysql_prefix='FULLTEXT', mysql_with_parser='ngram'
+        )
+
+
+def downgrade() -> None:
+    """Drop the FULLTEXT search indexes"""
+    if op.get_context().dialect.name != 'mysql':
+        return
+    for table in SEARCH_INDEXES:
+        op.drop_index(f'ft_{table}_search', table_name=table)
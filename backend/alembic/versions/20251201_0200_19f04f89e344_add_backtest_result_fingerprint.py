@@ -0,0 +1,32 @@
+"""add backtest result fingerprint
+
+Revision ID: 19f04f89e344
+Revises: 5826eacaa488
+Create Date: 2025-12-01 02:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '19f04f89e344'
+down_revision: Union[str, None] = '5826eacaa488'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add the input fingerprint used to reuse completed backtest results"""
+    op.add_column(
+        'backtest_results',
+        sa.Column('fingerprint', sa.String(length=64), nullable=True, comment="SHA-256 of the run's inputs (code, data version, dates, costs, params)")
+    )
+    op.create_index('idx_backtest_result_fingerprint', 'backtest_results', ['fingerprint', 'status'], unique=False)
+
+
+def downgrade() -> None:
+    """Drop the backtest result fingerprint"""
+    op.drop_index('idx_backtest_result_fingerprint', table_name='backtest_results')
+    op.drop_column('backtest_results', 'fingerprint')
@@ -0,0 +1,30 @@
+"""add backtest result artifact path
+
+Revision ID: 560de3d9eb13
+Revises: 19f04f89e344
+Create Date: 2025-12-01 03:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '560de3d9eb13'
+down_revision: Union[str, None] = '19f04f89e344'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add the result store key of a backtest result's time series files"""
+    op.add_column(
+        'backtest_results',
+        sa.Column('artifact_path', sa.String(length=255), nullable=True, comment='Result store key of the equity, positions and trades files (under RESULT_DIR)')
+    )
+
+
+def downgrade() -> None:
+    """Drop the backtest result artifact path"""
+    op.drop_column('backtest_results', 'artifact_path')
@@ -0,0 +1,39 @@
+"""add backtest result relative metrics
+
+Revision ID: 84cbe16cb450
+Revises: 560de3d9eb13
+Create Date: 2025-12-01 04:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '84cbe16cb450'
+down_revision: Union[str, None] = '560de3d9eb13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add benchmark-relative metrics and their ranking indexes to backtest_results"""
+    op.add_column('backtest_results', sa.Column('benchmark', sa.String(length=100), nullable=True, comment='Benchmark of the relative metrics (dataset instrument or equal_weight)'))
+    op.add_column('backtest_results', sa.Column('alpha', sa.Numeric(precision=12, scale=6), nullable=True, comment='Annualized alpha against the benchmark'))
+    op.add_column('backtest_results', sa.Column('beta', sa.Numeric(precision=10, scale=4), nullable=True, comment='Beta to the benchmark'))
+    op.add_column('backtest_results', sa.Column('tracking_error', sa.Numeric(precision=12, scale=6), nullable=True, comment='Annualized tracking error against the benchmark'))
+    op.add_column('backtest_results', sa.Column('information_ratio', sa.Numeric(precision=10, scale=4), nullable=True, comment='Information ratio (annualized active return / tracking error)'))
+    op.create_index('idx_backtest_result_information_ratio', 'backtest_results', ['status', 'information_ratio'], unique=False)
+    op.create_index('idx_backtest_result_benchmark', 'backtest_results', ['benchmark', 'information_ratio'], unique=False)
+
+
+def downgrade() -> None:
+    """Drop the benchmark-relative metrics"""
+    op.drop_index('idx_backtest_result_benchmark', table_name='backtest_results')
+    op.drop_index('idx_backtest_result_information_ratio', table_name='backtest_results')
+    op.drop_column('backtest_results', 'information_ratio')
+    op.drop_column('backtest_results', 'tracking_error')
+    op.drop_column('backtest_results', 'beta')
+    op.drop_column('backtest_results', 'alpha')
+    op.drop_column('backtest_results', 'benchmark')
@@ -52,11 +52,17 @@ celery_app.conf.update(
     task_retry_backoff_max=600,  # Max retry delay: 10 minutes
     task_retry_jitter=True,  # Add random jitter to prevent thundering herd
 
-    # Task routing
+    # Task routing (exact names take precedence over the module patterns).
+    # Optimizations and walk-forward analyses fan out on their own process
+    # pool, which prefork children cannot start: their queue is served by a
+    # solo-pool worker.
     task_routes={
+        "app.modules.backtest.tasks.run_optimization": {"queue": "optimization"},
+        "app.modules.backtest.tasks.run_walk_forward": {"queue": "optimization"},
         "app.modules.data_management.tasks.*": {"queue": "data_import"},
         "app.modules.backtest.tasks.*": {"queue": "backtest"},
         "app.modules.strategy.tasks.*": {"queue": "strategy"},
+        "app.modules.indicator.tasks.*": {"queue": "factor"},
     },
 )
 
@@ -66,6 +72,7 @@ celery_app.autodiscover_tasks(
         "app.modules.data_management.tasks",
         "app.modules.backtest.tasks",
         "app.modules.strategy.tasks",
+        "app.modules.indicator.tasks",
     ],
     force=True,
 )
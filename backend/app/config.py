@@ -78,6 +78,32 @@ class Settings(BaseSettings):
 
     MAX_UPLOAD_SIZE_MB: int = Field(default=100, env="MAX_UPLOAD_SIZE_MB")
 
+    # Indicators
+    # Compute backend for technical indicators: auto, numpy, pandas or talib
+    INDICATOR_BACKEND: str = Field(default="auto", env="INDICATOR_BACKEND")
+    # Memory budget of the in-process indicator result cache
+    INDICATOR_CACHE_MAX_MB: int = Field(default=256, env="INDICATOR_CACHE_MAX_MB")
+
+    # Strategy builder quick tests
+    # Wall-clock budget of a quick test simulation (the run is cut short beyond it)
+    QUICK_TEST_TIME_BUDGET_SECONDS: float = Field(default=2.0, env="QUICK_TEST_TIME_BUDGET_SECONDS")
+    # Memory budget of the in-process cache of pre-sliced quick test panels
+    QUICK_TEST_CACHE_MAX_MB: int = Field(default=256, env="QUICK_TEST_CACHE_MAX_MB")
+    # Age after which a RUNNING quick test is failed by the timeout sweeper
+    QUICK_TEST_TIMEOUT_MINUTES: int = Field(default=10, env="QUICK_TEST_TIMEOUT_MINUTES")
+
+    # Search
+    # Full-text search backend: auto (MySQL FULLTEXT when available) or index (in-process)
+    SEARCH_BACKEND: str = Field(default="auto", env="SEARCH_BACKEND")
+    # Age after which in-process search indexes are rebuilt (picks up other processes' writes)
+    SEARCH_INDEX_REFRESH_SECONDS: int = Field(default=300, env="SEARCH_INDEX_REFRESH_SECONDS")
+
+    # Usage counters
+    # Where clicks are buffered before being written: memory (per process) or redis (shared, crash-safe)
+    USAGE_COUNTER_BACKEND: str = Field(default="memory", env="USAGE_COUNTER_BACKEND")
+    # Seconds between batched usage_count writes
+    USAGE_COUNTER_FLUSH_SECONDS: float = Field(default=10.0, env="USAGE_COUNTER_FLUSH_SECONDS")
+
     # Task Scheduling
     MAX_PARALLEL_TASKS: int = Field(default=2, env="MAX_PARALLEL_TASKS")
     TASK_TIMEOUT_SECONDS: int = Field(default=3600, env="TASK_TIMEOUT_SECONDS")
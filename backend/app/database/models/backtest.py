@@ -118,6 +118,7 @@ class BacktestResult(BaseDBModel):
     Stores:
     - Execution status
     - Performance metrics (returns, sharpe, drawdown, etc.)
+    - Benchmark-relative metrics (alpha, beta, tracking error, information ratio)
     - Trade statistics
     - Detailed metrics in JSON format
 
@@ -193,10 +194,58 @@ class BacktestResult(BaseDBModel):
         comment="Trade statistics (total_trades, winning_trades, avg_win, etc.)"
     )
 
+    # Time Series Files
+    artifact_path: Mapped[Optional[str]] = mapped_column(
+        String(255),
+        nullable=True,
+        comment="Result store key of the equity, positions and trades files (under RESULT_DIR)"
+    )
+
+    # Benchmark-Relative Metrics
+    benchmark: Mapped[Optional[str]] = mapped_column(
+        String(100),
+        nullable=True,
+        comment="Benchmark of the relative metrics (dataset instrument or equal_weight)"
+    )
+
+    alpha: Mapped[Optional[Decimal]] = mapped_column(
+        Numeric(precision=12, scale=6),
+        nullable=True,
+        comment="Annualized alpha against the benchmark"
+    )
+
+    beta: Mapped[Optional[Decimal]] = mapped_column(
+        Numeric(precision=10, scale=4),
+        nullable=True,
+        comment="Beta to the benchmark"
+    )
+
+    tracking_error: Mapped[Optional[Decimal]] = mapped_column(
+        Numeric(precision=12, scale=6),
+        nullable=True,
+        comment="Annualized tracking error against the benchmark"
+    )
+
+    information_ratio: Mapped[Optional[Decimal]] = mapped_column(
+        Numeric(precision=10, scale=4),
+        nullable=True,
+        comment="Information ratio (annualized active return / tracking error)"
+    )
+
+    # Reuse
+    fingerprint: Mapped[Optional[str]] = mapped_column(
+        String(64),
+        nullable=True,
+        comment="SHA-256 of the run's inputs (code, data version, dates, costs, params)"
+    )
+
     # Indexes for query optimization
     __table_args__ = (
         Index('idx_backtest_result_config', 'config_id'),
         Index('idx_backtest_result_status', 'status'),
         Index('idx_backtest_result_performance', 'total_return', 'sharpe_ratio'),
+        Index('idx_backtest_result_fingerprint', 'fingerprint', 'status'),
+        Index('idx_backtest_result_information_ratio', 'status', 'information_ratio'),
+        Index('idx_backtest_result_benchmark', 'benchmark', 'information_ratio'),
         CheckConstraint('win_rate >= 0 AND win_rate <= 1', name='check_win_rate_range'),
     )
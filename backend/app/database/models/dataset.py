@@ -115,5 +115,15 @@ class Dataset(BaseDBModel):
         {"comment": "Dataset storage table", "mysql_engine": "InnoDB", "mysql_charset": "utf8mb4"}
     )
 
+    @property
+    def version(self) -> str:
+        """
+        Content version used to key derived results (indicators, factors).
+
+        Changes whenever the row is updated, e.g. on append or re-import.
+        """
+        updated = self.updated_at.isoformat() if self.updated_at else ""
+        return f"{self.row_count}@{updated}"
+
     def __repr__(self) -> str:
         return f"<Dataset(id={self.id}, name={self.name}, source={self.source})>"
@@ -20,6 +20,7 @@ from sqlalchemy import (
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database.base import BaseDBModel
+from app.database.search import searchable
 
 
 # ===================== Enums =====================
@@ -92,6 +93,7 @@ class LibraryItemStatus(str, PyEnum):
 
 # ===================== Models =====================
 
+@searchable({"code": 2.0, "name_zh": 3.0, "name_en": 3.0})
 class IndicatorComponent(BaseDBModel):
     """
     Technical Indicator Component
@@ -210,6 +212,7 @@ class IndicatorComponent(BaseDBModel):
     )
 
 
+@searchable({"factor_name": 3.0, "description": 1.0})
 class CustomFactor(BaseDBModel):
     """
     Custom Factor Definition
@@ -396,6 +399,13 @@ class FactorValidationResult(BaseDBModel):
         nullable=True,
         comment="Validation completion time"
     )
+    progress_percentage: Mapped[float] = mapped_column(
+        Float,
+        nullable=False,
+        default=0.0,
+        server_default="0",
+        comment="Progress percentage (0-100)"
+    )
 
     # Results
     metrics: Mapped[Optional[dict]] = mapped_column(
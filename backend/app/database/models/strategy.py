@@ -14,6 +14,7 @@ from sqlalchemy import String, Integer, Enum, JSON, Index, CheckConstraint, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database.base import BaseDBModel
+from app.database.search import searchable
 
 
 # Enums for Strategy System
@@ -61,6 +62,7 @@ class StopLossType(str, enum.Enum):
     FIXED_AMOUNT = "FIXED_AMOUNT"
 
 
+@searchable({"name": 3.0, "description": 1.0})
 class StrategyTemplate(BaseDBModel):
     """
     Strategy Template model for managing built-in and custom strategy templates
@@ -17,6 +17,7 @@ from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy import DateTime
 
 from app.database.base import BaseDBModel
+from app.database.search import searchable
 
 if TYPE_CHECKING:
     from app.database.models.strategy import StrategyInstance
@@ -60,6 +61,7 @@ class SessionType(str, enum.Enum):
     COLLABORATIVE = "COLLABORATIVE"
 
 
+@searchable({"name": 3.0, "display_name": 3.0, "description": 1.0})
 class NodeTemplate(BaseDBModel):
     """
     Node Template model for reusable logic flow nodes
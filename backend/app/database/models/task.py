@@ -15,13 +15,17 @@ from app.database.base import BaseDBModel
 
 
 class TaskType(str, enum.Enum):
-    """Task type enumeration"""
+    """Task type enumeration (stored in a plain string column: new types need no migration)"""
     BACKTEST = "BACKTEST"
     OPTIMIZATION = "OPTIMIZATION"
     DATA_IMPORT = "DATA_IMPORT"
     DATA_PREPROCESSING = "DATA_PREPROCESSING"
     FACTOR_BACKTEST = "FACTOR_BACKTEST"
+    FACTOR_BATCH = "FACTOR_BATCH"
+    FACTOR_CORRELATION = "FACTOR_CORRELATION"
     CUSTOM_CODE = "CUSTOM_CODE"
+    REPORT_EXPORT = "REPORT_EXPORT"
+    WALK_FORWARD = "WALK_FORWARD"
 
 
 class TaskStatus(str, enum.Enum):
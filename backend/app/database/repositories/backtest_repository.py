@@ -25,6 +25,12 @@ from app.modules.backtest.exceptions import BacktestError
 
 logger = logging.getLogger(__name__)
 
+# Result columns get_best_performing_results can rank by
+RANKING_COLUMNS = (
+    "total_return", "annual_return", "sharpe_ratio", "win_rate",
+    "alpha", "beta", "tracking_error", "information_ratio",
+)
+
 
 class BacktestRepository:
     """Repository for backtest configuration and result operations"""
@@ -243,6 +249,127 @@ class BacktestRepository:
             logger.error(f"Failed to create result: {str(e)}", exc_info=True)
             raise BacktestError(f"Failed to create backtest result: {str(e)}") from e
 
+    async def create_configs_with_results(
+        self,
+        configs_data: List[Dict[str, Any]],
+        result_data: Dict[str, Any]
+    ) -> List[BacktestResult]:
+        """
+        Create configurations and one result per configuration in one transaction.
+
+        An entry of ``configs_data`` that holds only an ``id`` refers to an
+        existing configuration, which gets a result but is not created again.
+
+        Args:
+            configs_data: Configuration fields (or {"id": existing_id}) per result
+            result_data: Fields shared by all results (config_id is filled in)
+
+        Returns:
+            Created BacktestResult instances, in the order of configs_data
+
+        Raises:
+            BacktestError: If database operation fails
+        """
+        try:
+            configs = [
+                config_data["id"] if set(config_data) == {"id"} else BacktestConfig(**config_data)
+                for config_data in configs_data
+            ]
+            self.session.add_all([config for config in configs if isinstance(config, BacktestConfig)])
+            await self.session.flush()
+
+            results = [
+                BacktestResult(
+                    **result_data,
+                    config_id=config.id if isinstance(config, BacktestConfig) else config
+                )
+                for config in configs
+            ]
+            self.session.add_all(results)
+            await self.session.flush()
+            result_ids = [result.id for result in results]
+            await self.session.commit()
+            # One query reloads every expired result
+            loaded = {result.id: result for result in await self.get_results_by_ids(result_ids)}
+            logger.info(f"Created {len(result_ids)} backtest results in one batch")
+            return [loaded[result_id] for result_id in result_ids]
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            logger.error(f"Failed to create batch results: {str(e)}", exc_info=True)
+            raise BacktestError(f"Failed to create backtest results: {str(e)}") from e
+
+    async def get_results_by_ids(self, result_ids: List[str]) -> List[BacktestResult]:
+        """
+        Retrieve backtest results by ID in one query.
+
+        Args:
+            result_ids: Result IDs
+
+        Returns:
+            Found BacktestResult instances (missing or deleted IDs are skipped)
+        """
+        stmt = select(BacktestResult).where(
+            and_(
+                BacktestResult.id.in_(result_ids),
+                BacktestResult.is_deleted == False
+            )
+        )
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def get_configs_by_ids(self, config_ids: List[str]) -> List[BacktestConfig]:
+        """
+        Retrieve backtest configurations by ID in one query.
+
+        Args:
+            config_ids: Configuration IDs
+
+        Returns:
+            Found BacktestConfig instances (missing or deleted IDs are skipped)
+        """
+        stmt = select(BacktestConfig).where(
+            and_(
+                BacktestConfig.id.in_(config_ids),
+                BacktestConfig.is_deleted == False
+            )
+        )
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def update_results(
+        self,
+        updates: Dict[str, Dict[str, Any]]
+    ) -> List[BacktestResult]:
+        """
+        Update many backtest results in one transaction.
+
+        Args:
+            updates: Result ID -> fields to update
+
+        Returns:
+            Updated BacktestResult instances (IDs not found are skipped)
+
+        Raises:
+            BacktestError: If database operation fails
+        """
+        try:
+            results = await self.get_results_by_ids(list(updates))
+            result_ids = [result.id for result in results]
+            for result in results:
+                for key, value in updates[result.id].items():
+                    if hasattr(result, key):
+                        setattr(result, key, value)
+
+            await self.session.commit()
+            # One query reloads every expired result
+            results = await self.get_results_by_ids(result_ids)
+            logger.info(f"Updated {len(results)} backtest results in one batch")
+            return results
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            logger.error(f"Failed to update batch results: {str(e)}", exc_info=True)
+            raise BacktestError(f"Failed to update backtest results: {str(e)}") from e
+
     async def get_result_by_id(self, result_id: str) -> Optional[BacktestResult]:
         """
         Retrieve a backtest result by ID.
@@ -400,28 +527,92 @@ class BacktestRepository:
 
     async def get_best_performing_results(
         self,
-        limit: int = 10
+        limit: int = 10,
+        order_by: str = "total_return",
+        benchmark: Optional[str] = None
     ) -> List[BacktestResult]:
         """
-        Retrieve best performing backtest results sorted by total return.
+        Retrieve best performing backtest results sorted by a metric column.
+
+        Results without a value of the metric (relative metrics of results
+        without a benchmark) are excluded.
 
         Args:
             limit: Maximum number of results to return
+            order_by: Metric column in RANKING_COLUMNS
+            benchmark: Only results whose relative metrics are against this benchmark
+
+        Returns:
+            List of BacktestResult instances sorted by the metric descending
+            (ascending for tracking_error)
+
+        Raises:
+            ValueError: If order_by is not a ranking column
+        """
+        if order_by not in RANKING_COLUMNS:
+            raise ValueError(f"order_by must be one of {', '.join(RANKING_COLUMNS)}")
+        column = getattr(BacktestResult, order_by)
+        conditions = [
+            BacktestResult.is_deleted == False,
+            BacktestResult.status == BacktestStatus.COMPLETED.value,
+            column.isnot(None)
+        ]
+        if benchmark is not None:
+            conditions.append(BacktestResult.benchmark == benchmark)
+
+        stmt = select(BacktestResult).where(
+            and_(*conditions)
+        ).order_by(
+            column.asc() if order_by == "tracking_error" else column.desc()
+        ).limit(limit)
+
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def find_completed_by_fingerprint(self, fingerprint: str) -> Optional[BacktestResult]:
+        """
+        Find the latest completed result of a run with the given inputs.
+
+        Args:
+            fingerprint: Run fingerprint (see BacktestExecutionService.backtest_fingerprint)
 
         Returns:
-            List of BacktestResult instances sorted by total_return descending
+            BacktestResult instance or None if no completed run matches
         """
         stmt = select(BacktestResult).where(
             and_(
-                BacktestResult.is_deleted == False,
-                BacktestResult.status == BacktestStatus.COMPLETED.value
+                BacktestResult.fingerprint == fingerprint,
+                BacktestResult.status == BacktestStatus.COMPLETED.value,
+                BacktestResult.is_deleted == False
             )
         ).order_by(
-            BacktestResult.total_return.desc()
-        ).limit(limit)
+            BacktestResult.created_at.desc()
+        ).limit(1)
 
         result = await self.session.execute(stmt)
-        return list(result.scalars().all())
+        return result.scalar_one_or_none()
+
+    async def is_artifact_referenced(self, artifact_path: str) -> bool:
+        """
+        Check whether a non-deleted result reads the given stored artifacts.
+
+        Results reused from a completed run share its artifact_path.
+
+        Args:
+            artifact_path: Result store key
+
+        Returns:
+            True if any non-deleted result has this artifact_path
+        """
+        stmt = select(BacktestResult.id).where(
+            and_(
+                BacktestResult.artifact_path == artifact_path,
+                BacktestResult.is_deleted == False
+            )
+        ).limit(1)
+
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none() is not None
 
     async def count_results_by_status(self, status: str) -> int:
         """
@@ -6,11 +6,12 @@ Provides specialized queries for user-defined factors using the actual CustomFac
 
 from typing import List, Optional
 from datetime import datetime, timezone
-from sqlalchemy import select, func, and_, or_
+from sqlalchemy import select, func, and_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.repositories.base import BaseRepository
 from app.database.models.indicator import CustomFactor, FactorStatus
+from app.database.search import count_matches, ranked_search
 
 
 class CustomFactorRepository(BaseRepository[CustomFactor]):
@@ -187,8 +188,14 @@ class CustomFactorRepository(BaseRepository[CustomFactor]):
         if not factor:
             return False
 
-        factor.usage_count += 1
+        stmt = (
+            update(self.model)
+            .where(self.model.id == factor_id)
+            .values(usage_count=self.model.usage_count + 1)
+        )
+        await self.session.execute(stmt)
         await self.session.commit()
+        await self.session.refresh(factor)
         return True
 
     async def search_by_name(
@@ -199,7 +206,7 @@ class CustomFactorRepository(BaseRepository[CustomFactor]):
         limit: int = 20
     ) -> List[CustomFactor]:
         """
-        按名称或描述搜索因子
+        按名称或描述全文搜索因子（按相关度排序，相同时按使用次数）
 
         Args:
             keyword: 搜索关键词
@@ -210,23 +217,21 @@ class CustomFactorRepository(BaseRepository[CustomFactor]):
         Returns:
             匹配的因子列表
         """
-        conditions = [
-            or_(
-                self.model.factor_name.like(f"%{keyword}%"),
-                self.model.description.like(f"%{keyword}%")
-            ),
-            self.model.is_deleted == False
-        ]
+        return await ranked_search(
+            self.session,
+            self.model,
+            keyword,
+            conditions=self._search_conditions(user_id),
+            order_by=[self.model.usage_count],
+            skip=skip,
+            limit=limit
+        )
 
+    def _search_conditions(self, user_id: Optional[str]) -> list:
+        conditions = [self.model.is_deleted == False]
         if user_id:
             conditions.append(self.model.user_id == user_id)
-
-        stmt = select(self.model).where(and_(*conditions)).order_by(
-            self.model.usage_count.desc()
-        ).offset(skip).limit(limit)
-
-        result = await self.session.execute(stmt)
-        return list(result.scalars().all())
+        return conditions
 
     async def get_popular_factors(
         self,
@@ -327,21 +332,9 @@ class CustomFactorRepository(BaseRepository[CustomFactor]):
         Returns:
             Number of matching factors
         """
-        conditions = [
-            or_(
-                self.model.factor_name.like(f"%{keyword}%"),
-                self.model.description.like(f"%{keyword}%")
-            ),
-            self.model.is_deleted == False
-        ]
-
-        if user_id:
-            conditions.append(self.model.user_id == user_id)
-
-        stmt = select(func.count()).select_from(self.model).where(and_(*conditions))
-
-        result = await self.session.execute(stmt)
-        return result.scalar_one()
+        return await count_matches(
+            self.session, self.model, keyword, self._search_conditions(user_id)
+        )
 
     async def count_public_factors(self) -> int:
         """
@@ -5,6 +5,7 @@ Manages factor validation results including IC analysis, backtesting metrics,
 and performance evaluations.
 """
 
+from datetime import datetime, timezone
 from typing import List, Optional
 from sqlalchemy import select, and_, desc
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -117,14 +118,25 @@ class FactorValidationResultRepository(BaseRepository[FactorValidationResult]):
     async def update_status(
         self,
         validation_id: str,
-        status: str
+        status: str,
+        progress: Optional[float] = None,
+        metrics: Optional[dict] = None,
+        details: Optional[dict] = None,
+        error_message: Optional[str] = None
     ) -> Optional[FactorValidationResult]:
         """
-        Update validation status
+        Update validation status and progress
+
+        Sets started_at when the validation starts running and completed_at
+        when it completes or fails.
 
         Args:
             validation_id: Validation result ID
             status: New status
+            progress: Progress percentage (0-100)
+            metrics: Validation metrics to store
+            details: Detailed results to store
+            error_message: Error message (for failed validations)
 
         Returns:
             Updated validation result or None
@@ -133,7 +145,21 @@ class FactorValidationResultRepository(BaseRepository[FactorValidationResult]):
         if not validation:
             return None
 
+        now = datetime.now(timezone.utc)
         validation.status = status
+        if status == ValidationStatus.RUNNING.value and validation.started_at is None:
+            validation.started_at = now
+        if status in (ValidationStatus.COMPLETED.value, ValidationStatus.FAILED.value):
+            validation.completed_at = now
+        if progress is not None:
+            validation.progress_percentage = progress
+        if metrics is not None:
+            validation.metrics = metrics
+        if details is not None:
+            validation.details = details
+        if error_message is not None:
+            validation.error_message = error_message
+
         await self.session.commit()
         await self.session.refresh(validation)
         return validation
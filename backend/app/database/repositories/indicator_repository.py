@@ -8,11 +8,12 @@ query methods for category filtering, search, and usage tracking.
 from typing import List, Optional
 
 from loguru import logger
-from sqlalchemy import select, or_, func, update
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.models.indicator import IndicatorComponent, IndicatorCategory, IndicatorSource
 from app.database.repositories.base import BaseRepository
+from app.database.search import count_matches, ranked_search
 
 
 class IndicatorRepository(BaseRepository[IndicatorComponent]):
@@ -76,6 +77,8 @@ class IndicatorRepository(BaseRepository[IndicatorComponent]):
         """
         Search indicators by name (Chinese, English) or code.
 
+        Results are ranked by relevance, then by usage count.
+
         Args:
             keyword: Search keyword
             skip: Number of records to skip
@@ -84,24 +87,16 @@ class IndicatorRepository(BaseRepository[IndicatorComponent]):
         Returns:
             List of matching indicators
         """
-        # Use LIKE for fuzzy search (works in SQLite and MySQL)
-        search_pattern = f"%{keyword}%"
-
-        stmt = select(IndicatorComponent).where(
-            IndicatorComponent.is_deleted == False,
-            or_(
-                IndicatorComponent.name_zh.like(search_pattern),
-                IndicatorComponent.name_en.like(search_pattern),
-                IndicatorComponent.code.like(search_pattern)
-            )
+        indicators = await ranked_search(
+            self.session,
+            IndicatorComponent,
+            keyword,
+            conditions=[IndicatorComponent.is_deleted == False],
+            order_by=[IndicatorComponent.usage_count],
+            skip=skip,
+            limit=limit
         )
 
-        stmt = stmt.order_by(IndicatorComponent.usage_count.desc())
-        stmt = stmt.offset(skip).limit(limit)
-
-        result = await self.session.execute(stmt)
-        indicators = list(result.scalars().all())
-
         logger.debug(f"Search '{keyword}' found {len(indicators)} indicators")
         return indicators
 
@@ -115,20 +110,13 @@ class IndicatorRepository(BaseRepository[IndicatorComponent]):
         Returns:
             Number of matching indicators
         """
-        search_pattern = f"%{keyword}%"
-
-        stmt = select(func.count()).select_from(IndicatorComponent).where(
-            IndicatorComponent.is_deleted == False,
-            or_(
-                IndicatorComponent.name_zh.like(search_pattern),
-                IndicatorComponent.name_en.like(search_pattern),
-                IndicatorComponent.code.like(search_pattern)
-            )
+        count = await count_matches(
+            self.session,
+            IndicatorComponent,
+            keyword,
+            [IndicatorComponent.is_deleted == False]
         )
 
-        result = await self.session.execute(stmt)
-        count = result.scalar_one()
-
         logger.debug(f"Search '{keyword}' has {count} total results")
         return count
 
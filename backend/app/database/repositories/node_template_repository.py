@@ -8,11 +8,12 @@ query methods for builder functionality.
 from typing import List, Optional
 
 from loguru import logger
-from sqlalchemy import select, or_, update
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.models.strategy_builder import NodeTemplate, NodeTypeCategory
 from app.database.repositories.base import BaseRepository
+from app.database.search import ranked_search
 
 
 class NodeTemplateRepository(BaseRepository[NodeTemplate]):
@@ -115,7 +116,8 @@ class NodeTemplateRepository(BaseRepository[NodeTemplate]):
         Search node templates with multiple filters.
 
         Args:
-            keyword: Search keyword (matches name or display_name)
+            keyword: Full-text search keyword (name, display_name or
+                description); results are ranked by relevance first
             node_type: Filter by node type
             category: Filter by category
             is_system_template: Filter system vs custom templates
@@ -126,46 +128,34 @@ class NodeTemplateRepository(BaseRepository[NodeTemplate]):
         Returns:
             List of matching templates
         """
-        stmt = select(NodeTemplate).where(
-            NodeTemplate.is_deleted == False
-        )
-
-        # Apply keyword search
-        if keyword:
-            search_pattern = f"%{keyword}%"
-            stmt = stmt.where(
-                or_(
-                    NodeTemplate.name.like(search_pattern),
-                    NodeTemplate.display_name.like(search_pattern),
-                    NodeTemplate.description.like(search_pattern)
-                )
-            )
+        conditions = [NodeTemplate.is_deleted == False]
 
         # Apply type filter
         if node_type:
-            stmt = stmt.where(NodeTemplate.node_type == node_type.value)
+            conditions.append(NodeTemplate.node_type == node_type.value)
 
         # Apply category filter
         if category:
-            stmt = stmt.where(NodeTemplate.category == category)
+            conditions.append(NodeTemplate.category == category)
 
         # Apply system/custom filter
         if is_system_template is not None:
-            stmt = stmt.where(NodeTemplate.is_system_template == is_system_template)
+            conditions.append(NodeTemplate.is_system_template == is_system_template)
 
         # Apply user filter
         if user_id:
-            stmt = stmt.where(NodeTemplate.user_id == user_id)
-
-        # Order by usage count, then by creation date
-        stmt = stmt.order_by(
-            NodeTemplate.usage_count.desc(),
-            NodeTemplate.created_at.desc()
+            conditions.append(NodeTemplate.user_id == user_id)
+
+        # Relevance first, then usage count and creation date
+        templates = await ranked_search(
+            self.session,
+            NodeTemplate,
+            keyword,
+            conditions=conditions,
+            order_by=[NodeTemplate.usage_count, NodeTemplate.created_at],
+            skip=skip,
+            limit=limit
         )
-        stmt = stmt.offset(skip).limit(limit)
-
-        result = await self.session.execute(stmt)
-        templates = list(result.scalars().all())
 
         logger.debug(f"Search returned {len(templates)} templates")
         return templates
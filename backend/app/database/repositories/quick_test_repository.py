@@ -5,7 +5,7 @@ Repository for managing quick test operations with specialized
 query methods for test execution and result tracking.
 """
 
-from typing import List, Optional
+from typing import List, Optional, Sequence
 from datetime import datetime, timedelta
 
 from loguru import logger
@@ -147,15 +147,17 @@ class QuickTestRepository(BaseRepository[QuickTest]):
         self,
         timeout_minutes: int = 10,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        statuses: Sequence[str] = ("RUNNING",)
     ) -> List[QuickTest]:
         """
-        Find timeout tests (status=RUNNING, created >timeout_minutes ago).
+        Find timeout tests (status in statuses, created >timeout_minutes ago).
 
         Args:
             timeout_minutes: Timeout threshold in minutes
             skip: Number of records to skip
             limit: Maximum number of records to return
+            statuses: Statuses considered unfinished
 
         Returns:
             List of timeout tests
@@ -163,7 +165,7 @@ class QuickTestRepository(BaseRepository[QuickTest]):
         timeout_threshold = datetime.utcnow() - timedelta(minutes=timeout_minutes)
 
         stmt = select(QuickTest).where(
-            QuickTest.status == "RUNNING",
+            QuickTest.status.in_(statuses),
             QuickTest.created_at < timeout_threshold,
             QuickTest.is_deleted == False
         )
@@ -11,11 +11,12 @@ Repository pattern for StrategyTemplate model with specialized methods for:
 from typing import List, Optional
 
 from loguru import logger
-from sqlalchemy import select, or_, func
+from sqlalchemy import select, func, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.models.strategy import StrategyTemplate
 from app.database.repositories.base import BaseRepository
+from app.database.search import ranked_search
 
 
 class StrategyTemplateRepository(BaseRepository[StrategyTemplate]):
@@ -74,7 +75,7 @@ class StrategyTemplateRepository(BaseRepository[StrategyTemplate]):
 
     async def increment_usage_count(self, id: str) -> Optional[StrategyTemplate]:
         """
-        Increment the usage count for a template.
+        Atomically increment the usage count for a template.
 
         Args:
             id: Template ID
@@ -90,7 +91,12 @@ class StrategyTemplateRepository(BaseRepository[StrategyTemplate]):
             logger.warning(f"StrategyTemplate not found: id={id}")
             return None
 
-        template.usage_count += 1
+        stmt = (
+            update(self.model)
+            .where(self.model.id == id)
+            .values(usage_count=self.model.usage_count + 1)
+        )
+        await self.session.execute(stmt)
         await self.session.flush()
         await self.session.refresh(template)
 
@@ -143,7 +149,9 @@ class StrategyTemplateRepository(BaseRepository[StrategyTemplate]):
         include_deleted: bool = False
     ) -> List[StrategyTemplate]:
         """
-        Search templates by name (case-insensitive).
+        Full-text search templates by name and description.
+
+        Results are ranked by relevance, then by creation date (newest first).
 
         Args:
             query: Search query string
@@ -162,34 +170,25 @@ class StrategyTemplateRepository(BaseRepository[StrategyTemplate]):
                 limit=10
             )
         """
-        stmt = select(self.model)
+        conditions = []
 
         # Apply soft delete filter
         if not include_deleted:
-            stmt = stmt.where(self.model.is_deleted == False)
-
-        # Apply search query (case-insensitive)
-        if query:
-            search_pattern = f"%{query}%"
-            stmt = stmt.where(
-                or_(
-                    self.model.name.ilike(search_pattern),
-                    self.model.description.ilike(search_pattern)
-                )
-            )
+            conditions.append(self.model.is_deleted == False)
 
         # Apply category filter
         if category:
-            stmt = stmt.where(self.model.category == category)
-
-        # Order by relevance (name matches first) and created_at
-        stmt = stmt.order_by(self.model.created_at.desc())
-
-        # Apply pagination
-        stmt = stmt.offset(skip).limit(limit)
-
-        result = await self.session.execute(stmt)
-        return list(result.scalars().all())
+            conditions.append(self.model.category == category)
+
+        return await ranked_search(
+            self.session,
+            self.model,
+            query,
+            conditions=conditions,
+            order_by=[self.model.created_at],
+            skip=skip,
+            limit=limit
+        )
 
     async def list_all(
         self,
@@ -123,14 +123,22 @@ class UserFactorLibraryRepository(BaseRepository[UserFactorLibrary]):
         self,
         library_item_id: str
     ) -> bool:
-        """Increment usage count"""
+        """Atomically increment usage count"""
         item = await self.get(library_item_id)
         if not item:
             return False
 
-        item.usage_count += 1
-        item.last_used_at = datetime.now(timezone.utc)
+        stmt = (
+            update(self.model)
+            .where(self.model.id == library_item_id)
+            .values(
+                usage_count=self.model.usage_count + 1,
+                last_used_at=datetime.now(timezone.utc)
+            )
+        )
+        await self.session.execute(stmt)
         await self.session.commit()
+        await self.session.refresh(item)
         return True
 
     async def find_library_item(
@@ -0,0 +1,495 @@
+"""
+Full-Text Search
+
+Ranked keyword search over the name and description columns of searchable
+models (factors, indicators, strategy and node templates).
+
+Models opt in with the ``searchable`` decorator, which records the text
+columns and their weights and declares a MySQL FULLTEXT index (ngram parser,
+so Chinese text is searchable) over them. Two backends answer queries:
+
+- MySQL: ``MATCH ... AGAINST`` in boolean mode on the FULLTEXT index, every
+  query word required.
+- Everything else (and MySQL queries with words shorter than the ngram size):
+  an in-process inverted index per database engine and model, ranked with
+  BM25 over weighted fields. English and numbers are indexed as words (and
+  camelCase parts) and match any word containing them, like the former
+  ``LIKE '%keyword%'`` filters (exact and prefix matches rank higher);
+  Chinese is indexed as single characters and bigrams. The index is built lazily on first search, kept
+  current from committed session changes, and rebuilt every
+  SEARCH_INDEX_REFRESH_SECONDS to pick up writes made by other processes.
+
+Index hits are always re-checked against the database with the caller's
+filters, so stale entries can only make a result miss, never leak deleted
+or filtered-out rows.
+"""
+
+import math
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from weakref import WeakKeyDictionary
+
+from loguru import logger
+from sqlalchemy import Index, event, func, inspect, select
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+
+# MySQL ngram_token_size default; shorter query words use the in-process index
+MYSQL_NGRAM_SIZE = 2
+# Score multipliers for prefix and other substring (rather than exact) word matches
+PREFIX_MATCH_WEIGHT = 0.8
+SUBSTRING_MATCH_WEIGHT = 0.6
+# Maximum ids per IN (...) clause when re-checking index hits
+ID_CHUNK_SIZE = 500
+
+_WORD_RE = re.compile(r"[^\W_]+")
+_CJK_RE = re.compile("([\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+)")
+_CAMEL_RE = re.compile(r"[A-Z]?[a-z]+|[A-Z]+(?![a-z])|\d+")
+
+
+def searchable(fields: Dict[str, float]):
+    """
+    Class decorator registering a model for full-text search.
+
+    Args:
+        fields: Text column names and their ranking weights
+
+    Returns:
+        Decorator that records the fields and adds a MySQL FULLTEXT index
+    """
+    def decorate(model):
+        model.__search_fields__ = dict(fields)
+        table = model.__table__
+        Index(
+            f"ft_{table.name}_search",
+            *(table.c[name] for name in fields),
+            mysql_prefix="FULLTEXT",
+            mysql_with_parser="ngram",
+        ).ddl_if(dialect="mysql")
+        return model
+    return decorate
+
+
+def _split_words(text: str) -> Iterable[Tuple[str, bool]]:
+    """Yield (segment, is_cjk) runs of word characters."""
+    text = unicodedata.normalize("NFKC", text)
+    for word in _WORD_RE.findall(text):
+        for segment in _CJK_RE.split(word):
+            if segment:
+                yield segment, bool(_CJK_RE.fullmatch(segment))
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """
+    Index terms of a text.
+
+    Words are lowercased; camelCase and letter/digit runs also yield their
+    parts. Chinese runs yield every character and every bigram.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        Terms, with repeats
+    """
+    terms: List[str] = []
+    for segment, is_cjk in _split_words(text or ""):
+        if is_cjk:
+            terms.extend(segment)
+            terms.extend(segment[i:i + 2] for i in range(len(segment) - 1))
+            continue
+        terms.append(segment.lower())
+        parts = _CAMEL_RE.findall(segment)
+        if len(parts) > 1:
+            terms.extend(part.lower() for part in parts)
+    return terms
+
+
+def query_terms(query: Optional[str]) -> List[Tuple[str, bool]]:
+    """
+    Terms a query requires, each as (term, match_substring).
+
+    Words match any indexed word containing them; Chinese runs require each
+    of their bigrams (a single character requires itself).
+
+    Args:
+        query: Search query
+
+    Returns:
+        Distinct terms in query order
+    """
+    terms: Dict[str, bool] = {}
+    for segment, is_cjk in _split_words(query or ""):
+        if not is_cjk:
+            terms.setdefault(segment.lower(), True)
+        elif len(segment) == 1:
+            terms.setdefault(segment, False)
+        else:
+            for i in range(len(segment) - 1):
+                terms.setdefault(segment[i:i + 2], False)
+    return list(terms.items())
+
+
+class InvertedIndex:
+    """
+    In-memory inverted index with weighted-field BM25 ranking.
+
+    Not thread-safe on its own; SearchIndexRegistry serializes access.
+    """
+
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self, fields: Dict[str, float]):
+        """
+        Initialize an empty index.
+
+        Args:
+            fields: Field names and their weights
+        """
+        self.fields = dict(fields)
+        self.built_at = time.monotonic()
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._doc_terms: Dict[str, Set[str]] = {}
+        self._doc_length: Dict[str, float] = {}
+        self._total_length = 0.0
+
+    def __len__(self) -> int:
+        return len(self._doc_length)
+
+    def add(self, doc_id: str, values: Dict[str, Optional[str]]) -> None:
+        """Index a document, replacing any previous version of it."""
+        self.remove(doc_id)
+        weights: Counter = Counter()
+        for field, weight in self.fields.items():
+            for term in tokenize(values.get(field)):
+                weights[term] += weight
+        if not weights:
+            return
+
+        for term, weight in weights.items():
+            self._postings.setdefault(term, {})[doc_id] = weight
+        self._doc_terms[doc_id] = set(weights)
+        self._doc_length[doc_id] = sum(weights.values())
+        self._total_length += self._doc_length[doc_id]
+
+    def remove(self, doc_id: str) -> None:
+        """Drop a document if indexed."""
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+        self._total_length -= self._doc_length.pop(doc_id)
+
+    def search(self, query: str) -> Dict[str, float]:
+        """
+        Documents matching every query term, with their relevance scores.
+
+        Args:
+            query: Search query
+
+        Returns:
+            Dict of document id to score (empty if nothing matches)
+        """
+        terms = query_terms(query)
+        if not terms or not self._doc_length:
+            return {}
+
+        n_docs = len(self._doc_length)
+        average_length = self._total_length / n_docs
+        scores: Optional[Dict[str, float]] = None
+        for term, substring in terms:
+            term_scores: Dict[str, float] = {}
+            for candidate in self._expand(term, substring):
+                postings = self._postings[candidate]
+                idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                if candidate == term:
+                    boost = 1.0
+                elif candidate.startswith(term):
+                    boost = PREFIX_MATCH_WEIGHT
+                else:
+                    boost = SUBSTRING_MATCH_WEIGHT
+                for doc_id, weight in postings.items():
+                    if scores is not None and doc_id not in scores:
+                        continue
+                    norm = self.K1 * (1 - self.B + self.B * self._doc_length[doc_id] / average_length)
+                    score = boost * idf * weight * (self.K1 + 1) / (weight + norm)
+                    if score > term_scores.get(doc_id, 0.0):
+                        term_scores[doc_id] = score
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {doc_id: scores[doc_id] + s for doc_id, s in term_scores.items()}
+            if not scores:
+                break
+        return scores or {}
+
+    def _expand(self, term: str, substring: bool) -> List[str]:
+        """Indexed terms a query term matches."""
+        if not substring:
+            return [term] if term in self._postings else []
+        return [candidate for candidate in self._postings if term in candidate]
+
+
+class SearchIndexRegistry:
+    """
+    Process-wide in-process indexes, one per (engine, table).
+
+    Committed changes to searchable rows are applied to built indexes and to
+    indexes being built, so a build racing with writes converges.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._indexes: "WeakKeyDictionary[Engine, Dict[str, InvertedIndex]]" = WeakKeyDictionary()
+        self._building: "WeakKeyDictionary[Engine, Dict[str, List[list]]]" = WeakKeyDictionary()
+
+    def get(self, engine: Engine, table: str, max_age: float) -> Optional[InvertedIndex]:
+        """Built index for a table, or None if missing or older than max_age seconds."""
+        with self._lock:
+            index = self._indexes.get(engine, {}).get(table)
+        if index is not None and time.monotonic() - index.built_at <= max_age:
+            return index
+        return None
+
+    def begin_build(self, engine: Engine, table: str) -> list:
+        """Start recording changes for a build; returns the change queue."""
+        queue: list = []
+        with self._lock:
+            self._building.setdefault(engine, {}).setdefault(table, []).append(queue)
+        return queue
+
+    def finish_build(self, engine: Engine, table: str, index: InvertedIndex, queue: list) -> None:
+        """Apply changes recorded during the build and install the index."""
+        with self._lock:
+            self._building[engine][table].remove(queue)
+            for doc_id, values in queue:
+                _apply(index, doc_id, values)
+            self._indexes.setdefault(engine, {})[table] = index
+
+    def apply(self, engine: Engine, changes: Sequence[Tuple[str, str, Optional[dict]]]) -> None:
+        """Apply committed (table, id, values or None for removal) changes."""
+        with self._lock:
+            indexes = self._indexes.get(engine, {})
+            building = self._building.get(engine, {})
+            for table, doc_id, values in changes:
+                if table in indexes:
+                    _apply(indexes[table], doc_id, values)
+                for queue in building.get(table, ()):
+                    queue.append((doc_id, values))
+
+    def search(self, index: InvertedIndex, query: str) -> Dict[str, float]:
+        """Search an index under the registry lock."""
+        with self._lock:
+            return index.search(query)
+
+
+def _apply(index: InvertedIndex, doc_id: str, values: Optional[dict]) -> None:
+    if values is None:
+        index.remove(doc_id)
+    else:
+        index.add(doc_id, values)
+
+
+registry = SearchIndexRegistry()
+
+
+def _engine_of(session: Session) -> Optional[Engine]:
+    bind = session.bind
+    if isinstance(bind, Connection):
+        bind = bind.engine
+    return bind
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session: Session, flush_context) -> None:
+    """Record flushed changes to searchable rows until the commit."""
+    changes = []
+    for obj in list(session.new) + list(session.dirty):
+        fields = getattr(type(obj), "__search_fields__", None)
+        if not fields:
+            continue
+        state = inspect(obj)
+        if obj not in session.new and not any(
+            state.attrs[name].history.has_changes() for name in (*fields, "is_deleted")
+        ):
+            continue
+        values = None if obj.is_deleted else {name: getattr(obj, name) for name in fields}
+        changes.append((type(obj).__tablename__, obj.id, values))
+    for obj in session.deleted:
+        if getattr(type(obj), "__search_fields__", None):
+            changes.append((type(obj).__tablename__, obj.id, None))
+    if changes:
+        session.info.setdefault("search_changes", []).extend(changes)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_changes(session: Session) -> None:
+    """Apply committed changes to the in-process indexes."""
+    changes = session.info.pop("search_changes", None)
+    engine = _engine_of(session)
+    if changes and engine is not None:
+        registry.apply(engine, changes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session: Session) -> None:
+    session.info.pop("search_changes", None)
+
+
+def _use_fulltext(session: AsyncSession, query: str) -> bool:
+    """Whether the MySQL FULLTEXT index can answer a query."""
+    from app.config import settings
+    if settings.SEARCH_BACKEND != "auto" or session.bind.dialect.name != "mysql":
+        return False
+    words = [segment for segment, _ in _split_words(query)]
+    return bool(words) and all(len(word) >= MYSQL_NGRAM_SIZE for word in words)
+
+
+def _fulltext_score(model, query: str):
+    """Relevance expression of a boolean-mode MATCH requiring every word."""
+    against = " ".join(f'+"{segment}"' for segment, _ in _split_words(query))
+    columns = [getattr(model, name) for name in model.__search_fields__]
+    return match(*columns, against=against).in_boolean_mode()
+
+
+async def _get_index(session: AsyncSession, model) -> InvertedIndex:
+    """Built in-process index for a model, building it if needed."""
+    from app.config import settings
+    engine = session.bind.sync_engine
+    table = model.__tablename__
+    index = registry.get(engine, table, settings.SEARCH_INDEX_REFRESH_SECONDS)
+    if index is not None:
+        return index
+
+    queue = registry.begin_build(engine, table)
+    index = InvertedIndex(model.__search_fields__)
+    try:
+        fields = list(model.__search_fields__)
+        stmt = select(model.id, *(getattr(model, name) for name in fields)).where(
+            model.is_deleted == False
+        )
+        result = await session.execute(stmt)
+        for row in result:
+            index.add(row[0], dict(zip(fields, row[1:])))
+    finally:
+        registry.finish_build(engine, table, index, queue)
+    logger.debug(f"Built search index for {table} with {len(index)} documents")
+    return index
+
+
+async def _ranked_ids(
+    session: AsyncSession,
+    model,
+    query: str,
+    conditions: Sequence[Any],
+    order_by: Sequence[Any]
+) -> List[str]:
+    """Ids of rows matching the query and conditions, best first."""
+    index = await _get_index(session, model)
+    scores = registry.search(index, query)
+    if not scores:
+        return []
+
+    rows = []
+    ids = list(scores)
+    for start in range(0, len(ids), ID_CHUNK_SIZE):
+        stmt = select(model.id, *order_by).where(
+            model.id.in_(ids[start:start + ID_CHUNK_SIZE]), *conditions
+        )
+        rows.extend((await session.execute(stmt)).all())
+
+    # Relevance first, then the tie-breaker columns (descending), then id
+    rows.sort(key=lambda row: row[0])
+    for position in reversed(range(1, len(order_by) + 1)):
+        rows.sort(key=lambda row: (row[position] is not None, row[position] or 0), reverse=True)
+    rows.sort(key=lambda row: scores[row[0]], reverse=True)
+    return [row[0] for row in rows]
+
+
+async def ranked_search(
+    session: AsyncSession,
+    model,
+    query: Optional[str],
+    conditions: Sequence[Any] = (),
+    order_by: Sequence[Any] = (),
+    skip: int = 0,
+    limit: int = 100
+) -> list:
+    """
+    Rows of a searchable model matching a query, most relevant first.
+
+    A query without searchable words applies only the conditions and the
+    tie-breaker ordering.
+
+    Args:
+        session: Database session
+        model: Model registered with ``searchable``
+        query: Search query
+        conditions: Extra filters (soft-delete, ownership, category, ...)
+        order_by: Tie-breaker columns, compared descending
+        skip: Number of records to skip
+        limit: Maximum number of records to return
+
+    Returns:
+        List of model instances
+    """
+    if not query_terms(query):
+        stmt = select(model).where(*conditions).order_by(
+            *(column.desc() for column in order_by), model.id
+        ).offset(skip).limit(limit)
+        return list((await session.execute(stmt)).scalars().all())
+
+    if _use_fulltext(session, query):
+        score = _fulltext_score(model, query)
+        stmt = select(model).where(score > 0, *conditions).order_by(
+            score.desc(), *(column.desc() for column in order_by), model.id
+        ).offset(skip).limit(limit)
+        return list((await session.execute(stmt)).scalars().all())
+
+    page = (await _ranked_ids(session, model, query, conditions, order_by))[skip:skip + limit]
+    if not page:
+        return []
+    result = await session.execute(select(model).where(model.id.in_(page)))
+    by_id = {obj.id: obj for obj in result.scalars().all()}
+    return [by_id[doc_id] for doc_id in page if doc_id in by_id]
+
+
+async def count_matches(
+    session: AsyncSession,
+    model,
+    query: Optional[str],
+    conditions: Sequence[Any] = ()
+) -> int:
+    """
+    Number of rows ``ranked_search`` can return for a query.
+
+    Args:
+        session: Database session
+        model: Model registered with ``searchable``
+        query: Search query
+        conditions: Extra filters
+
+    Returns:
+        Number of matching rows
+    """
+    if not query_terms(query):
+        stmt = select(func.count()).select_from(model).where(*conditions)
+        return (await session.execute(stmt)).scalar_one()
+    if _use_fulltext(session, query):
+        stmt = select(func.count()).select_from(model).where(
+            _fulltext_score(model, query) > 0, *conditions
+        )
+        return (await session.execute(stmt)).scalar_one()
+    return len(await _ranked_ids(session, model, query, conditions, ()))
@@ -0,0 +1,260 @@
+"""
+Write-Behind Usage Counters
+
+Buffers usage_count increments of indicators, factors, library items and
+templates and writes them in periodic batches, one
+``UPDATE ... SET usage_count = usage_count + n`` per row, instead of a
+read-modify-write and a commit per click.
+
+Increments are kept either in process memory or in Redis (shared by all
+workers). Popular/most-used queries read the database and may lag by up to
+one flush interval.
+
+Crash behaviour:
+
+- memory: increments not yet flushed are lost if the process dies without
+  running the shutdown flush (at most one interval of clicks).
+- redis: increments survive process crashes. A flush first moves the pending
+  hash to a per-flush key and deletes it only after the database commit;
+  keys left behind by a crashed flush are applied by the next flush, so a
+  batch may be counted twice but is never lost.
+"""
+
+import asyncio
+import time
+import uuid
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, AsyncContextManager, Callable, Dict, List, Optional, Tuple, Type
+
+from loguru import logger
+from sqlalchemy import bindparam, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.base import Base, BaseDBModel
+
+
+# (table name, record id) -> (increment, last used timestamp)
+Pending = Dict[Tuple[str, str], Tuple[int, float]]
+
+
+class MemoryCounterStore:
+    """Pending increments in process memory."""
+
+    def __init__(self):
+        self._pending: Pending = {}
+
+    async def add(self, table: str, record_id: str, amount: int, used_at: float) -> None:
+        """Buffer an increment."""
+        count, last_used = self._pending.get((table, record_id), (0, used_at))
+        self._pending[(table, record_id)] = (count + amount, max(last_used, used_at))
+
+    async def drain(self) -> Tuple[Pending, Any]:
+        """Take all pending increments; returns them and a token for ack/restore."""
+        pending, self._pending = self._pending, {}
+        return pending, None
+
+    async def ack(self, token: Any) -> None:
+        """Forget increments that were written to the database."""
+
+    async def restore(self, pending: Pending, token: Any) -> None:
+        """Put back increments whose write failed."""
+        for (table, record_id), (count, used_at) in pending.items():
+            await self.add(table, record_id, count, used_at)
+
+
+class RedisCounterStore:
+    """
+    Pending increments in Redis hashes, shared by all processes.
+
+    ``{prefix}:pending`` maps "table|id" to the increment and
+    ``{prefix}:used`` to the last use time. A flush renames both to
+    ``{prefix}:flushing:<token>:*`` and deletes them after the write;
+    flushing keys older than ``recover_after`` seconds belong to a crashed
+    flush and are picked up again.
+    """
+
+    def __init__(self, url: str, prefix: str = "usage_counter", recover_after: float = 300.0):
+        """
+        Initialize the store.
+
+        Args:
+            url: Redis URL
+            prefix: Key prefix
+            recover_after: Age in seconds after which an unfinished flush is retried
+        """
+        import redis.asyncio as redis
+
+        self.redis = redis.Redis.from_url(url, decode_responses=True)
+        self.prefix = prefix
+        self.recover_after = recover_after
+
+    async def add(self, table: str, record_id: str, amount: int, used_at: float) -> None:
+        field = f"{table}|{record_id}"
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hincrby(f"{self.prefix}:pending", field, amount)
+            pipe.hset(f"{self.prefix}:used", field, used_at)
+            await pipe.execute()
+
+    async def drain(self) -> Tuple[Pending, Any]:
+        token = f"{int(time.time())}-{uuid.uuid4().hex}"
+        for name in ("pending", "used"):
+            if await self.redis.exists(f"{self.prefix}:{name}"):
+                await self.redis.rename(f"{self.prefix}:{name}", f"{self.prefix}:flushing:{token}:{name}")
+
+        # This flush's batch plus batches abandoned by crashed flushes
+        now = time.time()
+        batches = set()
+        async for key in self.redis.scan_iter(f"{self.prefix}:flushing:*:pending"):
+            batch = key[len(self.prefix) + len(":flushing:"):-len(":pending")]
+            if batch == token or now - int(batch.split("-", 1)[0]) > self.recover_after:
+                batches.add(batch)
+
+        pending: Pending = {}
+        for batch in batches:
+            counts = await self.redis.hgetall(f"{self.prefix}:flushing:{batch}:pending")
+            used = await self.redis.hgetall(f"{self.prefix}:flushing:{batch}:used")
+            for field, count in counts.items():
+                table, record_id = field.split("|", 1)
+                previous, last_used = pending.get((table, record_id), (0, 0.0))
+                pending[(table, record_id)] = (
+                    previous + int(count), max(last_used, float(used.get(field, now)))
+                )
+        return pending, sorted(batches)
+
+    async def ack(self, token: Any) -> None:
+        keys = [f"{self.prefix}:flushing:{batch}:{name}" for batch in token for name in ("pending", "used")]
+        if keys:
+            await self.redis.delete(*keys)
+
+    async def restore(self, pending: Pending, token: Any) -> None:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            for (table, record_id), (count, used_at) in pending.items():
+                pipe.hincrby(f"{self.prefix}:pending", f"{table}|{record_id}", count)
+                pipe.hset(f"{self.prefix}:used", f"{table}|{record_id}", used_at)
+            for batch in token:
+                pipe.delete(f"{self.prefix}:flushing:{batch}:pending", f"{self.prefix}:flushing:{batch}:used")
+            await pipe.execute()
+
+
+class UsageCounter:
+    """
+    Aggregates usage_count increments and flushes them in batches.
+
+    Example:
+        counter = get_usage_counter()
+        await counter.increment(IndicatorComponent, indicator_id)
+        ...
+        async with db_manager.session() as session:
+            await counter.flush(session)
+    """
+
+    def __init__(self, store: Optional[Any] = None, flush_interval: float = 10.0):
+        """
+        Initialize the counter.
+
+        Args:
+            store: MemoryCounterStore or RedisCounterStore (default: memory)
+            flush_interval: Seconds between background flushes
+        """
+        self.store = store or MemoryCounterStore()
+        self.flush_interval = flush_interval
+        self._models: Dict[str, Type[BaseDBModel]] = {}
+
+    async def increment(self, model: Type[BaseDBModel], record_id: str, amount: int = 1) -> None:
+        """
+        Buffer a usage_count increment.
+
+        Args:
+            model: Model with a usage_count column
+            record_id: Record ID
+            amount: Increment
+        """
+        self._models[model.__tablename__] = model
+        await self.store.add(model.__tablename__, str(record_id), amount, time.time())
+
+    async def flush(self, session: AsyncSession) -> int:
+        """
+        Write all pending increments in one transaction.
+
+        Models with a last_used_at column also get it set to the latest use.
+        On failure the increments are kept for the next flush.
+
+        Args:
+            session: Database session
+
+        Returns:
+            Number of rows updated
+        """
+        pending, token = await self.store.drain()
+        if not pending:
+            await self.store.ack(token)
+            return 0
+
+        by_table: Dict[str, List[Dict[str, Any]]] = {}
+        for (table, record_id), (count, used_at) in pending.items():
+            by_table.setdefault(table, []).append({
+                "record_id": record_id,
+                "amount": count,
+                "used_at": datetime.fromtimestamp(used_at, tz=timezone.utc),
+            })
+
+        try:
+            for table, params in by_table.items():
+                model = self._models.get(table) or _model_for_table(table)
+                if model is None:
+                    logger.warning(f"Dropping usage counts for unknown table {table}")
+                    continue
+                columns = model.__table__.c
+                values = {"usage_count": columns.usage_count + bindparam("amount")}
+                if "last_used_at" in columns:
+                    values["last_used_at"] = bindparam("used_at")
+                stmt = (
+                    update(model.__table__)
+                    .where(columns.id == bindparam("record_id"))
+                    .values(**values)
+                )
+                await session.execute(stmt, params)
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            await self.store.restore(pending, token)
+            raise
+
+        await self.store.ack(token)
+        logger.debug(f"Flushed usage counts for {len(pending)} rows")
+        return len(pending)
+
+    async def run(self, session_factory: Callable[[], AsyncContextManager[AsyncSession]]) -> None:
+        """
+        Flush every flush_interval seconds until cancelled.
+
+        Args:
+            session_factory: Callable returning an async session context manager
+        """
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                async with session_factory() as session:
+                    await self.flush(session)
+            except Exception as e:
+                logger.error(f"Usage counter flush failed: {e}")
+
+
+def _model_for_table(table: str) -> Optional[Type[BaseDBModel]]:
+    """Mapped model of a table (for batches left by another process)."""
+    for mapper in Base.registry.mappers:
+        if getattr(mapper.class_, "__tablename__", None) == table:
+            return mapper.class_
+    return None
+
+
+@lru_cache()
+def get_usage_counter() -> UsageCounter:
+    """Process-wide usage counter configured by USAGE_COUNTER_* settings."""
+    from app.config import settings
+    if settings.USAGE_COUNTER_BACKEND == "redis":
+        store = RedisCounterStore(settings.REDIS_URL)
+    else:
+        store = MemoryCounterStore()
+    return UsageCounter(store, settings.USAGE_COUNTER_FLUSH_SECONDS)
@@ -5,6 +5,7 @@ FastAPI main application with comprehensive logging
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+import asyncio
 from contextlib import asynccontextmanager
 
 from app.config import settings
@@ -18,6 +19,8 @@ from app.modules.code_security.api import router as security_router
 
 # Import database
 from app.database import db_manager
+from app.database.usage_counter import get_usage_counter
+from app.modules.strategy.services.quick_test_service import run_timeout_sweeper
 
 # Import logging modules
 from app.modules.common.logging import setup_logging, get_logger
@@ -88,6 +91,11 @@ async def lifespan(app: FastAPI):
         if settings.APP_ENV == "production":
             raise
 
+    # Write buffered usage counts in the background
+    usage_flusher = asyncio.create_task(get_usage_counter().run(db_manager.session))
+    # Fail quick tests left RUNNING (e.g. by a restart) after QUICK_TEST_TIMEOUT_MINUTES
+    quick_test_sweeper = asyncio.create_task(run_timeout_sweeper(db_manager.session))
+
     # Log audit event for system startup
     AuditLogger.log_event(
         event_type=AuditEventType.SYSTEM_STARTUP,
@@ -107,6 +115,16 @@ async def lifespan(app: FastAPI):
         extra={"environment": settings.APP_ENV},
     )
 
+    quick_test_sweeper.cancel()
+
+    # Stop the usage count flusher and write what is still buffered
+    usage_flusher.cancel()
+    try:
+        async with db_manager.session() as session:
+            await get_usage_counter().flush(session)
+    except Exception as e:
+        logger.error(f"Error flushing usage counts: {e}", exc_info=True)
+
     # Close database connections
     try:
         await db_manager.close()
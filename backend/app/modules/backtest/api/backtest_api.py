@@ -4,23 +4,38 @@ Backtest API Endpoints
 Handles backtest configuration and execution operations.
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from datetime import date
 from decimal import Decimal
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import FileResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
+from app.database.models.backtest import BacktestStatus
+from app.database.models.task import TaskType
 from app.database.repositories.backtest_repository import BacktestRepository
+from app.database.repositories.task_repository import TaskRepository
+from app.modules.backtest.services.analysis_service import (
+    MAX_SERIES_PAGE_SIZE,
+    SERIES_PAGE_SIZE,
+    ResultsAnalysisService,
+)
 from app.modules.backtest.services.config_service import BacktestConfigService
+from app.modules.backtest.services.diagnostic_service import DiagnosticService
 from app.modules.backtest.services.execution_service import BacktestExecutionService
+from app.modules.backtest.services.export_service import REPORT_MEDIA_TYPES, ExportService
+from app.modules.backtest.services.monte_carlo import MAX_PATHS
 from app.modules.backtest.exceptions import (
     InvalidConfigError,
     InvalidDateRangeError,
     InvalidCapitalError,
     ResourceNotFoundError
 )
+from app.modules.data_management.services.dataset_panel import PanelLoadError
+from app.modules.task_scheduling.exceptions import TaskValidationError
+from app.modules.task_scheduling.services.task_service import TaskService
 
 router = APIRouter(prefix="/api/backtest", tags=["backtest"])
 
@@ -38,6 +53,32 @@ async def get_execution_service(session: AsyncSession = Depends(get_db)) -> Back
     return BacktestExecutionService(repository)
 
 
+async def get_analysis_service(session: AsyncSession = Depends(get_db)) -> ResultsAnalysisService:
+    """Get ResultsAnalysisService instance."""
+    return ResultsAnalysisService(BacktestRepository(session))
+
+
+async def get_diagnostic_service(session: AsyncSession = Depends(get_db)) -> DiagnosticService:
+    """Get DiagnosticService instance."""
+    return DiagnosticService(BacktestRepository(session))
+
+
+async def get_export_service(session: AsyncSession = Depends(get_db)) -> ExportService:
+    """Get ExportService instance."""
+    return ExportService(BacktestRepository(session))
+
+
+async def get_task_service(session: AsyncSession = Depends(get_db)) -> TaskService:
+    """Get TaskService instance."""
+    return TaskService(TaskRepository(session))
+
+
+# TODO: Add authentication dependency to get current user
+def get_current_user_id() -> str:
+    """Temporary: Return a mock user ID until authentication is implemented."""
+    return "user123"
+
+
 @router.post(
     "/config",
     status_code=status.HTTP_201_CREATED,
@@ -166,9 +207,17 @@ async def start_backtest(
     config_id: str,
     service: BacktestExecutionService = Depends(get_execution_service)
 ):
-    """Start a backtest execution."""
+    """
+    Start a backtest execution; the run_backtest task executes it on the backtest queue.
+
+    An identical earlier run is reused: the result is returned COMPLETED and no task is queued.
+    """
+    from app.modules.backtest.tasks.backtest_tasks import run_backtest
+
     try:
         result = await service.start_backtest(config_id)
+        if result.status != BacktestStatus.COMPLETED.value:
+            run_backtest.delay(result.id)
         return {
             "id": result.id,
             "config_id": result.config_id,
@@ -183,6 +232,332 @@ async def start_backtest(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
 
+@router.post(
+    "/{config_id}/batch",
+    status_code=status.HTTP_201_CREATED,
+    summary="Start batch backtest of several strategies"
+)
+async def start_batch_backtest(
+    config_id: str,
+    request: Dict[str, Any],
+    service: BacktestExecutionService = Depends(get_execution_service)
+):
+    """
+    Backtest several strategies on a configuration's dataset, dates and costs.
+
+    The body holds ``strategy_ids``; each strategy trades its own signal.
+    One run_batch_backtest task loads the data once and runs them all.
+    """
+    from app.modules.backtest.tasks.backtest_tasks import run_batch_backtest
+
+    strategy_ids = request.get("strategy_ids")
+    try:
+        if not isinstance(strategy_ids, list) or not all(isinstance(i, str) for i in strategy_ids):
+            raise InvalidConfigError("strategy_ids must be a list of strategy IDs")
+        results = await service.start_batch_backtest(config_id, strategy_ids)
+    except ResourceNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except InvalidConfigError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    run_batch_backtest.delay([result.id for result in results])
+    return {
+        "results": [
+            {"id": result.id, "config_id": result.config_id, "status": result.status}
+            for result in results
+        ]
+    }
+
+
+@router.get(
+    "/results/{result_id}/series/{name}",
+    summary="Get a stored time series of a backtest result"
+)
+async def get_result_series(
+    result_id: str,
+    name: str,
+    columns: Optional[str] = Query(None, description="Comma-separated columns (default: all)"),
+    start_date: Optional[date] = Query(None, description="First date to include"),
+    end_date: Optional[date] = Query(None, description="Last date to include"),
+    offset: int = Query(0, ge=0, description="Rows to skip within the date range"),
+    limit: int = Query(SERIES_PAGE_SIZE, ge=1, le=MAX_SERIES_PAGE_SIZE, description="Maximum number of rows"),
+    service: ResultsAnalysisService = Depends(get_analysis_service)
+):
+    """
+    Read the equity, positions, trades or round_trips series of a backtest result.
+
+    Series are read from the result's columnar files only when requested,
+    restricted to the given columns and date/row range. Rows are returned in
+    pages of up to 20000 rows (limit); page through longer series with offset.
+    """
+    try:
+        return await service.get_series(
+            result_id,
+            name,
+            columns=[c.strip() for c in columns.split(",") if c.strip()] if columns else None,
+            start_date=start_date,
+            end_date=end_date,
+            offset=offset,
+            limit=limit,
+        )
+    except ResourceNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except InvalidConfigError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.delete(
+    "/results/{result_id}",
+    summary="Delete a backtest result"
+)
+async def delete_result(
+    result_id: str,
+    service: ResultsAnalysisService = Depends(get_analysis_service)
+):
+    """Delete a backtest result and the stored files only it reads."""
+    try:
+        await service.delete_result(result_id)
+        return {"message": "Result deleted successfully"}
+    except ResourceNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+@router.get(
+    "/results/{result_id}/trade-analysis",
+    summary="Get fill and round trip statistics of a backtest result"
+)
+async def get_trade_analysis(
+    result_id: str,
+    service: ResultsAnalysisService = Depends(get_analysis_service)
+):
+    """
+    Summarize the trades of a backtest result.
+
+    Round trips themselves are paged through the ``round_trips`` series.
+    """
+    try:
+        return await service.analyze_trades(result_id)
+    except ResourceNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+@router.post(
+    "/results/relative-metrics",
+    summary="Compute benchmark-relative metrics of backtest results"
+)
+async def compute_relative_metrics(
+    request: Dict[str, Any],
+    service: BacktestExecutionService = Depends(get_execution_service)
+):
+    """
+    Compute alpha, beta, tracking error and information ratio of completed results.
+
+    The body holds ``result_ids`` and an optional ``benchmark`` (an
+    instrument of the dataset or ``equal_weight``; default: each
+    configuration's config_params["benchmark"]). The metrics of all results
+    are computed in one pass and stored on the results for ranking.
+    """
+    result_ids = request.get("result_ids")
+    benchmark = request.get("benchmark")
+    try:
+        if not isinstance(result_ids, list) or not all(isinstance(i, str) for i in result_ids):
+            raise InvalidConfigError("result_ids must be a list of result IDs")
+        if benchmark is not None and not isinstance(benchmark, str):
+            raise InvalidConfigError("benchmark must be an instrument code or 'equal_weight'")
+        results = await service.compute_relative_metrics(result_ids, benchmark)
+    except ResourceNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except (InvalidConfigError, PanelLoadError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return {
+        "results": [
+            {
+                "id": result.id,
+                "benchmark": result.benchmark,
+                "alpha": result.alpha,
+                "beta": result.beta,
+                "tracking_error": result.tracking_error,
+                "information_ratio": result.information_ratio,
+            }
+            for result in results
+        ]
+    }
+
+
+@router.get(
+    "/results/ranking",
+    summary="Rank completed backtest results by a metric"
+)
+async def rank_results(
+    order_by: str = Query("information_ratio", description="Metric column to rank by"),
+    benchmark: Optional[str] = Query(None, description="Only results against this benchmark"),
+    limit: int = Query(10, ge=1, le=1000, description="Maximum number of results"),
+    service: ResultsAnalysisService = Depends(get_analysis_service)
+):
+    """
+    Best completed results by total_return, sharpe_ratio, information_ratio, alpha, ...
+
+    Results without the metric are left out; tracking_error ranks lowest first.
+    """
+    try:
+        return {"results": await service.rank_results(order_by, benchmark, limit)}
+    except InvalidConfigError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.post(
+    "/results/{result_id}/reports",
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Start rendering a report of a backtest result"
+)
+async def start_report_export(
+    result_id: str,
+    request: Dict[str, Any],
+    user_id: str = Depends(get_current_user_id),
+    service: ExportService = Depends(get_export_service),
+    task_service: TaskService = Depends(get_task_service)
+):
+    """
+    Render an xlsx, pdf or html report of a result on the backtest queue.
+
+    The body holds ``format``. A report already rendered from the result's
+    current contents is returned at once with status COMPLETED; otherwise
+    an export_report task is queued: poll GET /api/v1/tasks/{task_id} for
+    progress, then download from GET /results/{result_id}/reports/{format}.
+    """
+    from app.modules.backtest.tasks.export_tasks import export_report
+
+    report_format = request.get("format")
+    download_url = f"/api/backtest/results/{result_id}/reports/{report_format}"
+    try:
+        cached = await service.get_cached_report(result_id, report_format)
+        if cached:
+            return {"task_id": None, "status": "COMPLETED", "size": cached["size"], "download_url": download_url}
+        task = await task_service.create_task({
+            "type": TaskType.REPORT_EXPORT.value,
+            "name": f"{report_format} report of backtest {result_id}",
+            "params": {"result_id": result_id, "format": report_format},
+            "created_by": user_id,
+        })
+    except ResourceNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except (InvalidConfigError, TaskValidationError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    export_report.delay(task.id)
+    return {"task_id": task.id, "status": task.status, "download_url": download_url}
+
+
+@router.get(
+    "/results/{result_id}/reports/{report_format}",
+    summary="Download a rendered report of a backtest result"
+)
+async def download_report(
+    result_id: str,
+    report_format: str,
+    service: ExportService = Depends(get_export_service)
+):
+    """
+    Stream a report rendered by POST /results/{result_id}/reports.
+
+    Returns 404 until the report is rendered, and again once the result
+    has changed since.
+    """
+    try:
+        report = await service.get_cached_report(result_id, report_format)
+    except ResourceNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except InvalidConfigError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if not report:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No current {report_format} report of backtest result {result_id}"
+        )
+    return FileResponse(
+        report["path"],
+        media_type=REPORT_MEDIA_TYPES[report_format],
+        filename=f"backtest_{result_id}.{report_format}",
+    )
+
+
+@router.get(
+    "/results/{result_id}/monte-carlo",
+    summary="Get Monte Carlo confidence intervals of a backtest result"
+)
+async def get_monte_carlo(
+    result_id: str,
+    n_paths: int = Query(10000, ge=1, le=MAX_PATHS, description="Number of resampled paths"),
+    block_size: Optional[float] = Query(None, ge=1, description="Mean block length (default: n^(1/3))"),
+    source: str = Query("returns", description="Resampled sequence: returns or trades"),
+    confidence: float = Query(0.95, gt=0, lt=1, description="Confidence level of the intervals"),
+    seed: Optional[int] = Query(0, description="Random seed"),
+    service: DiagnosticService = Depends(get_diagnostic_service)
+):
+    """
+    Stationary block bootstrap of the daily returns or trade P&L.
+
+    Returns confidence intervals and percentiles of terminal return, max
+    drawdown and Sharpe ratio over the resampled paths, and the share of
+    paths ending in a loss. Reports are cached per result.
+    """
+    try:
+        return await service.get_monte_carlo(
+            result_id, n_paths=n_paths, block_size=block_size, source=source,
+            confidence=confidence, seed=seed
+        )
+    except ResourceNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except InvalidConfigError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.post(
+    "/results/{result_id}/walk-forward",
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Start walk-forward analysis of a backtest result"
+)
+async def start_walk_forward(
+    result_id: str,
+    request: Optional[Dict[str, Any]] = None,
+    user_id: str = Depends(get_current_user_id),
+    service: DiagnosticService = Depends(get_diagnostic_service),
+    task_service: TaskService = Depends(get_task_service)
+):
+    """
+    Re-run a result's strategy on rolling in-sample / out-of-sample folds.
+
+    The body holds the options in WALK_FORWARD_DEFAULTS (n_folds,
+    in_sample_ratio, anchored, grid, objective, n_trials, max_workers). A
+    report already computed with these options is returned at once with
+    status COMPLETED; otherwise a run_walk_forward task is queued: poll
+    GET /api/v1/tasks/{task_id} for fold progress and the report (per-fold
+    results and the degradation and deflated Sharpe ratio summary, which
+    detect_overfitting uses from then on).
+    """
+    from app.modules.backtest.tasks.walk_forward_tasks import run_walk_forward
+
+    options = request or {}
+    try:
+        cached = await service.get_cached_walk_forward(result_id, options)
+        if cached:
+            return {"task_id": None, "status": "COMPLETED", "report": cached}
+        task = await task_service.create_task({
+            "type": TaskType.WALK_FORWARD.value,
+            "name": f"Walk-forward analysis of backtest {result_id}",
+            "params": {"result_id": result_id, "options": options},
+            "created_by": user_id,
+        })
+    except ResourceNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except (InvalidConfigError, TaskValidationError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    run_walk_forward.delay(task.id)
+    return {"task_id": task.id, "status": task.status}
+
+
 @router.get(
     "/{result_id}/status",
     summary="Get backtest status"
@@ -197,3 +572,43 @@ async def get_backtest_status(
         return {"status": status_value}
     except ResourceNotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+@router.post(
+    "/optimizations",
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Start parameter optimization"
+)
+async def start_optimization(
+    request: Dict[str, Any],
+    user_id: str = Depends(get_current_user_id),
+    task_service: TaskService = Depends(get_task_service)
+):
+    """
+    Start a parameter sweep of a strategy's signal on the backtest queue.
+
+    The body holds strategy_id, dataset_id and either a ``grid``
+    (parameter -> values) or a random search ``space`` with ``n_samples``,
+    plus the options in OPTIMIZATION_DEFAULTS. Poll
+    GET /api/v1/tasks/{task_id} for progress and the leaderboard.
+    """
+    from app.modules.backtest.tasks.optimization_tasks import run_optimization
+
+    params = dict(request)
+    strategy_id = params.pop("strategy_id", None)
+    dataset_id = params.pop("dataset_id", None)
+    try:
+        if not strategy_id or not dataset_id:
+            raise InvalidConfigError("strategy_id and dataset_id are required")
+        BacktestExecutionService.validate_optimization_options(params)
+        task = await task_service.create_task({
+            "type": TaskType.OPTIMIZATION.value,
+            "name": f"Optimization of strategy {strategy_id}",
+            "params": {"strategy_id": strategy_id, "dataset_id": dataset_id, **params},
+            "created_by": user_id,
+        })
+    except (InvalidConfigError, TaskValidationError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    run_optimization.delay(task.id)
+    return {"task_id": task.id, "status": task.status}
@@ -3,22 +3,109 @@ Results Analysis Service
 
 Provides analysis functionality for backtest results including:
 - Metrics calculation (returns, Sharpe ratio, max drawdown)
-- Trade analysis (win rate, profit/loss ratio)
+- Trade analysis (fills and round trips: win rate, profit/loss ratio,
+  holding period, adverse/favorable excursion)
 - Performance statistics
+- Ranking results by a metric column (e.g. information ratio)
+- Reading stored time series (equity curve, holdings, trades)
+- Deleting results together with their stored files
 """
 
-from typing import Dict, Any
-from decimal import Decimal
+from datetime import date
+from typing import Dict, Any, List, Optional, Sequence, Union
 
-from app.database.repositories.backtest_repository import BacktestRepository
-from app.modules.backtest.exceptions import ResourceNotFoundError
+import numpy as np
+
+from app.database.repositories.backtest_repository import RANKING_COLUMNS, BacktestRepository
+from app.modules.backtest.exceptions import InvalidConfigError, ResourceNotFoundError
+from app.modules.backtest.services.backtest_engine import round_trip_statistics
+from app.modules.backtest.services.benchmark import RELATIVE_METRICS
+from app.modules.backtest.services.result_store import (
+    ARTIFACT_COLUMNS,
+    BacktestResultStore,
+    get_result_store,
+    result_columns,
+)
+from app.modules.common.utils.return_statistics import to_json_list
+
+# Default and maximum rows of a series page
+SERIES_PAGE_SIZE = 5000
+MAX_SERIES_PAGE_SIZE = 20000
+
+# Round trip columns read for the trade analysis
+TRIP_STATISTIC_COLUMNS = ["direction", "holding_period", "pnl", "return", "mae", "mfe", "closed"]
 
 
 class ResultsAnalysisService:
     """Service for analyzing backtest results."""
 
-    def __init__(self, repository: BacktestRepository):
+    def __init__(self, repository: BacktestRepository, result_store: Optional[BacktestResultStore] = None):
         self.repository = repository
+        self._result_store = result_store
+
+    @property
+    def result_store(self) -> BacktestResultStore:
+        """Store of equity, positions and trades files."""
+        if self._result_store is None:
+            self._result_store = get_result_store()
+        return self._result_store
+
+    async def get_series(
+        self,
+        result_id: str,
+        name: str,
+        columns: Optional[Sequence[str]] = None,
+        start_date: Optional[Union[str, date]] = None,
+        end_date: Optional[Union[str, date]] = None,
+        offset: int = 0,
+        limit: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Read a stored time series of a backtest result.
+
+        Only the requested columns are loaded; per-trade and per-holding
+        series are memory-mapped, so only the requested rows are read.
+
+        Args:
+            result_id: Result ID
+            name: equity, positions, trades or round_trips
+            columns: Columns to return (None: all)
+            start_date: First date to include
+            end_date: Last date to include
+            offset: Rows to skip within the date range
+            limit: Maximum number of rows
+
+        Returns:
+            Dict with the artifact name, the row count and column -> JSON list
+
+        Raises:
+            ResourceNotFoundError: If the result or its series is not found
+            InvalidConfigError: If the artifact or a column is unknown
+        """
+        if name not in ARTIFACT_COLUMNS:
+            raise InvalidConfigError(
+                f"Unknown series {name}; expected one of {', '.join(ARTIFACT_COLUMNS)}"
+            )
+        result = await self.repository.get_result_by_id(result_id)
+        if not result:
+            raise ResourceNotFoundError(f"Backtest result {result_id} not found")
+
+        try:
+            data = result_columns(
+                self.result_store, result, name, columns, start_date, end_date, offset, limit
+            )
+        except KeyError as e:
+            raise InvalidConfigError(str(e.args[0])) from e
+        if data is None:
+            raise ResourceNotFoundError(f"Backtest result {result_id} has no {name} series")
+
+        rows = len(next(iter(data.values()))) if data else 0
+        return {
+            "result_id": result_id,
+            "series": name,
+            "rows": rows,
+            "columns": {column: _json_column(values) for column, values in data.items()},
+        }
 
     async def calculate_metrics(self, result_id: str) -> Dict[str, Any]:
         """Calculate performance metrics for a backtest result."""
@@ -30,37 +117,100 @@ class ResultsAnalysisService:
             "total_return": result.total_return,
             "annual_return": result.annual_return,
             "sharpe_ratio": result.sharpe_ratio,
-            "max_drawdown": result.max_drawdown
+            "max_drawdown": result.max_drawdown,
+            "benchmark": result.benchmark,
+            **{metric: getattr(result, metric) for metric in RELATIVE_METRICS}
         }
 
     async def analyze_trades(self, result_id: str) -> Dict[str, Any]:
-        """Analyze trade statistics for a backtest result."""
+        """
+        Analyze the trades of a backtest result.
+
+        Round trip statistics are computed from the stored round_trips
+        columns (only those needed are loaded); results stored without
+        round trips fall back to the fill statistics of the run.
+
+        Returns:
+            Dict with win_rate (of the result), total_trades (fills),
+            profit_loss_ratio, ``fills`` (statistics of the fills) and
+            ``round_trips`` (see backtest_engine.round_trip_statistics;
+            None when not stored)
+        """
         result = await self.repository.get_result_by_id(result_id)
         if not result:
             raise ResourceNotFoundError(f"Backtest result {result_id} not found")
 
-        # Calculate profit/loss ratio from win rate
-        # Simplified calculation: assuming equal position sizes
-        win_rate = result.win_rate
-
-        # Handle edge cases for profit/loss ratio calculation
-        if win_rate <= Decimal("0.0"):
-            # No wins, P/L ratio is 0
-            profit_loss_ratio = Decimal("0.0")
-        elif win_rate >= Decimal("1.0"):
-            # All wins, P/L ratio is undefined (represented as None)
-            profit_loss_ratio = None
-        else:
-            # Normal case: calculate ratio
-            loss_rate = Decimal("1.0") - win_rate
-            profit_loss_ratio = win_rate / loss_rate
+        fills = {key: value for key, value in (result.trades or {}).items() if key != "trades"}
+        trips = result_columns(self.result_store, result, "round_trips", TRIP_STATISTIC_COLUMNS)
+        trip_stats = round_trip_statistics(trips) if trips is not None else None
 
+        profit_loss_ratio = (trip_stats or fills).get("profit_loss_ratio")
         return {
             "win_rate": result.win_rate,
             "profit_loss_ratio": profit_loss_ratio,
-            "total_trades": 0  # Placeholder - would be calculated from trade data
+            "total_trades": int(fills.get("total_trades", 0)),
+            "fills": fills,
+            "round_trips": trip_stats,
         }
 
+    async def rank_results(
+        self,
+        order_by: str = "information_ratio",
+        benchmark: Optional[str] = None,
+        limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Best completed results by a metric column (an indexed query).
+
+        Args:
+            order_by: Metric column (see RANKING_COLUMNS)
+            benchmark: Only results with relative metrics against this benchmark
+            limit: Maximum number of results
+
+        Returns:
+            Result ID, configuration ID, benchmark and metric columns of each
+            result, best first
+
+        Raises:
+            InvalidConfigError: If order_by is not a ranking column
+        """
+        try:
+            results = await self.repository.get_best_performing_results(limit, order_by, benchmark)
+        except ValueError as e:
+            raise InvalidConfigError(str(e)) from e
+        return [
+            {
+                "id": result.id,
+                "config_id": result.config_id,
+                "benchmark": result.benchmark,
+                **{column: getattr(result, column) for column in RANKING_COLUMNS},
+            }
+            for result in results
+        ]
+
+    async def delete_result(self, result_id: str) -> None:
+        """
+        Soft delete a result and remove stored files no other result reads.
+
+        A reused result shares the artifacts of the run it was copied from,
+        so the artifact directory is only removed once no remaining result
+        references it. Reports rendered for the result are stored under its
+        ID and go with it on the same condition.
+
+        Args:
+            result_id: Result ID
+
+        Raises:
+            ResourceNotFoundError: If the result is not found
+        """
+        result = await self.repository.get_result_by_id(result_id)
+        if not result or not await self.repository.delete_result(result_id):
+            raise ResourceNotFoundError(f"Backtest result {result_id} not found")
+
+        for key in {result_id, result.artifact_path} - {None}:
+            if not await self.repository.is_artifact_referenced(key):
+                self.result_store.delete(key)
+
     async def get_performance_summary(self, result_id: str) -> Dict[str, Any]:
         """Get comprehensive performance summary."""
         metrics = await self.calculate_metrics(result_id)
@@ -70,3 +220,12 @@ class ResultsAnalysisService:
             "metrics": metrics,
             "trades": trades
         }
+
+
+def _json_column(values: np.ndarray) -> List[Any]:
+    """JSON-safe list of a stored column (dates as ISO strings)."""
+    if np.issubdtype(values.dtype, np.datetime64):
+        return [None if np.isnat(value) else str(value) for value in values.astype("datetime64[D]")]
+    if np.issubdtype(values.dtype, np.number):
+        return to_json_list(values)
+    return values.tolist()
@@ -0,0 +1,702 @@
+"""
+Vectorized Backtest Engine
+
+Array-based portfolio simulation over a (dates x instruments) price panel:
+
+1. Signals -> target weights on rebalance dates (``target_weights``).
+2. Targets -> fills and holdings (``simulate``): targets decided on date t
+   are filled at the price of date t + 1, so a signal computed from data up
+   to t never trades on that same data. Buys fill at ``price * (1 + slippage)``,
+   sells at ``price * (1 - slippage)`` and every fill pays
+   ``commission_rate`` of its value.
+3. Equity curve, returns and trades -> performance metrics
+   (``performance_metrics``) and daily holdings (``position_history``).
+
+``simulate_batch`` runs several schedules (e.g. one per strategy) over the
+same prices at once, stacking their holdings along a portfolio axis.
+
+Only dates are looped over; each date is a handful of vector operations
+across instruments, and instruments are only touched individually when
+they trade, so a 10-year daily backtest of 3000 instruments runs in
+seconds. Instruments without a price on a date (suspended, not listed,
+delisted) cannot be traded that date and are valued at their last price.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.modules.common.utils.return_statistics import ANNUALIZATION, summarize_returns
+
+
+# Version of the simulation and the artifacts stored with its results. Part
+# of the result fingerprint: bump it whenever a change alters the numbers or
+# artifacts of a run, so results of the old engine are no longer reused.
+ENGINE_VERSION = 1
+
+# Trades below this share of equity are not sent
+MIN_TRADE_FRACTION = 1e-6
+
+# Trade list columns and dtypes
+TRADE_FIELDS = {
+    "date_index": np.int32,
+    "instrument_index": np.int32,
+    "quantity": np.float64,
+    "price": np.float64,
+    "value": np.float64,
+    "commission": np.float64,
+    "pnl": np.float64,
+}
+
+# Round trip columns and dtypes (see round_trips)
+ROUND_TRIP_FIELDS = {
+    "entry_index": np.int32,
+    "exit_index": np.int32,
+    "instrument_index": np.int32,
+    "direction": np.int8,
+    "quantity": np.float64,
+    "entry_price": np.float64,
+    "exit_price": np.float64,
+    "holding_period": np.int32,
+    "pnl": np.float64,
+    "return": np.float64,
+    "mae": np.float64,
+    "mfe": np.float64,
+    "commission": np.float64,
+    "closed": np.bool_,
+}
+
+# Price cells gathered at once for excursions (MAE / MFE)
+EXCURSION_CHUNK_CELLS = 4_000_000
+
+# Progress callback: fraction of dates simulated (0-1)
+EngineProgressCallback = Callable[[float], Any]
+
+# Checkpoint callback: (dates simulated, equity so far) -> False to stop early
+EngineCheckpointCallback = Callable[[int, np.ndarray], bool]
+
+
+@dataclass
+class RebalanceSchedule:
+    """
+    Target portfolio weights on rebalance dates.
+
+    Attributes:
+        rows: Date indices on which targets are decided (increasing)
+        weights: Target weights (len(rows) x instruments); positive long,
+            negative short, the rest is held in cash
+    """
+
+    rows: np.ndarray
+    weights: np.ndarray
+
+
+@dataclass
+class BacktestRun:
+    """
+    Output of a simulation.
+
+    Attributes:
+        equity: Portfolio value at each date's close
+        cash: Cash at each date's close
+        returns: Per-date portfolio return (first date relative to initial capital)
+        turnover: Traded value / equity per date
+        positions: Shares held per instrument after the last date
+        trades: Columnar trade list (see ``simulate``)
+    """
+
+    equity: np.ndarray
+    cash: np.ndarray
+    returns: np.ndarray
+    turnover: np.ndarray
+    positions: np.ndarray
+    trades: Dict[str, np.ndarray]
+
+
+def rebalance_rows(n_dates: int, period: int) -> np.ndarray:
+    """Every ``period``-th date index, starting with the first."""
+    if period < 1:
+        raise ValueError("period must be at least 1")
+    return np.arange(0, n_dates, period)
+
+
+def target_weights(
+    signal: np.ndarray,
+    prices: np.ndarray,
+    mode: str = "score",
+    top_k: int = 50,
+    long_short: bool = False,
+    rebalance_period: int = 1
+) -> RebalanceSchedule:
+    """
+    Turn a signal panel into target weights.
+
+    Only instruments with both a signal and a price on the decision date are
+    eligible. Dates with no eligible instrument are not rebalanced.
+
+    Modes:
+        score: Equal weights on the ``top_k`` highest signals. With
+            ``long_short`` the ``top_k`` lowest are shorted and each leg
+            gets half of the capital.
+        weight: The signal is the target weight itself; rows whose gross
+            exposure exceeds 1 are scaled down to 1.
+
+    Args:
+        signal: Signal values (dates x instruments)
+        prices: Prices (dates x instruments)
+        mode: "score" or "weight"
+        top_k: Instruments per leg in score mode
+        long_short: Also short the lowest signals (score mode)
+        rebalance_period: Dates between rebalances
+
+    Returns:
+        RebalanceSchedule
+
+    Raises:
+        ValueError: If the mode or shapes are invalid
+    """
+    if signal.shape != prices.shape:
+        raise ValueError("signal and prices must have the same shape")
+    if mode not in ("score", "weight"):
+        raise ValueError(f"Unknown signal mode: {mode}")
+
+    rows = rebalance_rows(signal.shape[0], rebalance_period)
+    values = signal[rows].astype(float)
+    with np.errstate(invalid="ignore"):
+        eligible = np.isfinite(values) & (prices[rows] > 0)
+    has_eligible = eligible.any(axis=1)
+    rows, values, eligible = rows[has_eligible], values[has_eligible], eligible[has_eligible]
+
+    if mode == "weight":
+        weights = np.where(eligible, values, 0.0)
+        gross = np.abs(weights).sum(axis=1, keepdims=True)
+        weights = np.where(gross > 1.0, weights / np.where(gross > 0, gross, 1.0), weights)
+        return RebalanceSchedule(rows=rows, weights=weights)
+
+    if top_k < 1:
+        raise ValueError("top_k must be at least 1")
+    leg_weight = 0.5 if long_short else 1.0
+    weights = _top_k_weights(np.where(eligible, values, -np.inf), eligible, top_k, leg_weight)
+    if long_short:
+        weights -= _top_k_weights(np.where(eligible, -values, -np.inf), eligible, top_k, leg_weight)
+    return RebalanceSchedule(rows=rows, weights=weights)
+
+
+def _top_k_weights(scores: np.ndarray, eligible: np.ndarray, k: int, total: float) -> np.ndarray:
+    """Spread ``total`` equally over the k highest finite scores of each row."""
+    n_rows, n_instruments = scores.shape
+    k = min(k, n_instruments)
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    chosen = np.zeros_like(eligible)
+    np.put_along_axis(chosen, top, True, axis=1)
+    chosen &= eligible
+    count = chosen.sum(axis=1, keepdims=True)
+    return np.where(chosen, total / np.maximum(count, 1), 0.0)
+
+
+def forward_fill(prices: np.ndarray) -> np.ndarray:
+    """Carry the last valid price forward along dates (leading gaps stay NaN)."""
+    valid = np.isfinite(prices)
+    index = np.where(valid, np.arange(prices.shape[0])[:, None], 0)
+    np.maximum.accumulate(index, axis=0, out=index)
+    filled = prices[index, np.arange(prices.shape[1])]
+    filled[~np.maximum.accumulate(valid, axis=0)] = np.nan
+    return filled
+
+
+def simulate(
+    prices: np.ndarray,
+    schedule: RebalanceSchedule,
+    initial_capital: float,
+    commission_rate: float = 0.0,
+    slippage: float = 0.0,
+    progress: Optional[EngineProgressCallback] = None,
+    checkpoint: Optional[EngineCheckpointCallback] = None
+) -> BacktestRun:
+    """
+    Simulate a portfolio following a rebalance schedule.
+
+    Targets are sized on the equity at the fill date's prices, scaled by
+    ``1 / (1 + commission_rate + slippage)`` so that costs are paid from the
+    cash kept aside (cash can still dip slightly below zero on rebalances
+    that turn over more than the whole portfolio). Positions in instruments
+    without a price on the fill date are left unchanged.
+
+    Trades are returned column-wise: date_index, instrument_index, quantity
+    (signed shares, positive buy), price (fill price), value
+    (quantity * price), commission and pnl (realized profit net of the
+    trade's commission for trades that reduce a position, NaN for trades
+    that only open or add).
+
+    Args:
+        prices: Prices (dates x instruments); NaN where not tradable
+        schedule: Target weights from ``target_weights``
+        initial_capital: Starting cash
+        commission_rate: Commission as a fraction of traded value
+        slippage: Price slippage as a fraction of price
+        progress: Callback receiving the fraction of dates simulated
+        checkpoint: Callback called with the number of dates simulated and
+            the equity curve so far at the same points as ``progress``;
+            returning False stops the simulation there, and the run then
+            covers only the dates simulated
+
+    Returns:
+        BacktestRun
+    """
+    single_checkpoint = None
+    if checkpoint is not None:
+        def single_checkpoint(dates: int, equity: np.ndarray) -> bool:
+            return checkpoint(dates, equity[0])
+    return _simulate_portfolios(
+        prices, [schedule], initial_capital, commission_rate, slippage, progress, single_checkpoint
+    )[0]
+
+
+def simulate_batch(
+    prices: np.ndarray,
+    schedules: Sequence[RebalanceSchedule],
+    initial_capital: float,
+    commission_rate: float = 0.0,
+    slippage: float = 0.0,
+    progress: Optional[EngineProgressCallback] = None
+) -> List[BacktestRun]:
+    """
+    Simulate several portfolios over the same prices in one pass.
+
+    Gives the same runs as calling ``simulate`` once per schedule, but the
+    holdings, average costs and cash of all portfolios are stacked into
+    (portfolios x instruments) arrays, so each date is one set of vector
+    operations for every portfolio and the price marks are computed once.
+
+    Args:
+        prices: Prices (dates x instruments); NaN where not tradable
+        schedules: Target weights per portfolio
+        initial_capital: Starting cash of each portfolio
+        commission_rate: Commission as a fraction of traded value
+        slippage: Price slippage as a fraction of price
+        progress: Callback receiving the fraction of dates simulated
+
+    Returns:
+        One BacktestRun per schedule, in order
+    """
+    return _simulate_portfolios(
+        prices, schedules, initial_capital, commission_rate, slippage, progress
+    )
+
+
+def _simulate_portfolios(
+    prices: np.ndarray,
+    schedules: Sequence[RebalanceSchedule],
+    initial_capital: float,
+    commission_rate: float,
+    slippage: float,
+    progress: Optional[EngineProgressCallback] = None,
+    checkpoint: Optional[EngineCheckpointCallback] = None
+) -> List[BacktestRun]:
+    """
+    Simulation loop shared by ``simulate`` and ``simulate_batch``.
+
+    ``checkpoint`` receives the (portfolios x dates) equity so far; returning
+    False stops every run at that date.
+    """
+    n_dates, n_instruments = prices.shape
+    n_portfolios = len(schedules)
+    for schedule in schedules:
+        if schedule.weights.shape[1:] != (n_instruments,):
+            raise ValueError("schedule weights do not match the number of instruments")
+
+    marks = np.nan_to_num(forward_fill(prices))
+    # fill_row[p, t]: row of portfolio p's weights filled on date t, or -1
+    fill_row = np.full((n_portfolios, n_dates), -1, dtype=np.intp)
+    for p, schedule in enumerate(schedules):
+        filled = schedule.rows.astype(np.intp) + 1
+        inside = filled < n_dates
+        fill_row[p, filled[inside]] = np.flatnonzero(inside)
+    sizing = 1.0 / (1.0 + commission_rate + slippage)
+
+    shares = np.zeros((n_portfolios, n_instruments))
+    avg_cost = np.zeros((n_portfolios, n_instruments))
+    cash = np.full(n_portfolios, float(initial_capital))
+    equity = np.empty((n_portfolios, n_dates))
+    cash_curve = np.empty((n_portfolios, n_dates))
+    turnover = np.zeros((n_portfolios, n_dates))
+    trade_columns: Dict[str, list] = {name: [] for name in TRADE_FIELDS}
+    trade_portfolios: List[np.ndarray] = []
+    report_every = max(1, n_dates // 20)
+
+    for t in range(n_dates):
+        active = np.flatnonzero(fill_row[:, t] >= 0)
+        if active.size:
+            price = prices[t]
+            tradable = np.isfinite(price) & (price > 0)
+            nav = cash[active] + shares[active] @ marks[t]
+            weights = np.stack([schedules[p].weights[fill_row[p, t]] for p in active])
+            target = weights * (nav * sizing)[:, None]
+            held_value = shares[active] * np.where(tradable, price, 0.0)
+            delta = np.where(tradable, target - held_value, 0.0)
+            threshold = np.maximum(nav, 0.0) * MIN_TRADE_FRACTION
+            rows, idx = np.nonzero(np.abs(delta) > threshold[:, None])
+
+            if idx.size:
+                portfolio = active[rows]
+                ref = price[idx]
+                old = shares[portfolio, idx]
+                # Close out exactly so no rounding residue is left behind
+                quantity = np.where(target[rows, idx] == 0, -old, delta[rows, idx] / ref)
+                fill = ref * (1.0 + slippage * np.sign(quantity))
+                traded = quantity * fill
+                commission = np.abs(traded) * commission_rate
+
+                cost = avg_cost[portfolio, idx]
+                new = old + quantity
+                reducing = (old != 0) & (np.sign(quantity) != np.sign(old))
+                closed = np.where(reducing, np.minimum(np.abs(quantity), np.abs(old)), 0.0)
+                pnl = np.where(reducing, closed * np.sign(old) * (fill - cost) - commission, np.nan)
+
+                adding = (old == 0) | (np.sign(quantity) == np.sign(old))
+                flipped = reducing & (np.abs(quantity) > np.abs(old))
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    added_cost = (cost * old + fill * quantity) / new
+                avg_cost[portfolio, idx] = np.where(
+                    new == 0, 0.0, np.where(adding, added_cost, np.where(flipped, fill, cost))
+                )
+                shares[portfolio, idx] = new
+                cash -= np.bincount(portfolio, weights=traded + commission, minlength=n_portfolios)
+                gross = np.bincount(rows, weights=np.abs(traded), minlength=active.size)
+                turnover[active, t] = np.where(nav > 0, gross / np.where(nav > 0, nav, 1.0), 0.0)
+
+                trade_portfolios.append(portfolio)
+                for name, column in (
+                    ("date_index", np.full(idx.size, t)), ("instrument_index", idx),
+                    ("quantity", quantity), ("price", fill), ("value", traded),
+                    ("commission", commission), ("pnl", pnl),
+                ):
+                    trade_columns[name].append(column)
+
+        cash_curve[:, t] = cash
+        equity[:, t] = cash + shares @ marks[t]
+        if (t + 1) % report_every == 0:
+            if progress:
+                progress((t + 1) / n_dates)
+            if checkpoint and checkpoint(t + 1, equity[:, :t + 1]) is False:
+                equity = equity[:, :t + 1]
+                cash_curve = cash_curve[:, :t + 1]
+                turnover = turnover[:, :t + 1]
+                break
+
+    start = np.full((n_portfolios, 1), float(initial_capital))
+    previous = np.concatenate((start, equity[:, :-1]), axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        returns = np.where(previous > 0, equity / previous - 1.0, np.nan)
+
+    # Split the interleaved trade list by portfolio, keeping date order
+    owner = np.concatenate(trade_portfolios) if trade_portfolios else np.empty(0, dtype=np.intp)
+    order = np.argsort(owner, kind="stable")
+    bounds = np.searchsorted(owner[order], np.arange(n_portfolios + 1))
+    trades = {
+        name: (np.concatenate(columns) if columns else np.empty(0)).astype(dtype)[order]
+        for (name, columns), dtype in zip(trade_columns.items(), TRADE_FIELDS.values())
+    }
+
+    return [
+        BacktestRun(
+            equity=equity[p],
+            cash=cash_curve[p],
+            returns=returns[p],
+            turnover=turnover[p],
+            positions=shares[p].copy(),
+            trades={name: column[bounds[p]:bounds[p + 1]] for name, column in trades.items()},
+        )
+        for p in range(n_portfolios)
+    ]
+
+
+def position_history(trades: Dict[str, np.ndarray], n_dates: int) -> Dict[str, np.ndarray]:
+    """
+    Holdings after each date's close, rebuilt from the trades.
+
+    Only instruments that were ever traded are tracked, so the work is
+    (dates x traded instruments) rather than the whole universe.
+
+    Args:
+        trades: Columnar trades from ``simulate``
+        n_dates: Number of simulated dates
+
+    Returns:
+        Columnar holdings sorted by date: date_index, instrument_index and
+        shares, with one row per date and non-zero position
+    """
+    if not trades["quantity"].size:
+        empty = np.zeros(0, dtype=np.intp)
+        return {"date_index": empty, "instrument_index": empty, "shares": np.zeros(0)}
+
+    held, column = np.unique(trades["instrument_index"], return_inverse=True)
+    change = np.zeros((n_dates, held.size))
+    np.add.at(change, (trades["date_index"], column), trades["quantity"])
+    shares = np.cumsum(change, axis=0)
+    # A full close leaves rounding residue of the summed trade quantities
+    shares[np.abs(shares) <= 1e-9 * np.abs(change).max(axis=0)] = 0.0
+
+    rows, columns = np.nonzero(shares)
+    return {"date_index": rows, "instrument_index": held[columns], "shares": shares[rows, columns]}
+
+
+def round_trips(trades: Dict[str, np.ndarray], prices: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Round trips rebuilt from the fills, one per position episode.
+
+    A round trip opens when an instrument's position leaves zero and closes
+    when it returns to zero; a fill that flips the position closes one and
+    opens the next. Fills adding to a position raise its entry quantity and
+    average entry price, fills reducing it are its exits (a flipping fill's
+    commission is charged to the round trip it closes). Positions still
+    open after the last date are marked to the last price.
+
+    Fills are matched with array operations over the fill list sorted by
+    instrument (running positions, episode numbers from the sign changes,
+    per-episode sums with bincount); excursions gather the held prices of
+    all episodes in chunks and reduce them per episode.
+
+    Args:
+        trades: Columnar trades from ``simulate``
+        prices: Prices (dates x instruments) of the simulation
+
+    Returns:
+        Columns of ROUND_TRIP_FIELDS sorted by entry date and instrument:
+        entry_index and exit_index (date rows; -1 while open),
+        instrument_index, direction (1 long, -1 short), quantity (shares
+        entered), average entry_price and exit_price (last price if open),
+        holding_period (dates), pnl (exit minus entry value net of
+        commission, shares still held valued at the last price), return
+        (pnl / entry value),
+        mae and mfe (largest adverse and favorable price move from the
+        entry price at closes while held, as positive fractions),
+        commission and closed
+    """
+    if not trades["quantity"].size:
+        return {name: np.empty(0, dtype=dtype) for name, dtype in ROUND_TRIP_FIELDS.items()}
+
+    order = np.lexsort((trades["date_index"], trades["instrument_index"]))
+    instrument = trades["instrument_index"][order]
+    date = trades["date_index"][order]
+    quantity = trades["quantity"][order]
+    fill = trades["price"][order]
+    commission = trades["commission"][order]
+
+    # Running position per instrument; full closes leave summation residue
+    first_fill = np.concatenate(([True], instrument[1:] != instrument[:-1]))
+    total = np.cumsum(quantity)
+    group = np.cumsum(first_fill) - 1
+    after = total - (total - quantity)[first_fill][group]
+    after[np.abs(after) <= 1e-9 * (np.abs(quantity) + np.abs(total))] = 0.0
+    before = np.concatenate(([0.0], after[:-1]))
+    before[first_fill] = 0.0
+
+    sign_before, sign_after = np.sign(before), np.sign(after)
+    opens = (sign_after != 0) & (sign_after != sign_before)
+    closes = (sign_before != 0) & (sign_after != sign_before)
+    trip = np.cumsum(opens) - 1           # episode held after the fill
+    previous_trip = trip - opens          # episode held before the fill
+    n_trips = int(opens.sum())
+
+    size = np.abs(quantity)
+    reducing = (sign_before != 0) & (np.sign(quantity) != sign_before)
+    exit_qty = np.where(reducing, np.minimum(size, np.abs(before)), 0.0)
+    entry_qty = np.maximum(size - exit_qty, 0.0)
+    exit_trip = np.where(reducing, previous_trip, 0)
+
+    entry_trip = np.maximum(trip, 0)
+    entered = np.bincount(entry_trip, entry_qty, n_trips)
+    entry_value = np.bincount(entry_trip, entry_qty * fill, n_trips)
+    exited = np.bincount(exit_trip, exit_qty, n_trips)
+    exit_value = np.bincount(exit_trip, exit_qty * fill, n_trips)
+    # A flipping fill's commission belongs to the episode it closes
+    fees = np.bincount(np.where(reducing, previous_trip, entry_trip), commission, n_trips)
+
+    trip_instrument = instrument[opens]
+    entry_index = date[opens]
+    direction = sign_after[opens].astype(np.int8)
+    exit_index = np.full(n_trips, -1, dtype=np.int64)
+    exit_index[previous_trip[closes]] = date[closes]
+    closed = exit_index >= 0
+
+    marks = forward_fill(prices)
+    last_row = prices.shape[0] - 1
+    with np.errstate(invalid="ignore", divide="ignore"):
+        entry_price = entry_value / entered
+        exit_price = np.where(closed, exit_value / exited, marks[last_row, trip_instrument])
+    # Cash flows of the episode, with what is still held valued at the mark
+    remaining = np.where(closed, 0.0, entered - exited)
+    pnl = direction * (exit_value + remaining * np.nan_to_num(exit_price) - entry_value) - fees
+
+    end_index = np.where(closed, exit_index, last_row)
+    high, low = _held_price_range(marks, trip_instrument, entry_index, end_index)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        up, down = high / entry_price - 1.0, 1.0 - low / entry_price
+        mfe = np.maximum(np.where(direction > 0, up, down), 0.0)
+        mae = np.maximum(np.where(direction > 0, down, up), 0.0)
+        trip_return = pnl / entry_value
+
+    by_entry = np.lexsort((trip_instrument, entry_index))
+    columns = {
+        "entry_index": entry_index,
+        "exit_index": exit_index,
+        "instrument_index": trip_instrument,
+        "direction": direction,
+        "quantity": entered,
+        "entry_price": entry_price,
+        "exit_price": exit_price,
+        "holding_period": end_index - entry_index,
+        "pnl": pnl,
+        "return": trip_return,
+        "mae": mae,
+        "mfe": mfe,
+        "commission": fees,
+        "closed": closed,
+    }
+    return {name: columns[name][by_entry].astype(dtype) for name, dtype in ROUND_TRIP_FIELDS.items()}
+
+
+def _held_price_range(
+    marks: np.ndarray,
+    instrument: np.ndarray,
+    first: np.ndarray,
+    last: np.ndarray
+) -> tuple:
+    """Highest and lowest mark of each instrument over date rows [first, last]."""
+    n = instrument.size
+    high, low = np.full(n, np.nan), np.full(n, np.nan)
+    lengths = (last - first + 1).astype(np.int64)
+    ends = np.cumsum(lengths)
+    start = 0
+    while start < n:
+        base = ends[start] - lengths[start]
+        stop = max(start + 1, int(np.searchsorted(ends, base + EXCURSION_CHUNK_CELLS, "right")))
+        chunk = lengths[start:stop]
+        offsets = np.concatenate(([0], np.cumsum(chunk)[:-1]))
+        rows = np.repeat(first[start:stop] - offsets, chunk) + np.arange(int(chunk.sum()))
+        values = marks[rows, np.repeat(instrument[start:stop], chunk)]
+        high[start:stop] = np.fmax.reduceat(values, offsets)
+        low[start:stop] = np.fmin.reduceat(values, offsets)
+        start = stop
+    return high, low
+
+
+def trade_statistics(trades: Dict[str, np.ndarray]) -> Dict[str, Any]:
+    """
+    Statistics of a trade list.
+
+    A closing trade (one that reduces a position) wins if its realized
+    profit net of commission is positive.
+
+    Args:
+        trades: Columnar trades from ``simulate``
+
+    Returns:
+        Dict with total_trades, buy_trades, sell_trades, closing_trades,
+        winning_trades, losing_trades, win_rate, avg_win, avg_loss,
+        profit_loss_ratio and total_commission (None where undefined)
+    """
+    pnl = trades["pnl"][~np.isnan(trades["pnl"])]
+    wins, losses = pnl[pnl > 0], pnl[pnl <= 0]
+    avg_win = float(wins.mean()) if wins.size else None
+    avg_loss = float(losses.mean()) if losses.size else None
+    return {
+        "total_trades": int(trades["quantity"].size),
+        "buy_trades": int((trades["quantity"] > 0).sum()),
+        "sell_trades": int((trades["quantity"] < 0).sum()),
+        "closing_trades": int(pnl.size),
+        "winning_trades": int(wins.size),
+        "losing_trades": int(losses.size),
+        "win_rate": float(wins.size / pnl.size) if pnl.size else 0.0,
+        "avg_win": avg_win,
+        "avg_loss": avg_loss,
+        "profit_loss_ratio": (
+            abs(avg_win / avg_loss) if avg_win is not None and avg_loss else None
+        ),
+        "total_commission": float(trades["commission"].sum()),
+    }
+
+
+def round_trip_statistics(trips: Dict[str, np.ndarray]) -> Dict[str, Any]:
+    """
+    Statistics of round trips.
+
+    Win/loss statistics cover closed round trips (a round trip wins if its
+    pnl net of commission is positive); holding period and excursions
+    cover all of them.
+
+    Args:
+        trips: Round trip columns (pnl, return, direction, holding_period,
+            mae, mfe and closed as from ``round_trips``)
+
+    Returns:
+        Dict with round_trips, closed_trips, open_trips, long_trips,
+        short_trips, winning_trips, losing_trips, win_rate, avg_win,
+        avg_loss, profit_loss_ratio, expectancy (mean pnl), avg_return,
+        largest_win, largest_loss, avg_holding_period, max_holding_period,
+        avg_mae and avg_mfe (None where undefined)
+    """
+    closed = trips["closed"].astype(bool)
+    pnl = trips["pnl"][closed]
+    wins, losses = pnl[pnl > 0], pnl[pnl <= 0]
+    avg_win = float(wins.mean()) if wins.size else None
+    avg_loss = float(losses.mean()) if losses.size else None
+    holding = trips["holding_period"]
+
+    def mean(values: np.ndarray) -> Optional[float]:
+        values = values[np.isfinite(values)]
+        return float(values.mean()) if values.size else None
+
+    return {
+        "round_trips": int(closed.size),
+        "closed_trips": int(closed.sum()),
+        "open_trips": int((~closed).sum()),
+        "long_trips": int((trips["direction"] > 0).sum()),
+        "short_trips": int((trips["direction"] < 0).sum()),
+        "winning_trips": int(wins.size),
+        "losing_trips": int(losses.size),
+        "win_rate": float(wins.size / pnl.size) if pnl.size else None,
+        "avg_win": avg_win,
+        "avg_loss": avg_loss,
+        "profit_loss_ratio": (
+            abs(avg_win / avg_loss) if avg_win is not None and avg_loss else None
+        ),
+        "expectancy": mean(pnl),
+        "avg_return": mean(trips["return"][closed]),
+        "largest_win": float(wins.max()) if wins.size else None,
+        "largest_loss": float(losses.min()) if losses.size else None,
+        "avg_holding_period": float(holding.mean()) if holding.size else None,
+        "max_holding_period": int(holding.max()) if holding.size else None,
+        "avg_mae": mean(trips["mae"]),
+        "avg_mfe": mean(trips["mfe"]),
+    }
+
+
+def performance_metrics(run: BacktestRun, periods_per_year: int = ANNUALIZATION) -> Dict[str, Any]:
+    """
+    Summary metrics of a simulation.
+
+    Args:
+        run: BacktestRun from ``simulate``
+        periods_per_year: Dates per year for annualization
+
+    Returns:
+        Dict with total_return, annual_return, annual_volatility, sharpe_ratio,
+        max_drawdown (positive fraction), win_rate, mean_turnover,
+        final_equity and n_periods
+    """
+    summary = summarize_returns(run.returns, periods_per_year)
+    stats = trade_statistics(run.trades)
+    return {
+        "total_return": summary["total_return"] or 0.0,
+        "annual_return": summary["annual_return"] or 0.0,
+        "annual_volatility": summary["annual_volatility"] or 0.0,
+        "sharpe_ratio": summary["sharpe"] or 0.0,
+        "max_drawdown": -(summary["max_drawdown"] or 0.0),
+        "win_rate": stats["win_rate"],
+        "mean_turnover": float(run.turnover.mean()) if run.turnover.size else 0.0,
+        "final_equity": float(run.equity[-1]) if run.equity.size else None,
+        "n_periods": summary["n_periods"],
+    }
@@ -0,0 +1,178 @@
+"""
+Benchmark-Relative Metrics
+
+Alpha, beta, tracking error and information ratio of backtest returns
+against a benchmark. A benchmark is an instrument of the backtest's dataset
+(e.g. an index loaded alongside the stocks) or ``equal_weight``, the mean
+daily return of all the dataset's instruments. Its daily returns are taken
+from the traded price field and aligned to the panel calendar.
+
+Aligned series are cached per (dataset, version, benchmark, price field),
+so all results on one dataset share a single alignment. Metrics are
+computed for a whole (n_results x n_dates) return matrix at once: dates
+where a result or the benchmark has no return are masked out, so results
+over different date ranges of one calendar share the matrix.
+
+With r the strategy's and b the benchmark's returns over their common
+dates and P the periods per year:
+
+    beta               cov(r, b) / var(b)
+    alpha              (mean(r) - beta * mean(b)) * P   (Jensen's alpha, zero risk-free rate)
+    tracking_error     std(r - b) * sqrt(P)
+    information_ratio  mean(r - b) * P / tracking_error
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Tuple
+
+import numpy as np
+
+from app.modules.backtest.exceptions import InvalidConfigError
+from app.modules.common.utils.return_statistics import ANNUALIZATION
+from app.modules.data_management.services.dataset_panel import DatasetPanel
+
+# Benchmark of the mean return of all instruments
+EQUAL_WEIGHT = "equal_weight"
+
+# Relative metrics, in the order of the BacktestResult columns
+RELATIVE_METRICS = ("alpha", "beta", "tracking_error", "information_ratio")
+
+_BENCHMARK_CACHE_SIZE = 64
+_benchmark_cache: "OrderedDict[Tuple[Hashable, ...], np.ndarray]" = OrderedDict()
+_benchmark_cache_lock = threading.Lock()
+
+
+def benchmark_returns(panel: DatasetPanel, benchmark: str, price_field: str = "close") -> np.ndarray:
+    """
+    Daily returns of a benchmark on the panel calendar.
+
+    Args:
+        panel: Dataset panel
+        benchmark: Instrument code in the panel, or EQUAL_WEIGHT
+        price_field: Price field the returns are computed from
+
+    Returns:
+        float64 array with one return per panel date (NaN on the first
+        date and where the benchmark has no price)
+
+    Raises:
+        InvalidConfigError: If the benchmark or price field is not in the panel
+    """
+    try:
+        prices = panel.field(price_field)
+    except KeyError as e:
+        raise InvalidConfigError(str(e.args[0])) from e
+
+    if benchmark == EQUAL_WEIGHT:
+        columns = prices
+    else:
+        matches = np.flatnonzero(np.asarray(panel.instruments, dtype=str) == benchmark)
+        if not matches.size:
+            raise InvalidConfigError(f"Benchmark {benchmark} is not an instrument of the dataset")
+        columns = prices[:, matches[:1]]
+
+    returns = np.full(columns.shape, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns[1:] = columns[1:] / columns[:-1] - 1.0
+    returns[~np.isfinite(returns)] = np.nan
+    if returns.shape[1] == 1:
+        return returns[:, 0]
+
+    counts = np.sum(~np.isnan(returns), axis=1)
+    totals = np.nansum(returns, axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(counts > 0, totals / counts, np.nan)
+
+
+def aligned_benchmark_returns(
+    dataset_key: Tuple[Hashable, ...],
+    panel: DatasetPanel,
+    benchmark: str,
+    price_field: str = "close"
+) -> np.ndarray:
+    """
+    Cached benchmark_returns of a dataset panel.
+
+    Args:
+        dataset_key: Identity of the panel's data, e.g. (dataset id, version)
+        panel: Dataset panel
+        benchmark: Instrument code in the panel, or EQUAL_WEIGHT
+        price_field: Price field the returns are computed from
+
+    Returns:
+        Read-only float64 array with one return per panel date
+
+    Raises:
+        InvalidConfigError: If the benchmark or price field is not in the panel
+    """
+    key = (*dataset_key, benchmark, price_field)
+    with _benchmark_cache_lock:
+        returns = _benchmark_cache.get(key)
+        if returns is not None:
+            _benchmark_cache.move_to_end(key)
+            return returns
+
+    returns = benchmark_returns(panel, benchmark, price_field)
+    returns.setflags(write=False)
+
+    with _benchmark_cache_lock:
+        _benchmark_cache[key] = returns
+        while len(_benchmark_cache) > _BENCHMARK_CACHE_SIZE:
+            _benchmark_cache.popitem(last=False)
+    return returns
+
+
+def clear_benchmark_cache() -> None:
+    """Drop all cached benchmark series."""
+    with _benchmark_cache_lock:
+        _benchmark_cache.clear()
+
+
+def relative_metrics(
+    returns: np.ndarray,
+    benchmark: np.ndarray,
+    periods_per_year: int = ANNUALIZATION
+) -> Dict[str, np.ndarray]:
+    """
+    Benchmark-relative metrics of many return series at once.
+
+    Args:
+        returns: (n_results, n_dates) per-date returns on the benchmark's
+            calendar (NaN where a result has no return); a 1-D series is
+            treated as one result
+        benchmark: (n_dates,) benchmark returns
+        periods_per_year: Dates per year for annualization
+
+    Returns:
+        Dict of RELATIVE_METRICS, each a float64 array with one value per
+        result (NaN with fewer than 2 common dates, a constant benchmark
+        for alpha and beta, or zero tracking error for the information ratio)
+    """
+    r = np.atleast_2d(np.asarray(returns, dtype=float))
+    b = np.asarray(benchmark, dtype=float)
+    if r.shape[1] != b.shape[0]:
+        raise ValueError("returns and benchmark must have the same number of dates")
+
+    valid = ~np.isnan(r) & ~np.isnan(b)[None, :]
+    count = valid.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_r = np.where(valid, r, 0.0).sum(axis=1) / count
+        mean_b = np.where(valid, b[None, :], 0.0).sum(axis=1) / count
+        dev_r = np.where(valid, r - mean_r[:, None], 0.0)
+        dev_b = np.where(valid, b[None, :] - mean_b[:, None], 0.0)
+        dof = np.where(count > 1, count - 1, np.nan)
+        cov = np.einsum("ij,ij->i", dev_r, dev_b) / dof
+        var_b = np.einsum("ij,ij->i", dev_b, dev_b) / dof
+        dev_r -= dev_b
+        tracking = np.sqrt(np.einsum("ij,ij->i", dev_r, dev_r) / dof * periods_per_year)
+
+        beta = np.where(var_b > 0, cov / var_b, np.nan)
+        alpha = (mean_r - beta * mean_b) * periods_per_year
+        information = np.where(tracking > 0, (mean_r - mean_b) * periods_per_year / tracking, np.nan)
+    return {
+        "alpha": alpha,
+        "beta": beta,
+        "tracking_error": tracking,
+        "information_ratio": information,
+    }
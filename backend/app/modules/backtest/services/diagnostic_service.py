@@ -2,100 +2,401 @@
 Diagnostic Service
 
 Provides diagnostic functionality for backtest results including:
-- Risk analysis (volatility, VaR, CVaR)
-- Return analysis (return sources, distribution)
-- Overfitting detection (in-sample vs out-sample comparison)
+- Risk analysis (volatility, downside deviation, historical and parametric
+  VaR / CVaR, Sortino and Calmar ratios, rolling volatility)
+- Return analysis (return distribution, up/down days, histogram)
+- Monte Carlo robustness (stationary block bootstrap of daily returns or
+  trade P&L, see monte_carlo)
+- Overfitting detection (walk-forward in-sample vs out-of-sample
+  degradation and deflated Sharpe ratio, see walk_forward)
 - Optimization suggestions
+
+Risk and return statistics are computed from the result's stored daily
+return series (see risk_analytics) once per completed result, and cached
+as a document next to its series in the result store. Walk-forward reports
+are cached the same way; the analysis itself runs in the run_walk_forward
+Celery task, which reports fold progress on its Task record. Monte Carlo
+reports are cached per result for the last set of bootstrap parameters.
 """
 
-from typing import Dict, Any, List
+import asyncio
+import json
+from typing import Dict, Any, List, Optional, Tuple
 from decimal import Decimal
 import math
 
+import numpy as np
+
+from app.database.models.backtest import BacktestStatus
 from app.database.repositories.backtest_repository import BacktestRepository
-from app.modules.backtest.exceptions import ResourceNotFoundError
+from app.modules.backtest.exceptions import InvalidConfigError, ResourceNotFoundError
+from app.modules.backtest.services.execution_service import BacktestExecutionService
+from app.modules.backtest.services.monte_carlo import DEFAULT_CONFIDENCE, DEFAULT_PATHS, bootstrap_report
+from app.modules.backtest.services.result_store import BacktestResultStore, get_result_store, result_columns
+from app.modules.backtest.services.risk_analytics import risk_report
+from app.modules.backtest.services.walk_forward import FoldProgressCallback
+from app.modules.backtest.services.walk_forward import overfitting_score as walk_forward_score
+from app.modules.common.utils.return_statistics import ANNUALIZATION
+
+# Bump when the report's contents change so cached reports are recomputed
+RISK_REPORT_VERSION = 1
+WALK_FORWARD_VERSION = 1
+MONTE_CARLO_VERSION = 2
+
+# Sequences a Monte Carlo bootstrap can resample
+MONTE_CARLO_SOURCES = ("returns", "trades")
 
 
 class DiagnosticService:
     """Service for diagnosing backtest results."""
 
-    def __init__(self, repository: BacktestRepository):
+    def __init__(
+        self,
+        repository: BacktestRepository,
+        result_store: Optional[BacktestResultStore] = None,
+        execution_service: Optional[BacktestExecutionService] = None
+    ):
         self.repository = repository
-
-    async def calculate_risk_metrics(self, result_id: str) -> Dict[str, Any]:
-        """Calculate risk metrics for a backtest result."""
+        self._result_store = result_store
+        self._execution_service = execution_service
+
+    @property
+    def result_store(self) -> BacktestResultStore:
+        """Store of result series and cached analytics."""
+        if self._result_store is None:
+            self._result_store = get_result_store()
+        return self._result_store
+
+    @property
+    def execution_service(self) -> BacktestExecutionService:
+        """Service re-running the result's strategy for walk-forward folds."""
+        if self._execution_service is None:
+            self._execution_service = BacktestExecutionService(self.repository, result_store=self.result_store)
+        return self._execution_service
+
+    async def get_risk_report(self, result_id: str) -> Dict[str, Any]:
+        """
+        Risk and return-distribution report of a backtest result.
+
+        Computed from the daily return series on first use and cached next
+        to the series once the result is completed.
+
+        Args:
+            result_id: Result ID
+
+        Returns:
+            Report of risk_analytics.risk_report (empty statistics when the
+            result has no return series)
+
+        Raises:
+            ResourceNotFoundError: If the result is not found
+        """
         result = await self.repository.get_result_by_id(result_id)
         if not result:
             raise ResourceNotFoundError(f"Backtest result {result_id} not found")
 
-        # Calculate volatility from max drawdown (simplified estimation)
-        # In real implementation, this would use daily returns data
-        max_drawdown = abs(float(result.max_drawdown))
-        volatility = Decimal(str(max_drawdown * 2))  # Simplified estimation
+        key = result.artifact_path or result.id
+        cached = self.result_store.read_document(key, "risk")
+        if cached and cached.get("version") == RISK_REPORT_VERSION:
+            return cached["report"]
 
-        # Calculate VaR and CVaR (simplified)
-        # VaR at 95% confidence level
-        var_95 = Decimal(str(float(volatility) * 1.645))  # 1.645 is z-score for 95%
+        series = result_columns(self.result_store, result, "equity")
+        if series is not None and "returns" in series:
+            report = risk_report(series["returns"], series["date"])
+        else:
+            report = risk_report(np.zeros(0))
+        if result.status == BacktestStatus.COMPLETED.value:
+            self.result_store.write_document(key, "risk", {"version": RISK_REPORT_VERSION, "report": report})
+        return report
 
-        # CVaR (Conditional VaR) - expected loss beyond VaR
-        cvar_95 = Decimal(str(float(var_95) * 1.3))  # Simplified estimation
+    async def calculate_risk_metrics(self, result_id: str) -> Dict[str, Any]:
+        """
+        Calculate risk metrics for a backtest result.
+
+        Returns:
+            Dict with annualized volatility, downside_deviation, sortino_ratio,
+            calmar_ratio, max_drawdown, historical var/cvar at 95% and 99%
+            (var_95, cvar_95, var_99, cvar_99), their ``parametric`` (normal)
+            counterparts and ``rolling_volatility`` (window, dates, values)
+        """
+        report = await self.get_risk_report(result_id)
+        risk = report["risk"]
 
         return {
-            "volatility": volatility,
-            "var_95": var_95,
-            "cvar_95": cvar_95
+            "volatility": risk["volatility"],
+            "downside_deviation": risk["downside_deviation"],
+            "sortino_ratio": risk["sortino_ratio"],
+            "calmar_ratio": risk["calmar_ratio"],
+            "max_drawdown": risk["max_drawdown"],
+            "var_95": risk["historical_var_95"],
+            "cvar_95": risk["historical_cvar_95"],
+            "var_99": risk["historical_var_99"],
+            "cvar_99": risk["historical_cvar_99"],
+            "parametric": {
+                "var_95": risk["parametric_var_95"],
+                "cvar_95": risk["parametric_cvar_95"],
+                "var_99": risk["parametric_var_99"],
+                "cvar_99": risk["parametric_cvar_99"],
+            },
+            "rolling_volatility": report["rolling_volatility"],
+            "n_periods": risk["n_periods"],
         }
 
     async def analyze_return_sources(self, result_id: str) -> Dict[str, Any]:
-        """Analyze return sources for a backtest result."""
+        """
+        Analyze the daily return distribution of a backtest result.
+
+        Returns:
+            Dict with total_return, return_distribution (mean, median, std,
+            skewness, excess_kurtosis, best, worst, positive/negative ratios),
+            positive_days, negative_days, flat_days and the return histogram
+        """
         result = await self.repository.get_result_by_id(result_id)
         if not result:
             raise ResourceNotFoundError(f"Backtest result {result_id} not found")
-
-        # Analyze return distribution
-        total_return = result.total_return
-        win_rate = result.win_rate
-
-        # Estimate positive and negative days based on win rate
-        # In real implementation, this would use actual daily returns
-        total_trading_days = 252  # Approximate trading days per year
-        positive_days = int(total_trading_days * float(win_rate))
-        negative_days = total_trading_days - positive_days
+        report = await self.get_risk_report(result_id)
+        distribution = report["distribution"]
+        n = report["risk"]["n_periods"]
 
         return {
-            "total_return": total_return,
+            "total_return": result.total_return,
             "return_distribution": {
-                "mean": total_return / Decimal(str(total_trading_days)),
-                "positive_ratio": win_rate,
-                "negative_ratio": Decimal("1.0") - win_rate
+                "mean": distribution["mean"],
+                "median": distribution["median"],
+                "std": distribution["std"],
+                "skewness": distribution["skewness"],
+                "excess_kurtosis": distribution["excess_kurtosis"],
+                "best": distribution["best"],
+                "worst": distribution["worst"],
+                "positive_ratio": distribution["positive_days"] / n if n else None,
+                "negative_ratio": distribution["negative_days"] / n if n else None,
             },
-            "positive_days": positive_days,
-            "negative_days": negative_days
+            "positive_days": distribution["positive_days"],
+            "negative_days": distribution["negative_days"],
+            "flat_days": distribution["flat_days"],
+            "histogram": distribution["histogram"],
+        }
+
+    async def get_monte_carlo(
+        self,
+        result_id: str,
+        n_paths: int = DEFAULT_PATHS,
+        block_size: Optional[float] = None,
+        source: str = "returns",
+        confidence: float = DEFAULT_CONFIDENCE,
+        seed: Optional[int] = 0
+    ) -> Dict[str, Any]:
+        """
+        Monte Carlo confidence intervals of a backtest result's performance.
+
+        Resamples the daily return series (source "returns") or the sequence
+        of realized trade P&L as a fraction of initial capital (source
+        "trades") with the stationary block bootstrap. Cached next to the
+        series once the result is completed; a call with other parameters
+        replaces the cached report.
+
+        Args:
+            result_id: Result ID
+            n_paths: Number of resampled paths
+            block_size: Mean block length (default: n^(1/3) observations)
+            source: "returns" or "trades"
+            confidence: Two-sided confidence level of the intervals
+            seed: Random seed (None: nondeterministic, not cached)
+
+        Returns:
+            Report of monte_carlo.bootstrap_report plus its source
+
+        Raises:
+            ResourceNotFoundError: If the result is not found
+            InvalidConfigError: If a parameter is out of range
+        """
+        if source not in MONTE_CARLO_SOURCES:
+            raise InvalidConfigError(f"source must be one of {', '.join(MONTE_CARLO_SOURCES)}")
+        result = await self.repository.get_result_by_id(result_id)
+        if not result:
+            raise ResourceNotFoundError(f"Backtest result {result_id} not found")
+
+        params = {
+            "n_paths": n_paths, "block_size": block_size, "source": source,
+            "confidence": confidence, "seed": seed,
         }
+        key = result.artifact_path or result.id
+        cached = self.result_store.read_document(key, "monte_carlo")
+        if cached and cached.get("version") == MONTE_CARLO_VERSION and cached["params"] == params:
+            return cached["report"]
+
+        if source == "returns":
+            series = result_columns(self.result_store, result, "equity")
+            values = series["returns"] if series is not None and "returns" in series else np.zeros(0)
+            additive, periods_per_year = False, ANNUALIZATION
+        else:
+            values, periods_per_year = await self._trade_pnl_fractions(result)
+            additive = True
+
+        try:
+            # Up to ~1.3s of numpy work (20k paths of 10 years daily): keep it off the event loop
+            report = await asyncio.to_thread(
+                bootstrap_report,
+                values, n_paths, block_size, confidence, seed,
+                additive=additive, periods_per_year=periods_per_year
+            )
+        except ValueError as e:
+            raise InvalidConfigError(str(e)) from e
+        report = {"source": source, **report}
+        if seed is not None and result.status == BacktestStatus.COMPLETED.value:
+            self.result_store.write_document(
+                key, "monte_carlo", {"version": MONTE_CARLO_VERSION, "params": params, "report": report}
+            )
+        return report
+
+    async def _trade_pnl_fractions(self, result) -> Tuple[np.ndarray, float]:
+        """Realized trade P&L as fractions of initial capital, and trades per year."""
+        trades = result_columns(self.result_store, result, "trades", ["pnl"])
+        pnl = trades["pnl"] if trades is not None else np.zeros(0)
+        pnl = pnl[~np.isnan(pnl)]
+        config = await self.repository.get_config_by_id(result.config_id)
+        capital = float(config.initial_capital) if config else 0.0
+        if capital <= 0:
+            return np.zeros(0), ANNUALIZATION
+        n_dates = (result.metrics or {}).get("n_dates")
+        if not n_dates:
+            equity = result_columns(self.result_store, result, "equity", ["date"])
+            n_dates = len(equity["date"]) if equity is not None else 0
+        trades_per_year = pnl.size * ANNUALIZATION / n_dates if n_dates and pnl.size else ANNUALIZATION
+        return pnl / capital, trades_per_year
+
+    async def get_cached_walk_forward(
+        self,
+        result_id: str,
+        options: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Cached walk-forward report of a result for the given options.
+
+        Args:
+            result_id: Result ID
+            options: Analysis options (see execution_service.WALK_FORWARD_DEFAULTS)
+
+        Returns:
+            Report of run_walk_forward, or None if none was cached with these options
+
+        Raises:
+            ResourceNotFoundError: If the result is not found
+            InvalidConfigError: If the options are invalid
+        """
+        options = self._walk_forward_options(options)
+        result = await self.repository.get_result_by_id(result_id)
+        if not result:
+            raise ResourceNotFoundError(f"Backtest result {result_id} not found")
+        return self._cached_walk_forward(result, options)
+
+    async def run_walk_forward(
+        self,
+        result_id: str,
+        options: Optional[Dict[str, Any]] = None,
+        progress: Optional[FoldProgressCallback] = None
+    ) -> Dict[str, Any]:
+        """
+        Walk-forward analysis of a backtest result.
+
+        CPU bound: run it in a worker (the run_walk_forward task), not in a
+        request. The report of a completed result is cached; a later call
+        with the same options returns it without re-running the folds.
+
+        Args:
+            result_id: Result ID
+            options: Analysis options (see execution_service.WALK_FORWARD_DEFAULTS)
+            progress: Async callback receiving (done, total, fold result)
+
+        Returns:
+            Report of BacktestExecutionService.run_walk_forward
+
+        Raises:
+            ResourceNotFoundError: If the result, configuration or dataset is missing
+            InvalidConfigError: If the options or the signal are invalid
+            BacktestExecutionError: If the date range is too short for the folds
+        """
+        options = self._walk_forward_options(options)
+        result = await self.repository.get_result_by_id(result_id)
+        if not result:
+            raise ResourceNotFoundError(f"Backtest result {result_id} not found")
+
+        cached = self._cached_walk_forward(result, options)
+        if cached is not None:
+            return cached
+
+        report = await self.execution_service.run_walk_forward(result_id, options, progress=progress)
+        report = json.loads(json.dumps(report))
+        key = result.artifact_path or result.id
+        if result.status == BacktestStatus.COMPLETED.value:
+            self.result_store.write_document(
+                key, "walk_forward", {"version": WALK_FORWARD_VERSION, "report": report}
+            )
+        return report
+
+    @staticmethod
+    def _walk_forward_options(options: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Validated walk-forward options in their JSON form (as cached)."""
+        return json.loads(json.dumps(BacktestExecutionService.validate_walk_forward_options(options or {})))
+
+    def _cached_walk_forward(self, result, options: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Cached walk-forward report of a result run with these options, if any."""
+        cached = self.result_store.read_document(result.artifact_path or result.id, "walk_forward")
+        if cached and cached.get("version") == WALK_FORWARD_VERSION and cached["report"]["options"] == options:
+            return cached["report"]
+        return None
 
     async def detect_overfitting(self, result_id: str) -> Dict[str, Any]:
-        """Detect overfitting indicators for a backtest result."""
+        """
+        Detect overfitting indicators for a backtest result.
+
+        Uses the result's walk-forward report (see run_walk_forward) when one
+        has been run: the score averages the lost share of in-sample Sharpe
+        ratio out-of-sample and the probability that the Sharpe ratio is not
+        genuine (1 - deflated Sharpe ratio). Without one, falls back to a
+        heuristic on win rate and Sharpe ratio.
+
+        Returns:
+            Dict with overfitting_score (0 to 1), stability_score,
+            recommendation, method ("walk_forward" or "heuristic") and the
+            walk-forward summary (None for the heuristic)
+        """
         result = await self.repository.get_result_by_id(result_id)
         if not result:
             raise ResourceNotFoundError(f"Backtest result {result_id} not found")
 
-        # Calculate overfitting score based on Sharpe ratio and win rate
-        # High Sharpe with very high win rate might indicate overfitting
-        sharpe_ratio = float(result.sharpe_ratio)
-        win_rate = float(result.win_rate)
+        cached = self.result_store.read_document(result.artifact_path or result.id, "walk_forward")
+        walk_forward = None
+        score = None
+        if cached and cached.get("version") == WALK_FORWARD_VERSION:
+            walk_forward = cached["report"]["summary"]
+            score = walk_forward_score(walk_forward)
 
-        # Overfitting score: 0 (no overfitting) to 1 (high overfitting)
-        # If win rate is too high (>0.7) and Sharpe is very high (>2), suspect overfitting
-        overfitting_score = Decimal("0.0")
-        if win_rate > 0.7 and sharpe_ratio > 2.0:
-            overfitting_score = Decimal(str(min((win_rate - 0.7) * 2 + (sharpe_ratio - 2.0) * 0.2, 1.0)))
+        if score is not None:
+            overfitting_score = Decimal(str(round(score, 4)))
+        else:
+            walk_forward = None
+            # Calculate overfitting score based on Sharpe ratio and win rate
+            # High Sharpe with very high win rate might indicate overfitting
+            sharpe_ratio = float(result.sharpe_ratio)
+            win_rate = float(result.win_rate)
+
+            # Overfitting score: 0 (no overfitting) to 1 (high overfitting)
+            # If win rate is too high (>0.7) and Sharpe is very high (>2), suspect overfitting
+            overfitting_score = Decimal("0.0")
+            if win_rate > 0.7 and sharpe_ratio > 2.0:
+                overfitting_score = Decimal(str(min((win_rate - 0.7) * 2 + (sharpe_ratio - 2.0) * 0.2, 1.0)))
 
         # Stability score: inverse of overfitting score
         stability_score = Decimal("1.0") - overfitting_score
 
         # Generate recommendation
         if overfitting_score > Decimal("0.5"):
-            recommendation = "High risk of overfitting detected. Consider out-of-sample validation."
+            recommendation = (
+                "High risk of overfitting: in-sample performance does not hold out-of-sample."
+                if walk_forward else
+                "High risk of overfitting detected. Consider out-of-sample validation."
+            )
         elif overfitting_score > Decimal("0.3"):
             recommendation = "Moderate overfitting risk. Verify with different time periods."
         else:
@@ -104,7 +405,9 @@ class DiagnosticService:
         return {
             "overfitting_score": overfitting_score,
             "stability_score": stability_score,
-            "recommendation": recommendation
+            "recommendation": recommendation,
+            "method": "walk_forward" if walk_forward else "heuristic",
+            "walk_forward": walk_forward,
         }
 
     async def generate_optimization_suggestions(self, result_id: str) -> Dict[str, Any]:
@@ -3,43 +3,204 @@ Backtest Execution Service.
 
 Manages backtest execution lifecycle including:
 - Starting backtest execution
+- Running the vectorized engine over a dataset (run_backtest task)
+- Parameter sweeps over a strategy's signal (run_optimization task)
+- Batch backtests of many strategies on one data load (run_batch_backtest task)
+- Walk-forward out-of-sample analysis of a backtest (see walk_forward)
+- Benchmark-relative metrics (alpha, beta, tracking error, information
+  ratio) of runs and, in bulk, of stored results (see benchmark)
 - Status tracking and updates
 - Result storage
 - Error handling
+- Reuse of completed results of identical runs (matched by fingerprint)
+
+Equity curves, daily holdings and trades are written to the result store
+(see result_store) and referenced by ``BacktestResult.artifact_path``; the
+result row only holds scalar metrics and trade statistics.
+
+The traded signal is configured under ``config_params["signal"]`` of the
+backtest configuration, or under ``parameters["signal"]`` of the strategy
+instance when the configuration has none. It is either a factor formula
+(``formula`` and optional ``formula_language``) or a custom factor
+(``factor_id``), plus the portfolio construction options in SIGNAL_DEFAULTS.
+``config_params["benchmark"]`` (an instrument of the dataset or
+``equal_weight``) adds the relative metrics to the run's result.
 """
 
-from typing import Dict, Any
+import hashlib
+import json
+from datetime import date
+from typing import Dict, Any, List, Optional, Tuple, Union
 from decimal import Decimal
 
+import numpy as np
+import pandas as pd
+from loguru import logger
+
 from app.database.repositories.backtest_repository import BacktestRepository
-from app.database.models.backtest import BacktestResult, BacktestStatus
+from app.database.repositories.code_generation_repository import CodeGenerationRepository
+from app.database.repositories.custom_factor_repository import CustomFactorRepository
+from app.database.repositories.dataset import DatasetRepository
+from app.database.repositories.strategy_instance import StrategyInstanceRepository
+from app.database.models.backtest import BacktestConfig, BacktestResult, BacktestStatus
+from app.database.models.indicator import FormulaLanguage
 from app.modules.backtest.exceptions import (
+    BacktestError,
     BacktestExecutionError,
+    InvalidConfigError,
     ResourceNotFoundError
 )
+from app.modules.backtest.services import backtest_engine
+from app.modules.backtest.services.benchmark import (
+    RELATIVE_METRICS,
+    aligned_benchmark_returns,
+    relative_metrics,
+)
+from app.modules.backtest.services.result_store import BacktestResultStore, get_result_store, result_columns
+from app.modules.backtest.services.optimization import (
+    DEFAULT_ETA,
+    DEFAULT_MIN_WINDOW,
+    Leaderboard,
+    ParameterSweep,
+    SweepProgressCallback,
+    apply_parameters,
+    expand_grid,
+    formula_placeholders,
+    sample_space,
+)
+from app.modules.backtest.services.walk_forward import (
+    FoldProgressCallback,
+    run_folds,
+    walk_forward_folds,
+    walk_forward_summary,
+)
+from app.modules.data_management.services.dataset_panel import DatasetPanel, load_dataset_panel
+from app.modules.indicator.exceptions import FactorEvaluationError, FormulaCompileError
+from app.modules.indicator.services.factor_compiler import compile_formula
+from app.modules.indicator.services.factor_store import FactorValueStore, get_factor_store
+
+
+SIGNAL_DEFAULTS: Dict[str, Any] = {
+    "formula": None,
+    "formula_language": FormulaLanguage.QLIB_ALPHA.value,
+    "factor_id": None,
+    "mode": "score",
+    "top_k": 50,
+    "long_short": False,
+    "rebalance_period": 1,
+    "price_field": "close",
+}
+
+# Decimal places of the benchmark-relative result columns
+RELATIVE_PLACES: Dict[str, int] = {"alpha": 6, "beta": 4, "tracking_error": 6, "information_ratio": 4}
+
+# Result fields written with the relative metrics
+RELATIVE_FIELDS = ("benchmark", *RELATIVE_METRICS)
+
+# Options of an optimization run (OPTIMIZATION task params besides
+# strategy_id and dataset_id); either grid or space is required
+OPTIMIZATION_DEFAULTS: Dict[str, Any] = {
+    "start_date": None,
+    "end_date": None,
+    "initial_capital": 1000000.0,
+    "commission_rate": 0.0003,
+    "slippage": 0.0,
+    "grid": None,
+    "space": None,
+    "n_samples": 50,
+    "seed": None,
+    "objective": "sharpe_ratio",
+    "leaderboard_size": 20,
+    "max_workers": None,
+    "search_mode": "full",
+    "eta": DEFAULT_ETA,
+    "min_window": DEFAULT_MIN_WINDOW,
+}
+
+# full: every candidate over the whole range; halving / hyperband:
+# candidates compete on short windows and the best are promoted
+SEARCH_MODES = ("full", "halving", "hyperband")
+
+# Failed candidates reported in an optimization result
+MAX_REPORTED_FAILURES = 50
+
+# Options of a walk-forward analysis. Without a grid every fold re-runs the
+# backtest's own signal; with one, each fold selects the best candidate
+# in-sample. n_trials (default: the number of candidates) is the number of
+# configurations the strategy was selected from, for the deflated Sharpe ratio.
+WALK_FORWARD_DEFAULTS: Dict[str, Any] = {
+    "n_folds": 5,
+    "in_sample_ratio": 0.75,
+    "anchored": False,
+    "grid": None,
+    "objective": "sharpe_ratio",
+    "n_trials": None,
+    "max_workers": None,
+}
 
 
 class BacktestExecutionService:
     """Service for managing backtest execution."""
 
-    def __init__(self, repository: BacktestRepository):
+    def __init__(
+        self,
+        repository: BacktestRepository,
+        dataset_repo: Optional[DatasetRepository] = None,
+        strategy_repo: Optional[StrategyInstanceRepository] = None,
+        custom_factor_repo: Optional[CustomFactorRepository] = None,
+        factor_store: Optional[FactorValueStore] = None,
+        code_generation_repo: Optional[CodeGenerationRepository] = None,
+        result_store: Optional[BacktestResultStore] = None
+    ):
         """
         Initialize service with repository.
 
         Args:
             repository: BacktestRepository instance
+            dataset_repo: DatasetRepository (default: on the repository's session)
+            strategy_repo: StrategyInstanceRepository (default: on the repository's session)
+            custom_factor_repo: CustomFactorRepository (default: on the repository's session)
+            factor_store: Store of materialized factor values
+                         (default: the process-wide store)
+            code_generation_repo: CodeGenerationRepository (default: on the repository's session)
+            result_store: Store of equity, positions and trades files
+                         (default: the process-wide store)
         """
         self.repository = repository
+        self.dataset_repo = dataset_repo or DatasetRepository(repository.session)
+        self.strategy_repo = strategy_repo or StrategyInstanceRepository(repository.session)
+        self.custom_factor_repo = custom_factor_repo or CustomFactorRepository(repository.session)
+        self._factor_store = factor_store
+        self.code_generation_repo = code_generation_repo or CodeGenerationRepository(repository.session)
+        self._result_store = result_store
+
+    @property
+    def factor_store(self) -> FactorValueStore:
+        """Store of materialized factor values."""
+        if self._factor_store is None:
+            self._factor_store = get_factor_store()
+        return self._factor_store
+
+    @property
+    def result_store(self) -> BacktestResultStore:
+        """Store of equity, positions and trades files."""
+        if self._result_store is None:
+            self._result_store = get_result_store()
+        return self._result_store
 
     async def start_backtest(self, config_id: str) -> BacktestResult:
         """
         Start a backtest execution.
 
+        When a completed run with the same fingerprint exists, its results
+        are copied into the new record, which is returned COMPLETED and
+        needs no run_backtest task.
+
         Args:
             config_id: Configuration ID
 
         Returns:
-            Created BacktestResult instance with PENDING status
+            Created BacktestResult instance with PENDING (or reused COMPLETED) status
 
         Raises:
             ResourceNotFoundError: If configuration not found
@@ -49,6 +210,19 @@ class BacktestExecutionService:
         if not config:
             raise ResourceNotFoundError(f"Configuration {config_id} not found")
 
+        try:
+            spec = await self._resolve_signal(config)
+            dataset = await self.dataset_repo.get(config.dataset_id)
+            reusable = dataset and await self._find_reusable(config, spec, dataset)
+        except BacktestError:
+            # Configuration problems are reported by the run itself
+            reusable = None
+        if reusable:
+            logger.info(f"Reusing backtest result {reusable.id} for configuration {config_id}")
+            return await self.repository.create_result(
+                {"config_id": config_id, **self._reused_fields(reusable)}
+            )
+
         # Create result record with PENDING status
         result_data = {
             "config_id": config_id,
@@ -124,7 +298,18 @@ class BacktestExecutionService:
             ResourceNotFoundError: If result not found
         """
         # Update status and metrics
-        update_data = {
+        update_data = self._completed_fields(metrics)
+
+        result = await self.repository.update_result(result_id, update_data)
+        if not result:
+            raise ResourceNotFoundError(f"Backtest result {result_id} not found")
+
+        return result
+
+    @staticmethod
+    def _completed_fields(metrics: Dict[str, Any]) -> Dict[str, Any]:
+        """Result fields of a completed backtest."""
+        return {
             "status": BacktestStatus.COMPLETED.value,
             "total_return": metrics.get("total_return", Decimal("0.0")),
             "annual_return": metrics.get("annual_return", Decimal("0.0")),
@@ -132,14 +317,30 @@ class BacktestExecutionService:
             "max_drawdown": metrics.get("max_drawdown", Decimal("0.0")),
             "win_rate": metrics.get("win_rate", Decimal("0.0")),
             "metrics": metrics.get("metrics"),
-            "trades": metrics.get("trades")
+            "trades": metrics.get("trades"),
+            "artifact_path": metrics.get("artifact_path"),
+            "fingerprint": metrics.get("fingerprint"),
+            **{field: metrics.get(field) for field in RELATIVE_FIELDS}
         }
 
-        result = await self.repository.update_result(result_id, update_data)
-        if not result:
-            raise ResourceNotFoundError(f"Backtest result {result_id} not found")
-
-        return result
+    @staticmethod
+    def _reused_fields(source: BacktestResult) -> Dict[str, Any]:
+        """Result fields copied from a completed run with the same fingerprint."""
+        metrics = dict(source.metrics or {})
+        metrics.setdefault("reused_from", source.id)
+        return {
+            "status": BacktestStatus.COMPLETED.value,
+            "total_return": source.total_return,
+            "annual_return": source.annual_return,
+            "sharpe_ratio": source.sharpe_ratio,
+            "max_drawdown": source.max_drawdown,
+            "win_rate": source.win_rate,
+            "metrics": metrics,
+            "trades": source.trades,
+            "artifact_path": source.artifact_path,
+            "fingerprint": source.fingerprint,
+            **{field: getattr(source, field) for field in RELATIVE_FIELDS}
+        }
 
     async def fail_backtest(
         self,
@@ -169,3 +370,918 @@ class BacktestExecutionService:
             raise ResourceNotFoundError(f"Backtest result {result_id} not found")
 
         return result
+
+    async def run_backtest(self, result_id: str) -> BacktestResult:
+        """
+        Run the engine for a pending backtest and store its results.
+
+        Metrics go to the result columns, the full performance summary to
+        ``metrics`` and the trade statistics to ``trades``; the equity curve,
+        daily holdings and trades are written to the result store. If a
+        completed run with the same fingerprint exists, its results are
+        copied instead.
+
+        Args:
+            result_id: Result ID
+
+        Returns:
+            Completed BacktestResult instance (unchanged if already completed)
+
+        Raises:
+            ResourceNotFoundError: If the result, configuration or dataset is missing
+            InvalidConfigError: If the signal configuration is invalid
+            BacktestExecutionError: If the backtest cannot be run on the data
+        """
+        result = await self.repository.get_result_by_id(result_id)
+        if not result:
+            raise ResourceNotFoundError(f"Backtest result {result_id} not found")
+        if result.status == BacktestStatus.COMPLETED.value:
+            return result
+        config = await self.repository.get_config_by_id(result.config_id)
+        if not config:
+            raise ResourceNotFoundError(f"Configuration {result.config_id} not found")
+
+        await self.update_status(result_id, BacktestStatus.RUNNING.value)
+        try:
+            spec = await self._resolve_signal(config)
+            dataset = await self.dataset_repo.get(config.dataset_id)
+            if not dataset:
+                raise ResourceNotFoundError(f"Dataset {config.dataset_id} not found")
+
+            fingerprint = await self.backtest_fingerprint(config, spec, dataset)
+            reusable = await self.repository.find_completed_by_fingerprint(fingerprint)
+            if reusable:
+                logger.info(f"Backtest {result_id} reuses result {reusable.id}")
+                return await self.repository.update_result(result_id, self._reused_fields(reusable))
+
+            panel = load_dataset_panel(dataset.file_path)
+            signal = await self._signal_values(spec, dataset, panel)
+            payload, artifacts = self._run_engine(config, spec, panel, signal)
+            payload["metrics"]["dataset_version"] = dataset.version
+            benchmark = (config.config_params or {}).get("benchmark")
+            if benchmark:
+                start, stop = self._date_rows(panel, config.start_date, config.end_date)
+                payload.update(self._relative_fields(
+                    dataset, panel, benchmark, spec["price_field"], artifacts["equity"]["returns"][None, :], start
+                )[0])
+            payload["artifact_path"] = self.result_store.write(result_id, artifacts)
+            payload["fingerprint"] = fingerprint
+        except Exception as e:
+            logger.error(f"Backtest {result_id} failed: {e}")
+            await self.fail_backtest(result_id, str(e))
+            raise
+
+        logger.info(f"Backtest {result_id} completed")
+        return await self.complete_backtest(result_id, payload)
+
+    async def start_batch_backtest(
+        self,
+        config_id: str,
+        strategy_ids: List[str]
+    ) -> List[BacktestResult]:
+        """
+        Start backtests of several strategies on one configuration's data.
+
+        Each strategy gets a copy of the configuration (dataset, dates,
+        capital, costs and config_params without the ``signal`` override, so
+        every strategy trades its own ``parameters["signal"]``); the
+        configuration's own strategy reuses it. All configurations and their
+        PENDING results are created in one transaction.
+
+        Args:
+            config_id: Configuration whose data, dates and costs are shared
+            strategy_ids: Strategy instance IDs
+
+        Returns:
+            Created BacktestResult instances, one per strategy in order
+
+        Raises:
+            ResourceNotFoundError: If the configuration is not found
+            InvalidConfigError: If no strategies are given
+        """
+        config = await self.repository.get_config_by_id(config_id)
+        if not config:
+            raise ResourceNotFoundError(f"Configuration {config_id} not found")
+        strategy_ids = list(dict.fromkeys(strategy_ids))
+        if not strategy_ids:
+            raise InvalidConfigError("At least one strategy is required")
+
+        shared_params = {
+            key: value for key, value in (config.config_params or {}).items() if key != "signal"
+        }
+        configs_data = [
+            {"id": config.id} if strategy_id == config.strategy_id else {
+                "strategy_id": strategy_id,
+                "dataset_id": config.dataset_id,
+                "start_date": config.start_date,
+                "end_date": config.end_date,
+                "initial_capital": config.initial_capital,
+                "commission_rate": config.commission_rate,
+                "slippage": config.slippage,
+                "config_params": shared_params or None,
+            }
+            for strategy_id in strategy_ids
+        ]
+        return await self.repository.create_configs_with_results(configs_data, {
+            "status": BacktestStatus.PENDING.value,
+            "total_return": Decimal("0.0"),
+            "annual_return": Decimal("0.0"),
+            "sharpe_ratio": Decimal("0.0"),
+            "max_drawdown": Decimal("0.0"),
+            "win_rate": Decimal("0.0")
+        })
+
+    async def run_batch_backtest(self, result_ids: List[str]) -> List[BacktestResult]:
+        """
+        Run pending backtests that share a dataset, date range and costs together.
+
+        The dataset is loaded and aligned once, each distinct signal is
+        evaluated once, and the strategies' target positions are simulated
+        together as one stacked array (``backtest_engine.simulate_batch``).
+        All results are written in one transaction; a strategy whose signal
+        is invalid fails on its own without stopping the others, and one
+        matching a completed run's fingerprint reuses its results.
+
+        Args:
+            result_ids: Result IDs (completed ones are left unchanged)
+
+        Returns:
+            BacktestResult instances in the order of result_ids
+
+        Raises:
+            ResourceNotFoundError: If a result, configuration or the dataset is missing
+            InvalidConfigError: If the results do not share dataset, dates and costs
+            BacktestExecutionError: If the backtests cannot be run on the data
+        """
+        results = {result.id: result for result in await self.repository.get_results_by_ids(result_ids)}
+        missing = [result_id for result_id in result_ids if result_id not in results]
+        if missing:
+            raise ResourceNotFoundError(f"Backtest results not found: {', '.join(missing)}")
+        pending = [
+            result_id for result_id in dict.fromkeys(result_ids)
+            if results[result_id].status != BacktestStatus.COMPLETED.value
+        ]
+        if not pending:
+            return [results[result_id] for result_id in result_ids]
+
+        configs = {
+            config.id: config
+            for config in await self.repository.get_configs_by_ids(
+                list({results[result_id].config_id for result_id in pending})
+            )
+        }
+        config_of = {}
+        for result_id in pending:
+            config = configs.get(results[result_id].config_id)
+            if not config:
+                raise ResourceNotFoundError(f"Configuration {results[result_id].config_id} not found")
+            config_of[result_id] = config
+        shared = {
+            (c.dataset_id, c.start_date, c.end_date, c.initial_capital, c.commission_rate, c.slippage)
+            for c in config_of.values()
+        }
+        if len(shared) > 1:
+            raise InvalidConfigError("Batch backtests must share dataset, dates, capital and costs")
+        config = next(iter(config_of.values()))
+
+        await self.repository.update_results(
+            {result_id: {"status": BacktestStatus.RUNNING.value} for result_id in pending}
+        )
+        updates: Dict[str, Dict[str, Any]] = {}
+        try:
+            specs = {}
+            for result_id in pending:
+                try:
+                    specs[result_id] = await self._resolve_signal(config_of[result_id])
+                except BacktestError as e:
+                    updates[result_id] = {"status": BacktestStatus.FAILED.value, "metrics": {"error": str(e)}}
+
+            dataset = await self.dataset_repo.get(config.dataset_id)
+            if not dataset:
+                raise ResourceNotFoundError(f"Dataset {config.dataset_id} not found")
+
+            # Strategies matching a completed run copy its results
+            fingerprints = {}
+            for result_id, spec in list(specs.items()):
+                try:
+                    fingerprints[result_id] = await self.backtest_fingerprint(config_of[result_id], spec, dataset)
+                except BacktestError as e:
+                    updates[result_id] = {"status": BacktestStatus.FAILED.value, "metrics": {"error": str(e)}}
+                    del specs[result_id]
+                    continue
+                reusable = await self.repository.find_completed_by_fingerprint(fingerprints[result_id])
+                if reusable:
+                    updates[result_id] = self._reused_fields(reusable)
+                    del specs[result_id]
+
+            if specs:
+                panel = load_dataset_panel(dataset.file_path)
+                start, stop = self._date_rows(panel, config.start_date, config.end_date)
+
+                # Evaluate each distinct signal once and group strategies by traded prices
+                signals: Dict[Any, np.ndarray] = {}
+                groups: Dict[str, List[Tuple[str, backtest_engine.RebalanceSchedule]]] = {}
+                for result_id, spec in specs.items():
+                    key = spec["factor_id"] or (spec["formula"], spec["formula_language"])
+                    try:
+                        if key not in signals:
+                            signals[key] = await self._signal_values(spec, dataset, panel)
+                        prices = self._prices(panel, spec, start, stop)
+                    except BacktestError as e:
+                        updates[result_id] = {"status": BacktestStatus.FAILED.value, "metrics": {"error": str(e)}}
+                        continue
+                    schedule = self._schedule(spec, signals[key][start:stop], prices)
+                    groups.setdefault(spec["price_field"], []).append((result_id, schedule))
+
+                for price_field, members in groups.items():
+                    traded = panel.field(price_field)[start:stop]
+                    runs = backtest_engine.simulate_batch(
+                        traded,
+                        [schedule for _, schedule in members],
+                        float(config.initial_capital),
+                        float(config.commission_rate),
+                        float(config.slippage)
+                    )
+                    # Relative metrics of all strategies with one benchmark in one pass
+                    relative: Dict[str, Dict[str, Any]] = {}
+                    by_benchmark: Dict[str, List[int]] = {}
+                    for index, (result_id, _) in enumerate(members):
+                        benchmark = (config_of[result_id].config_params or {}).get("benchmark")
+                        if benchmark:
+                            by_benchmark.setdefault(benchmark, []).append(index)
+                    for benchmark, indices in by_benchmark.items():
+                        fields = self._relative_fields(
+                            dataset, panel, benchmark, price_field,
+                            np.stack([runs[index].returns for index in indices]), start
+                        )
+                        relative.update({members[index][0]: f for index, f in zip(indices, fields)})
+
+                    for (result_id, _), run in zip(members, runs):
+                        payload = self._result_payload(specs[result_id], panel, start, stop, run)
+                        payload["metrics"]["dataset_version"] = dataset.version
+                        payload["artifact_path"] = self.result_store.write(
+                            result_id, self._artifacts(panel, start, stop, run, traded)
+                        )
+                        payload["fingerprint"] = fingerprints[result_id]
+                        payload.update(relative.get(result_id, {}))
+                        updates[result_id] = self._completed_fields(payload)
+        except Exception as e:
+            logger.error(f"Batch backtest of {len(pending)} results failed: {e}")
+            await self.repository.update_results({
+                result_id: {"status": BacktestStatus.FAILED.value, "metrics": {"error": str(e)}}
+                for result_id in pending
+            })
+            raise
+
+        stored = {result.id: result for result in await self.repository.update_results(updates)}
+        logger.info(
+            f"Batch backtest completed: {sum(u['status'] == BacktestStatus.COMPLETED.value for u in updates.values())} "
+            f"of {len(pending)} strategies"
+        )
+        return [stored.get(result_id, results[result_id]) for result_id in result_ids]
+
+    async def compute_relative_metrics(
+        self,
+        result_ids: List[str],
+        benchmark: Optional[str] = None
+    ) -> List[BacktestResult]:
+        """
+        Compute benchmark-relative metrics of completed results in bulk.
+
+        Results are grouped by dataset, benchmark and traded price field.
+        Each group's dataset is loaded and its benchmark aligned once, the
+        stored daily returns of its results are placed on the dataset
+        calendar as one matrix and the metrics of all of them are computed
+        in one pass. All results are written in one transaction.
+
+        Args:
+            result_ids: Result IDs
+            benchmark: Benchmark of all results (default: each configuration's
+                config_params["benchmark"]; results without one are left unchanged)
+
+        Returns:
+            BacktestResult instances in the order of result_ids
+
+        Raises:
+            ResourceNotFoundError: If a result, configuration or dataset is missing
+            InvalidConfigError: If a result is not completed or a benchmark
+                is not in its dataset
+        """
+        results = {result.id: result for result in await self.repository.get_results_by_ids(result_ids)}
+        missing = [result_id for result_id in result_ids if result_id not in results]
+        if missing:
+            raise ResourceNotFoundError(f"Backtest results not found: {', '.join(missing)}")
+        unfinished = [r.id for r in results.values() if r.status != BacktestStatus.COMPLETED.value]
+        if unfinished:
+            raise InvalidConfigError(f"Backtest results not completed: {', '.join(unfinished)}")
+
+        configs = {
+            config.id: config
+            for config in await self.repository.get_configs_by_ids(
+                list({result.config_id for result in results.values()})
+            )
+        }
+        groups: Dict[Tuple[str, str, str], List[BacktestResult]] = {}
+        for result in results.values():
+            config = configs.get(result.config_id)
+            if not config:
+                raise ResourceNotFoundError(f"Configuration {result.config_id} not found")
+            name = benchmark or (config.config_params or {}).get("benchmark")
+            if not name:
+                continue
+            price_field = ((result.metrics or {}).get("signal") or {}).get("price_field", "close")
+            groups.setdefault((config.dataset_id, name, price_field), []).append(result)
+
+        updates: Dict[str, Dict[str, Any]] = {}
+        panels: Dict[str, Tuple[Any, DatasetPanel]] = {}
+        for (dataset_id, name, price_field), members in groups.items():
+            if dataset_id not in panels:
+                dataset = await self.dataset_repo.get(dataset_id)
+                if not dataset:
+                    raise ResourceNotFoundError(f"Dataset {dataset_id} not found")
+                panels[dataset_id] = (dataset, load_dataset_panel(dataset.file_path))
+            dataset, panel = panels[dataset_id]
+
+            calendar = panel.dates.astype("datetime64[D]")
+            matrix = np.full((len(members), len(calendar)), np.nan)
+            stored = []
+            for result in members:
+                try:
+                    series = result_columns(self.result_store, result, "equity", ["date", "returns"])
+                except KeyError:
+                    series = None
+                if series is None:
+                    logger.warning(f"Backtest result {result.id} has no stored returns")
+                    continue
+                rows = np.searchsorted(calendar, series["date"])
+                on_calendar = (rows < len(calendar)) & (calendar[np.minimum(rows, len(calendar) - 1)] == series["date"])
+                matrix[len(stored), rows[on_calendar]] = series["returns"][on_calendar]
+                stored.append(result.id)
+
+            if stored:
+                fields = self._relative_fields(dataset, panel, name, price_field, matrix[:len(stored)], 0)
+                updates.update(zip(stored, fields))
+
+        if not updates:
+            return [results[result_id] for result_id in result_ids]
+        updated = {result.id: result for result in await self.repository.update_results(updates)}
+        logger.info(f"Computed relative metrics of {len(updates)} backtest results")
+        return [updated.get(result_id, results[result_id]) for result_id in result_ids]
+
+    async def run_optimization(
+        self,
+        strategy_id: str,
+        dataset_id: str,
+        options: Dict[str, Any],
+        progress: Optional[SweepProgressCallback] = None
+    ) -> Dict[str, Any]:
+        """
+        Backtest a strategy's signal over a parameter grid or random search space.
+
+        The strategy's ``parameters["signal"]`` is the base configuration;
+        each candidate overrides signal options (top_k, rebalance_period,
+        ...) and fills ``{name}`` placeholders in its formula. Candidates run
+        in parallel on a process pool that reads the panel from shared memory.
+        With search_mode "halving" or "hyperband" candidates first compete
+        on short windows and only the best are backtested over the full range.
+
+        Args:
+            strategy_id: Strategy instance ID
+            dataset_id: Dataset ID
+            options: Run options (see OPTIMIZATION_DEFAULTS)
+            progress: Async callback receiving (done, total, leaderboard)
+                as candidates finish
+
+        Returns:
+            Dict with the leaderboard (best first), failed candidates, the
+            promotion history (adaptive search modes only) and a run summary
+
+        Raises:
+            ResourceNotFoundError: If the strategy or dataset is missing
+            InvalidConfigError: If the options or a candidate's signal are invalid
+            BacktestExecutionError: If the date range has fewer than 2 dates
+        """
+        options = self.validate_optimization_options(options)
+        costs = self._optimization_costs(options)
+        leaderboard = Leaderboard(options["objective"], options["leaderboard_size"])
+
+        strategy = await self.strategy_repo.get(strategy_id)
+        if not strategy:
+            raise ResourceNotFoundError(f"Strategy {strategy_id} not found")
+        base = (strategy.parameters or {}).get("signal")
+        if not isinstance(base, dict):
+            raise InvalidConfigError("Strategy has no parameters.signal to optimize")
+        base = self._validate_signal(base)
+
+        if options["grid"]:
+            candidates = expand_grid(options["grid"])
+        else:
+            candidates = sample_space(options["space"], options["n_samples"], options["seed"])
+        specs = [self._validate_signal(apply_parameters(base, params)) for params in candidates]
+
+        dataset = await self.dataset_repo.get(dataset_id)
+        if not dataset:
+            raise ResourceNotFoundError(f"Dataset {dataset_id} not found")
+        panel = load_dataset_panel(dataset.file_path)
+        rows = self._date_rows(panel, options["start_date"], options["end_date"])
+
+        # A signal no parameter changes is evaluated once and shared
+        signal = None
+        if not formula_placeholders(base["formula"]):
+            signal = await self._signal_values(base, dataset, panel)
+            specs = [{**spec, "formula": None} for spec in specs]
+
+        sweep = ParameterSweep(max_workers=options["max_workers"])
+        if options["search_mode"] == "full":
+            result = await sweep.run(
+                panel, specs, candidates, rows, costs,
+                leaderboard=leaderboard, signal=signal, progress=progress
+            )
+        else:
+            result = await sweep.run_halving(
+                panel, specs, candidates, rows, costs,
+                leaderboard=leaderboard,
+                eta=options["eta"],
+                min_window=options["min_window"],
+                hyperband=options["search_mode"] == "hyperband",
+                signal=signal,
+                progress=progress
+            )
+
+        dates = panel.dates[rows[0]:rows[1]]
+        logger.info(
+            f"Optimized strategy {strategy_id} over {len(candidates)} candidates; "
+            f"best {leaderboard.objective}: "
+            f"{leaderboard.best['metrics'][leaderboard.objective] if leaderboard.best else None}"
+        )
+        return {
+            "strategy_id": strategy_id,
+            "dataset_id": dataset_id,
+            "dataset_version": dataset.version,
+            "signal": base,
+            "search": "grid" if options["grid"] else "random",
+            "search_mode": options["search_mode"],
+            "objective": leaderboard.objective,
+            "start_date": str(dates[0])[:10],
+            "end_date": str(dates[-1])[:10],
+            "leaderboard": result["leaderboard"],
+            "failed": result["failed"][:MAX_REPORTED_FAILURES],
+            "history": result.get("history"),
+            "summary": result["summary"],
+        }
+
+    @classmethod
+    def validate_optimization_options(cls, options: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Check optimization options without touching the strategy or data.
+
+        Args:
+            options: Run options (see OPTIMIZATION_DEFAULTS)
+
+        Returns:
+            Options merged with defaults
+
+        Raises:
+            InvalidConfigError: If an option is unknown or invalid
+        """
+        unknown = set(options) - set(OPTIMIZATION_DEFAULTS)
+        if unknown:
+            raise InvalidConfigError(f"Unknown optimization options: {', '.join(sorted(unknown))}")
+        options = {**OPTIMIZATION_DEFAULTS, **options}
+        if bool(options["grid"]) == bool(options["space"]):
+            raise InvalidConfigError("Optimization needs exactly one of grid or space")
+        if options["search_mode"] not in SEARCH_MODES:
+            raise InvalidConfigError(f"search_mode must be one of {', '.join(SEARCH_MODES)}")
+        if not isinstance(options["eta"], int) or options["eta"] < 2:
+            raise InvalidConfigError("eta must be an integer of at least 2")
+        if not isinstance(options["min_window"], int) or options["min_window"] < 2:
+            raise InvalidConfigError("min_window must be an integer of at least 2 dates")
+        cls._optimization_costs(options)
+        Leaderboard(options["objective"], options["leaderboard_size"])
+        return options
+
+    @staticmethod
+    def _optimization_costs(options: Dict[str, Any]) -> Tuple[float, float, float]:
+        """(initial capital, commission rate, slippage) of optimization options."""
+        try:
+            capital = float(options["initial_capital"])
+            commission = float(options["commission_rate"])
+            slippage = float(options["slippage"])
+        except (TypeError, ValueError) as e:
+            raise InvalidConfigError(f"Invalid capital or cost option: {e}") from e
+        if capital <= 0:
+            raise InvalidConfigError("initial_capital must be positive")
+        if not (0 <= commission <= 1 and 0 <= slippage <= 1):
+            raise InvalidConfigError("commission_rate and slippage must be between 0 and 1")
+        return capital, commission, slippage
+
+    async def run_walk_forward(
+        self,
+        result_id: str,
+        options: Optional[Dict[str, Any]] = None,
+        progress: Optional[FoldProgressCallback] = None
+    ) -> Dict[str, Any]:
+        """
+        Walk-forward analysis of a backtest's strategy over its date range.
+
+        The range is split into rolling (or anchored) in-sample /
+        out-of-sample folds; each fold backtests the candidates in-sample,
+        selects the best and backtests it out-of-sample. Folds run in
+        parallel over one loaded panel. The deflated Sharpe ratio is
+        computed from the result's stored daily returns when available,
+        otherwise from the concatenated out-of-sample returns.
+
+        Args:
+            result_id: Result ID (its configuration gives the signal, dataset,
+                dates, capital and costs)
+            options: Analysis options (see WALK_FORWARD_DEFAULTS)
+            progress: Async callback receiving (done, total, fold result)
+
+        Returns:
+            Dict with the signal, period, options, per-fold results and the
+            summary of walk_forward.walk_forward_summary
+
+        Raises:
+            ResourceNotFoundError: If the result, configuration or dataset is missing
+            InvalidConfigError: If the options or the signal are invalid
+            BacktestExecutionError: If the date range is too short for the folds
+        """
+        options = self.validate_walk_forward_options(options or {})
+        result = await self.repository.get_result_by_id(result_id)
+        if not result:
+            raise ResourceNotFoundError(f"Backtest result {result_id} not found")
+        config = await self.repository.get_config_by_id(result.config_id)
+        if not config:
+            raise ResourceNotFoundError(f"Configuration {result.config_id} not found")
+
+        base = await self._resolve_signal(config)
+        candidates = expand_grid(options["grid"]) if options["grid"] else [{}]
+        specs = [self._validate_signal(apply_parameters(base, params)) for params in candidates]
+
+        dataset = await self.dataset_repo.get(config.dataset_id)
+        if not dataset:
+            raise ResourceNotFoundError(f"Dataset {config.dataset_id} not found")
+        panel = load_dataset_panel(dataset.file_path)
+        rows = self._date_rows(panel, config.start_date, config.end_date)
+        folds = walk_forward_folds(
+            rows[1] - rows[0], options["n_folds"], options["in_sample_ratio"], options["anchored"]
+        )
+
+        # A signal no parameter changes is evaluated once and shared
+        signal = None
+        if not formula_placeholders(base["formula"]):
+            signal = await self._signal_values(base, dataset, panel)
+            specs = [{**spec, "formula": None} for spec in specs]
+
+        costs = (float(config.initial_capital), float(config.commission_rate), float(config.slippage))
+        fold_results = await run_folds(
+            panel, folds, specs, candidates, rows, costs,
+            objective=options["objective"],
+            signal=signal,
+            max_workers=options["max_workers"],
+            progress=progress
+        )
+
+        series = result_columns(self.result_store, result, "equity")
+        returns = series["returns"] if series is not None and "returns" in series else None
+        n_trials = options["n_trials"] or len(candidates)
+        summary = walk_forward_summary(fold_results, n_trials, returns)
+        for fold in fold_results:
+            fold.pop("out_of_sample_returns", None)
+            fold["failed"] = fold["failed"][:MAX_REPORTED_FAILURES]
+
+        dates = panel.dates[rows[0]:rows[1]]
+        logger.info(
+            f"Walk-forward analysis of result {result_id}: {summary['completed_folds']}/{len(folds)} folds, "
+            f"IS Sharpe {summary['in_sample_sharpe']}, OOS Sharpe {summary['out_of_sample_sharpe']}"
+        )
+        return {
+            "result_id": result_id,
+            "signal": base,
+            "dataset_version": dataset.version,
+            "start_date": str(dates[0])[:10],
+            "end_date": str(dates[-1])[:10],
+            "options": options,
+            "folds": fold_results,
+            "summary": summary,
+        }
+
+    @classmethod
+    def validate_walk_forward_options(cls, options: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Check walk-forward options without touching the result or data.
+
+        Args:
+            options: Analysis options (see WALK_FORWARD_DEFAULTS)
+
+        Returns:
+            Options merged with defaults
+
+        Raises:
+            InvalidConfigError: If an option is unknown or invalid
+        """
+        unknown = set(options) - set(WALK_FORWARD_DEFAULTS)
+        if unknown:
+            raise InvalidConfigError(f"Unknown walk-forward options: {', '.join(sorted(unknown))}")
+        options = {**WALK_FORWARD_DEFAULTS, **options}
+        if not isinstance(options["n_folds"], int) or options["n_folds"] < 1:
+            raise InvalidConfigError("n_folds must be a positive integer")
+        if not isinstance(options["in_sample_ratio"], (int, float)) or not 0 < options["in_sample_ratio"] < 1:
+            raise InvalidConfigError("in_sample_ratio must be between 0 and 1")
+        if options["n_trials"] is not None and (not isinstance(options["n_trials"], int) or options["n_trials"] < 1):
+            raise InvalidConfigError("n_trials must be a positive integer")
+        if options["grid"]:
+            expand_grid(options["grid"])
+        Leaderboard(options["objective"], 1)
+        return options
+
+    @staticmethod
+    def _date_rows(
+        panel: DatasetPanel,
+        start_date: Optional[Union[date, str]],
+        end_date: Optional[Union[date, str]]
+    ) -> Tuple[int, int]:
+        """Panel rows [start, stop) of an inclusive date range (None: open ended)."""
+        start = 0 if start_date is None else int(
+            np.searchsorted(panel.dates, np.datetime64(pd.Timestamp(start_date)), "left")
+        )
+        stop = len(panel.dates) if end_date is None else int(
+            np.searchsorted(panel.dates, np.datetime64(pd.Timestamp(end_date)), "right")
+        )
+        if stop - start < 2:
+            raise BacktestExecutionError(
+                f"Dataset has fewer than 2 dates between {start_date} and {end_date}"
+            )
+        return start, stop
+
+    async def backtest_fingerprint(
+        self,
+        config: BacktestConfig,
+        spec: Dict[str, Any],
+        dataset
+    ) -> str:
+        """
+        Fingerprint of everything that determines a backtest's results.
+
+        Covers the strategy's latest generated code (``CodeGeneration.code_hash``),
+        the resolved signal (and the formula of a custom factor signal), the
+        dataset version, date range, capital, costs, config_params and the
+        engine version (``backtest_engine.ENGINE_VERSION``). Runs with equal
+        fingerprints produce equal results.
+
+        Args:
+            config: Backtest configuration
+            spec: Resolved signal configuration (see _resolve_signal)
+            dataset: Dataset record
+
+        Returns:
+            SHA-256 hex digest
+
+        Raises:
+            ResourceNotFoundError: If the signal's custom factor is missing
+        """
+        generation = await self.code_generation_repo.get_latest_by_instance(config.strategy_id)
+        factor_formula = None
+        if spec["factor_id"]:
+            factor = await self.custom_factor_repo.get(spec["factor_id"])
+            if not factor:
+                raise ResourceNotFoundError(f"Factor {spec['factor_id']} not found")
+            factor_formula = [factor.formula, factor.formula_language]
+
+        inputs = {
+            "engine_version": backtest_engine.ENGINE_VERSION,
+            "code_hash": generation.code_hash if generation else None,
+            "signal": spec,
+            "factor_formula": factor_formula,
+            "dataset_id": config.dataset_id,
+            "dataset_version": dataset.version,
+            "start_date": config.start_date.isoformat(),
+            "end_date": config.end_date.isoformat(),
+            "initial_capital": str(Decimal(str(config.initial_capital)).normalize()),
+            "commission_rate": str(Decimal(str(config.commission_rate)).normalize()),
+            "slippage": str(Decimal(str(config.slippage)).normalize()),
+            "config_params": config.config_params or {},
+        }
+        encoded = json.dumps(inputs, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    async def _find_reusable(
+        self,
+        config: BacktestConfig,
+        spec: Dict[str, Any],
+        dataset
+    ) -> Optional[BacktestResult]:
+        """Latest completed result with the same fingerprint, if any."""
+        fingerprint = await self.backtest_fingerprint(config, spec, dataset)
+        return await self.repository.find_completed_by_fingerprint(fingerprint)
+
+    async def _resolve_signal(self, config: BacktestConfig) -> Dict[str, Any]:
+        """Signal configuration merged with defaults and validated."""
+        spec = (config.config_params or {}).get("signal")
+        if spec is None:
+            strategy = await self.strategy_repo.get(config.strategy_id)
+            spec = (strategy.parameters or {}).get("signal") if strategy else None
+        if not isinstance(spec, dict):
+            raise InvalidConfigError(
+                "No signal configured: set config_params.signal or the strategy's parameters.signal"
+            )
+        return self._validate_signal(spec)
+
+    @staticmethod
+    def _validate_signal(spec: Dict[str, Any]) -> Dict[str, Any]:
+        """Signal configuration merged with defaults; raises InvalidConfigError if invalid."""
+        return validate_signal(spec)
+
+    async def _signal_values(
+        self,
+        spec: Dict[str, Any],
+        dataset,
+        panel: DatasetPanel
+    ) -> np.ndarray:
+        """Evaluate the signal over the whole dataset (so lookbacks are warm)."""
+        try:
+            if spec["factor_id"]:
+                factor = await self.custom_factor_repo.get(spec["factor_id"])
+                if not factor:
+                    raise ResourceNotFoundError(f"Factor {spec['factor_id']} not found")
+                plan = compile_formula(factor.formula, factor.formula_language)
+                return self.factor_store.materialize(
+                    factor.id, plan, dataset.id, dataset.version, panel
+                ).values
+            return compile_formula(spec["formula"], spec["formula_language"]).evaluate(panel)["factor"]
+        except (FormulaCompileError, FactorEvaluationError) as e:
+            raise InvalidConfigError(f"Invalid signal: {e}") from e
+
+    @staticmethod
+    def _run_engine(
+        config: BacktestConfig,
+        spec: Dict[str, Any],
+        panel: DatasetPanel,
+        signal: np.ndarray
+    ) -> Tuple[Dict[str, Any], Dict[str, Dict[str, np.ndarray]]]:
+        """Simulate the configured date range; returns complete_backtest metrics and the run's artifacts."""
+        start, stop = BacktestExecutionService._date_rows(panel, config.start_date, config.end_date)
+        prices = BacktestExecutionService._prices(panel, spec, start, stop)
+        schedule = BacktestExecutionService._schedule(spec, signal[start:stop], prices)
+        run = backtest_engine.simulate(
+            prices, schedule, float(config.initial_capital),
+            float(config.commission_rate), float(config.slippage)
+        )
+        return (
+            BacktestExecutionService._result_payload(spec, panel, start, stop, run),
+            BacktestExecutionService._artifacts(panel, start, stop, run, prices)
+        )
+
+    @staticmethod
+    def _prices(panel: DatasetPanel, spec: Dict[str, Any], start: int, stop: int) -> np.ndarray:
+        """Traded prices of a signal over panel rows [start, stop)."""
+        try:
+            return panel.field(spec["price_field"])[start:stop]
+        except KeyError as e:
+            raise InvalidConfigError(str(e.args[0])) from e
+
+    @staticmethod
+    def _schedule(
+        spec: Dict[str, Any],
+        signal: np.ndarray,
+        prices: np.ndarray
+    ) -> backtest_engine.RebalanceSchedule:
+        """Target weights of a signal configuration."""
+        return backtest_engine.target_weights(
+            signal, prices, spec["mode"], spec["top_k"],
+            bool(spec["long_short"]), spec["rebalance_period"]
+        )
+
+    @staticmethod
+    def _result_payload(
+        spec: Dict[str, Any],
+        panel: DatasetPanel,
+        start: int,
+        stop: int,
+        run: backtest_engine.BacktestRun
+    ) -> Dict[str, Any]:
+        """complete_backtest metrics of an engine run over panel rows [start, stop)."""
+        summary = backtest_engine.performance_metrics(run)
+
+        return {
+            "total_return": _decimal(summary["total_return"], 6),
+            "annual_return": _decimal(summary["annual_return"], 6),
+            "sharpe_ratio": _decimal(summary["sharpe_ratio"], 4),
+            "max_drawdown": _decimal(summary["max_drawdown"], 6),
+            "win_rate": _decimal(summary["win_rate"], 6),
+            "metrics": {
+                **summary,
+                "signal": spec,
+                "start_date": str(panel.dates[start])[:10],
+                "end_date": str(panel.dates[stop - 1])[:10],
+                "n_dates": stop - start,
+            },
+            "trades": backtest_engine.trade_statistics(run.trades),
+        }
+
+    @staticmethod
+    def _relative_fields(
+        dataset,
+        panel: DatasetPanel,
+        benchmark: str,
+        price_field: str,
+        returns: np.ndarray,
+        start: int
+    ) -> List[Dict[str, Any]]:
+        """Relative metric columns of (n_results, n_dates) returns from panel row ``start`` on."""
+        if not isinstance(benchmark, str):
+            raise InvalidConfigError("config_params.benchmark must be an instrument code or 'equal_weight'")
+        aligned = aligned_benchmark_returns((dataset.id, dataset.version), panel, benchmark, price_field)
+        values = relative_metrics(returns, aligned[start:start + returns.shape[1]])
+        return [
+            {
+                "benchmark": benchmark,
+                **{
+                    field: _optional_decimal(values[field][index], places)
+                    for field, places in RELATIVE_PLACES.items()
+                },
+            }
+            for index in range(returns.shape[0])
+        ]
+
+    @staticmethod
+    def _artifacts(
+        panel: DatasetPanel,
+        start: int,
+        stop: int,
+        run: backtest_engine.BacktestRun,
+        prices: np.ndarray
+    ) -> Dict[str, Dict[str, np.ndarray]]:
+        """Result store columns of an engine run over panel rows [start, stop) at the traded prices."""
+        dates = panel.dates[start:stop].astype("datetime64[D]")
+        instruments = np.asarray(panel.instruments, dtype=str)
+        trades = run.trades
+        holdings = backtest_engine.position_history(trades, stop - start)
+        trips = backtest_engine.round_trips(trades, prices)
+        exit_dates = np.where(
+            trips["closed"], dates[np.maximum(trips["exit_index"], 0)], np.datetime64("NaT", "D")
+        )
+        return {
+            "equity": {
+                "date": dates,
+                "equity": run.equity,
+                "cash": run.cash,
+                "returns": run.returns,
+                "turnover": run.turnover,
+            },
+            "positions": {
+                "date": dates[holdings["date_index"]],
+                "instrument": instruments[holdings["instrument_index"]],
+                "shares": holdings["shares"],
+            },
+            "trades": {
+                "date": dates[trades["date_index"]],
+                "instrument": instruments[trades["instrument_index"]],
+                "quantity": trades["quantity"],
+                "price": trades["price"],
+                "value": trades["value"],
+                "commission": trades["commission"],
+                "pnl": trades["pnl"],
+            },
+            "round_trips": {
+                "date": dates[trips["entry_index"]],
+                "exit_date": exit_dates,
+                "instrument": instruments[trips["instrument_index"]],
+                **{
+                    column: trips[column]
+                    for column in backtest_engine.ROUND_TRIP_FIELDS
+                    if column not in ("entry_index", "exit_index", "instrument_index")
+                },
+            },
+        }
+
+
+def validate_signal(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Merge a signal configuration with SIGNAL_DEFAULTS and validate it.
+
+    Raises:
+        InvalidConfigError: If keys are unknown or values invalid
+    """
+    resolved = {**SIGNAL_DEFAULTS, **spec}
+    unknown = set(resolved) - set(SIGNAL_DEFAULTS)
+    if unknown:
+        raise InvalidConfigError(f"Unknown signal keys: {', '.join(sorted(unknown))}")
+    if bool(resolved["formula"]) == bool(resolved["factor_id"]):
+        raise InvalidConfigError("Signal needs exactly one of formula or factor_id")
+    if resolved["mode"] not in ("score", "weight"):
+        raise InvalidConfigError("Signal mode must be 'score' or 'weight'")
+    for key in ("top_k", "rebalance_period"):
+        if not isinstance(resolved[key], int) or resolved[key] < 1:
+            raise InvalidConfigError(f"{key} must be a positive integer")
+    return resolved
+
+
+def _decimal(value: float, places: int) -> Decimal:
+    """Round a float into a Decimal for a Numeric column."""
+    return Decimal(str(round(float(value), places)))
+
+
+def _optional_decimal(value: float, places: int) -> Optional[Decimal]:
+    """_decimal of a finite float, None for NaN or infinity."""
+    return _decimal(value, places) if np.isfinite(value) else None
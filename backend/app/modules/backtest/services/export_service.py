@@ -2,25 +2,67 @@
 Export Service
 
 Provides functionality for exporting backtest results in various formats:
-- PDF reports
-- Excel data exports
+- Excel workbooks of the summary, equity curve, trades and round trips
+- PDF and HTML reports with equity and drawdown charts
 - Chart exports (PNG/SVG)
+
+Reports are rendered by report_writer off the event loop. build_report
+stores each format once per result next to its artifacts in the result
+store (``report.xlsx``, ``report.pdf``, ``report.html``), together with a
+stamp of the result's contents in the ``reports`` document, so repeated
+downloads reuse the file until the result changes. The export_report task
+builds them in the background with progress on the Task record.
 """
 
-from typing import Dict, Any, List
+import asyncio
+import hashlib
+import json
+from contextlib import asynccontextmanager
+from decimal import Decimal
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
 from pathlib import Path
 from datetime import datetime
-import json
+from types import SimpleNamespace
+
+import numpy as np
 
 from app.database.repositories.backtest_repository import BacktestRepository
-from app.modules.backtest.exceptions import ResourceNotFoundError
+from app.modules.backtest.exceptions import InvalidConfigError, ResourceNotFoundError
+from app.modules.backtest.services import report_writer
+from app.modules.backtest.services.result_store import BacktestResultStore, get_result_store, result_columns
+
+# Report format -> file name in the result store
+REPORT_FORMATS: Dict[str, str] = {"xlsx": "report.xlsx", "pdf": "report.pdf", "html": "report.html"}
+
+REPORT_MEDIA_TYPES: Dict[str, str] = {
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "pdf": "application/pdf",
+    "html": "text/html",
+}
+
+# Series written to the Excel report: artifact -> sheet title
+EXCEL_SERIES: Dict[str, str] = {"equity": "Equity", "trades": "Trades", "round_trips": "Round Trips"}
+
+# Result store document of the stored reports
+REPORTS_DOCUMENT = "reports"
+
+# Async progress callback: (fraction done in [0, 1], step description)
+ExportProgressCallback = Callable[[float, str], Awaitable[Any]]
 
 
 class ExportService:
     """Service for exporting backtest results."""
 
-    def __init__(self, repository: BacktestRepository):
+    def __init__(self, repository: BacktestRepository, result_store: Optional[BacktestResultStore] = None):
         self.repository = repository
+        self._result_store = result_store
+
+    @property
+    def result_store(self) -> BacktestResultStore:
+        """Store of the series and the cached reports."""
+        if self._result_store is None:
+            self._result_store = get_result_store()
+        return self._result_store
 
     async def generate_pdf_report(self, result_id: str, output_path: str) -> str:
         """
@@ -33,53 +75,28 @@ class ExportService:
         Returns:
             Path to the generated PDF file
         """
-        result = await self.repository.get_result_by_id(result_id)
-        if not result:
-            raise ResourceNotFoundError(f"Backtest result {result_id} not found")
-
-        # Ensure output directory exists
-        output_file = Path(output_path)
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-
-        # Generate PDF content (simplified implementation)
-        # In production, use libraries like reportlab or weasyprint
-        pdf_content = self._generate_pdf_content(result)
+        return await self._render_to(result_id, "pdf", output_path)
 
-        # Write PDF file (mock implementation - writes text for now)
-        with open(output_file, 'wb') as f:
-            # Write PDF header
-            f.write(b'%PDF-1.4\n')
-            f.write(pdf_content.encode('utf-8'))
-            f.write(b'\n%%EOF\n')
+    async def generate_html_report(self, result_id: str, output_path: str) -> str:
+        """
+        Generate a self-contained HTML report for backtest result.
 
-        return str(output_file)
+        Args:
+            result_id: The backtest result ID
+            output_path: Path to save the HTML file
 
-    def _generate_pdf_content(self, result) -> str:
-        """Generate PDF content from backtest result."""
-        content = f"""
-Backtest Report
-===============
-
-Result ID: {result.id}
-Status: {result.status}
-Configuration ID: {result.config_id}
-
-Performance Metrics
--------------------
-Total Return: {result.total_return}
-Annual Return: {result.annual_return}
-Sharpe Ratio: {result.sharpe_ratio}
-Max Drawdown: {result.max_drawdown}
-Win Rate: {result.win_rate}
-
-Generated: {datetime.utcnow().isoformat()}
-"""
-        return content
+        Returns:
+            Path to the generated HTML file
+        """
+        return await self._render_to(result_id, "html", output_path)
 
     async def export_to_excel(self, result_id: str, output_path: str) -> str:
         """
         Export backtest data to Excel format.
 
+        The workbook has a Summary sheet and Equity, Trades and Round Trips
+        sheets for the series the result has stored.
+
         Args:
             result_id: The backtest result ID
             output_path: Path to save the Excel file
@@ -87,48 +104,226 @@ Generated: {datetime.utcnow().isoformat()}
         Returns:
             Path to the generated Excel file
         """
-        result = await self.repository.get_result_by_id(result_id)
-        if not result:
-            raise ResourceNotFoundError(f"Backtest result {result_id} not found")
+        return await self._render_to(result_id, "xlsx", output_path)
 
-        # Ensure output directory exists
-        output_file = Path(output_path)
-        output_file.parent.mkdir(parents=True, exist_ok=True)
+    async def build_report(
+        self,
+        result_id: str,
+        report_format: str,
+        progress: Optional[ExportProgressCallback] = None
+    ) -> Dict[str, Any]:
+        """
+        Render a report into the result store, or reuse the stored one.
+
+        Args:
+            result_id: The backtest result ID
+            report_format: xlsx, pdf or html
+            progress: Async callback receiving (fraction done, step) while rendering
+
+        Returns:
+            Dict with result_id, format, path, size (bytes) and cached
+            (True if the stored report was still current)
 
-        # Generate Excel content (simplified implementation)
-        # In production, use libraries like openpyxl or xlsxwriter
-        excel_content = self._generate_excel_content(result)
+        Raises:
+            ResourceNotFoundError: If the result is not found
+            InvalidConfigError: If the format is unknown
+        """
+        self._check_format(report_format)
+        source, summary = await self._source(result_id)
+        stamp = self._stamp(source, summary)
+        stored = self._stored_report(result_id, report_format, stamp)
+        if stored is not None:
+            return {**stored, "cached": True}
+
+        async with self._thread_progress(progress) as callback:
+            path = await asyncio.to_thread(
+                self.result_store.write_file, result_id, REPORT_FORMATS[report_format],
+                lambda target: self._write(source, summary, report_format, target, callback)
+            )
+        entry = {
+            "file": path.name,
+            "stamp": stamp,
+            "size": path.stat().st_size,
+            "created_at": datetime.utcnow().isoformat(),
+        }
+        reports = self.result_store.read_document(result_id, REPORTS_DOCUMENT) or {}
+        reports[report_format] = entry
+        self.result_store.write_document(result_id, REPORTS_DOCUMENT, reports)
+        return {
+            "result_id": result_id, "format": report_format, "path": str(path),
+            "size": entry["size"], "cached": False,
+        }
 
-        # Write Excel file (mock implementation - creates a valid ZIP/Excel structure)
-        with open(output_file, 'wb') as f:
-            # Write minimal Excel file header (ZIP format)
-            f.write(b'PK\x03\x04')  # ZIP local file header signature
-            f.write(excel_content.encode('utf-8'))
+    async def get_cached_report(self, result_id: str, report_format: str) -> Optional[Dict[str, Any]]:
+        """
+        The stored report of a result if it is still current.
 
+        Returns:
+            Dict with result_id, format, path and size, or None if the report
+            was not built or the result changed since
+
+        Raises:
+            ResourceNotFoundError: If the result is not found
+            InvalidConfigError: If the format is unknown
+        """
+        self._check_format(report_format)
+        source, summary = await self._source(result_id)
+        return self._stored_report(result_id, report_format, self._stamp(source, summary))
+
+    @staticmethod
+    def _check_format(report_format: str) -> None:
+        if report_format not in REPORT_FORMATS:
+            raise InvalidConfigError(
+                f"Unknown report format {report_format}; expected one of {', '.join(REPORT_FORMATS)}"
+            )
+
+    async def _render_to(self, result_id: str, report_format: str, output_path: str) -> str:
+        """Render a report to a given path."""
+        source, summary = await self._source(result_id)
+        output_file = Path(output_path)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        await asyncio.to_thread(self._write, source, summary, report_format, output_file, None)
         return str(output_file)
 
-    def _generate_excel_content(self, result) -> str:
-        """Generate Excel content from backtest result."""
-        # Simplified content generation
-        content = f"""
-Sheet: Summary
-Result ID,{result.id}
-Status,{result.status}
-Total Return,{result.total_return}
-Annual Return,{result.annual_return}
-Sharpe Ratio,{result.sharpe_ratio}
-Max Drawdown,{result.max_drawdown}
-Win Rate,{result.win_rate}
-
-Sheet: Metrics
-Metric,Value
-Total Return,{result.total_return}
-Annual Return,{result.annual_return}
-Sharpe Ratio,{result.sharpe_ratio}
-Max Drawdown,{result.max_drawdown}
-Win Rate,{result.win_rate}
-"""
-        return content
+    async def _source(self, result_id: str) -> Tuple[SimpleNamespace, List[Tuple[str, Any]]]:
+        """Detached copy of the fields the writers read (they run off the session's loop) and the summary."""
+        result = await self.repository.get_result_by_id(result_id)
+        if not result:
+            raise ResourceNotFoundError(f"Backtest result {result_id} not found")
+        source = SimpleNamespace(
+            id=result.id,
+            artifact_path=result.artifact_path,
+            fingerprint=result.fingerprint,
+            metrics=result.metrics,
+            trades=result.trades,
+        )
+        return source, self._summary(result)
+
+    @staticmethod
+    def _summary(result) -> List[Tuple[str, Any]]:
+        """Summary rows of a result."""
+        metrics = result.metrics or {}
+        trades = result.trades or {}
+
+        def number(value):
+            return float(value) if isinstance(value, (Decimal, int, float)) else value
+
+        return [
+            ("Result ID", result.id),
+            ("Configuration ID", result.config_id),
+            ("Status", result.status),
+            ("Start date", metrics.get("start_date")),
+            ("End date", metrics.get("end_date")),
+            ("Total return", number(result.total_return)),
+            ("Annual return", number(result.annual_return)),
+            ("Annual volatility", number(metrics.get("annual_volatility"))),
+            ("Sharpe ratio", number(result.sharpe_ratio)),
+            ("Max drawdown", number(result.max_drawdown)),
+            ("Win rate", number(result.win_rate)),
+            ("Final equity", number(metrics.get("final_equity"))),
+            ("Total trades", trades.get("total_trades")),
+            ("Benchmark", result.benchmark),
+            ("Alpha", number(result.alpha)),
+            ("Beta", number(result.beta)),
+            ("Tracking error", number(result.tracking_error)),
+            ("Information ratio", number(result.information_ratio)),
+        ]
+
+    @staticmethod
+    def _stamp(source: SimpleNamespace, summary: List[Tuple[str, Any]]) -> str:
+        """Hash of everything a report is rendered from."""
+        content = [summary, source.artifact_path, source.fingerprint, source.metrics, source.trades]
+        return hashlib.sha256(json.dumps(content, sort_keys=True, default=str).encode()).hexdigest()
+
+    def _stored_report(self, result_id: str, report_format: str, stamp: str) -> Optional[Dict[str, Any]]:
+        """Entry of a stored report matching the stamp whose file exists."""
+        entry = (self.result_store.read_document(result_id, REPORTS_DOCUMENT) or {}).get(report_format)
+        if not entry or entry.get("stamp") != stamp:
+            return None
+        path = self.result_store.file_path(result_id, REPORT_FORMATS[report_format])
+        if not path.exists():
+            return None
+        return {"result_id": result_id, "format": report_format, "path": str(path), "size": entry["size"]}
+
+    @staticmethod
+    @asynccontextmanager
+    async def _thread_progress(
+        progress: Optional[ExportProgressCallback]
+    ) -> AsyncIterator[Optional[report_writer.ReportProgressCallback]]:
+        """
+        Writer progress callback forwarding to an async callback on the current loop.
+
+        Updates are queued and awaited one at a time, so calls never overlap
+        (callbacks typically write to a shared session), and leaving the
+        context waits for the queued ones, so none is still running after.
+        """
+        if progress is None:
+            yield None
+            return
+        loop = asyncio.get_running_loop()
+        updates: "asyncio.Queue[Optional[Tuple[float, str]]]" = asyncio.Queue()
+
+        async def drain() -> None:
+            while True:
+                update = await updates.get()
+                if update is None:
+                    return
+                await progress(*update)
+
+        def forward(fraction: float, step: str) -> None:
+            loop.call_soon_threadsafe(updates.put_nowait, (fraction, step))
+
+        drainer = asyncio.create_task(drain())
+        try:
+            yield forward
+        finally:
+            updates.put_nowait(None)
+            await drainer
+
+    def _write(
+        self,
+        source: SimpleNamespace,
+        summary: List[Tuple[str, Any]],
+        report_format: str,
+        path: Path,
+        progress: Optional[report_writer.ReportProgressCallback]
+    ) -> None:
+        """Read the series and write one report (blocking)."""
+        if progress:
+            progress(0.0, "Reading series")
+        if report_format == "xlsx":
+            sheets = []
+            for name, title in EXCEL_SERIES.items():
+                try:
+                    columns = result_columns(self.result_store, source, name)
+                except KeyError:
+                    columns = None
+                if columns:
+                    sheets.append(report_writer.ReportSheet(title, columns))
+            report_writer.write_excel_report(path, summary, sheets, progress)
+            return
+
+        title = f"Backtest Report {source.id}"
+        charts = self._charts(source)
+        if report_format == "pdf":
+            report_writer.write_pdf_report(path, title, summary, charts, progress)
+        else:
+            report_writer.write_html_report(path, title, summary, charts, progress)
+
+    def _charts(self, source: SimpleNamespace) -> List[report_writer.ReportChart]:
+        """Equity and drawdown charts of a result (none without an equity curve)."""
+        try:
+            curve = result_columns(self.result_store, source, "equity", ["date", "equity"])
+        except KeyError:
+            curve = None
+        if not curve or not len(curve["equity"]):
+            return []
+        equity = curve["equity"].astype(float)
+        drawdown = equity / np.fmax.accumulate(equity) - 1.0
+        return [
+            report_writer.ReportChart("Equity", curve["date"], equity),
+            report_writer.ReportChart("Drawdown", curve["date"], drawdown, percent=True, color=(0.8, 0.2, 0.2)),
+        ]
 
     async def export_chart(
         self,
@@ -272,7 +467,7 @@ Win Rate,{result.win_rate}
         return {
             "result_id": result_id,
             "export_timestamp": datetime.utcnow().isoformat(),
-            "available_formats": ["pdf", "excel", "charts"],
+            "available_formats": ["pdf", "excel", "html", "charts"],
             "chart_types": ["returns", "drawdown", "positions", "trades"],
             "estimated_sizes": {
                 "pdf": "~500KB",
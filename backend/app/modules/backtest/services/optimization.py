@@ -0,0 +1,863 @@
+"""
+Parameter Optimization
+
+Runs many backtests of one signal over a parameter grid or a random search
+space and ranks the candidates on a leaderboard.
+
+A parameter is either a portfolio construction option of the signal
+(SIGNAL_PARAMETERS) or a ``{name}`` placeholder in the signal formula, e.g.
+``"-Ref($close, {lag}) / $close"`` with a ``lag`` parameter. Candidates are
+grouped by their formula so each distinct formula is evaluated once per
+chunk, and groups are split into chunks of at most ``chunk_size``
+candidates that the workers run.
+
+The panel fields the formulas read and the price field are copied once into
+shared memory (``SharedPanel``); worker processes attach to the block
+instead of receiving a pickled copy of the panel per task. A signal that
+does not depend on any parameter (a custom factor, or a formula without
+placeholders) is evaluated once up front and shared as the SHARED_SIGNAL
+field. Where child processes are not allowed (inside a daemonic Celery
+prefork worker) chunks run on a thread pool that shares the panel directly;
+optimization and walk-forward tasks are therefore routed to the
+``optimization`` queue, served by a solo-pool worker
+(start_celery_optimization_worker.sh) whose main process may start the
+process pool.
+
+Results are yielded chunk by chunk as workers finish, so the leaderboard
+and progress can be reported while the sweep runs.
+
+Instead of backtesting every candidate over the full range, a sweep can run
+successive halving or Hyperband over growing windows (``run_halving``):
+most candidates are discarded after a short window and only the best reach
+the full range. Formulas are evaluated up to the last date of the window
+being simulated, which assumes they only look backwards (as a tradable
+signal must).
+"""
+
+import asyncio
+import itertools
+import math
+import multiprocessing
+import random
+import re
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from loguru import logger
+
+from app.modules.backtest.exceptions import InvalidConfigError
+from app.modules.backtest.services import backtest_engine
+from app.modules.data_management.services.dataset_panel import DatasetPanel
+from app.modules.indicator.exceptions import FactorEvaluationError, FormulaCompileError
+from app.modules.indicator.services.factor_batch import SharedPanel, SharedPanelSpec, attach_panel
+from app.modules.indicator.services.factor_compiler import compile_formula
+
+
+# Signal options a sweep may vary; other parameters fill formula placeholders
+SIGNAL_PARAMETERS = ("mode", "top_k", "long_short", "rebalance_period")
+
+# Ranking metrics; True if higher is better
+OBJECTIVES = {
+    "sharpe_ratio": True,
+    "annual_return": True,
+    "total_return": True,
+    "win_rate": True,
+    "max_drawdown": False,
+    "annual_volatility": False,
+}
+
+# Panel field holding a parameter-independent signal
+SHARED_SIGNAL = "__signal__"
+
+DEFAULT_CHUNK_SIZE = 8
+DEFAULT_LEADERBOARD_SIZE = 20
+
+# Successive halving: promotion factor and shortest window (dates)
+DEFAULT_ETA = 3
+DEFAULT_MIN_WINDOW = 60
+MAX_CANDIDATES = 5000
+
+# Metrics kept per candidate
+CANDIDATE_METRICS = (
+    "total_return", "annual_return", "annual_volatility", "sharpe_ratio",
+    "max_drawdown", "win_rate", "mean_turnover", "final_equity",
+)
+
+# Async progress callback: (candidates done, candidates total, leaderboard)
+SweepProgressCallback = Callable[[int, int, List[Dict[str, Any]]], Any]
+
+_PLACEHOLDER = re.compile(r"\{(\w+)\}")
+
+
+# ===================== Search spaces =====================
+
+def expand_grid(grid: Mapping[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """
+    Every combination of a parameter grid.
+
+    Args:
+        grid: Parameter name -> candidate values
+
+    Returns:
+        Parameter dicts, varying the last parameter fastest
+
+    Raises:
+        InvalidConfigError: If the grid is empty, a parameter has no values,
+            or it has more than MAX_CANDIDATES combinations
+    """
+    if not grid:
+        raise InvalidConfigError("Parameter grid is empty")
+    for name, values in grid.items():
+        if not isinstance(values, (list, tuple)) or not values:
+            raise InvalidConfigError(f"Grid parameter '{name}' needs a non-empty list of values")
+    size = math.prod(len(values) for values in grid.values())
+    if size > MAX_CANDIDATES:
+        raise InvalidConfigError(f"Grid has {size} combinations; the limit is {MAX_CANDIDATES}")
+
+    names = list(grid)
+    return [dict(zip(names, combination)) for combination in itertools.product(*grid.values())]
+
+
+def sample_space(
+    space: Mapping[str, Any],
+    n_samples: int,
+    seed: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Random candidates from a search space.
+
+    A dimension is either a list of choices or a range
+    ``{"low": a, "high": b}`` (integers if both bounds are integers,
+    ``"log": true`` to sample on a log scale). Duplicate draws are dropped,
+    so a small discrete space may yield fewer than ``n_samples`` candidates.
+
+    Args:
+        space: Parameter name -> choices or range
+        n_samples: Number of draws
+        seed: Random seed for reproducible sweeps
+
+    Returns:
+        Distinct parameter dicts in draw order
+
+    Raises:
+        InvalidConfigError: If the space or a dimension is malformed
+    """
+    if not space:
+        raise InvalidConfigError("Search space is empty")
+    if not isinstance(n_samples, int) or not 1 <= n_samples <= MAX_CANDIDATES:
+        raise InvalidConfigError(f"n_samples must be between 1 and {MAX_CANDIDATES}")
+
+    samplers = {name: _dimension_sampler(name, dimension) for name, dimension in space.items()}
+    rng = random.Random(seed)
+    candidates: Dict[Tuple, Dict[str, Any]] = {}
+    for _ in range(n_samples):
+        params = {name: sampler(rng) for name, sampler in samplers.items()}
+        candidates.setdefault(tuple(params.values()), params)
+    return list(candidates.values())
+
+
+def _dimension_sampler(name: str, dimension: Any) -> Callable[[random.Random], Any]:
+    """Draw function for one search space dimension."""
+    if isinstance(dimension, (list, tuple)):
+        if not dimension:
+            raise InvalidConfigError(f"Search parameter '{name}' has no choices")
+        return lambda rng: rng.choice(dimension)
+
+    if not isinstance(dimension, dict) or not {"low", "high"} <= set(dimension):
+        raise InvalidConfigError(
+            f"Search parameter '{name}' must be a list of choices or a {{low, high}} range"
+        )
+    low, high = dimension["low"], dimension["high"]
+    if not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in (low, high)) or low > high:
+        raise InvalidConfigError(f"Search parameter '{name}' needs numeric bounds with low <= high")
+    log = bool(dimension.get("log"))
+    if log and low <= 0:
+        raise InvalidConfigError(f"Search parameter '{name}' needs a positive low bound on a log scale")
+
+    integer = isinstance(low, int) and isinstance(high, int)
+    if integer and log:
+        return lambda rng: min(high, max(low, round(math.exp(rng.uniform(math.log(low), math.log(high))))))
+    if integer:
+        return lambda rng: rng.randint(low, high)
+    if log:
+        return lambda rng: math.exp(rng.uniform(math.log(low), math.log(high)))
+    return lambda rng: rng.uniform(low, high)
+
+
+def formula_placeholders(formula: Optional[str]) -> List[str]:
+    """Names of the ``{name}`` placeholders in a formula, in order of appearance."""
+    return list(dict.fromkeys(_PLACEHOLDER.findall(formula or "")))
+
+
+def apply_parameters(spec: Mapping[str, Any], params: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Signal configuration of one candidate.
+
+    Args:
+        spec: Base signal configuration (formula may contain placeholders)
+        params: Candidate parameters
+
+    Returns:
+        Signal configuration with the signal options overridden and the
+        formula placeholders filled in
+
+    Raises:
+        InvalidConfigError: If a parameter is neither a signal option nor a
+            placeholder, or a placeholder has no value
+    """
+    resolved = dict(spec)
+    placeholders = set(formula_placeholders(spec.get("formula")))
+    unknown = sorted(set(params) - set(SIGNAL_PARAMETERS) - placeholders)
+    if unknown:
+        raise InvalidConfigError(
+            f"Parameters {unknown} are neither signal options {list(SIGNAL_PARAMETERS)} "
+            f"nor placeholders in the signal formula"
+        )
+    missing = sorted(placeholders - set(params))
+    if missing:
+        raise InvalidConfigError(f"Formula placeholders without a value: {missing}")
+
+    for name in SIGNAL_PARAMETERS:
+        if name in params:
+            resolved[name] = params[name]
+    if placeholders:
+        resolved["formula"] = _PLACEHOLDER.sub(lambda m: str(params[m.group(1)]), spec["formula"])
+    return resolved
+
+
+# ===================== Leaderboard =====================
+
+class Leaderboard:
+    """
+    Best candidates by one objective, updated as results arrive.
+
+    Candidates whose objective is not finite rank below all others; ties
+    keep arrival order.
+    """
+
+    def __init__(self, objective: str = "sharpe_ratio", size: int = DEFAULT_LEADERBOARD_SIZE):
+        """
+        Initialize the leaderboard.
+
+        Args:
+            objective: Metric to rank by (a key of OBJECTIVES)
+            size: Number of entries kept
+
+        Raises:
+            InvalidConfigError: If the objective is unknown or size is not positive
+        """
+        if objective not in OBJECTIVES:
+            raise InvalidConfigError(f"Unknown objective '{objective}'. Choose one of {sorted(OBJECTIVES)}")
+        if size < 1:
+            raise InvalidConfigError("Leaderboard size must be positive")
+        self.objective = objective
+        self.size = size
+        self._sign = 1.0 if OBJECTIVES[objective] else -1.0
+        self._entries: List[Tuple[float, int, Dict[str, Any]]] = []
+        self._seen = 0
+
+    def score(self, metrics: Mapping[str, Any]) -> float:
+        """Ranking score of a metrics dict (higher is better)."""
+        value = metrics.get(self.objective)
+        if value is None or not math.isfinite(value):
+            return -math.inf
+        return self._sign * value
+
+    def add(self, entry: Dict[str, Any]) -> bool:
+        """
+        Offer a candidate result.
+
+        Args:
+            entry: Result with ``metrics``
+
+        Returns:
+            True if the candidate made the leaderboard
+        """
+        self._seen += 1
+        key = (self.score(entry["metrics"]), -self._seen, entry)
+        if len(self._entries) >= self.size and key[:2] <= self._entries[-1][:2]:
+            return False
+        self._entries.append(key)
+        self._entries.sort(key=lambda item: item[:2], reverse=True)
+        del self._entries[self.size:]
+        return True
+
+    @property
+    def best(self) -> Optional[Dict[str, Any]]:
+        """Best candidate so far."""
+        return self._entries[0][2] if self._entries else None
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Entries best first, with their rank."""
+        return [{"rank": i + 1, **entry} for i, (_, _, entry) in enumerate(self._entries)]
+
+
+# ===================== Workers =====================
+
+def candidate_signal(panel: DatasetPanel, spec: Mapping[str, Any], stop: int) -> np.ndarray:
+    """
+    Signal of a candidate over panel rows [0, stop).
+
+    The formula is evaluated on the panel up to ``stop`` only, so shorter
+    ranges cost less while lookbacks stay warm.
+
+    Args:
+        panel: Full panel (SHARED_SIGNAL holds a parameter-independent signal)
+        spec: Resolved signal configuration (``formula`` None: SHARED_SIGNAL)
+        stop: Row after the last date needed
+
+    Returns:
+        Signal values, rows [0, stop) at least
+
+    Raises:
+        FormulaCompileError, FactorEvaluationError: If the formula is invalid
+        KeyError: If a field is missing from the panel
+    """
+    if spec["formula"] is None:
+        return panel.field(SHARED_SIGNAL)
+    prefix = DatasetPanel(
+        dates=panel.dates[:stop],
+        instruments=panel.instruments,
+        fields={name: values[:stop] for name, values in panel.fields.items()},
+    )
+    return compile_formula(spec["formula"], spec["formula_language"]).evaluate(prefix)["factor"]
+
+
+def simulate_candidate(
+    spec: Mapping[str, Any],
+    signal: np.ndarray,
+    prices: np.ndarray,
+    costs: Tuple[float, float, float]
+) -> backtest_engine.BacktestRun:
+    """Simulate one signal configuration on aligned signal and price rows."""
+    schedule = backtest_engine.target_weights(
+        signal, prices, spec["mode"], spec["top_k"],
+        bool(spec["long_short"]), spec["rebalance_period"]
+    )
+    return backtest_engine.simulate(prices, schedule, *costs)
+
+
+def _run_chunk(
+    panel: DatasetPanel,
+    candidates: List[Tuple[int, Dict[str, Any], Dict[str, Any]]],
+    rows: Tuple[int, int],
+    costs: Tuple[float, float, float]
+) -> List[Dict[str, Any]]:
+    """
+    Backtest candidates that share one signal formula.
+
+    The formula is evaluated on the panel up to the last simulated date, so
+    short windows cost less than the full range while lookbacks stay warm.
+
+    Args:
+        panel: Full panel (SHARED_SIGNAL holds a parameter-independent signal)
+        candidates: (index, parameters, resolved signal configuration)
+        rows: Date rows [start, stop) simulated
+        costs: (initial capital, commission rate, slippage)
+
+    Returns:
+        Per-candidate results with index, params, metrics or error, seconds
+    """
+    start, stop = rows
+    spec = candidates[0][2]
+    begin = time.perf_counter()
+    try:
+        signal = candidate_signal(panel, spec, stop)
+        prices = panel.field(spec["price_field"])[start:stop]
+    except (FormulaCompileError, FactorEvaluationError, KeyError) as e:
+        error = str(e.args[0]) if isinstance(e, KeyError) else str(e)
+        return [
+            {"index": index, "params": params, "error": error, "seconds": 0.0}
+            for index, params, _ in candidates
+        ]
+    signal = signal[start:stop]
+    shared = (time.perf_counter() - begin) / len(candidates)
+
+    results = []
+    for index, params, candidate in candidates:
+        begin = time.perf_counter()
+        summary = backtest_engine.performance_metrics(simulate_candidate(candidate, signal, prices, costs))
+        results.append({
+            "index": index,
+            "params": params,
+            "metrics": {name: summary[name] for name in CANDIDATE_METRICS},
+            "seconds": shared + time.perf_counter() - begin,
+        })
+    return results
+
+
+def _run_shared_chunk(
+    spec: SharedPanelSpec,
+    candidates: List[Tuple[int, Dict[str, Any], Dict[str, Any]]],
+    rows: Tuple[int, int],
+    costs: Tuple[float, float, float]
+) -> List[Dict[str, Any]]:
+    """Process pool entry point: attach to the shared panel and run a chunk."""
+    memory, panel = attach_panel(spec)
+    try:
+        return _run_chunk(panel, candidates, rows, costs)
+    finally:
+        del panel
+        memory.close()
+
+
+class _ChunkRunner:
+    """Runs chunks inline or on an executor, yielding results as chunks finish."""
+
+    def __init__(self, function: Callable, panel: Any, executor: Optional[Executor] = None):
+        self.function = function
+        self.panel = panel
+        self.executor = executor
+
+    async def map(
+        self,
+        tasks: List[Any],
+        rows: Tuple[int, int],
+        costs: Tuple[float, float, float]
+    ):
+        """Run tasks (chunks of candidates) over one date range."""
+        if self.executor is None:
+            for chunk in tasks:
+                yield self.function(self.panel, chunk, rows, costs)
+            return
+
+        loop = asyncio.get_running_loop()
+        futures = [
+            loop.run_in_executor(self.executor, self.function, self.panel, chunk, rows, costs)
+            for chunk in tasks
+        ]
+        for future in asyncio.as_completed(futures):
+            yield await future
+
+
+def chunk_candidates(
+    specs: Sequence[Dict[str, Any]],
+    chunk_size: int
+) -> List[List[int]]:
+    """
+    Group candidate indices by signal formula and split groups into chunks.
+
+    Args:
+        specs: Resolved signal configuration per candidate
+        chunk_size: Maximum candidates per chunk
+
+    Returns:
+        Chunks of candidate indices, each sharing one formula
+    """
+    groups: Dict[Tuple, List[int]] = {}
+    for index, spec in enumerate(specs):
+        groups.setdefault((spec["formula"], spec["formula_language"], spec["price_field"]), []).append(index)
+    return [
+        indices[i:i + chunk_size]
+        for indices in groups.values()
+        for i in range(0, len(indices), chunk_size)
+    ]
+
+
+def sweep_panel(
+    panel: DatasetPanel,
+    specs: Sequence[Dict[str, Any]],
+    signal: Optional[np.ndarray]
+) -> DatasetPanel:
+    """
+    Panel restricted to the fields the candidates read.
+
+    Args:
+        panel: Full dataset panel
+        specs: Resolved signal configuration per candidate
+        signal: Parameter-independent signal, added as SHARED_SIGNAL
+
+    Returns:
+        Panel sharing the arrays of the fields used
+    """
+    fields = {spec["price_field"].lower() for spec in specs}
+    for spec in specs:
+        if spec["formula"] is not None:
+            try:
+                fields.update(compile_formula(spec["formula"], spec["formula_language"]).fields)
+            except FormulaCompileError:
+                pass  # reported per candidate by the worker
+    shared_fields = {name: panel.fields[name] for name in fields if name in panel.fields}
+    if signal is not None:
+        shared_fields[SHARED_SIGNAL] = signal
+    return DatasetPanel(dates=panel.dates, instruments=panel.instruments, fields=shared_fields)
+
+
+# ===================== Successive halving =====================
+
+def halving_windows(n_dates: int, min_window: int, eta: int) -> List[int]:
+    """
+    Window lengths of successive halving rungs, shortest first.
+
+    Each rung is ``eta`` times longer than the previous one and the last
+    rung covers all ``n_dates``; rungs shorter than ``min_window`` are
+    dropped.
+
+    Args:
+        n_dates: Dates in the full range
+        min_window: Shortest window (dates)
+        eta: Growth factor between rungs
+
+    Returns:
+        Window lengths, ending with n_dates
+    """
+    windows = [n_dates]
+    while windows[-1] // eta >= max(min_window, 2):
+        windows.append(windows[-1] // eta)
+    return windows[::-1]
+
+
+def hyperband_brackets(n_candidates: int, n_rungs: int, eta: int) -> List[Tuple[int, List[int]]]:
+    """
+    Split candidates between Hyperband brackets.
+
+    Bracket ``s`` (s = n_rungs - 1 ... 0) starts at rung ``n_rungs - 1 - s``
+    and gets a share of the candidates proportional to Hyperband's
+    ``ceil((s_max + 1) / (s + 1)) * eta ** s``, so aggressive brackets try
+    many candidates on short windows and conservative ones few candidates on
+    long windows. Candidates are shuffled deterministically first so grid
+    neighbours are spread across brackets.
+
+    Args:
+        n_candidates: Number of candidates
+        n_rungs: Number of halving rungs
+        eta: Promotion factor
+
+    Returns:
+        (first rung, candidate indices) per non-empty bracket
+    """
+    s_max = n_rungs - 1
+    weights = [math.ceil((s_max + 1) / (s + 1)) * eta ** s for s in range(s_max, -1, -1)]
+    shares = [n_candidates * w / sum(weights) for w in weights]
+    counts = [int(share) for share in shares]
+    # Largest remainders get the candidates lost to rounding down
+    for i in sorted(range(len(shares)), key=lambda i: counts[i] - shares[i])[:n_candidates - sum(counts)]:
+        counts[i] += 1
+
+    order = list(range(n_candidates))
+    random.Random(0).shuffle(order)
+    brackets = []
+    offset = 0
+    for first_rung, count in enumerate(counts):
+        if count:
+            brackets.append((first_rung, sorted(order[offset:offset + count])))
+        offset += count
+    return brackets
+
+
+# ===================== Sweep =====================
+
+class ParameterSweep:
+    """
+    Backtests many candidate signal configurations over one panel.
+
+    ``run`` backtests every candidate over the full range.
+    ``run_halving`` runs successive halving (or Hyperband) over growing
+    windows that start at the first simulated date: all candidates run on
+    the shortest window, the best 1/eta are promoted to an eta times longer
+    window, and so on up to the full range. Only candidates that reach the
+    full range are ranked on the leaderboard, so their metrics are
+    comparable with a full sweep's.
+
+    Example:
+        sweep = ParameterSweep(max_workers=8)
+        result = await sweep.run(panel, specs, params, (start, stop), (1e6, 0.0003, 0.0005))
+        result["leaderboard"][0]["params"]
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+    ):
+        """
+        Initialize the sweep.
+
+        Args:
+            max_workers: Worker count (default: CPU count)
+            chunk_size: Maximum candidates per worker task
+        """
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+        self.max_workers = max_workers or multiprocessing.cpu_count()
+        self.chunk_size = chunk_size
+
+    async def run(
+        self,
+        panel: DatasetPanel,
+        specs: Sequence[Dict[str, Any]],
+        params: Sequence[Dict[str, Any]],
+        rows: Tuple[int, int],
+        costs: Tuple[float, float, float],
+        leaderboard: Optional[Leaderboard] = None,
+        signal: Optional[np.ndarray] = None,
+        progress: Optional[SweepProgressCallback] = None
+    ) -> Dict[str, Any]:
+        """
+        Backtest every candidate and rank the results.
+
+        Args:
+            panel: Full dataset panel (formulas are evaluated from the first
+                date so lookbacks are warm; only ``rows`` are simulated)
+            specs: Resolved signal configuration per candidate; ``formula``
+                is None where the candidate trades ``signal``
+            params: Parameters per candidate (reported on the leaderboard)
+            rows: Date rows [start, stop) to simulate
+            costs: (initial capital, commission rate, slippage)
+            leaderboard: Leaderboard to fill (default: by Sharpe ratio)
+            signal: Parameter-independent signal for specs without a formula
+            progress: Async callback receiving (done, total, leaderboard)
+
+        Returns:
+            Dict with "leaderboard" (best first), "failed" candidates and a
+            "summary" of the run
+        """
+        begin = time.perf_counter()
+        leaderboard = leaderboard or Leaderboard()
+        total = len(specs)
+        chunks = len(chunk_candidates(specs, self.chunk_size))
+        workers = min(self.max_workers, chunks)
+
+        done = 0
+        failed: List[Dict[str, Any]] = []
+        backtest_seconds = 0.0
+        if progress:
+            await progress(done, total, leaderboard.to_list())
+        with self._runner(sweep_panel(panel, specs, signal), workers) as runner:
+            async for chunk_results in self._evaluate(runner, specs, params, range(total), rows, costs):
+                for result in chunk_results:
+                    if "error" in result:
+                        failed.append(result)
+                    else:
+                        leaderboard.add(result)
+                        backtest_seconds += result["seconds"]
+                done += len(chunk_results)
+                if progress:
+                    await progress(done, total, leaderboard.to_list())
+
+        elapsed = time.perf_counter() - begin
+        summary = {
+            "candidates": total,
+            "completed": total - len(failed),
+            "failed": len(failed),
+            "chunks": chunks,
+            "workers": workers,
+            "dates": rows[1] - rows[0],
+            "backtest_seconds": backtest_seconds,
+            "elapsed_seconds": elapsed,
+        }
+        logger.info(
+            f"Swept {total} candidates in {chunks} chunks on {workers} workers: "
+            f"{summary['completed']} completed, {len(failed)} failed in {elapsed:.2f}s"
+        )
+        return {"leaderboard": leaderboard.to_list(), "failed": failed, "summary": summary}
+
+    async def run_halving(
+        self,
+        panel: DatasetPanel,
+        specs: Sequence[Dict[str, Any]],
+        params: Sequence[Dict[str, Any]],
+        rows: Tuple[int, int],
+        costs: Tuple[float, float, float],
+        leaderboard: Optional[Leaderboard] = None,
+        eta: int = DEFAULT_ETA,
+        min_window: int = DEFAULT_MIN_WINDOW,
+        hyperband: bool = False,
+        signal: Optional[np.ndarray] = None,
+        progress: Optional[SweepProgressCallback] = None
+    ) -> Dict[str, Any]:
+        """
+        Successive halving (or Hyperband) over growing date windows.
+
+        Args:
+            panel: Full dataset panel
+            specs: Resolved signal configuration per candidate
+            params: Parameters per candidate
+            rows: Date rows [start, stop) of the full range
+            costs: (initial capital, commission rate, slippage)
+            leaderboard: Leaderboard of full-range results (default: by Sharpe ratio)
+            eta: Promotion factor; the best 1/eta of a rung are promoted to
+                a window eta times longer
+            min_window: Shortest window (dates)
+            hyperband: Split candidates into Hyperband brackets starting at
+                different windows instead of starting all on the shortest
+            signal: Parameter-independent signal for specs without a formula
+            progress: Async callback receiving (done, planned, leaderboard)
+
+        Returns:
+            Dict with "leaderboard", "failed" candidates, the promotion
+            "history" (one entry per rung: window, candidates with their
+            objective value best first, promoted candidates) and a "summary"
+            comparing evaluated dates with a full sweep's
+
+        Raises:
+            InvalidConfigError: If eta < 2 or min_window < 2
+        """
+        if eta < 2:
+            raise InvalidConfigError("eta must be at least 2")
+        if min_window < 2:
+            raise InvalidConfigError("min_window must be at least 2 dates")
+
+        begin = time.perf_counter()
+        leaderboard = leaderboard or Leaderboard()
+        objective = leaderboard.objective
+        start, stop = rows
+        windows = halving_windows(stop - start, min_window, eta)
+        if hyperband:
+            brackets = hyperband_brackets(len(specs), len(windows), eta)
+        else:
+            brackets = [(0, list(range(len(specs))))]
+
+        planned = 0
+        for first_rung, indices in brackets:
+            size = len(indices)
+            for _ in windows[first_rung:]:
+                planned += size
+                size = max(1, math.ceil(size / eta))
+        workers = min(self.max_workers, len(chunk_candidates(specs, self.chunk_size)))
+
+        done = 0
+        evaluated_dates = 0
+        backtest_seconds = 0.0
+        failed: List[Dict[str, Any]] = []
+        history: List[Dict[str, Any]] = []
+        if progress:
+            await progress(done, planned, leaderboard.to_list())
+        with self._runner(sweep_panel(panel, specs, signal), workers) as runner:
+            for bracket, (first_rung, indices) in enumerate(brackets):
+                for rung in range(first_rung, len(windows)):
+                    window = windows[rung]
+                    last = rung == len(windows) - 1
+                    board = leaderboard if last else Leaderboard(
+                        objective, max(1, math.ceil(len(indices) / eta))
+                    )
+                    scores: List[Dict[str, Any]] = []
+                    async for chunk_results in self._evaluate(
+                        runner, specs, params, indices, (start, start + window), costs
+                    ):
+                        for result in chunk_results:
+                            if "error" in result:
+                                failed.append({**result, "window": window})
+                                continue
+                            board.add(result)
+                            scores.append({"index": result["index"], objective: result["metrics"][objective]})
+                            backtest_seconds += result["seconds"]
+                        done += len(chunk_results)
+                        if progress:
+                            await progress(min(done, planned), planned, leaderboard.to_list())
+
+                    evaluated_dates += window * len(indices)
+                    promoted = [] if last else sorted(entry["index"] for entry in board.to_list())
+                    history.append({
+                        "bracket": bracket,
+                        "rung": rung,
+                        "start_date": str(panel.dates[start])[:10],
+                        "end_date": str(panel.dates[start + window - 1])[:10],
+                        "dates": window,
+                        "candidates": len(indices),
+                        "results": sorted(scores, key=board.score, reverse=True),
+                        "promoted": promoted,
+                    })
+                    if last or not promoted:
+                        break
+                    indices = promoted
+
+        if progress and done < planned:
+            await progress(planned, planned, leaderboard.to_list())
+
+        elapsed = time.perf_counter() - begin
+        full_dates = len(specs) * (stop - start)
+        summary = {
+            "candidates": len(specs),
+            "completed": sum(
+                len(entry["results"]) for entry in history if entry["rung"] == len(windows) - 1
+            ),
+            "failed": len(failed),
+            "brackets": len(brackets),
+            "windows": windows,
+            "evaluations": sum(entry["candidates"] for entry in history),
+            "workers": workers,
+            "dates": stop - start,
+            "evaluated_dates": evaluated_dates,
+            "full_search_dates": full_dates,
+            "cost_ratio": full_dates / evaluated_dates if evaluated_dates else None,
+            "backtest_seconds": backtest_seconds,
+            "elapsed_seconds": elapsed,
+        }
+        logger.info(
+            f"{'Hyperband' if hyperband else 'Successive halving'} over {len(specs)} candidates, "
+            f"windows {windows}: {summary['evaluations']} evaluations, "
+            f"{summary['cost_ratio'] or 0:.1f}x fewer backtested dates than a full sweep, "
+            f"{elapsed:.2f}s"
+        )
+        return {
+            "leaderboard": leaderboard.to_list(),
+            "failed": failed,
+            "history": history,
+            "summary": summary,
+        }
+
+    async def _evaluate(
+        self,
+        runner: _ChunkRunner,
+        specs: Sequence[Dict[str, Any]],
+        params: Sequence[Dict[str, Any]],
+        indices: Sequence[int],
+        rows: Tuple[int, int],
+        costs: Tuple[float, float, float]
+    ):
+        """Backtest a subset of candidates, yielding each chunk's results."""
+        indices = list(indices)
+        chunks = chunk_candidates([specs[i] for i in indices], self.chunk_size)
+        tasks = [
+            [(indices[p], params[indices[p]], specs[indices[p]]) for p in chunk]
+            for chunk in chunks
+        ]
+        async for chunk_results in runner.map(tasks, rows, costs):
+            yield chunk_results
+
+    def _runner(self, panel: DatasetPanel, workers: int):
+        """Chunk runner kept open for the whole sweep."""
+        return chunk_runner(panel, workers, _run_chunk, _run_shared_chunk)
+
+
+@contextmanager
+def chunk_runner(
+    panel: DatasetPanel,
+    workers: int,
+    function: Callable,
+    shared_function: Callable
+) -> Iterator[_ChunkRunner]:
+    """
+    Runner of worker tasks over one panel, kept open for a whole run.
+
+    With one worker tasks run inline. Otherwise the panel is copied once
+    into shared memory and tasks run on a process pool, or on a thread
+    pool sharing the panel directly inside a daemonic process.
+
+    Args:
+        panel: Panel the tasks read
+        workers: Worker count
+        function: Task function ``(panel, task, rows, costs)``
+        shared_function: Module-level equivalent taking a SharedPanelSpec
+            instead of the panel (run in child processes)
+
+    Yields:
+        Runner whose ``map`` yields task results as they finish
+    """
+    if workers <= 1:
+        yield _ChunkRunner(function, panel)
+    elif multiprocessing.current_process().daemon:
+        # Daemonic processes (Celery prefork children) cannot start a process pool
+        logger.warning(
+            "Running sweep chunks on threads in a daemonic process; "
+            "serve the optimization queue with a solo-pool worker to use processes"
+        )
+        with ThreadPoolExecutor(workers) as executor:
+            yield _ChunkRunner(function, panel, executor)
+    else:
+        with SharedPanel(panel, list(panel.fields)) as shared, ProcessPoolExecutor(workers) as executor:
+            yield _ChunkRunner(shared_function, shared.spec, executor)
@@ -0,0 +1,427 @@
+"""
+Report Writers
+
+File writers of backtest reports, independent of the database:
+
+- write_excel_report: xlsx workbook of a summary sheet and one sheet per
+  series (equity curve, trades, round trips). openpyxl's write-only mode
+  streams rows to disk, and series are converted to cells in chunks of
+  EXCEL_CHUNK_ROWS rows, so memory does not grow with the number of cells.
+  Series longer than an Excel sheet continue on numbered sheets.
+- write_pdf_report / write_html_report: one-page summary with equity and
+  drawdown charts. The PDF is drawn directly as PDF vector graphics with
+  the standard Helvetica fonts, and the HTML embeds the charts as inline
+  SVG, so neither needs a plotting or rendering library.
+
+Chart series are reduced to at most MAX_CHART_POINTS points by keeping each
+bucket's minimum and maximum, so drawdown troughs and equity peaks survive.
+
+All writers are synchronous; callers run them off the event loop. Progress
+is reported as (fraction done, step description).
+"""
+
+import html
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Rows converted to cells at a time
+EXCEL_CHUNK_ROWS = 10_000
+
+# Data rows per sheet (Excel's limit less the header row)
+EXCEL_MAX_ROWS = 1_048_575
+
+# Points drawn per chart line
+MAX_CHART_POINTS = 1_000
+
+# Progress callback: (fraction done in [0, 1], step description)
+ReportProgressCallback = Callable[[float, str], None]
+
+# Summary rows: (label, value)
+SummaryRows = Sequence[Tuple[str, Any]]
+
+
+@dataclass
+class ReportSheet:
+    """
+    A series written as one worksheet.
+
+    Attributes:
+        title: Sheet title (at most 31 characters)
+        columns: Column name -> equal-length array
+    """
+
+    title: str
+    columns: Dict[str, np.ndarray]
+
+    @property
+    def rows(self) -> int:
+        """Number of data rows."""
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+
+@dataclass
+class ReportChart:
+    """
+    A line chart of a series over dates.
+
+    Attributes:
+        title: Chart title
+        dates: datetime64 dates
+        values: Values per date
+        percent: Label the axis in percent
+        color: RGB color in [0, 1]
+    """
+
+    title: str
+    dates: np.ndarray
+    values: np.ndarray
+    percent: bool = False
+    color: Tuple[float, float, float] = (0.12, 0.38, 0.71)
+
+
+# ===================== Excel =====================
+
+def write_excel_report(
+    path: Path,
+    summary: SummaryRows,
+    sheets: Sequence[ReportSheet],
+    progress: Optional[ReportProgressCallback] = None
+) -> None:
+    """
+    Write a summary sheet and one sheet per series to an xlsx workbook.
+
+    Args:
+        path: Output file
+        summary: Summary rows
+        sheets: Series sheets, written in order
+        progress: Callback receiving the share of rows written
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    summary_sheet = workbook.create_sheet("Summary")
+    summary_sheet.append(["Metric", "Value"])
+    for label, value in summary:
+        summary_sheet.append([label, _cell(value)])
+
+    total = sum(sheet.rows for sheet in sheets)
+    written = 0
+    for sheet in sheets:
+        headers = list(sheet.columns)
+        for part, first in enumerate(range(0, max(sheet.rows, 1), EXCEL_MAX_ROWS)):
+            worksheet = workbook.create_sheet(sheet.title if part == 0 else f"{sheet.title[:26]} ({part + 1})")
+            worksheet.append(headers)
+            last = min(first + EXCEL_MAX_ROWS, sheet.rows)
+            for start in range(first, last, EXCEL_CHUNK_ROWS):
+                stop = min(start + EXCEL_CHUNK_ROWS, last)
+                cells = [_cell_column(values[start:stop]) for values in sheet.columns.values()]
+                for row in zip(*cells):
+                    worksheet.append(row)
+                written += stop - start
+                if progress:
+                    progress(written / total, f"Wrote {written}/{total} rows")
+    workbook.save(path)
+
+
+def _cell_column(values: np.ndarray) -> List[Any]:
+    """Cell values of a chunk of a column (dates as ISO strings, NaN/NaT as empty)."""
+    if np.issubdtype(values.dtype, np.datetime64):
+        days = values.astype("datetime64[D]")
+        return [None if np.isnat(day) else str(day) for day in days]
+    if np.issubdtype(values.dtype, np.floating):
+        return [None if value != value else value for value in values.tolist()]
+    return values.tolist()
+
+
+def _cell(value: Any) -> Any:
+    """Cell value of a summary value."""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+# ===================== Charts =====================
+
+def chart_points(values: np.ndarray, max_points: int = MAX_CHART_POINTS) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Positions and values of a series reduced for drawing.
+
+    Series longer than max_points are split into max_points / 2 buckets;
+    each bucket keeps its minimum and maximum in date order.
+
+    Returns:
+        (positions in [0, 1], values) of the finite points
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    index = np.flatnonzero(np.isfinite(values))
+    if n > max_points and index.size:
+        buckets = max(1, max_points // 2)
+        starts = np.unique(np.searchsorted(index, np.linspace(0, n, buckets, endpoint=False).astype(int)))
+        starts = starts[starts < index.size]
+        finite = values[index]
+        keep = []
+        for lo, hi in zip(starts, np.append(starts[1:], index.size)):
+            block = finite[lo:hi]
+            keep.extend(sorted({lo + int(np.argmin(block)), lo + int(np.argmax(block))}))
+        index = index[np.asarray(keep, dtype=int)]
+    positions = index / max(n - 1, 1)
+    return positions, values[index]
+
+
+def _axis_range(values: np.ndarray) -> Tuple[float, float]:
+    """Value range of a chart axis (padded when flat)."""
+    if not values.size:
+        return 0.0, 1.0
+    lo, hi = float(values.min()), float(values.max())
+    if hi - lo < 1e-12:
+        pad = abs(hi) * 0.01 or 1.0
+        return lo - pad, hi + pad
+    return lo, hi
+
+
+def _format_value(value: float, percent: bool) -> str:
+    return f"{value:.2%}" if percent else f"{value:,.2f}"
+
+
+def _date_label(dates: np.ndarray, index: int) -> str:
+    if not len(dates):
+        return ""
+    return str(np.asarray(dates).astype("datetime64[D]")[index])
+
+
+def svg_line_chart(chart: ReportChart, width: int = 800, height: int = 280) -> str:
+    """
+    Inline SVG of a line chart.
+
+    Args:
+        chart: Chart series
+        width: Width in pixels
+        height: Height in pixels
+
+    Returns:
+        SVG markup
+    """
+    left, right, top, bottom = 80, 20, 30, 30
+    plot_w, plot_h = width - left - right, height - top - bottom
+    positions, values = chart_points(chart.values)
+    lo, hi = _axis_range(values)
+    xs = left + positions * plot_w
+    ys = top + (hi - values) / (hi - lo) * plot_h
+    points = " ".join(f"{x:.1f},{y:.1f}" for x, y in zip(xs, ys))
+    color = "#%02x%02x%02x" % tuple(int(c * 255) for c in chart.color)
+
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}" font-family="Helvetica, Arial, sans-serif" font-size="11">'
+        f'<text x="{left}" y="18" font-size="13" font-weight="bold">{html.escape(chart.title)}</text>'
+        f'<rect x="{left}" y="{top}" width="{plot_w}" height="{plot_h}" fill="none" stroke="#cccccc"/>'
+        f'<text x="{left - 6}" y="{top + 4}" text-anchor="end">{_format_value(hi, chart.percent)}</text>'
+        f'<text x="{left - 6}" y="{top + plot_h}" text-anchor="end">{_format_value(lo, chart.percent)}</text>'
+        f'<text x="{left}" y="{height - 10}">{_date_label(chart.dates, 0)}</text>'
+        f'<text x="{left + plot_w}" y="{height - 10}" text-anchor="end">{_date_label(chart.dates, -1)}</text>'
+        f'<polyline fill="none" stroke="{color}" stroke-width="1.5" points="{points}"/>'
+        "</svg>"
+    )
+
+
+# ===================== HTML =====================
+
+def write_html_report(
+    path: Path,
+    title: str,
+    summary: SummaryRows,
+    charts: Sequence[ReportChart],
+    progress: Optional[ReportProgressCallback] = None
+) -> None:
+    """
+    Write a self-contained HTML report with a summary table and SVG charts.
+
+    Args:
+        path: Output file
+        title: Report title
+        summary: Summary rows
+        charts: Charts, drawn in order below the summary
+        progress: Callback receiving the share of charts drawn
+    """
+    rows = "".join(
+        f"<tr><th>{html.escape(label)}</th><td>{html.escape(_text(value))}</td></tr>"
+        for label, value in summary
+    )
+    sections = []
+    for done, chart in enumerate(charts, 1):
+        sections.append(f"<section>{svg_line_chart(chart)}</section>")
+        if progress:
+            progress(done / len(charts), f"Drew {chart.title}")
+    path.write_text(
+        "<!DOCTYPE html><html><head><meta charset=\"utf-8\">"
+        f"<title>{html.escape(title)}</title>"
+        "<style>body{font-family:Helvetica,Arial,sans-serif;margin:32px;color:#222}"
+        "table{border-collapse:collapse;margin-bottom:24px}"
+        "th,td{padding:4px 12px;border-bottom:1px solid #eee;text-align:left}"
+        "th{font-weight:normal;color:#666}</style></head><body>"
+        f"<h1>{html.escape(title)}</h1><table>{rows}</table>{''.join(sections)}"
+        f"<footer>Generated {datetime.utcnow().isoformat(timespec='seconds')} UTC</footer>"
+        "</body></html>",
+        encoding="utf-8",
+    )
+
+
+def _text(value: Any) -> str:
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        return f"{value:.6g}"
+    return str(value)
+
+
+# ===================== PDF =====================
+
+class _PdfPage:
+    """Content stream of one PDF page (points, origin at the bottom left)."""
+
+    WIDTH, HEIGHT = 595, 842  # A4 portrait
+
+    def __init__(self):
+        self.operations: List[str] = []
+
+    def text(self, x: float, y: float, value: str, size: float = 10, bold: bool = False) -> None:
+        font = "F2" if bold else "F1"
+        self.operations.append(f"BT /{font} {size} Tf {x:.2f} {y:.2f} Td ({_pdf_string(value)}) Tj ET")
+
+    def polyline(
+        self,
+        points: Iterable[Tuple[float, float]],
+        color: Tuple[float, float, float] = (0, 0, 0),
+        width: float = 1.0
+    ) -> None:
+        points = list(points)
+        if len(points) < 2:
+            return
+        path = [f"{points[0][0]:.2f} {points[0][1]:.2f} m"]
+        path += [f"{x:.2f} {y:.2f} l" for x, y in points[1:]]
+        self.operations.append(
+            f"{color[0]:.3f} {color[1]:.3f} {color[2]:.3f} RG {width:.2f} w {' '.join(path)} S"
+        )
+
+    def rect(self, x: float, y: float, w: float, h: float, gray: float = 0.8) -> None:
+        self.operations.append(f"{gray:.2f} G 0.5 w {x:.2f} {y:.2f} {w:.2f} {h:.2f} re S")
+
+    def chart(self, chart: ReportChart, x: float, y: float, w: float, h: float) -> None:
+        """Draw a line chart in the box with bottom-left corner (x, y), title above it."""
+        self.text(x, y + h + 8, chart.title, size=11, bold=True)
+        self.rect(x, y, w, h)
+        positions, values = chart_points(chart.values)
+        lo, hi = _axis_range(values)
+        self.text(x - 4 - 5 * len(_format_value(hi, chart.percent)), y + h - 8, _format_value(hi, chart.percent), 8)
+        self.text(x - 4 - 5 * len(_format_value(lo, chart.percent)), y, _format_value(lo, chart.percent), 8)
+        self.text(x, y - 12, _date_label(chart.dates, 0), 8)
+        self.text(x + w - 50, y - 12, _date_label(chart.dates, -1), 8)
+        self.polyline(
+            zip(x + positions * w, y + (values - lo) / (hi - lo) * h),
+            chart.color, 1.0
+        )
+
+    def stream(self) -> bytes:
+        return zlib.compress("\n".join(self.operations).encode("latin-1"))
+
+
+def _pdf_string(value: str) -> str:
+    """Escape a string for a PDF literal (characters outside Latin-1 become '?')."""
+    value = value.encode("latin-1", "replace").decode("latin-1")
+    return value.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _write_pdf(path: Path, pages: Sequence[_PdfPage]) -> None:
+    """Serialize pages into a PDF 1.4 file with Helvetica fonts."""
+    objects: List[bytes] = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, once the page objects are numbered
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>",
+    ]
+    page_ids = []
+    for page in pages:
+        content = page.stream()
+        objects.append(
+            b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(content) + content + b"\nendstream"
+        )
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] "
+            b"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents %d 0 R >>"
+            % (_PdfPage.WIDTH, _PdfPage.HEIGHT, len(objects))
+        )
+        page_ids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % i for i in page_ids), len(page_ids)
+    )
+
+    with open(path, "wb") as f:
+        f.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        offsets = []
+        for number, body in enumerate(objects, 1):
+            offsets.append(f.tell())
+            f.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+        xref = f.tell()
+        f.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+        f.writelines(b"%010d 00000 n \n" % offset for offset in offsets)
+        f.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+
+
+def write_pdf_report(
+    path: Path,
+    title: str,
+    summary: SummaryRows,
+    charts: Sequence[ReportChart],
+    progress: Optional[ReportProgressCallback] = None
+) -> None:
+    """
+    Write a PDF report with a summary table and line charts.
+
+    The summary fills the top of the first page in two columns; charts
+    follow, two per page.
+
+    Args:
+        path: Output file
+        title: Report title
+        summary: Summary rows
+        charts: Charts, drawn in order below the summary
+        progress: Callback receiving the share of charts drawn
+    """
+    margin = 50
+    page = _PdfPage()
+    pages = [page]
+    y = _PdfPage.HEIGHT - margin - 10
+    page.text(margin, y, title, size=16, bold=True)
+    y -= 16
+    page.text(margin, y, f"Generated {datetime.utcnow().isoformat(timespec='seconds')} UTC", size=8)
+    y -= 24
+
+    half = (len(summary) + 1) // 2
+    column_width = (_PdfPage.WIDTH - 2 * margin) / 2
+    for index, (label, value) in enumerate(summary):
+        column, row = divmod(index, half) if half else (0, 0)
+        x = margin + column * column_width
+        page.text(x, y - row * 14, label, size=9)
+        page.text(x + 130, y - row * 14, _text(value)[:40], size=9, bold=True)
+    y -= half * 14 + 30
+
+    chart_height = 230
+    for done, chart in enumerate(charts, 1):
+        if y - chart_height - 20 < margin:
+            page = _PdfPage()
+            pages.append(page)
+            y = _PdfPage.HEIGHT - margin - 20
+        page.chart(chart, margin + 50, y - chart_height, _PdfPage.WIDTH - 2 * margin - 50, chart_height)
+        y -= chart_height + 50
+        if progress:
+            progress(done / len(charts), f"Drew {chart.title}")
+
+    _write_pdf(path, pages)
@@ -0,0 +1,425 @@
+"""
+Backtest Result Store
+
+Keeps the time series of a backtest run out of the database row. Each run
+gets a directory under RESULT_DIR/backtests, referenced by
+``BacktestResult.artifact_path``:
+
+    <root>/<key>/
+        meta.json       columns and row count of each artifact
+        equity.npz      date, equity, cash, returns, turnover (one row per date)
+        positions/      date, instrument, shares (holdings after each date's close)
+        trades/         date, instrument, quantity, price, value, commission, pnl
+        round_trips/    date (entry), exit_date, instrument, direction, quantity,
+                        entry/exit price, holding_period, pnl, return, mae, mfe,
+                        commission, closed (one row per position episode)
+        <name>.json     analytics derived from the series (e.g. risk), cached
+        <name>.<ext>    files rendered from the series (e.g. report.xlsx), cached
+
+The equity curve (one row per date) is a compressed numpy archive holding
+one array per column, so a read decompresses only the projected columns.
+The per-trade and per-holding artifacts (PAGED_ARTIFACTS) can run to
+millions of rows, so they are directories of uncompressed ``<column>.npy``
+files read through memory maps: a page reads only its own rows. Rows are
+sorted by date; date ranges are located by binary search on the date column
+and row ranges (offset/limit) page through the result. Stores written
+before the paged layout keep ``<name>.npz`` archives, which are still read.
+
+Derived documents and files are dropped with the artifacts when a key is rewritten,
+so a cache never outlives the series it was computed from.
+
+Results stored before the store existed keep their series inline in the
+``metrics`` / ``trades`` JSON; ``result_columns`` reads both layouts.
+
+Example:
+    store = get_result_store()
+    key = store.write(result.id, artifacts)
+    curve = store.read(key, "equity", ["date", "equity"], start_date="2024-01-01")
+"""
+
+import json
+import os
+import shutil
+import uuid
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+# Artifacts of a run and their columns, in storage order
+ARTIFACT_COLUMNS: Dict[str, List[str]] = {
+    "equity": ["date", "equity", "cash", "returns", "turnover"],
+    "positions": ["date", "instrument", "shares"],
+    "trades": ["date", "instrument", "quantity", "price", "value", "commission", "pnl"],
+    "round_trips": [
+        "date", "exit_date", "instrument", "direction", "quantity", "entry_price", "exit_price",
+        "holding_period", "pnl", "return", "mae", "mfe", "commission", "closed",
+    ],
+}
+
+# Artifacts stored as memory-mapped column files rather than compressed archives
+PAGED_ARTIFACTS = frozenset({"positions", "trades", "round_trips"})
+
+DateLike = Union[str, pd.Timestamp, None]
+
+
+class BacktestResultStore:
+    """
+    Columnar files of backtest time series.
+
+    Example:
+        store = BacktestResultStore("./results/backtests")
+        store.write("result-1", {"equity": {"date": dates, "equity": equity, ...}})
+        store.read("result-1", "trades", ["date", "pnl"], offset=100, limit=50)
+    """
+
+    META = "meta.json"
+
+    def __init__(self, root: Union[str, Path]):
+        """
+        Initialize the store.
+
+        Args:
+            root: Directory holding one subdirectory per result
+        """
+        self.root = Path(root)
+
+    # ===================== Reads =====================
+
+    def columns(self, key: str, name: str) -> Optional[List[str]]:
+        """
+        Columns of a stored artifact.
+
+        Returns:
+            Column names, or None if the artifact is not stored
+        """
+        meta = self._meta(key)
+        if meta is None or name not in meta["artifacts"]:
+            return None
+        return meta["artifacts"][name]["columns"]
+
+    def count(self, key: str, name: str) -> Optional[int]:
+        """
+        Number of rows of a stored artifact.
+
+        Returns:
+            Row count, or None if the artifact is not stored
+        """
+        meta = self._meta(key)
+        if meta is None or name not in meta["artifacts"]:
+            return None
+        return meta["artifacts"][name]["rows"]
+
+    def read(
+        self,
+        key: str,
+        name: str,
+        columns: Optional[Sequence[str]] = None,
+        start_date: DateLike = None,
+        end_date: DateLike = None,
+        offset: int = 0,
+        limit: Optional[int] = None
+    ) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Read a range of rows of some columns of an artifact.
+
+        Args:
+            key: Result directory key (BacktestResult.artifact_path)
+            name: Artifact name (see ARTIFACT_COLUMNS)
+            columns: Columns to load (None: all)
+            start_date: First date to include
+            end_date: Last date to include
+            offset: Rows to skip within the date range
+            limit: Maximum number of rows (None: all)
+
+        Returns:
+            Column name -> array, or None if the artifact is not stored
+
+        Raises:
+            KeyError: If a requested column does not exist
+        """
+        archive = _open_artifact(self._directory(key), name)
+        if archive is None:
+            return None
+
+        with archive:
+            available = [column for column in ARTIFACT_COLUMNS.get(name, []) if column in archive.files]
+            available += [column for column in archive.files if column not in available]
+            selected = list(columns) if columns is not None else available
+            unknown = [column for column in selected if column not in archive.files]
+            if unknown:
+                raise KeyError(f"Unknown {name} columns: {', '.join(unknown)}")
+
+            lo, hi = 0, None
+            if start_date is not None or end_date is not None:
+                dates = archive["date"]
+                lo, hi = date_range(dates, start_date, end_date)
+            rows = _page(lo, hi, offset, limit)
+            # Copy the page out of the archive or memory map
+            return {column: np.array(archive[column][rows]) for column in selected}
+
+    def read_document(self, key: str, name: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a cached JSON document stored next to a result's artifacts.
+
+        Returns:
+            The document, or None if not stored
+        """
+        try:
+            return json.loads((self._directory(key) / f"{_document_name(name)}.json").read_text())
+        except FileNotFoundError:
+            return None
+
+    # ===================== Writes =====================
+
+    def write(self, key: str, artifacts: Dict[str, Dict[str, np.ndarray]]) -> str:
+        """
+        Store a run's artifacts, replacing any stored under the same key.
+
+        Args:
+            key: Result directory key (normally the result ID)
+            artifacts: Artifact name -> column name -> equal-length arrays
+
+        Returns:
+            The key, to be stored in BacktestResult.artifact_path
+        """
+        directory = self._directory(key)
+        staging = self.root / f".{directory.name}.{uuid.uuid4().hex}"
+        staging.mkdir(parents=True)
+
+        meta = {"key": key, "created_at": datetime.utcnow().isoformat(), "artifacts": {}}
+        for name, columns in artifacts.items():
+            lengths = {len(values) for values in columns.values()}
+            if len(lengths) > 1:
+                shutil.rmtree(staging, ignore_errors=True)
+                raise ValueError(f"Columns of artifact {name} differ in length")
+            if name in PAGED_ARTIFACTS:
+                (staging / name).mkdir()
+                for column, values in columns.items():
+                    np.save(staging / name / f"{_column_name(column)}.npy", values, allow_pickle=False)
+            else:
+                np.savez_compressed(staging / f"{name}.npz", **columns)
+            meta["artifacts"][name] = {"columns": list(columns), "rows": lengths.pop() if lengths else 0}
+        (staging / self.META).write_text(json.dumps(meta))
+
+        # Readers see either the old directory or the complete new one
+        if directory.exists():
+            retired = self.root / f".{directory.name}.{uuid.uuid4().hex}.old"
+            os.replace(directory, retired)
+            shutil.rmtree(retired, ignore_errors=True)
+        os.replace(staging, directory)
+        logger.debug(f"Stored backtest artifacts {sorted(artifacts)} under {directory}")
+        return key
+
+    def write_document(self, key: str, name: str, document: Dict[str, Any]) -> None:
+        """
+        Store a JSON document next to a result's artifacts (atomically replaced).
+
+        Args:
+            key: Result directory key
+            name: Document name (not an artifact name or "meta")
+            document: JSON-serializable document
+        """
+        directory = self._directory(key)
+        directory.mkdir(parents=True, exist_ok=True)
+        target = directory / f"{_document_name(name)}.json"
+        staging = directory / f".{target.name}.{uuid.uuid4().hex}"
+        staging.write_text(json.dumps(document))
+        os.replace(staging, target)
+
+    def file_path(self, key: str, name: str) -> Path:
+        """
+        Path of a derived file stored next to a result's artifacts.
+
+        Args:
+            key: Result directory key
+            name: File name ``<stem>.<ext>`` (stem not an artifact name or "meta")
+
+        Returns:
+            The path (the file may not exist)
+        """
+        return self._directory(key) / _file_name(name)
+
+    def write_file(self, key: str, name: str, write: Callable[[Path], None]) -> Path:
+        """
+        Store a derived file next to a result's artifacts (atomically replaced).
+
+        Args:
+            key: Result directory key
+            name: File name (see file_path)
+            write: Function writing the file's content to the given path
+
+        Returns:
+            Path of the stored file
+        """
+        target = self.file_path(key, name)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        staging = target.parent / f".{uuid.uuid4().hex}{target.suffix}"
+        try:
+            write(staging)
+            os.replace(staging, target)
+        finally:
+            if staging.exists():
+                staging.unlink()
+        return target
+
+    def delete(self, key: str) -> bool:
+        """
+        Remove a result's artifacts.
+
+        Returns:
+            True if anything was removed
+        """
+        directory = self._directory(key)
+        if not directory.exists():
+            return False
+        shutil.rmtree(directory, ignore_errors=True)
+        return True
+
+    # ===================== Helpers =====================
+
+    def _meta(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            return json.loads((self._directory(key) / self.META).read_text())
+        except FileNotFoundError:
+            return None
+
+    def _directory(self, key: str) -> Path:
+        key = str(key)
+        if not key or key in (".", "..") or key.startswith(".") or "/" in key or "\\" in key:
+            raise ValueError(f"Invalid result store key: {key!r}")
+        return self.root / key
+
+
+def _document_name(name: str) -> str:
+    """Reject document names that clash with artifacts or escape the directory."""
+    if not name.isidentifier() or name in ARTIFACT_COLUMNS or name == "meta":
+        raise ValueError(f"Invalid result document name: {name!r}")
+    return name
+
+
+def _column_name(name: str) -> str:
+    """Reject column names that cannot be stored as a column file."""
+    if not name.isidentifier():
+        raise ValueError(f"Invalid artifact column name: {name!r}")
+    return name
+
+
+class _ColumnFiles:
+    """Directory of ``<column>.npy`` files with the read interface of an npz archive."""
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.files = sorted(path.stem for path in directory.glob("*.npy"))
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return np.load(self.directory / f"{column}.npy", mmap_mode="r", allow_pickle=False)
+
+    def __enter__(self) -> "_ColumnFiles":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        return None
+
+
+def _open_artifact(directory: Path, name: str):
+    """Column files or npz archive of an artifact, or None if not stored."""
+    if (directory / name).is_dir():
+        return _ColumnFiles(directory / name)
+    try:
+        return np.load(directory / f"{name}.npz", allow_pickle=False)
+    except FileNotFoundError:
+        return None
+
+
+def _file_name(name: str) -> str:
+    """Reject file names that clash with artifacts, documents or escape the directory."""
+    stem, _, suffix = name.partition(".")
+    if not suffix.isalnum() or suffix in ("json", "npz") or stem == "meta" or stem in ARTIFACT_COLUMNS or not stem.isidentifier():
+        raise ValueError(f"Invalid result file name: {name!r}")
+    return name
+
+
+def date_range(dates: np.ndarray, start_date: DateLike, end_date: DateLike) -> tuple:
+    """Row range [lo, hi) of sorted dates within [start_date, end_date]."""
+    lo, hi = 0, len(dates)
+    if start_date is not None:
+        lo = int(np.searchsorted(dates, np.datetime64(pd.Timestamp(start_date).date()), "left"))
+    if end_date is not None:
+        hi = int(np.searchsorted(dates, np.datetime64(pd.Timestamp(end_date).date()), "right"))
+    return lo, max(lo, hi)
+
+
+def _page(lo: int, hi: Optional[int], offset: int, limit: Optional[int]) -> slice:
+    start = lo + max(offset, 0)
+    stop = hi
+    if limit is not None:
+        stop = start + max(limit, 0) if stop is None else min(stop, start + max(limit, 0))
+    return slice(start, stop)
+
+
+def result_columns(
+    store: BacktestResultStore,
+    result,
+    name: str,
+    columns: Optional[Sequence[str]] = None,
+    start_date: DateLike = None,
+    end_date: DateLike = None,
+    offset: int = 0,
+    limit: Optional[int] = None
+) -> Optional[Dict[str, np.ndarray]]:
+    """
+    Read an artifact of a BacktestResult from the store or its inline JSON.
+
+    Arguments are as for BacktestResultStore.read.
+
+    Returns:
+        Column name -> array, or None if the result has no such series
+    """
+    if result.artifact_path:
+        return store.read(result.artifact_path, name, columns, start_date, end_date, offset, limit)
+
+    inline = _inline_columns(result, name)
+    if inline is None:
+        return None
+    selected = list(columns) if columns is not None else list(inline)
+    unknown = [column for column in selected if column not in inline]
+    if unknown:
+        raise KeyError(f"Unknown {name} columns: {', '.join(unknown)}")
+    lo, hi = 0, None
+    if start_date is not None or end_date is not None:
+        lo, hi = date_range(inline["date"], start_date, end_date)
+    rows = _page(lo, hi, offset, limit)
+    return {column: inline[column][rows] for column in selected}
+
+
+def _inline_columns(result, name: str) -> Optional[Dict[str, np.ndarray]]:
+    """Columns of a series stored in the result's JSON (results written before the store)."""
+    metrics = result.metrics or {}
+    if name == "equity" and metrics.get("dates"):
+        columns = {"date": np.asarray(metrics["dates"], dtype="datetime64[D]")}
+        for column, field in (("equity", "equity_curve"), ("returns", "returns"), ("turnover", "turnover")):
+            if field in metrics:
+                columns[column] = np.asarray(metrics[field], dtype=float)
+        return columns
+    if name == "trades" and (result.trades or {}).get("trades"):
+        trades = result.trades["trades"]
+        columns = {"date": np.asarray([trade["date"] for trade in trades], dtype="datetime64[D]")}
+        columns["instrument"] = np.asarray([trade["instrument"] for trade in trades], dtype=str)
+        for column in ARTIFACT_COLUMNS["trades"][2:]:
+            columns[column] = np.asarray(
+                [np.nan if trade.get(column) is None else trade[column] for trade in trades], dtype=float
+            )
+        return columns
+    return None
+
+
+@lru_cache()
+def get_result_store() -> BacktestResultStore:
+    """Process-wide result store under RESULT_DIR/backtests."""
+    from app.config import settings
+    return BacktestResultStore(Path(settings.RESULT_DIR) / "backtests")
@@ -0,0 +1,167 @@
+"""
+Return-Series Risk Analytics
+
+Vectorized risk and distribution statistics of a backtest's daily returns:
+
+- Historical VaR / CVaR (empirical quantile and tail mean)
+- Parametric VaR / CVaR (normal distribution fitted to the returns)
+- Annualized volatility, rolling volatility and downside deviation
+- Sortino and Calmar ratios
+- Return distribution (moments, up/down days, histogram)
+
+Losses are reported as positive fractions, like ``max_drawdown`` on
+BacktestResult. Statistics that need more observations than available
+are None.
+"""
+
+from statistics import NormalDist
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from app.modules.common.utils.return_statistics import ANNUALIZATION, to_json_list
+
+# Confidence levels of VaR / CVaR
+CONFIDENCE_LEVELS = (0.95, 0.99)
+
+# Dates per rolling volatility window
+ROLLING_WINDOW = 20
+
+# Bins of the return histogram
+HISTOGRAM_BINS = 50
+
+
+def value_at_risk(returns: np.ndarray, confidence: float) -> Dict[str, Optional[float]]:
+    """
+    Historical and parametric one-period VaR and CVaR.
+
+    Args:
+        returns: Per-period returns without NaN
+        confidence: Confidence level, e.g. 0.95
+
+    Returns:
+        Dict with historical_var, historical_cvar, parametric_var and
+        parametric_cvar (positive = loss)
+    """
+    if returns.size < 2:
+        return {"historical_var": None, "historical_cvar": None, "parametric_var": None, "parametric_cvar": None}
+
+    tail = 1.0 - confidence
+    cutoff = np.quantile(returns, tail)
+    mean, std = float(returns.mean()), float(returns.std(ddof=1))
+    z = NormalDist().inv_cdf(tail)
+    return {
+        "historical_var": float(-cutoff),
+        "historical_cvar": float(-returns[returns <= cutoff].mean()),
+        "parametric_var": -(mean + z * std),
+        "parametric_cvar": -(mean - std * NormalDist().pdf(z) / tail),
+    }
+
+
+def rolling_volatility(
+    returns: np.ndarray,
+    window: int = ROLLING_WINDOW,
+    periods_per_year: int = ANNUALIZATION
+) -> np.ndarray:
+    """
+    Annualized volatility over trailing windows.
+
+    Returns:
+        One value per period; NaN for the first window - 1 periods
+    """
+    result = np.full(returns.size, np.nan)
+    if returns.size >= window > 1:
+        windows = sliding_window_view(returns, window)
+        result[window - 1:] = windows.std(axis=1, ddof=1) * np.sqrt(periods_per_year)
+    return result
+
+
+def risk_report(
+    returns: np.ndarray,
+    dates: Optional[np.ndarray] = None,
+    periods_per_year: int = ANNUALIZATION,
+    confidence_levels: Sequence[float] = CONFIDENCE_LEVELS,
+    window: int = ROLLING_WINDOW,
+    bins: int = HISTOGRAM_BINS
+) -> Dict[str, Any]:
+    """
+    Risk and return-distribution statistics of a return series.
+
+    Args:
+        returns: Per-period returns (NaN periods are skipped)
+        dates: Dates of the returns (for the rolling volatility series)
+        periods_per_year: Periods per year for annualization
+        confidence_levels: VaR / CVaR confidence levels
+        window: Rolling volatility window
+        bins: Histogram bins
+
+    Returns:
+        JSON-safe dict with ``risk`` (volatility, downside deviation, ratios,
+        VaR / CVaR per confidence level), ``rolling_volatility`` and
+        ``distribution`` (moments, day counts, histogram)
+    """
+    valid = ~np.isnan(returns)
+    values = returns[valid]
+    n = values.size
+    ann = np.sqrt(periods_per_year)
+
+    std = float(values.std(ddof=1)) if n > 1 else None
+    mean = float(values.mean()) if n else None
+    downside = float(np.sqrt(np.mean(np.minimum(values, 0.0) ** 2)) * ann) if n else None
+    wealth = np.cumprod(1.0 + values)
+    max_drawdown = float(-(wealth / np.maximum.accumulate(np.maximum(wealth, 1.0)) - 1.0).min()) if n else None
+    total = float(wealth[-1] - 1.0) if n else None
+    annual_return = (
+        float((1.0 + total) ** (periods_per_year / n) - 1.0) if total is not None and total > -1 else
+        (-1.0 if n else None)
+    )
+
+    risk: Dict[str, Any] = {
+        "n_periods": int(n),
+        "volatility": std * ann if std is not None else None,
+        "downside_deviation": downside,
+        "max_drawdown": max_drawdown,
+        "annual_return": annual_return,
+        "sortino_ratio": mean * periods_per_year / downside if downside else None,
+        "calmar_ratio": annual_return / max_drawdown if max_drawdown else None,
+    }
+    for confidence in confidence_levels:
+        suffix = f"{int(round(confidence * 100))}"
+        for key, value in value_at_risk(values, confidence).items():
+            risk[f"{key}_{suffix}"] = value
+
+    rolling = rolling_volatility(values, window, periods_per_year)
+    rolling_dates = (
+        [str(d) for d in np.asarray(dates)[valid].astype("datetime64[D]")] if dates is not None else None
+    )
+
+    if n:
+        counts, edges = np.histogram(values, bins=bins)
+        centered = values - mean
+        m2 = float(np.mean(centered ** 2))
+        distribution = {
+            "mean": mean,
+            "median": float(np.median(values)),
+            "std": std,
+            "skewness": float(np.mean(centered ** 3) / m2 ** 1.5) if m2 > 0 else None,
+            "excess_kurtosis": float(np.mean(centered ** 4) / m2 ** 2 - 3.0) if m2 > 0 else None,
+            "best": float(values.max()),
+            "worst": float(values.min()),
+            "positive_days": int((values > 0).sum()),
+            "negative_days": int((values < 0).sum()),
+            "flat_days": int((values == 0).sum()),
+            "histogram": {"edges": to_json_list(edges, 8), "counts": counts.tolist()},
+        }
+    else:
+        distribution = {
+            "mean": None, "median": None, "std": None, "skewness": None, "excess_kurtosis": None,
+            "best": None, "worst": None, "positive_days": 0, "negative_days": 0, "flat_days": 0,
+            "histogram": {"edges": [], "counts": []},
+        }
+
+    return {
+        "risk": risk,
+        "rolling_volatility": {"window": window, "dates": rolling_dates, "values": to_json_list(rolling)},
+        "distribution": distribution,
+    }
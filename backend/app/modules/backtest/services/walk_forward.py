@@ -0,0 +1,475 @@
+"""
+Walk-Forward Analysis
+
+Out-of-sample validation of a strategy over its backtest period. The period
+is split into folds, each an in-sample (IS) window followed by the
+out-of-sample (OOS) window right after it:
+
+    rolling:   [ IS 1 ][OOS 1]
+                      [ IS 2 ][OOS 2]
+                             [ IS 3 ][OOS 3]
+    anchored:  [ IS 1 ][OOS 1]
+               [ IS 2        ][OOS 2]
+               [ IS 3               ][OOS 3]
+
+OOS windows tile the end of the period without overlapping. In every fold
+the candidates (the strategy's signal, or every combination of a parameter
+grid) are backtested in-sample, the best by the objective is selected and
+then backtested out-of-sample. How much of the IS performance survives OOS
+is reported as a degradation ratio (OOS Sharpe / IS Sharpe).
+
+The deflated Sharpe ratio (Bailey & Lopez de Prado, 2014) is the
+probability that a Sharpe ratio is positive after correcting for the
+number of trials it was selected from and for non-normal returns: the
+probabilistic Sharpe ratio against the Sharpe ratio the best of
+``n_trials`` skill-less trials would be expected to reach.
+
+Folds run in parallel over one loaded panel, shared with the workers the
+same way as parameter sweeps (see optimization.chunk_runner). Formulas are
+evaluated up to the last OOS date of a fold, so no fold sees later data.
+"""
+
+import math
+import multiprocessing
+import time
+from statistics import NormalDist
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.modules.backtest.exceptions import InvalidConfigError
+from app.modules.backtest.services import backtest_engine
+from app.modules.backtest.services.optimization import (
+    CANDIDATE_METRICS,
+    Leaderboard,
+    candidate_signal,
+    chunk_candidates,
+    chunk_runner,
+    simulate_candidate,
+    sweep_panel,
+)
+from app.modules.common.utils.return_statistics import ANNUALIZATION
+from app.modules.data_management.services.dataset_panel import DatasetPanel
+from app.modules.indicator.exceptions import FactorEvaluationError, FormulaCompileError
+from app.modules.indicator.services.factor_batch import SharedPanelSpec, attach_panel
+
+# Shortest in-sample and out-of-sample windows (dates)
+MIN_WINDOW = 5
+
+EULER_GAMMA = 0.5772156649015329
+
+# Async progress callback: (folds done, folds total, finished fold)
+FoldProgressCallback = Callable[[int, int, Dict[str, Any]], Any]
+
+
+# ===================== Folds =====================
+
+def walk_forward_folds(
+    n_dates: int,
+    n_folds: int,
+    in_sample_ratio: float,
+    anchored: bool = False
+) -> List[Dict[str, int]]:
+    """
+    In-sample / out-of-sample row ranges of walk-forward folds.
+
+    OOS windows have equal length and tile the end of the period; the first
+    in-sample window takes ``in_sample_ratio`` of the first fold's dates
+    plus any remainder. Rolling folds keep that in-sample length, anchored
+    folds grow it from the first date.
+
+    Args:
+        n_dates: Dates in the period
+        n_folds: Number of folds
+        in_sample_ratio: In-sample share of a rolling fold, in (0, 1)
+        anchored: Start every in-sample window at the first date
+
+    Returns:
+        Per fold: in_sample_start, in_sample_stop (= first OOS row) and
+        out_of_sample_stop, as rows [start, stop) of the period
+
+    Raises:
+        InvalidConfigError: If the options are invalid or a window would be
+            shorter than MIN_WINDOW dates
+    """
+    if not isinstance(n_folds, int) or n_folds < 1:
+        raise InvalidConfigError("n_folds must be a positive integer")
+    if not 0 < in_sample_ratio < 1:
+        raise InvalidConfigError("in_sample_ratio must be between 0 and 1")
+
+    out_of_sample = int(n_dates / (n_folds + in_sample_ratio / (1.0 - in_sample_ratio)))
+    in_sample = n_dates - n_folds * out_of_sample
+    if out_of_sample < MIN_WINDOW or in_sample < MIN_WINDOW:
+        raise InvalidConfigError(
+            f"{n_dates} dates are too few for {n_folds} folds with in_sample_ratio {in_sample_ratio}: "
+            f"windows need at least {MIN_WINDOW} dates"
+        )
+
+    folds = []
+    for fold in range(n_folds):
+        split = in_sample + fold * out_of_sample
+        folds.append({
+            "in_sample_start": 0 if anchored else split - in_sample,
+            "in_sample_stop": split,
+            "out_of_sample_stop": split + out_of_sample,
+        })
+    return folds
+
+
+# ===================== Statistics =====================
+
+def return_moments(returns: np.ndarray) -> Dict[str, Optional[float]]:
+    """
+    Per-period Sharpe ratio and higher moments of a return series.
+
+    Args:
+        returns: Per-period returns (NaN periods are skipped)
+
+    Returns:
+        Dict with n, sharpe (not annualized), skewness and excess_kurtosis
+        (None where undefined)
+    """
+    values = returns[~np.isnan(returns)]
+    n = values.size
+    std = float(values.std(ddof=1)) if n > 1 else 0.0
+    if std == 0.0:
+        return {"n": int(n), "sharpe": None, "skewness": None, "excess_kurtosis": None}
+    centered = values - values.mean()
+    m2 = float(np.mean(centered ** 2))
+    return {
+        "n": int(n),
+        "sharpe": float(values.mean()) / std,
+        "skewness": float(np.mean(centered ** 3) / m2 ** 1.5),
+        "excess_kurtosis": float(np.mean(centered ** 4) / m2 ** 2 - 3.0),
+    }
+
+
+def probabilistic_sharpe_ratio(
+    sharpe: float,
+    n: int,
+    skewness: float = 0.0,
+    excess_kurtosis: float = 0.0,
+    benchmark: float = 0.0
+) -> Optional[float]:
+    """
+    Probability that the true Sharpe ratio exceeds a benchmark.
+
+    Args:
+        sharpe: Observed per-period Sharpe ratio
+        n: Number of return observations
+        skewness: Skewness of the returns
+        excess_kurtosis: Excess kurtosis of the returns
+        benchmark: Per-period Sharpe ratio to beat
+
+    Returns:
+        Probability in [0, 1], or None with fewer than 2 observations
+    """
+    if n < 2:
+        return None
+    variance = 1.0 - skewness * sharpe + (excess_kurtosis + 2.0) / 4.0 * sharpe ** 2
+    if variance <= 0:
+        return None
+    return NormalDist().cdf((sharpe - benchmark) * math.sqrt(n - 1) / math.sqrt(variance))
+
+
+def expected_max_sharpe(n_trials: int, variance: float) -> float:
+    """
+    Expected maximum Sharpe ratio of ``n_trials`` trials without skill.
+
+    Args:
+        n_trials: Number of independent trials
+        variance: Variance of the trials' (per-period) Sharpe ratios
+
+    Returns:
+        Expected maximum per-period Sharpe ratio (0 for a single trial)
+    """
+    if n_trials <= 1 or variance <= 0:
+        return 0.0
+    normal = NormalDist()
+    return math.sqrt(variance) * (
+        (1.0 - EULER_GAMMA) * normal.inv_cdf(1.0 - 1.0 / n_trials)
+        + EULER_GAMMA * normal.inv_cdf(1.0 - 1.0 / (n_trials * math.e))
+    )
+
+
+def deflated_sharpe_ratio(
+    returns: np.ndarray,
+    n_trials: int,
+    sharpe_variance: float,
+    periods_per_year: int = ANNUALIZATION
+) -> Dict[str, Any]:
+    """
+    Deflated Sharpe ratio of a return series selected among several trials.
+
+    Args:
+        returns: Per-period returns of the selected strategy
+        n_trials: Number of configurations tried
+        sharpe_variance: Variance of the trials' per-period Sharpe ratios
+        periods_per_year: Periods per year for the annualized Sharpe ratio
+
+    Returns:
+        Dict with sharpe_ratio (annualized), n_periods, n_trials,
+        expected_max_sharpe (annualized), probabilistic_sharpe_ratio
+        (against 0) and deflated_sharpe_ratio (None where undefined)
+    """
+    moments = return_moments(returns)
+    benchmark = expected_max_sharpe(n_trials, sharpe_variance)
+    ann = math.sqrt(periods_per_year)
+    report = {
+        "sharpe_ratio": moments["sharpe"] * ann if moments["sharpe"] is not None else None,
+        "n_periods": moments["n"],
+        "n_trials": n_trials,
+        "expected_max_sharpe": benchmark * ann,
+        "probabilistic_sharpe_ratio": None,
+        "deflated_sharpe_ratio": None,
+    }
+    if moments["sharpe"] is not None:
+        args = (moments["sharpe"], moments["n"], moments["skewness"], moments["excess_kurtosis"])
+        report["probabilistic_sharpe_ratio"] = probabilistic_sharpe_ratio(*args)
+        report["deflated_sharpe_ratio"] = probabilistic_sharpe_ratio(*args, benchmark=benchmark)
+    return report
+
+
+def degradation_ratio(in_sample: Optional[float], out_of_sample: Optional[float]) -> Optional[float]:
+    """OOS / IS Sharpe ratio; None unless the in-sample Sharpe ratio is positive."""
+    if in_sample is None or out_of_sample is None or in_sample <= 0:
+        return None
+    return out_of_sample / in_sample
+
+
+# ===================== Workers =====================
+
+def _run_fold(
+    panel: DatasetPanel,
+    task: Tuple[int, Dict[str, int], List[Tuple[int, Dict[str, Any], Dict[str, Any]]], str],
+    rows: Tuple[int, int],
+    costs: Tuple[float, float, float]
+) -> Dict[str, Any]:
+    """
+    Select the best candidate in-sample and backtest it out-of-sample.
+
+    Args:
+        panel: Full panel (SHARED_SIGNAL holds a parameter-independent signal)
+        task: (fold number, fold rows relative to ``rows``, candidates as
+            (index, parameters, resolved signal configuration), objective)
+        rows: Date rows [start, stop) of the whole period
+        costs: (initial capital, commission rate, slippage)
+
+    Returns:
+        Fold result with its dates, selected params, in-sample and
+        out-of-sample metrics, OOS returns, every candidate's in-sample
+        Sharpe ratio and failed candidates
+    """
+    number, fold, candidates, objective = task
+    begin = time.perf_counter()
+    offset = rows[0]
+    is_start, split, oos_stop = (
+        offset + fold["in_sample_start"], offset + fold["in_sample_stop"], offset + fold["out_of_sample_stop"]
+    )
+
+    board = Leaderboard(objective, 1)
+    selected = None
+    in_sample_sharpes: List[float] = []
+    failed: List[Dict[str, Any]] = []
+    specs = [spec for _, _, spec in candidates]
+    for group in chunk_candidates(specs, len(specs)):
+        spec = specs[group[0]]
+        try:
+            signal = candidate_signal(panel, spec, oos_stop)
+            prices = panel.field(spec["price_field"])
+        except (FormulaCompileError, FactorEvaluationError, KeyError) as e:
+            error = str(e.args[0]) if isinstance(e, KeyError) else str(e)
+            failed.extend({"index": candidates[i][0], "params": candidates[i][1], "error": error} for i in group)
+            continue
+        for i in group:
+            index, params, candidate = candidates[i]
+            run = simulate_candidate(candidate, signal[is_start:split], prices[is_start:split], costs)
+            summary = backtest_engine.performance_metrics(run)
+            in_sample_sharpes.append(summary["sharpe_ratio"])
+            entry = {"index": index, "params": params, "metrics": {m: summary[m] for m in CANDIDATE_METRICS}}
+            if board.add(entry):
+                selected = (entry, candidate, signal, prices)
+
+    result = {
+        "fold": number,
+        "in_sample_start": str(panel.dates[is_start])[:10],
+        "in_sample_end": str(panel.dates[split - 1])[:10],
+        "out_of_sample_start": str(panel.dates[split])[:10],
+        "out_of_sample_end": str(panel.dates[oos_stop - 1])[:10],
+        "in_sample_dates": split - is_start,
+        "out_of_sample_dates": oos_stop - split,
+        "in_sample_sharpes": in_sample_sharpes,
+        "failed": failed,
+    }
+    if selected is None:
+        return {**result, "error": "Every candidate failed", "seconds": time.perf_counter() - begin}
+
+    entry, candidate, signal, prices = selected
+    run = simulate_candidate(candidate, signal[split:oos_stop], prices[split:oos_stop], costs)
+    summary = backtest_engine.performance_metrics(run)
+    in_sharpe, out_sharpe = entry["metrics"]["sharpe_ratio"], summary["sharpe_ratio"]
+    return {
+        **result,
+        "params": entry["params"],
+        "in_sample": entry["metrics"],
+        "out_of_sample": {m: summary[m] for m in CANDIDATE_METRICS},
+        "degradation_ratio": degradation_ratio(in_sharpe, out_sharpe),
+        "out_of_sample_returns": run.returns,
+        "seconds": time.perf_counter() - begin,
+    }
+
+
+def _run_shared_fold(
+    spec: SharedPanelSpec,
+    task: Tuple[int, Dict[str, int], List[Tuple[int, Dict[str, Any], Dict[str, Any]]], str],
+    rows: Tuple[int, int],
+    costs: Tuple[float, float, float]
+) -> Dict[str, Any]:
+    """Process pool entry point: attach to the shared panel and run a fold."""
+    memory, panel = attach_panel(spec)
+    try:
+        return _run_fold(panel, task, rows, costs)
+    finally:
+        del panel
+        memory.close()
+
+
+async def run_folds(
+    panel: DatasetPanel,
+    folds: Sequence[Dict[str, int]],
+    specs: Sequence[Dict[str, Any]],
+    params: Sequence[Dict[str, Any]],
+    rows: Tuple[int, int],
+    costs: Tuple[float, float, float],
+    objective: str = "sharpe_ratio",
+    signal: Optional[np.ndarray] = None,
+    max_workers: Optional[int] = None,
+    progress: Optional[FoldProgressCallback] = None
+) -> List[Dict[str, Any]]:
+    """
+    Run walk-forward folds in parallel over one panel.
+
+    Args:
+        panel: Full dataset panel
+        folds: Fold rows relative to ``rows`` (see walk_forward_folds)
+        specs: Resolved signal configuration per candidate; ``formula``
+            is None where the candidate trades ``signal``
+        params: Parameters per candidate
+        rows: Date rows [start, stop) of the whole period
+        costs: (initial capital, commission rate, slippage)
+        objective: In-sample selection metric (a key of OBJECTIVES)
+        signal: Parameter-independent signal for specs without a formula
+        max_workers: Worker count (default: CPU count)
+        progress: Async callback receiving (done, total, fold result)
+
+    Returns:
+        Fold results of _run_fold, in fold order
+
+    Raises:
+        InvalidConfigError: If the objective is unknown
+    """
+    Leaderboard(objective, 1)
+    candidates = [(index, params[index], spec) for index, spec in enumerate(specs)]
+    tasks = [(number, fold, candidates, objective) for number, fold in enumerate(folds, 1)]
+    workers = min(max_workers or multiprocessing.cpu_count(), len(tasks))
+
+    results: List[Dict[str, Any]] = []
+    with chunk_runner(sweep_panel(panel, specs, signal), workers, _run_fold, _run_shared_fold) as runner:
+        async for fold in runner.map(tasks, rows, costs):
+            results.append(fold)
+            if progress:
+                await progress(len(results), len(tasks), fold)
+    return sorted(results, key=lambda fold: fold["fold"])
+
+
+# ===================== Report =====================
+
+def walk_forward_summary(
+    folds: Sequence[Dict[str, Any]],
+    n_trials: int,
+    returns: Optional[np.ndarray] = None,
+    periods_per_year: int = ANNUALIZATION
+) -> Dict[str, Any]:
+    """
+    Aggregate statistics of finished folds.
+
+    Args:
+        folds: Fold results of _run_fold
+        n_trials: Configurations tried when selecting the strategy
+        returns: Daily returns of the full backtest, deflated for n_trials
+            (default: the concatenated out-of-sample returns)
+        periods_per_year: Periods per year for annualization
+
+    Returns:
+        Dict with mean in-sample and out-of-sample Sharpe ratios, the
+        degradation ratio of the means, the share of folds with a positive
+        OOS Sharpe ratio, OOS performance of the concatenated OOS returns
+        and the deflated Sharpe ratio
+    """
+    completed = [fold for fold in folds if "error" not in fold]
+    in_sharpes = [fold["in_sample"]["sharpe_ratio"] for fold in completed]
+    out_sharpes = [fold["out_of_sample"]["sharpe_ratio"] for fold in completed]
+    mean_in = float(np.mean(in_sharpes)) if completed else None
+    mean_out = float(np.mean(out_sharpes)) if completed else None
+
+    oos_returns = (
+        np.concatenate([np.asarray(fold["out_of_sample_returns"], dtype=float) for fold in completed])
+        if completed else np.zeros(0)
+    )
+    oos_moments = return_moments(oos_returns)
+
+    # Spread of the trials' Sharpe ratios, averaged over the folds
+    ann = math.sqrt(periods_per_year)
+    variances = [
+        float(np.var(np.asarray(fold["in_sample_sharpes"]) / ann, ddof=1))
+        for fold in completed if len(fold["in_sample_sharpes"]) > 1
+    ]
+    sharpe_variance = float(np.mean(variances)) if variances else 0.0
+
+    return {
+        "folds": len(folds),
+        "completed_folds": len(completed),
+        "in_sample_sharpe": mean_in,
+        "out_of_sample_sharpe": mean_out,
+        "degradation_ratio": degradation_ratio(mean_in, mean_out),
+        "positive_out_of_sample_folds": (
+            sum(sharpe > 0 for sharpe in out_sharpes) / len(completed) if completed else None
+        ),
+        "out_of_sample": {
+            "n_periods": oos_moments["n"],
+            "total_return": float(np.prod(1.0 + oos_returns[~np.isnan(oos_returns)]) - 1.0) if completed else None,
+            "sharpe_ratio": oos_moments["sharpe"] * ann if oos_moments["sharpe"] is not None else None,
+            "probabilistic_sharpe_ratio": (
+                probabilistic_sharpe_ratio(
+                    oos_moments["sharpe"], oos_moments["n"],
+                    oos_moments["skewness"], oos_moments["excess_kurtosis"]
+                ) if oos_moments["sharpe"] is not None else None
+            ),
+        },
+        "deflated_sharpe": deflated_sharpe_ratio(
+            oos_returns if returns is None else returns, n_trials, sharpe_variance, periods_per_year
+        ),
+        "sharpe_variance": sharpe_variance * periods_per_year,
+    }
+
+
+def overfitting_score(summary: Dict[str, Any]) -> Optional[float]:
+    """
+    Overfitting score in [0, 1] of a walk-forward summary.
+
+    The mean of the lost share of in-sample performance
+    (1 - degradation ratio, clipped to [0, 1]; 1 if the in-sample Sharpe
+    ratio is not positive) and the probability that the Sharpe ratio is
+    not genuine (1 - deflated Sharpe ratio).
+
+    Returns:
+        Score (0: no sign of overfitting), or None without completed folds
+    """
+    if not summary["completed_folds"]:
+        return None
+    ratio = summary["degradation_ratio"]
+    parts = [1.0 if ratio is None else min(max(1.0 - ratio, 0.0), 1.0)]
+    deflated = summary["deflated_sharpe"]["deflated_sharpe_ratio"]
+    if deflated is not None:
+        parts.append(1.0 - deflated)
+    return float(np.mean(parts))
@@ -2,13 +2,11 @@
 Backtest Tasks Module
 
 Celery tasks for asynchronous backtesting operations.
-TODO: Implement backtest tasks when backtest module is ready.
 """
 
-from app.celery_app import celery_app
+from app.modules.backtest.tasks.backtest_tasks import run_backtest, run_batch_backtest
+from app.modules.backtest.tasks.export_tasks import export_report
+from app.modules.backtest.tasks.optimization_tasks import run_optimization
+from app.modules.backtest.tasks.walk_forward_tasks import run_walk_forward
 
-
-@celery_app.task(name="app.modules.backtest.tasks.placeholder")
-def placeholder_task():
-    """Placeholder task for backtest module."""
-    return {"message": "Backtest tasks not yet implemented"}
+__all__ = ["export_report", "run_backtest", "run_batch_backtest", "run_optimization", "run_walk_forward"]
@@ -0,0 +1,157 @@
+"""
+Backtest Tasks
+
+Celery tasks for running backtests on the backtest queue.
+"""
+
+import asyncio
+from typing import Any, Dict, List
+
+from celery.utils.log import get_task_logger
+
+from app.celery_app import celery_app
+from app.database.repositories.backtest_repository import BacktestRepository
+from app.database.session import init_session_maker
+from app.modules.backtest.exceptions import BacktestError
+from app.modules.backtest.services.execution_service import BacktestExecutionService
+from app.modules.data_management.services.dataset_panel import PanelLoadError
+
+logger = get_task_logger(__name__)
+
+
+# Initialize session maker on module import
+async_session_maker = init_session_maker()
+
+
+@celery_app.task(
+    bind=True,
+    name="app.modules.backtest.tasks.run_backtest",
+    max_retries=3,
+    default_retry_delay=60,
+)
+def run_backtest(self, result_id: str) -> Dict[str, Any]:
+    """
+    Run a pending backtest asynchronously.
+
+    Status and metrics are stored on the BacktestResult record.
+
+    Args:
+        result_id: BacktestResult ID
+
+    Returns:
+        Dict with backtest status and headline metrics
+    """
+
+    async def _run():
+        """Inner async function for the backtest run."""
+        session = None
+        try:
+            session = async_session_maker()
+            service = BacktestExecutionService(BacktestRepository(session))
+
+            result = await service.run_backtest(result_id)
+            return {
+                "success": True,
+                "result_id": result_id,
+                "status": result.status,
+                "total_return": str(result.total_return),
+                "sharpe_ratio": str(result.sharpe_ratio),
+                "max_drawdown": str(result.max_drawdown),
+            }
+
+        except (BacktestError, PanelLoadError) as e:
+            # Missing records, bad configuration or unreadable data: retrying will not help
+            logger.error(f"Backtest {result_id} failed: {e}")
+            return {"success": False, "result_id": result_id, "error": str(e)}
+
+        except Exception as e:
+            logger.error(
+                f"Error running backtest {result_id}: {str(e)}",
+                exc_info=True,
+            )
+            if "database" in str(e).lower() or "connection" in str(e).lower():
+                raise self.retry(exc=e)
+            raise
+
+        finally:
+            if session:
+                await session.close()
+
+    # Run async function in event loop
+    try:
+        loop = asyncio.get_event_loop()
+    except RuntimeError:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+    return loop.run_until_complete(_run())
+
+
+@celery_app.task(
+    bind=True,
+    name="app.modules.backtest.tasks.run_batch_backtest",
+    max_retries=3,
+    default_retry_delay=60,
+)
+def run_batch_backtest(self, result_ids: List[str]) -> Dict[str, Any]:
+    """
+    Run pending backtests that share one dataset and date range together.
+
+    The dataset is loaded once for all strategies; status and metrics are
+    stored on each BacktestResult record.
+
+    Args:
+        result_ids: BacktestResult IDs created by start_batch_backtest
+
+    Returns:
+        Dict with each result's status and headline metrics
+    """
+
+    async def _run():
+        """Inner async function for the batch run."""
+        session = None
+        try:
+            session = async_session_maker()
+            service = BacktestExecutionService(BacktestRepository(session))
+
+            results = await service.run_batch_backtest(result_ids)
+            return {
+                "success": True,
+                "results": [
+                    {
+                        "result_id": result.id,
+                        "status": result.status,
+                        "total_return": str(result.total_return),
+                        "sharpe_ratio": str(result.sharpe_ratio),
+                        "max_drawdown": str(result.max_drawdown),
+                    }
+                    for result in results
+                ],
+            }
+
+        except (BacktestError, PanelLoadError) as e:
+            # Missing records, bad configuration or unreadable data: retrying will not help
+            logger.error(f"Batch backtest of {len(result_ids)} results failed: {e}")
+            return {"success": False, "result_ids": result_ids, "error": str(e)}
+
+        except Exception as e:
+            logger.error(
+                f"Error running batch backtest: {str(e)}",
+                exc_info=True,
+            )
+            if "database" in str(e).lower() or "connection" in str(e).lower():
+                raise self.retry(exc=e)
+            raise
+
+        finally:
+            if session:
+                await session.close()
+
+    # Run async function in event loop
+    try:
+        loop = asyncio.get_event_loop()
+    except RuntimeError:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+    return loop.run_until_complete(_run())
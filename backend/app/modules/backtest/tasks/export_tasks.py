@@ -0,0 +1,108 @@
+"""
+Export Tasks
+
+Celery task rendering backtest reports (REPORT_EXPORT tasks) on the
+backtest queue. Progress is stored on the Task record and the report is
+cached in the result store, where the download endpoint serves it from.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict
+
+from celery.utils.log import get_task_logger
+
+from app.celery_app import celery_app
+from app.database.repositories.backtest_repository import BacktestRepository
+from app.database.repositories.task_repository import TaskRepository
+from app.database.session import init_session_maker
+from app.modules.backtest.exceptions import BacktestError
+from app.modules.backtest.services.export_service import ExportService
+from app.modules.task_scheduling.services.task_service import TaskService
+
+logger = get_task_logger(__name__)
+
+# Minimum seconds between progress writes
+PROGRESS_INTERVAL = 1.0
+
+
+# Initialize session maker on module import
+async_session_maker = init_session_maker()
+
+
+@celery_app.task(
+    bind=True,
+    name="app.modules.backtest.tasks.export_report",
+    max_retries=3,
+    default_retry_delay=60,
+)
+def export_report(self, task_id: str) -> Dict[str, Any]:
+    """
+    Render a backtest report asynchronously.
+
+    Task params: result_id and format (xlsx, pdf or html).
+
+    Args:
+        task_id: REPORT_EXPORT Task ID
+
+    Returns:
+        Dict with the report's format, size and whether it was cached
+    """
+
+    async def _run():
+        """Inner async function for the export."""
+        session = None
+        task_service = None
+        try:
+            session = async_session_maker()
+            task_service = TaskService(TaskRepository(session))
+
+            task = await task_service.start_task(task_id)
+            result_id = task.params["result_id"]
+            report_format = task.params["format"]
+            last_report = 0.0
+
+            async def report(fraction: float, step: str) -> None:
+                nonlocal last_report
+                now = time.monotonic()
+                if fraction < 1.0 and now - last_report < PROGRESS_INTERVAL:
+                    return
+                last_report = now
+                await task_service.update_progress(task_id, round(99.0 * fraction, 1), current_step=step)
+
+            service = ExportService(BacktestRepository(session))
+            result = await service.build_report(result_id, report_format, progress=report)
+
+            summary = {key: result[key] for key in ("result_id", "format", "size", "cached")}
+            await task_service.complete_task(task_id, summary)
+            return {"success": True, "task_id": task_id, **summary}
+
+        except BacktestError as e:
+            # Missing result or unknown format: retrying will not help
+            logger.error(f"Report export {task_id} failed: {e}")
+            await task_service.fail_task(task_id, str(e))
+            return {"success": False, "task_id": task_id, "error": str(e)}
+
+        except Exception as e:
+            logger.error(
+                f"Error in report export {task_id}: {str(e)}",
+                exc_info=True,
+            )
+            if "database" in str(e).lower() or "connection" in str(e).lower():
+                raise self.retry(exc=e)
+            if task_service:
+                await task_service.fail_task(task_id, str(e))
+            raise
+
+        finally:
+            if session:
+                await session.close()
+
+    # Run async function in event loop
+    try:
+        loop = asyncio.get_event_loop()
+    except RuntimeError:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+    return loop.run_until_complete(_run())
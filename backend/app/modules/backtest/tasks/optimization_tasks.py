@@ -0,0 +1,117 @@
+"""
+Optimization Tasks
+
+Celery task running parameter sweeps (OPTIMIZATION tasks) on the backtest
+queue. Status, progress and the leaderboard are stored on the Task record;
+the leaderboard is updated while the sweep runs.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, List
+
+from celery.utils.log import get_task_logger
+
+from app.celery_app import celery_app
+from app.database.repositories.backtest_repository import BacktestRepository
+from app.database.repositories.task_repository import TaskRepository
+from app.database.session import init_session_maker
+from app.modules.backtest.exceptions import BacktestError
+from app.modules.backtest.services.execution_service import BacktestExecutionService
+from app.modules.data_management.services.dataset_panel import PanelLoadError
+from app.modules.task_scheduling.services.task_service import TaskService
+
+logger = get_task_logger(__name__)
+
+# Minimum seconds between intermediate leaderboard writes
+PROGRESS_INTERVAL = 1.0
+
+
+# Initialize session maker on module import
+async_session_maker = init_session_maker()
+
+
+@celery_app.task(
+    bind=True,
+    name="app.modules.backtest.tasks.run_optimization",
+    max_retries=3,
+    default_retry_delay=60,
+)
+def run_optimization(self, task_id: str) -> Dict[str, Any]:
+    """
+    Run a parameter sweep asynchronously.
+
+    Task params: strategy_id, dataset_id and the options in
+    execution_service.OPTIMIZATION_DEFAULTS (grid or space, dates, costs,
+    objective, leaderboard_size, max_workers, search_mode).
+
+    Args:
+        task_id: OPTIMIZATION Task ID
+
+    Returns:
+        Dict with the run summary and best candidate
+    """
+
+    async def _run():
+        """Inner async function for the sweep."""
+        session = None
+        task_service = None
+        try:
+            session = async_session_maker()
+            task_service = TaskService(TaskRepository(session))
+
+            task = await task_service.start_task(task_id)
+            options = dict(task.params)
+            strategy_id = options.pop("strategy_id")
+            dataset_id = options.pop("dataset_id")
+            last_report = 0.0
+
+            async def report(done: int, total: int, leaderboard: List[Dict[str, Any]]) -> None:
+                nonlocal last_report
+                now = time.monotonic()
+                if done < total and now - last_report < PROGRESS_INTERVAL:
+                    return
+                last_report = now
+                await task_service.update_progress(
+                    task_id,
+                    round(5.0 + 95.0 * done / max(total, 1), 1),
+                    current_step=f"Backtested {done}/{total} candidates",
+                    partial_result={"leaderboard": leaderboard, "done": done, "total": total},
+                )
+
+            service = BacktestExecutionService(BacktestRepository(session))
+            result = await service.run_optimization(strategy_id, dataset_id, options, progress=report)
+
+            await task_service.complete_task(task_id, result)
+            best = result["leaderboard"][0] if result["leaderboard"] else None
+            return {"success": True, "task_id": task_id, "summary": result["summary"], "best": best}
+
+        except (BacktestError, PanelLoadError) as e:
+            # Missing records, bad options or unreadable data: retrying will not help
+            logger.error(f"Optimization {task_id} failed: {e}")
+            await task_service.fail_task(task_id, str(e))
+            return {"success": False, "task_id": task_id, "error": str(e)}
+
+        except Exception as e:
+            logger.error(
+                f"Error in optimization {task_id}: {str(e)}",
+                exc_info=True,
+            )
+            if "database" in str(e).lower() or "connection" in str(e).lower():
+                raise self.retry(exc=e)
+            if task_service:
+                await task_service.fail_task(task_id, str(e))
+            raise
+
+        finally:
+            if session:
+                await session.close()
+
+    # Run async function in event loop
+    try:
+        loop = asyncio.get_event_loop()
+    except RuntimeError:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+    return loop.run_until_complete(_run())
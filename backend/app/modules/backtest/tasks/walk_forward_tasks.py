@@ -0,0 +1,117 @@
+"""
+Walk-Forward Tasks
+
+Celery task running walk-forward analyses of backtest results (WALK_FORWARD
+tasks) on the optimization queue. Fold progress is stored on the Task
+record; the report is cached next to the result (see
+DiagnosticService.run_walk_forward) and stored as the task's result.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict
+
+from celery.utils.log import get_task_logger
+
+from app.celery_app import celery_app
+from app.database.repositories.backtest_repository import BacktestRepository
+from app.database.repositories.task_repository import TaskRepository
+from app.database.session import init_session_maker
+from app.modules.backtest.exceptions import BacktestError
+from app.modules.backtest.services.diagnostic_service import DiagnosticService
+from app.modules.data_management.services.dataset_panel import PanelLoadError
+from app.modules.task_scheduling.services.task_service import TaskService
+
+logger = get_task_logger(__name__)
+
+# Minimum seconds between progress writes
+PROGRESS_INTERVAL = 1.0
+
+
+# Initialize session maker on module import
+async_session_maker = init_session_maker()
+
+
+@celery_app.task(
+    bind=True,
+    name="app.modules.backtest.tasks.run_walk_forward",
+    max_retries=3,
+    default_retry_delay=60,
+)
+def run_walk_forward(self, task_id: str) -> Dict[str, Any]:
+    """
+    Run a walk-forward analysis asynchronously.
+
+    Task params: result_id and options (see
+    execution_service.WALK_FORWARD_DEFAULTS).
+
+    Args:
+        task_id: WALK_FORWARD Task ID
+
+    Returns:
+        Dict with the analysis summary
+    """
+
+    async def _run():
+        """Inner async function for the analysis."""
+        session = None
+        task_service = None
+        try:
+            session = async_session_maker()
+            task_service = TaskService(TaskRepository(session))
+
+            task = await task_service.start_task(task_id)
+            result_id = task.params["result_id"]
+            options = task.params.get("options") or {}
+            last_report = 0.0
+
+            async def report(done: int, total: int, fold: Dict[str, Any]) -> None:
+                nonlocal last_report
+                now = time.monotonic()
+                if done < total and now - last_report < PROGRESS_INTERVAL:
+                    return
+                last_report = now
+                await task_service.update_progress(
+                    task_id,
+                    round(5.0 + 90.0 * done / max(total, 1), 1),
+                    current_step=(
+                        f"Walk-forward fold {fold['fold']} of {total} "
+                        f"({fold['out_of_sample_start']} to {fold['out_of_sample_end']}) done"
+                    ),
+                )
+
+            service = DiagnosticService(BacktestRepository(session))
+            result = await service.run_walk_forward(result_id, options, progress=report)
+
+            await task_service.complete_task(task_id, result)
+            return {"success": True, "task_id": task_id, "summary": result["summary"]}
+
+        except (BacktestError, PanelLoadError) as e:
+            # Missing records, bad options or unreadable data: retrying will not help
+            logger.error(f"Walk-forward analysis {task_id} failed: {e}")
+            await task_service.fail_task(task_id, str(e))
+            return {"success": False, "task_id": task_id, "error": str(e)}
+
+        except Exception as e:
+            logger.error(
+                f"Error in walk-forward analysis {task_id}: {str(e)}",
+                exc_info=True,
+            )
+            if "database" in str(e).lower() or "connection" in str(e).lower():
+                raise self.retry(exc=e)
+            if task_service:
+                await task_service.fail_task(task_id, str(e))
+            raise
+
+        finally:
+            if session:
+                await session.close()
+
+    # Run async function in event loop
+    try:
+        loop = asyncio.get_event_loop()
+    except RuntimeError:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+    return loop.run_until_complete(_run())
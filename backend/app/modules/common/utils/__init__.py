@@ -1,5 +1,19 @@
 """Utility functions for the application."""
 
+from .return_statistics import (
+    ANNUALIZATION,
+    cumulative_returns,
+    rolling_sharpe,
+    summarize_returns,
+    to_json_list,
+)
 from .validators import validate_file_path
 
-__all__ = ["validate_file_path"]
+__all__ = [
+    "ANNUALIZATION",
+    "cumulative_returns",
+    "rolling_sharpe",
+    "summarize_returns",
+    "to_json_list",
+    "validate_file_path",
+]
@@ -0,0 +1,109 @@
+"""
+Return Statistics
+
+Performance statistics of per-date return series shared by factor
+validation, backtests and quick tests: compounding, return summaries
+(total and annual return, volatility, Sharpe ratio, max drawdown) and
+rolling Sharpe ratios, plus conversion of series to JSON-safe lists.
+"""
+
+from typing import Any, Dict
+
+import numpy as np
+
+# Trading dates per year
+ANNUALIZATION = 252
+
+
+def cumulative_returns(returns: np.ndarray) -> np.ndarray:
+    """
+    Compound per-date returns along the first axis (NaN = flat).
+
+    Args:
+        returns: Per-date returns (dates or dates x series)
+
+    Returns:
+        Cumulative returns with the same shape
+    """
+    return np.cumprod(1.0 + np.nan_to_num(returns), axis=0) - 1.0
+
+
+def summarize_returns(returns: np.ndarray, periods_per_year: int = ANNUALIZATION) -> Dict[str, Any]:
+    """
+    Performance statistics of a per-date return series.
+
+    Args:
+        returns: Per-date returns (NaN dates are skipped)
+        periods_per_year: Dates per year for annualization
+
+    Returns:
+        Dict with total_return, annual_return, annual_volatility, sharpe,
+        max_drawdown and n_periods (None where undefined)
+    """
+    values = returns[~np.isnan(returns)]
+    n = len(values)
+    if n == 0:
+        return {
+            "total_return": None, "annual_return": None, "annual_volatility": None,
+            "sharpe": None, "max_drawdown": None, "n_periods": 0,
+        }
+
+    wealth = np.cumprod(1.0 + values)
+    total = float(wealth[-1] - 1.0)
+    std = float(values.std(ddof=1)) if n > 1 else 0.0
+    peak = np.maximum.accumulate(np.concatenate(([1.0], wealth)))[1:]
+    return {
+        "total_return": total,
+        "annual_return": float((1.0 + total) ** (periods_per_year / n) - 1.0) if total > -1 else -1.0,
+        "annual_volatility": std * np.sqrt(periods_per_year),
+        "sharpe": float(values.mean() / std * np.sqrt(periods_per_year)) if std > 0 else None,
+        "max_drawdown": float((wealth / peak - 1.0).min()),
+        "n_periods": n,
+    }
+
+
+def rolling_sharpe(
+    returns: np.ndarray,
+    window: int,
+    periods_per_year: int = ANNUALIZATION
+) -> np.ndarray:
+    """
+    Annualized Sharpe ratio over a trailing window of dates.
+
+    Computed from running sums, so the cost does not depend on the window.
+    NaN dates are skipped; a window with fewer than 2 returns or zero
+    volatility gets NaN.
+
+    Args:
+        returns: Per-date returns
+        window: Trailing window in dates
+        periods_per_year: Dates per year for annualization
+
+    Returns:
+        float64 array with one value per date
+    """
+    if window < 2:
+        raise ValueError(f"window must be at least 2, got {window}")
+    valid = ~np.isnan(returns)
+    values = np.where(valid, returns, 0.0)
+
+    def trailing(x: np.ndarray) -> np.ndarray:
+        total = np.concatenate(([0.0], np.cumsum(x)))
+        return total[1:] - total[np.maximum(np.arange(1, len(x) + 1) - window, 0)]
+
+    count = trailing(valid.astype(float))
+    total = trailing(values)
+    squares = trailing(values * values)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = total / count
+        variance = np.maximum(squares - total * mean, 0.0) / (count - 1)
+        std = np.sqrt(variance)
+        sharpe = mean / std * np.sqrt(periods_per_year)
+    # Relative tolerance: a constant series leaves rounding noise in the variance
+    return np.where((count > 1) & (std > 1e-6 * np.abs(mean)), sharpe, np.nan)
+
+
+def to_json_list(values: np.ndarray, decimals: int = 6) -> list:
+    """Convert an array to a JSON-safe list (NaN -> None)."""
+    rounded = np.round(values.astype(float), decimals)
+    return [None if np.isnan(v) else v for v in rounded.tolist()]
@@ -2,7 +2,7 @@
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from loguru import logger
 import pandas as pd
 from datetime import datetime
@@ -22,6 +22,10 @@ from app.modules.data_management.schemas.chart import (
     AnnotationRequest
 )
 from app.modules.data_management.services.chart_service import ChartService
+from app.modules.data_management.services.indicator_cache import (
+    DatasetWindow,
+    get_indicator_cache
+)
 from app.modules.common.schemas.response import SuccessResponse, ErrorResponse
 from app.modules.data_management.utils.serialization import (
     prepare_chart_data_for_serialization,
@@ -133,6 +137,18 @@ async def list_charts(
         )
 
 
+@router.get("/indicator-cache/stats")
+async def get_indicator_cache_stats() -> Dict[str, Any]:
+    """
+    Get indicator result cache statistics.
+
+    Returns:
+        Entries, memory use, hits, misses, hit ratio, evictions and the
+        compute time saved by cache hits
+    """
+    return get_indicator_cache().stats()
+
+
 @router.get("/{chart_id}", response_model=ChartConfigResponse)
 async def get_chart(
     chart_id: str,
@@ -364,7 +380,13 @@ async def get_chart_data(
             result_with_indicators = chart_service.apply_indicators(
                 sample_data,
                 indicators=request.indicators,
-                params=params
+                params=params,
+                window=DatasetWindow(
+                    dataset_id=dataset.id,
+                    version=dataset.version,
+                    start_date=request.start_date,
+                    end_date=request.end_date
+                )
             )
             indicator_results = result_with_indicators["indicators"]
 
@@ -29,6 +29,8 @@ from app.modules.data_management.schemas.dataset import (
 from app.modules.common.logging import get_logger, set_correlation_id, get_correlation_id
 from app.modules.common.logging.decorators import log_async_execution
 from app.modules.common.security import sanitize_search, validate_pagination, InputValidator
+from app.modules.data_management.services.indicator_cache import get_indicator_cache
+from app.modules.indicator.services.factor_store import get_factor_store
 
 # Initialize logger for this module
 logger = get_logger(__name__)
@@ -393,6 +395,9 @@ async def update_dataset(
             commit=True
         )
 
+        # Cached indicators were computed from the previous contents
+        get_indicator_cache().invalidate_dataset(dataset_id)
+
         logger.info(
             f"Dataset updated successfully: id={dataset_id}, "
             f"updated_fields={list(update_data.keys())}"
@@ -471,6 +476,9 @@ async def delete_dataset(
                 detail=f"Dataset with id {dataset_id} not found"
             )
 
+        get_indicator_cache().invalidate_dataset(dataset_id)
+        get_factor_store().drop_dataset(dataset_id)
+
         delete_type = "hard" if hard_delete else "soft"
         logger.info(f"Dataset {delete_type} deleted successfully: id={dataset_id}")
 
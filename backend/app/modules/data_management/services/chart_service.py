@@ -17,6 +17,7 @@ from typing import Dict, Any, List, Optional, Union
 from io import StringIO
 from loguru import logger
 
+from app.modules.data_management.services.indicator_cache import DatasetWindow
 from app.modules.data_management.services.indicator_service import IndicatorService
 
 
@@ -206,7 +207,8 @@ class ChartService:
         self,
         data: pd.DataFrame,
         indicators: List[str],
-        params: Optional[Dict[str, Dict[str, Any]]] = None
+        params: Optional[Dict[str, Dict[str, Any]]] = None,
+        window: Optional[DatasetWindow] = None
     ) -> Dict[str, Any]:
         """
         Apply technical indicators to chart data.
@@ -215,6 +217,7 @@ class ChartService:
             data: DataFrame with OHLC data
             indicators: List of indicators to apply (max 3)
             params: Optional parameters for each indicator
+            window: Dataset slice of ``data``, enables the indicator result cache
 
         Returns:
             Dictionary with original data and indicator results
@@ -233,7 +236,8 @@ class ChartService:
             indicator_results = self.indicator_service.calculate_multiple_indicators(
                 data,
                 indicators=indicators,
-                params=params
+                params=params,
+                window=window
             )
 
             # Prepare result
@@ -0,0 +1,230 @@
+"""
+Dataset Panels
+
+Loads a dataset file into aligned (dates x instruments) arrays, one per
+field, for vectorized factor and indicator calculations.
+
+Dataset files are long format: one row per (date, instrument) with price
+columns (open, high, low, close, volume, ...). Datasets without an
+instrument column are treated as a single instrument. Cells with no row in
+the file (before listing, after delisting, suspensions) are NaN.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+
+DATE_COLUMNS = ("date", "datetime")
+INSTRUMENT_COLUMNS = ("instrument", "symbol", "code", "ticker", "stock_code", "ts_code")
+
+
+class PanelLoadError(Exception):
+    """Raised when a dataset cannot be turned into a panel."""
+    pass
+
+
+@dataclass
+class DatasetPanel:
+    """
+    Field arrays aligned on a common date and instrument axis.
+
+    Attributes:
+        dates: Sorted dates (datetime64[ns])
+        instruments: Instrument codes
+        fields: Field name (lower case) -> float array (dates x instruments)
+    """
+
+    dates: np.ndarray
+    instruments: np.ndarray
+    fields: Dict[str, np.ndarray]
+
+    @property
+    def shape(self):
+        """(number of dates, number of instruments)"""
+        return len(self.dates), len(self.instruments)
+
+    def field(self, name: str) -> np.ndarray:
+        """
+        Get a field array by (case-insensitive) name.
+
+        Raises:
+            KeyError: If the dataset has no such field
+        """
+        try:
+            return self.fields[name.lower()]
+        except KeyError:
+            raise KeyError(
+                f"Field '{name}' not in dataset. Available fields: {sorted(self.fields)}"
+            ) from None
+
+    def slice(
+        self,
+        start_date: Optional[Union[str, pd.Timestamp]] = None,
+        end_date: Optional[Union[str, pd.Timestamp]] = None,
+        instruments: Optional[Sequence[str]] = None
+    ) -> "DatasetPanel":
+        """
+        Restrict the panel to a date range and/or instrument subset.
+
+        Date ranges are inclusive. The result shares memory with this panel
+        unless the instrument subset is not an evenly spaced run of columns
+        (e.g. out of order), in which case the selected columns are copied.
+
+        Args:
+            start_date: First date to keep
+            end_date: Last date to keep
+            instruments: Instruments to keep, in the requested order
+
+        Returns:
+            Sliced panel
+
+        Raises:
+            KeyError: If an instrument is not in the panel
+        """
+        start = 0 if start_date is None else np.searchsorted(
+            self.dates, np.datetime64(pd.Timestamp(start_date)), side="left"
+        )
+        stop = len(self.dates) if end_date is None else np.searchsorted(
+            self.dates, np.datetime64(pd.Timestamp(end_date)), side="right"
+        )
+        rows = slice(start, stop)
+
+        columns = slice(None)
+        selected = self.instruments
+        if instruments is not None:
+            columns = _as_slice(self.instrument_indices(instruments))
+            selected = self.instruments[columns]
+
+        return DatasetPanel(
+            dates=self.dates[rows],
+            instruments=selected,
+            fields={name: values[rows, columns] for name, values in self.fields.items()},
+        )
+
+    def instrument_indices(self, instruments: Iterable[str]) -> np.ndarray:
+        """
+        Column positions of instruments.
+
+        Raises:
+            KeyError: If an instrument is not in the panel
+        """
+        lookup = {code: i for i, code in enumerate(self.instruments)}
+        missing = [code for code in instruments if code not in lookup]
+        if missing:
+            raise KeyError(f"Instruments not in dataset: {missing[:10]}")
+        return np.array([lookup[code] for code in instruments], dtype=np.intp)
+
+    @classmethod
+    def from_frame(
+        cls,
+        data: pd.DataFrame,
+        fields: Optional[List[str]] = None,
+        default_instrument: str = "default"
+    ) -> "DatasetPanel":
+        """
+        Build a panel from a long-format DataFrame.
+
+        Args:
+            data: DataFrame with a date column, an optional instrument column
+                and numeric field columns
+            fields: Fields to load (default: all numeric columns)
+            default_instrument: Instrument code when there is no instrument column
+
+        Returns:
+            DatasetPanel
+
+        Raises:
+            PanelLoadError: If the date column or a field is missing
+        """
+        columns = {col.lower().strip(): col for col in data.columns}
+
+        date_col = next((columns[c] for c in DATE_COLUMNS if c in columns), None)
+        if date_col is None:
+            raise PanelLoadError(f"No date column found. Expected one of: {DATE_COLUMNS}")
+        instrument_col = next((columns[c] for c in INSTRUMENT_COLUMNS if c in columns), None)
+
+        if fields is None:
+            excluded = {date_col, instrument_col}
+            fields = [
+                name for name, col in columns.items()
+                if col not in excluded and pd.api.types.is_numeric_dtype(data[col])
+            ]
+        missing = [name for name in fields if name.lower() not in columns]
+        if missing:
+            raise PanelLoadError(f"Fields not in dataset: {missing}")
+
+        date_codes, dates = pd.factorize(pd.to_datetime(data[date_col]), sort=True)
+        if instrument_col is None:
+            instrument_codes = np.zeros(len(data), dtype=np.intp)
+            instruments = np.array([default_instrument], dtype=object)
+        else:
+            instrument_codes, instruments = pd.factorize(data[instrument_col].astype(str), sort=True)
+            instruments = np.asarray(instruments, dtype=object)
+
+        shape = (len(dates), len(instruments))
+        panel_fields = {}
+        for name in fields:
+            values = np.full(shape, np.nan)
+            # Later rows win for duplicated (date, instrument) pairs
+            values[date_codes, instrument_codes] = pd.to_numeric(
+                data[columns[name.lower()]], errors="coerce"
+            ).to_numpy(dtype=float)
+            panel_fields[name.lower()] = values
+
+        return cls(
+            dates=np.asarray(dates, dtype="datetime64[ns]"),
+            instruments=instruments,
+            fields=panel_fields,
+        )
+
+
+def _as_slice(indices: np.ndarray) -> Union[slice, np.ndarray]:
+    """Turn evenly increasing indices into a slice so indexing returns a view."""
+    if len(indices) == 0:
+        return indices
+    if len(indices) == 1:
+        return slice(indices[0], indices[0] + 1)
+    steps = np.diff(indices)
+    if steps[0] > 0 and (steps == steps[0]).all():
+        return slice(indices[0], indices[-1] + 1, steps[0])
+    return indices
+
+
+def load_dataset_panel(
+    file_path: Union[str, Path],
+    fields: Optional[List[str]] = None,
+    default_instrument: str = "default"
+) -> DatasetPanel:
+    """
+    Load a dataset file (CSV, Excel or Parquet) as a panel.
+
+    Args:
+        file_path: Path to the dataset file
+        fields: Fields to load (default: all numeric columns)
+        default_instrument: Instrument code when there is no instrument column
+
+    Returns:
+        DatasetPanel
+
+    Raises:
+        PanelLoadError: If the file is missing, unsupported or malformed
+    """
+    path = Path(file_path)
+    if not path.exists():
+        raise PanelLoadError(f"Dataset file not found: {file_path}")
+
+    suffix = path.suffix.lower()
+    if suffix in (".csv", ".txt"):
+        data = pd.read_csv(path)
+    elif suffix in (".xlsx", ".xls"):
+        data = pd.read_excel(path)
+    elif suffix == ".parquet":
+        data = pd.read_parquet(path)
+    else:
+        raise PanelLoadError(f"Unsupported dataset file type: {suffix}")
+
+    return DatasetPanel.from_frame(data, fields=fields, default_instrument=default_instrument)
@@ -0,0 +1,359 @@
+"""
+Indicator Compute Backends
+
+Pluggable implementations of the primitives behind IndicatorService:
+EMA and rolling mean / min / max. Every backend accepts a 1-D series or a
+2-D (dates x instruments) panel, works along axis 0 and follows the pandas
+semantics of the original implementation:
+
+- EMA equals ``ewm(span, adjust=False).mean()``
+- Rolling windows equal ``rolling(window).mean() / min() / max()`` (NaN until
+  the window is full and for windows containing NaN)
+
+Backends:
+- numpy: vectorized NumPy over the whole panel (indicator_panel)
+- pandas: pandas ewm / rolling, the reference implementation
+- talib: TA-Lib SMA / MIN / MAX, only registered when TA-Lib is importable
+- auto: per call, the backend that is fastest for the input shape
+
+MACD, RSI, KDJ and MA are composed from the primitives in IndicatorBackend,
+so every backend shares the same formulas.
+"""
+
+from typing import Callable, Dict, List, Optional, Type, Union
+
+import numpy as np
+import pandas as pd
+
+from app.modules.data_management.services import indicator_panel
+
+try:
+    import talib
+except ImportError:  # pragma: no cover - depends on the environment
+    talib = None
+
+
+class IndicatorBackend:
+    """
+    Base class for indicator compute backends.
+
+    Subclasses implement the primitives; the indicator formulas are shared.
+    """
+
+    name = "base"
+
+    def ema(self, values: np.ndarray, span: int) -> np.ndarray:
+        """EMA along axis 0 (``ewm(span, adjust=False).mean()``)."""
+        raise NotImplementedError
+
+    def rolling_mean(self, values: np.ndarray, window: int) -> np.ndarray:
+        """Rolling mean along axis 0 (``rolling(window).mean()``)."""
+        raise NotImplementedError
+
+    def rolling_min(self, values: np.ndarray, window: int) -> np.ndarray:
+        """Rolling minimum along axis 0 (``rolling(window).min()``)."""
+        raise NotImplementedError
+
+    def rolling_max(self, values: np.ndarray, window: int) -> np.ndarray:
+        """Rolling maximum along axis 0 (``rolling(window).max()``)."""
+        raise NotImplementedError
+
+    def macd(
+        self,
+        close: np.ndarray,
+        fast_period: int = 12,
+        slow_period: int = 26,
+        signal_period: int = 9
+    ) -> Dict[str, np.ndarray]:
+        """
+        MACD = EMA(fast) - EMA(slow), Signal = EMA(MACD), Histogram = MACD - Signal.
+
+        Returns:
+            Dictionary with 'macd', 'signal' and 'histogram' arrays
+        """
+        macd_line = self.ema(close, fast_period) - self.ema(close, slow_period)
+        signal_line = self.ema(macd_line, signal_period)
+        return {
+            "macd": macd_line,
+            "signal": signal_line,
+            "histogram": macd_line - signal_line,
+        }
+
+    def rsi(self, close: np.ndarray, period: int = 14) -> Dict[str, np.ndarray]:
+        """
+        RSI = 100 - 100 / (1 + EMA(gain) / EMA(loss)).
+
+        Returns:
+            Dictionary with the 'rsi' array
+        """
+        delta = np.diff(close, axis=0, prepend=np.nan)
+        gain = np.where(delta > 0, delta, 0.0)
+        loss = -np.where(delta < 0, delta, 0.0)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rs = self.ema(gain, period) / self.ema(loss, period)
+            rsi = 100 - (100 / (1 + rs))
+
+        return {"rsi": rsi}
+
+    def kdj(
+        self,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        k_period: int = 9,
+        d_period: int = 3,
+        j_period: int = 3
+    ) -> Dict[str, np.ndarray]:
+        """
+        RSV over k_period, K = EMA(RSV), D = EMA(K), J = 3K - 2D.
+
+        Returns:
+            Dictionary with 'k', 'd' and 'j' arrays
+        """
+        lowest_low = self.rolling_min(low, k_period)
+        highest_high = self.rolling_max(high, k_period)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsv = ((close - lowest_low) / (highest_high - lowest_low)) * 100
+
+        k = self.ema(rsv, d_period)
+        d = self.ema(k, j_period)
+        return {"k": k, "d": d, "j": 3 * k - 2 * d}
+
+    def ma(self, close: np.ndarray, periods: List[int]) -> Dict[str, np.ndarray]:
+        """
+        Moving averages for several periods.
+
+        Returns:
+            Dictionary with one array per period (e.g. 'ma5', 'ma10')
+        """
+        return {f"ma{period}": self.rolling_mean(close, period) for period in periods}
+
+
+def _as_panel(func: Callable) -> Callable:
+    """Adapt a 2-D panel primitive so it also accepts 1-D series."""
+    def wrapper(values: np.ndarray, param: int) -> np.ndarray:
+        if values.ndim == 1:
+            return func(values[:, None], param)[:, 0]
+        return func(values, param)
+    return wrapper
+
+
+class NumpyBackend(IndicatorBackend):
+    """
+    Vectorized NumPy backend.
+
+    Processes all instruments of a panel in one pass along the time axis.
+    The EMA recursion is a Python loop over dates, so this backend is best
+    for wide panels rather than single long series.
+    """
+
+    name = "numpy"
+
+    ema = staticmethod(_as_panel(indicator_panel.panel_ema))
+    rolling_mean = staticmethod(_as_panel(indicator_panel.panel_rolling_mean))
+    rolling_min = staticmethod(_as_panel(indicator_panel.panel_rolling_min))
+    rolling_max = staticmethod(_as_panel(indicator_panel.panel_rolling_max))
+
+    def ma(self, close: np.ndarray, periods: List[int]) -> Dict[str, np.ndarray]:
+        """Moving averages sharing one set of prefix sums across periods."""
+        panel = close[:, None] if close.ndim == 1 else close
+        prefix = indicator_panel._prefix_sums(panel)
+        result = {}
+        for period in periods:
+            values = indicator_panel._rolling_mean_from_prefix(prefix, period)
+            result[f"ma{period}"] = values[:, 0] if close.ndim == 1 else values
+        return result
+
+
+class PandasBackend(IndicatorBackend):
+    """pandas ewm / rolling backend (reference semantics)."""
+
+    name = "pandas"
+
+    @staticmethod
+    def _frame(values: np.ndarray) -> Union[pd.Series, pd.DataFrame]:
+        return pd.Series(values) if values.ndim == 1 else pd.DataFrame(values)
+
+    def ema(self, values: np.ndarray, span: int) -> np.ndarray:
+        return self._frame(values).ewm(span=span, adjust=False).mean().to_numpy()
+
+    def rolling_mean(self, values: np.ndarray, window: int) -> np.ndarray:
+        return self._frame(values).rolling(window=window).mean().to_numpy()
+
+    def rolling_min(self, values: np.ndarray, window: int) -> np.ndarray:
+        return self._frame(values).rolling(window=window).min().to_numpy()
+
+    def rolling_max(self, values: np.ndarray, window: int) -> np.ndarray:
+        return self._frame(values).rolling(window=window).max().to_numpy()
+
+
+class TalibBackend(NumpyBackend):
+    """
+    TA-Lib backend for the rolling primitives.
+
+    TA-Lib only agrees with pandas on gap-free data: after a NaN its SMA
+    stays NaN for the rest of the series and MIN / MAX skip NaN instead of
+    propagating it. Each series is therefore trimmed to its observed span,
+    and series with gaps inside that span use the NumPy implementation.
+
+    TA-Lib's EMA is seeded with an SMA of the first ``span`` values, which
+    does not match ``ewm(adjust=False)``, so EMA also uses NumPy.
+    """
+
+    name = "talib"
+
+    def __init__(self):
+        if talib is None:
+            raise ImportError("TA-Lib is not installed")
+
+    def rolling_mean(self, values: np.ndarray, window: int) -> np.ndarray:
+        return self._rolling(values, window, talib.SMA, super().rolling_mean)
+
+    def rolling_min(self, values: np.ndarray, window: int) -> np.ndarray:
+        return self._rolling(values, window, talib.MIN, super().rolling_min)
+
+    def rolling_max(self, values: np.ndarray, window: int) -> np.ndarray:
+        return self._rolling(values, window, talib.MAX, super().rolling_max)
+
+    def ma(self, close: np.ndarray, periods: List[int]) -> Dict[str, np.ndarray]:
+        return IndicatorBackend.ma(self, close, periods)
+
+    @staticmethod
+    def _rolling(
+        values: np.ndarray,
+        window: int,
+        talib_func: Callable,
+        fallback: Callable
+    ) -> np.ndarray:
+        """Apply a TA-Lib rolling function per series, falling back on gaps."""
+        # TA-Lib rejects periods below 2
+        if window < 2:
+            return fallback(values, window)
+
+        panel = values[:, None] if values.ndim == 1 else values
+        n_dates = panel.shape[0]
+        output = np.full(panel.shape, np.nan)
+
+        observed = ~np.isnan(panel)
+        first = np.argmax(observed, axis=0)
+        last = n_dates - 1 - np.argmax(observed[::-1], axis=0)
+        has_data = observed.any(axis=0)
+        gap_free = has_data & (observed.sum(axis=0) == last - first + 1)
+
+        for column in np.flatnonzero(gap_free):
+            start, stop = first[column], last[column] + 1
+            if stop - start >= window:
+                output[start:stop, column] = talib_func(
+                    np.ascontiguousarray(panel[start:stop, column]), timeperiod=window
+                )
+
+        with_gaps = np.flatnonzero(has_data & ~gap_free)
+        if len(with_gaps):
+            output[:, with_gaps] = fallback(panel[:, with_gaps], window)
+
+        return output[:, 0] if values.ndim == 1 else output
+
+
+class AutoBackend(IndicatorBackend):
+    """
+    Picks the fastest registered backend for each primitive and input shape.
+
+    Preferences come from scripts/benchmark_indicators.py (--backends):
+    pandas' compiled EMA wins on single series and the NumPy recursion on
+    panels; TA-Lib is fastest for rolling means and single-series min / max,
+    while the sliding-window NumPy reduction wins for min / max on panels.
+    """
+
+    name = "auto"
+
+    PREFERENCES = {
+        "ema": {1: ["pandas"], 2: ["numpy"]},
+        "rolling_mean": {1: ["talib", "numpy"], 2: ["talib", "numpy"]},
+        "rolling_extreme": {1: ["talib", "pandas"], 2: ["numpy"]},
+    }
+
+    def __init__(self):
+        self._backends = {
+            name: backend_cls()
+            for name, backend_cls in INDICATOR_BACKENDS.items()
+            if name != self.name
+        }
+
+    def select(self, primitive: str, ndim: int) -> IndicatorBackend:
+        """
+        Return the backend used for a primitive on inputs of a dimensionality.
+
+        Args:
+            primitive: 'ema', 'rolling_mean' or 'rolling_extreme' (min / max)
+            ndim: 1 for a single series, 2 for a panel
+
+        Returns:
+            The preferred available backend
+        """
+        for name in self.PREFERENCES[primitive][min(ndim, 2)]:
+            if name in self._backends:
+                return self._backends[name]
+        return self._backends["numpy"]
+
+    def ema(self, values: np.ndarray, span: int) -> np.ndarray:
+        return self.select("ema", values.ndim).ema(values, span)
+
+    def rolling_mean(self, values: np.ndarray, window: int) -> np.ndarray:
+        return self.select("rolling_mean", values.ndim).rolling_mean(values, window)
+
+    def rolling_min(self, values: np.ndarray, window: int) -> np.ndarray:
+        return self.select("rolling_extreme", values.ndim).rolling_min(values, window)
+
+    def rolling_max(self, values: np.ndarray, window: int) -> np.ndarray:
+        return self.select("rolling_extreme", values.ndim).rolling_max(values, window)
+
+    def ma(self, close: np.ndarray, periods: List[int]) -> Dict[str, np.ndarray]:
+        return self.select("rolling_mean", close.ndim).ma(close, periods)
+
+
+INDICATOR_BACKENDS: Dict[str, Type[IndicatorBackend]] = {
+    "numpy": NumpyBackend,
+    "pandas": PandasBackend,
+}
+if talib is not None:
+    INDICATOR_BACKENDS["talib"] = TalibBackend
+INDICATOR_BACKENDS["auto"] = AutoBackend
+
+
+def available_backends() -> List[str]:
+    """Names of the backends usable in this environment."""
+    return list(INDICATOR_BACKENDS)
+
+
+def get_indicator_backend(
+    backend: Optional[Union[str, IndicatorBackend]] = None
+) -> IndicatorBackend:
+    """
+    Resolve an indicator backend.
+
+    Args:
+        backend: Backend instance, registered name, or None to use the
+            INDICATOR_BACKEND setting
+
+    Returns:
+        Indicator backend instance
+
+    Raises:
+        ValueError: If the backend name is unknown or not available
+    """
+    if isinstance(backend, IndicatorBackend):
+        return backend
+
+    if backend is None:
+        from app.config import settings
+        backend = settings.INDICATOR_BACKEND
+
+    backend_cls = INDICATOR_BACKENDS.get(backend.lower())
+    if backend_cls is None:
+        raise ValueError(
+            f"Unknown or unavailable indicator backend: {backend}. "
+            f"Available: {available_backends()}"
+        )
+    return backend_cls()
@@ -0,0 +1,264 @@
+"""
+Indicator Result Cache
+
+Memoizes IndicatorService results so the same indicator on the same dataset
+is not recomputed for every chart request, export or preview.
+
+Entries are keyed by (dataset id, dataset version, date window, indicator,
+canonical params) and store indicator arrays as float32 to halve their
+memory footprint. The cache holds at most ``max_bytes`` of arrays and evicts
+the least recently used entries beyond that.
+
+Invalidation:
+- The dataset version changes whenever the dataset row is updated (see
+  Dataset.version), so stale entries are never hit and age out via LRU.
+- invalidate_dataset() drops a dataset's entries eagerly, e.g. on append,
+  re-import or delete.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+
+DateLike = Optional[Union[str, date, datetime, pd.Timestamp]]
+
+
+@dataclass(frozen=True)
+class DatasetWindow:
+    """
+    Identifies the slice of a dataset an indicator was calculated on.
+
+    Attributes:
+        dataset_id: Dataset ID
+        version: Dataset version (see Dataset.version)
+        start_date: Start of the date filter, if any
+        end_date: End of the date filter, if any
+    """
+
+    dataset_id: str
+    version: str
+    start_date: DateLike = None
+    end_date: DateLike = None
+
+    def key(self) -> Tuple[str, str, Optional[str], Optional[str]]:
+        """Hashable key with normalized dates."""
+        return (
+            self.dataset_id,
+            self.version,
+            _normalize_date(self.start_date),
+            _normalize_date(self.end_date),
+        )
+
+
+def _normalize_date(value: DateLike) -> Optional[str]:
+    if value is None:
+        return None
+    return pd.Timestamp(value).isoformat()
+
+
+@dataclass
+class _CacheEntry:
+    values: Dict[str, Any]
+    nbytes: int
+    compute_seconds: float
+
+
+class IndicatorResultCache:
+    """
+    Thread-safe LRU cache of indicator results with a memory budget.
+
+    Example:
+        cache = IndicatorResultCache(max_bytes=64 * 1024 * 1024)
+        key = cache.make_key(window, "MACD", {"fast_period": 12, ...})
+        result = cache.get_or_compute(key, lambda: service.calculate_macd(data))
+    """
+
+    def __init__(self, max_bytes: int):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Memory budget for cached arrays
+        """
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, _CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.saved_seconds = 0.0
+
+    @staticmethod
+    def make_key(
+        window: DatasetWindow,
+        indicator: str,
+        params: Dict[str, Any]
+    ) -> Tuple:
+        """
+        Build a cache key.
+
+        Args:
+            window: Dataset slice the indicator is calculated on
+            indicator: Indicator name
+            params: Canonical indicator parameters (all arguments explicit)
+
+        Returns:
+            Hashable cache key
+        """
+        canonical = json.dumps(params, sort_keys=True, default=str)
+        return window.key() + (indicator, canonical)
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        """
+        Look up a result and mark it as recently used.
+
+        Returns:
+            Result with float64 arrays, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self.saved_seconds += entry.compute_seconds
+
+        return {
+            name: value.astype(np.float64) if isinstance(value, np.ndarray) else value
+            for name, value in entry.values.items()
+        }
+
+    def put(
+        self,
+        key: Hashable,
+        result: Dict[str, Any],
+        compute_seconds: float = 0.0
+    ) -> bool:
+        """
+        Store a result, evicting least recently used entries if needed.
+
+        Args:
+            key: Cache key
+            result: Indicator result (arrays and scalars)
+            compute_seconds: Time the calculation took
+
+        Returns:
+            True if stored, False if the result alone exceeds the budget
+        """
+        values = {
+            name: np.asarray(value, dtype=np.float32) if _is_array(value) else value
+            for name, value in result.items()
+        }
+        nbytes = sum(value.nbytes for value in values.values() if isinstance(value, np.ndarray))
+        if nbytes > self.max_bytes:
+            return False
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes
+
+            while self._entries and self._bytes + nbytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self.evictions += 1
+
+            self._entries[key] = _CacheEntry(values, nbytes, compute_seconds)
+            self._bytes += nbytes
+
+        return True
+
+    def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Return the cached result or compute, store and return it.
+
+        Args:
+            key: Cache key
+            compute: Zero-argument function producing the result
+
+        Returns:
+            Indicator result
+        """
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        start = time.perf_counter()
+        result = compute()
+        self.put(key, result, time.perf_counter() - start)
+        return result
+
+    def invalidate_dataset(self, dataset_id: str) -> int:
+        """
+        Drop all entries of a dataset, whatever their version.
+
+        Args:
+            dataset_id: Dataset ID
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            stale = [key for key in self._entries if key[0] == dataset_id]
+            for key in stale:
+                self._bytes -= self._entries.pop(key).nbytes
+
+        if stale:
+            logger.debug(f"Invalidated {len(stale)} cached indicator results for dataset {dataset_id}")
+        return len(stale)
+
+    def clear(self) -> None:
+        """Remove all entries and reset statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+            self.saved_seconds = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Cache statistics.
+
+        Returns:
+            Dictionary with entries, bytes, hits, misses, hit_ratio,
+            evictions and saved_seconds (compute time avoided by hits)
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "saved_seconds": self.saved_seconds,
+            }
+
+
+def _is_array(value: Any) -> bool:
+    return isinstance(value, (np.ndarray, pd.Series, list))
+
+
+@lru_cache()
+def get_indicator_cache() -> IndicatorResultCache:
+    """Process-wide indicator cache sized by INDICATOR_CACHE_MAX_MB."""
+    from app.config import settings
+    return IndicatorResultCache(max_bytes=settings.INDICATOR_CACHE_MAX_MB * 1024 * 1024)
@@ -0,0 +1,151 @@
+"""
+Cross-Sectional Panel Indicators
+
+Vectorized indicator primitives over a (dates x instruments) panel.
+
+Each function processes every instrument in one pass along the time axis
+instead of calling IndicatorService once per instrument. These primitives
+back the NumPy indicator backend (see indicator_backends), and results match
+the single-series calculations for each instrument's listed span.
+
+Listing / delisting handling:
+- Rows before an instrument's first observation and after its last
+  observation are NaN in the input and stay NaN in the panel results of
+  IndicatorService (see listed_mask).
+- NaN gaps inside the listed span (e.g. suspensions) follow the pandas
+  semantics of the single-series calculation.
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def listed_mask(values: np.ndarray) -> np.ndarray:
+    """
+    Mask of cells between each instrument's first and last observation.
+
+    Args:
+        values: 2-D array (dates x instruments)
+
+    Returns:
+        Boolean array of the same shape
+    """
+    observed = ~np.isnan(values)
+    after_listing = np.cumsum(observed, axis=0) > 0
+    before_delisting = np.cumsum(observed[::-1], axis=0)[::-1] > 0
+    return after_listing & before_delisting
+
+
+def panel_ema(values: np.ndarray, span: int) -> np.ndarray:
+    """
+    EMA along the time axis, equivalent to ``ewm(span, adjust=False).mean()``.
+
+    Args:
+        values: 2-D array (dates x instruments)
+        span: EMA span
+
+    Returns:
+        EMA values (same shape)
+    """
+    alpha = 2.0 / (span + 1.0)
+    old_wt_factor = 1.0 - alpha
+
+    n_dates, n_instruments = values.shape
+    output = np.empty((n_dates, n_instruments), dtype=float)
+    weighted = np.full(n_instruments, np.nan)
+    old_wt = np.ones(n_instruments)
+
+    # Once a full row has been observed every instrument has started and its
+    # decayed weight is back to 1, so fully observed rows take a short path.
+    steady = False
+    fully_observed = ~np.isnan(values).any(axis=1)
+
+    for t in range(n_dates):
+        cur = values[t]
+        if steady and fully_observed[t]:
+            blended = (old_wt_factor * weighted + alpha * cur) / (old_wt_factor + alpha)
+            weighted = np.where(weighted != cur, blended, weighted)
+            output[t] = weighted
+            continue
+
+        observed = cur == cur
+        started = weighted == weighted
+
+        old_wt = np.where(started, old_wt * old_wt_factor, old_wt)
+        update = started & observed & (weighted != cur)
+        with np.errstate(invalid="ignore"):
+            blended = (old_wt * weighted + alpha * cur) / (old_wt + alpha)
+
+        weighted = np.where(update, blended, weighted)
+        weighted = np.where(~started & observed, cur, weighted)
+        old_wt = np.where(started & observed, 1.0, old_wt)
+
+        output[t] = weighted
+        steady = bool(fully_observed[t])
+
+    return output
+
+
+def panel_rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Rolling mean along the time axis, equivalent to ``rolling(window).mean()``.
+
+    Windows that are not full or contain NaN yield NaN.
+
+    Args:
+        values: 2-D array (dates x instruments)
+        window: Window length
+
+    Returns:
+        Rolling mean values (same shape)
+    """
+    return _rolling_mean_from_prefix(_prefix_sums(values), window)
+
+
+def _prefix_sums(values: np.ndarray):
+    """Cumulative sums of values (NaN as 0) and of NaN counts, with a zero row."""
+    missing = np.isnan(values)
+    n_instruments = values.shape[1]
+
+    sums = np.zeros((values.shape[0] + 1, n_instruments))
+    np.cumsum(np.where(missing, 0.0, values), axis=0, out=sums[1:])
+    counts = np.zeros((values.shape[0] + 1, n_instruments), dtype=np.int64)
+    np.cumsum(missing, axis=0, out=counts[1:])
+    return sums, counts
+
+
+def _rolling_mean_from_prefix(prefix, window: int) -> np.ndarray:
+    sums, counts = prefix
+    n_dates, n_instruments = sums.shape[0] - 1, sums.shape[1]
+    output = np.full((n_dates, n_instruments), np.nan)
+    if n_dates < window:
+        return output
+
+    window_sums = sums[window:] - sums[:-window]
+    window_missing = counts[window:] - counts[:-window]
+    window_sums /= window
+    window_sums[window_missing > 0] = np.nan
+
+    output[window - 1:] = window_sums
+    return output
+
+
+def panel_rolling_min(values: np.ndarray, window: int) -> np.ndarray:
+    """Rolling minimum along the time axis (NaN if the window has gaps)."""
+    return _panel_rolling_reduce(values, window, np.min)
+
+
+def panel_rolling_max(values: np.ndarray, window: int) -> np.ndarray:
+    """Rolling maximum along the time axis (NaN if the window has gaps)."""
+    return _panel_rolling_reduce(values, window, np.max)
+
+
+def _panel_rolling_reduce(values: np.ndarray, window: int, reducer) -> np.ndarray:
+    n_dates, n_instruments = values.shape
+    output = np.full((n_dates, n_instruments), np.nan)
+    if n_dates < window:
+        return output
+
+    windows = sliding_window_view(values, window, axis=0)
+    output[window - 1:] = reducer(windows, axis=-1)
+    return output
@@ -11,15 +11,38 @@ Supported Indicators:
 - Moving Averages (MA)
 - Volume Indicators
 
-Implementation uses pandas and numpy for efficient calculations.
-Falls back to pandas if TA-Lib is not available.
+Calculations run on a pluggable compute backend (NumPy, pandas, or TA-Lib
+when installed), selected with the INDICATOR_BACKEND setting or per service
+instance; see indicator_backends. Results for a dataset window can be
+memoized in the indicator result cache (calculate_cached).
+
+MACD, RSI, KDJ and MA can also be calculated incrementally (see
+build_indicator_state / extend_indicator_state) and across a whole
+(dates x instruments) panel in one vectorized pass (calculate_panel_*).
 """
 
+import inspect
+
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, List, Optional, Tuple, Union
 from loguru import logger
 
+from app.modules.data_management.services import indicator_panel
+from app.modules.data_management.services.indicator_backends import (
+    IndicatorBackend,
+    get_indicator_backend,
+)
+from app.modules.data_management.services.indicator_cache import (
+    DatasetWindow,
+    IndicatorResultCache,
+    get_indicator_cache,
+)
+from app.modules.data_management.services.indicator_state import (
+    INDICATOR_STATES,
+    IndicatorState,
+)
+
 
 class IndicatorCalculationError(Exception):
     """Raised when indicator calculation fails."""
@@ -39,10 +62,32 @@ class IndicatorService:
     commonly used in financial analysis and chart visualization.
     """
 
-    def __init__(self):
-        """Initialize the indicator service."""
+    INDICATOR_METHODS = {
+        "MACD": "calculate_macd",
+        "RSI": "calculate_rsi",
+        "KDJ": "calculate_kdj",
+        "MA": "calculate_ma",
+        "VOLUME": "calculate_volume_indicators",
+    }
+
+    def __init__(
+        self,
+        backend: Optional[Union[str, IndicatorBackend]] = None,
+        cache: Optional[IndicatorResultCache] = None
+    ):
+        """
+        Initialize the indicator service.
+
+        Args:
+            backend: Compute backend name or instance (default: the
+                INDICATOR_BACKEND setting, "auto")
+            cache: Result cache for calculate_cached (default: the
+                process-wide indicator cache)
+        """
         self.supported_indicators = ["MACD", "RSI", "KDJ", "MA", "VOLUME"]
-        logger.info("IndicatorService initialized")
+        self.backend = get_indicator_backend(backend)
+        self._cache = cache
+        logger.info(f"IndicatorService initialized with {self.backend.name} backend")
 
     def calculate_macd(
         self,
@@ -77,31 +122,16 @@ class IndicatorService:
         self._validate_column_exists(data, column)
 
         try:
-            prices = data[column].copy()
-
-            # Calculate EMAs
-            ema_fast = prices.ewm(span=fast_period, adjust=False).mean()
-            ema_slow = prices.ewm(span=slow_period, adjust=False).mean()
+            prices = self._column_values(data, column)
 
-            # Calculate MACD line
-            macd_line = ema_fast - ema_slow
-
-            # Calculate signal line
-            signal_line = macd_line.ewm(span=signal_period, adjust=False).mean()
-
-            # Calculate histogram
-            histogram = macd_line - signal_line
+            result = self.backend.macd(prices, fast_period, slow_period, signal_period)
 
             logger.debug(
                 f"MACD calculated: fast={fast_period}, slow={slow_period}, "
                 f"signal={signal_period}"
             )
 
-            return {
-                "macd": macd_line.values,
-                "signal": signal_line.values,
-                "histogram": histogram.values
-            }
+            return result
 
         except KeyError as e:
             raise IndicatorCalculationError(f"Missing required column: {column}") from e
@@ -141,31 +171,18 @@ class IndicatorService:
         self._validate_column_exists(data, column)
 
         try:
-            prices = data[column].copy()
+            prices = self._column_values(data, column)
 
             # Validate no negative prices
             if (prices < 0).any():
                 raise IndicatorCalculationError("Price data contains negative values")
 
-            # Calculate price changes
-            delta = prices.diff()
-
-            # Separate gains and losses
-            gain = delta.where(delta > 0, 0)
-            loss = -delta.where(delta < 0, 0)
-
-            # Calculate average gain and loss using exponential moving average
-            avg_gain = gain.ewm(span=period, adjust=False).mean()
-            avg_loss = loss.ewm(span=period, adjust=False).mean()
-
-            # Calculate RS and RSI
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
+            result = self.backend.rsi(prices, period)
 
             logger.debug(f"RSI calculated: period={period}")
 
             return {
-                "rsi": rsi.values,
+                "rsi": result["rsi"],
                 "overbought_line": overbought,
                 "oversold_line": oversold
             }
@@ -210,32 +227,18 @@ class IndicatorService:
             self._validate_column_exists(data, col)
 
         try:
-            high = data["high"]
-            low = data["low"]
-            close = data["close"]
-
-            # Calculate RSV (Raw Stochastic Value)
-            lowest_low = low.rolling(window=k_period).min()
-            highest_high = high.rolling(window=k_period).max()
-
-            rsv = ((close - lowest_low) / (highest_high - lowest_low)) * 100
-
-            # Calculate K line (smoothed RSV)
-            k = rsv.ewm(span=d_period, adjust=False).mean()
-
-            # Calculate D line (smoothed K)
-            d = k.ewm(span=j_period, adjust=False).mean()
-
-            # Calculate J line
-            j = 3 * k - 2 * d
+            result = self.backend.kdj(
+                self._column_values(data, "high"),
+                self._column_values(data, "low"),
+                self._column_values(data, "close"),
+                k_period,
+                d_period,
+                j_period
+            )
 
             logger.debug(f"KDJ calculated: k_period={k_period}, d_period={d_period}, j_period={j_period}")
 
-            return {
-                "k": k.values,
-                "d": d.values,
-                "j": j.values
-            }
+            return result
 
         except KeyError as e:
             raise IndicatorCalculationError(
@@ -271,12 +274,7 @@ class IndicatorService:
         self._validate_column_exists(data, column)
 
         try:
-            prices = data[column]
-            result = {}
-
-            for period in periods:
-                ma = prices.rolling(window=period).mean()
-                result[f"ma{period}"] = ma.values
+            result = self.backend.ma(self._column_values(data, column), periods)
 
             logger.debug(f"MA calculated for periods: {periods}")
 
@@ -314,19 +312,18 @@ class IndicatorService:
         self._validate_column_exists(data, "volume")
 
         try:
-            volume = data["volume"]
+            volume = self._column_values(data, "volume")
             result = {}
 
             # Calculate volume moving averages
             for period in periods:
-                volume_ma = volume.rolling(window=period).mean()
-                result[f"volume_ma{period}"] = volume_ma.values
+                result[f"volume_ma{period}"] = self.backend.rolling_mean(volume, period)
 
             # Calculate volume ratio if requested
             if include_ratio:
-                volume_ma5 = volume.rolling(window=5).mean()
-                volume_ratio = (volume / volume_ma5) * 100
-                result["volume_ratio"] = volume_ratio.values
+                volume_ma5 = self.backend.rolling_mean(volume, 5)
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    result["volume_ratio"] = (volume / volume_ma5) * 100
 
             logger.debug(f"Volume indicators calculated for periods: {periods}")
 
@@ -344,7 +341,8 @@ class IndicatorService:
         self,
         data: pd.DataFrame,
         indicators: List[str],
-        params: Optional[Dict[str, Dict[str, Any]]] = None
+        params: Optional[Dict[str, Dict[str, Any]]] = None,
+        window: Optional[DatasetWindow] = None
     ) -> Dict[str, Any]:
         """
         Calculate multiple indicators at once.
@@ -353,6 +351,8 @@ class IndicatorService:
             data: DataFrame with OHLCV data
             indicators: List of indicator names to calculate (max 3)
             params: Optional parameters for each indicator
+            window: Dataset slice ``data`` was loaded from; when given,
+                results are served from / stored in the result cache
 
         Returns:
             Dictionary with results for each indicator
@@ -383,18 +383,13 @@ class IndicatorService:
             for indicator in indicators:
                 indicator_params = params.get(indicator, {})
 
-                if indicator == "MACD":
-                    result["MACD"] = self.calculate_macd(data, **indicator_params)
-                elif indicator == "RSI":
-                    result["RSI"] = self.calculate_rsi(data, **indicator_params)
-                elif indicator == "KDJ":
-                    result["KDJ"] = self.calculate_kdj(data, **indicator_params)
-                elif indicator == "MA":
-                    result["MA"] = self.calculate_ma(data, **indicator_params)
-                elif indicator == "VOLUME":
-                    result["VOLUME"] = self.calculate_volume_indicators(
-                        data, **indicator_params
+                if window is not None:
+                    result[indicator] = self.calculate_cached(
+                        window, data, indicator, indicator_params
                     )
+                else:
+                    method = getattr(self, self.INDICATOR_METHODS[indicator])
+                    result[indicator] = method(data, **indicator_params)
 
             logger.info(f"Calculated multiple indicators: {indicators}")
 
@@ -404,6 +399,311 @@ class IndicatorService:
             logger.error(f"Error calculating multiple indicators: {str(e)}")
             raise
 
+    @property
+    def cache(self) -> IndicatorResultCache:
+        """Result cache used by calculate_cached."""
+        if self._cache is None:
+            self._cache = get_indicator_cache()
+        return self._cache
+
+    def calculate_cached(
+        self,
+        window: DatasetWindow,
+        data: pd.DataFrame,
+        indicator: str,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Calculate an indicator through the result cache.
+
+        ``data`` must be the rows of ``window``; on a hit it is not read.
+        Cached arrays are stored as float32, so hits carry float32 precision.
+
+        Args:
+            window: Dataset ID, version and date filter of ``data``
+            data: DataFrame with the window's OHLCV rows
+            indicator: Indicator name (MACD, RSI, KDJ, MA or VOLUME)
+            params: Optional indicator parameters (same as calculate_*)
+
+        Returns:
+            Indicator result
+
+        Raises:
+            ValueError: If the indicator is not supported
+            InsufficientDataError: If data has fewer rows than required
+            IndicatorCalculationError: If calculation fails
+        """
+        if indicator not in self.INDICATOR_METHODS:
+            raise ValueError(
+                f"Invalid indicator: {indicator}. "
+                f"Supported: {self.supported_indicators}"
+            )
+
+        method = getattr(self, self.INDICATOR_METHODS[indicator])
+        params = params or {}
+        key = self.cache.make_key(window, indicator, self._canonical_params(method, params))
+
+        return self.cache.get_or_compute(key, lambda: method(data, **params))
+
+    @staticmethod
+    def _canonical_params(method, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Parameters with defaults filled in, so {} and explicit defaults share a key."""
+        canonical = {
+            name: parameter.default
+            for name, parameter in inspect.signature(method).parameters.items()
+            if name != "data"
+        }
+        canonical.update(params)
+        return canonical
+
+    def calculate_panel_macd(
+        self,
+        close: Union[np.ndarray, pd.DataFrame],
+        fast_period: int = 12,
+        slow_period: int = 26,
+        signal_period: int = 9
+    ) -> Dict[str, Union[np.ndarray, pd.DataFrame]]:
+        """
+        Calculate MACD for every instrument of a (dates x instruments) panel.
+
+        Args:
+            close: Close price panel (NaN before listing / after delisting)
+            fast_period: Fast EMA period (default: 12)
+            slow_period: Slow EMA period (default: 26)
+            signal_period: Signal line EMA period (default: 9)
+
+        Returns:
+            Dictionary with 'macd', 'signal' and 'histogram' panels
+
+        Raises:
+            InsufficientDataError: If the panel has fewer dates than required
+            IndicatorCalculationError: If the panel is not 2-D
+        """
+        values, frame = self._validate_panel(close, min_rows=slow_period + signal_period)
+
+        result = self.backend.macd(values, fast_period, slow_period, signal_period)
+
+        logger.debug(f"Panel MACD calculated: shape={values.shape}")
+
+        return self._wrap_panel_result(self._mask_unlisted(result, values), frame)
+
+    def calculate_panel_rsi(
+        self,
+        close: Union[np.ndarray, pd.DataFrame],
+        period: int = 14,
+        overbought: float = 70,
+        oversold: float = 30
+    ) -> Dict[str, Union[np.ndarray, pd.DataFrame, float]]:
+        """
+        Calculate RSI for every instrument of a (dates x instruments) panel.
+
+        Args:
+            close: Close price panel (NaN before listing / after delisting)
+            period: RSI period (default: 14)
+            overbought: Overbought threshold (default: 70)
+            oversold: Oversold threshold (default: 30)
+
+        Returns:
+            Dictionary with the 'rsi' panel, 'overbought_line' and 'oversold_line'
+
+        Raises:
+            InsufficientDataError: If the panel has fewer dates than required
+            IndicatorCalculationError: If the panel is invalid or has negative prices
+        """
+        values, frame = self._validate_panel(close, min_rows=period + 1)
+
+        if (values < 0).any():
+            raise IndicatorCalculationError("Price data contains negative values")
+
+        result = self._wrap_panel_result(
+            self._mask_unlisted(self.backend.rsi(values, period), values), frame
+        )
+        result["overbought_line"] = overbought
+        result["oversold_line"] = oversold
+
+        logger.debug(f"Panel RSI calculated: shape={values.shape}")
+
+        return result
+
+    def calculate_panel_kdj(
+        self,
+        high: Union[np.ndarray, pd.DataFrame],
+        low: Union[np.ndarray, pd.DataFrame],
+        close: Union[np.ndarray, pd.DataFrame],
+        k_period: int = 9,
+        d_period: int = 3,
+        j_period: int = 3
+    ) -> Dict[str, Union[np.ndarray, pd.DataFrame]]:
+        """
+        Calculate KDJ for every instrument of a (dates x instruments) panel.
+
+        Args:
+            high: High price panel
+            low: Low price panel
+            close: Close price panel
+            k_period: K period (default: 9)
+            d_period: D period (default: 3)
+            j_period: J period (default: 3)
+
+        Returns:
+            Dictionary with 'k', 'd' and 'j' panels
+
+        Raises:
+            InsufficientDataError: If the panel has fewer dates than required
+            IndicatorCalculationError: If the panels are invalid or misaligned
+        """
+        close_values, frame = self._validate_panel(close, min_rows=k_period)
+        high_values, _ = self._validate_panel(high, min_rows=k_period)
+        low_values, _ = self._validate_panel(low, min_rows=k_period)
+
+        if not (high_values.shape == low_values.shape == close_values.shape):
+            raise IndicatorCalculationError(
+                "High, low and close panels must have the same shape"
+            )
+
+        result = self.backend.kdj(
+            high_values, low_values, close_values, k_period, d_period, j_period
+        )
+
+        logger.debug(f"Panel KDJ calculated: shape={close_values.shape}")
+
+        return self._wrap_panel_result(self._mask_unlisted(result, close_values), frame)
+
+    def calculate_panel_ma(
+        self,
+        close: Union[np.ndarray, pd.DataFrame],
+        periods: List[int] = None
+    ) -> Dict[str, Union[np.ndarray, pd.DataFrame]]:
+        """
+        Calculate moving averages for every instrument of a panel.
+
+        Args:
+            close: Close price panel
+            periods: List of periods to calculate (default: [5, 10, 20, 60])
+
+        Returns:
+            Dictionary with one panel per period (e.g., 'ma5', 'ma10')
+
+        Raises:
+            IndicatorCalculationError: If the panel is not 2-D
+        """
+        if periods is None:
+            periods = [5, 10, 20, 60]
+
+        values, frame = self._validate_panel(close)
+
+        result = self.backend.ma(values, periods)
+
+        logger.debug(f"Panel MA calculated for periods {periods}: shape={values.shape}")
+
+        return self._wrap_panel_result(result, frame)
+
+    def build_indicator_state(
+        self,
+        data: pd.DataFrame,
+        indicator: str,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Tuple[Dict[str, Any], IndicatorState]:
+        """
+        Calculate an indicator over the full history and keep resumable state.
+
+        The returned state can be serialized with ``state.to_dict()`` and later
+        passed to extend_indicator_state when new bars are appended.
+
+        Args:
+            data: DataFrame with the full price history
+            indicator: Indicator name (MACD, RSI, KDJ or MA)
+            params: Optional indicator parameters (same as calculate_*)
+
+        Returns:
+            Tuple of (indicator result for all rows, indicator state)
+
+        Raises:
+            ValueError: If the indicator does not support incremental updates
+            InsufficientDataError: If data has fewer rows than required
+            IndicatorCalculationError: If required columns are missing
+        """
+        state_cls = INDICATOR_STATES.get(indicator)
+        if state_cls is None:
+            raise ValueError(
+                f"Incremental calculation not supported for: {indicator}. "
+                f"Supported: {list(INDICATOR_STATES)}"
+            )
+
+        state = state_cls(**(params or {}))
+        self._validate_dataframe(data, min_rows=self._min_rows_for_state(state))
+
+        result = self._update_indicator_state(state, data)
+
+        logger.debug(f"{indicator} state built from {len(data)} rows")
+
+        return result, state
+
+    def extend_indicator_state(
+        self,
+        state: Union[IndicatorState, Dict[str, Any]],
+        new_data: pd.DataFrame
+    ) -> Dict[str, Any]:
+        """
+        Extend an indicator with newly appended bars.
+
+        Only the new rows are processed, so the cost is O(k) for k new bars
+        regardless of the history length. The state is updated in place.
+
+        Args:
+            state: State from build_indicator_state (or its ``to_dict()`` form)
+            new_data: DataFrame with only the new rows
+
+        Returns:
+            Indicator result for the new rows
+
+        Raises:
+            IndicatorCalculationError: If required columns are missing
+        """
+        if isinstance(state, dict):
+            state = IndicatorState.from_dict(state)
+
+        result = self._update_indicator_state(state, new_data)
+
+        logger.debug(
+            f"{state.indicator} extended by {len(new_data)} rows "
+            f"(total {state.bars_seen})"
+        )
+
+        return result
+
+    def _update_indicator_state(
+        self,
+        state: IndicatorState,
+        data: pd.DataFrame
+    ) -> Dict[str, Any]:
+        """Validate columns and feed rows into an indicator state."""
+        for col in state.required_columns:
+            self._validate_column_exists(data, col)
+
+        if state.indicator == "RSI" and (data[state.params["column"]] < 0).any():
+            raise IndicatorCalculationError("Price data contains negative values")
+
+        try:
+            return state.update(data)
+        except Exception as e:
+            logger.error(f"Error updating {state.indicator} state: {str(e)}")
+            raise IndicatorCalculationError(
+                f"Failed to update {state.indicator} state: {str(e)}"
+            ) from e
+
+    @staticmethod
+    def _min_rows_for_state(state: IndicatorState) -> int:
+        """Minimum history required, matching the batch calculate_* methods."""
+        params = state.params
+        if state.indicator == "MACD":
+            return params["slow_period"] + params["signal_period"]
+        if state.indicator == "RSI":
+            return params["period"] + 1
+        if state.indicator == "KDJ":
+            return params["k_period"]
+        return 1
+
     def _validate_dataframe(self, data: pd.DataFrame, min_rows: int = 1):
         """
         Validate that dataframe has sufficient data.
@@ -423,6 +723,70 @@ class IndicatorService:
                 f"Insufficient data: {len(data)} rows, minimum {min_rows} required"
             )
 
+    def _validate_panel(
+        self,
+        panel: Union[np.ndarray, pd.DataFrame],
+        min_rows: int = 1
+    ) -> Tuple[np.ndarray, Optional[pd.DataFrame]]:
+        """
+        Validate a (dates x instruments) panel and return it as a float array.
+
+        Args:
+            panel: 2-D array or DataFrame (index = dates, columns = instruments)
+            min_rows: Minimum required number of dates
+
+        Returns:
+            Tuple of (float array, original DataFrame or None)
+
+        Raises:
+            InsufficientDataError: If the panel has too few dates
+            IndicatorCalculationError: If the panel is not 2-D
+        """
+        frame = panel if isinstance(panel, pd.DataFrame) else None
+        values = np.asarray(panel, dtype=float)
+
+        if values.ndim != 2:
+            raise IndicatorCalculationError(
+                f"Panel must be 2-D (dates x instruments), got {values.ndim}-D"
+            )
+
+        if values.size == 0:
+            raise InsufficientDataError("Data is empty")
+
+        if values.shape[0] < min_rows:
+            raise InsufficientDataError(
+                f"Insufficient data: {values.shape[0]} rows, minimum {min_rows} required"
+            )
+
+        return values, frame
+
+    @staticmethod
+    def _column_values(data: pd.DataFrame, column: str) -> np.ndarray:
+        """Column as a float array for the compute backend."""
+        return data[column].to_numpy(dtype=float)
+
+    @staticmethod
+    def _mask_unlisted(
+        result: Dict[str, np.ndarray],
+        values: np.ndarray
+    ) -> Dict[str, np.ndarray]:
+        """Set cells before listing / after delisting back to NaN."""
+        mask = indicator_panel.listed_mask(values)
+        return {key: np.where(mask, panel, np.nan) for key, panel in result.items()}
+
+    @staticmethod
+    def _wrap_panel_result(
+        result: Dict[str, np.ndarray],
+        frame: Optional[pd.DataFrame]
+    ) -> Dict[str, Union[np.ndarray, pd.DataFrame]]:
+        """Return DataFrames with the input labels when the input was a DataFrame."""
+        if frame is None:
+            return result
+        return {
+            key: pd.DataFrame(values, index=frame.index, columns=frame.columns)
+            for key, values in result.items()
+        }
+
     def _validate_column_exists(self, data: pd.DataFrame, column: str):
         """
         Validate that required column exists in dataframe.
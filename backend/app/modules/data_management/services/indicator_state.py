@@ -0,0 +1,411 @@
+"""
+Incremental Indicator State
+
+Resumable state for the technical indicators computed by IndicatorService.
+
+Every indicator in IndicatorService is built from three primitives:
+- EMA accumulators (MACD, RSI averages, KDJ smoothing)
+- Rolling windows (MA, KDJ highest high / lowest low)
+- The previous close (RSI price delta)
+
+The state objects below keep exactly that information, so when k new bars
+arrive the indicator tail is extended in O(k) instead of recomputing the
+full history. The recurrences mirror pandas ``ewm(span, adjust=False)`` and
+``rolling(window)`` step for step (including NaN handling), so a resumed
+series matches the batch calculation.
+
+All states serialize to JSON-safe dictionaries via ``to_dict``/``from_dict``
+so they can be stored in the cache next to the indicator values.
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Type
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def _encode_floats(values: np.ndarray) -> List[Optional[float]]:
+    """Convert a float array to a JSON-safe list (NaN -> None)."""
+    return [None if math.isnan(v) else float(v) for v in np.asarray(values, dtype=float)]
+
+
+def _decode_floats(values: List[Optional[float]]) -> np.ndarray:
+    """Convert a JSON list back to a float array (None -> NaN)."""
+    return np.array([np.nan if v is None else v for v in values], dtype=float)
+
+
+def _encode_float(value: float) -> Optional[float]:
+    return None if math.isnan(value) else float(value)
+
+
+def _decode_float(value: Optional[float]) -> float:
+    return math.nan if value is None else float(value)
+
+
+@dataclass
+class EMAState:
+    """
+    Exponential moving average accumulator.
+
+    Equivalent to pandas ``Series.ewm(span=span, adjust=False).mean()``.
+    ``weighted`` is the current EMA value and ``old_wt`` the decayed weight
+    carried across missing observations.
+    """
+
+    span: int
+    weighted: float = math.nan
+    old_wt: float = 1.0
+    nobs: int = 0
+
+    def update(self, values: np.ndarray) -> np.ndarray:
+        """
+        Feed new values and return the EMA for each of them.
+
+        Args:
+            values: New input values (NaN allowed)
+
+        Returns:
+            EMA values aligned with the input
+        """
+        alpha = 2.0 / (self.span + 1.0)
+        old_wt_factor = 1.0 - alpha
+
+        weighted, old_wt, nobs = self.weighted, self.old_wt, self.nobs
+        values = np.asarray(values, dtype=float)
+        output = np.empty(len(values), dtype=float)
+
+        for i, cur in enumerate(values.tolist()):
+            is_observation = cur == cur
+            nobs += is_observation
+            if weighted == weighted:
+                old_wt *= old_wt_factor
+                if is_observation:
+                    if weighted != cur:
+                        weighted = old_wt * weighted + alpha * cur
+                        weighted /= old_wt + alpha
+                    old_wt = 1.0
+            elif is_observation:
+                weighted = cur
+            output[i] = weighted if nobs >= 1 else math.nan
+
+        self.weighted, self.old_wt, self.nobs = weighted, old_wt, nobs
+        return output
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "span": self.span,
+            "weighted": _encode_float(self.weighted),
+            "old_wt": self.old_wt,
+            "nobs": self.nobs,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "EMAState":
+        return cls(
+            span=int(data["span"]),
+            weighted=_decode_float(data["weighted"]),
+            old_wt=float(data["old_wt"]),
+            nobs=int(data["nobs"]),
+        )
+
+
+@dataclass
+class RollingWindowState:
+    """
+    Fixed-size rolling window buffer.
+
+    Equivalent to pandas ``Series.rolling(window).<reducer>()`` with the
+    default ``min_periods=window``: any window that is not full or contains
+    NaN yields NaN. Only the last ``window - 1`` values are retained.
+    """
+
+    window: int
+    reducer: str = "mean"
+    buffer: np.ndarray = field(default=None)
+
+    _REDUCERS = {"mean": np.mean, "min": np.min, "max": np.max}
+
+    def __post_init__(self):
+        if self.reducer not in self._REDUCERS:
+            raise ValueError(f"Unsupported rolling reducer: {self.reducer}")
+        if self.buffer is None:
+            self.buffer = np.full(self.window - 1, np.nan)
+
+    def update(self, values: np.ndarray) -> np.ndarray:
+        """
+        Feed new values and return the rolling statistic for each of them.
+
+        Args:
+            values: New input values
+
+        Returns:
+            Rolling values aligned with the input
+        """
+        values = np.asarray(values, dtype=float)
+        if len(values) == 0:
+            return np.empty(0, dtype=float)
+
+        joined = np.concatenate([self.buffer, values])
+        windows = sliding_window_view(joined, self.window)
+        output = self._REDUCERS[self.reducer](windows, axis=1)
+
+        self.buffer = joined[len(joined) - (self.window - 1):].copy()
+        return output
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "window": self.window,
+            "reducer": self.reducer,
+            "buffer": _encode_floats(self.buffer),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RollingWindowState":
+        return cls(
+            window=int(data["window"]),
+            reducer=data["reducer"],
+            buffer=_decode_floats(data["buffer"]),
+        )
+
+
+class IndicatorState:
+    """
+    Base class for resumable indicator state.
+
+    Subclasses implement ``update`` to consume new bars and return the
+    indicator values for those bars in the same format as the matching
+    ``IndicatorService.calculate_*`` method.
+    """
+
+    indicator: str = ""
+    required_columns: List[str] = []
+
+    def __init__(self, params: Dict[str, Any]):
+        self.params = dict(params)
+        self.bars_seen = 0
+
+    def update(self, data: pd.DataFrame) -> Dict[str, Any]:
+        result = self._update(data)
+        self.bars_seen += len(data)
+        return result
+
+    def _update(self, data: pd.DataFrame) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def _state_dict(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def _load_state(self, state: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize to a JSON-safe dictionary."""
+        return {
+            "indicator": self.indicator,
+            "params": self.params,
+            "bars_seen": self.bars_seen,
+            "state": self._state_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "IndicatorState":
+        """Restore state serialized with ``to_dict``."""
+        state_cls = INDICATOR_STATES.get(data.get("indicator"))
+        if state_cls is None:
+            raise ValueError(f"Unknown indicator state: {data.get('indicator')}")
+        instance = state_cls(**data["params"])
+        instance.bars_seen = int(data["bars_seen"])
+        instance._load_state(data["state"])
+        return instance
+
+
+class MACDState(IndicatorState):
+    """Resumable MACD: fast, slow and signal EMA accumulators."""
+
+    indicator = "MACD"
+
+    def __init__(
+        self,
+        fast_period: int = 12,
+        slow_period: int = 26,
+        signal_period: int = 9,
+        column: str = "close"
+    ):
+        super().__init__({
+            "fast_period": fast_period,
+            "slow_period": slow_period,
+            "signal_period": signal_period,
+            "column": column,
+        })
+        self.required_columns = [column]
+        self.fast = EMAState(fast_period)
+        self.slow = EMAState(slow_period)
+        self.signal = EMAState(signal_period)
+
+    def _update(self, data: pd.DataFrame) -> Dict[str, Any]:
+        prices = data[self.params["column"]].to_numpy(dtype=float)
+
+        macd_line = self.fast.update(prices) - self.slow.update(prices)
+        signal_line = self.signal.update(macd_line)
+
+        return {
+            "macd": macd_line,
+            "signal": signal_line,
+            "histogram": macd_line - signal_line,
+        }
+
+    def _state_dict(self) -> Dict[str, Any]:
+        return {
+            "fast": self.fast.to_dict(),
+            "slow": self.slow.to_dict(),
+            "signal": self.signal.to_dict(),
+        }
+
+    def _load_state(self, state: Dict[str, Any]) -> None:
+        self.fast = EMAState.from_dict(state["fast"])
+        self.slow = EMAState.from_dict(state["slow"])
+        self.signal = EMAState.from_dict(state["signal"])
+
+
+class RSIState(IndicatorState):
+    """Resumable RSI: previous close plus average gain/loss accumulators."""
+
+    indicator = "RSI"
+
+    def __init__(
+        self,
+        period: int = 14,
+        overbought: float = 70,
+        oversold: float = 30,
+        column: str = "close"
+    ):
+        super().__init__({
+            "period": period,
+            "overbought": overbought,
+            "oversold": oversold,
+            "column": column,
+        })
+        self.required_columns = [column]
+        self.last_price = math.nan
+        self.avg_gain = EMAState(period)
+        self.avg_loss = EMAState(period)
+
+    def _update(self, data: pd.DataFrame) -> Dict[str, Any]:
+        prices = data[self.params["column"]].to_numpy(dtype=float)
+
+        delta = np.diff(prices, prepend=self.last_price)
+        gain = np.where(delta > 0, delta, 0.0)
+        loss = -np.where(delta < 0, delta, 0.0)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rs = self.avg_gain.update(gain) / self.avg_loss.update(loss)
+            rsi = 100 - (100 / (1 + rs))
+
+        if len(prices):
+            self.last_price = float(prices[-1])
+
+        return {
+            "rsi": rsi,
+            "overbought_line": self.params["overbought"],
+            "oversold_line": self.params["oversold"],
+        }
+
+    def _state_dict(self) -> Dict[str, Any]:
+        return {
+            "last_price": _encode_float(self.last_price),
+            "avg_gain": self.avg_gain.to_dict(),
+            "avg_loss": self.avg_loss.to_dict(),
+        }
+
+    def _load_state(self, state: Dict[str, Any]) -> None:
+        self.last_price = _decode_float(state["last_price"])
+        self.avg_gain = EMAState.from_dict(state["avg_gain"])
+        self.avg_loss = EMAState.from_dict(state["avg_loss"])
+
+
+class KDJState(IndicatorState):
+    """Resumable KDJ: high/low rolling windows plus K and D accumulators."""
+
+    indicator = "KDJ"
+    required_columns = ["high", "low", "close"]
+
+    def __init__(self, k_period: int = 9, d_period: int = 3, j_period: int = 3):
+        super().__init__({
+            "k_period": k_period,
+            "d_period": d_period,
+            "j_period": j_period,
+        })
+        self.lowest_low = RollingWindowState(k_period, reducer="min")
+        self.highest_high = RollingWindowState(k_period, reducer="max")
+        self.k = EMAState(d_period)
+        self.d = EMAState(j_period)
+
+    def _update(self, data: pd.DataFrame) -> Dict[str, Any]:
+        high = data["high"].to_numpy(dtype=float)
+        low = data["low"].to_numpy(dtype=float)
+        close = data["close"].to_numpy(dtype=float)
+
+        lowest_low = self.lowest_low.update(low)
+        highest_high = self.highest_high.update(high)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsv = ((close - lowest_low) / (highest_high - lowest_low)) * 100
+
+        k = self.k.update(rsv)
+        d = self.d.update(k)
+
+        return {"k": k, "d": d, "j": 3 * k - 2 * d}
+
+    def _state_dict(self) -> Dict[str, Any]:
+        return {
+            "lowest_low": self.lowest_low.to_dict(),
+            "highest_high": self.highest_high.to_dict(),
+            "k": self.k.to_dict(),
+            "d": self.d.to_dict(),
+        }
+
+    def _load_state(self, state: Dict[str, Any]) -> None:
+        self.lowest_low = RollingWindowState.from_dict(state["lowest_low"])
+        self.highest_high = RollingWindowState.from_dict(state["highest_high"])
+        self.k = EMAState.from_dict(state["k"])
+        self.d = EMAState.from_dict(state["d"])
+
+
+class MAState(IndicatorState):
+    """Resumable moving averages: one rolling window per period."""
+
+    indicator = "MA"
+
+    def __init__(self, periods: Optional[List[int]] = None, column: str = "close"):
+        if periods is None:
+            periods = [5, 10, 20, 60]
+        super().__init__({"periods": list(periods), "column": column})
+        self.required_columns = [column]
+        self.windows = {period: RollingWindowState(period) for period in periods}
+
+    def _update(self, data: pd.DataFrame) -> Dict[str, Any]:
+        prices = data[self.params["column"]].to_numpy(dtype=float)
+        return {
+            f"ma{period}": window.update(prices)
+            for period, window in self.windows.items()
+        }
+
+    def _state_dict(self) -> Dict[str, Any]:
+        return {str(period): window.to_dict() for period, window in self.windows.items()}
+
+    def _load_state(self, state: Dict[str, Any]) -> None:
+        self.windows = {
+            int(period): RollingWindowState.from_dict(window)
+            for period, window in state.items()
+        }
+
+
+INDICATOR_STATES: Dict[str, Type[IndicatorState]] = {
+    "MACD": MACDState,
+    "RSI": RSIState,
+    "KDJ": KDJState,
+    "MA": MAState,
+}
@@ -17,8 +17,23 @@ from app.modules.indicator.schemas.custom_factor import (
     PublishFactorRequest,
     CloneFactorRequest
 )
+from app.modules.indicator.schemas.factor_batch import (
+    FactorBatchEvaluationCreate,
+    FactorBatchEvaluationResponse
+)
+from app.modules.indicator.schemas.factor_validation import (
+    FactorValidationCreate,
+    FactorValidationResponse,
+    FactorValidationListResponse
+)
 from app.modules.indicator.services.custom_factor_service import CustomFactorService
+from app.modules.indicator.services.factor_validation_service import FactorValidationService
 from app.database.repositories.custom_factor_repository import CustomFactorRepository
+from app.database.repositories.dataset import DatasetRepository
+from app.database.repositories.factor_validation_repository import FactorValidationResultRepository
+from app.database.repositories.task_repository import TaskRepository
+from app.database.models.task import TaskType
+from app.modules.task_scheduling.services.task_service import TaskService
 from app.modules.common.logging import get_logger, set_correlation_id
 from app.modules.common.logging.decorators import log_async_execution
 
@@ -45,6 +60,20 @@ def get_custom_factor_service(db: AsyncSession = Depends(get_db)) -> CustomFacto
     return CustomFactorService(custom_factor_repo)
 
 
+def get_factor_validation_service(db: AsyncSession = Depends(get_db)) -> FactorValidationService:
+    """Dependency to get FactorValidationService instance."""
+    return FactorValidationService(
+        validation_repo=FactorValidationResultRepository(db),
+        custom_factor_repo=CustomFactorRepository(db),
+        dataset_repo=DatasetRepository(db),
+    )
+
+
+def get_task_service(db: AsyncSession = Depends(get_db)) -> TaskService:
+    """Dependency to get TaskService instance."""
+    return TaskService(TaskRepository(db))
+
+
 # TODO: Add authentication dependency to get current user
 def get_current_user_id() -> str:
     """Temporary: Return a mock user ID until authentication is implemented."""
@@ -382,3 +411,218 @@ async def clone_factor(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to clone factor"
         )
+
+
+@router.post(
+    "/batch-evaluations",
+    response_model=FactorBatchEvaluationResponse,
+    status_code=status.HTTP_202_ACCEPTED
+)
+@log_async_execution(level="INFO")
+async def start_batch_evaluation(
+    request: FactorBatchEvaluationCreate,
+    user_id: str = Depends(get_current_user_id),
+    task_service: TaskService = Depends(get_task_service),
+    correlation_id: str = Depends(set_request_correlation_id)
+):
+    """
+    Start a background evaluation of many factors in one data pass.
+
+    The dataset is loaded once, shared subexpressions are computed once and
+    results are stored in the factor value store.
+
+    Args:
+        request: Factor IDs, dataset and worker count
+        user_id: Current user ID (from authentication)
+        task_service: TaskService instance
+        correlation_id: Request correlation ID
+
+    Returns:
+        FactorBatchEvaluationResponse; poll GET /api/v1/tasks/{task_id}
+        for progress and per-factor results and timings
+    """
+    from app.modules.indicator.tasks.batch_tasks import evaluate_factor_batch
+
+    factor_ids = list(dict.fromkeys(request.factor_ids))
+    try:
+        task = await task_service.create_task({
+            "type": TaskType.FACTOR_BATCH.value,
+            "name": f"Batch evaluation of {len(factor_ids)} factors",
+            "params": {
+                "factor_ids": factor_ids,
+                "dataset_id": request.dataset_id,
+                "max_workers": request.max_workers,
+            },
+            "created_by": user_id,
+        })
+        evaluate_factor_batch.delay(task.id)
+        return {"task_id": task.id, "status": task.status, "factor_count": len(factor_ids)}
+    except Exception as e:
+        logger.error(f"Error starting batch evaluation: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to start batch evaluation"
+        )
+
+
+@router.post(
+    "/{factor_id}/validations",
+    response_model=FactorValidationResponse,
+    status_code=status.HTTP_202_ACCEPTED
+)
+@log_async_execution(level="INFO")
+async def start_validation(
+    factor_id: str,
+    request: FactorValidationCreate,
+    user_id: str = Depends(get_current_user_id),
+    service: FactorValidationService = Depends(get_factor_validation_service),
+    correlation_id: str = Depends(set_request_correlation_id)
+):
+    """
+    Start a background validation (IC, rank IC, distribution, layered
+    backtest or Sharpe ratio) of a factor.
+
+    Args:
+        factor_id: Factor ID
+        request: Dataset, validation type and options
+        user_id: Current user ID (from authentication)
+        service: FactorValidationService instance
+        correlation_id: Request correlation ID
+
+    Returns:
+        FactorValidationResponse with the pending validation; poll
+        GET /{factor_id}/validations/{validation_id} for progress
+
+    Raises:
+        400: If the validation type or options are invalid
+        403: If the user may not use the factor
+        404: If the factor or dataset is not found
+    """
+    from app.modules.indicator.exceptions import (
+        ValidationError, AuthorizationError, ResourceNotFoundError
+    )
+    from app.modules.indicator.tasks.validation_tasks import run_factor_validation
+
+    try:
+        result = await service.create_validation(
+            factor_id=factor_id,
+            dataset_id=request.dataset_id,
+            validation_type=request.validation_type,
+            authenticated_user_id=user_id,
+            config=request.config.model_dump(mode="json") if request.config else None
+        )
+        validation = result["validation"]
+        run_factor_validation.delay(validation["id"])
+        return validation
+    except ValidationError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except AuthorizationError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+    except ResourceNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error starting validation for factor {factor_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to start validation"
+        )
+
+
+@router.get("/{factor_id}/validations", response_model=FactorValidationListResponse)
+@log_async_execution(level="INFO")
+async def list_validations(
+    factor_id: str,
+    validation_type: Optional[str] = Query(None, description="Filter by validation type"),
+    skip: int = Query(0, ge=0, description="Number of records to skip"),
+    limit: int = Query(20, ge=1, le=100, description="Maximum records to return"),
+    user_id: str = Depends(get_current_user_id),
+    service: FactorValidationService = Depends(get_factor_validation_service),
+    correlation_id: str = Depends(set_request_correlation_id)
+):
+    """
+    List a factor's validations, newest first.
+
+    Args:
+        factor_id: Factor ID
+        validation_type: Optional type filter
+        skip: Number of records to skip
+        limit: Maximum records to return
+        user_id: Current user ID (from authentication)
+        service: FactorValidationService instance
+        correlation_id: Request correlation ID
+
+    Returns:
+        FactorValidationListResponse
+
+    Raises:
+        403: If the user may not use the factor
+        404: If the factor is not found
+    """
+    from app.modules.indicator.exceptions import AuthorizationError, ResourceNotFoundError
+
+    try:
+        validations = await service.get_factor_validations(
+            factor_id, validation_type=validation_type, skip=skip, limit=limit,
+            authenticated_user_id=user_id
+        )
+        return {"validations": validations, "total": len(validations)}
+    except AuthorizationError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+    except ResourceNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error listing validations for factor {factor_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to list validations"
+        )
+
+
+@router.get("/{factor_id}/validations/{validation_id}", response_model=FactorValidationResponse)
+@log_async_execution(level="INFO")
+async def get_validation(
+    factor_id: str,
+    validation_id: str,
+    user_id: str = Depends(get_current_user_id),
+    service: FactorValidationService = Depends(get_factor_validation_service),
+    correlation_id: str = Depends(set_request_correlation_id)
+):
+    """
+    Get a validation's status, progress and results.
+
+    Args:
+        factor_id: Factor ID
+        validation_id: Validation ID
+        user_id: Current user ID (from authentication)
+        service: FactorValidationService instance
+        correlation_id: Request correlation ID
+
+    Returns:
+        FactorValidationResponse
+
+    Raises:
+        403: If the user may not use the factor
+        404: If the validation is not found for this factor
+    """
+    from app.modules.indicator.exceptions import AuthorizationError
+
+    try:
+        result = await service.get_validation(
+            validation_id, factor_id=factor_id, authenticated_user_id=user_id
+        )
+        if not result:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Validation with id '{validation_id}' not found"
+            )
+        return result["validation"]
+    except HTTPException:
+        raise
+    except AuthorizationError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error getting validation {validation_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to get validation"
+        )
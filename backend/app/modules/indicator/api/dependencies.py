@@ -11,6 +11,7 @@ from app.database import get_db
 from app.database.repositories.indicator_repository import IndicatorRepository
 from app.database.repositories.custom_factor_repository import CustomFactorRepository
 from app.database.repositories.user_factor_library_repository import UserFactorLibraryRepository
+from app.database.usage_counter import get_usage_counter
 from app.modules.indicator.services.indicator_service import IndicatorService
 from app.modules.indicator.services.custom_factor_service import CustomFactorService
 from app.modules.indicator.services.user_library_service import UserLibraryService
@@ -60,7 +61,7 @@ def get_indicator_service(db: AsyncSession = Depends(get_db)) -> IndicatorServic
         IndicatorService instance
     """
     indicator_repo = IndicatorRepository(db)
-    return IndicatorService(indicator_repo)
+    return IndicatorService(indicator_repo, get_usage_counter())
 
 
 def get_custom_factor_service(db: AsyncSession = Depends(get_db)) -> CustomFactorService:
@@ -88,4 +89,4 @@ def get_user_library_service(db: AsyncSession = Depends(get_db)) -> UserLibraryS
         UserLibraryService instance
     """
     user_library_repo = UserFactorLibraryRepository(db)
-    return UserLibraryService(user_library_repo)
+    return UserLibraryService(user_library_repo, get_usage_counter())
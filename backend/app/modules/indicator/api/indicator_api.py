@@ -16,6 +16,7 @@ from app.modules.indicator.schemas.indicator import (
 )
 from app.modules.indicator.services.indicator_service import IndicatorService
 from app.database.repositories.indicator_repository import IndicatorRepository
+from app.database.usage_counter import get_usage_counter
 from app.modules.common.logging import get_logger, set_correlation_id
 from app.modules.common.logging.decorators import log_async_execution
 
@@ -39,7 +40,7 @@ async def set_request_correlation_id(request: Request) -> str:
 def get_indicator_service(db: AsyncSession = Depends(get_db)) -> IndicatorService:
     """Dependency to get IndicatorService instance."""
     indicator_repo = IndicatorRepository(db)
-    return IndicatorService(indicator_repo)
+    return IndicatorService(indicator_repo, get_usage_counter())
 
 
 @router.get("", response_model=IndicatorListResponse)
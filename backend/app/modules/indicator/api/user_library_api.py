@@ -3,8 +3,10 @@
 Provides endpoints for managing user's factor library.
 """
 
+from datetime import date
+from typing import List, Optional
 from uuid import uuid4
-from fastapi import APIRouter, HTTPException, status, Query, Depends, Request
+from fastapi import APIRouter, HTTPException, status, Query, Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
@@ -15,8 +17,21 @@ from app.modules.indicator.schemas.user_library import (
     ToggleFavoriteRequest,
     LibraryStatsResponse
 )
+from app.modules.indicator.schemas.factor_correlation import (
+    FactorCorrelationRequest,
+    FactorCorrelationResponse,
+    FactorCorrelationResult
+)
+from app.modules.indicator.exceptions import ResourceNotFoundError, ValidationError
 from app.modules.indicator.services.user_library_service import UserLibraryService
+from app.modules.indicator.services.factor_correlation_service import FactorCorrelationService
 from app.database.repositories.user_factor_library_repository import UserFactorLibraryRepository
+from app.database.repositories.custom_factor_repository import CustomFactorRepository
+from app.database.repositories.dataset import DatasetRepository
+from app.database.repositories.task_repository import TaskRepository
+from app.database.usage_counter import get_usage_counter
+from app.database.models.task import TaskType
+from app.modules.task_scheduling.services.task_service import TaskService
 from app.modules.common.logging import get_logger, set_correlation_id
 from app.modules.common.logging.decorators import log_async_execution
 
@@ -40,7 +55,21 @@ async def set_request_correlation_id(request: Request) -> str:
 def get_user_library_service(db: AsyncSession = Depends(get_db)) -> UserLibraryService:
     """Dependency to get UserLibraryService instance."""
     user_library_repo = UserFactorLibraryRepository(db)
-    return UserLibraryService(user_library_repo)
+    return UserLibraryService(user_library_repo, get_usage_counter())
+
+
+def get_factor_correlation_service(db: AsyncSession = Depends(get_db)) -> FactorCorrelationService:
+    """Dependency to get FactorCorrelationService instance."""
+    return FactorCorrelationService(
+        UserFactorLibraryRepository(db),
+        CustomFactorRepository(db),
+        DatasetRepository(db)
+    )
+
+
+def get_task_service(db: AsyncSession = Depends(get_db)) -> TaskService:
+    """Dependency to get TaskService instance."""
+    return TaskService(TaskRepository(db))
 
 
 # TODO: Add authentication dependency to get current user
@@ -313,6 +342,136 @@ async def get_library_stats(
         )
 
 
+@router.post("/correlations", response_model=FactorCorrelationResponse)
+@log_async_execution(level="INFO")
+async def request_correlation(
+    request: FactorCorrelationRequest,
+    response: Response,
+    user_id: str = Depends(get_current_user_id),
+    service: FactorCorrelationService = Depends(get_factor_correlation_service),
+    task_service: TaskService = Depends(get_task_service),
+    correlation_id: str = Depends(set_request_correlation_id)
+):
+    """
+    Get or start the correlation analysis of the user's library.
+
+    If the analysis is cached for the current library version, dataset
+    version and options it is returned directly (200). Otherwise a
+    FACTOR_CORRELATION task is started (202); poll GET /api/v1/tasks/{task_id}
+    and then GET /api/user-library/correlations.
+
+    Args:
+        request: Dataset, optional factor subset and options
+        response: Response (status code set to 202 when pending)
+        user_id: Current user ID (from authentication)
+        service: FactorCorrelationService instance
+        task_service: TaskService instance
+        correlation_id: Request correlation ID
+
+    Returns:
+        FactorCorrelationResponse with the result or the task ID
+
+    Raises:
+        HTTPException: 400 if the request is invalid, 404 if the dataset is missing
+    """
+    from app.modules.indicator.tasks.correlation_tasks import compute_factor_correlation
+
+    config = request.config.model_dump(mode="json") if request.config else None
+    try:
+        result = await service.get_correlation(user_id, request.dataset_id, config, request.factor_ids)
+        if result is not None:
+            return {"status": "completed", "result": result}
+
+        task = await task_service.create_task({
+            "type": TaskType.FACTOR_CORRELATION.value,
+            "name": "Factor library correlation analysis",
+            "params": {
+                "dataset_id": request.dataset_id,
+                "factor_ids": request.factor_ids,
+                "config": config,
+            },
+            "created_by": user_id,
+        })
+        compute_factor_correlation.delay(task.id)
+        response.status_code = status.HTTP_202_ACCEPTED
+        return {"status": "pending", "task_id": task.id}
+    except ValidationError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except ResourceNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error requesting correlation analysis: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to request correlation analysis"
+        )
+
+
+@router.get("/correlations", response_model=FactorCorrelationResult)
+@log_async_execution(level="INFO")
+async def get_correlation(
+    dataset_id: str = Query(..., description="Dataset ID"),
+    factor_ids: Optional[List[str]] = Query(None, description="Library factor IDs (default: all)"),
+    threshold: float = Query(0.7, gt=0, le=1, description="Redundancy threshold on |correlation|"),
+    min_instruments: int = Query(5, ge=2, description="Minimum shared instruments per date"),
+    max_dates: int = Query(250, ge=1, description="Maximum sampled dates"),
+    start_date: Optional[date] = Query(None, description="First date to analyze"),
+    end_date: Optional[date] = Query(None, description="Last date to analyze"),
+    user_id: str = Depends(get_current_user_id),
+    service: FactorCorrelationService = Depends(get_factor_correlation_service),
+    correlation_id: str = Depends(set_request_correlation_id)
+):
+    """
+    Get the cached correlation analysis of the user's library.
+
+    The threshold is applied on read, so any threshold can be queried
+    once the matrix is computed.
+
+    Args:
+        dataset_id: Dataset ID
+        factor_ids: Library factor subset (default: whole library)
+        threshold: Redundancy threshold
+        min_instruments: Minimum shared instruments per date
+        max_dates: Maximum sampled dates
+        start_date: First date to analyze
+        end_date: Last date to analyze
+        user_id: Current user ID (from authentication)
+        service: FactorCorrelationService instance
+        correlation_id: Request correlation ID
+
+    Returns:
+        FactorCorrelationResult
+
+    Raises:
+        HTTPException: 404 if not computed for the current library version
+    """
+    config = {
+        "threshold": threshold,
+        "min_instruments": min_instruments,
+        "max_dates": max_dates,
+        "start_date": start_date.isoformat() if start_date else None,
+        "end_date": end_date.isoformat() if end_date else None,
+    }
+    try:
+        result = await service.get_correlation(user_id, dataset_id, config, factor_ids)
+    except ValidationError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except ResourceNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error getting correlation analysis: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to get correlation analysis"
+        )
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Correlation analysis not computed for the current library"
+        )
+    return result
+
+
 @router.post("/{factor_id}/increment-usage")
 @log_async_execution(level="INFO")
 async def increment_usage(
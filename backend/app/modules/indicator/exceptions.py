@@ -33,3 +33,13 @@ class ConflictError(IndicatorServiceError):
 class ServiceUnavailableError(IndicatorServiceError):
     """Raised when external service is unavailable"""
     pass
+
+
+class FormulaCompileError(ValidationError):
+    """Raised when a factor formula cannot be parsed or type-checked"""
+    pass
+
+
+class FactorEvaluationError(IndicatorServiceError):
+    """Raised when a compiled factor cannot be evaluated on a dataset"""
+    pass
@@ -16,6 +16,25 @@ from app.modules.indicator.schemas.custom_factor import (
     CloneFactorRequest
 )
 
+from app.modules.indicator.schemas.factor_validation import (
+    FactorValidationConfig,
+    FactorValidationCreate,
+    FactorValidationResponse,
+    FactorValidationListResponse
+)
+
+from app.modules.indicator.schemas.factor_batch import (
+    FactorBatchEvaluationCreate,
+    FactorBatchEvaluationResponse
+)
+
+from app.modules.indicator.schemas.factor_correlation import (
+    FactorCorrelationConfig,
+    FactorCorrelationRequest,
+    FactorCorrelationResult,
+    FactorCorrelationResponse
+)
+
 from app.modules.indicator.schemas.user_library import (
     UserLibraryItemResponse,
     UserLibraryListResponse,
@@ -37,6 +56,19 @@ __all__ = [
     "CustomFactorListResponse",
     "PublishFactorRequest",
     "CloneFactorRequest",
+    # Factor Validation schemas
+    "FactorValidationConfig",
+    "FactorValidationCreate",
+    "FactorValidationResponse",
+    "FactorValidationListResponse",
+    # Factor Batch Evaluation schemas
+    "FactorBatchEvaluationCreate",
+    "FactorBatchEvaluationResponse",
+    # Factor Correlation schemas
+    "FactorCorrelationConfig",
+    "FactorCorrelationRequest",
+    "FactorCorrelationResult",
+    "FactorCorrelationResponse",
     # User Library schemas
     "UserLibraryItemResponse",
     "UserLibraryListResponse",
@@ -0,0 +1,42 @@
+"""Factor Batch Evaluation Schemas for Indicator Module"""
+
+from typing import List, Optional
+from pydantic import BaseModel, Field, ConfigDict
+
+
+class FactorBatchEvaluationCreate(BaseModel):
+    """
+    Schema for starting a batch evaluation of many factors.
+
+    Attributes:
+        factor_ids: Factors to evaluate
+        dataset_id: Dataset to evaluate on
+        max_workers: Worker count (optional, default: CPU count)
+    """
+    factor_ids: List[str] = Field(..., min_length=1, max_length=500, description="Factor IDs")
+    dataset_id: str = Field(..., min_length=1, description="Dataset ID")
+    max_workers: Optional[int] = Field(None, ge=1, le=64, description="Worker count")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "factor_ids": [
+                    "550e8400-e29b-41d4-a716-446655440000",
+                    "6ba7b810-9dad-11d1-80b4-00c04fd430c8"
+                ],
+                "dataset_id": "7c9e6679-7425-40de-944b-e07fc1f90ae7"
+            }
+        }
+    )
+
+
+class FactorBatchEvaluationResponse(BaseModel):
+    """
+    Schema for a started batch evaluation.
+
+    Progress and per-factor results are available from the task API
+    (GET /api/v1/tasks/{task_id}).
+    """
+    task_id: str = Field(..., description="FACTOR_BATCH task ID")
+    status: str = Field(..., description="Task status")
+    factor_count: int = Field(..., ge=1, description="Number of distinct factors")
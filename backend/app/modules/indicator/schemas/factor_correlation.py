@@ -0,0 +1,86 @@
+"""Factor Correlation Schemas for Indicator Module"""
+
+from typing import Any, Dict, List, Optional
+from datetime import date
+from pydantic import BaseModel, Field, ConfigDict
+
+
+class FactorCorrelationConfig(BaseModel):
+    """
+    Schema for correlation analysis options.
+
+    Attributes:
+        threshold: Absolute correlation at which factors count as redundant
+        min_instruments: Minimum shared instruments for a date to count
+        max_dates: Maximum dates sampled (evenly spaced) from the window
+        start_date: First date to analyze (optional)
+        end_date: Last date to analyze (optional)
+    """
+    threshold: float = Field(0.7, gt=0, le=1, description="Redundancy threshold on |correlation|")
+    min_instruments: int = Field(5, ge=2, description="Minimum shared instruments per date")
+    max_dates: Optional[int] = Field(250, ge=1, description="Maximum sampled dates (None: all)")
+    start_date: Optional[date] = Field(None, description="First date to analyze")
+    end_date: Optional[date] = Field(None, description="Last date to analyze")
+
+
+class FactorCorrelationRequest(BaseModel):
+    """
+    Schema for requesting a library correlation analysis.
+
+    Attributes:
+        dataset_id: Dataset to compute correlations on
+        factor_ids: Library factors to compare (optional, default: whole library)
+        config: Analysis options (optional)
+    """
+    dataset_id: str = Field(..., min_length=1, description="Dataset ID")
+    factor_ids: Optional[List[str]] = Field(None, min_length=2, description="Library factor IDs")
+    config: Optional[FactorCorrelationConfig] = Field(None, description="Analysis options")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "dataset_id": "550e8400-e29b-41d4-a716-446655440000",
+                "config": {"threshold": 0.8}
+            }
+        }
+    )
+
+
+class FactorCorrelationCluster(BaseModel):
+    """Group of factors connected by correlations above the threshold."""
+    factor_ids: List[str] = Field(..., description="Factors in the cluster, preferred first")
+    representative: str = Field(..., description="Factor to keep from the cluster")
+    max_correlation: float = Field(..., description="Highest |correlation| within the cluster")
+
+
+class FactorCorrelationResult(BaseModel):
+    """
+    Schema for a correlation analysis result.
+
+    matrix[i][j] is the time-averaged rank correlation of factors[i] and
+    factors[j] (None where no date had enough shared instruments).
+    """
+    library_version: str = Field(..., description="Library version the result belongs to")
+    dataset_id: str = Field(..., description="Dataset ID")
+    dataset_version: str = Field(..., description="Dataset version")
+    n_dates: int = Field(..., ge=0, description="Number of dates averaged")
+    threshold: float = Field(..., description="Redundancy threshold")
+    factors: List[Dict[str, Any]] = Field(..., description="Factor ID, name and coverage per row")
+    matrix: List[List[Optional[float]]] = Field(..., description="Correlation matrix")
+    clusters: List[FactorCorrelationCluster] = Field(..., description="Redundant factor clusters")
+    selected: List[str] = Field(..., description="Factors with pairwise |correlation| below threshold")
+    redundant: List[str] = Field(..., description="Factors not selected")
+    excluded: List[Dict[str, Any]] = Field(default_factory=list, description="Factors that failed to evaluate")
+    config: Dict[str, Any] = Field(default_factory=dict, description="Options the matrix was computed with")
+
+
+class FactorCorrelationResponse(BaseModel):
+    """
+    Schema for a correlation request response.
+
+    Completed requests carry the result; otherwise poll the task API
+    (GET /api/v1/tasks/{task_id}) and then GET /api/user-library/correlations.
+    """
+    status: str = Field(..., description="completed or pending")
+    task_id: Optional[str] = Field(None, description="FACTOR_CORRELATION task ID when pending")
+    result: Optional[FactorCorrelationResult] = Field(None, description="Result when completed")
@@ -0,0 +1,83 @@
+"""Factor Validation Schemas for Indicator Module"""
+
+from typing import Any, Dict, List, Optional
+from datetime import date, datetime
+from pydantic import BaseModel, Field, ConfigDict
+
+
+class FactorValidationConfig(BaseModel):
+    """
+    Schema for validation run options.
+
+    Attributes:
+        horizons: Forward-return horizons in trading days
+        price_field: Dataset field used for forward returns
+        min_instruments: Minimum instruments per date for an IC value or bucketing
+        n_groups: Number of quantile buckets (layered backtest, Sharpe ratio)
+        rebalance_period: Trading days between rebalances (layered backtest, Sharpe ratio)
+        sharpe_window: Trading days of the rolling Sharpe ratio (Sharpe ratio)
+        start_date: First date to validate (optional)
+        end_date: Last date to validate (optional)
+    """
+    horizons: List[int] = Field([1, 5, 10, 20], min_length=1, description="Forward-return horizons")
+    price_field: str = Field("close", description="Price field for forward returns")
+    min_instruments: int = Field(5, ge=2, description="Minimum instruments per date")
+    n_groups: int = Field(5, ge=2, le=20, description="Quantile buckets for layered backtest")
+    rebalance_period: int = Field(1, ge=1, le=250, description="Days between rebalances")
+    sharpe_window: int = Field(63, ge=2, le=250, description="Days of the rolling Sharpe ratio")
+    start_date: Optional[date] = Field(None, description="First date to validate")
+    end_date: Optional[date] = Field(None, description="Last date to validate")
+
+
+class FactorValidationCreate(BaseModel):
+    """
+    Schema for starting a factor validation.
+
+    Attributes:
+        dataset_id: Dataset to validate on
+        validation_type: ic_analysis, ic_rank_analysis, factor_distribution,
+                         layered_backtest or sharpe_ratio
+        config: Validation options (optional)
+    """
+    dataset_id: str = Field(..., min_length=1, description="Dataset ID")
+    validation_type: str = Field(..., description="Validation type")
+    config: Optional[FactorValidationConfig] = Field(None, description="Validation options")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "dataset_id": "550e8400-e29b-41d4-a716-446655440000",
+                "validation_type": "ic_rank_analysis",
+                "config": {"horizons": [1, 5, 20], "min_instruments": 10}
+            }
+        }
+    )
+
+
+class FactorValidationResponse(BaseModel):
+    """
+    Schema for factor validation response.
+
+    Metrics and details are filled in once the validation completes.
+    """
+    id: str
+    factor_id: str = Field(..., description="Factor ID")
+    dataset_id: str = Field(..., description="Dataset ID")
+    validation_type: str = Field(..., description="Validation type")
+    status: str = Field(..., description="Status (pending, running, completed, failed)")
+    progress_percentage: float = Field(0.0, description="Progress percentage (0-100)")
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    metrics: Optional[Dict[str, Any]] = Field(None, description="Summary metrics")
+    details: Optional[Dict[str, Any]] = Field(None, description="Detailed results")
+    error_message: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class FactorValidationListResponse(BaseModel):
+    """Schema for a factor's validation history."""
+    validations: List[FactorValidationResponse] = Field(..., description="Validations, newest first")
+    total: int = Field(..., ge=0, description="Number of validations returned")
@@ -5,12 +5,27 @@ Provides high-level operations for managing user-defined custom factors.
 """
 
 from typing import Dict, Any, List, Optional
+import numpy as np
 from loguru import logger
 from sqlalchemy.exc import IntegrityError
 
 from app.database.repositories.custom_factor_repository import CustomFactorRepository
 from app.database.models.indicator import FactorStatus
-from app.modules.indicator.exceptions import ValidationError, AuthorizationError, ConflictError
+from app.modules.data_management.services.dataset_panel import DatasetPanel
+from app.modules.indicator.exceptions import (
+    ValidationError,
+    AuthorizationError,
+    ConflictError,
+    FactorEvaluationError,
+    FormulaCompileError,
+)
+from app.modules.indicator.services.factor_batch import BatchProgressCallback, FactorBatchEvaluator
+from app.modules.indicator.services.factor_compiler import compile_formula, formula_hash
+from app.modules.indicator.services.factor_store import (
+    FactorValueStore,
+    MaterializedFactor,
+    get_factor_store,
+)
 
 
 class CustomFactorService:
@@ -23,16 +38,32 @@ class CustomFactorService:
     - Factor cloning
     - Usage tracking
     - Public factor discovery
+    - Factor evaluation and materialized factor values
+    - Batch evaluation of many factors in one data pass
     """
 
-    def __init__(self, custom_factor_repo: CustomFactorRepository):
+    def __init__(
+        self,
+        custom_factor_repo: CustomFactorRepository,
+        factor_store: Optional[FactorValueStore] = None
+    ):
         """
         Initialize service with repository.
 
         Args:
             custom_factor_repo: CustomFactorRepository instance
+            factor_store: Store of materialized factor values
+                         (default: the process-wide store)
         """
         self.custom_factor_repo = custom_factor_repo
+        self._factor_store = factor_store
+
+    @property
+    def factor_store(self) -> FactorValueStore:
+        """Store of materialized factor values."""
+        if self._factor_store is None:
+            self._factor_store = get_factor_store()
+        return self._factor_store
 
     async def create_factor(
         self,
@@ -181,6 +212,159 @@ class CustomFactorService:
             logger.error(f"Error getting factor detail: {e}")
             raise
 
+    async def evaluate_factor(
+        self,
+        factor_id: str,
+        panel: DatasetPanel,
+        user_id: Optional[str] = None
+    ) -> Optional[np.ndarray]:
+        """
+        Evaluate a factor's formula over a dataset panel.
+
+        The formula is compiled into a vectorized plan (cached by formula
+        text) and evaluated over all dates and instruments at once.
+
+        Args:
+            factor_id: Factor ID
+            panel: Dataset panel with the fields the formula reads
+            user_id: Optional user ID for authorization check.
+                    If provided, only evaluates if user owns the factor or it's public.
+
+        Returns:
+            Factor values (dates x instruments) or None if not found/unauthorized
+
+        Raises:
+            FormulaCompileError: If the formula cannot be compiled
+            FactorEvaluationError: If the panel lacks a field the formula reads
+        """
+        try:
+            factor = await self.custom_factor_repo.get(factor_id)
+            if not factor:
+                return None
+
+            if user_id is not None and factor.user_id != user_id and not factor.is_public:
+                logger.warning(
+                    f"Unauthorized evaluation attempt for factor {factor_id} by user {user_id}"
+                )
+                return None
+
+            plan = compile_formula(factor.formula, factor.formula_language)
+            return plan.evaluate(panel)["factor"]
+        except (FormulaCompileError, FactorEvaluationError):
+            raise
+        except Exception as e:
+            logger.error(f"Error evaluating factor {factor_id}: {e}")
+            raise
+
+    async def evaluate_factors_batch(
+        self,
+        factor_ids: List[str],
+        panel: DatasetPanel,
+        dataset_id: str,
+        dataset_version: str,
+        user_id: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        progress: Optional[BatchProgressCallback] = None
+    ) -> Dict[str, Any]:
+        """
+        Evaluate and materialize many factors in one pass over a dataset panel.
+
+        Shared subexpressions are computed once and factors already stored
+        for this dataset version are not recomputed (see FactorBatchEvaluator).
+        Factors that are missing, unauthorized or fail to compile are
+        reported as failed without stopping the batch.
+
+        Args:
+            factor_ids: Factor IDs (duplicates are ignored)
+            panel: Dataset panel with the fields the formulas read
+            dataset_id: Dataset ID
+            dataset_version: Dataset version the panel was loaded from
+            user_id: Optional user ID for authorization check.
+                    If provided, only evaluates factors the user owns or that are public.
+            max_workers: Worker count (default: CPU count)
+            progress: Async callback receiving (factors done, factors total)
+
+        Returns:
+            Dict with per-factor results under "factors", in request order,
+            and a run "summary"
+        """
+        plans = {}
+        rejected: Dict[str, Dict[str, Any]] = {}
+        for factor_id in dict.fromkeys(factor_ids):
+            factor = await self.custom_factor_repo.get(factor_id)
+            if not factor or (
+                user_id is not None and factor.user_id != user_id and not factor.is_public
+            ):
+                rejected[factor_id] = {"status": "failed", "error": f"Factor {factor_id} not found"}
+                continue
+            try:
+                plans[factor_id] = compile_formula(factor.formula, factor.formula_language)
+            except FormulaCompileError as e:
+                rejected[factor_id] = {"status": "failed", "error": str(e)}
+
+        evaluator = FactorBatchEvaluator(self.factor_store, max_workers=max_workers)
+        result = await evaluator.evaluate(plans, panel, dataset_id, dataset_version, progress)
+
+        evaluated = result["factors"]
+        result["factors"] = {
+            factor_id: evaluated.get(factor_id) or rejected[factor_id]
+            for factor_id in dict.fromkeys(factor_ids)
+        }
+        result["summary"]["factors"] += len(rejected)
+        result["summary"]["failed"] += len(rejected)
+        return result
+
+    async def materialize_factor(
+        self,
+        factor_id: str,
+        panel: DatasetPanel,
+        dataset_id: str,
+        dataset_version: str,
+        user_id: Optional[str] = None
+    ) -> Optional[MaterializedFactor]:
+        """
+        Get stored factor values for a dataset version, computing them if needed.
+
+        Values already stored for this (formula, dataset version) are read
+        from the factor store; after the dataset grows only the new dates
+        are computed.
+
+        Args:
+            factor_id: Factor ID
+            panel: Dataset panel with the fields the formula reads
+            dataset_id: Dataset ID
+            dataset_version: Dataset version the panel was loaded from
+            user_id: Optional user ID for authorization check.
+                    If provided, only materializes if user owns the factor or it's public.
+
+        Returns:
+            MaterializedFactor or None if not found/unauthorized
+
+        Raises:
+            FormulaCompileError: If the formula cannot be compiled
+            FactorEvaluationError: If the panel lacks a field the formula reads
+        """
+        try:
+            factor = await self.custom_factor_repo.get(factor_id)
+            if not factor:
+                return None
+
+            if user_id is not None and factor.user_id != user_id and not factor.is_public:
+                logger.warning(
+                    f"Unauthorized materialization attempt for factor {factor_id} by user {user_id}"
+                )
+                return None
+
+            plan = compile_formula(factor.formula, factor.formula_language)
+            return self.factor_store.materialize(
+                factor_id, plan, dataset_id, dataset_version, panel
+            )
+        except (FormulaCompileError, FactorEvaluationError):
+            raise
+        except Exception as e:
+            logger.error(f"Error materializing factor {factor_id}: {e}")
+            raise
+
     async def update_factor(
         self,
         factor_id: str,
@@ -233,6 +417,9 @@ class CustomFactorService:
             if not updated:
                 return None
 
+            if 'formula' in factor_data or 'formula_language' in factor_data:
+                self._gc_materializations(updated)
+
             logger.info(
                 f"Factor updated successfully",
                 extra={
@@ -487,11 +674,27 @@ class CustomFactorService:
                 return False
 
             # Delete
-            return await self.custom_factor_repo.delete(factor_id, soft=soft)
+            deleted = await self.custom_factor_repo.delete(factor_id, soft=soft)
+            if deleted:
+                self.factor_store.gc(factor_id)
+            return deleted
         except Exception as e:
             logger.error(f"Error deleting factor: {e}")
             return False
 
+    def _gc_materializations(self, factor) -> None:
+        """Drop stored values computed with a formula other than the factor's current one."""
+        try:
+            keep_hash = formula_hash(factor.formula, factor.formula_language)
+        except FormulaCompileError:
+            keep_hash = None
+
+        try:
+            self.factor_store.gc(factor.id, keep_hash=keep_hash)
+        except OSError as e:
+            # Stale values are unreachable under the new hash; cleanup can wait
+            logger.warning(f"Failed to remove stale values of factor {factor.id}: {e}")
+
     def _to_dict(self, factor) -> Dict[str, Any]:
         """
         Convert factor model to dictionary.
@@ -0,0 +1,424 @@
+"""
+Batch Factor Evaluation
+
+Evaluates many factors over one dataset panel in a single pass:
+
+1. Factors already materialized for the dataset version are read from the
+   factor store and not recomputed.
+2. The remaining expressions are merged into one FactorPlan, so
+   subexpressions shared across factors (returns, rolling volatility, ...)
+   are computed once per partition instead of once per factor.
+3. The merged outputs are split into partitions that group factors sharing
+   steps, and each partition's sub-plan is evaluated by a worker that stores
+   its outputs in the factor store.
+
+Worker processes attach to the panel through shared memory rather than
+receiving a pickled copy. Where child processes are not allowed (inside a
+daemonic Celery prefork worker) partitions run on a thread pool instead;
+NumPy releases the GIL in its kernels and threads share the panel directly.
+
+Partitions hold at most ``chunk_size`` factors, which bounds the memory a
+worker needs for outputs that are waiting to be stored.
+
+A factor's compute time is the time of the steps it depends on, with steps
+shared by several factors in a partition split evenly between them.
+"""
+
+import asyncio
+import math
+import multiprocessing
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from loguru import logger
+
+from app.modules.data_management.services.dataset_panel import DatasetPanel
+from app.modules.indicator.exceptions import FactorEvaluationError
+from app.modules.indicator.services.factor_compiler import Expr, FactorPlan
+from app.modules.indicator.services.factor_store import FactorValueStore
+
+
+DEFAULT_CHUNK_SIZE = 16
+
+# Async progress callback: (factors done, factors total)
+BatchProgressCallback = Callable[[int, int], Any]
+
+
+# ===================== Shared memory panels =====================
+
+@dataclass
+class SharedPanelSpec:
+    """Picklable description of a panel held in shared memory."""
+
+    name: str
+    fields: List[str]
+    shape: Tuple[int, int]
+    dates: np.ndarray
+    instruments: np.ndarray
+
+
+class SharedPanel:
+    """
+    Copy of a panel's fields in one shared memory block.
+
+    Use as a context manager; the block is released on exit.
+
+    Example:
+        with SharedPanel(panel, plan.fields) as shared:
+            executor.submit(worker, shared.spec, ...)
+    """
+
+    def __init__(self, panel: DatasetPanel, fields: Sequence[str]):
+        """
+        Copy the given fields of a panel into shared memory.
+
+        Args:
+            panel: Source panel
+            fields: Field names to share
+        """
+        self.fields = [name.lower() for name in fields]
+        size = max(len(self.fields) * panel.shape[0] * panel.shape[1] * 8, 1)
+        self._memory = shared_memory.SharedMemory(create=True, size=size)
+        block = np.ndarray((len(self.fields), *panel.shape), dtype=np.float64, buffer=self._memory.buf)
+        for i, name in enumerate(self.fields):
+            block[i] = panel.field(name)
+        del block
+
+        self.spec = SharedPanelSpec(
+            name=self._memory.name,
+            fields=self.fields,
+            shape=panel.shape,
+            dates=panel.dates,
+            instruments=panel.instruments,
+        )
+
+    def close(self) -> None:
+        """Release the shared memory block."""
+        self._memory.close()
+        self._memory.unlink()
+
+    def __enter__(self) -> "SharedPanel":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def attach_panel(spec: SharedPanelSpec) -> Tuple[shared_memory.SharedMemory, DatasetPanel]:
+    """
+    Attach to a shared panel without copying it.
+
+    Args:
+        spec: SharedPanel.spec
+
+    Returns:
+        (shared memory handle to close when done, panel viewing the block)
+    """
+    memory = shared_memory.SharedMemory(name=spec.name)
+    block = np.ndarray((len(spec.fields), *spec.shape), dtype=np.float64, buffer=memory.buf)
+    block.flags.writeable = False
+    panel = DatasetPanel(
+        dates=spec.dates,
+        instruments=spec.instruments,
+        fields={name: block[i] for i, name in enumerate(spec.fields)},
+    )
+    return memory, panel
+
+
+# ===================== Planning =====================
+
+def partition_outputs(plan: FactorPlan, n_partitions: int, max_size: int = DEFAULT_CHUNK_SIZE) -> List[List[str]]:
+    """
+    Split a plan's outputs into partitions that share as many steps as possible.
+
+    Outputs are placed greedily, most expensive first, into the partition
+    where they add the fewest steps not already computed there (ties go to
+    the least loaded partition), so factors with common subexpressions stay
+    together. Partitions are capped at an even share of the outputs so all
+    workers get work.
+
+    Args:
+        plan: Merged plan
+        n_partitions: Minimum number of partitions (e.g. worker count)
+        max_size: Maximum outputs per partition
+
+    Returns:
+        Non-empty partitions of output names
+    """
+    costly = {i for i, step in enumerate(plan.steps) if step.op not in ("const", "field")}
+    dependencies = {name: set(plan.dependencies(name)) & costly for name in plan.outputs}
+    count = max(n_partitions, math.ceil(len(dependencies) / max_size), 1)
+    capacity = min(max_size, math.ceil(len(dependencies) / count))
+
+    partitions: List[List[str]] = [[] for _ in range(count)]
+    steps: List[set] = [set() for _ in range(count)]
+    for name in sorted(dependencies, key=lambda n: (-len(dependencies[n]), n)):
+        open_partitions = [i for i in range(count) if len(partitions[i]) < capacity]
+        best = min(
+            open_partitions,
+            key=lambda i: (len(dependencies[name] - steps[i]), len(steps[i]), i)
+        )
+        partitions[best].append(name)
+        steps[best] |= dependencies[name]
+    return [partition for partition in partitions if partition]
+
+
+def attribute_timings(plan: FactorPlan, timings: Sequence[float]) -> Dict[str, float]:
+    """
+    Split per-step times between the outputs that use each step.
+
+    Args:
+        plan: Evaluated plan
+        timings: Seconds per step (from FactorPlan.evaluate)
+
+    Returns:
+        Output name -> attributed seconds
+    """
+    dependencies = {name: plan.dependencies(name) for name in plan.outputs}
+    users = Counter(step for steps in dependencies.values() for step in steps)
+    return {
+        name: sum(timings[step] / users[step] for step in steps)
+        for name, steps in dependencies.items()
+    }
+
+
+def summarize_values(values: np.ndarray) -> Dict[str, Optional[float]]:
+    """Coverage, mean and standard deviation of a factor matrix."""
+    finite = np.isfinite(values)
+    n = int(finite.sum())
+    if n == 0:
+        return {"coverage": 0.0, "mean": None, "std": None}
+    observed = values[finite]
+    return {
+        "coverage": n / values.size,
+        "mean": float(observed.mean()),
+        "std": float(observed.std(ddof=1)) if n > 1 else None,
+    }
+
+
+# ===================== Workers =====================
+
+def _evaluate_partition(
+    panel: DatasetPanel,
+    expressions: Dict[str, Expr],
+    hashes: Dict[str, str],
+    store: FactorValueStore,
+    dataset_id: str,
+    dataset_version: str
+) -> Dict[str, Dict[str, Any]]:
+    """Evaluate one partition and store its outputs; returns per-factor results."""
+    plan = FactorPlan(expressions)
+    timings: List[float] = []
+    try:
+        outputs = plan.evaluate(panel, timings)
+    except FactorEvaluationError as e:
+        if len(expressions) == 1:
+            name = next(iter(expressions))
+            return {name: {"status": "failed", "formula_hash": hashes[name], "error": str(e)}}
+        # Evaluate factors one by one so only the failing ones are reported
+        results: Dict[str, Dict[str, Any]] = {}
+        for name, expr in expressions.items():
+            results.update(_evaluate_partition(
+                panel, {name: expr}, hashes, store, dataset_id, dataset_version
+            ))
+        return results
+
+    compute_seconds = attribute_timings(plan, timings)
+    results = {}
+    for name in list(outputs):
+        values = outputs.pop(name)
+        start = time.perf_counter()
+        store.put(name, hashes[name], dataset_id, dataset_version, panel, values)
+        results[name] = {
+            "status": "computed",
+            "formula_hash": hashes[name],
+            "compute_seconds": compute_seconds[name],
+            "store_seconds": time.perf_counter() - start,
+            **summarize_values(values),
+        }
+    return results
+
+
+def _evaluate_shared_partition(
+    spec: SharedPanelSpec,
+    expressions: Dict[str, Expr],
+    hashes: Dict[str, str],
+    store_root: str,
+    dataset_id: str,
+    dataset_version: str
+) -> Dict[str, Dict[str, Any]]:
+    """Process pool entry point: attach to the shared panel and evaluate."""
+    memory, panel = attach_panel(spec)
+    try:
+        return _evaluate_partition(
+            panel, expressions, hashes, FactorValueStore(store_root), dataset_id, dataset_version
+        )
+    finally:
+        del panel
+        memory.close()
+
+
+# ===================== Evaluator =====================
+
+class FactorBatchEvaluator:
+    """
+    Evaluates and materializes many factors over one panel.
+
+    Example:
+        evaluator = FactorBatchEvaluator(get_factor_store(), max_workers=8)
+        result = await evaluator.evaluate(plans, panel, dataset.id, dataset.version)
+        result["factors"][factor_id]["compute_seconds"]
+    """
+
+    def __init__(
+        self,
+        store: FactorValueStore,
+        max_workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+    ):
+        """
+        Initialize the evaluator.
+
+        Args:
+            store: Factor value store outputs are written to
+            max_workers: Worker count (default: CPU count)
+            chunk_size: Maximum factors per partition
+        """
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+        self.store = store
+        self.max_workers = max_workers or multiprocessing.cpu_count()
+        self.chunk_size = chunk_size
+
+    async def evaluate(
+        self,
+        plans: Mapping[str, FactorPlan],
+        panel: DatasetPanel,
+        dataset_id: str,
+        dataset_version: str,
+        progress: Optional[BatchProgressCallback] = None
+    ) -> Dict[str, Any]:
+        """
+        Evaluate factors and store their values for the dataset version.
+
+        Args:
+            plans: Factor ID -> compiled plan (output 'factor')
+            panel: Full dataset panel
+            dataset_id: Dataset ID
+            dataset_version: Version of the dataset the panel was loaded from
+            progress: Async callback receiving (factors done, factors total)
+
+        Returns:
+            Dict with per-factor results under "factors" (status
+            computed/cached/failed, formula_hash, timings, coverage, mean,
+            std or error) and a "summary" of the run
+        """
+        start = time.perf_counter()
+        total = len(plans)
+        results: Dict[str, Dict[str, Any]] = {}
+        pending: Dict[str, FactorPlan] = {}
+
+        for factor_id, plan in plans.items():
+            missing = [name for name in plan.fields if name.lower() not in panel.fields]
+            if missing:
+                results[factor_id] = {
+                    "status": "failed",
+                    "formula_hash": plan.formula_hash,
+                    "error": f"Fields not in dataset: {', '.join(missing)}",
+                }
+            elif self.store.get(factor_id, plan.formula_hash, dataset_id, dataset_version) is not None:
+                results[factor_id] = {
+                    "status": "cached", "formula_hash": plan.formula_hash, "compute_seconds": 0.0
+                }
+            else:
+                pending[factor_id] = plan
+
+        merged_steps = 0
+        partitions: List[List[str]] = []
+        workers = 0
+        if pending:
+            merged = FactorPlan({fid: plan.expressions["factor"] for fid, plan in pending.items()})
+            merged_steps = len(merged.steps)
+            partitions = partition_outputs(merged, min(self.max_workers, len(pending)), self.chunk_size)
+            workers = min(self.max_workers, len(partitions))
+            if progress:
+                await progress(len(results), total)
+            hashes = {fid: plan.formula_hash for fid, plan in pending.items()}
+
+            async for partition_results in self._run(partitions, pending, hashes, panel, merged.fields,
+                                                     dataset_id, dataset_version, workers):
+                results.update(partition_results)
+                if progress:
+                    await progress(len(results), total)
+
+        summary = {
+            "factors": total,
+            "computed": sum(r["status"] == "computed" for r in results.values()),
+            "cached": sum(r["status"] == "cached" for r in results.values()),
+            "failed": sum(r["status"] == "failed" for r in results.values()),
+            "merged_steps": merged_steps,
+            "independent_steps": sum(len(plan.steps) for plan in pending.values()),
+            "partitions": len(partitions),
+            "workers": workers,
+            "elapsed_seconds": time.perf_counter() - start,
+        }
+        logger.info(
+            f"Batch evaluated {total} factors on dataset {dataset_id}: "
+            f"{summary['computed']} computed, {summary['cached']} cached, {summary['failed']} failed "
+            f"({merged_steps} merged steps vs {summary['independent_steps']} independent) "
+            f"in {summary['elapsed_seconds']:.2f}s"
+        )
+        return {"factors": {fid: results[fid] for fid in plans}, "summary": summary}
+
+    async def _run(
+        self,
+        partitions: List[List[str]],
+        plans: Mapping[str, FactorPlan],
+        hashes: Dict[str, str],
+        panel: DatasetPanel,
+        fields: Sequence[str],
+        dataset_id: str,
+        dataset_version: str,
+        workers: int
+    ):
+        """Evaluate partitions, yielding each partition's results as it finishes."""
+        expressions = [
+            {fid: plans[fid].expressions["factor"] for fid in partition} for partition in partitions
+        ]
+        if workers <= 1:
+            for partition in expressions:
+                yield _evaluate_partition(
+                    panel, partition, hashes, self.store, dataset_id, dataset_version
+                )
+            return
+
+        loop = asyncio.get_running_loop()
+        if multiprocessing.current_process().daemon:
+            # Daemonic processes (Celery prefork children) cannot start a process pool
+            with ThreadPoolExecutor(workers) as executor:
+                futures = [
+                    loop.run_in_executor(
+                        executor, _evaluate_partition,
+                        panel, partition, hashes, self.store, dataset_id, dataset_version
+                    )
+                    for partition in expressions
+                ]
+                for future in asyncio.as_completed(futures):
+                    yield await future
+            return
+
+        with SharedPanel(panel, fields) as shared, ProcessPoolExecutor(workers) as executor:
+            futures = [
+                loop.run_in_executor(
+                    executor, _evaluate_shared_partition,
+                    shared.spec, partition, hashes, str(self.store.root), dataset_id, dataset_version
+                )
+                for partition in expressions
+            ]
+            for future in asyncio.as_completed(futures):
+                yield await future
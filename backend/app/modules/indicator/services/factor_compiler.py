@@ -0,0 +1,627 @@
+"""
+Factor Expression Compiler
+
+Compiles CustomFactor formulas into vectorized evaluation plans.
+
+Formulas use Qlib-style alpha expressions, e.g.
+``(close - Ref(close, 20)) / Ref(close, 20)`` or ``Rank(Corr($close, $volume, 10))``.
+Python-language formulas use the same operators with Python syntax
+(``a if cond else b`` is accepted as If).
+
+Pipeline:
+1. Parse with Python's ``ast`` (no code is executed) into a typed
+   expression tree of Constant / Field / Call nodes.
+2. Fold constant subexpressions and trivial identities (x * 1, x + 0, ...),
+   and order commutative operands canonically.
+3. Lower the tree to a plan of unique steps, so repeated subexpressions
+   (common-subexpression elimination) are evaluated once.
+4. Evaluate the steps with NumPy over a DatasetPanel, releasing each
+   intermediate after its last use.
+
+Plans are cached by formula text; plan.formula_hash identifies the
+canonical expression, so formatting-only edits keep the same hash.
+"""
+
+import ast
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from app.database.models.indicator import FormulaLanguage
+from app.modules.data_management.services.dataset_panel import DatasetPanel
+from app.modules.indicator.exceptions import FactorEvaluationError, FormulaCompileError
+from app.modules.indicator.services import factor_ops
+
+
+# ===================== Expression tree =====================
+
+@dataclass(frozen=True)
+class Expr:
+    """Node of the typed expression tree."""
+
+    @property
+    def type(self) -> str:
+        """'scalar' for constants, 'series' for panel-valued nodes."""
+        return "series"
+
+
+@dataclass(frozen=True)
+class Constant(Expr):
+    value: float
+
+    @property
+    def type(self) -> str:
+        return "scalar"
+
+    def __str__(self) -> str:
+        return repr(float(self.value))
+
+
+@dataclass(frozen=True)
+class Field(Expr):
+    name: str
+
+    def __str__(self) -> str:
+        return f"${self.name}"
+
+
+@dataclass(frozen=True)
+class Call(Expr):
+    op: str
+    args: Tuple[Expr, ...]
+    window: Optional[int] = None
+
+    def __post_init__(self):
+        # Children are built first, so the canonical text is assembled bottom-up
+        parts = [str(arg) for arg in self.args]
+        if self.window is not None:
+            parts.append(str(self.window))
+        object.__setattr__(self, "_text", f"{self.op}({', '.join(parts)})")
+
+    def __str__(self) -> str:
+        return self._text
+
+
+# ===================== Operator tables =====================
+
+ELEMENTWISE: Dict[str, Callable] = {
+    "Add": factor_ops.add,
+    "Sub": factor_ops.sub,
+    "Mul": factor_ops.mul,
+    "Div": factor_ops.div,
+    "Power": factor_ops.power,
+    "Neg": factor_ops.neg,
+    "Abs": factor_ops.absolute,
+    "Sign": factor_ops.sign,
+    "Log": factor_ops.log,
+    "Greater": factor_ops.greater,
+    "Less": factor_ops.less,
+    "Gt": factor_ops.gt,
+    "Ge": factor_ops.ge,
+    "Lt": factor_ops.lt,
+    "Le": factor_ops.le,
+    "Eq": factor_ops.eq,
+    "Ne": factor_ops.ne,
+    "And": factor_ops.logical_and,
+    "Or": factor_ops.logical_or,
+    "Not": factor_ops.logical_not,
+    "If": factor_ops.if_else,
+}
+
+WINDOWED: Dict[str, Callable] = {
+    "Ref": factor_ops.ref,
+    "Mean": factor_ops.rolling_mean,
+    "Sum": factor_ops.rolling_sum,
+    "Std": factor_ops.rolling_std,
+    "Max": factor_ops.rolling_max,
+    "Min": factor_ops.rolling_min,
+    "TsRank": factor_ops.ts_rank,
+    "Corr": factor_ops.rolling_corr,
+}
+
+CROSS_SECTIONAL: Dict[str, Callable] = {
+    "CSRank": factor_ops.cs_rank,
+}
+
+# Longest window (or Ref offset) a formula may use: ten years of trading
+# days. Windowed operators pad their first rows with a window of NaN.
+MAX_WINDOW = 2520
+
+COMMUTATIVE = {"Add", "Mul", "Greater", "Less", "Eq", "Ne", "And", "Or"}
+
+# Formula functions: name -> (number of expression arguments, window argument)
+# where the window argument is "required", "optional" or None.
+FUNCTIONS: Dict[str, Tuple[int, Optional[str]]] = {
+    "Ref": (1, "required"),
+    "Mean": (1, "required"),
+    "Sum": (1, "required"),
+    "Std": (1, "required"),
+    "Max": (1, "required"),
+    "Min": (1, "required"),
+    "Delta": (1, "required"),
+    "Corr": (2, "required"),
+    "Rank": (1, "optional"),
+    "Abs": (1, None),
+    "Sign": (1, None),
+    "Log": (1, None),
+    "Greater": (2, None),
+    "Less": (2, None),
+    "Power": (2, None),
+    "If": (3, None),
+}
+_FUNCTION_LOOKUP = {name.lower(): name for name in FUNCTIONS}
+
+_BINARY_OPERATORS = {
+    ast.Add: "Add",
+    ast.Sub: "Sub",
+    ast.Mult: "Mul",
+    ast.Div: "Div",
+    ast.Pow: "Power",
+    ast.BitAnd: "And",
+    ast.BitOr: "Or",
+}
+
+_COMPARISONS = {
+    ast.Gt: "Gt",
+    ast.GtE: "Ge",
+    ast.Lt: "Lt",
+    ast.LtE: "Le",
+    ast.Eq: "Eq",
+    ast.NotEq: "Ne",
+}
+
+SUPPORTED_LANGUAGES = {FormulaLanguage.QLIB_ALPHA.value, FormulaLanguage.PYTHON.value}
+
+
+# ===================== Parsing and simplification =====================
+
+def parse_formula(formula: str, language: str = FormulaLanguage.QLIB_ALPHA.value) -> Expr:
+    """
+    Parse a formula into a simplified, type-checked expression tree.
+
+    Args:
+        formula: Formula text
+        language: Formula language (qlib_alpha or python)
+
+    Returns:
+        Root expression node
+
+    Raises:
+        FormulaCompileError: If the formula is invalid or unsupported
+    """
+    if language not in SUPPORTED_LANGUAGES:
+        raise FormulaCompileError(
+            f"Formula language '{language}' cannot be compiled. "
+            f"Supported: {sorted(SUPPORTED_LANGUAGES)}"
+        )
+    if not formula or not formula.strip():
+        raise FormulaCompileError("Formula is empty")
+
+    # Qlib marks fields with '$'; fields are plain names in the tree
+    source = re.sub(r"\$(\w+)", r"\1", formula.strip())
+
+    try:
+        tree = ast.parse(source, mode="eval")
+        return _build(tree.body)
+    except SyntaxError as e:
+        raise FormulaCompileError(f"Invalid formula syntax: {e.msg}") from e
+    except RecursionError as e:
+        raise FormulaCompileError("Formula is too deeply nested") from e
+
+
+def _build(node: ast.AST) -> Expr:
+    if isinstance(node, ast.Constant):
+        if isinstance(node.value, (bool, int, float)):
+            return Constant(float(node.value))
+        raise FormulaCompileError(f"Unsupported literal: {node.value!r}")
+
+    if isinstance(node, ast.Name):
+        return Field(node.id.lower())
+
+    if isinstance(node, ast.BinOp):
+        # Walk left-deep chains (a + b + c + ...) iteratively
+        chain = []
+        while isinstance(node, ast.BinOp):
+            op = _BINARY_OPERATORS.get(type(node.op))
+            if op is None:
+                raise FormulaCompileError(f"Unsupported operator: {type(node.op).__name__}")
+            chain.append((op, node.right))
+            node = node.left
+        result = _build(node)
+        for op, right in reversed(chain):
+            result = make_call(op, (result, _build(right)))
+        return result
+
+    if isinstance(node, ast.UnaryOp):
+        operand = _build(node.operand)
+        if isinstance(node.op, ast.UAdd):
+            return operand
+        if isinstance(node.op, ast.USub):
+            return make_call("Neg", (operand,))
+        return make_call("Not", (operand,))
+
+    if isinstance(node, ast.BoolOp):
+        op = "And" if isinstance(node.op, ast.And) else "Or"
+        result = _build(node.values[0])
+        for value in node.values[1:]:
+            result = make_call(op, (result, _build(value)))
+        return result
+
+    if isinstance(node, ast.Compare):
+        operands = [_build(node.left)] + [_build(c) for c in node.comparators]
+        result = None
+        for i, cmp_op in enumerate(node.ops):
+            op = _COMPARISONS.get(type(cmp_op))
+            if op is None:
+                raise FormulaCompileError(f"Unsupported comparison: {type(cmp_op).__name__}")
+            comparison = make_call(op, (operands[i], operands[i + 1]))
+            result = comparison if result is None else make_call("And", (result, comparison))
+        return result
+
+    if isinstance(node, ast.IfExp):
+        return make_call("If", (_build(node.test), _build(node.body), _build(node.orelse)))
+
+    if isinstance(node, ast.Call):
+        return _build_function(node)
+
+    raise FormulaCompileError(f"Unsupported syntax: {type(node).__name__}")
+
+
+def _build_function(node: ast.Call) -> Expr:
+    if not isinstance(node.func, ast.Name):
+        raise FormulaCompileError("Only operator calls such as Mean(x, 5) are supported")
+    name = _FUNCTION_LOOKUP.get(node.func.id.lower())
+    if name is None:
+        raise FormulaCompileError(
+            f"Unknown function: {node.func.id}. Supported: {sorted(FUNCTIONS)}"
+        )
+    if node.keywords:
+        raise FormulaCompileError(f"{name} does not accept keyword arguments")
+
+    n_args, window_arg = FUNCTIONS[name]
+    args = [_build(arg) for arg in node.args]
+    expected = [n_args] if window_arg is None else (
+        [n_args + 1] if window_arg == "required" else [n_args, n_args + 1]
+    )
+    if len(args) not in expected:
+        raise FormulaCompileError(
+            f"{name} expects {' or '.join(map(str, expected))} arguments, got {len(args)}"
+        )
+
+    window = _window_value(name, args[n_args]) if len(args) > n_args else None
+    args = tuple(args[:n_args])
+
+    if window_arg is not None:
+        for arg in args:
+            if arg.type != "series":
+                raise FormulaCompileError(f"{name} expects a series, got constant {arg}")
+
+    if name == "Rank":
+        return make_call("CSRank", args) if window is None else make_call("TsRank", args, window)
+    if name == "Delta":
+        return make_call("Sub", (args[0], make_call("Ref", args, window)))
+    return make_call(name, args, window)
+
+
+def _window_value(name: str, arg: Expr) -> int:
+    if not isinstance(arg, Constant) or not float(arg.value).is_integer():
+        raise FormulaCompileError(f"{name} window must be an integer constant, got {arg}")
+    window = int(arg.value)
+    if name != "Ref" and window < 1:
+        raise FormulaCompileError(f"{name} window must be positive, got {window}")
+    if abs(window) > MAX_WINDOW:
+        raise FormulaCompileError(f"{name} window must be at most {MAX_WINDOW}, got {window}")
+    return window
+
+
+def make_call(op: str, args: Tuple[Expr, ...], window: Optional[int] = None) -> Expr:
+    """
+    Create a Call node with constant folding and identity simplification.
+
+    Args:
+        op: Operator name (see ELEMENTWISE, WINDOWED, CROSS_SECTIONAL)
+        args: Operand expressions
+        window: Window length for windowed operators
+
+    Returns:
+        Simplified expression
+    """
+    if op in ELEMENTWISE and all(isinstance(arg, Constant) for arg in args):
+        value = ELEMENTWISE[op](*[arg.value for arg in args])
+        return Constant(float(value))
+
+    simplified = _simplify(op, args, window)
+    if simplified is not None:
+        return simplified
+
+    if op in COMMUTATIVE:
+        args = tuple(sorted(args, key=str))
+    return Call(op, args, window)
+
+
+def _is_constant(expr: Expr, value: float) -> bool:
+    return isinstance(expr, Constant) and expr.value == value
+
+
+def _simplify(op: str, args: Tuple[Expr, ...], window: Optional[int]) -> Optional[Expr]:
+    if op == "Ref" and window == 0:
+        return args[0]
+    if op == "Neg" and isinstance(args[0], Call) and args[0].op == "Neg":
+        return args[0].args[0]
+    if op == "If" and isinstance(args[0], Constant) and not np.isnan(args[0].value):
+        return args[1] if args[0].value != 0 else args[2]
+    if len(args) != 2:
+        return None
+
+    left, right = args
+    if op == "Add":
+        if _is_constant(left, 0):
+            return right
+        if _is_constant(right, 0):
+            return left
+    elif op == "Mul":
+        if _is_constant(left, 1):
+            return right
+        if _is_constant(right, 1):
+            return left
+    elif op in ("Sub", "Div", "Power"):
+        if _is_constant(right, 0 if op == "Sub" else 1):
+            return left
+    return None
+
+
+# ===================== Plans =====================
+
+@dataclass(frozen=True)
+class Step:
+    """One unique operation of a plan; args are indices of earlier steps."""
+
+    op: str
+    args: Tuple[int, ...] = ()
+    window: Optional[int] = None
+    value: Any = None
+
+
+class FactorPlan:
+    """
+    Deduplicated evaluation plan for one or more factor expressions.
+
+    Attributes:
+        expressions: Output name -> expression tree
+        steps: Unique operations in evaluation order
+        outputs: Output name -> step index
+        fields: Dataset fields read by the plan
+        formula_hash: Hash of the canonical expressions
+        lookback: Earlier dates an output value depends on
+        lookahead: Later dates an output value depends on (negative Ref)
+        cross_sectional: Whether outputs depend on the instrument universe
+    """
+
+    def __init__(self, expressions: Mapping[str, Expr]):
+        self.expressions = dict(expressions)
+        self.steps: List[Step] = []
+        self._index: Dict[Step, int] = {}
+        self.outputs = {name: self._lower(expr) for name, expr in self.expressions.items()}
+        del self._index
+
+        self.fields = sorted({step.value for step in self.steps if step.op == "field"})
+        canonical = ";".join(f"{name}={expr}" for name, expr in sorted(self.expressions.items()))
+        self.formula_hash = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+        self._last_use = self._compute_last_use()
+        self.lookback, self.lookahead = self._compute_horizon()
+        self.cross_sectional = any(step.op in CROSS_SECTIONAL for step in self.steps)
+
+    def _lower(self, root: Expr) -> int:
+        """Append the steps of an expression (post-order, iterative); return its index."""
+        lowered: Dict[int, int] = {}
+        stack = [(root, False)]
+        while stack:
+            expr, children_done = stack.pop()
+            if id(expr) in lowered:
+                continue
+            if isinstance(expr, Call) and not children_done:
+                stack.append((expr, True))
+                stack.extend((arg, False) for arg in reversed(expr.args))
+                continue
+
+            if isinstance(expr, Constant):
+                step = Step("const", value=expr.value)
+            elif isinstance(expr, Field):
+                step = Step("field", value=expr.name)
+            else:
+                step = Step(expr.op, tuple(lowered[id(arg)] for arg in expr.args), expr.window)
+
+            index = self._index.get(step)
+            if index is None:
+                index = len(self.steps)
+                self.steps.append(step)
+                self._index[step] = index
+            lowered[id(expr)] = index
+        return lowered[id(root)]
+
+    def _compute_last_use(self) -> List[int]:
+        last_use = list(range(len(self.steps)))
+        for i, step in enumerate(self.steps):
+            for arg in step.args:
+                last_use[arg] = i
+        for index in self.outputs.values():
+            last_use[index] = len(self.steps)
+        return last_use
+
+    def _compute_horizon(self) -> Tuple[int, int]:
+        back = [0] * len(self.steps)
+        ahead = [0] * len(self.steps)
+        for i, step in enumerate(self.steps):
+            back[i] = max((back[arg] for arg in step.args), default=0)
+            ahead[i] = max((ahead[arg] for arg in step.args), default=0)
+            if step.op == "Ref":
+                back[i] += max(step.window, 0)
+                ahead[i] += max(-step.window, 0)
+            elif step.op in WINDOWED:
+                back[i] += step.window - 1
+        outputs = self.outputs.values()
+        return max((back[i] for i in outputs), default=0), max((ahead[i] for i in outputs), default=0)
+
+    def evaluate(
+        self,
+        panel: DatasetPanel,
+        timings: Optional[List[float]] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Evaluate every output over a dataset panel.
+
+        Args:
+            panel: Dataset panel with the fields in ``self.fields``
+            timings: If given, filled with the seconds spent on each step
+
+        Returns:
+            Output name -> float array (dates x instruments)
+
+        Raises:
+            FactorEvaluationError: If a field is missing or an operator fails
+        """
+        values: List[Any] = [None] * len(self.steps)
+        if timings is not None:
+            timings[:] = [0.0] * len(self.steps)
+
+        for i, step in enumerate(self.steps):
+            start = time.perf_counter()
+            try:
+                values[i] = self._run(step, values, panel)
+            except KeyError as e:
+                raise FactorEvaluationError(str(e.args[0])) from e
+            except Exception as e:
+                raise FactorEvaluationError(f"Failed to evaluate {step.op}: {e}") from e
+            if timings is not None:
+                timings[i] = time.perf_counter() - start
+
+            # Free intermediates that later steps no longer need
+            for arg in step.args:
+                if self._last_use[arg] == i:
+                    values[arg] = None
+
+        # Constants are broadcast; bare fields are copied so callers never
+        # write into the panel
+        return {
+            name: values[index] if self.steps[index].op not in ("const", "field")
+            else np.broadcast_to(np.asarray(values[index], dtype=float), panel.shape).copy()
+            for name, index in self.outputs.items()
+        }
+
+    @staticmethod
+    def _run(step: Step, values: List[Any], panel: DatasetPanel) -> Any:
+        if step.op == "const":
+            return step.value
+        if step.op == "field":
+            return panel.field(step.value)
+
+        args = [values[arg] for arg in step.args]
+        if step.op in WINDOWED:
+            return WINDOWED[step.op](*args, step.window)
+        if step.op in CROSS_SECTIONAL:
+            return CROSS_SECTIONAL[step.op](*args)
+        return ELEMENTWISE[step.op](*args)
+
+    def dependencies(self, name: str) -> List[int]:
+        """
+        Steps an output depends on, in evaluation order.
+
+        Args:
+            name: Output name
+
+        Returns:
+            Step indices including the output's own step
+        """
+        needed = {self.outputs[name]}
+        stack = [self.outputs[name]]
+        while stack:
+            for arg in self.steps[stack.pop()].args:
+                if arg not in needed:
+                    needed.add(arg)
+                    stack.append(arg)
+        return sorted(needed)
+
+    def __repr__(self) -> str:
+        return f"<FactorPlan(outputs={list(self.outputs)}, steps={len(self.steps)})>"
+
+
+# ===================== Compilation entry points =====================
+
+_PLAN_CACHE_SIZE = 1024
+_plan_cache: "OrderedDict[Tuple[str, str], FactorPlan]" = OrderedDict()
+_plan_cache_lock = threading.Lock()
+
+
+def compile_formula(
+    formula: str,
+    language: str = FormulaLanguage.QLIB_ALPHA.value
+) -> FactorPlan:
+    """
+    Compile a single formula; the plan's output is named 'factor'.
+
+    Compiled plans are cached by (language, formula text).
+
+    Args:
+        formula: Formula text
+        language: Formula language (qlib_alpha or python)
+
+    Returns:
+        FactorPlan
+
+    Raises:
+        FormulaCompileError: If the formula is invalid or unsupported
+    """
+    key = (language, formula)
+    with _plan_cache_lock:
+        plan = _plan_cache.get(key)
+        if plan is not None:
+            _plan_cache.move_to_end(key)
+            return plan
+
+    plan = FactorPlan({"factor": parse_formula(formula, language)})
+
+    with _plan_cache_lock:
+        _plan_cache[key] = plan
+        while len(_plan_cache) > _PLAN_CACHE_SIZE:
+            _plan_cache.popitem(last=False)
+    return plan
+
+
+def compile_formulas(
+    formulas: Mapping[str, str],
+    language: str = FormulaLanguage.QLIB_ALPHA.value
+) -> FactorPlan:
+    """
+    Compile several formulas into one plan sharing common subexpressions.
+
+    Args:
+        formulas: Output name -> formula text
+        language: Formula language of all formulas
+
+    Returns:
+        FactorPlan with one output per formula
+
+    Raises:
+        FormulaCompileError: If any formula is invalid
+    """
+    return FactorPlan({
+        name: compile_formula(formula, language).expressions["factor"]
+        for name, formula in formulas.items()
+    })
+
+
+def formula_hash(formula: str, language: str = FormulaLanguage.QLIB_ALPHA.value) -> str:
+    """Hash of the canonical form of a formula."""
+    return compile_formula(formula, language).formula_hash
+
+
+def clear_plan_cache() -> None:
+    """Drop all cached plans."""
+    with _plan_cache_lock:
+        _plan_cache.clear()
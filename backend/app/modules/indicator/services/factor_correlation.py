@@ -0,0 +1,197 @@
+"""
+Factor Correlation Analysis
+
+Pairwise cross-sectional rank correlation between factors, averaged over
+time, and detection of redundant (highly correlated) factors.
+
+For each sampled date every factor is ranked across instruments and the
+ranks are standardized over that factor's observed instruments. The
+correlation of two factors on a date is then the mean product of their
+standardized ranks over the instruments both observe, which equals the
+Spearman correlation when both factors cover the same instruments. Dates
+where a pair shares fewer than ``min_instruments`` instruments are left out
+of that pair's average.
+
+Dates are processed in blocks, so memory is bounded by ``block_bytes``
+regardless of the number of dates; each block is one batched matrix product
+over (factors x instruments) per date.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.modules.indicator.services.factor_validation import rank_rows
+
+
+DEFAULT_MAX_DATES = 250
+DEFAULT_BLOCK_BYTES = 256 * 2 ** 20
+
+# Progress callback: fraction of dates processed (0-1)
+CorrelationProgressCallback = Callable[[float], Any]
+
+
+def sample_rows(n_dates: int, max_dates: Optional[int] = DEFAULT_MAX_DATES) -> np.ndarray:
+    """
+    Evenly spaced date indices, at most ``max_dates`` of them.
+
+    Args:
+        n_dates: Number of dates
+        max_dates: Maximum dates to keep (None: all)
+
+    Returns:
+        Sorted row indices
+    """
+    if max_dates is None or n_dates <= max_dates:
+        return np.arange(n_dates)
+    return np.unique(np.linspace(0, n_dates - 1, max_dates).round().astype(int))
+
+
+def standardized_ranks(values: np.ndarray) -> np.ndarray:
+    """
+    Rank each row and standardize the ranks over its observed cells.
+
+    Args:
+        values: Array whose last axis is instruments
+
+    Returns:
+        float32 array of the same shape; missing cells and rows without
+        dispersion are 0
+    """
+    flat = values.reshape(-1, values.shape[-1])
+    ranks = rank_rows(flat)
+    observed = ~np.isnan(ranks)
+    count = observed.sum(axis=1, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        centered = np.where(observed, ranks - np.nansum(ranks, axis=1, keepdims=True) / count, 0.0)
+        std = np.sqrt((centered ** 2).sum(axis=1, keepdims=True) / count)
+        z = np.where(std > 0, centered / std, 0.0)
+    return z.astype(np.float32).reshape(values.shape)
+
+
+def rank_correlation_matrix(
+    factors: Sequence[np.ndarray],
+    rows: Optional[np.ndarray] = None,
+    min_instruments: int = 5,
+    block_bytes: int = DEFAULT_BLOCK_BYTES,
+    progress: Optional[CorrelationProgressCallback] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Time-averaged cross-sectional rank correlation of every factor pair.
+
+    Args:
+        factors: Factor values (dates x instruments), aligned on the same
+            dates and instruments; memory-mapped arrays are read block by block
+        rows: Date indices to use (default: all dates)
+        min_instruments: Minimum shared instruments for a date to count
+        block_bytes: Approximate memory for one block of dates
+        progress: Callback receiving the fraction of dates processed
+
+    Returns:
+        Dict with matrix (n x n mean correlation, NaN if no usable date),
+        periods (n x n number of dates averaged) and coverage (per factor,
+        mean share of instruments with a value on the sampled dates)
+    """
+    n = len(factors)
+    if n == 0:
+        raise ValueError("At least one factor is required")
+    n_dates, n_instruments = factors[0].shape
+    if any(f.shape != (n_dates, n_instruments) for f in factors):
+        raise ValueError("All factors must have the same shape")
+    rows = np.arange(n_dates) if rows is None else np.asarray(rows)
+
+    # Block input plus float32 ranks, mask and temporaries
+    block = max(1, int(block_bytes // (n * n_instruments * 24 + n * n * 16)))
+
+    total = np.zeros((n, n))
+    periods = np.zeros((n, n), dtype=np.int64)
+    observed_cells = np.zeros(n)
+    for start in range(0, len(rows), block):
+        chunk = rows[start:start + block]
+        values = np.stack([np.asarray(f[chunk], dtype=np.float64) for f in factors], axis=1)
+        values[~np.isfinite(values)] = np.nan
+
+        z = standardized_ranks(values)
+        mask = (~np.isnan(values)).astype(np.float32)
+        del values
+        observed_cells += mask.sum(axis=(0, 2))
+
+        shared = np.matmul(mask, mask.transpose(0, 2, 1))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            corr = np.matmul(z, z.transpose(0, 2, 1)) / shared
+        valid = shared >= min_instruments
+        total += np.where(valid, np.clip(corr, -1.0, 1.0), 0.0).sum(axis=0)
+        periods += valid.sum(axis=0)
+
+        if progress:
+            progress(min(start + block, len(rows)) / len(rows))
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        matrix = np.where(periods > 0, total / periods, np.nan)
+    diagonal = np.diag_indices(n)
+    matrix[diagonal] = np.where(periods[diagonal] > 0, 1.0, np.nan)
+
+    return {
+        "matrix": matrix,
+        "periods": periods,
+        "coverage": observed_cells / max(len(rows) * n_instruments, 1),
+    }
+
+
+def correlated_clusters(matrix: np.ndarray, threshold: float) -> List[List[int]]:
+    """
+    Groups of factors linked by absolute correlation at or above a threshold.
+
+    Two factors are in the same cluster if a chain of pairs with
+    ``|corr| >= threshold`` connects them.
+
+    Args:
+        matrix: Correlation matrix (n x n)
+        threshold: Absolute correlation threshold
+
+    Returns:
+        Clusters of two or more factor indices, largest first
+    """
+    n = matrix.shape[0]
+    parent = list(range(n))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    with np.errstate(invalid="ignore"):
+        pairs = np.argwhere(np.triu(np.abs(matrix) >= threshold, k=1))
+    for i, j in pairs:
+        root_i, root_j = find(i), find(j)
+        if root_i != root_j:
+            parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    groups: Dict[int, List[int]] = {}
+    for i in range(n):
+        groups.setdefault(find(i), []).append(i)
+    return sorted(
+        (members for members in groups.values() if len(members) > 1),
+        key=lambda members: (-len(members), members[0])
+    )
+
+
+def select_uncorrelated(matrix: np.ndarray, threshold: float, order: Sequence[int]) -> List[int]:
+    """
+    Greedily pick factors whose pairwise |correlation| stays below a threshold.
+
+    Args:
+        matrix: Correlation matrix (n x n)
+        threshold: Absolute correlation threshold
+        order: Factor indices in order of preference
+
+    Returns:
+        Selected factor indices, in preference order
+    """
+    selected: List[int] = []
+    for i in order:
+        correlations = np.abs(matrix[i, selected])
+        if not np.any(correlations[~np.isnan(correlations)] >= threshold):
+            selected.append(i)
+    return selected
@@ -0,0 +1,374 @@
+"""
+FactorCorrelationService - Correlation and redundancy analysis of a user's factor library
+
+Computes the time-averaged cross-sectional rank correlation matrix of the
+factors in a user's library on a dataset, and flags clusters of highly
+correlated (redundant) factors.
+
+Results are cached on disk per library version: a hash of the library's
+active factors and their formulas, together with the dataset version
+and the analysis options. Adding, removing or editing a factor therefore
+changes the version and the matrix is recomputed; the redundancy threshold
+is applied when a result is read, so changing it does not recompute.
+"""
+
+import hashlib
+import json
+import os
+import uuid
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from loguru import logger
+
+from app.database.models.indicator import LibraryItemStatus
+from app.database.repositories.custom_factor_repository import CustomFactorRepository
+from app.database.repositories.dataset import DatasetRepository
+from app.database.repositories.user_factor_library_repository import UserFactorLibraryRepository
+from app.modules.data_management.services.dataset_panel import load_dataset_panel
+from app.modules.indicator.exceptions import (
+    FormulaCompileError,
+    ResourceNotFoundError,
+    ValidationError,
+)
+from app.modules.indicator.services import factor_correlation
+from app.modules.indicator.services.factor_batch import FactorBatchEvaluator
+from app.modules.indicator.services.factor_compiler import compile_formula
+from app.modules.indicator.services.factor_store import FactorValueStore, get_factor_store
+
+
+DEFAULT_CONFIG: Dict[str, Any] = {
+    "threshold": 0.7,
+    "min_instruments": 5,
+    "max_dates": factor_correlation.DEFAULT_MAX_DATES,
+    "start_date": None,
+    "end_date": None,
+}
+# Options that change the matrix (the threshold only changes clustering)
+MATRIX_OPTIONS = ("min_instruments", "max_dates", "start_date", "end_date")
+MAX_FACTORS = 500
+MAX_LIBRARY_ITEMS = 10000
+
+# Async progress callback: percentage (0-100)
+ProgressCallback = Callable[[float], Any]
+
+
+class FactorCorrelationCache:
+    """JSON files of correlation results keyed by cache key."""
+
+    def __init__(self, root: Union[str, Path]):
+        """
+        Initialize the cache.
+
+        Args:
+            root: Directory holding the results
+        """
+        self.root = Path(root)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Load a cached result, or None if missing."""
+        try:
+            return json.loads((self.root / f"{key}.json").read_text())
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        """Store a result (atomically replaces any previous one)."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        temporary = self.root / f".{key}.{uuid.uuid4().hex}"
+        temporary.write_text(json.dumps(result))
+        os.replace(temporary, self.root / f"{key}.json")
+
+
+@lru_cache()
+def get_correlation_cache() -> FactorCorrelationCache:
+    """Process-wide correlation cache under CACHE_DIR/factor_correlations."""
+    from app.config import settings
+    return FactorCorrelationCache(Path(settings.CACHE_DIR) / "factor_correlations")
+
+
+class FactorCorrelationService:
+    """
+    Service for factor correlation analysis.
+
+    Provides business logic for:
+    - Resolving a user's library and its version
+    - Computing the time-averaged rank correlation matrix (blockwise)
+    - Flagging redundant factor clusters and an uncorrelated selection
+    - Caching results per library version
+    """
+
+    def __init__(
+        self,
+        user_library_repo: UserFactorLibraryRepository,
+        custom_factor_repo: CustomFactorRepository,
+        dataset_repo: DatasetRepository,
+        factor_store: Optional[FactorValueStore] = None,
+        cache: Optional[FactorCorrelationCache] = None
+    ):
+        """
+        Initialize service with repositories.
+
+        Args:
+            user_library_repo: UserFactorLibraryRepository instance
+            custom_factor_repo: CustomFactorRepository instance
+            dataset_repo: DatasetRepository instance
+            factor_store: Store of materialized factor values
+                         (default: the process-wide store)
+            cache: Result cache (default: the process-wide cache)
+        """
+        self.user_library_repo = user_library_repo
+        self.custom_factor_repo = custom_factor_repo
+        self.dataset_repo = dataset_repo
+        self._factor_store = factor_store
+        self._cache = cache
+
+    @property
+    def factor_store(self) -> FactorValueStore:
+        """Store of materialized factor values."""
+        if self._factor_store is None:
+            self._factor_store = get_factor_store()
+        return self._factor_store
+
+    @property
+    def cache(self) -> FactorCorrelationCache:
+        """Correlation result cache."""
+        if self._cache is None:
+            self._cache = get_correlation_cache()
+        return self._cache
+
+    async def get_correlation(
+        self,
+        user_id: str,
+        dataset_id: str,
+        config: Optional[Dict[str, Any]] = None,
+        factor_ids: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get the cached analysis for the current library version.
+
+        Args:
+            user_id: Library owner
+            dataset_id: Dataset ID
+            config: Overrides of DEFAULT_CONFIG
+            factor_ids: Restrict to these library factors (default: whole library)
+
+        Returns:
+            Analysis dict, or None if not computed for the current version
+
+        Raises:
+            ValidationError: If the config or factor selection is invalid
+            ResourceNotFoundError: If the dataset does not exist
+        """
+        resolved = self._resolve_config(config)
+        factors, library_version = await self._resolve_library(user_id, factor_ids)
+        dataset = await self._get_dataset(dataset_id)
+
+        cached = self.cache.get(self._cache_key(library_version, dataset, resolved))
+        if cached is None:
+            return None
+        return self._with_clusters(cached, resolved["threshold"])
+
+    async def compute_correlation(
+        self,
+        user_id: str,
+        dataset_id: str,
+        config: Optional[Dict[str, Any]] = None,
+        factor_ids: Optional[List[str]] = None,
+        progress: Optional[ProgressCallback] = None
+    ) -> Dict[str, Any]:
+        """
+        Compute (or read from cache) the correlation analysis of a library.
+
+        Factors not yet materialized for the dataset version are evaluated
+        in one batch first. Factors that fail to compile or evaluate are
+        listed under "excluded".
+
+        Args:
+            user_id: Library owner
+            dataset_id: Dataset ID
+            config: Overrides of DEFAULT_CONFIG
+            factor_ids: Restrict to these library factors (default: whole library)
+            progress: Async callback receiving a percentage
+
+        Returns:
+            Analysis dict with factors, matrix, clusters, selected and
+            redundant factors
+
+        Raises:
+            ValidationError: If the config or factor selection is invalid
+            ResourceNotFoundError: If the dataset does not exist
+        """
+        resolved = self._resolve_config(config)
+        factors, library_version = await self._resolve_library(user_id, factor_ids)
+        dataset = await self._get_dataset(dataset_id)
+
+        key = self._cache_key(library_version, dataset, resolved)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return self._with_clusters(cached, resolved["threshold"])
+
+        async def report(percentage: float) -> None:
+            if progress:
+                await progress(round(percentage, 1))
+
+        panel = load_dataset_panel(dataset.file_path)
+        await report(10.0)
+
+        # Materialize every factor; shared subexpressions are computed once
+        excluded: Dict[str, str] = {}
+        plans = {}
+        for factor in factors:
+            try:
+                plans[factor.id] = compile_formula(factor.formula, factor.formula_language)
+            except FormulaCompileError as e:
+                excluded[factor.id] = str(e)
+        evaluation = await FactorBatchEvaluator(self.factor_store).evaluate(
+            plans, panel, dataset.id, dataset.version,
+            lambda done, total: report(10.0 + 40.0 * done / max(total, 1))
+        )
+        for factor_id, outcome in evaluation["factors"].items():
+            if outcome["status"] == "failed":
+                excluded[factor_id] = outcome["error"]
+
+        included = [f for f in factors if f.id not in excluded]
+        if len(included) < 2:
+            raise ValidationError("At least two factors must evaluate successfully")
+        values = [
+            self.factor_store.read(
+                f.id, plans[f.id].formula_hash, dataset.id, dataset.version,
+                start_date=resolved["start_date"], end_date=resolved["end_date"]
+            ).values
+            for f in included
+        ]
+        rows = factor_correlation.sample_rows(values[0].shape[0], resolved["max_dates"])
+        await report(50.0)
+
+        result = factor_correlation.rank_correlation_matrix(values, rows, resolved["min_instruments"])
+        await report(95.0)
+
+        cached = {
+            "library_version": library_version,
+            "dataset_id": dataset.id,
+            "dataset_version": dataset.version,
+            "config": {option: resolved[option] for option in MATRIX_OPTIONS},
+            "n_dates": int(len(rows)),
+            "factors": [
+                {"factor_id": f.id, "factor_name": f.factor_name, "coverage": round(float(c), 4)}
+                for f, c in zip(included, result["coverage"])
+            ],
+            "matrix": [
+                [None if np.isnan(v) else v for v in row]
+                for row in np.round(result["matrix"], 4).tolist()
+            ],
+            "excluded": [
+                {"factor_id": factor_id, "error": error} for factor_id, error in excluded.items()
+            ],
+        }
+        self.cache.put(key, cached)
+        logger.info(
+            f"Computed correlation of {len(included)} factors for user {user_id} "
+            f"on dataset {dataset.id} ({len(rows)} dates)"
+        )
+        return self._with_clusters(cached, resolved["threshold"])
+
+    async def _resolve_library(
+        self,
+        user_id: str,
+        factor_ids: Optional[Sequence[str]] = None
+    ) -> Tuple[list, str]:
+        """Active library factors (optionally a subset) and the library version."""
+        items = await self.user_library_repo.get_user_library(
+            user_id=user_id, status=LibraryItemStatus.ACTIVE.value, limit=MAX_LIBRARY_ITEMS
+        )
+        library_ids = list(dict.fromkeys(item.factor_id for item in items))
+        if factor_ids is not None:
+            missing = sorted(set(factor_ids) - set(library_ids))
+            if missing:
+                raise ValidationError(f"Factors not in library: {', '.join(missing)}")
+            library_ids = [fid for fid in library_ids if fid in set(factor_ids)]
+
+        factors = []
+        for factor_id in library_ids:
+            factor = await self.custom_factor_repo.get(factor_id)
+            if factor:
+                factors.append(factor)
+        if len(factors) < 2:
+            raise ValidationError("At least two library factors are required")
+        if len(factors) > MAX_FACTORS:
+            raise ValidationError(f"At most {MAX_FACTORS} factors can be compared at once")
+
+        factors.sort(key=lambda f: f.id)
+        fingerprint = ";".join(
+            f"{f.id}:{hashlib.sha256(f'{f.formula_language}:{f.formula}'.encode('utf-8')).hexdigest()}"
+            for f in factors
+        )
+        return factors, hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+
+    async def _get_dataset(self, dataset_id: str):
+        dataset = await self.dataset_repo.get(dataset_id)
+        if not dataset:
+            raise ResourceNotFoundError(f"Dataset {dataset_id} not found")
+        return dataset
+
+    @staticmethod
+    def _cache_key(library_version: str, dataset, config: Dict[str, Any]) -> str:
+        payload = json.dumps({
+            "library_version": library_version,
+            "dataset_id": dataset.id,
+            "dataset_version": dataset.version,
+            **{option: config[option] for option in MATRIX_OPTIONS},
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _with_clusters(cached: Dict[str, Any], threshold: float) -> Dict[str, Any]:
+        """Add redundancy clusters and an uncorrelated selection for a threshold."""
+        factors = cached["factors"]
+        ids = [f["factor_id"] for f in factors]
+        matrix = np.array(
+            [[np.nan if v is None else v for v in row] for row in cached["matrix"]], dtype=float
+        )
+
+        # Prefer factors with better coverage; keep ties in factor order
+        preference = sorted(range(len(ids)), key=lambda i: (-factors[i]["coverage"], i))
+        rank = {i: position for position, i in enumerate(preference)}
+        selected = factor_correlation.select_uncorrelated(matrix, threshold, preference)
+
+        clusters = []
+        for members in factor_correlation.correlated_clusters(matrix, threshold):
+            members = sorted(members, key=rank.get)
+            block = np.abs(matrix[np.ix_(members, members)])
+            np.fill_diagonal(block, np.nan)
+            clusters.append({
+                "factor_ids": [ids[i] for i in members],
+                "representative": ids[members[0]],
+                "max_correlation": float(np.nanmax(block)),
+            })
+
+        return {
+            **cached,
+            "threshold": threshold,
+            "clusters": clusters,
+            "selected": [ids[i] for i in selected],
+            "redundant": [ids[i] for i in sorted(set(range(len(ids))) - set(selected))],
+        }
+
+    @staticmethod
+    def _resolve_config(config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Merge config with defaults and validate it."""
+        resolved = {**DEFAULT_CONFIG, **(config or {})}
+        unknown = set(resolved) - set(DEFAULT_CONFIG)
+        if unknown:
+            raise ValidationError(f"Unknown config keys: {', '.join(sorted(unknown))}")
+        if not isinstance(resolved["threshold"], (int, float)) or not 0 < resolved["threshold"] <= 1:
+            raise ValidationError("threshold must be in (0, 1]")
+        if not isinstance(resolved["min_instruments"], int) or resolved["min_instruments"] < 2:
+            raise ValidationError("min_instruments must be an integer of at least 2")
+        if resolved["max_dates"] is not None and (
+            not isinstance(resolved["max_dates"], int) or resolved["max_dates"] < 1
+        ):
+            raise ValidationError("max_dates must be a positive integer")
+        return resolved
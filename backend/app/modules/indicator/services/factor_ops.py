@@ -0,0 +1,252 @@
+"""
+Vectorized Factor Operators
+
+NumPy kernels behind compiled factor expressions. Every kernel works on a
+whole (dates x instruments) panel at once; elementwise kernels also accept
+scalars so they can be used for constant folding.
+
+Semantics follow Qlib's expression operators:
+- Rolling operators use the observations available in the window
+  (``min_periods=1``) and skip NaN.
+- Std uses the sample standard deviation (ddof=1).
+- Rank(x) is the cross-sectional percentile rank per date; Rank(x, N) is the
+  percentile of the latest value within its own N-day window.
+- Division by zero and logs of non-positive values give NaN.
+"""
+
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+# Rows per block for kernels that materialize (rows x instruments x window)
+_WINDOW_BLOCK_ROWS = 256
+
+
+# ---------------------------------------------------------------- elementwise
+
+def add(a, b):
+    return np.add(a, b)
+
+
+def sub(a, b):
+    return np.subtract(a, b)
+
+
+def mul(a, b):
+    return np.multiply(a, b)
+
+
+def div(a, b):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = np.true_divide(a, b)
+    return np.where(np.isinf(out), np.nan, out)
+
+
+def power(a, b):
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        out = np.power(a, b)
+    return np.where(np.isinf(out), np.nan, out)
+
+
+def neg(a):
+    return np.negative(a)
+
+
+def absolute(a):
+    return np.abs(a)
+
+
+def sign(a):
+    return np.sign(a)
+
+
+def log(a):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(np.greater(a, 0), np.log(a), np.nan)
+
+
+def greater(a, b):
+    return np.maximum(a, b)
+
+
+def less(a, b):
+    return np.minimum(a, b)
+
+
+def _comparison(func: Callable) -> Callable:
+    def compare(a, b):
+        with np.errstate(invalid="ignore"):
+            out = func(a, b).astype(float)
+        return np.where(np.isnan(a) | np.isnan(b), np.nan, out)
+    return compare
+
+
+gt = _comparison(np.greater)
+ge = _comparison(np.greater_equal)
+lt = _comparison(np.less)
+le = _comparison(np.less_equal)
+eq = _comparison(np.equal)
+ne = _comparison(np.not_equal)
+
+
+def logical_and(a, b):
+    out = (np.not_equal(a, 0) & np.not_equal(b, 0)).astype(float)
+    return np.where(np.isnan(a) | np.isnan(b), np.nan, out)
+
+
+def logical_or(a, b):
+    out = (np.not_equal(a, 0) | np.not_equal(b, 0)).astype(float)
+    return np.where(np.isnan(a) | np.isnan(b), np.nan, out)
+
+
+def logical_not(a):
+    return np.where(np.isnan(a), np.nan, np.equal(a, 0).astype(float))
+
+
+def if_else(condition, then_value, else_value):
+    return np.where(
+        np.isnan(condition), np.nan, np.where(np.not_equal(condition, 0), then_value, else_value)
+    )
+
+
+# ---------------------------------------------------------------- time series
+
+def ref(x: np.ndarray, n: int) -> np.ndarray:
+    """Value n dates earlier (n < 0 looks ahead)."""
+    if n == 0:
+        return x
+    out = np.full(x.shape, np.nan)
+    if n > 0:
+        out[n:] = x[:-n]
+    else:
+        out[:n] = x[-n:]
+    return out
+
+
+def _window_sum(values: np.ndarray, n: int) -> np.ndarray:
+    """Sum over the last n rows (fewer at the start) via prefix sums."""
+    prefix = np.zeros((values.shape[0] + 1,) + values.shape[1:])
+    np.cumsum(values, axis=0, out=prefix[1:])
+
+    k = min(n, values.shape[0])
+    out = np.empty(values.shape)
+    out[:k] = prefix[1:k + 1]
+    np.subtract(prefix[k + 1:], prefix[1:values.shape[0] - k + 1], out=out[k:])
+    return out
+
+
+def rolling_sum(x: np.ndarray, n: int) -> np.ndarray:
+    observed = ~np.isnan(x)
+    total = _window_sum(np.where(observed, x, 0.0), n)
+    count = _window_sum(observed, n)
+    return np.where(count > 0, total, np.nan)
+
+
+def rolling_mean(x: np.ndarray, n: int) -> np.ndarray:
+    observed = ~np.isnan(x)
+    total = _window_sum(np.where(observed, x, 0.0), n)
+    count = _window_sum(observed, n)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(count > 0, total / count, np.nan)
+
+
+def _demeaned(x: np.ndarray, observed: np.ndarray) -> np.ndarray:
+    """Center each column on its mean so prefix sums keep their precision."""
+    with np.errstate(invalid="ignore"):
+        center = np.nanmean(np.where(observed, x, np.nan), axis=0)
+    return np.where(observed, x - np.nan_to_num(center), 0.0)
+
+
+def rolling_std(x: np.ndarray, n: int) -> np.ndarray:
+    observed = ~np.isnan(x)
+    centered = _demeaned(x, observed)
+
+    count = _window_sum(observed, n)
+    total = _window_sum(centered, n)
+    squares = _window_sum(centered * centered, n)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        variance = (squares - total * total / count) / (count - 1)
+    return np.where(count > 1, np.sqrt(np.maximum(variance, 0.0)), np.nan)
+
+
+def rolling_corr(x: np.ndarray, y: np.ndarray, n: int) -> np.ndarray:
+    observed = ~np.isnan(x) & ~np.isnan(y)
+    cx, cy = _demeaned(x, observed), _demeaned(y, observed)
+
+    count = _window_sum(observed, n)
+    sx = _window_sum(cx, n)
+    sy = _window_sum(cy, n)
+    sxx = _window_sum(cx * cx, n)
+    syy = _window_sum(cy * cy, n)
+    sxy = _window_sum(cx * cy, n)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        var_x = sxx - sx * sx / count
+        var_y = syy - sy * sy / count
+        corr = (sxy - sx * sy / count) / np.sqrt(var_x * var_y)
+
+    # Constant windows have no defined correlation
+    degenerate = (var_x <= 1e-9 * sxx) | (var_y <= 1e-9 * syy)
+    return np.where((count > 1) & ~degenerate, np.clip(corr, -1.0, 1.0), np.nan)
+
+
+def _rolling_windows(x: np.ndarray, n: int, reducer: Callable) -> np.ndarray:
+    """
+    Apply ``reducer(windows, last)`` to NaN-padded windows, in row blocks.
+
+    Only the first n - 1 rows, whose windows start before the data, are
+    evaluated on a padded copy; later windows are views into ``x``.
+    """
+    rows = x.shape[0]
+    out = np.empty(x.shape)
+    head = min(n - 1, rows)
+    if head:
+        padded = np.concatenate([np.full((n - 1,) + x.shape[1:], np.nan), x[:head]])
+        windows = sliding_window_view(padded, n, axis=0)
+        for start in range(0, head, _WINDOW_BLOCK_ROWS):
+            stop = min(start + _WINDOW_BLOCK_ROWS, head)
+            out[start:stop] = reducer(windows[start:stop], x[start:stop])
+    if rows >= n:
+        # Window i of the view ends at row i + n - 1
+        windows = sliding_window_view(x, n, axis=0)
+        for start in range(head, rows, _WINDOW_BLOCK_ROWS):
+            stop = min(start + _WINDOW_BLOCK_ROWS, rows)
+            out[start:stop] = reducer(windows[start - head:stop - head], x[start:stop])
+    return out
+
+
+def rolling_max(x: np.ndarray, n: int) -> np.ndarray:
+    if n == 1:
+        return x
+    return _rolling_windows(x, n, lambda windows, _: np.fmax.reduce(windows, axis=-1))
+
+
+def rolling_min(x: np.ndarray, n: int) -> np.ndarray:
+    if n == 1:
+        return x
+    return _rolling_windows(x, n, lambda windows, _: np.fmin.reduce(windows, axis=-1))
+
+
+def ts_rank(x: np.ndarray, n: int) -> np.ndarray:
+    """Percentile of the latest value within its window (ties averaged)."""
+    def rank(windows, last):
+        last = last[..., None]
+        less = (windows < last).sum(axis=-1)
+        equal = (windows == last).sum(axis=-1)
+        count = (~np.isnan(windows)).sum(axis=-1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pct = (less + (equal + 1) / 2) / count
+        return np.where(np.isnan(last[..., 0]), np.nan, pct)
+
+    return _rolling_windows(x, n, rank)
+
+
+# ------------------------------------------------------------ cross-sectional
+
+def cs_rank(x: np.ndarray) -> np.ndarray:
+    """Percentile rank across instruments for each date (ties averaged)."""
+    return pd.DataFrame(x).rank(axis=1, pct=True).to_numpy()
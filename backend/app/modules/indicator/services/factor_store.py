@@ -0,0 +1,433 @@
+"""
+Factor Value Store
+
+Persists computed factor matrices so validation, backtests and charts read
+factor values instead of recomputing them from prices.
+
+Materializations are keyed by (factor id, formula hash, dataset version):
+
+    <root>/<factor_id>/<formula_hash>/<dataset_id>/CURRENT
+    <root>/<factor_id>/<formula_hash>/<dataset_id>/<generation>/
+        meta.json        factor/dataset ids, formula hash, dataset version
+        dates.npy        datetime64[ns]
+        instruments.npy  instrument codes
+        values.npy       float64 (dates x instruments), column-major
+
+Values are stored column-major (one contiguous column per instrument) and
+memory-mapped on read, so date ranges and instrument runs are views of the
+file rather than copies. Each write goes to a new generation directory and
+CURRENT is switched atomically, so readers never see a partial write.
+Writers of one entry are serialized with an exclusive lock on its LOCK
+file, which holds across the API and Celery worker processes sharing the
+store.
+
+When a dataset grows (new dates appended, possibly new instruments), only
+the new rows plus the formula's lookback are computed; existing rows are
+assumed unchanged by the append. Materializations for an old formula hash
+are removed with gc(), e.g. when the factor's formula is updated.
+"""
+
+import json
+import os
+import shutil
+import threading
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from app.modules.data_management.services.dataset_panel import DatasetPanel
+from app.modules.indicator.services.factor_compiler import FactorPlan
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers are only serialized within a process
+    fcntl = None
+
+
+@dataclass
+class MaterializedFactor:
+    """
+    Stored values of one factor on one dataset version.
+
+    Attributes:
+        factor_id: Factor ID
+        formula_hash: Canonical formula hash the values were computed with
+        dataset_id: Dataset ID
+        dataset_version: Dataset version (see Dataset.version)
+        dates: Sorted dates (datetime64[ns])
+        instruments: Instrument codes
+        values: Factor values (dates x instruments), memory-mapped when loaded
+    """
+
+    factor_id: str
+    formula_hash: str
+    dataset_id: str
+    dataset_version: str
+    dates: np.ndarray
+    instruments: np.ndarray
+    values: np.ndarray
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """(number of dates, number of instruments)"""
+        return self.values.shape
+
+    def slice(
+        self,
+        start_date: Optional[Union[str, pd.Timestamp]] = None,
+        end_date: Optional[Union[str, pd.Timestamp]] = None,
+        instruments: Optional[Sequence[str]] = None
+    ) -> "MaterializedFactor":
+        """
+        Restrict to a date range and/or instrument subset (see DatasetPanel.slice).
+
+        Raises:
+            KeyError: If an instrument is not in the materialization
+        """
+        panel = DatasetPanel(self.dates, self.instruments, {"factor": self.values})
+        sliced = panel.slice(start_date, end_date, instruments)
+        return MaterializedFactor(
+            factor_id=self.factor_id,
+            formula_hash=self.formula_hash,
+            dataset_id=self.dataset_id,
+            dataset_version=self.dataset_version,
+            dates=sliced.dates,
+            instruments=sliced.instruments,
+            values=sliced.fields["factor"],
+        )
+
+
+class FactorValueStore:
+    """
+    File-backed store of materialized factor values.
+
+    Example:
+        store = get_factor_store()
+        plan = compile_formula(factor.formula, factor.formula_language)
+        stored = store.materialize(factor.id, plan, dataset.id, dataset.version, panel)
+        window = stored.slice("2024-01-01", "2024-06-30", ["SH600000"])
+    """
+
+    CURRENT = "CURRENT"
+    LOCK = "LOCK"
+
+    def __init__(self, root: Union[str, Path]):
+        """
+        Initialize the store.
+
+        Args:
+            root: Directory holding the materializations
+        """
+        self.root = Path(root)
+        self._locks: Dict[Tuple[str, str, str], threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    # ===================== Reads =====================
+
+    def get(
+        self,
+        factor_id: str,
+        formula_hash: str,
+        dataset_id: str,
+        dataset_version: Optional[str] = None
+    ) -> Optional[MaterializedFactor]:
+        """
+        Load a materialization (memory-mapped).
+
+        Args:
+            factor_id: Factor ID
+            formula_hash: Formula hash
+            dataset_id: Dataset ID
+            dataset_version: Required dataset version (None: any version)
+
+        Returns:
+            MaterializedFactor, or None if missing or of another version
+        """
+        directory = self._directory(factor_id, formula_hash, dataset_id)
+        try:
+            generation = directory / (directory / self.CURRENT).read_text().strip()
+            meta = json.loads((generation / "meta.json").read_text())
+            if dataset_version is not None and meta["dataset_version"] != dataset_version:
+                return None
+            return MaterializedFactor(
+                factor_id=factor_id,
+                formula_hash=formula_hash,
+                dataset_id=dataset_id,
+                dataset_version=meta["dataset_version"],
+                dates=np.load(generation / "dates.npy"),
+                instruments=np.load(generation / "instruments.npy").astype(object),
+                values=np.load(generation / "values.npy", mmap_mode="r"),
+            )
+        except FileNotFoundError:
+            return None
+
+    def read(
+        self,
+        factor_id: str,
+        formula_hash: str,
+        dataset_id: str,
+        dataset_version: str,
+        start_date: Optional[Union[str, pd.Timestamp]] = None,
+        end_date: Optional[Union[str, pd.Timestamp]] = None,
+        instruments: Optional[Sequence[str]] = None
+    ) -> Optional[MaterializedFactor]:
+        """
+        Load a slice of a materialization.
+
+        Returns:
+            Sliced MaterializedFactor, or None if not materialized for this version
+        """
+        stored = self.get(factor_id, formula_hash, dataset_id, dataset_version)
+        if stored is None:
+            return None
+        return stored.slice(start_date, end_date, instruments)
+
+    # ===================== Writes =====================
+
+    def materialize(
+        self,
+        factor_id: str,
+        plan: FactorPlan,
+        dataset_id: str,
+        dataset_version: str,
+        panel: DatasetPanel
+    ) -> MaterializedFactor:
+        """
+        Return stored values for this dataset version, computing what is missing.
+
+        Args:
+            factor_id: Factor ID
+            plan: Compiled factor plan (output 'factor')
+            dataset_id: Dataset ID
+            dataset_version: Version of the dataset the panel was loaded from
+            panel: Full dataset panel
+
+        Returns:
+            MaterializedFactor backed by the stored file
+        """
+        key = (factor_id, plan.formula_hash, dataset_id)
+        with self._lock(key):
+            current = self.get(*key)
+            if current is not None and current.dataset_version == dataset_version:
+                return current
+
+            values = self._extend(current, plan, panel) if current is not None else None
+            if values is None:
+                values = plan.evaluate(panel)["factor"]
+
+            self._write(key, dataset_version, panel.dates, panel.instruments, values)
+            return self.get(*key)
+
+    def put(
+        self,
+        factor_id: str,
+        formula_hash: str,
+        dataset_id: str,
+        dataset_version: str,
+        panel: DatasetPanel,
+        values: np.ndarray
+    ) -> MaterializedFactor:
+        """
+        Store values computed elsewhere (e.g. by a batch evaluation).
+
+        Args:
+            factor_id: Factor ID
+            formula_hash: Formula hash of the plan that produced the values
+            dataset_id: Dataset ID
+            dataset_version: Version of the dataset the panel was loaded from
+            panel: Panel the values were computed on
+            values: Factor values (dates x instruments)
+
+        Returns:
+            MaterializedFactor backed by the stored file
+        """
+        if values.shape != panel.shape:
+            raise ValueError(f"values shape {values.shape} does not match panel {panel.shape}")
+        key = (factor_id, formula_hash, dataset_id)
+        with self._lock(key):
+            self._write(key, dataset_version, panel.dates, panel.instruments, values)
+            return self.get(*key)
+
+    def _extend(
+        self,
+        current: MaterializedFactor,
+        plan: FactorPlan,
+        panel: DatasetPanel
+    ) -> Optional[np.ndarray]:
+        """Extend stored values to a grown panel; None if a full recompute is needed."""
+        n_old = len(current.dates)
+        if len(panel.dates) < n_old or not np.array_equal(panel.dates[:n_old], current.dates):
+            return None
+
+        same_universe = np.array_equal(panel.instruments, current.instruments)
+        if not same_universe and plan.cross_sectional:
+            return None
+        try:
+            old_columns = panel.instrument_indices(current.instruments)
+        except KeyError:
+            return None
+
+        # Rows whose value can change, and the history needed to compute them
+        start = max(n_old - plan.lookahead, 0)
+        input_start = max(start - plan.lookback, 0)
+
+        values = np.empty(panel.shape, order="F")
+        if not same_universe:
+            values[:] = np.nan
+        values[:start, old_columns] = current.values[:start]
+        if start < len(panel.dates):
+            tail = plan.evaluate(panel.slice(start_date=panel.dates[input_start]))["factor"]
+            values[start:] = tail[start - input_start:]
+
+        if not same_universe:
+            new = np.setdiff1d(np.arange(panel.shape[1]), old_columns)
+            listed = panel.slice(instruments=panel.instruments[new])
+            values[:, new] = plan.evaluate(listed)["factor"]
+
+        logger.debug(
+            f"Extended factor {current.factor_id} on dataset {current.dataset_id}: "
+            f"{n_old} -> {len(panel.dates)} dates, recomputed from row {input_start}"
+        )
+        return values
+
+    def _write(
+        self,
+        key: Tuple[str, str, str],
+        dataset_version: str,
+        dates: np.ndarray,
+        instruments: np.ndarray,
+        values: np.ndarray
+    ) -> None:
+        directory = self._directory(*key)
+        generation = uuid.uuid4().hex
+        target = directory / generation
+        target.mkdir(parents=True)
+
+        np.save(target / "dates.npy", np.asarray(dates, dtype="datetime64[ns]"))
+        np.save(target / "instruments.npy", np.asarray(instruments, dtype=str))
+        np.save(target / "values.npy", np.asfortranarray(values, dtype=np.float64))
+        (target / "meta.json").write_text(json.dumps({
+            "factor_id": key[0],
+            "formula_hash": key[1],
+            "dataset_id": key[2],
+            "dataset_version": dataset_version,
+            "shape": list(values.shape),
+            "created_at": datetime.utcnow().isoformat(),
+        }))
+
+        # Switch readers to the new generation atomically, then drop the old ones
+        pointer = directory / f"{self.CURRENT}.{generation}"
+        pointer.write_text(generation)
+        os.replace(pointer, directory / self.CURRENT)
+        for old in directory.iterdir():
+            if old.is_dir() and old.name != generation:
+                shutil.rmtree(old, ignore_errors=True)
+
+    # ===================== Garbage collection =====================
+
+    def gc(self, factor_id: str, keep_hash: Optional[str] = None) -> int:
+        """
+        Remove a factor's materializations for formula hashes other than keep_hash.
+
+        Args:
+            factor_id: Factor ID
+            keep_hash: Formula hash to keep (None: remove everything)
+
+        Returns:
+            Number of materializations removed
+        """
+        factor_dir = self.root / _safe_name(factor_id)
+        if not factor_dir.exists():
+            return 0
+
+        removed = 0
+        for hash_dir in factor_dir.iterdir():
+            if hash_dir.name == keep_hash:
+                continue
+            removed += sum(1 for d in hash_dir.iterdir() if d.is_dir())
+            shutil.rmtree(hash_dir, ignore_errors=True)
+        if keep_hash is None:
+            shutil.rmtree(factor_dir, ignore_errors=True)
+
+        if removed:
+            logger.info(f"Removed {removed} stale materializations of factor {factor_id}")
+        return removed
+
+    def drop_dataset(self, dataset_id: str) -> int:
+        """
+        Remove every factor's materialization on a dataset.
+
+        Args:
+            dataset_id: Dataset ID
+
+        Returns:
+            Number of materializations removed
+        """
+        stale = list(self.root.glob(f"*/*/{_safe_name(dataset_id)}"))
+        for directory in stale:
+            shutil.rmtree(directory, ignore_errors=True)
+        return len(stale)
+
+    def list_materializations(self, factor_id: str) -> List[Dict[str, str]]:
+        """
+        Describe a factor's stored materializations.
+
+        Returns:
+            List of dicts with formula_hash, dataset_id and dataset_version
+        """
+        result = []
+        for current in sorted(self.root.glob(f"{_safe_name(factor_id)}/*/*/{self.CURRENT}")):
+            stored = self.get(factor_id, current.parent.parent.name, current.parent.name)
+            if stored is not None:
+                result.append({
+                    "formula_hash": stored.formula_hash,
+                    "dataset_id": stored.dataset_id,
+                    "dataset_version": stored.dataset_version,
+                })
+        return result
+
+    # ===================== Helpers =====================
+
+    def _directory(self, factor_id: str, formula_hash: str, dataset_id: str) -> Path:
+        return self.root / _safe_name(factor_id) / _safe_name(formula_hash) / _safe_name(dataset_id)
+
+    @contextmanager
+    def _lock(self, key: Tuple[str, str, str]) -> Iterator[None]:
+        """Hold the entry's write lock, across threads and processes."""
+        with self._locks_guard:
+            thread_lock = self._locks.setdefault(key, threading.Lock())
+        with thread_lock:
+            if fcntl is None:
+                yield
+                return
+            directory = self._directory(*key)
+            directory.mkdir(parents=True, exist_ok=True)
+            with open(directory / self.LOCK, "a") as handle:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+def _safe_name(name: str) -> str:
+    """Reject IDs that would escape the store directory."""
+    name = str(name)
+    if not name or name in (".", "..") or "/" in name or "\\" in name:
+        raise ValueError(f"Invalid store key component: {name!r}")
+    return name
+
+
+@lru_cache()
+def get_factor_store() -> FactorValueStore:
+    """Process-wide factor store under CACHE_DIR/factors."""
+    from app.config import settings
+    return FactorValueStore(Path(settings.CACHE_DIR) / "factors")
@@ -0,0 +1,476 @@
+"""
+Factor Validation Engine
+
+Vectorized factor statistics over (dates x instruments) panels:
+- Forward returns for a holding horizon
+- Daily cross-sectional Pearson IC and Spearman (rank) IC
+- IC summary statistics (mean, std, IR, t-stat, quantiles)
+- Factor value distribution
+- Layered (quantile) backtests: bucket returns, turnover and long-short
+
+All dates are processed at once with NumPy: each statistic is a handful of
+whole-panel operations rather than a loop over dates. For each date only
+instruments where both the factor and the forward return are observed are
+used, and dates with fewer than ``min_instruments`` such instruments get NaN.
+"""
+
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.modules.indicator.services import factor_ops
+
+
+DEFAULT_HORIZONS = (1, 5, 10, 20)
+SUMMARY_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+
+def forward_returns(prices: np.ndarray, horizon: int) -> np.ndarray:
+    """
+    Return from each date to ``horizon`` dates later (NaN where unknown).
+
+    Args:
+        prices: Prices (dates x instruments)
+        horizon: Holding period in dates
+
+    Returns:
+        Forward returns (dates x instruments)
+    """
+    if horizon < 1:
+        raise ValueError(f"horizon must be positive, got {horizon}")
+    return factor_ops.div(factor_ops.ref(prices, -horizon), prices) - 1.0
+
+
+class RowRanker:
+    """
+    Sorts each row of an array once and ranks it, optionally over a subset.
+
+    Ranking over a subset (e.g. instruments that also have a forward
+    return) reuses the sort: a subset member's rank is the count of subset
+    members at or before it in sorted order, with ties averaged.
+    """
+
+    def __init__(self, values: np.ndarray):
+        """
+        Sort the rows of ``values`` (NaN sorts last).
+
+        Args:
+            values: 2-D array
+        """
+        self.values = values
+        # NumPy sorts NaN last but much slower than +inf
+        missing = np.isnan(values)
+        self.order = np.argsort(np.where(missing, np.inf, values) if missing.any() else values, axis=1)
+        ordered = np.take_along_axis(values, self.order, axis=1)
+
+        # Tie groups are runs of equal sorted values; record each position's
+        # group first and last positions (continuous data usually has none)
+        starts = np.ones(values.shape, dtype=bool)
+        starts[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+        self.has_ties = not starts.all()
+        if self.has_ties:
+            n_cols = values.shape[1]
+            positions = np.broadcast_to(np.arange(n_cols, dtype=np.int32), values.shape)
+            self.first = np.maximum.accumulate(np.where(starts, positions, 0), axis=1)
+            ends = np.ones(values.shape, dtype=bool)
+            ends[:, :-1] = starts[:, 1:]
+            self.last = np.minimum.accumulate(
+                np.where(ends, positions, n_cols - 1)[:, ::-1], axis=1
+            )[:, ::-1]
+
+    def ranks(self, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Average ranks (1 = smallest) within each row.
+
+        Args:
+            mask: Cells to rank (default: all observed cells); others are NaN
+
+        Returns:
+            Float ranks with the shape of the input
+        """
+        observed = ~np.isnan(self.values)
+        mask = observed if mask is None else mask & observed
+
+        included = np.take_along_axis(mask, self.order, axis=1)
+        cumulative = np.cumsum(included, axis=1, dtype=np.int32)
+        if self.has_ties:
+            before_group = (
+                np.take_along_axis(cumulative, self.first, axis=1)
+                - np.take_along_axis(included, self.first, axis=1)
+            )
+            group_end = np.take_along_axis(cumulative, self.last, axis=1)
+            sorted_ranks = (before_group + 1 + group_end) / 2.0
+        else:
+            sorted_ranks = cumulative.astype(float)
+
+        ranks = np.empty(self.values.shape)
+        np.put_along_axis(ranks, self.order, sorted_ranks, axis=1)
+        ranks[~mask] = np.nan
+        return ranks
+
+
+def rank_rows(values: np.ndarray) -> np.ndarray:
+    """
+    Rank each row (1 = smallest), averaging ties; NaN stays NaN.
+
+    Args:
+        values: 2-D array
+
+    Returns:
+        Float ranks with the shape of ``values``
+    """
+    return RowRanker(values).ranks()
+
+
+def row_correlation(x: np.ndarray, y: np.ndarray, min_instruments: int = 5) -> np.ndarray:
+    """
+    Pearson correlation of x and y within each row, over cells where both are observed.
+
+    Args:
+        x: 2-D array
+        y: 2-D array of the same shape
+        min_instruments: Minimum observed pairs for a row to get a value
+
+    Returns:
+        Correlation per row (NaN for rows with too few pairs or no variance)
+    """
+    observed = ~np.isnan(x) & ~np.isnan(y)
+    count = observed.sum(axis=1)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        dx = np.where(observed, x, 0.0)
+        dx -= (dx.sum(axis=1) / count)[:, None]
+        dx[~observed] = 0.0
+        dy = np.where(observed, y, 0.0)
+        dy -= (dy.sum(axis=1) / count)[:, None]
+        dy[~observed] = 0.0
+
+        denominator = np.sqrt(np.einsum("ij,ij->i", dx, dx) * np.einsum("ij,ij->i", dy, dy))
+        corr = np.einsum("ij,ij->i", dx, dy) / denominator
+
+    valid = (count >= min_instruments) & (denominator > 0)
+    return np.where(valid, corr, np.nan)
+
+
+def information_coefficient(
+    factor: np.ndarray,
+    returns: np.ndarray,
+    method: str = "pearson",
+    min_instruments: int = 5,
+    factor_ranker: Optional[RowRanker] = None
+) -> np.ndarray:
+    """
+    Daily cross-sectional IC between factor values and forward returns.
+
+    Args:
+        factor: Factor values (dates x instruments)
+        returns: Forward returns (dates x instruments)
+        method: "pearson" (IC) or "spearman" (rank IC)
+        min_instruments: Minimum instruments per date
+        factor_ranker: RowRanker of ``factor`` to reuse across horizons
+            (spearman only)
+
+    Returns:
+        IC per date
+    """
+    if method == "pearson":
+        return row_correlation(factor, returns, min_instruments)
+    if method != "spearman":
+        raise ValueError(f"Unknown IC method '{method}'. Use 'pearson' or 'spearman'")
+
+    # Both sides are ranked over the instruments observed in both arrays
+    joint = ~np.isnan(factor) & ~np.isnan(returns)
+    factor_ranker = factor_ranker if factor_ranker is not None else RowRanker(factor)
+    return row_correlation(
+        factor_ranker.ranks(joint), RowRanker(returns).ranks(joint), min_instruments
+    )
+
+
+def summarize_ic(ic: np.ndarray) -> Dict[str, Any]:
+    """
+    Summary statistics of an IC series (NaN dates ignored).
+
+    Args:
+        ic: IC per date
+
+    Returns:
+        Dict with ic_mean, ic_std, ic_ir, t_stat, positive_ratio,
+        n_periods and quantiles (None where undefined)
+    """
+    values = ic[~np.isnan(ic)]
+    n = len(values)
+    if n == 0:
+        return {
+            "ic_mean": None, "ic_std": None, "ic_ir": None, "t_stat": None,
+            "positive_ratio": None, "n_periods": 0,
+            "quantiles": {_quantile_key(q): None for q in SUMMARY_QUANTILES},
+        }
+
+    mean = float(values.mean())
+    std = float(values.std(ddof=1)) if n > 1 else None
+    ir = mean / std if std else None
+    return {
+        "ic_mean": mean,
+        "ic_std": std,
+        "ic_ir": ir,
+        "t_stat": ir * np.sqrt(n) if ir is not None else None,
+        "positive_ratio": float((values > 0).mean()),
+        "n_periods": n,
+        "quantiles": dict(zip(
+            (_quantile_key(q) for q in SUMMARY_QUANTILES),
+            np.quantile(values, SUMMARY_QUANTILES).tolist()
+        )),
+    }
+
+
+def ic_analysis(
+    factor: np.ndarray,
+    prices: np.ndarray,
+    horizons: Sequence[int] = DEFAULT_HORIZONS,
+    method: str = "pearson",
+    min_instruments: int = 5
+) -> Dict[int, np.ndarray]:
+    """
+    Daily IC for several forward-return horizons.
+
+    Args:
+        factor: Factor values (dates x instruments)
+        prices: Prices used for forward returns (dates x instruments)
+        horizons: Holding periods in dates
+        method: "pearson" or "spearman"
+        min_instruments: Minimum instruments per date
+
+    Returns:
+        Horizon -> IC per date
+    """
+    factor_ranker = RowRanker(factor) if method == "spearman" else None
+    return {
+        horizon: information_coefficient(
+            factor, forward_returns(prices, horizon), method, min_instruments, factor_ranker
+        )
+        for horizon in horizons
+    }
+
+
+def factor_distribution(factor: np.ndarray) -> Dict[str, Any]:
+    """
+    Distribution of factor values over the whole panel.
+
+    Args:
+        factor: Factor values (dates x instruments)
+
+    Returns:
+        Dict with count, missing_ratio, mean, std, skew, kurtosis (excess),
+        min, max, quantiles and coverage (mean share of instruments with a
+        value per date)
+    """
+    finite = np.isfinite(factor)
+    values = factor[finite]
+    result: Dict[str, Any] = {
+        "count": int(values.size),
+        "missing_ratio": float(1.0 - values.size / factor.size) if factor.size else None,
+        "coverage": float(finite.mean(axis=1).mean()) if factor.size else None,
+    }
+    if values.size == 0:
+        result.update({
+            "mean": None, "std": None, "skew": None, "kurtosis": None, "min": None, "max": None,
+            "quantiles": {_quantile_key(q): None for q in SUMMARY_QUANTILES},
+        })
+        return result
+
+    mean = values.mean()
+    centered = values - mean
+    variance = np.mean(centered ** 2)
+    std = np.sqrt(variance)
+    result.update({
+        "mean": float(mean),
+        "std": float(values.std(ddof=1)) if values.size > 1 else None,
+        "skew": float(np.mean(centered ** 3) / std ** 3) if std > 0 else None,
+        "kurtosis": float(np.mean(centered ** 4) / variance ** 2 - 3.0) if std > 0 else None,
+        "min": float(values.min()),
+        "max": float(values.max()),
+        "quantiles": dict(zip(
+            (_quantile_key(q) for q in SUMMARY_QUANTILES),
+            np.quantile(values, SUMMARY_QUANTILES).tolist()
+        )),
+    })
+    return result
+
+
+def factor_histogram(factor: np.ndarray, bins: int = 50) -> Dict[str, list]:
+    """
+    Histogram of factor values between the 1st and 99th percentiles.
+
+    Values outside that range are counted in the first and last bins so
+    outliers do not flatten the rest of the histogram.
+
+    Args:
+        factor: Factor values (dates x instruments)
+        bins: Number of bins
+
+    Returns:
+        Dict with bin edges and counts (empty lists if no values)
+    """
+    values = factor[np.isfinite(factor)]
+    if values.size == 0:
+        return {"edges": [], "counts": []}
+    low, high = np.quantile(values, (0.01, 0.99))
+    if low == high:
+        low, high = low - 0.5, high + 0.5
+    counts, edges = np.histogram(np.clip(values, low, high), bins=bins, range=(low, high))
+    return {"edges": edges.tolist(), "counts": counts.tolist()}
+
+
+def quantile_buckets(
+    factor: np.ndarray,
+    n_groups: int = 5,
+    min_instruments: int = 5,
+    factor_ranker: Optional[RowRanker] = None
+) -> np.ndarray:
+    """
+    Assign each instrument to a factor quantile bucket on every date.
+
+    Buckets come from the within-date rank: ``floor((rank - 1) * n_groups /
+    count)``, so buckets are equally sized up to rounding and tied values
+    share a bucket.
+
+    Args:
+        factor: Factor values (dates x instruments)
+        n_groups: Number of buckets
+        min_instruments: Minimum instruments per date (at least ``n_groups``)
+        factor_ranker: RowRanker of ``factor`` to reuse
+
+    Returns:
+        Bucket per cell as int16: 0 = lowest values, -1 = not bucketed
+    """
+    if n_groups < 2:
+        raise ValueError(f"n_groups must be at least 2, got {n_groups}")
+    ranks = (factor_ranker if factor_ranker is not None else RowRanker(factor)).ranks()
+    count = (~np.isnan(ranks)).sum(axis=1, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        buckets = np.floor((ranks - 1.0) * n_groups / count)
+    valid = ~np.isnan(buckets) & (count >= max(min_instruments, n_groups))
+    return np.where(valid, buckets, -1).astype(np.int16)
+
+
+def _group_totals(
+    values: Optional[np.ndarray],
+    groups: np.ndarray,
+    n_groups: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Per-row, per-group sums of ``values`` and member counts.
+
+    One bincount over ``row * n_groups + group`` replaces a loop over
+    dates. Cells with group -1 (or NaN values) are ignored.
+
+    Returns:
+        (sums, counts), each rows x n_groups; sums are zero if values is None
+    """
+    valid = groups >= 0
+    if values is not None:
+        valid &= ~np.isnan(values)
+    n_rows = groups.shape[0]
+    rows = np.broadcast_to(np.arange(n_rows)[:, None], groups.shape)
+    index = rows[valid] * n_groups + groups[valid]
+    size = n_rows * n_groups
+    counts = np.bincount(index, minlength=size).reshape(n_rows, n_groups)
+    if values is None:
+        return np.zeros((n_rows, n_groups)), counts
+    sums = np.bincount(index, weights=values[valid], minlength=size).reshape(n_rows, n_groups)
+    return sums, counts
+
+
+def bucket_turnover(buckets: np.ndarray, n_groups: int) -> np.ndarray:
+    """
+    Turnover of each equal-weighted bucket between consecutive rebalances.
+
+    Turnover is half the sum of absolute weight changes, so replacing the
+    whole bucket is 1.0.
+
+    Args:
+        buckets: Bucket per cell at each rebalance (rebalances x instruments)
+        n_groups: Number of buckets
+
+    Returns:
+        Turnover (rebalances x n_groups); the first row is NaN
+    """
+    turnover = np.full((buckets.shape[0], n_groups), np.nan)
+    if buckets.shape[0] < 2:
+        return turnover
+
+    previous, current = buckets[:-1], buckets[1:]
+    _, previous_counts = _group_totals(None, previous, n_groups)
+    _, current_counts = _group_totals(None, current, n_groups)
+    rows = np.arange(previous.shape[0])[:, None]
+    with np.errstate(divide="ignore"):
+        previous_weight = np.where(
+            previous >= 0, 1.0 / previous_counts[rows, np.maximum(previous, 0)], 0.0
+        )
+        current_weight = np.where(
+            current >= 0, 1.0 / current_counts[rows, np.maximum(current, 0)], 0.0
+        )
+
+    # An instrument that stays in its bucket changes weight by the difference;
+    # one that moves leaves its old weight and takes its new one
+    stays = previous == current
+    leaving = np.where(stays, np.abs(current_weight - previous_weight), previous_weight)
+    entering = np.where(stays, 0.0, current_weight)
+    changed = (
+        _group_totals(leaving, previous, n_groups)[0]
+        + _group_totals(entering, current, n_groups)[0]
+    )
+    turnover[1:] = changed / 2.0
+    return turnover
+
+
+def layered_backtest(
+    factor: np.ndarray,
+    prices: np.ndarray,
+    n_groups: int = 5,
+    rebalance_period: int = 1,
+    min_instruments: int = 5
+) -> Dict[str, np.ndarray]:
+    """
+    Backtest equal-weighted factor quantile buckets.
+
+    Instruments are bucketed by factor value every ``rebalance_period``
+    dates and held until the next rebalance. Each bucket earns the mean
+    next-date return of its members on every date; members without a
+    return that date are skipped. Long-short is the top bucket minus the
+    bottom bucket.
+
+    Args:
+        factor: Factor values (dates x instruments)
+        prices: Prices (dates x instruments)
+        n_groups: Number of buckets
+        rebalance_period: Dates between rebalances
+        min_instruments: Minimum instruments for a date to be bucketed
+
+    Returns:
+        Dict with group_returns (dates x n_groups, NaN = no holdings),
+        long_short (dates), turnover (rebalances x n_groups) and
+        rebalance_rows (date index of each rebalance)
+    """
+    if rebalance_period < 1:
+        raise ValueError(f"rebalance_period must be positive, got {rebalance_period}")
+    n_dates = factor.shape[0]
+    buckets = quantile_buckets(factor, n_groups, min_instruments)
+
+    rebalance_rows = np.arange(0, n_dates, rebalance_period)
+    held = buckets[np.repeat(rebalance_rows, rebalance_period)[:n_dates]]
+
+    sums, counts = _group_totals(forward_returns(prices, 1), held, n_groups)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        group_returns = np.where(counts > 0, sums / counts, np.nan)
+
+    return {
+        "group_returns": group_returns,
+        "long_short": group_returns[:, -1] - group_returns[:, 0],
+        "turnover": bucket_turnover(buckets[rebalance_rows], n_groups),
+        "rebalance_rows": rebalance_rows,
+    }
+
+
+def _quantile_key(q: float) -> str:
+    return f"p{int(round(q * 100)):02d}"
@@ -0,0 +1,542 @@
+"""
+FactorValidationService - Business logic for factor validation runs
+
+Creates FactorValidationResult records, runs the validation engine over a
+dataset and stores metrics and details back on the record. Runs are
+executed by the run_factor_validation Celery task; status and progress are
+reported through FactorValidationResultRepository.update_status.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+from app.database.models.indicator import ValidationStatus, ValidationType
+from app.database.repositories.custom_factor_repository import CustomFactorRepository
+from app.database.repositories.dataset import DatasetRepository
+from app.database.repositories.factor_validation_repository import FactorValidationResultRepository
+from app.modules.common.utils import return_statistics
+from app.modules.data_management.services.dataset_panel import DatasetPanel, load_dataset_panel
+from app.modules.indicator.exceptions import (
+    AuthorizationError,
+    ResourceNotFoundError,
+    ValidationError,
+)
+from app.modules.indicator.services import factor_validation
+from app.modules.indicator.services.factor_compiler import compile_formula
+from app.modules.indicator.services.factor_store import (
+    FactorValueStore,
+    MaterializedFactor,
+    get_factor_store,
+)
+
+
+DEFAULT_CONFIG: Dict[str, Any] = {
+    "horizons": list(factor_validation.DEFAULT_HORIZONS),
+    "price_field": "close",
+    "min_instruments": 5,
+    "n_groups": 5,
+    "rebalance_period": 1,
+    "sharpe_window": 63,
+    "start_date": None,
+    "end_date": None,
+}
+MAX_HORIZON = 250
+MAX_GROUPS = 20
+
+# Async progress callback: percentage (0-100)
+ProgressCallback = Callable[[float], Any]
+
+
+class FactorValidationService:
+    """
+    Service for factor validation operations.
+
+    Provides business logic for:
+    - Creating validation runs with authorization and config checks
+    - Running IC / rank IC / distribution / layered backtest / Sharpe ratio
+      analyses with progress reporting
+    - Retrieving validation results
+    """
+
+    SUPPORTED_TYPES = (
+        ValidationType.IC_ANALYSIS.value,
+        ValidationType.IC_RANK_ANALYSIS.value,
+        ValidationType.FACTOR_DISTRIBUTION.value,
+        ValidationType.LAYERED_BACKTEST.value,
+        ValidationType.SHARPE_RATIO.value,
+    )
+
+    def __init__(
+        self,
+        validation_repo: FactorValidationResultRepository,
+        custom_factor_repo: CustomFactorRepository,
+        dataset_repo: DatasetRepository,
+        factor_store: Optional[FactorValueStore] = None
+    ):
+        """
+        Initialize service with repositories.
+
+        Args:
+            validation_repo: FactorValidationResultRepository instance
+            custom_factor_repo: CustomFactorRepository instance
+            dataset_repo: DatasetRepository instance
+            factor_store: Store of materialized factor values
+                         (default: the process-wide store)
+        """
+        self.validation_repo = validation_repo
+        self.custom_factor_repo = custom_factor_repo
+        self.dataset_repo = dataset_repo
+        self._factor_store = factor_store
+
+    @property
+    def factor_store(self) -> FactorValueStore:
+        """Store of materialized factor values."""
+        if self._factor_store is None:
+            self._factor_store = get_factor_store()
+        return self._factor_store
+
+    async def create_validation(
+        self,
+        factor_id: str,
+        dataset_id: str,
+        validation_type: str,
+        authenticated_user_id: str,
+        config: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Create a pending validation run.
+
+        Args:
+            factor_id: Factor to validate
+            dataset_id: Dataset to validate on
+            validation_type: One of SUPPORTED_TYPES
+            authenticated_user_id: ID of authenticated user (from auth context)
+            config: Overrides of DEFAULT_CONFIG
+
+        Returns:
+            Dict with created validation
+
+        Raises:
+            ValidationError: If the type or config is invalid
+            ResourceNotFoundError: If the factor or dataset does not exist
+            AuthorizationError: If the user may not use the factor
+        """
+        if validation_type not in self.SUPPORTED_TYPES:
+            raise ValidationError(
+                f"Unsupported validation_type '{validation_type}'. "
+                f"Must be one of: {', '.join(self.SUPPORTED_TYPES)}"
+            )
+        resolved = self._resolve_config(config)
+
+        await self._authorize(factor_id, authenticated_user_id)
+        if not await self.dataset_repo.get(dataset_id):
+            raise ResourceNotFoundError(f"Dataset {dataset_id} not found")
+
+        validation = await self.validation_repo.create({
+            "factor_id": factor_id,
+            "dataset_id": dataset_id,
+            "validation_type": validation_type,
+            "status": ValidationStatus.PENDING.value,
+            "details": {"config": resolved},
+        }, commit=True, user_id=authenticated_user_id)
+
+        logger.info(
+            f"Validation created",
+            extra={
+                "validation_id": validation.id,
+                "factor_id": factor_id,
+                "validation_type": validation_type,
+            }
+        )
+        return {
+            "validation": self._to_dict(validation),
+            "message": "Validation created successfully"
+        }
+
+    async def get_validation(
+        self,
+        validation_id: str,
+        factor_id: Optional[str] = None,
+        authenticated_user_id: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get a validation result.
+
+        Args:
+            validation_id: Validation result ID
+            factor_id: If provided, the validation must belong to this factor
+            authenticated_user_id: If provided, the user must own the
+                validated factor or the factor must be public
+
+        Returns:
+            Dict with validation or None if not found
+
+        Raises:
+            AuthorizationError: If the user may not use the factor
+        """
+        validation = await self.validation_repo.get(validation_id)
+        if not validation or (factor_id is not None and validation.factor_id != factor_id):
+            return None
+        if authenticated_user_id is not None:
+            try:
+                await self._authorize(validation.factor_id, authenticated_user_id)
+            except ResourceNotFoundError:
+                return None
+        return {"validation": self._to_dict(validation)}
+
+    async def get_factor_validations(
+        self,
+        factor_id: str,
+        validation_type: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 20,
+        authenticated_user_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get a factor's validation history, newest first.
+
+        Args:
+            factor_id: Factor ID
+            validation_type: Optional type filter
+            skip: Skip records
+            limit: Limit records
+            authenticated_user_id: If provided, the user must own the factor
+                or the factor must be public
+
+        Returns:
+            List of validation dicts
+
+        Raises:
+            ResourceNotFoundError: If the factor does not exist
+            AuthorizationError: If the user may not use the factor
+        """
+        if authenticated_user_id is not None:
+            await self._authorize(factor_id, authenticated_user_id)
+        validations = await self.validation_repo.get_by_factor(
+            factor_id, validation_type=validation_type, skip=skip, limit=limit
+        )
+        return [self._to_dict(v) for v in validations]
+
+    async def run_validation(self, validation_id: str) -> Dict[str, Any]:
+        """
+        Execute a validation run and store its results.
+
+        Progress is reported through update_status: loading the dataset,
+        materializing the factor, then each analysis step.
+
+        Args:
+            validation_id: Validation result ID
+
+        Returns:
+            Dict with status and metrics
+
+        Raises:
+            ResourceNotFoundError: If the validation, factor or dataset is missing
+        """
+        validation = await self.validation_repo.get(validation_id)
+        if not validation:
+            raise ResourceNotFoundError(f"Validation {validation_id} not found")
+        if validation.status == ValidationStatus.COMPLETED.value:
+            return {"status": validation.status, "metrics": validation.metrics, "skipped": True}
+
+        config = self._resolve_config((validation.details or {}).get("config"))
+
+        async def report(progress: float) -> None:
+            await self.validation_repo.update_status(
+                validation_id, ValidationStatus.RUNNING.value, progress=round(progress, 1)
+            )
+
+        try:
+            await report(0.0)
+            factor = await self.custom_factor_repo.get(validation.factor_id)
+            if not factor:
+                raise ResourceNotFoundError(f"Factor {validation.factor_id} not found")
+            dataset = await self.dataset_repo.get(validation.dataset_id)
+            if not dataset:
+                raise ResourceNotFoundError(f"Dataset {validation.dataset_id} not found")
+
+            panel = load_dataset_panel(dataset.file_path)
+            await report(20.0)
+
+            plan = compile_formula(factor.formula, factor.formula_language)
+            stored = self.factor_store.materialize(
+                factor.id, plan, dataset.id, dataset.version, panel
+            )
+            await report(40.0)
+
+            factor_values, panel = self._window(stored, panel, config)
+            metrics, details = await self._analyze(
+                validation.validation_type, factor_values, panel, config,
+                lambda fraction: report(40.0 + 55.0 * fraction)
+            )
+            details["config"] = config
+            details["dataset_version"] = dataset.version
+
+            await self.validation_repo.update_status(
+                validation_id,
+                ValidationStatus.COMPLETED.value,
+                progress=100.0,
+                metrics=metrics,
+                details=details,
+            )
+            logger.info(f"Validation {validation_id} completed")
+            return {"status": ValidationStatus.COMPLETED.value, "metrics": metrics}
+
+        except Exception as e:
+            logger.error(f"Validation {validation_id} failed: {e}")
+            await self.validation_repo.update_status(
+                validation_id, ValidationStatus.FAILED.value, error_message=str(e)
+            )
+            raise
+
+    async def _analyze(
+        self,
+        validation_type: str,
+        factor_values: np.ndarray,
+        panel: DatasetPanel,
+        config: Dict[str, Any],
+        progress: ProgressCallback
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Run one analysis; returns (metrics, details)."""
+        dates = [str(d)[:10] for d in panel.dates]
+
+        if validation_type == ValidationType.FACTOR_DISTRIBUTION.value:
+            metrics = factor_validation.factor_distribution(factor_values)
+            with np.errstate(invalid="ignore"):
+                coverage = np.isfinite(factor_values).mean(axis=1)
+            details = {
+                "dates": dates,
+                "coverage": return_statistics.to_json_list(coverage, 4),
+                "histogram": factor_validation.factor_histogram(factor_values),
+            }
+            await progress(1.0)
+            return metrics, details
+
+        if validation_type == ValidationType.LAYERED_BACKTEST.value:
+            metrics, details = self._layered_backtest(
+                factor_values, self._prices(panel, config), config
+            )
+            details["dates"] = dates
+            await progress(1.0)
+            return metrics, details
+
+        if validation_type == ValidationType.SHARPE_RATIO.value:
+            metrics, details = self._sharpe_ratio(
+                factor_values, self._prices(panel, config), config
+            )
+            details["dates"] = dates
+            await progress(1.0)
+            return metrics, details
+
+        method = "spearman" if validation_type == ValidationType.IC_RANK_ANALYSIS.value else "pearson"
+        prices = self._prices(panel, config)
+        horizons = config["horizons"]
+        ranker = factor_validation.RowRanker(factor_values) if method == "spearman" else None
+        summaries: Dict[str, Dict[str, Any]] = {}
+        series: Dict[str, list] = {}
+        for i, horizon in enumerate(horizons):
+            ic = factor_validation.information_coefficient(
+                factor_values,
+                factor_validation.forward_returns(prices, horizon),
+                method,
+                config["min_instruments"],
+                ranker,
+            )
+            summaries[str(horizon)] = factor_validation.summarize_ic(ic)
+            series[str(horizon)] = return_statistics.to_json_list(ic)
+            await progress((i + 1) / len(horizons))
+
+        primary = str(horizons[0])
+        metrics = {
+            "method": method,
+            "primary_horizon": horizons[0],
+            **summaries[primary],
+            "horizons": summaries,
+        }
+        return metrics, {"dates": dates, "ic": series}
+
+    @staticmethod
+    def _layered_backtest(
+        factor_values: np.ndarray,
+        prices: np.ndarray,
+        config: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Run a layered backtest; returns (metrics, details without dates).
+
+        Groups are labelled "1" (lowest factor values) to "n_groups".
+        Details hold cumulative return series per group and for long-short,
+        and turnover per rebalance date.
+        """
+        n_groups = config["n_groups"]
+        result = factor_validation.layered_backtest(
+            factor_values, prices, n_groups, config["rebalance_period"], config["min_instruments"]
+        )
+        group_returns, turnover = result["group_returns"], result["turnover"]
+        labels = [str(g + 1) for g in range(n_groups)]
+
+        groups: Dict[str, Dict[str, Any]] = {}
+        for g, label in enumerate(labels):
+            mean_turnover = turnover[1:, g]
+            mean_turnover = mean_turnover[~np.isnan(mean_turnover)]
+            groups[label] = {
+                **return_statistics.summarize_returns(group_returns[:, g]),
+                "mean_turnover": float(mean_turnover.mean()) if mean_turnover.size else None,
+            }
+
+        # Rank correlation between group order and group return
+        annual = [groups[label]["annual_return"] for label in labels]
+        monotonicity = None
+        if None not in annual and len(set(annual)) > 1:
+            monotonicity = float(factor_validation.row_correlation(
+                np.arange(n_groups, dtype=float)[None, :],
+                factor_validation.rank_rows(np.array([annual])),
+                min_instruments=2,
+            )[0])
+
+        cumulative = return_statistics.cumulative_returns(group_returns)
+        metrics = {
+            "n_groups": n_groups,
+            "rebalance_period": config["rebalance_period"],
+            "long_short": return_statistics.summarize_returns(result["long_short"]),
+            "monotonicity": monotonicity,
+            "groups": groups,
+        }
+        details = {
+            "cumulative_returns": {
+                label: return_statistics.to_json_list(cumulative[:, g])
+                for g, label in enumerate(labels)
+            },
+            "long_short": return_statistics.to_json_list(
+                return_statistics.cumulative_returns(result["long_short"])
+            ),
+            "turnover": {
+                "rebalance_rows": result["rebalance_rows"].tolist(),
+                **{
+                    label: return_statistics.to_json_list(turnover[:, g], 4)
+                    for g, label in enumerate(labels)
+                },
+            },
+        }
+        return metrics, details
+
+    async def _authorize(self, factor_id: str, user_id: str) -> None:
+        """Check that the user owns the factor or the factor is public."""
+        factor = await self.custom_factor_repo.get(factor_id)
+        if not factor:
+            raise ResourceNotFoundError(f"Factor {factor_id} not found")
+        if factor.user_id != user_id and not factor.is_public:
+            raise AuthorizationError(
+                f"User {user_id} is not authorized to use factor {factor_id}"
+            )
+
+    @staticmethod
+    def _sharpe_ratio(
+        factor_values: np.ndarray,
+        prices: np.ndarray,
+        config: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Run a long-short Sharpe analysis; returns (metrics, details without dates).
+
+        The portfolio is long the top and short the bottom of n_groups
+        buckets, rebalanced every rebalance_period dates (see
+        _layered_backtest). Details hold its cumulative return and a
+        rolling Sharpe ratio over sharpe_window dates.
+        """
+        result = factor_validation.layered_backtest(
+            factor_values, prices, config["n_groups"], config["rebalance_period"],
+            config["min_instruments"]
+        )
+        long_short = result["long_short"]
+        summary = return_statistics.summarize_returns(long_short)
+        metrics = {
+            "sharpe": summary["sharpe"],
+            "n_groups": config["n_groups"],
+            "rebalance_period": config["rebalance_period"],
+            "sharpe_window": config["sharpe_window"],
+            "long_short": summary,
+            "long": return_statistics.summarize_returns(result["group_returns"][:, -1]),
+            "short": return_statistics.summarize_returns(result["group_returns"][:, 0]),
+        }
+        details = {
+            "long_short": return_statistics.to_json_list(
+                return_statistics.cumulative_returns(long_short)
+            ),
+            "rolling_sharpe": return_statistics.to_json_list(
+                return_statistics.rolling_sharpe(long_short, config["sharpe_window"]), 4
+            ),
+        }
+        return metrics, details
+
+    @staticmethod
+    def _prices(panel: DatasetPanel, config: Dict[str, Any]) -> np.ndarray:
+        """Price field used for returns."""
+        try:
+            return panel.field(config["price_field"])
+        except KeyError as e:
+            raise ValidationError(str(e.args[0])) from e
+
+    @staticmethod
+    def _window(
+        stored: MaterializedFactor,
+        panel: DatasetPanel,
+        config: Dict[str, Any]
+    ) -> Tuple[np.ndarray, DatasetPanel]:
+        """Restrict factor values and prices to the configured date range."""
+        start, end = config["start_date"], config["end_date"]
+        if start is None and end is None:
+            return stored.values, panel
+        return stored.slice(start, end).values, panel.slice(start, end)
+
+    @staticmethod
+    def _resolve_config(config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Merge config with defaults and validate it."""
+        resolved = {**DEFAULT_CONFIG, **(config or {})}
+        unknown = set(resolved) - set(DEFAULT_CONFIG)
+        if unknown:
+            raise ValidationError(f"Unknown config keys: {', '.join(sorted(unknown))}")
+
+        horizons = resolved["horizons"]
+        if (
+            not isinstance(horizons, (list, tuple)) or not horizons
+            or not all(isinstance(h, int) and 1 <= h <= MAX_HORIZON for h in horizons)
+        ):
+            raise ValidationError(f"horizons must be a non-empty list of integers in [1, {MAX_HORIZON}]")
+        resolved["horizons"] = list(dict.fromkeys(horizons))
+
+        if not isinstance(resolved["min_instruments"], int) or resolved["min_instruments"] < 2:
+            raise ValidationError("min_instruments must be an integer of at least 2")
+        if not isinstance(resolved["n_groups"], int) or not 2 <= resolved["n_groups"] <= MAX_GROUPS:
+            raise ValidationError(f"n_groups must be an integer in [2, {MAX_GROUPS}]")
+        if (
+            not isinstance(resolved["rebalance_period"], int)
+            or not 1 <= resolved["rebalance_period"] <= MAX_HORIZON
+        ):
+            raise ValidationError(f"rebalance_period must be an integer in [1, {MAX_HORIZON}]")
+        if (
+            not isinstance(resolved["sharpe_window"], int)
+            or not 2 <= resolved["sharpe_window"] <= MAX_HORIZON
+        ):
+            raise ValidationError(f"sharpe_window must be an integer in [2, {MAX_HORIZON}]")
+        return resolved
+
+    def _to_dict(self, validation) -> Dict[str, Any]:
+        """Convert validation model to dict."""
+        return {
+            "id": validation.id,
+            "factor_id": validation.factor_id,
+            "dataset_id": validation.dataset_id,
+            "validation_type": validation.validation_type,
+            "status": validation.status,
+            "progress_percentage": validation.progress_percentage,
+            "started_at": validation.started_at,
+            "completed_at": validation.completed_at,
+            "metrics": validation.metrics,
+            "details": validation.details,
+            "error_message": validation.error_message,
+            "created_at": validation.created_at,
+            "updated_at": validation.updated_at,
+        }
@@ -8,7 +8,8 @@ from typing import Dict, Any, List, Optional
 from loguru import logger
 
 from app.database.repositories.indicator_repository import IndicatorRepository
-from app.database.models.indicator import IndicatorCategory, IndicatorSource
+from app.database.models.indicator import IndicatorCategory, IndicatorComponent, IndicatorSource
+from app.database.usage_counter import UsageCounter
 
 
 class IndicatorService:
@@ -22,14 +23,21 @@ class IndicatorService:
     - Popular indicators
     """
 
-    def __init__(self, indicator_repo: IndicatorRepository):
+    def __init__(
+        self,
+        indicator_repo: IndicatorRepository,
+        usage_counter: Optional[UsageCounter] = None
+    ):
         """
         Initialize service with repository.
 
         Args:
             indicator_repo: IndicatorRepository instance
+            usage_counter: Write-behind usage counter (default: write
+                          each increment immediately)
         """
         self.indicator_repo = indicator_repo
+        self.usage_counter = usage_counter
 
     async def get_all_indicators(
         self,
@@ -170,6 +178,9 @@ class IndicatorService:
         """
         Increment indicator usage count.
 
+        With a usage counter the increment is buffered and written with the
+        next batch.
+
         Args:
             indicator_id: Indicator ID
 
@@ -177,6 +188,11 @@ class IndicatorService:
             Success status
         """
         try:
+            if self.usage_counter:
+                if not await self.indicator_repo.get(indicator_id):
+                    return False
+                await self.usage_counter.increment(IndicatorComponent, indicator_id)
+                return True
             result = await self.indicator_repo.increment_usage_count(indicator_id)
             return result is not None
         except Exception as e:
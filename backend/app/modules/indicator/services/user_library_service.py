@@ -7,7 +7,9 @@ Provides high-level operations for managing user's personal factor library.
 from typing import Dict, Any, List, Optional
 from loguru import logger
 
+from app.database.models.indicator import UserFactorLibrary
 from app.database.repositories.user_factor_library_repository import UserFactorLibraryRepository
+from app.database.usage_counter import UsageCounter
 
 
 class UserLibraryService:
@@ -22,14 +24,21 @@ class UserLibraryService:
     - Library statistics
     """
 
-    def __init__(self, user_library_repo: UserFactorLibraryRepository):
+    def __init__(
+        self,
+        user_library_repo: UserFactorLibraryRepository,
+        usage_counter: Optional[UsageCounter] = None
+    ):
         """
         Initialize service with repository.
 
         Args:
             user_library_repo: UserFactorLibraryRepository instance
+            usage_counter: Write-behind usage counter (default: write
+                          each increment immediately)
         """
         self.user_library_repo = user_library_repo
+        self.usage_counter = usage_counter
 
     async def get_user_library(
         self,
@@ -178,6 +187,9 @@ class UserLibraryService:
                 logger.warning(f"Library item not found for user {user_id}, factor {factor_id}")
                 return False
 
+            if self.usage_counter:
+                await self.usage_counter.increment(UserFactorLibrary, item.id)
+                return True
             result = await self.user_library_repo.increment_usage_count(item.id)
             return result
         except Exception as e:
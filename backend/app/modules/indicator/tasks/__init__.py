@@ -0,0 +1,11 @@
+"""
+Indicator Tasks Module
+
+Contains Celery tasks for factor validation, batch evaluation and analysis.
+"""
+
+from app.modules.indicator.tasks.batch_tasks import evaluate_factor_batch
+from app.modules.indicator.tasks.correlation_tasks import compute_factor_correlation
+from app.modules.indicator.tasks.validation_tasks import run_factor_validation
+
+__all__ = ["compute_factor_correlation", "evaluate_factor_batch", "run_factor_validation"]
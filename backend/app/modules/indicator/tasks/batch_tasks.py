@@ -0,0 +1,117 @@
+"""
+Factor Batch Evaluation Tasks
+
+Celery task evaluating many custom factors over one dataset in a single
+data pass. Status, progress and per-factor results are stored on the
+FACTOR_BATCH Task record.
+"""
+
+import asyncio
+from typing import Any, Dict
+
+from celery.utils.log import get_task_logger
+
+from app.celery_app import celery_app
+from app.database.repositories.custom_factor_repository import CustomFactorRepository
+from app.database.repositories.dataset import DatasetRepository
+from app.database.repositories.task_repository import TaskRepository
+from app.database.session import init_session_maker
+from app.modules.data_management.services.dataset_panel import PanelLoadError, load_dataset_panel
+from app.modules.indicator.services.custom_factor_service import CustomFactorService
+from app.modules.task_scheduling.services.task_service import TaskService
+
+logger = get_task_logger(__name__)
+
+
+# Initialize session maker on module import
+async_session_maker = init_session_maker()
+
+
+@celery_app.task(
+    bind=True,
+    name="app.modules.indicator.tasks.evaluate_factor_batch",
+    max_retries=3,
+    default_retry_delay=60,
+)
+def evaluate_factor_batch(self, task_id: str) -> Dict[str, Any]:
+    """
+    Evaluate and materialize a batch of factors asynchronously.
+
+    Task params: factor_ids, dataset_id and optional max_workers.
+
+    Args:
+        task_id: FACTOR_BATCH Task ID
+
+    Returns:
+        Dict with the run summary
+    """
+
+    async def _run():
+        """Inner async function for the batch evaluation."""
+        session = None
+        task_service = None
+        try:
+            session = async_session_maker()
+            task_service = TaskService(TaskRepository(session))
+
+            task = await task_service.start_task(task_id)
+            params = task.params
+
+            dataset = await DatasetRepository(session).get(params["dataset_id"])
+            if not dataset:
+                await task_service.fail_task(task_id, f"Dataset {params['dataset_id']} not found")
+                return {"success": False, "task_id": task_id, "error": "Dataset not found"}
+
+            await task_service.update_progress(task_id, 5.0, current_step="Loading dataset")
+            panel = load_dataset_panel(dataset.file_path)
+
+            async def report(done: int, total: int) -> None:
+                await task_service.update_progress(
+                    task_id,
+                    round(10.0 + 90.0 * done / max(total, 1), 1),
+                    current_step=f"Evaluated {done}/{total} factors",
+                )
+
+            service = CustomFactorService(CustomFactorRepository(session))
+            result = await service.evaluate_factors_batch(
+                params["factor_ids"],
+                panel,
+                dataset.id,
+                dataset.version,
+                user_id=task.created_by,
+                max_workers=params.get("max_workers"),
+                progress=report,
+            )
+
+            await task_service.complete_task(task_id, result)
+            return {"success": True, "task_id": task_id, "summary": result["summary"]}
+
+        except PanelLoadError as e:
+            # Unreadable dataset: retrying will not help
+            logger.error(f"Batch evaluation {task_id} failed: {e}")
+            await task_service.fail_task(task_id, str(e))
+            return {"success": False, "task_id": task_id, "error": str(e)}
+
+        except Exception as e:
+            logger.error(
+                f"Error in batch evaluation {task_id}: {str(e)}",
+                exc_info=True,
+            )
+            if "database" in str(e).lower() or "connection" in str(e).lower():
+                raise self.retry(exc=e)
+            if task_service:
+                await task_service.fail_task(task_id, str(e))
+            raise
+
+        finally:
+            if session:
+                await session.close()
+
+    # Run async function in event loop
+    try:
+        loop = asyncio.get_event_loop()
+    except RuntimeError:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+    return loop.run_until_complete(_run())
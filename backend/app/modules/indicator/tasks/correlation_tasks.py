@@ -0,0 +1,121 @@
+"""
+Factor Correlation Tasks
+
+Celery task computing the correlation matrix and redundancy clusters of a
+user's factor library. The full result is cached by
+FactorCorrelationService; the FACTOR_CORRELATION Task record keeps a summary.
+"""
+
+import asyncio
+from typing import Any, Dict
+
+from celery.utils.log import get_task_logger
+
+from app.celery_app import celery_app
+from app.database.repositories.custom_factor_repository import CustomFactorRepository
+from app.database.repositories.dataset import DatasetRepository
+from app.database.repositories.task_repository import TaskRepository
+from app.database.repositories.user_factor_library_repository import UserFactorLibraryRepository
+from app.database.session import init_session_maker
+from app.modules.data_management.services.dataset_panel import PanelLoadError
+from app.modules.indicator.exceptions import ResourceNotFoundError, ValidationError
+from app.modules.indicator.services.factor_correlation_service import FactorCorrelationService
+from app.modules.task_scheduling.services.task_service import TaskService
+
+logger = get_task_logger(__name__)
+
+
+# Initialize session maker on module import
+async_session_maker = init_session_maker()
+
+
+@celery_app.task(
+    bind=True,
+    name="app.modules.indicator.tasks.compute_factor_correlation",
+    max_retries=3,
+    default_retry_delay=60,
+)
+def compute_factor_correlation(self, task_id: str) -> Dict[str, Any]:
+    """
+    Compute the correlation analysis of a factor library asynchronously.
+
+    Task params: dataset_id, optional factor_ids and config. The library
+    owner is the task creator.
+
+    Args:
+        task_id: FACTOR_CORRELATION Task ID
+
+    Returns:
+        Dict with the analysis summary
+    """
+
+    async def _run():
+        """Inner async function for the correlation analysis."""
+        session = None
+        task_service = None
+        try:
+            session = async_session_maker()
+            task_service = TaskService(TaskRepository(session))
+
+            task = await task_service.start_task(task_id)
+            params = task.params
+
+            async def report(percentage: float) -> None:
+                step = "Evaluating factors" if percentage < 50 else "Computing correlations"
+                await task_service.update_progress(task_id, percentage, current_step=step)
+
+            service = FactorCorrelationService(
+                UserFactorLibraryRepository(session),
+                CustomFactorRepository(session),
+                DatasetRepository(session),
+            )
+            result = await service.compute_correlation(
+                task.created_by,
+                params["dataset_id"],
+                config=params.get("config"),
+                factor_ids=params.get("factor_ids"),
+                progress=report,
+            )
+
+            summary = {
+                "library_version": result["library_version"],
+                "dataset_version": result["dataset_version"],
+                "n_factors": len(result["factors"]),
+                "n_dates": result["n_dates"],
+                "threshold": result["threshold"],
+                "n_clusters": len(result["clusters"]),
+                "n_selected": len(result["selected"]),
+                "excluded": result["excluded"],
+            }
+            await task_service.complete_task(task_id, summary)
+            return {"success": True, "task_id": task_id, "summary": summary}
+
+        except (ValidationError, ResourceNotFoundError, PanelLoadError) as e:
+            # Invalid request or unreadable dataset: retrying will not help
+            logger.error(f"Correlation analysis {task_id} failed: {e}")
+            await task_service.fail_task(task_id, str(e))
+            return {"success": False, "task_id": task_id, "error": str(e)}
+
+        except Exception as e:
+            logger.error(
+                f"Error in correlation analysis {task_id}: {str(e)}",
+                exc_info=True,
+            )
+            if "database" in str(e).lower() or "connection" in str(e).lower():
+                raise self.retry(exc=e)
+            if task_service:
+                await task_service.fail_task(task_id, str(e))
+            raise
+
+        finally:
+            if session:
+                await session.close()
+
+    # Run async function in event loop
+    try:
+        loop = asyncio.get_event_loop()
+    except RuntimeError:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+    return loop.run_until_complete(_run())
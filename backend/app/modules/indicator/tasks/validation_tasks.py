@@ -0,0 +1,91 @@
+"""
+Factor Validation Tasks
+
+Celery tasks for running factor validations in the background.
+"""
+
+import asyncio
+from typing import Any, Dict
+
+from celery.utils.log import get_task_logger
+
+from app.celery_app import celery_app
+from app.database.repositories.custom_factor_repository import CustomFactorRepository
+from app.database.repositories.dataset import DatasetRepository
+from app.database.repositories.factor_validation_repository import FactorValidationResultRepository
+from app.database.session import init_session_maker
+from app.modules.data_management.services.dataset_panel import PanelLoadError
+from app.modules.indicator.exceptions import IndicatorServiceError
+from app.modules.indicator.services.factor_validation_service import FactorValidationService
+
+logger = get_task_logger(__name__)
+
+
+# Initialize session maker on module import
+async_session_maker = init_session_maker()
+
+
+def build_validation_service(session) -> FactorValidationService:
+    """Create a FactorValidationService bound to a session."""
+    return FactorValidationService(
+        validation_repo=FactorValidationResultRepository(session),
+        custom_factor_repo=CustomFactorRepository(session),
+        dataset_repo=DatasetRepository(session),
+    )
+
+
+@celery_app.task(
+    bind=True,
+    name="app.modules.indicator.tasks.run_factor_validation",
+    max_retries=3,
+    default_retry_delay=60,
+)
+def run_factor_validation(self, validation_id: str) -> Dict[str, Any]:
+    """
+    Run a factor validation asynchronously.
+
+    Status and progress are stored on the FactorValidationResult record.
+
+    Args:
+        validation_id: FactorValidationResult ID
+
+    Returns:
+        Dict with validation result
+    """
+
+    async def _run():
+        """Inner async function for the validation run."""
+        session = None
+        try:
+            session = async_session_maker()
+            service = build_validation_service(session)
+
+            result = await service.run_validation(validation_id)
+            return {"success": True, "validation_id": validation_id, **result}
+
+        except (IndicatorServiceError, PanelLoadError) as e:
+            # Missing records, bad formulas or unreadable data: retrying will not help
+            logger.error(f"Validation {validation_id} failed: {e}")
+            return {"success": False, "validation_id": validation_id, "error": str(e)}
+
+        except Exception as e:
+            logger.error(
+                f"Error running validation {validation_id}: {str(e)}",
+                exc_info=True,
+            )
+            if "database" in str(e).lower() or "connection" in str(e).lower():
+                raise self.retry(exc=e)
+            raise
+
+        finally:
+            if session:
+                await session.close()
+
+    # Run async function in event loop
+    try:
+        loop = asyncio.get_event_loop()
+    except RuntimeError:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+    return loop.run_until_complete(_run())
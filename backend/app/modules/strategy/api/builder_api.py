@@ -25,6 +25,7 @@ Endpoints:
 - GET    /api/v1/strategy-builder/code-history/{instance_id} - Get code history
 - POST   /api/v1/strategy-builder/quick-test - Execute quick test
 - GET    /api/v1/strategy-builder/quick-test/{test_id} - Get test result
+- WS     /api/v1/strategy-builder/quick-test/{test_id}/stream - Partial metrics of a running test
 - GET    /api/v1/strategy-builder/quick-test/history - Get test history
 - POST   /api/v1/strategy-builder/sessions - Create/update session
 - GET    /api/v1/strategy-builder/sessions/{session_id} - Get session
@@ -34,19 +35,27 @@ Author: Qlib-UI Strategy Builder Team
 Version: 1.0.0
 """
 
+import asyncio
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status, Path
+from fastapi import (
+    APIRouter, BackgroundTasks, Depends, HTTPException, Query, status, Path, WebSocket, WebSocketDisconnect
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from loguru import logger
 
-from app.database import get_db
+from app.database import db_manager, get_db
+from app.database.repositories.dataset import DatasetRepository
 from app.database.repositories.node_template_repository import NodeTemplateRepository
 from app.database.repositories.code_generation_repository import CodeGenerationRepository
 from app.database.repositories.quick_test_repository import QuickTestRepository
 from app.database.repositories.builder_session_repository import BuilderSessionRepository
+from app.database.repositories.strategy_instance import StrategyInstanceRepository
+from app.database.usage_counter import get_usage_counter
 from app.modules.strategy.services.builder_service import BuilderService
 from app.modules.strategy.services.code_generator_service import CodeGeneratorService
 from app.modules.strategy.services.builder_validation_service import ValidationService
+from app.modules.strategy.services.quick_test_service import QuickTestService
+from app.modules.backtest.websocket.connection_manager import manager
 from app.modules.strategy.exceptions import (
     ResourceNotFoundError,
     AuthorizationError,
@@ -98,7 +107,9 @@ async def get_builder_service(db: AsyncSession = Depends(get_db)) -> BuilderServ
     """
     node_template_repo = NodeTemplateRepository(db)
     session_repo = BuilderSessionRepository(db)
-    return BuilderService(db, node_template_repo, session_repo)
+    return BuilderService(
+        db, node_template_repo, session_repo, usage_counter=get_usage_counter()
+    )
 
 
 async def get_code_generator_service(db: AsyncSession = Depends(get_db)) -> CodeGeneratorService:
@@ -696,25 +707,31 @@ async def get_code_history(
 
     **Quick Test Features:**
     - Simplified configuration (preset date ranges, stock pools)
-    - Fast execution (< 30 seconds for typical cases)
+    - Runs the strategy's parameters.signal on a cached, pre-sliced panel
+    - Strict time budget (QUICK_TEST_TIME_BUDGET_SECONDS, default 2s); runs
+      that exceed it return metrics of the part simulated (partial=true)
     - Key performance metrics only
-    - Asynchronous execution with status polling
 
     **Execution Flow:**
     1. Create QuickTest record (status=PENDING)
-    2. Submit to background task queue
-    3. Return test_id immediately
+    2. Return test_id immediately; the test runs right after the response
+    3. Partial metrics are pushed to WS /quick-test/{test_id}/stream
     4. Client polls GET /quick-test/{test_id} for results
     """
 )
 async def execute_quick_test(
     request: QuickTestRequest,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db)
 ):
     """Execute quick backtest for strategy validation."""
     try:
         logger.info(f"Creating quick test for instance: {request.instance_id}")
 
+        instance = await StrategyInstanceRepository(db).get(request.instance_id)
+        if not instance:
+            raise ResourceNotFoundError(f"Strategy instance not found: {request.instance_id}")
+
         # Create QuickTest record
         quick_test_repo = QuickTestRepository(db)
 
@@ -723,6 +740,8 @@ async def execute_quick_test(
             "user_id": MOCK_USER_ID,
             "test_name": request.test_name,
             "test_config": request.test_config.model_dump(),
+            "logic_flow_snapshot": instance.logic_flow or {},
+            "parameters_snapshot": instance.parameters or {},
             "status": "PENDING",
         }
 
@@ -730,8 +749,7 @@ async def execute_quick_test(
         await db.commit()
         await db.refresh(quick_test)
 
-        # TODO: Submit to background task queue
-        # For now, just return pending status
+        background_tasks.add_task(_run_quick_test, quick_test.id)
 
         logger.info(f"Quick test created: {quick_test.id}")
 
@@ -751,6 +769,64 @@ async def execute_quick_test(
         )
 
 
+async def _run_quick_test(test_id: str) -> None:
+    """Run a quick test in its own session once the response has been sent."""
+    try:
+        async with db_manager.session() as session:
+            service = QuickTestService(
+                QuickTestRepository(session),
+                StrategyInstanceRepository(session),
+                DatasetRepository(session),
+            )
+            await service.run(test_id)
+    except Exception as e:
+        logger.error(f"Error running quick test {test_id}: {str(e)}")
+
+
+@router.websocket("/quick-test/{test_id}/stream")
+async def stream_quick_test(
+    websocket: WebSocket,
+    test_id: str
+):
+    """
+    Stream partial metrics of a running quick test.
+
+    The test is looked up in a short-lived session, so the connection does
+    not hold a pooled database connection while it streams.
+
+    Message Types:
+        - connected: Current status on connection
+        - metrics: Metrics of the simulated part (partial=true)
+        - completion: Final status; the result is read with GET /quick-test/{test_id}
+        - error: Unknown test
+    """
+    async with db_manager.session() as db:
+        quick_test = await QuickTestRepository(db).get(test_id)
+        status = quick_test.status if quick_test else None
+    if not quick_test:
+        await websocket.accept()
+        await manager.send_error(websocket, f"Quick test not found: {test_id}", "NOT_FOUND")
+        await websocket.close()
+        return
+
+    await manager.connect(websocket, test_id)
+    try:
+        await manager.send_personal_message(
+            {"type": "connected", "test_id": test_id, "status": status}, websocket
+        )
+        while True:
+            try:
+                data = await asyncio.wait_for(websocket.receive_text(), timeout=30.0)
+                if data == "ping":
+                    await manager.send_personal_message({"type": "pong"}, websocket)
+            except asyncio.TimeoutError:
+                await manager.send_personal_message({"type": "ping"}, websocket)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        await manager.disconnect(websocket, test_id)
+
+
 @router.get(
     "/quick-test/{test_id}",
     response_model=QuickTestResponse,
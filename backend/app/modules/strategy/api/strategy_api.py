@@ -34,6 +34,7 @@ from app.database.models.strategy import StrategyCategory, StrategyStatus
 from app.database.repositories.strategy_template import StrategyTemplateRepository
 from app.database.repositories.strategy_instance import StrategyInstanceRepository
 from app.database.repositories.template_rating import TemplateRatingRepository
+from app.database.usage_counter import get_usage_counter
 from app.modules.strategy.services.template_service import TemplateService
 from app.modules.strategy.services.instance_service import InstanceService
 from app.modules.strategy.services.validation_service import ValidationService
@@ -358,7 +359,7 @@ async def create_strategy(
 ):
     """Create strategy instance."""
     try:
-        service = InstanceService(db)
+        service = InstanceService(db, get_usage_counter())
 
         # Create from template or custom
         if strategy.template_id:
@@ -580,7 +581,7 @@ async def copy_strategy(
 ):
     """Duplicate strategy."""
     try:
-        service = InstanceService(db)
+        service = InstanceService(db, get_usage_counter())
 
         # Get new name from request
         new_name = data.get("name")
@@ -637,7 +638,7 @@ async def create_snapshot(
 ):
     """Create version snapshot."""
     try:
-        service = InstanceService(db)
+        service = InstanceService(db, get_usage_counter())
 
         # Create snapshot
         snapshot = await service.save_snapshot(
@@ -682,7 +683,7 @@ async def get_versions(
 ):
     """Get version history."""
     try:
-        service = InstanceService(db)
+        service = InstanceService(db, get_usage_counter())
 
         # Get versions
         versions = await service.get_versions(
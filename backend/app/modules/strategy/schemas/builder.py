@@ -687,13 +687,18 @@ class QuickTestConfig(BaseModel):
         le=10000000,
         description="Initial capital"
     )
+    dataset_id: Optional[str] = Field(
+        None,
+        description="Dataset to test on (default: the strategy's parameters.dataset_id)"
+    )
 
     model_config = ConfigDict(
         json_schema_extra={
             "example": {
                 "date_range": "3M",
                 "stock_pool": "CSI300",
-                "initial_capital": 100000.0
+                "initial_capital": 100000.0,
+                "dataset_id": "ds_a1b2c3d4"
             }
         }
     )
@@ -43,6 +43,7 @@ from app.database.models.strategy_builder import (
 )
 from app.database.repositories.node_template_repository import NodeTemplateRepository
 from app.database.repositories.builder_session_repository import BuilderSessionRepository
+from app.database.usage_counter import UsageCounter
 from app.modules.strategy.exceptions import (
     ResourceNotFoundError,
     AuthorizationError,
@@ -72,7 +73,8 @@ class BuilderService:
         db: AsyncSession,
         node_template_repo: NodeTemplateRepository,
         session_repo: BuilderSessionRepository,
-        indicator_service: Optional[Any] = None
+        indicator_service: Optional[Any] = None,
+        usage_counter: Optional[UsageCounter] = None
     ):
         """
         Initialize builder service with dependencies.
@@ -82,11 +84,14 @@ class BuilderService:
             node_template_repo: Repository for node templates
             session_repo: Repository for builder sessions
             indicator_service: Optional indicator service for factor integration
+            usage_counter: Write-behind usage counter (default: write each
+                          increment immediately)
         """
         self.db = db
         self.node_template_repo = node_template_repo
         self.session_repo = session_repo
         self.indicator_service = indicator_service
+        self.usage_counter = usage_counter
 
     # ==================== Node Template Operations ====================
 
@@ -342,7 +347,10 @@ class BuilderService:
         Args:
             template_id: Template ID
         """
-        await self.node_template_repo.increment_usage(template_id)
+        if self.usage_counter:
+            await self.usage_counter.increment(NodeTemplate, template_id)
+        else:
+            await self.node_template_repo.increment_usage(template_id)
 
         logger.debug(f"Incremented usage count for template: {template_id}")
 
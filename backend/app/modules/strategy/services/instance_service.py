@@ -14,9 +14,10 @@ from copy import deepcopy
 from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.models.strategy import StrategyInstance, StrategyStatus
+from app.database.models.strategy import StrategyInstance, StrategyStatus, StrategyTemplate
 from app.database.repositories.strategy_instance import StrategyInstanceRepository
 from app.database.repositories.strategy_template import StrategyTemplateRepository
+from app.database.usage_counter import UsageCounter
 
 
 class InstanceService:
@@ -24,14 +25,17 @@ class InstanceService:
 
     MAX_VERSIONS = 5  # Maximum number of version snapshots to retain
 
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, usage_counter: Optional[UsageCounter] = None):
         """
         Initialize service with database session
 
         Args:
             db: AsyncSession for database operations
+            usage_counter: Write-behind usage counter for template usage
+                          (default: write each increment immediately)
         """
         self.db = db
+        self.usage_counter = usage_counter
         self.instance_repo = StrategyInstanceRepository(db)
         self.template_repo = StrategyTemplateRepository(db)
 
@@ -106,7 +110,10 @@ class InstanceService:
         instance = await self.instance_repo.create(instance_data, user_id=user_id)
 
         # Increment template usage count
-        await self.template_repo.increment_usage_count(template_id)
+        if self.usage_counter:
+            await self.usage_counter.increment(StrategyTemplate, template_id)
+        else:
+            await self.template_repo.increment_usage_count(template_id)
 
         logger.info(
             f"Created strategy instance '{name}' from template {template_id} "
@@ -0,0 +1,666 @@
+"""
+QuickTestService
+
+Low-latency backtests for interactive strategy editing.
+
+A quick test runs the strategy instance's signal (``parameters["signal"]``,
+configured as for full backtests) over the last ``date_range`` of a dataset
+for a stock pool, with the vectorized backtest engine:
+
+- Panels are pre-sliced to the window (plus WARMUP_ROWS of history for
+  signal lookbacks) and the pool's instruments, and kept in an LRU cache
+  keyed by (dataset, version, date range, pool), so repeated tests while
+  editing skip the file load.
+- The test has a wall-clock budget (QUICK_TEST_TIME_BUDGET_SECONDS,
+  counted from the start of the test). A simulation that exceeds it stops
+  at the next engine checkpoint and is reported as partial, with the share
+  of the window covered; a test whose panel load or signal evaluation
+  alone exceeds it fails, as nothing of the window was simulated.
+- Metrics of the simulated prefix are pushed to WebSocket clients of the
+  test (see builder_api) at engine checkpoints while the simulation runs.
+
+Stock pools are approximated by liquidity rank (mean daily traded value,
+close x volume, over the window) since datasets carry no index membership:
+CSI300 is the 300 most traded instruments, CSI500 the next 500, CSI800
+both and ALL_A_SHARES every instrument.
+
+Tests left PENDING or RUNNING by a crashed worker are failed by ``sweep_timeouts``,
+which the application runs periodically (see ``run_timeout_sweeper``).
+
+Example:
+    >>> service = QuickTestService(quick_test_repo, strategy_repo, dataset_repo)
+    >>> quick_test = await service.run(test_id)
+    >>> quick_test.metrics_summary["sharpe_ratio"]
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, AsyncContextManager, Callable, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.models.strategy_builder import QuickTest
+from app.database.repositories.custom_factor_repository import CustomFactorRepository
+from app.database.repositories.dataset import DatasetRepository
+from app.database.repositories.quick_test_repository import QuickTestRepository
+from app.database.repositories.strategy_instance import StrategyInstanceRepository
+from app.modules.backtest.exceptions import InvalidConfigError
+from app.modules.backtest.services import backtest_engine
+from app.modules.backtest.services.execution_service import validate_signal
+from app.modules.common.utils.return_statistics import summarize_returns, to_json_list
+from app.modules.data_management.services.dataset_panel import DatasetPanel, PanelLoadError, load_dataset_panel
+from app.modules.indicator.exceptions import FactorEvaluationError, FormulaCompileError
+from app.modules.indicator.services.factor_compiler import FactorPlan, compile_formula
+from app.modules.strategy.exceptions import QuickTestError, ResourceNotFoundError
+
+
+# Trading dates per QuickTestConfig.date_range
+DATE_RANGE_ROWS: Dict[str, int] = {"1M": 21, "3M": 63, "6M": 126, "1Y": 252}
+
+# Liquidity ranks [first, last) per QuickTestConfig.stock_pool (None: all)
+STOCK_POOL_RANKS: Dict[str, Tuple[int, Optional[int]]] = {
+    "CSI300": (0, 300),
+    "CSI500": (300, 800),
+    "CSI800": (0, 800),
+    "ALL_A_SHARES": (0, None),
+}
+
+# Dates of history kept before the window for signal lookbacks; longer
+# lookbacks leave the signal undefined (no positions) at the window start
+WARMUP_ROWS = 120
+
+# Commission of quick tests (full backtests take it from their config)
+QUICK_TEST_COMMISSION = 0.0003
+
+# Minimum seconds between partial metric updates
+PARTIAL_UPDATE_SECONDS = 0.2
+
+# Errors that fail a quick test rather than the request
+QUICK_TEST_ERRORS = (
+    QuickTestError, InvalidConfigError, PanelLoadError, FormulaCompileError, FactorEvaluationError,
+)
+
+# Partial metrics callback: (metrics of the simulated prefix) -> None
+PartialMetricsCallback = Callable[[Dict[str, Any]], Any]
+
+
+@dataclass
+class QuickTestPanel:
+    """
+    Dataset panel pre-sliced for quick tests.
+
+    Attributes:
+        panel: Panel of the pool's instruments over the window and its warm-up
+        window_start: Row of the panel where the test window starts
+    """
+
+    panel: DatasetPanel
+    window_start: int
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the panel's field arrays."""
+        return sum(values.nbytes for values in self.panel.fields.values())
+
+
+def pool_columns(panel: DatasetPanel, stock_pool: str, rows: slice) -> np.ndarray:
+    """
+    Columns of a stock pool's instruments, ranked by mean traded value.
+
+    Args:
+        panel: Dataset panel
+        stock_pool: Key of STOCK_POOL_RANKS
+        rows: Rows over which liquidity is measured
+
+    Returns:
+        Sorted column indices
+
+    Raises:
+        QuickTestError: If the pool is unknown
+    """
+    if stock_pool not in STOCK_POOL_RANKS:
+        raise QuickTestError(f"Unknown stock pool: {stock_pool}")
+    first, last = STOCK_POOL_RANKS[stock_pool]
+    n_instruments = len(panel.instruments)
+    if first == 0 and (last is None or last >= n_instruments):
+        return np.arange(n_instruments)
+
+    traded = panel.field("close")[rows]
+    if "volume" in panel.fields:
+        traded = traded * panel.field("volume")[rows]
+    with np.errstate(invalid="ignore"):
+        liquidity = np.nanmean(np.where(np.isfinite(traded), traded, np.nan), axis=0)
+    # Most liquid first; instruments never traded in the window rank last
+    order = np.argsort(-np.nan_to_num(liquidity, nan=-np.inf), kind="stable")
+    return np.sort(order[first:last])
+
+
+def slice_quick_test_panel(
+    panel: DatasetPanel,
+    date_range: str,
+    stock_pool: str,
+    warmup: int = WARMUP_ROWS
+) -> QuickTestPanel:
+    """
+    Cut a panel down to the last ``date_range`` dates and a stock pool.
+
+    The arrays are copied so a cached slice does not keep the whole dataset
+    in memory.
+
+    Args:
+        panel: Full dataset panel
+        date_range: Key of DATE_RANGE_ROWS
+        stock_pool: Key of STOCK_POOL_RANKS
+        warmup: Dates of history kept before the window
+
+    Returns:
+        QuickTestPanel
+
+    Raises:
+        QuickTestError: If the range or pool is unknown or the dataset is empty
+    """
+    if date_range not in DATE_RANGE_ROWS:
+        raise QuickTestError(f"Unknown date range: {date_range}")
+    n_dates = len(panel.dates)
+    if n_dates < 2:
+        raise QuickTestError("Dataset has fewer than 2 dates")
+
+    window = min(DATE_RANGE_ROWS[date_range], n_dates)
+    first = max(0, n_dates - window - warmup)
+    window_rows = slice(n_dates - window, n_dates)
+    try:
+        columns = pool_columns(panel, stock_pool, window_rows)
+    except KeyError as e:
+        raise QuickTestError(str(e.args[0])) from e
+
+    sliced = DatasetPanel(
+        dates=panel.dates[first:].copy(),
+        instruments=panel.instruments[columns],
+        fields={
+            name: np.ascontiguousarray(values[first:, columns])
+            for name, values in panel.fields.items()
+        },
+    )
+    return QuickTestPanel(panel=sliced, window_start=n_dates - window - first)
+
+
+class QuickTestPanelCache:
+    """
+    Thread-safe LRU cache of pre-sliced quick test panels with a memory budget.
+
+    Keys are (dataset id, dataset version, date range, stock pool); a new
+    dataset version is a new key, so stale slices age out via LRU.
+
+    Example:
+        cache = QuickTestPanelCache(max_bytes=256 * 1024 * 1024)
+        sliced = cache.get_or_load(key, lambda: slice_quick_test_panel(panel, "3M", "CSI300"))
+    """
+
+    def __init__(self, max_bytes: int):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Memory budget for cached panels
+        """
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, QuickTestPanel]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(dataset_id: str, version: str, date_range: str, stock_pool: str) -> Tuple[str, str, str, str]:
+        """Cache key of a dataset slice."""
+        return (dataset_id, version, date_range, stock_pool)
+
+    def get(self, key: Hashable) -> Optional[QuickTestPanel]:
+        """
+        Look up a panel and mark it as recently used.
+
+        Returns:
+            The panel, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: Hashable, entry: QuickTestPanel) -> bool:
+        """
+        Store a panel, evicting least recently used panels if needed.
+
+        Returns:
+            True if stored, False if the panel alone exceeds the budget
+        """
+        nbytes = entry.nbytes
+        if nbytes > self.max_bytes:
+            return False
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes
+            while self._entries and self._bytes + nbytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self.evictions += 1
+            self._entries[key] = entry
+            self._bytes += nbytes
+        return True
+
+    def get_or_load(self, key: Hashable, load: Callable[[], QuickTestPanel]) -> Tuple[QuickTestPanel, bool]:
+        """
+        Return the cached panel or load, store and return it.
+
+        Args:
+            key: Cache key
+            load: Zero-argument function producing the panel
+
+        Returns:
+            (panel, whether it was cached)
+        """
+        cached = self.get(key)
+        if cached is not None:
+            return cached, True
+        entry = load()
+        self.put(key, entry)
+        return entry, False
+
+    def invalidate_dataset(self, dataset_id: str) -> int:
+        """
+        Drop all panels of a dataset, whatever their version.
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            stale = [key for key in self._entries if key[0] == dataset_id]
+            for key in stale:
+                self._bytes -= self._entries.pop(key).nbytes
+        return len(stale)
+
+    def clear(self) -> None:
+        """Remove all entries and reset statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Cache statistics.
+
+        Returns:
+            Dictionary with entries, bytes, max_bytes, hits, misses,
+            hit_ratio and evictions
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+            }
+
+
+@lru_cache()
+def get_quick_test_cache() -> QuickTestPanelCache:
+    """Process-wide quick test panel cache sized by QUICK_TEST_CACHE_MAX_MB."""
+    from app.config import settings
+    return QuickTestPanelCache(max_bytes=settings.QUICK_TEST_CACHE_MAX_MB * 1024 * 1024)
+
+
+def equity_metrics(equity: np.ndarray, initial_capital: float) -> Dict[str, float]:
+    """Headline metrics of an equity curve (max_drawdown as a positive fraction)."""
+    previous = np.concatenate(([initial_capital], equity[:-1]))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        returns = np.where(previous > 0, equity / previous - 1.0, np.nan)
+    summary = summarize_returns(returns)
+    return {
+        "total_return": summary["total_return"] or 0.0,
+        "annual_return": summary["annual_return"] or 0.0,
+        "sharpe_ratio": summary["sharpe"] or 0.0,
+        "max_drawdown": -(summary["max_drawdown"] or 0.0),
+    }
+
+
+def check_deadline(deadline: float, stage: str) -> None:
+    """
+    Fail a quick test whose budget ran out before its simulation started.
+
+    Raises:
+        QuickTestError: If ``time.perf_counter()`` is past the deadline
+    """
+    if time.perf_counter() >= deadline:
+        raise QuickTestError(f"Quick test time budget exceeded while {stage}")
+
+
+def simulate_quick_test(
+    sliced: QuickTestPanel,
+    spec: Dict[str, Any],
+    plan: FactorPlan,
+    initial_capital: float,
+    deadline: float,
+    on_partial: Optional[PartialMetricsCallback] = None
+) -> Dict[str, Any]:
+    """
+    Evaluate a signal and simulate it over a quick test window.
+
+    Args:
+        sliced: Pre-sliced panel
+        spec: Validated signal configuration (see validate_signal)
+        plan: Compiled signal formula
+        initial_capital: Starting cash
+        deadline: ``time.perf_counter()`` value after which the simulation
+            stops at its next checkpoint
+        on_partial: Called with the metrics of the simulated prefix at
+            checkpoints (at most every PARTIAL_UPDATE_SECONDS)
+
+    Returns:
+        Dict with ``run`` (BacktestRun, truncated if the budget ran out),
+        ``dates`` (of the window), ``coverage`` (share of the window
+        simulated) and ``signal_seconds``
+
+    Raises:
+        QuickTestError: If the deadline passed while evaluating the signal
+    """
+    panel, start = sliced.panel, sliced.window_start
+    started = time.perf_counter()
+    signal = plan.evaluate(panel)["factor"]
+    signal_seconds = time.perf_counter() - started
+    check_deadline(deadline, "evaluating the signal")
+    try:
+        prices = panel.field(spec["price_field"])[start:]
+    except KeyError as e:
+        raise InvalidConfigError(str(e.args[0])) from e
+    schedule = backtest_engine.target_weights(
+        signal[start:], prices, spec["mode"], spec["top_k"],
+        bool(spec["long_short"]), spec["rebalance_period"]
+    )
+
+    last_update = [0.0]
+    n_dates = len(prices)
+
+    def checkpoint(simulated: int, equity: np.ndarray) -> bool:
+        now = time.perf_counter()
+        if on_partial and now - last_update[0] >= PARTIAL_UPDATE_SECONDS and simulated < n_dates:
+            last_update[0] = now
+            on_partial({
+                **equity_metrics(equity, initial_capital),
+                "coverage": simulated / n_dates,
+                "end_date": str(panel.dates[start + simulated - 1])[:10],
+            })
+        return now < deadline
+
+    run = backtest_engine.simulate(
+        prices, schedule, initial_capital, QUICK_TEST_COMMISSION, checkpoint=checkpoint
+    )
+    return {
+        "run": run,
+        "dates": panel.dates[start:start + len(run.equity)],
+        "coverage": len(run.equity) / n_dates,
+        "signal_seconds": signal_seconds,
+    }
+
+
+class QuickTestService:
+    """
+    Runs quick tests and fails the ones that got stuck.
+
+    Example:
+        >>> service = QuickTestService(quick_test_repo, strategy_repo, dataset_repo)
+        >>> await service.run(test_id)
+        >>> await service.sweep_timeouts()
+    """
+
+    def __init__(
+        self,
+        repository: QuickTestRepository,
+        strategy_repo: StrategyInstanceRepository,
+        dataset_repo: DatasetRepository,
+        custom_factor_repo: Optional[CustomFactorRepository] = None,
+        cache: Optional[QuickTestPanelCache] = None,
+        connection_manager: Optional[Any] = None,
+        budget_seconds: Optional[float] = None
+    ):
+        """
+        Initialize the service.
+
+        Args:
+            repository: Quick test repository
+            strategy_repo: Strategy instance repository (signal configuration)
+            dataset_repo: Dataset repository
+            custom_factor_repo: Custom factor repository (for factor_id signals)
+            cache: Panel cache (default: process-wide)
+            connection_manager: WebSocket manager receiving partial metrics
+                (default: the backtest connection manager)
+            budget_seconds: Time budget (default: QUICK_TEST_TIME_BUDGET_SECONDS)
+        """
+        self.repository = repository
+        self.strategy_repo = strategy_repo
+        self.dataset_repo = dataset_repo
+        self.custom_factor_repo = custom_factor_repo or CustomFactorRepository(repository.session)
+        self._cache = cache
+        if connection_manager is None:
+            from app.modules.backtest.websocket.connection_manager import manager as connection_manager
+        self.connection_manager = connection_manager
+        if budget_seconds is None:
+            from app.config import settings
+            budget_seconds = settings.QUICK_TEST_TIME_BUDGET_SECONDS
+        self.budget_seconds = budget_seconds
+
+    @property
+    def cache(self) -> QuickTestPanelCache:
+        """Cache of pre-sliced panels."""
+        if self._cache is None:
+            self._cache = get_quick_test_cache()
+        return self._cache
+
+    async def run(self, test_id: str) -> QuickTest:
+        """
+        Run a PENDING quick test and store its result.
+
+        Configuration errors (no signal, no dataset, invalid formula) fail
+        the test with an error message rather than raising.
+
+        Args:
+            test_id: Quick test ID
+
+        Returns:
+            The updated quick test (unchanged if it was not PENDING)
+
+        Raises:
+            ResourceNotFoundError: If the test does not exist
+        """
+        quick_test = await self.repository.get(test_id)
+        if not quick_test:
+            raise ResourceNotFoundError(f"Quick test not found: {test_id}")
+        if quick_test.status != "PENDING":
+            return quick_test
+
+        started = time.perf_counter()
+        await self.repository.update_status(test_id, "RUNNING")
+        try:
+            result = await self._execute(quick_test, started)
+        except QUICK_TEST_ERRORS as e:
+            logger.warning(f"Quick test {test_id} failed: {e}")
+            updated = await self._finish(test_id, started, {"status": "FAILED", "error_message": str(e)})
+        except Exception as e:
+            logger.error(f"Quick test {test_id} failed: {e}")
+            await self._finish(test_id, started, {"status": "FAILED", "error_message": str(e)})
+            raise
+        else:
+            updated = await self._finish(test_id, started, {"status": "COMPLETED", **result})
+            logger.info(
+                f"Quick test {test_id} completed in {updated.execution_time:.3f}s "
+                f"(coverage {result['test_result']['coverage']:.0%})"
+            )
+        await self.connection_manager.send_completion(test_id, updated.status)
+        return updated
+
+    async def sweep_timeouts(self, timeout_minutes: Optional[int] = None, limit: int = 100) -> int:
+        """
+        Fail quick tests that have been PENDING or RUNNING longer than the timeout.
+
+        PENDING tests are included: a test whose background run was lost
+        (e.g. the worker restarted before it started) would otherwise never
+        finish.
+
+        Args:
+            timeout_minutes: Timeout (default: QUICK_TEST_TIMEOUT_MINUTES)
+            limit: Maximum number of tests failed per call
+
+        Returns:
+            Number of tests failed
+        """
+        if timeout_minutes is None:
+            from app.config import settings
+            timeout_minutes = settings.QUICK_TEST_TIMEOUT_MINUTES
+        stuck = await self.repository.find_timeout_tests(
+            timeout_minutes=timeout_minutes, limit=limit, statuses=("PENDING", "RUNNING")
+        )
+        now = datetime.utcnow()
+        for quick_test in stuck:
+            await self.repository.update_result(quick_test.id, {
+                "status": "FAILED",
+                "error_message": f"Quick test timed out after {timeout_minutes} minutes",
+                "completed_at": now,
+            }, commit=False)
+        if stuck:
+            await self.repository.session.commit()
+            logger.warning(f"Failed {len(stuck)} timed out quick tests")
+        return len(stuck)
+
+    async def _execute(self, quick_test: QuickTest, started: float) -> Dict[str, Any]:
+        """Resolve the signal and dataset, simulate and build the stored result."""
+        config = quick_test.test_config or {}
+        instance = await self.strategy_repo.get(quick_test.instance_id)
+        if not instance:
+            raise QuickTestError(f"Strategy instance {quick_test.instance_id} not found")
+        parameters = instance.parameters or {}
+        spec = parameters.get("signal")
+        if not isinstance(spec, dict):
+            raise QuickTestError("Strategy has no parameters.signal to test")
+        spec = validate_signal(spec)
+        plan = await self._signal_plan(spec, quick_test.user_id)
+
+        dataset_id = config.get("dataset_id") or parameters.get("dataset_id")
+        if not dataset_id:
+            raise QuickTestError("No dataset: set test_config.dataset_id or the strategy's parameters.dataset_id")
+        dataset = await self.dataset_repo.get(dataset_id)
+        if not dataset:
+            raise QuickTestError(f"Dataset {dataset_id} not found")
+
+        date_range = config.get("date_range", "3M")
+        stock_pool = config.get("stock_pool", "CSI300")
+        key = self.cache.make_key(dataset.id, dataset.version, date_range, stock_pool)
+        sliced, cached = await asyncio.to_thread(
+            self.cache.get_or_load,
+            key,
+            lambda: slice_quick_test_panel(load_dataset_panel(dataset.file_path), date_range, stock_pool),
+        )
+        panel_seconds = time.perf_counter() - started
+        deadline = started + self.budget_seconds
+        check_deadline(deadline, "loading the dataset")
+
+        loop = asyncio.get_running_loop()
+        test_id = quick_test.id
+
+        def on_partial(metrics: Dict[str, Any]) -> None:
+            asyncio.run_coroutine_threadsafe(
+                self.connection_manager.send_metrics_update(test_id, {**metrics, "partial": True}), loop
+            )
+
+        initial_capital = float(config.get("initial_capital", 100000.0))
+        outcome = await asyncio.to_thread(
+            simulate_quick_test, sliced, spec, plan, initial_capital,
+            deadline, on_partial,
+        )
+        run = outcome["run"]
+        metrics = {
+            **equity_metrics(run.equity, initial_capital),
+            "win_rate": backtest_engine.trade_statistics(run.trades)["win_rate"],
+        }
+        return {
+            "metrics_summary": metrics,
+            "test_result": {
+                "metrics": metrics,
+                "partial": outcome["coverage"] < 1.0,
+                "coverage": outcome["coverage"],
+                "dates": [str(d)[:10] for d in outcome["dates"]],
+                "equity_curve": to_json_list(run.equity, 2),
+                "trades": backtest_engine.trade_statistics(run.trades),
+                "instruments": len(sliced.panel.instruments),
+                "dataset_id": dataset.id,
+                "panel_cached": cached,
+                "panel_seconds": panel_seconds,
+                "signal_seconds": outcome["signal_seconds"],
+            },
+        }
+
+    async def _signal_plan(self, spec: Dict[str, Any], user_id: str) -> FactorPlan:
+        """
+        Compiled formula of a signal configuration.
+
+        A factor_id signal may only use a factor the test's user owns or
+        that is public, as in CustomFactorService.evaluate_factor.
+        """
+        formula, language = spec["formula"], spec["formula_language"]
+        if spec["factor_id"]:
+            factor = await self.custom_factor_repo.get(spec["factor_id"])
+            if factor and factor.user_id != user_id and not factor.is_public:
+                logger.warning(f"Unauthorized quick test use of factor {factor.id} by user {user_id}")
+                factor = None
+            if not factor:
+                raise QuickTestError(f"Factor {spec['factor_id']} not found")
+            formula, language = factor.formula, factor.formula_language
+        return compile_formula(formula, language)
+
+    async def _finish(self, test_id: str, started: float, fields: Dict[str, Any]) -> QuickTest:
+        """Store the final status and execution time."""
+        return await self.repository.update_result(test_id, {
+            **fields,
+            "execution_time": time.perf_counter() - started,
+            "completed_at": datetime.utcnow(),
+        })
+
+
+async def run_timeout_sweeper(
+    session_factory: Callable[[], AsyncContextManager[AsyncSession]],
+    interval_seconds: float = 60.0
+) -> None:
+    """
+    Fail timed out quick tests every interval_seconds until cancelled.
+
+    Args:
+        session_factory: Callable returning an async session context manager
+        interval_seconds: Seconds between sweeps
+    """
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            async with session_factory() as session:
+                service = QuickTestService(
+                    QuickTestRepository(session), StrategyInstanceRepository(session), DatasetRepository(session)
+                )
+                await service.sweep_timeouts()
+        except Exception as e:
+            logger.error(f"Quick test timeout sweep failed: {e}")
@@ -42,7 +42,11 @@ class TaskService:
         TaskType.DATA_IMPORT.value: {"file_path"},
         TaskType.DATA_PREPROCESSING.value: {"dataset_id"},
         TaskType.FACTOR_BACKTEST.value: {"factor_id", "dataset_id"},
+        TaskType.FACTOR_BATCH.value: {"factor_ids", "dataset_id"},
+        TaskType.FACTOR_CORRELATION.value: {"dataset_id"},
         TaskType.CUSTOM_CODE.value: {"code"},
+        TaskType.REPORT_EXPORT.value: {"result_id", "format"},
+        TaskType.WALK_FORWARD.value: {"result_id"},
     }
 
     # Valid status transitions
@@ -355,7 +359,8 @@ class TaskService:
         task_id: str,
         progress: float,
         current_step: Optional[str] = None,
-        eta: Optional[int] = None
+        eta: Optional[int] = None,
+        partial_result: Optional[Dict[str, Any]] = None
     ) -> Task:
         """
         Update task progress.
@@ -365,6 +370,8 @@ class TaskService:
             progress: Progress percentage (0-100)
             current_step: Current step description
             eta: Estimated time remaining (seconds)
+            partial_result: Intermediate result stored while the task runs
+                (replaced by complete_task)
 
         Returns:
             Updated Task instance
@@ -385,6 +392,9 @@ class TaskService:
         if eta is not None:
             update_data["eta"] = eta
 
+        if partial_result is not None:
+            update_data["result"] = partial_result
+
         updated_task = await self.repository.update_task(task_id, update_data)
 
         logger.debug(
@@ -0,0 +1,184 @@
+"""
+Indicator Benchmark Script
+
+Compares the vectorized panel indicators against calling IndicatorService
+once per instrument on a synthetic (dates x instruments) universe, and
+reports the throughput of each compute backend per series length.
+
+Usage:
+    python scripts/benchmark_indicators.py --dates 2500 --instruments 3000
+    python scripts/benchmark_indicators.py --backends --lengths 250 2500 25000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.modules.data_management.services.indicator_backends import available_backends  # noqa: E402
+from app.modules.data_management.services.indicator_service import IndicatorService  # noqa: E402
+
+
+def make_universe(n_dates: int, n_instruments: int, seed: int = 42) -> dict:
+    """Create synthetic OHLC panels with staggered listings and delistings."""
+    rng = np.random.default_rng(seed)
+    close = 20 * np.exp(np.cumsum(rng.normal(0, 0.02, (n_dates, n_instruments)), axis=0))
+    high = close * (1 + np.abs(rng.normal(0, 0.01, close.shape)))
+    low = close * (1 - np.abs(rng.normal(0, 0.01, close.shape)))
+
+    listing = rng.integers(0, n_dates // 4, n_instruments)
+    delisting = n_dates - rng.integers(0, n_dates // 4, n_instruments)
+    rows = np.arange(n_dates)[:, None]
+    unlisted = (rows < listing) | (rows >= delisting)
+    for panel in (close, high, low):
+        panel[unlisted] = np.nan
+
+    return {"high": high, "low": low, "close": close}
+
+
+def run_per_instrument(service: IndicatorService, universe: dict, indicator: str) -> None:
+    """Baseline: one IndicatorService call per instrument."""
+    close = universe["close"]
+    for column in range(close.shape[1]):
+        valid = ~np.isnan(close[:, column])
+        frame = pd.DataFrame({name: panel[valid, column] for name, panel in universe.items()})
+        if indicator == "MACD":
+            service.calculate_macd(frame)
+        elif indicator == "RSI":
+            service.calculate_rsi(frame)
+        elif indicator == "KDJ":
+            service.calculate_kdj(frame)
+        elif indicator == "MA":
+            service.calculate_ma(frame)
+
+
+def run_panel(service: IndicatorService, universe: dict, indicator: str) -> None:
+    """Vectorized: one call for the whole universe."""
+    if indicator == "MACD":
+        service.calculate_panel_macd(universe["close"])
+    elif indicator == "RSI":
+        service.calculate_panel_rsi(universe["close"])
+    elif indicator == "KDJ":
+        service.calculate_panel_kdj(universe["high"], universe["low"], universe["close"])
+    elif indicator == "MA":
+        service.calculate_panel_ma(universe["close"])
+
+
+def timed(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def benchmark_panel(n_dates: int, n_instruments: int, indicators: list) -> None:
+    """Print per-instrument loop vs panel timings."""
+    universe = make_universe(n_dates, n_instruments)
+    service = IndicatorService()
+
+    # Keep per-call debug logging out of the measurement
+    logger.remove()
+
+    print(f"Universe: {n_dates} dates x {n_instruments} instruments")
+    print(f"{'indicator':<10}{'loop (s)':>12}{'panel (s)':>12}{'speedup':>10}")
+    for indicator in indicators:
+        loop_time = timed(run_per_instrument, service, universe, indicator)
+        panel_time = timed(run_panel, service, universe, indicator)
+        print(
+            f"{indicator:<10}{loop_time:>12.3f}{panel_time:>12.3f}"
+            f"{loop_time / panel_time:>9.1f}x"
+        )
+
+
+def benchmark_backends(
+    lengths: list,
+    n_instruments: int,
+    indicators: list,
+    repeats: int = 3
+) -> None:
+    """
+    Print throughput (values per second) for each backend and series length.
+
+    Each length is measured on a single series and on a panel with
+    ``n_instruments`` columns; the best of ``repeats`` runs is reported.
+    """
+    logger.remove()
+
+    services = {name: IndicatorService(backend=name) for name in available_backends()}
+
+    print(f"{'indicator':<10}{'shape':>14}" + "".join(f"{name:>12}" for name in services))
+    for n_dates in lengths:
+        universe = make_universe(n_dates, n_instruments)
+        series = {name: panel[:, 0].copy() for name, panel in universe.items()}
+        series["close"][np.isnan(series["close"])] = 20.0
+        frame = pd.DataFrame(series).ffill().bfill()
+
+        cases = [
+            (f"{n_dates}x1", lambda service, indicator: run_series(service, frame, indicator), n_dates),
+            (
+                f"{n_dates}x{n_instruments}",
+                lambda service, indicator: run_panel(service, universe, indicator),
+                n_dates * n_instruments,
+            ),
+        ]
+        for indicator in indicators:
+            for shape, run, n_values in cases:
+                row = f"{indicator:<10}{shape:>14}"
+                for service in services.values():
+                    best = min(timed(run, service, indicator) for _ in range(repeats))
+                    row += f"{n_values / best / 1e6:>11.2f}M"
+                print(row)
+
+    print("Throughput in million values per second (higher is better)")
+
+
+def run_series(service: IndicatorService, frame: pd.DataFrame, indicator: str) -> None:
+    """One IndicatorService call on a single series."""
+    if indicator == "MACD":
+        service.calculate_macd(frame)
+    elif indicator == "RSI":
+        service.calculate_rsi(frame)
+    elif indicator == "KDJ":
+        service.calculate_kdj(frame)
+    elif indicator == "MA":
+        service.calculate_ma(frame)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark indicator calculations")
+    parser.add_argument("--dates", type=int, default=2500, help="Number of dates")
+    parser.add_argument("--instruments", type=int, default=3000, help="Number of instruments")
+    parser.add_argument(
+        "--indicators",
+        nargs="+",
+        default=["MACD", "RSI", "KDJ", "MA"],
+        help="Indicators to benchmark"
+    )
+    parser.add_argument(
+        "--backends",
+        action="store_true",
+        help="Compare compute backends instead of loop vs panel"
+    )
+    parser.add_argument(
+        "--lengths",
+        type=int,
+        nargs="+",
+        default=[250, 2500, 25000],
+        help="Series lengths for --backends"
+    )
+    args = parser.parse_args()
+
+    if args.backends:
+        benchmark_backends(args.lengths, args.instruments, args.indicators)
+    else:
+        benchmark_panel(args.dates, args.instruments, args.indicators)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
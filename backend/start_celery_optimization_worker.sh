@@ -0,0 +1,26 @@
+#!/bin/bash
+# Celery Optimization Worker Startup Script
+#
+# Parameter optimizations and walk-forward analyses run on their own queue.
+# The solo pool runs tasks in the worker's main process, which (unlike a
+# daemonic prefork child) may start the process pool a sweep fans out on,
+# so each task uses all CPU cores through shared memory.
+
+# Set working directory
+cd "$(dirname "$0")"
+
+# Activate virtual environment if exists
+if [ -d "venv" ]; then
+    source venv/bin/activate
+elif [ -d ".venv" ]; then
+    source .venv/bin/activate
+fi
+
+# Start Celery worker with configurations
+celery -A app.celery_app worker \
+    --loglevel=info \
+    --pool=solo \
+    --time-limit=3600 \
+    --soft-time-limit=3300 \
+    --queues=optimization \
+    --hostname=optimization@%h
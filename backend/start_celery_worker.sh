@@ -18,5 +18,5 @@ celery -A app.celery_app worker \
     --max-tasks-per-child=1000 \
     --time-limit=3600 \
     --soft-time-limit=3300 \
-    --queues=data_import,backtest,strategy \
+    --queues=data_import,backtest,strategy,factor \
     --hostname=worker@%h
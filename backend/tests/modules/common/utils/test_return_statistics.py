@@ -0,0 +1,63 @@
+"""
+Tests for the shared return statistics
+
+Test Coverage:
+- Return summaries (total/annual return, drawdown, Sharpe)
+- Rolling Sharpe ratio against pandas
+- JSON-safe list conversion
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.modules.common.utils.return_statistics import (
+    cumulative_returns,
+    rolling_sharpe,
+    summarize_returns,
+    to_json_list,
+)
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(7)
+
+
+class TestReturnStatistics:
+    """Test return series statistics."""
+
+    def test_cumulative_returns(self):
+        """Test compounding with NaN dates treated as flat."""
+        returns = np.array([[0.1, 0.0], [np.nan, -0.5], [0.1, 0.2]])
+
+        np.testing.assert_allclose(cumulative_returns(returns)[-1], [0.21, -0.4])
+
+    def test_summarize_returns(self):
+        """Test total return, drawdown and Sharpe."""
+        returns = np.array([0.1, -0.5, np.nan, 0.2])
+
+        summary = summarize_returns(returns, periods_per_year=3)
+
+        assert summary["n_periods"] == 3
+        assert summary["total_return"] == pytest.approx(1.1 * 0.5 * 1.2 - 1)
+        assert summary["annual_return"] == pytest.approx(summary["total_return"])
+        assert summary["max_drawdown"] == pytest.approx(-0.5)
+        values = np.array([0.1, -0.5, 0.2])
+        assert summary["sharpe"] == pytest.approx(values.mean() / values.std(ddof=1) * np.sqrt(3))
+
+    def test_rolling_sharpe_matches_pandas(self, rng):
+        """Test the trailing Sharpe ratio against pandas rolling statistics."""
+        returns = rng.normal(0.001, 0.02, size=120)
+        returns[[5, 40, 41]] = np.nan
+
+        sharpe = rolling_sharpe(returns, window=20, periods_per_year=252)
+
+        series = pd.Series(returns).rolling(20, min_periods=2)
+        expected = (series.mean() / series.std() * np.sqrt(252)).to_numpy()
+        np.testing.assert_allclose(sharpe, expected, rtol=1e-9, equal_nan=True)
+        assert np.isnan(rolling_sharpe(np.full(10, 0.01), window=5)).all()
+
+    def test_to_json_list(self):
+        """Test NaN conversion for JSON storage."""
+        assert to_json_list(np.array([0.1234567, np.nan])) == [0.123457, None]
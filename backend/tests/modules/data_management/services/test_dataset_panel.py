@@ -0,0 +1,137 @@
+"""
+Tests for dataset panels
+
+Test Coverage:
+- Building panels from long-format data
+- Missing cells and single-instrument datasets
+- Date and instrument slicing
+- File loading and errors
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.modules.data_management.services.dataset_panel import (
+    DatasetPanel,
+    PanelLoadError,
+    load_dataset_panel,
+)
+
+
+@pytest.fixture
+def long_frame():
+    """Two instruments over three dates; B has no row on the first date."""
+    return pd.DataFrame({
+        "Date": ["2024-01-03", "2024-01-01", "2024-01-02", "2024-01-02", "2024-01-03"],
+        "Symbol": ["A", "A", "A", "B", "B"],
+        "Close": [12.0, 10.0, 11.0, 20.0, 21.0],
+        "Volume": [300, 100, 200, 1000, 1100],
+    })
+
+
+class TestFromFrame:
+    """Test panel construction."""
+
+    def test_pivots_long_data(self, long_frame):
+        """Test that rows land on sorted date and instrument axes."""
+        panel = DatasetPanel.from_frame(long_frame)
+
+        assert panel.shape == (3, 2)
+        assert list(panel.instruments) == ["A", "B"]
+        assert sorted(panel.fields) == ["close", "volume"]
+        np.testing.assert_array_equal(panel.field("close")[:, 0], [10.0, 11.0, 12.0])
+
+    def test_missing_rows_are_nan(self, long_frame):
+        """Test that (date, instrument) pairs without a row are NaN."""
+        panel = DatasetPanel.from_frame(long_frame)
+
+        assert np.isnan(panel.field("close")[0, 1])
+        np.testing.assert_array_equal(panel.field("close")[1:, 1], [20.0, 21.0])
+
+    def test_without_instrument_column(self, long_frame):
+        """Test that a dataset without instruments becomes one column."""
+        single = long_frame[long_frame["Symbol"] == "A"].drop(columns="Symbol")
+
+        panel = DatasetPanel.from_frame(single, default_instrument="000001")
+
+        assert panel.shape == (3, 1)
+        assert list(panel.instruments) == ["000001"]
+
+    def test_selected_fields(self, long_frame):
+        """Test loading a subset of fields."""
+        panel = DatasetPanel.from_frame(long_frame, fields=["close"])
+
+        assert list(panel.fields) == ["close"]
+
+    def test_missing_field_raises(self, long_frame):
+        """Test that requesting an absent field raises PanelLoadError."""
+        with pytest.raises(PanelLoadError):
+            DatasetPanel.from_frame(long_frame, fields=["amount"])
+
+    def test_missing_date_column_raises(self, long_frame):
+        """Test that data without a date column is rejected."""
+        with pytest.raises(PanelLoadError):
+            DatasetPanel.from_frame(long_frame.drop(columns="Date"))
+
+    def test_unknown_field_lookup(self, long_frame):
+        """Test that field() names the available fields."""
+        panel = DatasetPanel.from_frame(long_frame)
+
+        with pytest.raises(KeyError, match="close"):
+            panel.field("amount")
+
+
+class TestSlice:
+    """Test panel slicing."""
+
+    def test_date_range_returns_views(self, long_frame):
+        """Test that date slicing is inclusive and does not copy."""
+        panel = DatasetPanel.from_frame(long_frame)
+
+        sliced = panel.slice(start_date="2024-01-02", end_date="2024-01-03")
+
+        assert sliced.shape == (2, 2)
+        assert np.shares_memory(sliced.field("close"), panel.field("close"))
+
+    def test_instrument_subset(self, long_frame):
+        """Test selecting instruments in the requested order."""
+        panel = DatasetPanel.from_frame(long_frame)
+
+        sliced = panel.slice(instruments=["B"])
+
+        assert list(sliced.instruments) == ["B"]
+        np.testing.assert_array_equal(sliced.field("volume")[1:, 0], [1000, 1100])
+
+    def test_unknown_instrument_raises(self, long_frame):
+        """Test that unknown instruments are rejected."""
+        panel = DatasetPanel.from_frame(long_frame)
+
+        with pytest.raises(KeyError):
+            panel.slice(instruments=["C"])
+
+
+class TestLoadDatasetPanel:
+    """Test loading panels from files."""
+
+    def test_load_csv(self, long_frame, tmp_path):
+        """Test loading a CSV dataset."""
+        path = tmp_path / "prices.csv"
+        long_frame.to_csv(path, index=False)
+
+        panel = load_dataset_panel(path)
+
+        assert panel.shape == (3, 2)
+
+    def test_missing_file_raises(self, tmp_path):
+        """Test that a missing file raises PanelLoadError."""
+        with pytest.raises(PanelLoadError):
+            load_dataset_panel(tmp_path / "missing.csv")
+
+    def test_unsupported_type_raises(self, tmp_path):
+        """Test that unsupported file types are rejected."""
+        path = tmp_path / "prices.json"
+        path.write_text("{}")
+
+        with pytest.raises(PanelLoadError):
+            load_dataset_panel(path)
@@ -0,0 +1,198 @@
+"""
+Tests for indicator compute backends
+
+Test Coverage:
+- Every backend's primitives match pandas on series and panels, with gaps
+- IndicatorService results are identical across backends
+- TA-Lib fallback for series with gaps
+- Backend resolution and automatic selection
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.modules.data_management.services.indicator_backends import (
+    AutoBackend,
+    IndicatorBackend,
+    NumpyBackend,
+    available_backends,
+    get_indicator_backend,
+)
+from app.modules.data_management.services.indicator_service import IndicatorService
+
+
+BACKENDS = available_backends()
+
+
+def assert_values_close(actual, expected):
+    """Compare indicator arrays within tolerance, NaN positions included."""
+    np.testing.assert_allclose(
+        np.asarray(actual, dtype=float),
+        np.asarray(expected, dtype=float),
+        rtol=1e-9,
+        atol=1e-9,
+        equal_nan=True
+    )
+
+
+@pytest.fixture
+def gapped_panel():
+    """
+    Price panel of 150 dates x 5 instruments.
+
+    Instrument 1 lists late, instrument 2 delists early, instrument 3 has a
+    suspension and instrument 4 is never observed.
+    """
+    rng = np.random.default_rng(11)
+    values = 30 * np.exp(np.cumsum(rng.normal(0, 0.02, (150, 5)), axis=0))
+    values[:30, 1] = np.nan
+    values[120:, 2] = np.nan
+    values[70:74, 3] = np.nan
+    values[:, 4] = np.nan
+    return values
+
+
+class TestPrimitiveParity:
+    """Test that every backend reproduces pandas ewm / rolling."""
+
+    @pytest.mark.parametrize("backend_name", BACKENDS)
+    @pytest.mark.parametrize("primitive,reference", [
+        ("ema", lambda frame, n: frame.ewm(span=n, adjust=False).mean()),
+        ("rolling_mean", lambda frame, n: frame.rolling(window=n).mean()),
+        ("rolling_min", lambda frame, n: frame.rolling(window=n).min()),
+        ("rolling_max", lambda frame, n: frame.rolling(window=n).max()),
+    ])
+    @pytest.mark.parametrize("param", [1, 3, 20])
+    def test_panel_primitive(self, gapped_panel, backend_name, primitive, reference, param):
+        """Test a primitive on a panel with listings, delistings and gaps."""
+        backend = get_indicator_backend(backend_name)
+
+        result = getattr(backend, primitive)(gapped_panel, param)
+
+        assert result.shape == gapped_panel.shape
+        assert_values_close(result, reference(pd.DataFrame(gapped_panel), param))
+
+    @pytest.mark.parametrize("backend_name", BACKENDS)
+    @pytest.mark.parametrize("primitive", ["ema", "rolling_mean", "rolling_min", "rolling_max"])
+    def test_series_primitive(self, gapped_panel, backend_name, primitive):
+        """Test that 1-D input returns a 1-D result equal to the panel column."""
+        backend = get_indicator_backend(backend_name)
+
+        for column in range(gapped_panel.shape[1]):
+            series = gapped_panel[:, column].copy()
+            result = getattr(backend, primitive)(series, 9)
+
+            assert result.ndim == 1
+            expected = getattr(NumpyBackend(), primitive)(series, 9)
+            assert_values_close(result, expected)
+
+
+class TestServiceParity:
+    """Test that IndicatorService gives the same results on every backend."""
+
+    @pytest.mark.parametrize("backend_name", BACKENDS)
+    @pytest.mark.parametrize("method,params", [
+        ("calculate_macd", {}),
+        ("calculate_rsi", {"period": 6}),
+        ("calculate_kdj", {}),
+        ("calculate_ma", {"periods": [5, 20]}),
+        ("calculate_volume_indicators", {"include_ratio": True}),
+    ])
+    def test_single_series(self, sample_stock_data, backend_name, method, params):
+        """Test single-series indicators against the pandas backend."""
+        expected = getattr(IndicatorService(backend="pandas"), method)(sample_stock_data, **params)
+
+        result = getattr(IndicatorService(backend=backend_name), method)(sample_stock_data, **params)
+
+        assert result.keys() == expected.keys()
+        for key, values in expected.items():
+            if isinstance(values, np.ndarray):
+                assert_values_close(result[key], values)
+            else:
+                assert result[key] == values
+
+    @pytest.mark.parametrize("backend_name", BACKENDS)
+    def test_panel_kdj(self, gapped_panel, backend_name):
+        """Test panel KDJ against the pandas backend."""
+        high, low = gapped_panel * 1.01, gapped_panel * 0.99
+        expected = IndicatorService(backend="pandas").calculate_panel_kdj(high, low, gapped_panel)
+
+        result = IndicatorService(backend=backend_name).calculate_panel_kdj(high, low, gapped_panel)
+
+        for key in ("k", "d", "j"):
+            assert_values_close(result[key], expected[key])
+
+
+class TestTalibBackend:
+    """Test the TA-Lib backend's handling of gaps."""
+
+    @pytest.fixture(autouse=True)
+    def require_talib(self):
+        pytest.importorskip("talib")
+
+    def test_gap_free_series_uses_talib(self, monkeypatch):
+        """Test that the NumPy fallback is not used without gaps."""
+        backend = get_indicator_backend("talib")
+        monkeypatch.setattr(
+            NumpyBackend, "rolling_mean", staticmethod(lambda *args: pytest.fail("fallback used"))
+        )
+        values = np.r_[np.nan, np.nan, np.arange(1.0, 30.0), np.nan]
+
+        result = backend.rolling_mean(values, 5)
+
+        expected = pd.Series(values).rolling(window=5).mean().values
+        assert_values_close(result, expected)
+
+    def test_series_with_gap_falls_back(self):
+        """Test that a suspension inside the listed span matches pandas."""
+        backend = get_indicator_backend("talib")
+        values = np.arange(1.0, 40.0)
+        values[15] = np.nan
+
+        result = backend.rolling_max(values, 5)
+
+        expected = pd.Series(values).rolling(window=5).max().values
+        assert_values_close(result, expected)
+
+
+class TestBackendResolution:
+    """Test backend lookup and automatic selection."""
+
+    def test_default_uses_setting(self, monkeypatch):
+        """Test that the INDICATOR_BACKEND setting is used by default."""
+        from app.config import settings
+        monkeypatch.setattr(settings, "INDICATOR_BACKEND", "pandas")
+
+        assert IndicatorService().backend.name == "pandas"
+
+    def test_instance_is_used_as_is(self):
+        """Test passing a backend instance."""
+        backend = NumpyBackend()
+
+        assert IndicatorService(backend=backend).backend is backend
+
+    def test_name_is_case_insensitive(self):
+        """Test backend names are case-insensitive."""
+        assert get_indicator_backend("NumPy").name == "numpy"
+
+    def test_unknown_backend_raises_error(self):
+        """Test that unknown backends are rejected."""
+        with pytest.raises(ValueError):
+            get_indicator_backend("cuda")
+
+    def test_auto_selects_by_shape(self):
+        """Test that auto picks pandas EMA for series and NumPy EMA for panels."""
+        backend = AutoBackend()
+
+        assert backend.select("ema", 1).name == "pandas"
+        assert backend.select("ema", 2).name == "numpy"
+        assert isinstance(backend.select("rolling_mean", 1), IndicatorBackend)
+
+    def test_auto_falls_back_without_talib(self, monkeypatch):
+        """Test that auto skips backends that are not available."""
+        backend = AutoBackend()
+        backend._backends.pop("talib", None)
+
+        assert backend.select("rolling_mean", 2).name == "numpy"
+        assert backend.select("rolling_extreme", 1).name == "pandas"
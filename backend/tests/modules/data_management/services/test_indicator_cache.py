@@ -0,0 +1,192 @@
+"""
+Tests for the indicator result cache
+
+Test Coverage:
+- Hits, misses, statistics and saved compute time
+- float32 storage and memory budget with LRU eviction
+- Dataset invalidation and version keys
+- IndicatorService / ChartService integration
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from app.modules.data_management.services.chart_service import ChartService
+from app.modules.data_management.services.indicator_cache import (
+    DatasetWindow,
+    IndicatorResultCache,
+)
+from app.modules.data_management.services.indicator_service import IndicatorService
+
+
+@pytest.fixture
+def cache():
+    """Cache with a 1 MB budget."""
+    return IndicatorResultCache(max_bytes=1024 * 1024)
+
+
+@pytest.fixture
+def window():
+    """Window over version 1 of a dataset."""
+    return DatasetWindow(dataset_id="ds-1", version="v1")
+
+
+def make_result(n_values=100):
+    return {"rsi": np.linspace(0, 100, n_values), "overbought_line": 70}
+
+
+class TestIndicatorResultCache:
+    """Test the cache itself."""
+
+    def test_miss_then_hit(self, cache, window):
+        """Test that the second lookup is served from the cache."""
+        key = cache.make_key(window, "RSI", {"period": 14})
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return make_result()
+
+        first = cache.get_or_compute(key, compute)
+        second = cache.get_or_compute(key, compute)
+
+        assert len(calls) == 1
+        np.testing.assert_allclose(second["rsi"], first["rsi"], rtol=1e-6)
+        assert second["overbought_line"] == 70
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_ratio"] == 0.5
+        assert stats["saved_seconds"] >= 0
+
+    def test_arrays_stored_as_float32(self, cache, window):
+        """Test that cached arrays use 4 bytes per value."""
+        key = cache.make_key(window, "RSI", {})
+
+        cache.put(key, make_result(1000))
+
+        assert cache.stats()["bytes"] == 4000
+        assert cache.get(key)["rsi"].dtype == np.float64
+
+    def test_hits_do_not_share_cached_arrays(self, cache, window):
+        """Test that mutating a returned array leaves the cache intact."""
+        key = cache.make_key(window, "RSI", {})
+        cache.put(key, make_result())
+
+        cache.get(key)["rsi"][:] = -1
+
+        assert cache.get(key)["rsi"][0] == 0
+
+    def test_lru_eviction_respects_budget(self, window):
+        """Test that the least recently used entry is evicted."""
+        cache = IndicatorResultCache(max_bytes=10_000)
+        keys = [cache.make_key(window, "RSI", {"period": p}) for p in (6, 14, 24)]
+
+        cache.put(keys[0], make_result(1000))
+        cache.put(keys[1], make_result(1000))
+        cache.get(keys[0])
+        cache.put(keys[2], make_result(1000))
+
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[0]) is not None
+        assert cache.stats()["evictions"] == 1
+        assert cache.stats()["bytes"] <= 10_000
+
+    def test_oversized_result_is_not_stored(self, window):
+        """Test that a result larger than the budget is skipped."""
+        cache = IndicatorResultCache(max_bytes=100)
+
+        stored = cache.put(cache.make_key(window, "RSI", {}), make_result(1000))
+
+        assert stored is False
+        assert cache.stats()["entries"] == 0
+
+    def test_invalidate_dataset(self, cache, window):
+        """Test that invalidation drops every version of one dataset only."""
+        other = DatasetWindow(dataset_id="ds-2", version="v1")
+        cache.put(cache.make_key(window, "RSI", {}), make_result())
+        cache.put(cache.make_key(DatasetWindow("ds-1", "v2"), "RSI", {}), make_result())
+        cache.put(cache.make_key(other, "RSI", {}), make_result())
+
+        removed = cache.invalidate_dataset("ds-1")
+
+        assert removed == 2
+        assert cache.stats()["entries"] == 1
+        assert cache.get(cache.make_key(other, "RSI", {})) is not None
+
+    def test_key_depends_on_version_and_window(self, cache):
+        """Test that versions and date windows produce different keys."""
+        base = DatasetWindow("ds-1", "v1", start_date="2024-01-01")
+
+        assert cache.make_key(base, "RSI", {}) != cache.make_key(
+            DatasetWindow("ds-1", "v2", start_date="2024-01-01"), "RSI", {}
+        )
+        assert cache.make_key(base, "RSI", {}) != cache.make_key(
+            DatasetWindow("ds-1", "v1", start_date="2024-02-01"), "RSI", {}
+        )
+
+    def test_dates_are_normalized(self, cache):
+        """Test that equal dates in different types share a key."""
+        as_string = DatasetWindow("ds-1", "v1", start_date="2024-01-01")
+        as_datetime = DatasetWindow("ds-1", "v1", start_date=datetime(2024, 1, 1))
+
+        assert cache.make_key(as_string, "RSI", {}) == cache.make_key(as_datetime, "RSI", {})
+
+
+class TestServiceIntegration:
+    """Test cached calculation through the services."""
+
+    def test_default_params_share_entry(self, sample_stock_data, cache, window):
+        """Test that {} and explicit default parameters hit the same entry."""
+        service = IndicatorService(cache=cache)
+
+        service.calculate_cached(window, sample_stock_data, "MACD")
+        service.calculate_cached(
+            window, sample_stock_data, "MACD",
+            {"fast_period": 12, "slow_period": 26, "signal_period": 9}
+        )
+
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["entries"] == 1
+
+    def test_cached_result_matches_direct_calculation(self, sample_stock_data, cache, window):
+        """Test float32 cached values against the direct calculation."""
+        service = IndicatorService(cache=cache)
+        expected = service.calculate_kdj(sample_stock_data)
+
+        service.calculate_cached(window, sample_stock_data, "KDJ")
+        cached = service.calculate_cached(window, sample_stock_data, "KDJ")
+
+        for key in ("k", "d", "j"):
+            np.testing.assert_allclose(cached[key], expected[key], rtol=1e-5, equal_nan=True)
+
+    def test_unknown_indicator_raises_error(self, sample_stock_data, cache, window):
+        """Test that unsupported indicators are rejected."""
+        service = IndicatorService(cache=cache)
+
+        with pytest.raises(ValueError):
+            service.calculate_cached(window, sample_stock_data, "BOLL")
+
+    def test_chart_service_uses_cache_with_window(self, sample_stock_data, cache, window):
+        """Test that apply_indicators goes through the cache when given a window."""
+        chart_service = ChartService()
+        chart_service.indicator_service = IndicatorService(cache=cache)
+
+        for _ in range(3):
+            chart_service.apply_indicators(
+                sample_stock_data, ["MACD", "RSI"], window=window
+            )
+
+        assert cache.stats()["misses"] == 2
+        assert cache.stats()["hits"] == 4
+
+    def test_chart_service_without_window_skips_cache(self, sample_stock_data, cache):
+        """Test that calculations without a window are not cached."""
+        chart_service = ChartService()
+        chart_service.indicator_service = IndicatorService(cache=cache)
+
+        chart_service.apply_indicators(sample_stock_data, ["MACD"])
+
+        assert cache.stats()["entries"] == 0
@@ -0,0 +1,192 @@
+"""
+Tests for cross-sectional panel indicators
+
+Test Coverage:
+- Panel MACD/RSI/KDJ/MA match the per-instrument IndicatorService results
+- NaN-padded listings, delistings and suspensions
+- DataFrame input/output labels
+- Validation errors
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.modules.data_management.services.indicator_service import (
+    IndicatorService,
+    IndicatorCalculationError,
+    InsufficientDataError
+)
+from app.modules.data_management.services.indicator_panel import listed_mask, panel_ema
+
+
+@pytest.fixture
+def price_panel():
+    """
+    OHLC panels of 120 dates x 6 instruments.
+
+    Instrument 1 lists late, instrument 2 delists early, instrument 3 has a
+    suspension, and instrument 4 lists late and delists early.
+    """
+    rng = np.random.default_rng(7)
+    n_dates, n_instruments = 120, 6
+
+    close = 50 * np.exp(np.cumsum(rng.normal(0, 0.02, (n_dates, n_instruments)), axis=0))
+    high = close * (1 + np.abs(rng.normal(0, 0.01, close.shape)))
+    low = close * (1 - np.abs(rng.normal(0, 0.01, close.shape)))
+
+    for panel in (close, high, low):
+        panel[:40, 1] = np.nan
+        panel[90:, 2] = np.nan
+        panel[60:63, 3] = np.nan
+        panel[:20, 4] = np.nan
+        panel[100:, 4] = np.nan
+
+    return {"high": high, "low": low, "close": close}
+
+
+def listed_frame(panel, column):
+    """Per-instrument OHLC frame trimmed to the instrument's listed span."""
+    mask = listed_mask(panel["close"])[:, column]
+    return pd.DataFrame({
+        name: values[mask, column] for name, values in panel.items()
+    }), mask
+
+
+def assert_matches_single(panel_values, single_values, mask, column):
+    """Panel column equals the single-series result on the listed span, NaN elsewhere."""
+    np.testing.assert_allclose(
+        panel_values[mask, column],
+        np.asarray(single_values, dtype=float),
+        rtol=1e-9,
+        atol=1e-9,
+        equal_nan=True
+    )
+    assert np.isnan(panel_values[~mask, column]).all()
+
+
+class TestPanelPrimitives:
+    """Test panel primitives."""
+
+    def test_panel_ema_matches_pandas_per_column(self, price_panel):
+        """Test that panel EMA equals pandas ewm column by column."""
+        close = price_panel["close"]
+
+        result = panel_ema(close, span=12)
+
+        expected = pd.DataFrame(close).ewm(span=12, adjust=False).mean().values
+        np.testing.assert_array_equal(result, expected)
+
+    def test_listed_mask(self):
+        """Test that the mask covers first to last observation, gaps included."""
+        values = np.array([[np.nan], [1.0], [np.nan], [2.0], [np.nan]])
+
+        mask = listed_mask(values)
+
+        assert mask[:, 0].tolist() == [False, True, True, True, False]
+
+
+class TestPanelIndicators:
+    """Test panel indicators against the per-instrument loop."""
+
+    def test_panel_macd(self, price_panel):
+        """Test panel MACD."""
+        service = IndicatorService()
+
+        result = service.calculate_panel_macd(price_panel["close"])
+
+        for column in range(price_panel["close"].shape[1]):
+            frame, mask = listed_frame(price_panel, column)
+            single = service.calculate_macd(frame)
+            for key in ("macd", "signal", "histogram"):
+                assert_matches_single(result[key], single[key], mask, column)
+
+    def test_panel_rsi(self, price_panel):
+        """Test panel RSI."""
+        service = IndicatorService()
+
+        result = service.calculate_panel_rsi(price_panel["close"], period=10)
+
+        assert result["overbought_line"] == 70
+        assert result["oversold_line"] == 30
+        for column in range(price_panel["close"].shape[1]):
+            frame, mask = listed_frame(price_panel, column)
+            single = service.calculate_rsi(frame, period=10)
+            assert_matches_single(result["rsi"], single["rsi"], mask, column)
+
+    def test_panel_kdj(self, price_panel):
+        """Test panel KDJ."""
+        service = IndicatorService()
+
+        result = service.calculate_panel_kdj(
+            price_panel["high"], price_panel["low"], price_panel["close"]
+        )
+
+        for column in range(price_panel["close"].shape[1]):
+            frame, mask = listed_frame(price_panel, column)
+            single = service.calculate_kdj(frame)
+            for key in ("k", "d", "j"):
+                assert_matches_single(result[key], single[key], mask, column)
+
+    def test_panel_ma(self, price_panel):
+        """Test panel moving averages."""
+        service = IndicatorService()
+
+        result = service.calculate_panel_ma(price_panel["close"], periods=[5, 20])
+
+        for column in range(price_panel["close"].shape[1]):
+            frame, mask = listed_frame(price_panel, column)
+            single = service.calculate_ma(frame, periods=[5, 20])
+            for key in ("ma5", "ma20"):
+                assert_matches_single(result[key], single[key], mask, column)
+
+    def test_dataframe_input_keeps_labels(self, price_panel):
+        """Test that DataFrame panels return DataFrames with the same labels."""
+        service = IndicatorService()
+        close = pd.DataFrame(
+            price_panel["close"],
+            index=pd.date_range("2024-01-01", periods=120),
+            columns=[f"SH60000{i}" for i in range(6)]
+        )
+
+        result = service.calculate_panel_rsi(close)
+
+        assert isinstance(result["rsi"], pd.DataFrame)
+        assert result["rsi"].index.equals(close.index)
+        assert list(result["rsi"].columns) == list(close.columns)
+
+
+class TestPanelValidation:
+    """Test panel validation errors."""
+
+    def test_one_dimensional_input_raises_error(self):
+        """Test that a 1-D series is rejected."""
+        service = IndicatorService()
+
+        with pytest.raises(IndicatorCalculationError):
+            service.calculate_panel_ma(np.arange(100.0))
+
+    def test_insufficient_dates_raises_error(self, price_panel):
+        """Test the minimum number of dates."""
+        service = IndicatorService()
+
+        with pytest.raises(InsufficientDataError):
+            service.calculate_panel_macd(price_panel["close"][:20])
+
+    def test_negative_prices_raise_error(self, price_panel):
+        """Test that RSI rejects negative prices."""
+        service = IndicatorService()
+        close = price_panel["close"].copy()
+        close[50, 0] = -1.0
+
+        with pytest.raises(IndicatorCalculationError):
+            service.calculate_panel_rsi(close)
+
+    def test_misaligned_kdj_panels_raise_error(self, price_panel):
+        """Test that KDJ requires aligned panels."""
+        service = IndicatorService()
+
+        with pytest.raises(IndicatorCalculationError):
+            service.calculate_panel_kdj(
+                price_panel["high"][:, :5], price_panel["low"], price_panel["close"]
+            )
@@ -0,0 +1,196 @@
+"""
+Tests for incremental indicator state
+
+Test Coverage:
+- EMA / rolling window primitives match pandas
+- build_indicator_state + extend_indicator_state match batch calculation
+- State serialization round trip
+- Error handling
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.modules.data_management.services.indicator_service import (
+    IndicatorService,
+    IndicatorCalculationError,
+    InsufficientDataError
+)
+from app.modules.data_management.services.indicator_state import (
+    EMAState,
+    RollingWindowState,
+    IndicatorState,
+)
+
+
+def assert_series_equal(actual, expected):
+    """Compare indicator arrays within tolerance, NaN positions included."""
+    np.testing.assert_allclose(
+        np.asarray(actual, dtype=float),
+        np.asarray(expected, dtype=float),
+        rtol=1e-10,
+        atol=1e-10,
+        equal_nan=True
+    )
+
+
+class TestStatePrimitives:
+    """Test EMA and rolling window state against pandas."""
+
+    def test_ema_state_matches_pandas_exactly(self):
+        """Test EMAState reproduces ewm(adjust=False) bit-for-bit, with gaps."""
+        values = np.random.default_rng(0).normal(size=500).cumsum()
+        values[:3] = np.nan
+        values[100:110] = np.nan
+
+        state = EMAState(span=12)
+        head = state.update(values[:250])
+        tail = state.update(values[250:])
+
+        expected = pd.Series(values).ewm(span=12, adjust=False).mean().values
+        np.testing.assert_array_equal(np.concatenate([head, tail]), expected)
+
+    @pytest.mark.parametrize("reducer", ["mean", "min", "max"])
+    def test_rolling_state_matches_pandas(self, reducer):
+        """Test RollingWindowState across chunk boundaries."""
+        values = np.random.default_rng(1).normal(size=200)
+        values[50] = np.nan
+
+        state = RollingWindowState(window=7, reducer=reducer)
+        chunks = [state.update(chunk) for chunk in np.array_split(values, 9)]
+
+        expected = getattr(pd.Series(values).rolling(window=7), reducer)().values
+        assert_series_equal(np.concatenate(chunks), expected)
+
+    def test_rolling_state_rejects_unknown_reducer(self):
+        """Test that unsupported reducers are rejected."""
+        with pytest.raises(ValueError):
+            RollingWindowState(window=5, reducer="median")
+
+
+class TestIncrementalIndicators:
+    """Test extending indicator state matches batch calculation."""
+
+    @pytest.mark.parametrize("indicator,params,batch_method", [
+        ("MACD", {}, "calculate_macd"),
+        ("MACD", {"fast_period": 5, "slow_period": 13, "signal_period": 4}, "calculate_macd"),
+        ("RSI", {}, "calculate_rsi"),
+        ("RSI", {"period": 6}, "calculate_rsi"),
+        ("KDJ", {}, "calculate_kdj"),
+        ("MA", {"periods": [5, 10, 20]}, "calculate_ma"),
+    ])
+    def test_extend_matches_batch(self, sample_stock_data, indicator, params, batch_method):
+        """Test that history + appended bars equals the batch result."""
+        service = IndicatorService()
+        history = sample_stock_data.iloc[:60]
+        new_bars = sample_stock_data.iloc[60:]
+
+        _, state = service.build_indicator_state(history, indicator, params)
+        tail = service.extend_indicator_state(state, new_bars)
+
+        expected = getattr(service, batch_method)(sample_stock_data, **params)
+        for key, values in tail.items():
+            if isinstance(values, np.ndarray):
+                assert len(values) == len(new_bars)
+                assert_series_equal(values, np.asarray(expected[key])[60:])
+            else:
+                assert values == expected[key]
+
+    def test_build_returns_full_history(self, sample_stock_data):
+        """Test that build_indicator_state returns the full batch result."""
+        service = IndicatorService()
+
+        result, state = service.build_indicator_state(sample_stock_data, "MACD")
+        expected = service.calculate_macd(sample_stock_data)
+
+        assert state.bars_seen == len(sample_stock_data)
+        for key in ("macd", "signal", "histogram"):
+            assert_series_equal(result[key], expected[key])
+
+    def test_extend_one_bar_at_a_time(self, sample_stock_data):
+        """Test many single-bar appends."""
+        service = IndicatorService()
+        _, state = service.build_indicator_state(sample_stock_data.iloc[:30], "KDJ")
+
+        k_values = [
+            service.extend_indicator_state(state, sample_stock_data.iloc[i:i + 1])["k"][0]
+            for i in range(30, len(sample_stock_data))
+        ]
+
+        expected = service.calculate_kdj(sample_stock_data)["k"][30:]
+        assert_series_equal(k_values, expected)
+
+    def test_extend_with_empty_data(self, sample_stock_data):
+        """Test that appending no bars returns empty arrays."""
+        service = IndicatorService()
+        _, state = service.build_indicator_state(sample_stock_data, "RSI")
+
+        tail = service.extend_indicator_state(state, sample_stock_data.iloc[0:0])
+
+        assert len(tail["rsi"]) == 0
+        assert state.bars_seen == len(sample_stock_data)
+
+
+class TestStateSerialization:
+    """Test state serialization for caching."""
+
+    @pytest.mark.parametrize("indicator", ["MACD", "RSI", "KDJ", "MA"])
+    def test_round_trip_through_json(self, sample_stock_data, indicator):
+        """Test that a JSON round trip resumes identically."""
+        service = IndicatorService()
+        _, state = service.build_indicator_state(sample_stock_data.iloc[:50], indicator)
+
+        payload = json.loads(json.dumps(state.to_dict()))
+        restored = IndicatorState.from_dict(payload)
+
+        new_bars = sample_stock_data.iloc[50:]
+        from_original = service.extend_indicator_state(state, new_bars)
+        from_restored = service.extend_indicator_state(payload, new_bars)
+
+        assert restored.bars_seen == 50
+        for key, values in from_original.items():
+            if isinstance(values, np.ndarray):
+                np.testing.assert_array_equal(values, from_restored[key])
+
+    def test_from_dict_rejects_unknown_indicator(self):
+        """Test that unknown serialized indicators are rejected."""
+        with pytest.raises(ValueError):
+            IndicatorState.from_dict({"indicator": "BOLL", "params": {}, "bars_seen": 0, "state": {}})
+
+
+class TestIncrementalErrors:
+    """Test error handling for incremental calculation."""
+
+    def test_unsupported_indicator_raises_error(self, sample_stock_data):
+        """Test that VOLUME has no incremental state."""
+        service = IndicatorService()
+
+        with pytest.raises(ValueError):
+            service.build_indicator_state(sample_stock_data, "VOLUME")
+
+    def test_insufficient_history_raises_error(self, sample_stock_data):
+        """Test that the batch minimum row requirement applies."""
+        service = IndicatorService()
+
+        with pytest.raises(InsufficientDataError):
+            service.build_indicator_state(sample_stock_data.iloc[:10], "MACD")
+
+    def test_missing_column_on_extend_raises_error(self, sample_stock_data):
+        """Test that new bars must contain the indicator columns."""
+        service = IndicatorService()
+        _, state = service.build_indicator_state(sample_stock_data, "KDJ")
+
+        with pytest.raises(IndicatorCalculationError):
+            service.extend_indicator_state(state, sample_stock_data.drop(columns=["high"]))
+
+    def test_negative_prices_on_extend_raise_error(self, sample_stock_data):
+        """Test that RSI rejects negative prices in new bars."""
+        service = IndicatorService()
+        _, state = service.build_indicator_state(sample_stock_data, "RSI")
+        new_bars = pd.DataFrame({"close": [10.0, -1.0]})
+
+        with pytest.raises(IndicatorCalculationError):
+            service.extend_indicator_state(state, new_bars)
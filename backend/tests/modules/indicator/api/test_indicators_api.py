@@ -21,6 +21,7 @@ import pytest
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.database.usage_counter import get_usage_counter
 from app.database.models.indicator import (
     IndicatorComponent, IndicatorCategory, IndicatorSource
 )
@@ -478,6 +479,7 @@ class TestIncrementIndicatorUsage:
         assert "incremented successfully" in data["message"].lower()
 
         # Verify usage count was actually incremented in database
+        await get_usage_counter().flush(db_session)
         await db_session.refresh(sample_indicator)
         assert sample_indicator.usage_count == original_count + 1
 
@@ -500,6 +502,7 @@ class TestIncrementIndicatorUsage:
             assert response.status_code == 200
 
         # ASSERT
+        await get_usage_counter().flush(db_session)
         await db_session.refresh(sample_indicator)
         assert sample_indicator.usage_count == original_count + increment_times
 
@@ -1043,5 +1046,6 @@ class TestIndicatorAPIBoundaryConditions:
             assert response.status_code == 200
 
         # Verify final count is correctly incremented
+        await get_usage_counter().flush(db_session)
         await db_session.refresh(sample_indicator)
         assert sample_indicator.usage_count == original_count + 5
@@ -24,6 +24,7 @@ from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 from unittest.mock import patch, AsyncMock
 
+from app.database.usage_counter import get_usage_counter
 from app.database.models.indicator import (
     CustomFactor, UserFactorLibrary, FactorStatus
 )
@@ -544,6 +545,7 @@ class TestIncrementLibraryUsage:
         assert "incremented successfully" in data["message"].lower()
 
         # Verify usage count was incremented
+        await get_usage_counter().flush(db_session)
         await db_session.refresh(sample_library_item)
         assert sample_library_item.usage_count == original_count + 1
 
@@ -566,6 +568,7 @@ class TestIncrementLibraryUsage:
             assert response.status_code == 200
 
         # ASSERT
+        await get_usage_counter().flush(db_session)
         await db_session.refresh(sample_library_item)
         assert sample_library_item.usage_count == original_count + increment_times
 
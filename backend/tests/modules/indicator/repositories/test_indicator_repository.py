@@ -725,3 +725,96 @@ class TestIncrementUsageCount:
         result = await repo.increment_usage_count("99999")
 
         assert result is None
+
+
+# ============================================================================
+# Tests: full-text search
+# ============================================================================
+
+def _indicator(code: str, name_zh: str, name_en: str, usage_count: int = 0) -> IndicatorComponent:
+    return IndicatorComponent(
+        code=code,
+        name_zh=name_zh,
+        name_en=name_en,
+        category="trend",
+        source="qlib",
+        is_enabled=True,
+        is_deleted=False,
+        usage_count=usage_count
+    )
+
+
+@pytest.mark.asyncio
+class TestFullTextSearch:
+    """Test relevance ranking and incremental index updates of search_by_name."""
+
+    async def test_exact_word_ranks_above_prefix_match(self, db_session: AsyncSession):
+        """Test that an exact word match outranks a more used prefix match."""
+        repo = IndicatorRepository(db_session)
+        db_session.add_all([
+            _indicator("MACD", "指数平滑异同移动平均线", "Moving Average Convergence Divergence", 100),
+            _indicator("MA", "移动平均", "Moving Average", 1),
+        ])
+        await db_session.commit()
+
+        results = await repo.search_by_name("ma")
+
+        assert [r.code for r in results] == ["MA", "MACD"]
+
+    async def test_multiple_words_must_all_match(self, db_session: AsyncSession):
+        """Test that every query word is required, in any order."""
+        repo = IndicatorRepository(db_session)
+        db_session.add_all([
+            _indicator("SMA", "简单移动平均", "Simple Moving Average"),
+            _indicator("VMA", "成交量移动平均", "Volume Moving Average"),
+        ])
+        await db_session.commit()
+
+        results = await repo.search_by_name("average simple")
+
+        assert [r.code for r in results] == ["SMA"]
+
+    async def test_chinese_and_camel_case(self, db_session: AsyncSession):
+        """Test Chinese bigram matching and camelCase word parts."""
+        repo = IndicatorRepository(db_session)
+        db_session.add_all([
+            _indicator("BollingerBands", "布林带", "Bollinger Bands"),
+            _indicator("RSI", "相对强弱指标", "Relative Strength Index"),
+        ])
+        await db_session.commit()
+
+        assert [r.code for r in await repo.search_by_name("强弱")] == ["RSI"]
+        assert [r.code for r in await repo.search_by_name("弱强")] == []
+        assert [r.code for r in await repo.search_by_name("bands")] == ["BollingerBands"]
+
+    async def test_index_follows_updates_and_deletes(self, db_session: AsyncSession):
+        """Test that committed creates, renames and soft deletes update the index."""
+        repo = IndicatorRepository(db_session)
+        indicator = _indicator("KDJ", "随机指标", "Stochastic Oscillator")
+        db_session.add(indicator)
+        await db_session.commit()
+        assert await repo.count_search_results("stochastic") == 1
+
+        db_session.add(_indicator("STOCHRSI", "随机相对强弱", "Stochastic RSI"))
+        await db_session.commit()
+        assert await repo.count_search_results("stochastic") == 2
+
+        await repo.update(indicator.id, {"name_en": "KDJ Oscillator"})
+        assert await repo.count_search_results("stochastic") == 1
+        assert await repo.count_search_results("oscillator") == 1
+
+        await repo.delete(indicator.id)
+        assert await repo.count_search_results("oscillator") == 0
+
+    async def test_rolled_back_changes_are_not_indexed(self, db_session: AsyncSession):
+        """Test that flushed but rolled back rows never reach the index."""
+        repo = IndicatorRepository(db_session)
+        db_session.add(_indicator("OBV", "能量潮", "On Balance Volume"))
+        await db_session.commit()
+        assert await repo.count_search_results("volume") == 1
+
+        db_session.add(_indicator("VWAP", "成交量加权平均价", "Volume Weighted Average Price"))
+        await db_session.flush()
+        await db_session.rollback()
+
+        assert await repo.count_search_results("volume") == 1
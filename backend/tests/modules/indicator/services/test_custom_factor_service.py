@@ -22,9 +22,19 @@ import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 
+import numpy as np
+import pandas as pd
+
 from app.database.models.indicator import CustomFactor, IndicatorComponent, FactorStatus
+from app.modules.data_management.services.dataset_panel import DatasetPanel
 from app.modules.indicator.services.custom_factor_service import CustomFactorService
-from app.modules.indicator.exceptions import ValidationError, ConflictError
+from app.modules.indicator.services.factor_store import FactorValueStore
+from app.modules.indicator.exceptions import (
+    ValidationError,
+    ConflictError,
+    FactorEvaluationError,
+    FormulaCompileError,
+)
 
 
 @pytest.mark.asyncio
@@ -1483,6 +1493,265 @@ class TestCustomFactorServiceUpdate:
             assert "Update failed" in str(exc_info.value)
 
 
+@pytest.fixture
+def price_panel() -> DatasetPanel:
+    """Two-instrument panel with open and close prices."""
+    dates = pd.date_range("2024-01-01", periods=30).to_numpy()
+    close = np.column_stack([np.linspace(10, 20, 30), np.linspace(20, 10, 30)])
+    return DatasetPanel(
+        dates=dates,
+        instruments=np.array(["A", "B"], dtype=object),
+        fields={"open": close - 0.5, "close": close},
+    )
+
+
+@pytest.mark.asyncio
+class TestCustomFactorServiceEvaluate:
+    """Test evaluate_factor functionality."""
+
+    async def test_evaluate_own_factor(
+        self,
+        custom_factor_service: CustomFactorService,
+        sample_custom_factor: CustomFactor,
+        price_panel: DatasetPanel
+    ):
+        """Test evaluating a factor over a panel."""
+        # ACT
+        values = await custom_factor_service.evaluate_factor(
+            sample_custom_factor.id, price_panel, user_id="user123"
+        )
+
+        # ASSERT
+        expected = (price_panel.fields["close"] - price_panel.fields["open"]) / price_panel.fields["open"]
+        np.testing.assert_allclose(values, expected)
+
+    async def test_evaluate_public_factor_by_other_user(
+        self,
+        custom_factor_service: CustomFactorService,
+        sample_public_factor: CustomFactor,
+        price_panel: DatasetPanel
+    ):
+        """Test that public factors can be evaluated by anyone."""
+        # ACT
+        values = await custom_factor_service.evaluate_factor(
+            sample_public_factor.id, price_panel, user_id="other_user"
+        )
+
+        # ASSERT
+        assert values.shape == price_panel.shape
+        assert np.isnan(values[:20]).all()
+        assert not np.isnan(values[20:]).any()
+
+    async def test_evaluate_private_factor_unauthorized(
+        self,
+        custom_factor_service: CustomFactorService,
+        sample_custom_factor: CustomFactor,
+        price_panel: DatasetPanel
+    ):
+        """Test that private factors of other users are not evaluated."""
+        # ACT
+        values = await custom_factor_service.evaluate_factor(
+            sample_custom_factor.id, price_panel, user_id="other_user"
+        )
+
+        # ASSERT
+        assert values is None
+
+    async def test_evaluate_nonexistent_factor(
+        self,
+        custom_factor_service: CustomFactorService,
+        price_panel: DatasetPanel
+    ):
+        """Test evaluating a factor that doesn't exist."""
+        # ACT
+        values = await custom_factor_service.evaluate_factor("nonexistent-id", price_panel)
+
+        # ASSERT
+        assert values is None
+
+    async def test_evaluate_invalid_formula(
+        self,
+        custom_factor_service: CustomFactorService,
+        db_session: AsyncSession,
+        price_panel: DatasetPanel
+    ):
+        """Test that an uncompilable formula raises FormulaCompileError."""
+        # ARRANGE
+        factor = CustomFactor(
+            factor_name="语法错误因子",
+            user_id="user123",
+            formula="close +* open",
+            formula_language="qlib_alpha"
+        )
+        db_session.add(factor)
+        await db_session.commit()
+
+        # ACT & ASSERT
+        with pytest.raises(FormulaCompileError):
+            await custom_factor_service.evaluate_factor(factor.id, price_panel)
+
+    async def test_evaluate_missing_field(
+        self,
+        custom_factor_service: CustomFactorService,
+        db_session: AsyncSession,
+        price_panel: DatasetPanel
+    ):
+        """Test that a formula reading an absent field raises FactorEvaluationError."""
+        # ARRANGE
+        factor = CustomFactor(
+            factor_name="成交量因子",
+            user_id="user123",
+            formula="Mean($volume, 5)",
+            formula_language="qlib_alpha"
+        )
+        db_session.add(factor)
+        await db_session.commit()
+
+        # ACT & ASSERT
+        with pytest.raises(FactorEvaluationError):
+            await custom_factor_service.evaluate_factor(factor.id, price_panel)
+
+
+@pytest.mark.asyncio
+class TestCustomFactorServiceMaterialize:
+    """Test materialized factor values and their garbage collection."""
+
+    @pytest.fixture
+    def store_service(self, custom_factor_repo, tmp_path) -> CustomFactorService:
+        return CustomFactorService(custom_factor_repo, factor_store=FactorValueStore(tmp_path))
+
+    async def test_materialize_factor(
+        self,
+        store_service: CustomFactorService,
+        sample_custom_factor: CustomFactor,
+        price_panel: DatasetPanel
+    ):
+        """Test that values are stored for the dataset version."""
+        # ACT
+        stored = await store_service.materialize_factor(
+            sample_custom_factor.id, price_panel, "ds1", "v1", user_id="user123"
+        )
+
+        # ASSERT
+        assert stored.dataset_version == "v1"
+        assert stored.shape == price_panel.shape
+        assert len(store_service.factor_store.list_materializations(sample_custom_factor.id)) == 1
+
+    async def test_formula_update_removes_stale_values(
+        self,
+        store_service: CustomFactorService,
+        sample_custom_factor: CustomFactor,
+        price_panel: DatasetPanel
+    ):
+        """Test that update_factor drops values computed with the old formula."""
+        # ARRANGE
+        await store_service.materialize_factor(sample_custom_factor.id, price_panel, "ds1", "v1")
+
+        # ACT
+        await store_service.update_factor(
+            sample_custom_factor.id, {"formula": "close / open - 1"}, "user123"
+        )
+
+        # ASSERT
+        assert store_service.factor_store.list_materializations(sample_custom_factor.id) == []
+
+    async def test_description_update_keeps_values(
+        self,
+        store_service: CustomFactorService,
+        sample_custom_factor: CustomFactor,
+        price_panel: DatasetPanel
+    ):
+        """Test that non-formula updates keep stored values."""
+        # ARRANGE
+        await store_service.materialize_factor(sample_custom_factor.id, price_panel, "ds1", "v1")
+
+        # ACT
+        await store_service.update_factor(
+            sample_custom_factor.id, {"description": "新描述"}, "user123"
+        )
+
+        # ASSERT
+        assert len(store_service.factor_store.list_materializations(sample_custom_factor.id)) == 1
+
+    async def test_delete_removes_values(
+        self,
+        store_service: CustomFactorService,
+        sample_custom_factor: CustomFactor,
+        price_panel: DatasetPanel
+    ):
+        """Test that deleting a factor drops its stored values."""
+        # ARRANGE
+        await store_service.materialize_factor(sample_custom_factor.id, price_panel, "ds1", "v1")
+
+        # ACT
+        deleted = await store_service.delete_factor(sample_custom_factor.id, "user123")
+
+        # ASSERT
+        assert deleted is True
+        assert store_service.factor_store.list_materializations(sample_custom_factor.id) == []
+
+
+@pytest.mark.asyncio
+class TestCustomFactorServiceBatchEvaluate:
+    """Test evaluate_factors_batch functionality."""
+
+    @pytest.fixture
+    def store_service(self, custom_factor_repo, tmp_path) -> CustomFactorService:
+        return CustomFactorService(custom_factor_repo, factor_store=FactorValueStore(tmp_path))
+
+    async def test_batch_evaluates_and_stores(
+        self,
+        store_service: CustomFactorService,
+        sample_custom_factor: CustomFactor,
+        sample_public_factor: CustomFactor,
+        price_panel: DatasetPanel
+    ):
+        """Test that every requested factor is computed and stored."""
+        # ACT
+        result = await store_service.evaluate_factors_batch(
+            [sample_custom_factor.id, sample_public_factor.id], price_panel, "ds1", "v1",
+            user_id="user123", max_workers=1
+        )
+
+        # ASSERT
+        assert list(result["factors"]) == [sample_custom_factor.id, sample_public_factor.id]
+        assert all(r["status"] == "computed" for r in result["factors"].values())
+        assert result["summary"]["computed"] == 2
+        assert len(store_service.factor_store.list_materializations(sample_custom_factor.id)) == 1
+
+    async def test_batch_reports_unavailable_factors(
+        self,
+        store_service: CustomFactorService,
+        sample_custom_factor: CustomFactor,
+        db_session: AsyncSession,
+        price_panel: DatasetPanel
+    ):
+        """Test that missing, unauthorized and invalid factors fail individually."""
+        # ARRANGE
+        invalid = CustomFactor(
+            factor_name="语法错误因子",
+            user_id="other_user",
+            formula="close +* open",
+            formula_language="qlib_alpha",
+            is_public=True
+        )
+        db_session.add(invalid)
+        await db_session.commit()
+
+        # ACT
+        result = await store_service.evaluate_factors_batch(
+            [sample_custom_factor.id, "nonexistent-id", invalid.id], price_panel, "ds1", "v1",
+            user_id="other_user", max_workers=1
+        )
+
+        # ASSERT
+        assert result["factors"][sample_custom_factor.id]["status"] == "failed"
+        assert result["factors"]["nonexistent-id"]["status"] == "failed"
+        assert result["factors"][invalid.id]["status"] == "failed"
+        assert result["summary"]["factors"] == 3
+        assert result["summary"]["failed"] == 3
+
+
 @pytest.mark.asyncio
 class TestCustomFactorServiceToDict:
     """Test _to_dict method."""
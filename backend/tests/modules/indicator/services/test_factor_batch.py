@@ -0,0 +1,176 @@
+"""
+Tests for batch factor evaluation
+
+Test Coverage:
+- Output partitioning by shared steps
+- Timing attribution of shared steps
+- Shared memory panels
+- Batch evaluation: stored values, cache hits, failure isolation, progress
+"""
+
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.modules.data_management.services.dataset_panel import DatasetPanel
+from app.modules.indicator.services.factor_batch import (
+    FactorBatchEvaluator,
+    SharedPanel,
+    attach_panel,
+    attribute_timings,
+    partition_outputs,
+)
+from app.modules.indicator.services.factor_compiler import compile_formula, compile_formulas
+from app.modules.indicator.services.factor_store import FactorValueStore
+
+
+FORMULAS = {
+    "momentum": "$close / Ref($close, 5) - 1",
+    "reversal": "Ref($close, 5) / $close - 1",
+    "volatility": "Std($close / Ref($close, 1) - 1, 10)",
+    "sharpe": "Mean($close / Ref($close, 1) - 1, 10) / Std($close / Ref($close, 1) - 1, 10)",
+    "volume": "Rank(Mean($volume, 5))",
+}
+
+
+@pytest.fixture
+def panel():
+    rng = np.random.default_rng(11)
+    close = 50 * np.exp(rng.normal(0, 0.02, size=(60, 8)).cumsum(axis=0))
+    return DatasetPanel(
+        dates=pd.date_range("2024-01-01", periods=60).to_numpy(),
+        instruments=np.array([f"S{i}" for i in range(8)], dtype=object),
+        fields={
+            "close": close,
+            "volume": rng.random((60, 8)) * 1e6,
+            # Wrong shape: formulas reading it fail during evaluation
+            "broken": np.ones((60, 3)),
+        },
+    )
+
+
+@pytest.fixture
+def plans():
+    return {name: compile_formula(formula) for name, formula in FORMULAS.items()}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return FactorValueStore(tmp_path / "factors")
+
+
+class TestPlanning:
+    """Test partitioning and timing attribution."""
+
+    def test_partitions_keep_shared_steps_together(self):
+        """Test that factors sharing a return series land in one partition."""
+        plan = compile_formulas(FORMULAS)
+
+        partitions = partition_outputs(plan, n_partitions=2, max_size=3)
+
+        assert sorted(name for part in partitions for name in part) == sorted(FORMULAS)
+        assert all(len(part) <= 3 for part in partitions)
+        assert any({"volatility", "sharpe"} <= set(part) for part in partitions)
+
+    def test_partition_count_respects_max_size(self):
+        """Test that max_size forces more partitions."""
+        plan = compile_formulas(FORMULAS)
+
+        assert len(partition_outputs(plan, n_partitions=1, max_size=2)) == 3
+
+    def test_shared_step_time_is_split(self):
+        """Test that a shared step's time is divided between its users."""
+        plan = compile_formulas({"a": "Mean(close, 5)", "b": "Mean(close, 5) * 2"})
+        timings = [0.0] * len(plan.steps)
+        shared = plan.outputs["a"]
+        timings[shared] = 1.0
+        timings[plan.outputs["b"]] = 0.5
+
+        attributed = attribute_timings(plan, timings)
+
+        assert attributed["a"] == pytest.approx(0.5)
+        assert attributed["b"] == pytest.approx(1.0)
+
+    def test_evaluate_records_step_timings(self, panel):
+        """Test that FactorPlan.evaluate fills per-step timings."""
+        plan = compile_formula(FORMULAS["sharpe"])
+        timings = []
+
+        plan.evaluate(panel, timings)
+
+        assert len(timings) == len(plan.steps)
+        assert all(t >= 0 for t in timings)
+
+
+class TestSharedPanel:
+    """Test shared memory panels."""
+
+    def test_attach_sees_same_values(self, panel):
+        """Test that an attached panel reads the shared copy read-only."""
+        with SharedPanel(panel, ["close"]) as shared:
+            memory, attached = attach_panel(shared.spec)
+            try:
+                np.testing.assert_array_equal(attached.field("close"), panel.field("close"))
+                assert not attached.field("close").flags.writeable
+                assert list(attached.fields) == ["close"]
+            finally:
+                del attached
+                memory.close()
+
+
+class TestFactorBatchEvaluator:
+    """Test batch evaluation."""
+
+    @pytest.mark.parametrize("max_workers", [1, 2])
+    def test_values_match_individual_evaluation(self, store, plans, panel, max_workers):
+        """Test that stored values equal evaluating each factor alone."""
+        evaluator = FactorBatchEvaluator(store, max_workers=max_workers, chunk_size=2)
+
+        result = asyncio.run(evaluator.evaluate(plans, panel, "ds1", "v1"))
+
+        assert result["summary"]["computed"] == len(plans)
+        assert result["summary"]["merged_steps"] < result["summary"]["independent_steps"]
+        for name, plan in plans.items():
+            stored = store.get(name, plan.formula_hash, "ds1", "v1")
+            np.testing.assert_allclose(stored.values, plan.evaluate(panel)["factor"], equal_nan=True)
+            assert result["factors"][name]["compute_seconds"] >= 0
+
+    def test_stored_factors_are_not_recomputed(self, store, plans, panel):
+        """Test that a second run reads every factor from the store."""
+        evaluator = FactorBatchEvaluator(store, max_workers=1)
+        asyncio.run(evaluator.evaluate(plans, panel, "ds1", "v1"))
+
+        result = asyncio.run(evaluator.evaluate(plans, panel, "ds1", "v1"))
+
+        assert result["summary"]["cached"] == len(plans)
+        assert result["summary"]["partitions"] == 0
+
+    def test_failures_are_isolated(self, store, plans, panel):
+        """Test that one failing factor does not fail the others."""
+        plans = {
+            **plans,
+            "no_field": compile_formula("Mean($vwap, 5)"),
+            "bad_shape": compile_formula("$close + $broken"),
+        }
+        evaluator = FactorBatchEvaluator(store, max_workers=1, chunk_size=len(plans))
+
+        result = asyncio.run(evaluator.evaluate(plans, panel, "ds1", "v1"))
+
+        assert "vwap" in result["factors"]["no_field"]["error"]
+        assert result["factors"]["bad_shape"]["status"] == "failed"
+        assert result["summary"]["computed"] == len(FORMULAS)
+
+    def test_progress(self, store, plans, panel):
+        """Test that progress reaches the factor total."""
+        reported = []
+
+        async def progress(done, total):
+            reported.append((done, total))
+
+        evaluator = FactorBatchEvaluator(store, max_workers=1, chunk_size=2)
+        asyncio.run(evaluator.evaluate(plans, panel, "ds1", "v1", progress))
+
+        assert reported[-1] == (len(plans), len(plans))
+        assert [done for done, _ in reported] == sorted(done for done, _ in reported)
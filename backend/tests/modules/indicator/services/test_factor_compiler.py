@@ -0,0 +1,264 @@
+"""
+Tests for the factor expression compiler
+
+Test Coverage:
+- Parsing, constant folding and canonical ordering
+- Common-subexpression elimination and formula hashing
+- Evaluation against pandas reference implementations
+- Compile and evaluation errors
+- Plan cache and multi-formula plans
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.modules.data_management.services.dataset_panel import DatasetPanel
+from app.modules.indicator.exceptions import (
+    FactorEvaluationError,
+    FormulaCompileError,
+    ValidationError,
+)
+from app.modules.indicator.services.factor_compiler import (
+    Constant,
+    clear_plan_cache,
+    compile_formula,
+    compile_formulas,
+    formula_hash,
+    parse_formula,
+)
+
+
+@pytest.fixture
+def panel():
+    """60 dates x 5 instruments with a few missing cells."""
+    rng = np.random.default_rng(42)
+    close = 50 + rng.normal(size=(60, 5)).cumsum(axis=0)
+    volume = rng.uniform(1e5, 1e6, size=(60, 5))
+    close[:3, 4] = np.nan  # listed late
+    volume[10, 2] = np.nan  # suspended
+    return DatasetPanel(
+        dates=pd.date_range("2024-01-01", periods=60).to_numpy(),
+        instruments=np.array([f"SH60000{i}" for i in range(5)], dtype=object),
+        fields={"close": close, "open": close * 0.99, "volume": volume},
+    )
+
+
+def evaluate(formula, panel, language="qlib_alpha"):
+    return compile_formula(formula, language).evaluate(panel)["factor"]
+
+
+class TestParsing:
+    """Test parsing and simplification."""
+
+    def test_constants_are_folded(self):
+        """Test that constant subexpressions are evaluated at compile time."""
+        expr = parse_formula("2 * 3 + 1")
+
+        assert isinstance(expr, Constant)
+        assert expr.value == 7
+
+    def test_identities_are_removed(self):
+        """Test that x * 1 and x + 0 reduce to x."""
+        assert str(parse_formula("(close * 1) + 0")) == "$close"
+
+    def test_fields_are_case_insensitive_and_dollar_prefixed(self):
+        """Test that $Close and close are the same field."""
+        assert str(parse_formula("$Close")) == str(parse_formula("close"))
+
+    def test_commutative_operands_are_ordered(self):
+        """Test that a + b and b + a have the same canonical form."""
+        assert formula_hash("close + open") == formula_hash("open + close")
+        assert formula_hash("close - open") != formula_hash("open - close")
+
+    def test_formatting_does_not_change_hash(self):
+        """Test that whitespace and function case keep the same hash."""
+        assert formula_hash("Mean($close,5)") == formula_hash("mean( close , 5 )")
+
+    def test_delta_is_lowered_to_ref(self):
+        """Test that Delta(x, n) is rewritten as x - Ref(x, n)."""
+        assert formula_hash("Delta(close, 5)") == formula_hash("close - Ref(close, 5)")
+
+    def test_python_language_accepts_conditional(self, panel):
+        """Test that python formulas support 'a if cond else b'."""
+        values = evaluate("close if close > open else open", panel, language="python")
+
+        np.testing.assert_allclose(values, panel.fields["close"], equal_nan=True)
+
+
+class TestCommonSubexpressions:
+    """Test step deduplication."""
+
+    def test_repeated_subexpression_is_one_step(self):
+        """Test that Ref(close, 20) is computed once in a momentum formula."""
+        plan = compile_formula("(close - Ref(close, 20)) / Ref(close, 20)")
+
+        # close, Ref(close, 20), Sub, Div
+        assert len(plan.steps) == 4
+        assert plan.fields == ["close"]
+
+    def test_formulas_share_steps(self):
+        """Test that a multi-formula plan shares common subexpressions."""
+        plan = compile_formulas({
+            "ma_ratio": "close / Mean(close, 20)",
+            "ma_gap": "close - Mean(close, 20)",
+        })
+
+        assert set(plan.outputs) == {"ma_ratio", "ma_gap"}
+        # close, Mean(close, 20), Div, Sub
+        assert len(plan.steps) == 4
+
+    def test_long_formula_compiles(self):
+        """Test that very long operator chains do not hit the recursion limit."""
+        plan = compile_formula("close " + "+ open " * 1000)
+
+        assert plan.fields == ["close", "open"]
+
+
+class TestEvaluation:
+    """Test evaluation against pandas references."""
+
+    def test_arithmetic(self, panel):
+        """Test elementwise arithmetic."""
+        close, open_ = panel.fields["close"], panel.fields["open"]
+
+        values = evaluate("(close - open) / open", panel)
+
+        np.testing.assert_allclose(values, (close - open_) / open_, equal_nan=True)
+
+    def test_momentum(self, panel):
+        """Test Ref-based momentum."""
+        close = pd.DataFrame(panel.fields["close"])
+
+        values = evaluate("(close - Ref(close, 20)) / Ref(close, 20)", panel)
+
+        np.testing.assert_allclose(values, close.pct_change(20, fill_method=None), equal_nan=True)
+
+    @pytest.mark.parametrize("func,method", [
+        ("Mean", "mean"), ("Sum", "sum"), ("Std", "std"), ("Max", "max"), ("Min", "min"),
+    ])
+    def test_rolling_operators(self, panel, func, method):
+        """Test rolling operators with Qlib's min_periods=1 semantics."""
+        volume = pd.DataFrame(panel.fields["volume"])
+        rolling = volume.rolling(10, min_periods=1)
+        expected = getattr(rolling, method)().where(rolling.count() > 0)
+
+        values = evaluate(f"{func}($volume, 10)", panel)
+
+        np.testing.assert_allclose(values, expected, rtol=1e-9, equal_nan=True)
+
+    @pytest.mark.parametrize("window", [3, 10, 100])
+    def test_window_operators_across_row_blocks(self, panel, window, monkeypatch):
+        """Test padded head rows, later row blocks and windows longer than the data."""
+        from app.modules.indicator.services import factor_ops
+        monkeypatch.setattr(factor_ops, "_WINDOW_BLOCK_ROWS", 7)
+        close = pd.DataFrame(panel.fields["close"])
+
+        values = evaluate(f"Max($close, {window})", panel)
+
+        np.testing.assert_allclose(values, close.rolling(window, min_periods=1).max(), equal_nan=True)
+
+    def test_rolling_corr(self, panel):
+        """Test rolling correlation of two fields."""
+        close = pd.DataFrame(panel.fields["close"])
+        volume = pd.DataFrame(panel.fields["volume"])
+        expected = close.rolling(10, min_periods=2).corr(volume)
+
+        values = evaluate("Corr($close, $volume, 10)", panel)
+
+        np.testing.assert_allclose(values, expected, rtol=1e-7, atol=1e-9, equal_nan=True)
+
+    def test_cross_sectional_rank(self, panel):
+        """Test that Rank(x) ranks instruments per date."""
+        close = pd.DataFrame(panel.fields["close"])
+
+        values = evaluate("Rank($close)", panel)
+
+        np.testing.assert_allclose(values, close.rank(axis=1, pct=True), equal_nan=True)
+
+    def test_time_series_rank(self, panel):
+        """Test that Rank(x, N) ranks the latest value within its window."""
+        close = pd.DataFrame(panel.fields["close"])
+        expected = close.rolling(5, min_periods=1).apply(
+            lambda w: pd.Series(w).rank(pct=True).iloc[-1], raw=True
+        ).where(close.notna())
+
+        values = evaluate("Rank($close, 5)", panel)
+
+        np.testing.assert_allclose(values, expected, equal_nan=True)
+
+    def test_division_by_zero_is_nan(self, panel):
+        """Test that division by zero yields NaN instead of inf."""
+        values = evaluate("close / (open - open)", panel)
+
+        assert np.isnan(values).all()
+
+    def test_constant_formula_is_broadcast(self, panel):
+        """Test that a constant formula returns a full panel."""
+        values = evaluate("1 + 1", panel)
+
+        assert values.shape == panel.shape
+        assert (values == 2).all()
+
+    def test_output_does_not_alias_panel(self, panel):
+        """Test that a plain field formula can be modified safely."""
+        values = evaluate("close + 0", panel)
+        values[:] = 0
+
+        assert not (panel.fields["close"] == 0).any()
+
+
+class TestErrors:
+    """Test compile and evaluation errors."""
+
+    @pytest.mark.parametrize("formula", [
+        "close +* open",
+        "",
+        "Foo(close)",
+        "Mean(close)",
+        "Mean(close, 0)",
+        "Mean(close, 2.5)",
+        "Max(close, 100000)",
+        "Ref(close, -100000)",
+        "Mean(close, open)",
+        "close.attr",
+        "'text'",
+        "__import__('os')",
+    ])
+    def test_invalid_formula_raises(self, formula):
+        """Test that invalid formulas raise FormulaCompileError."""
+        with pytest.raises(FormulaCompileError):
+            compile_formula(formula)
+
+    def test_compile_error_is_validation_error(self):
+        """Test that compile errors surface as validation errors."""
+        with pytest.raises(ValidationError, match="Invalid formula syntax"):
+            compile_formula("close +* open")
+
+    def test_pandas_language_is_not_compiled(self):
+        """Test that free-form pandas formulas are rejected."""
+        with pytest.raises(FormulaCompileError, match="cannot be compiled"):
+            compile_formula("df['close'].pct_change()", "pandas")
+
+    def test_missing_field_raises(self, panel):
+        """Test that evaluating an unknown field raises FactorEvaluationError."""
+        with pytest.raises(FactorEvaluationError, match="amount"):
+            evaluate("Mean($amount, 5)", panel)
+
+
+class TestPlanCache:
+    """Test compiled plan caching."""
+
+    def test_same_formula_returns_cached_plan(self):
+        """Test that compiling the same formula twice reuses the plan."""
+        clear_plan_cache()
+
+        assert compile_formula("Mean(close, 5)") is compile_formula("Mean(close, 5)")
+
+    def test_clear_plan_cache(self):
+        """Test that clearing the cache forces recompilation."""
+        plan = compile_formula("Mean(close, 5)")
+
+        clear_plan_cache()
+
+        assert compile_formula("Mean(close, 5)") is not plan
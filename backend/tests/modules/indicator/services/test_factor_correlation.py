@@ -0,0 +1,254 @@
+"""
+Tests for factor correlation analysis
+
+Test Coverage:
+- Rank correlation matrix against a per-date pandas Spearman reference
+- Blockwise computation, date sampling and the min_instruments cut-off
+- Redundancy clusters and greedy uncorrelated selection
+- FactorCorrelationService caching keyed by library version
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.modules.indicator.exceptions import ResourceNotFoundError, ValidationError
+from app.modules.indicator.services import factor_correlation
+from app.modules.indicator.services.factor_correlation_service import (
+    FactorCorrelationCache,
+    FactorCorrelationService,
+)
+from app.modules.indicator.services.factor_store import FactorValueStore
+
+
+def make_factors(n_dates=40, n_instruments=30, seed=7):
+    """Three factors: a base, a noisy copy of it and an independent one."""
+    rng = np.random.default_rng(seed)
+    base = rng.normal(size=(n_dates, n_instruments))
+    copy = base + 0.1 * rng.normal(size=base.shape)
+    independent = rng.normal(size=base.shape)
+    return [base, copy, independent]
+
+
+def spearman_reference(a, b, min_instruments=5):
+    """Mean per-date pandas Spearman correlation over dates with enough data."""
+    values = []
+    for t in range(a.shape[0]):
+        frame = pd.DataFrame({"a": a[t], "b": b[t]}).dropna()
+        if len(frame) >= min_instruments:
+            values.append(frame["a"].corr(frame["b"], method="spearman"))
+    return np.mean(values)
+
+
+class TestRankCorrelationMatrix:
+    """Test rank_correlation_matrix."""
+
+    def test_matches_pandas_spearman(self):
+        """Test that full-coverage factors match the per-date Spearman mean."""
+        factors = make_factors()
+
+        result = factor_correlation.rank_correlation_matrix(factors)
+
+        matrix = result["matrix"]
+        assert np.allclose(np.diag(matrix), 1.0)
+        assert np.allclose(matrix, matrix.T)
+        for i, j in [(0, 1), (0, 2), (1, 2)]:
+            assert matrix[i, j] == pytest.approx(spearman_reference(factors[i], factors[j]), abs=1e-5)
+        assert (result["periods"] == 40).all()
+        assert np.allclose(result["coverage"], 1.0)
+
+    def test_blockwise_equals_single_block(self):
+        """Test that a small memory budget gives the same result."""
+        factors = make_factors()
+        factors[1][factors[1] > 1.5] = np.nan
+
+        whole = factor_correlation.rank_correlation_matrix(factors)
+        blocks = factor_correlation.rank_correlation_matrix(factors, block_bytes=1)
+
+        assert np.allclose(whole["matrix"], blocks["matrix"], atol=1e-6)
+        assert (whole["periods"] == blocks["periods"]).all()
+
+    def test_missing_values_close_to_reference(self):
+        """Test that partial coverage stays close to the exact Spearman mean."""
+        factors = make_factors(seed=11)
+        rng = np.random.default_rng(0)
+        factors[0][rng.random(factors[0].shape) < 0.1] = np.nan
+
+        matrix = factor_correlation.rank_correlation_matrix(factors)["matrix"]
+
+        assert matrix[0, 1] == pytest.approx(spearman_reference(factors[0], factors[1]), abs=0.02)
+
+    def test_min_instruments_excludes_sparse_dates(self):
+        """Test that dates with too few shared instruments are left out."""
+        factors = make_factors()
+        factors[2][:10, 3:] = np.nan
+
+        result = factor_correlation.rank_correlation_matrix(factors, min_instruments=5)
+
+        assert result["periods"][0, 2] == 30
+        assert result["periods"][0, 1] == 40
+
+    def test_no_usable_date_is_nan(self):
+        """Test that pairs without any usable date have a NaN correlation."""
+        factors = make_factors()
+        factors[2][:] = np.nan
+
+        matrix = factor_correlation.rank_correlation_matrix(factors)["matrix"]
+
+        assert np.isnan(matrix[0, 2]) and np.isnan(matrix[2, 2])
+
+    def test_sample_rows(self):
+        """Test even date sampling."""
+        assert list(factor_correlation.sample_rows(5, 10)) == [0, 1, 2, 3, 4]
+        rows = factor_correlation.sample_rows(1000, 250)
+        assert len(rows) == 250 and rows[0] == 0 and rows[-1] == 999
+
+    def test_shape_mismatch(self):
+        """Test that misaligned factors are rejected."""
+        with pytest.raises(ValueError):
+            factor_correlation.rank_correlation_matrix([np.zeros((3, 4)), np.zeros((3, 5))])
+
+
+class TestRedundancy:
+    """Test correlated_clusters and select_uncorrelated."""
+
+    matrix = np.array([
+        [1.0, 0.9, 0.1, 0.0],
+        [0.9, 1.0, -0.8, 0.0],
+        [0.1, -0.8, 1.0, 0.2],
+        [0.0, 0.0, 0.2, 1.0],
+    ])
+
+    def test_clusters_are_transitive_and_use_absolute_value(self):
+        """Test that negatively correlated chains join one cluster."""
+        assert factor_correlation.correlated_clusters(self.matrix, 0.7) == [[0, 1, 2]]
+        assert factor_correlation.correlated_clusters(self.matrix, 0.95) == []
+
+    def test_select_uncorrelated(self):
+        """Test greedy selection in preference order."""
+        assert factor_correlation.select_uncorrelated(self.matrix, 0.7, [0, 1, 2, 3]) == [0, 2, 3]
+        assert factor_correlation.select_uncorrelated(self.matrix, 0.7, [1, 0, 2, 3]) == [1, 3]
+
+
+@pytest.fixture
+def dataset_file(tmp_path):
+    """Long-format CSV with 50 dates x 20 instruments."""
+    rng = np.random.default_rng(5)
+    dates = pd.date_range("2024-01-01", periods=50)
+    instruments = [f"SZ{i:06d}" for i in range(20)]
+    close = 20 * np.exp(rng.normal(0, 0.02, size=(50, 20)).cumsum(axis=0))
+    frame = pd.DataFrame({
+        "date": np.repeat(dates, 20),
+        "symbol": np.tile(instruments, 50),
+        "close": close.ravel(),
+        "volume": rng.integers(1000, 5000, size=1000),
+    })
+    path = tmp_path / "prices.csv"
+    frame.to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture
+def factors():
+    def factor(factor_id, formula):
+        return SimpleNamespace(
+            id=factor_id, factor_name=f"name-{factor_id}",
+            formula=formula, formula_language="qlib_alpha"
+        )
+    return {
+        "f1": factor("f1", "$close / Ref($close, 5) - 1"),
+        "f2": factor("f2", "2 * ($close / Ref($close, 5) - 1)"),
+        "f3": factor("f3", "$volume"),
+    }
+
+
+@pytest.fixture
+def service(factors, dataset_file, tmp_path):
+    library_repo = Mock(get_user_library=AsyncMock(return_value=[
+        SimpleNamespace(factor_id=factor_id) for factor_id in factors
+    ]))
+    custom_factor_repo = Mock(get=AsyncMock(side_effect=lambda factor_id: factors.get(factor_id)))
+    dataset = SimpleNamespace(id="dataset-1", file_path=str(dataset_file), version="1000@v1")
+    dataset_repo = Mock(get=AsyncMock(return_value=dataset))
+    return FactorCorrelationService(
+        library_repo, custom_factor_repo, dataset_repo,
+        factor_store=FactorValueStore(tmp_path / "factors"),
+        cache=FactorCorrelationCache(tmp_path / "correlations")
+    )
+
+
+@pytest.mark.asyncio
+class TestFactorCorrelationService:
+    """Test FactorCorrelationService."""
+
+    async def test_compute_and_cache(self, service):
+        """Test that redundant factors are clustered and the result is cached."""
+        assert await service.get_correlation("user123", "dataset-1") is None
+        progress = []
+
+        async def report(percentage):
+            progress.append(percentage)
+
+        result = await service.compute_correlation("user123", "dataset-1", progress=report)
+
+        assert [f["factor_id"] for f in result["factors"]] == ["f1", "f2", "f3"]
+        assert result["matrix"][0][1] == pytest.approx(1.0)
+        assert result["clusters"][0]["factor_ids"] == ["f1", "f2"]
+        assert sorted(result["selected"]) == ["f1", "f3"]
+        assert result["redundant"] == ["f2"]
+        assert progress == sorted(progress)
+
+        cached = await service.get_correlation("user123", "dataset-1")
+        assert cached["matrix"] == result["matrix"]
+
+    async def test_threshold_applied_on_read(self, service):
+        """Test that a different threshold reuses the cached matrix."""
+        await service.compute_correlation("user123", "dataset-1")
+
+        result = await service.get_correlation("user123", "dataset-1", {"threshold": 1.0 - 1e-9})
+
+        assert result is not None and result["threshold"] == pytest.approx(1.0)
+
+    async def test_formula_edit_invalidates(self, service, factors):
+        """Test that editing a library formula changes the library version."""
+        first = await service.compute_correlation("user123", "dataset-1")
+        factors["f3"].formula = "-$volume"
+
+        assert await service.get_correlation("user123", "dataset-1") is None
+        second = await service.compute_correlation("user123", "dataset-1")
+        assert second["library_version"] != first["library_version"]
+
+    async def test_failed_factor_is_excluded(self, service, factors):
+        """Test that factors that do not compile are listed as excluded."""
+        factors["f3"].formula = "Unknown($close)"
+
+        result = await service.compute_correlation("user123", "dataset-1")
+
+        assert [f["factor_id"] for f in result["factors"]] == ["f1", "f2"]
+        assert result["excluded"][0]["factor_id"] == "f3"
+
+    async def test_factor_outside_library(self, service):
+        """Test that only library factors can be compared."""
+        with pytest.raises(ValidationError):
+            await service.compute_correlation("user123", "dataset-1", factor_ids=["f1", "other"])
+
+    @pytest.mark.parametrize("config", [
+        {"threshold": 0},
+        {"min_instruments": 1},
+        {"max_dates": 0},
+        {"unknown_option": True},
+    ])
+    async def test_invalid_config(self, service, config):
+        """Test that invalid options are rejected."""
+        with pytest.raises(ValidationError):
+            await service.get_correlation("user123", "dataset-1", config)
+
+    async def test_missing_dataset(self, service):
+        """Test that a missing dataset is reported."""
+        service.dataset_repo.get = AsyncMock(return_value=None)
+
+        with pytest.raises(ResourceNotFoundError):
+            await service.get_correlation("user123", "dataset-1")
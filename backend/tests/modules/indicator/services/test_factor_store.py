@@ -0,0 +1,260 @@
+"""
+Tests for the factor value store
+
+Test Coverage:
+- Materialization, reuse and version keys
+- Incremental extension on appended dates and instruments
+- Memory-mapped, zero-copy slices
+- Garbage collection by formula hash and dataset
+- Write locking across store instances
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.modules.data_management.services.dataset_panel import DatasetPanel
+from app.modules.indicator.services.factor_compiler import compile_formula
+from app.modules.indicator.services import factor_store
+from app.modules.indicator.services.factor_store import FactorValueStore
+
+
+def make_panel(n_dates=80, instruments=("A", "B", "C"), seed=0):
+    rng = np.random.default_rng(seed)
+    close = 50 + rng.normal(size=(n_dates, len(instruments))).cumsum(axis=0)
+    return DatasetPanel(
+        dates=pd.date_range("2024-01-01", periods=n_dates).to_numpy(),
+        instruments=np.array(instruments, dtype=object),
+        fields={"close": close},
+    )
+
+
+def grow(panel, n_dates):
+    """Panel with the same history and extra dates appended."""
+    longer = make_panel(n_dates, tuple(panel.instruments))
+    longer.fields["close"][:len(panel.dates)] = panel.fields["close"]
+    return longer
+
+
+@pytest.fixture
+def store(tmp_path):
+    return FactorValueStore(tmp_path / "factors")
+
+
+@pytest.fixture
+def plan():
+    return compile_formula("Mean(close, 5) / Ref(close, 10) - 1")
+
+
+class TestMaterialize:
+    """Test computing and reusing stored values."""
+
+    def test_values_match_direct_evaluation(self, store, plan):
+        """Test that stored values equal the plan's output."""
+        panel = make_panel()
+
+        stored = store.materialize("f1", plan, "ds1", "v1", panel)
+
+        np.testing.assert_allclose(stored.values, plan.evaluate(panel)["factor"], equal_nan=True)
+        assert isinstance(stored.values, np.memmap)
+        assert list(stored.instruments) == ["A", "B", "C"]
+
+    def test_same_version_is_not_recomputed(self, store, plan, monkeypatch):
+        """Test that a stored version is read back without evaluation."""
+        panel = make_panel()
+        store.materialize("f1", plan, "ds1", "v1", panel)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("recomputed")
+        monkeypatch.setattr(type(plan), "evaluate", fail)
+
+        assert store.materialize("f1", plan, "ds1", "v1", panel).dataset_version == "v1"
+
+    def test_get_requires_matching_version(self, store, plan):
+        """Test that another dataset version is a miss."""
+        store.materialize("f1", plan, "ds1", "v1", make_panel())
+
+        assert store.get("f1", plan.formula_hash, "ds1", "v1") is not None
+        assert store.get("f1", plan.formula_hash, "ds1", "v2") is None
+        assert store.get("f1", "other-hash", "ds1") is None
+
+    def test_invalid_key_rejected(self, store, plan):
+        """Test that IDs cannot escape the store directory."""
+        with pytest.raises(ValueError):
+            store.materialize("../f1", plan, "ds1", "v1", make_panel())
+
+
+class TestIncrementalExtension:
+    """Test extending stored values when the dataset grows."""
+
+    def test_appended_dates(self, store, plan, monkeypatch):
+        """Test that only the tail plus lookback is computed."""
+        panel = make_panel(80)
+        store.materialize("f1", plan, "ds1", "v1", panel)
+        longer = grow(panel, 100)
+
+        evaluated_rows = []
+        original = type(plan).evaluate
+
+        def spy(self, p):
+            evaluated_rows.append(p.shape[0])
+            return original(self, p)
+        monkeypatch.setattr(type(plan), "evaluate", spy)
+
+        stored = store.materialize("f1", plan, "ds1", "v2", longer)
+
+        assert evaluated_rows == [20 + plan.lookback]
+        np.testing.assert_allclose(
+            stored.values, original(plan, longer)["factor"], equal_nan=True
+        )
+
+    def test_new_instrument(self, store, plan):
+        """Test that a newly listed instrument gets its full history."""
+        panel = make_panel(80, ("A", "B"))
+        store.materialize("f1", plan, "ds1", "v1", panel)
+        longer = make_panel(90, ("A", "B", "C"), seed=1)
+        longer.fields["close"][:80, :2] = panel.fields["close"]
+
+        stored = store.materialize("f1", plan, "ds1", "v2", longer)
+
+        np.testing.assert_allclose(stored.values, plan.evaluate(longer)["factor"], equal_nan=True)
+
+    def test_lookahead_rows_are_recomputed(self, store):
+        """Test that negative Ref recomputes the rows that see new dates."""
+        plan = compile_formula("Ref(close, -3) - close")
+        panel = make_panel(50)
+        first = store.materialize("f1", plan, "ds1", "v1", panel)
+        assert np.isnan(first.values[-3:]).all()
+
+        longer = grow(panel, 60)
+        stored = store.materialize("f1", plan, "ds1", "v2", longer)
+
+        np.testing.assert_allclose(stored.values, plan.evaluate(longer)["factor"], equal_nan=True)
+
+    def test_changed_history_recomputes(self, store, plan):
+        """Test that a panel with different dates is recomputed in full."""
+        store.materialize("f1", plan, "ds1", "v1", make_panel(80))
+        shifted = make_panel(80)
+        shifted.dates = shifted.dates + np.timedelta64(1, "D")
+
+        stored = store.materialize("f1", plan, "ds1", "v2", shifted)
+
+        np.testing.assert_array_equal(stored.dates, shifted.dates)
+
+    def test_cross_sectional_new_instrument_recomputes(self, store):
+        """Test that cross-sectional factors are recomputed when the universe changes."""
+        plan = compile_formula("Rank(close)")
+        panel = make_panel(30, ("A", "B"))
+        store.materialize("f1", plan, "ds1", "v1", panel)
+        longer = make_panel(30, ("A", "B", "C"))
+
+        stored = store.materialize("f1", plan, "ds1", "v2", longer)
+
+        np.testing.assert_allclose(stored.values, plan.evaluate(longer)["factor"])
+
+
+class TestReads:
+    """Test sliced reads."""
+
+    def test_date_range_and_instrument_run_are_views(self, store, plan):
+        """Test that contiguous slices do not copy the stored values."""
+        stored = store.materialize("f1", plan, "ds1", "v1", make_panel())
+
+        window = stored.slice(
+            start_date="2024-02-01", end_date="2024-02-29", instruments=["B", "C"]
+        )
+
+        assert window.shape == (29, 2)
+        assert np.shares_memory(window.values, stored.values)
+        np.testing.assert_array_equal(window.values, stored.values[31:60, 1:3])
+
+    def test_read_slices_memory_mapped_file(self, store, plan):
+        """Test that read() returns a memory-mapped slice."""
+        stored = store.materialize("f1", plan, "ds1", "v1", make_panel())
+
+        window = store.read("f1", plan.formula_hash, "ds1", "v1", start_date="2024-03-01")
+
+        assert isinstance(window.values, np.memmap)
+        np.testing.assert_array_equal(window.values, stored.values[60:])
+
+    def test_unordered_instruments(self, store, plan):
+        """Test that out-of-order instrument subsets are returned in request order."""
+        stored = store.materialize("f1", plan, "ds1", "v1", make_panel())
+
+        window = stored.slice(instruments=["C", "A"])
+
+        assert list(window.instruments) == ["C", "A"]
+        np.testing.assert_array_equal(window.values, stored.values[:, [2, 0]])
+
+    def test_read_missing_version(self, store, plan):
+        """Test that reading an unmaterialized version returns None."""
+        assert store.read("f1", plan.formula_hash, "ds1", "v1") is None
+
+
+class TestGarbageCollection:
+    """Test removing stale materializations."""
+
+    def test_gc_keeps_current_hash(self, store, plan):
+        """Test that gc removes other formula hashes only."""
+        old_plan = compile_formula("Mean(close, 10)")
+        store.materialize("f1", old_plan, "ds1", "v1", make_panel())
+        store.materialize("f1", old_plan, "ds2", "v1", make_panel())
+        store.materialize("f1", plan, "ds1", "v1", make_panel())
+
+        removed = store.gc("f1", keep_hash=plan.formula_hash)
+
+        assert removed == 2
+        assert store.get("f1", old_plan.formula_hash, "ds1") is None
+        assert store.get("f1", plan.formula_hash, "ds1") is not None
+
+    def test_gc_everything(self, store, plan):
+        """Test that gc without keep_hash removes the factor entirely."""
+        store.materialize("f1", plan, "ds1", "v1", make_panel())
+
+        assert store.gc("f1") == 1
+        assert store.list_materializations("f1") == []
+        assert store.gc("f1") == 0
+
+    def test_drop_dataset(self, store, plan):
+        """Test that dropping a dataset removes it for every factor."""
+        store.materialize("f1", plan, "ds1", "v1", make_panel())
+        store.materialize("f2", plan, "ds1", "v1", make_panel())
+        store.materialize("f1", plan, "ds2", "v1", make_panel())
+
+        assert store.drop_dataset("ds1") == 2
+        assert [m["dataset_id"] for m in store.list_materializations("f1")] == ["ds2"]
+
+    def test_single_generation_kept(self, store, plan):
+        """Test that rewrites leave one generation on disk."""
+        panel = make_panel()
+        store.materialize("f1", plan, "ds1", "v1", panel)
+        store.materialize("f1", plan, "ds1", "v2", grow(panel, 90))
+
+        directory = store.root / "f1" / plan.formula_hash / "ds1"
+        assert len([d for d in directory.iterdir() if d.is_dir()]) == 1
+
+
+@pytest.mark.skipif(factor_store.fcntl is None, reason="file locks need fcntl")
+class TestLocking:
+    """Test that writers of one entry are serialized through the lock file."""
+
+    def test_other_store_waits_for_lock(self, store, plan):
+        """Test that a second store (as in another process) blocks on the entry."""
+        other = FactorValueStore(store.root)
+        panel = make_panel()
+        done = threading.Event()
+
+        def write():
+            other.materialize("f1", plan, "ds1", "v1", panel)
+            done.set()
+
+        with store._lock(("f1", plan.formula_hash, "ds1")):
+            writer = threading.Thread(target=write)
+            writer.start()
+            assert not done.wait(0.3)
+        writer.join(10)
+
+        assert done.is_set()
+        assert store.get("f1", plan.formula_hash, "ds1", "v1") is not None
@@ -0,0 +1,279 @@
+"""
+Tests for the factor validation engine
+
+Test Coverage:
+- Forward returns
+- Row ranking with ties and missing values
+- Pearson / Spearman IC against pandas references
+- IC summary statistics
+- Factor distribution and histogram
+- Layered backtest buckets, returns and turnover against per-date loops
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.modules.common.utils.return_statistics import cumulative_returns
+from app.modules.indicator.services.factor_validation import (
+    RowRanker,
+    bucket_turnover,
+    factor_distribution,
+    factor_histogram,
+    forward_returns,
+    ic_analysis,
+    information_coefficient,
+    layered_backtest,
+    quantile_buckets,
+    rank_rows,
+    summarize_ic,
+)
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(7)
+
+
+@pytest.fixture
+def factor_and_returns(rng):
+    """40 dates x 30 instruments with scattered missing values."""
+    factor = rng.normal(size=(40, 30))
+    returns = 0.3 * factor + rng.normal(size=(40, 30))
+    factor[rng.random(factor.shape) < 0.1] = np.nan
+    returns[rng.random(returns.shape) < 0.1] = np.nan
+    return factor, returns
+
+
+class TestForwardReturns:
+    """Test forward return calculation."""
+
+    def test_forward_returns(self):
+        """Test that returns look horizon dates ahead."""
+        prices = np.array([[10.0], [11.0], [12.1], [13.31]])
+
+        returns = forward_returns(prices, 2)
+
+        np.testing.assert_allclose(returns[:2, 0], [0.21, 0.21])
+        assert np.isnan(returns[2:]).all()
+
+    def test_invalid_horizon(self):
+        """Test that non-positive horizons are rejected."""
+        with pytest.raises(ValueError):
+            forward_returns(np.ones((5, 2)), 0)
+
+
+class TestRanking:
+    """Test row ranking."""
+
+    def test_matches_pandas_with_ties_and_nan(self, rng):
+        """Test average ranks against pandas."""
+        values = rng.integers(0, 5, size=(20, 15)).astype(float)
+        values[rng.random(values.shape) < 0.2] = np.nan
+
+        expected = pd.DataFrame(values).rank(axis=1).to_numpy()
+
+        np.testing.assert_allclose(rank_rows(values), expected, equal_nan=True)
+
+    def test_ranks_within_mask(self, rng):
+        """Test that masked ranking equals ranking the masked values."""
+        values = rng.normal(size=(10, 12))
+        values[0, :4] = 1.0
+        mask = rng.random(values.shape) < 0.7
+
+        ranks = RowRanker(values).ranks(mask)
+
+        np.testing.assert_allclose(ranks, rank_rows(np.where(mask, values, np.nan)), equal_nan=True)
+
+
+class TestInformationCoefficient:
+    """Test daily IC calculation."""
+
+    def test_pearson_matches_pandas(self, factor_and_returns):
+        """Test Pearson IC per date against pandas corrwith."""
+        factor, returns = factor_and_returns
+        expected = pd.DataFrame(factor).T.corrwith(pd.DataFrame(returns).T).to_numpy()
+
+        ic = information_coefficient(factor, returns, "pearson", min_instruments=3)
+
+        np.testing.assert_allclose(ic, expected, equal_nan=True)
+
+    def test_spearman_matches_pandas(self, factor_and_returns):
+        """Test rank IC per date against pandas corrwith(method='spearman')."""
+        factor, returns = factor_and_returns
+        expected = pd.DataFrame(factor).T.corrwith(
+            pd.DataFrame(returns).T, method="spearman"
+        ).to_numpy()
+
+        ic = information_coefficient(factor, returns, "spearman", min_instruments=3)
+
+        np.testing.assert_allclose(ic, expected, equal_nan=True)
+
+    def test_min_instruments(self, factor_and_returns):
+        """Test that dates with too few instruments get NaN."""
+        factor, returns = factor_and_returns
+        factor = factor.copy()
+        factor[0, 3:] = np.nan
+
+        ic = information_coefficient(factor, returns, "pearson", min_instruments=5)
+
+        assert np.isnan(ic[0])
+
+    def test_constant_cross_section_is_nan(self):
+        """Test that a date with no factor dispersion has no IC."""
+        factor = np.ones((3, 10))
+        returns = np.arange(30, dtype=float).reshape(3, 10)
+
+        assert np.isnan(information_coefficient(factor, returns)).all()
+
+    def test_unknown_method(self, factor_and_returns):
+        """Test that unknown methods are rejected."""
+        with pytest.raises(ValueError):
+            information_coefficient(*factor_and_returns, method="kendall")
+
+    def test_predictive_factor(self, rng):
+        """Test that a factor equal to the next return has rank IC 1."""
+        prices = 100 * np.exp(rng.normal(0, 0.02, size=(60, 50)).cumsum(axis=0))
+        factor = forward_returns(prices, 1)
+
+        result = ic_analysis(factor, prices, horizons=(1, 5), method="spearman")
+
+        np.testing.assert_allclose(result[1][:-1], 1.0)
+        assert np.nanmean(result[5]) < 1.0
+
+
+class TestSummaries:
+    """Test summary statistics."""
+
+    def test_summarize_ic(self):
+        """Test IC mean, IR and t-stat."""
+        ic = np.array([0.1, 0.2, np.nan, 0.3, -0.1])
+
+        summary = summarize_ic(ic)
+
+        values = np.array([0.1, 0.2, 0.3, -0.1])
+        assert summary["n_periods"] == 4
+        assert summary["ic_mean"] == pytest.approx(values.mean())
+        assert summary["ic_ir"] == pytest.approx(values.mean() / values.std(ddof=1))
+        assert summary["t_stat"] == pytest.approx(summary["ic_ir"] * 2)
+        assert summary["positive_ratio"] == 0.75
+        assert summary["quantiles"]["p50"] == pytest.approx(0.15)
+
+    def test_summarize_empty(self):
+        """Test that an all-NaN series gives empty statistics."""
+        summary = summarize_ic(np.full(5, np.nan))
+
+        assert summary["n_periods"] == 0
+        assert summary["ic_mean"] is None
+
+    def test_factor_distribution(self, rng):
+        """Test distribution moments and coverage."""
+        factor = rng.normal(size=(100, 50))
+        factor[:, :10] = np.nan
+
+        result = factor_distribution(factor)
+
+        assert result["count"] == 4000
+        assert result["missing_ratio"] == pytest.approx(0.2)
+        assert result["coverage"] == pytest.approx(0.8)
+        assert abs(result["mean"]) < 0.1
+        assert abs(result["skew"]) < 0.2
+        assert abs(result["kurtosis"]) < 0.3
+
+    def test_factor_histogram(self, rng):
+        """Test that every value lands in a bin."""
+        factor = rng.normal(size=(20, 20))
+        factor[0, 0] = 1e6
+
+        histogram = factor_histogram(factor, bins=10)
+
+        assert len(histogram["edges"]) == 11
+        assert sum(histogram["counts"]) == 400
+
+
+
+def loop_buckets(factor, n_groups):
+    """Reference: bucket one date at a time with pandas."""
+    buckets = np.full(factor.shape, -1)
+    for t, row in enumerate(factor):
+        series = pd.Series(row).dropna()
+        ranks = series.rank()
+        buckets[t, series.index] = np.floor((ranks - 1) * n_groups / len(series)).astype(int)
+    return buckets
+
+
+class TestLayeredBacktest:
+    """Test the layered (quantile) backtest."""
+
+    def test_buckets_match_loop(self, factor_and_returns):
+        """Test bucket assignment against a per-date loop."""
+        factor, _ = factor_and_returns
+
+        buckets = quantile_buckets(factor, n_groups=5, min_instruments=5)
+
+        np.testing.assert_array_equal(buckets, loop_buckets(factor, 5))
+        counts = [np.bincount(row[row >= 0], minlength=5) for row in buckets]
+        assert all(c.max() - c.min() <= 1 for c in counts)
+
+    def test_too_few_instruments_not_bucketed(self):
+        """Test that sparse dates are left out."""
+        factor = np.arange(20, dtype=float).reshape(2, 10)
+        factor[0, 3:] = np.nan
+
+        buckets = quantile_buckets(factor, n_groups=5, min_instruments=5)
+
+        assert (buckets[0] == -1).all()
+        assert (buckets[1] >= 0).all()
+
+    def test_group_returns_match_loop(self, rng):
+        """Test equal-weighted bucket returns with periodic rebalancing."""
+        prices = 50 * np.exp(rng.normal(0, 0.02, size=(30, 25)).cumsum(axis=0))
+        prices[rng.random(prices.shape) < 0.05] = np.nan
+        factor = rng.normal(size=prices.shape)
+
+        result = layered_backtest(factor, prices, n_groups=4, rebalance_period=3)
+
+        buckets = loop_buckets(factor, 4)
+        returns = prices[1:] / prices[:-1] - 1
+        for t in range(29):
+            held = buckets[t - t % 3]
+            for g in range(4):
+                members = (held == g) & ~np.isnan(returns[t])
+                expected = returns[t][members].mean() if members.any() else np.nan
+                np.testing.assert_allclose(result["group_returns"][t, g], expected, equal_nan=True)
+        assert np.isnan(result["group_returns"][-1]).all()
+        np.testing.assert_allclose(
+            result["long_short"], result["group_returns"][:, 3] - result["group_returns"][:, 0]
+        )
+        np.testing.assert_array_equal(result["rebalance_rows"], np.arange(0, 30, 3))
+
+    def test_turnover_matches_weights(self, rng):
+        """Test turnover against explicit weight vectors."""
+        buckets = loop_buckets(rng.normal(size=(6, 40)), 5)
+        buckets[3, :5] = -1
+
+        turnover = bucket_turnover(buckets, 5)
+
+        assert np.isnan(turnover[0]).all()
+        for t in range(1, 6):
+            for g in range(5):
+                previous = (buckets[t - 1] == g) / max((buckets[t - 1] == g).sum(), 1)
+                current = (buckets[t] == g) / max((buckets[t] == g).sum(), 1)
+                assert turnover[t, g] == pytest.approx(np.abs(current - previous).sum() / 2)
+
+    def test_unchanged_buckets_have_no_turnover(self):
+        """Test that a static ranking never trades."""
+        buckets = np.tile(np.repeat(np.arange(4), 5), (3, 1))
+
+        np.testing.assert_allclose(bucket_turnover(buckets, 4)[1:], 0.0)
+
+    def test_predictive_factor_is_monotonic(self, rng):
+        """Test that a factor equal to the next return orders the buckets."""
+        prices = 50 * np.exp(rng.normal(0, 0.02, size=(100, 50)).cumsum(axis=0))
+        factor = forward_returns(prices, 1)
+
+        result = layered_backtest(factor, prices, n_groups=5)
+
+        totals = cumulative_returns(result["group_returns"])[-1]
+        assert np.all(np.diff(totals) > 0)
+        assert np.nanmin(result["long_short"]) > 0
@@ -0,0 +1,293 @@
+"""
+Tests for FactorValidationService
+
+Test Coverage:
+- Creating validations (type/config checks, authorization, missing records)
+- Reading validations with owner / public factor access checks
+- Running IC, rank IC, distribution, layered backtest and Sharpe ratio
+  validations end to end
+- Progress and status reporting through update_status
+- Failure handling
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.database.models.indicator import ValidationStatus, ValidationType
+from app.modules.indicator.exceptions import (
+    AuthorizationError,
+    ResourceNotFoundError,
+    ValidationError,
+)
+from app.modules.indicator.services.factor_store import FactorValueStore
+from app.modules.indicator.services.factor_validation_service import FactorValidationService
+
+
+@pytest.fixture
+def dataset_file(tmp_path):
+    """Long-format CSV with 60 dates x 20 instruments."""
+    rng = np.random.default_rng(3)
+    dates = pd.date_range("2024-01-01", periods=60)
+    instruments = [f"SZ{i:06d}" for i in range(20)]
+    close = 20 * np.exp(rng.normal(0, 0.02, size=(60, 20)).cumsum(axis=0))
+    frame = pd.DataFrame({
+        "date": np.repeat(dates, 20),
+        "symbol": np.tile(instruments, 60),
+        "close": close.ravel(),
+        "open": (close * 0.99).ravel(),
+    })
+    path = tmp_path / "prices.csv"
+    frame.to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture
+def factor():
+    return SimpleNamespace(
+        id="factor-1", user_id="user123", is_public=False,
+        formula="Ref($close, -1) / $close - 1", formula_language="qlib_alpha"
+    )
+
+
+@pytest.fixture
+def dataset(dataset_file):
+    return SimpleNamespace(id="dataset-1", file_path=str(dataset_file), version="1200@v1")
+
+
+@pytest.fixture
+def validation_repo():
+    """Repository mock that keeps one validation record in memory."""
+    repo = Mock()
+    record = SimpleNamespace(
+        id="validation-1", factor_id="factor-1", dataset_id="dataset-1",
+        validation_type=ValidationType.IC_ANALYSIS.value,
+        status=ValidationStatus.PENDING.value, progress_percentage=0.0,
+        started_at=None, completed_at=None, metrics=None, details=None,
+        error_message=None, created_at=None, updated_at=None,
+    )
+    repo.record = record
+    repo.progress = []
+
+    async def create(data, commit=True, user_id=None):
+        for key, value in data.items():
+            setattr(record, key, value)
+        return record
+
+    async def update_status(validation_id, status, progress=None, metrics=None,
+                            details=None, error_message=None):
+        record.status = status
+        if progress is not None:
+            record.progress_percentage = progress
+            repo.progress.append(progress)
+        for key, value in (("metrics", metrics), ("details", details),
+                           ("error_message", error_message)):
+            if value is not None:
+                setattr(record, key, value)
+        return record
+
+    repo.create = AsyncMock(side_effect=create)
+    repo.get = AsyncMock(return_value=record)
+    repo.update_status = AsyncMock(side_effect=update_status)
+    return repo
+
+
+@pytest.fixture
+def service(validation_repo, factor, dataset, tmp_path):
+    custom_factor_repo = Mock(get=AsyncMock(return_value=factor))
+    dataset_repo = Mock(get=AsyncMock(return_value=dataset))
+    return FactorValidationService(
+        validation_repo, custom_factor_repo, dataset_repo,
+        factor_store=FactorValueStore(tmp_path / "factors")
+    )
+
+
+@pytest.mark.asyncio
+class TestCreateValidation:
+    """Test create_validation."""
+
+    async def test_create_with_defaults(self, service, validation_repo):
+        """Test that a pending validation stores the resolved config."""
+        result = await service.create_validation(
+            "factor-1", "dataset-1", ValidationType.IC_ANALYSIS.value, "user123"
+        )
+
+        validation = result["validation"]
+        assert validation["status"] == ValidationStatus.PENDING.value
+        assert validation["details"]["config"]["horizons"] == [1, 5, 10, 20]
+
+    async def test_unsupported_type(self, service):
+        """Test that unsupported validation types are rejected."""
+        with pytest.raises(ValidationError):
+            await service.create_validation("factor-1", "dataset-1", "unknown", "user123")
+
+    @pytest.mark.parametrize("config", [
+        {"horizons": []},
+        {"horizons": [0]},
+        {"horizons": [1000]},
+        {"min_instruments": 1},
+        {"n_groups": 1},
+        {"rebalance_period": 0},
+        {"sharpe_window": 1},
+        {"unknown_option": True},
+    ])
+    async def test_invalid_config(self, service, config):
+        """Test that invalid options are rejected."""
+        with pytest.raises(ValidationError):
+            await service.create_validation(
+                "factor-1", "dataset-1", ValidationType.IC_ANALYSIS.value, "user123", config
+            )
+
+    async def test_private_factor_of_other_user(self, service):
+        """Test that other users' private factors cannot be validated."""
+        with pytest.raises(AuthorizationError):
+            await service.create_validation(
+                "factor-1", "dataset-1", ValidationType.IC_ANALYSIS.value, "other_user"
+            )
+
+    async def test_missing_dataset(self, service):
+        """Test that a missing dataset is reported."""
+        service.dataset_repo.get = AsyncMock(return_value=None)
+
+        with pytest.raises(ResourceNotFoundError):
+            await service.create_validation(
+                "factor-1", "dataset-1", ValidationType.IC_ANALYSIS.value, "user123"
+            )
+
+
+@pytest.mark.asyncio
+class TestGetValidations:
+    """Test reading validations with access checks."""
+
+    async def test_owner_reads_validation(self, service):
+        """Test that the factor's owner sees its validations."""
+        result = await service.get_validation(
+            "validation-1", factor_id="factor-1", authenticated_user_id="user123"
+        )
+
+        assert result["validation"]["id"] == "validation-1"
+
+    async def test_private_factor_of_other_user(self, service, validation_repo):
+        """Test that other users cannot read validations of a private factor."""
+        validation_repo.get_by_factor = AsyncMock(return_value=[validation_repo.record])
+
+        with pytest.raises(AuthorizationError):
+            await service.get_validation("validation-1", authenticated_user_id="other_user")
+        with pytest.raises(AuthorizationError):
+            await service.get_factor_validations("factor-1", authenticated_user_id="other_user")
+        validation_repo.get_by_factor.assert_not_called()
+
+    async def test_public_factor_of_other_user(self, service, validation_repo, factor):
+        """Test that validations of public factors are readable by anyone."""
+        factor.is_public = True
+        validation_repo.get_by_factor = AsyncMock(return_value=[validation_repo.record])
+
+        validations = await service.get_factor_validations(
+            "factor-1", authenticated_user_id="other_user"
+        )
+
+        assert [v["id"] for v in validations] == ["validation-1"]
+
+
+@pytest.mark.asyncio
+class TestRunValidation:
+    """Test run_validation end to end."""
+
+    async def test_ic_analysis(self, service, validation_repo):
+        """Test that IC results and progress are stored."""
+        validation_repo.record.details = {"config": {"horizons": [1, 5]}}
+
+        result = await service.run_validation("validation-1")
+
+        record = validation_repo.record
+        assert result["status"] == ValidationStatus.COMPLETED.value
+        assert record.status == ValidationStatus.COMPLETED.value
+        assert record.metrics["method"] == "pearson"
+        assert set(record.metrics["horizons"]) == {"1", "5"}
+        # The factor is the next-day return, so its 1-day IC is perfect
+        assert record.metrics["ic_mean"] == pytest.approx(1.0)
+        assert len(record.details["ic"]["1"]) == len(record.details["dates"]) == 60
+        assert validation_repo.progress == sorted(validation_repo.progress)
+        assert validation_repo.progress[-1] == 100.0
+
+    async def test_rank_ic_analysis(self, service, validation_repo):
+        """Test that rank IC uses the Spearman method."""
+        validation_repo.record.validation_type = ValidationType.IC_RANK_ANALYSIS.value
+
+        await service.run_validation("validation-1")
+
+        assert validation_repo.record.metrics["method"] == "spearman"
+        assert validation_repo.record.metrics["ic_mean"] == pytest.approx(1.0)
+
+    async def test_factor_distribution(self, service, validation_repo):
+        """Test that distribution statistics are stored."""
+        validation_repo.record.validation_type = ValidationType.FACTOR_DISTRIBUTION.value
+
+        await service.run_validation("validation-1")
+
+        record = validation_repo.record
+        assert record.metrics["count"] == 59 * 20
+        assert sum(record.details["histogram"]["counts"]) == 59 * 20
+
+    async def test_layered_backtest(self, service, validation_repo):
+        """Test that group summaries and compact series are stored."""
+        validation_repo.record.validation_type = ValidationType.LAYERED_BACKTEST.value
+        validation_repo.record.details = {"config": {"n_groups": 4, "rebalance_period": 5}}
+
+        await service.run_validation("validation-1")
+
+        record = validation_repo.record
+        assert set(record.metrics["groups"]) == {"1", "2", "3", "4"}
+        assert record.metrics["monotonicity"] == pytest.approx(1.0)
+        assert record.metrics["long_short"]["total_return"] > 0
+        assert len(record.details["cumulative_returns"]["4"]) == 60
+        assert record.details["turnover"]["rebalance_rows"] == list(range(0, 60, 5))
+
+    async def test_sharpe_ratio(self, service, validation_repo):
+        """Test that the long-short Sharpe ratio and its rolling series are stored."""
+        validation_repo.record.validation_type = ValidationType.SHARPE_RATIO.value
+        validation_repo.record.details = {"config": {"n_groups": 4, "sharpe_window": 20}}
+
+        await service.run_validation("validation-1")
+
+        record = validation_repo.record
+        # Long the highest next-day returns, short the lowest: always positive
+        assert record.metrics["sharpe"] > 0
+        assert record.metrics["sharpe"] == record.metrics["long_short"]["sharpe"]
+        assert record.metrics["long"]["total_return"] > record.metrics["short"]["total_return"]
+        rolling = record.details["rolling_sharpe"]
+        assert len(rolling) == len(record.details["dates"]) == 60
+        assert all(value > 0 for value in rolling if value is not None)
+
+    async def test_date_window(self, service, validation_repo):
+        """Test that start_date/end_date restrict the analysis."""
+        validation_repo.record.details = {
+            "config": {"horizons": [1], "start_date": "2024-02-01", "end_date": "2024-02-10"}
+        }
+
+        await service.run_validation("validation-1")
+
+        assert validation_repo.record.details["dates"][0] == "2024-02-01"
+        assert len(validation_repo.record.details["dates"]) == 10
+
+    async def test_missing_price_field_fails(self, service, validation_repo):
+        """Test that failures mark the validation as failed."""
+        validation_repo.record.details = {"config": {"price_field": "vwap"}}
+
+        with pytest.raises(ValidationError):
+            await service.run_validation("validation-1")
+
+        assert validation_repo.record.status == ValidationStatus.FAILED.value
+        assert "vwap" in validation_repo.record.error_message
+
+    async def test_completed_validation_is_skipped(self, service, validation_repo):
+        """Test that a completed validation is not recomputed."""
+        validation_repo.record.status = ValidationStatus.COMPLETED.value
+
+        result = await service.run_validation("validation-1")
+
+        assert result["skipped"] is True
+        validation_repo.update_status.assert_not_called()
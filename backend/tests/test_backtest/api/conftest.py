@@ -1,6 +1,7 @@
 """Fixtures for backtest API tests."""
 
 from typing import AsyncGenerator
+from unittest.mock import MagicMock, patch
 
 import pytest
 import pytest_asyncio
@@ -31,3 +32,39 @@ async def async_client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient,
             yield client
     finally:
         app.dependency_overrides.clear()
+
+
+@pytest.fixture(autouse=True)
+def dispatched_backtests():
+    """Capture run_backtest dispatches instead of sending them to a broker."""
+    from app.modules.backtest.tasks.backtest_tasks import run_backtest
+
+    with patch.object(run_backtest, "delay", MagicMock()) as delay:
+        yield delay
+
+
+@pytest.fixture(autouse=True)
+def dispatched_batch_backtests():
+    """Capture run_batch_backtest dispatches instead of sending them to a broker."""
+    from app.modules.backtest.tasks.backtest_tasks import run_batch_backtest
+
+    with patch.object(run_batch_backtest, "delay", MagicMock()) as delay:
+        yield delay
+
+
+@pytest.fixture(autouse=True)
+def dispatched_optimizations():
+    """Capture run_optimization dispatches instead of sending them to a broker."""
+    from app.modules.backtest.tasks.optimization_tasks import run_optimization
+
+    with patch.object(run_optimization, "delay", MagicMock()) as delay:
+        yield delay
+
+
+@pytest.fixture(autouse=True)
+def dispatched_walk_forwards():
+    """Capture run_walk_forward dispatches instead of sending them to a broker."""
+    from app.modules.backtest.tasks.walk_forward_tasks import run_walk_forward
+
+    with patch.object(run_walk_forward, "delay", MagicMock()) as delay:
+        yield delay
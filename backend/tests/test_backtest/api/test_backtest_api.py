@@ -150,8 +150,8 @@ class TestExecutionEndpoints:
     """Test backtest execution endpoints."""
 
     @pytest.mark.asyncio
-    async def test_start_backtest_success(self, async_client: AsyncClient):
-        """Test starting a backtest."""
+    async def test_start_backtest_success(self, async_client: AsyncClient, dispatched_backtests):
+        """Test starting a backtest queues the run."""
         # ARRANGE - Create config first
         config_data = {
             "strategy_id": "strategy_005",
@@ -174,15 +174,88 @@ class TestExecutionEndpoints:
         assert data["config_id"] == config_id
         assert data["status"] == "PENDING"
         assert "id" in data
+        dispatched_backtests.assert_called_once_with(data["id"])
 
     @pytest.mark.asyncio
-    async def test_start_backtest_invalid_config(self, async_client: AsyncClient):
+    async def test_start_backtest_invalid_config(self, async_client: AsyncClient, dispatched_backtests):
         """Test starting backtest with invalid config ID."""
         # ACT
         response = await async_client.post("/api/backtest/nonexistent_id/start")
 
         # ASSERT
         assert response.status_code == 404
+        dispatched_backtests.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_start_batch_backtest(self, async_client: AsyncClient, dispatched_batch_backtests):
+        """Test starting a batch backtest queues one run for all strategies."""
+        # ARRANGE - Create config first
+        config_data = {
+            "strategy_id": "strategy_006",
+            "dataset_id": "dataset_006",
+            "start_date": "2023-01-01",
+            "end_date": "2023-12-31",
+            "initial_capital": "100000.00",
+            "commission_rate": "0.001",
+            "slippage": "0.0005"
+        }
+        create_response = await async_client.post("/api/backtest/config", json=config_data)
+        config_id = create_response.json()["id"]
+
+        # ACT
+        response = await async_client.post(
+            f"/api/backtest/{config_id}/batch",
+            json={"strategy_ids": ["strategy_006", "strategy_006b"]}
+        )
+
+        # ASSERT
+        assert response.status_code == 201
+        results = response.json()["results"]
+        assert len(results) == 2
+        assert results[0]["config_id"] == config_id
+        assert all(result["status"] == "PENDING" for result in results)
+        dispatched_batch_backtests.assert_called_once_with([result["id"] for result in results])
+
+    @pytest.mark.asyncio
+    async def test_start_batch_backtest_without_strategies(
+        self, async_client: AsyncClient, dispatched_batch_backtests
+    ):
+        """Test that a batch needs a list of strategies."""
+        # ACT
+        response = await async_client.post("/api/backtest/nonexistent_id/batch", json={})
+
+        # ASSERT
+        assert response.status_code == 400
+        dispatched_batch_backtests.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_start_optimization(self, async_client: AsyncClient, dispatched_optimizations):
+        """Test starting a parameter sweep queues an OPTIMIZATION task."""
+        # ACT
+        response = await async_client.post("/api/backtest/optimizations", json={
+            "strategy_id": "strategy_007",
+            "dataset_id": "dataset_007",
+            "grid": {"top_k": [10, 20], "rebalance_period": [1, 5]},
+        })
+
+        # ASSERT
+        assert response.status_code == 202
+        data = response.json()
+        assert data["status"] == "PENDING"
+        dispatched_optimizations.assert_called_once_with(data["task_id"])
+
+    @pytest.mark.asyncio
+    async def test_start_optimization_invalid_options(self, async_client: AsyncClient, dispatched_optimizations):
+        """Test that a sweep without a grid or search space is rejected."""
+        # ACT
+        response = await async_client.post("/api/backtest/optimizations", json={
+            "strategy_id": "strategy_007",
+            "dataset_id": "dataset_007",
+        })
+
+        # ASSERT
+        assert response.status_code == 400
+        dispatched_optimizations.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_get_backtest_status_success(self, async_client: AsyncClient):
@@ -219,6 +292,100 @@ class TestExecutionEndpoints:
         # ASSERT
         assert response.status_code == 404
 
+    @pytest.mark.asyncio
+    async def test_start_walk_forward(self, async_client: AsyncClient, dispatched_walk_forwards):
+        """Test that a walk-forward analysis is queued as a WALK_FORWARD task."""
+        # ARRANGE - Create config and start backtest
+        config_data = {
+            "strategy_id": "strategy_008",
+            "dataset_id": "dataset_008",
+            "start_date": "2023-01-01",
+            "end_date": "2023-12-31",
+            "initial_capital": "100000.00",
+            "commission_rate": "0.001",
+            "slippage": "0.0005"
+        }
+        create_response = await async_client.post("/api/backtest/config", json=config_data)
+        start_response = await async_client.post(f"/api/backtest/{create_response.json()['id']}/start")
+        result_id = start_response.json()["id"]
+
+        # ACT
+        response = await async_client.post(
+            f"/api/backtest/results/{result_id}/walk-forward", json={"n_folds": 3}
+        )
+
+        # ASSERT
+        assert response.status_code == 202
+        data = response.json()
+        assert data["status"] == "PENDING"
+        dispatched_walk_forwards.assert_called_once_with(data["task_id"])
+
+    @pytest.mark.asyncio
+    async def test_walk_forward_errors(self, async_client: AsyncClient, dispatched_walk_forwards):
+        """Test walk-forward analysis of a missing result and with invalid options."""
+        # ACT
+        missing = await async_client.post("/api/backtest/results/nonexistent_id/walk-forward", json={})
+        invalid = await async_client.post(
+            "/api/backtest/results/nonexistent_id/walk-forward", json={"in_sample_ratio": 2}
+        )
+
+        # ASSERT
+        assert missing.status_code == 404
+        assert invalid.status_code == 400
+        dispatched_walk_forwards.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_trade_analysis_not_found(self, async_client: AsyncClient):
+        """Test trade analysis of a missing result."""
+        # ACT
+        response = await async_client.get("/api/backtest/results/nonexistent_id/trade-analysis")
+
+        # ASSERT
+        assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_monte_carlo_errors(self, async_client: AsyncClient):
+        """Test Monte Carlo analysis of a missing result and with invalid parameters."""
+        # ACT
+        missing = await async_client.get("/api/backtest/results/nonexistent_id/monte-carlo")
+        invalid = await async_client.get("/api/backtest/results/nonexistent_id/monte-carlo?n_paths=0")
+
+        # ASSERT
+        assert missing.status_code == 404
+        assert invalid.status_code == 422
+
+    @pytest.mark.asyncio
+    async def test_relative_metrics_and_ranking_errors(self, async_client: AsyncClient):
+        """Test relative metrics of missing results and ranking by an unknown metric."""
+        # ACT
+        missing = await async_client.post(
+            "/api/backtest/results/relative-metrics", json={"result_ids": ["nonexistent_id"]}
+        )
+        invalid = await async_client.post("/api/backtest/results/relative-metrics", json={"result_ids": "x"})
+        ranking = await async_client.get("/api/backtest/results/ranking?order_by=information_ratio")
+        unknown = await async_client.get("/api/backtest/results/ranking?order_by=unknown")
+
+        # ASSERT
+        assert missing.status_code == 404
+        assert invalid.status_code == 400
+        assert ranking.status_code == 200
+        assert unknown.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_report_export_errors(self, async_client: AsyncClient):
+        """Test report export of a missing result, an unknown format and an unrendered report."""
+        # ACT
+        missing = await async_client.post(
+            "/api/backtest/results/nonexistent_id/reports", json={"format": "pdf"}
+        )
+        download = await async_client.get("/api/backtest/results/nonexistent_id/reports/pdf")
+        unknown = await async_client.get("/api/backtest/results/nonexistent_id/reports/docx")
+
+        # ASSERT
+        assert missing.status_code == 404
+        assert download.status_code == 404
+        assert unknown.status_code == 400
+
 
 class TestAPIErrorHandling:
     """Test API error handling and edge cases."""
@@ -1,5 +1,10 @@
 """Fixtures for backtest integration tests."""
 
 # Import fixtures directly from API tests
-from tests.test_backtest.api.conftest import async_client  # noqa: F401
+from tests.test_backtest.api.conftest import (  # noqa: F401
+    async_client,
+    dispatched_backtests,
+    dispatched_batch_backtests,
+    dispatched_optimizations,
+)
 from tests.test_backtest.repositories.conftest import db_session, test_engine  # noqa: F401
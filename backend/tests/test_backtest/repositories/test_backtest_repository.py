@@ -6,6 +6,7 @@ This test suite follows TDD principles and covers:
 - Query operations (by strategy, status, date range)
 - Soft delete functionality
 - Pagination and filtering
+- Bulk creation and updates for batch backtests
 - Edge cases and error handling
 
 Target: 100% test coverage for BacktestRepository
@@ -532,6 +533,39 @@ class TestBacktestRepositoryQueries:
         assert top_results[1].total_return == Decimal("0.25")
         assert top_results[2].total_return == Decimal("0.20")
 
+    @pytest.mark.asyncio
+    async def test_rank_results_by_information_ratio(self, db_session: AsyncSession):
+        """Test ranking by a relative metric, skipping results without one"""
+        repository = BacktestRepository(db_session)
+        config = await repository.create_config({
+            "strategy_id": "strategy_ir",
+            "dataset_id": "dataset_ir",
+            "start_date": date(2020, 1, 1),
+            "end_date": date(2023, 12, 31),
+            "initial_capital": Decimal("1000000.00"),
+            "commission_rate": Decimal("0.001"),
+            "slippage": Decimal("0.0005"),
+        })
+        ratios = [
+            ("SH000300", Decimal("0.5")), ("SH000300", Decimal("1.2")),
+            ("equal_weight", Decimal("2.0")), (None, None),
+        ]
+        for benchmark, ratio in ratios:
+            await repository.create_result({
+                "config_id": config.id,
+                "status": BacktestStatus.COMPLETED.value,
+                "benchmark": benchmark,
+                "information_ratio": ratio,
+            })
+
+        ranked = await repository.get_best_performing_results(order_by="information_ratio")
+        csi300 = await repository.get_best_performing_results(order_by="information_ratio", benchmark="SH000300")
+
+        assert [r.information_ratio for r in ranked] == [Decimal("2.0"), Decimal("1.2"), Decimal("0.5")]
+        assert [r.information_ratio for r in csi300] == [Decimal("1.2"), Decimal("0.5")]
+        with pytest.raises(ValueError):
+            await repository.get_best_performing_results(order_by="config_id")
+
     @pytest.mark.asyncio
     async def test_count_results_by_status(self, db_session: AsyncSession):
         """Test counting results by status"""
@@ -578,6 +612,97 @@ class TestBacktestRepositoryQueries:
         assert failed_count >= 1
 
 
+class TestBacktestRepositoryBulkOperations:
+    """Test suite for bulk operations of batch backtests"""
+
+    @staticmethod
+    def _config_data(strategy_id: str) -> dict:
+        return {
+            "strategy_id": strategy_id,
+            "dataset_id": "dataset_bulk",
+            "start_date": date(2020, 1, 1),
+            "end_date": date(2023, 12, 31),
+            "initial_capital": Decimal("1000000.00"),
+            "commission_rate": Decimal("0.001"),
+            "slippage": Decimal("0.0005"),
+        }
+
+    @staticmethod
+    def _pending() -> dict:
+        return {
+            "status": BacktestStatus.PENDING.value,
+            "total_return": Decimal("0.0"),
+            "annual_return": Decimal("0.0"),
+            "sharpe_ratio": Decimal("0.0"),
+            "max_drawdown": Decimal("0.0"),
+            "win_rate": Decimal("0.0"),
+        }
+
+    @pytest.mark.asyncio
+    async def test_create_configs_with_results(self, db_session: AsyncSession):
+        """Test creating configs and results together, reusing an existing config"""
+        repository = BacktestRepository(db_session)
+        existing = await repository.create_config(self._config_data("strategy_base"))
+
+        results = await repository.create_configs_with_results(
+            [self._config_data("strategy_a"), {"id": existing.id}, self._config_data("strategy_b")],
+            self._pending(),
+        )
+
+        assert len(results) == 3
+        assert results[1].config_id == existing.id
+        assert all(result.status == BacktestStatus.PENDING.value for result in results)
+        configs = await repository.get_configs_by_ids([result.config_id for result in results])
+        assert {config.strategy_id for config in configs} == {"strategy_a", "strategy_base", "strategy_b"}
+
+    @pytest.mark.asyncio
+    async def test_get_results_by_ids(self, db_session: AsyncSession):
+        """Test loading several results at once, skipping unknown IDs"""
+        repository = BacktestRepository(db_session)
+        results = await repository.create_configs_with_results(
+            [self._config_data("strategy_a"), self._config_data("strategy_b")], self._pending()
+        )
+
+        loaded = await repository.get_results_by_ids([results[0].id, "missing-id", results[1].id])
+
+        assert {result.id for result in loaded} == {results[0].id, results[1].id}
+
+    @pytest.mark.asyncio
+    async def test_update_results(self, db_session: AsyncSession):
+        """Test updating several results in one transaction"""
+        repository = BacktestRepository(db_session)
+        results = await repository.create_configs_with_results(
+            [self._config_data("strategy_a"), self._config_data("strategy_b")], self._pending()
+        )
+
+        updated = await repository.update_results({
+            results[0].id: {"status": BacktestStatus.COMPLETED.value, "total_return": Decimal("0.12")},
+            results[1].id: {"status": BacktestStatus.FAILED.value, "metrics": {"error": "boom"}},
+        })
+
+        by_id = {result.id: result for result in updated}
+        assert by_id[results[0].id].status == BacktestStatus.COMPLETED.value
+        assert by_id[results[0].id].total_return == Decimal("0.12")
+        assert by_id[results[1].id].metrics == {"error": "boom"}
+
+
+    @pytest.mark.asyncio
+    async def test_find_completed_by_fingerprint(self, db_session: AsyncSession):
+        """Test that only completed results match a fingerprint"""
+        repository = BacktestRepository(db_session)
+        results = await repository.create_configs_with_results(
+            [self._config_data("strategy_a"), self._config_data("strategy_b")],
+            {**self._pending(), "fingerprint": "f" * 64},
+        )
+        assert await repository.find_completed_by_fingerprint("f" * 64) is None
+
+        await repository.update_results({results[1].id: {"status": BacktestStatus.COMPLETED.value}})
+
+        found = await repository.find_completed_by_fingerprint("f" * 64)
+        assert found.id == results[1].id
+        assert await repository.find_completed_by_fingerprint("0" * 64) is None
+
+
 class TestBacktestRepositoryErrorHandling:
     """Test suite for error handling in BacktestRepository"""
 
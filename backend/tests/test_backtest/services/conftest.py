@@ -12,6 +12,8 @@ from pathlib import Path
 parent_dir = Path(__file__).parent.parent / "repositories"
 sys.path.insert(0, str(parent_dir))
 
+import numpy as np
+import pandas as pd
 import pytest
 import pytest_asyncio
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -53,17 +55,19 @@ async def analysis_service(backtest_repository: BacktestRepository) -> ResultsAn
 
 
 @pytest_asyncio.fixture
-async def diagnostic_service(backtest_repository: BacktestRepository):
+async def diagnostic_service(backtest_repository: BacktestRepository, tmp_path):
     """Create a DiagnosticService instance for testing."""
     from app.modules.backtest.services.diagnostic_service import DiagnosticService
-    return DiagnosticService(backtest_repository)
+    from app.modules.backtest.services.result_store import BacktestResultStore
+    return DiagnosticService(backtest_repository, result_store=BacktestResultStore(tmp_path / "results"))
 
 
 @pytest_asyncio.fixture
-async def export_service(backtest_repository: BacktestRepository):
+async def export_service(backtest_repository: BacktestRepository, tmp_path):
     """Create an ExportService instance for testing."""
     from app.modules.backtest.services.export_service import ExportService
-    return ExportService(backtest_repository)
+    from app.modules.backtest.services.result_store import BacktestResultStore
+    return ExportService(backtest_repository, result_store=BacktestResultStore(tmp_path / "results"))
 
 
 @pytest_asyncio.fixture
@@ -81,7 +85,10 @@ async def sample_result_id(backtest_repository: BacktestRepository) -> str:
     }
     config = await backtest_repository.create_config(config_data)
 
-    # Create result with dictionary
+    # Create result with dictionary (daily series inline, as stored before the result store)
+    rng = np.random.default_rng(1)
+    returns = rng.normal(0.0005, 0.01, 120)
+    returns[0] = 0.0
     result_data = {
         "config_id": config.id,
         "status": "COMPLETED",
@@ -89,7 +96,12 @@ async def sample_result_id(backtest_repository: BacktestRepository) -> str:
         "annual_return": Decimal("0.15"),
         "sharpe_ratio": Decimal("1.5"),
         "max_drawdown": Decimal("0.10"),
-        "win_rate": Decimal("0.60")
+        "win_rate": Decimal("0.60"),
+        "metrics": {
+            "dates": [str(d.date()) for d in pd.bdate_range("2023-01-02", periods=120)],
+            "returns": returns.round(6).tolist(),
+            "equity_curve": (100000.0 * np.cumprod(1 + returns)).round(2).tolist(),
+        }
     }
     result = await backtest_repository.create_result(result_data)
     return result.id
@@ -3,16 +3,20 @@ TDD Tests for Results Analysis Service
 
 Test coverage for:
 - Metrics calculation (returns, Sharpe ratio, max drawdown)
-- Trade analysis (win rate, profit/loss ratio)
+- Trade analysis (win rate, profit/loss ratio, round trip statistics)
 - Performance statistics
+- Stored time series reads
+- Result deletion with stored files
 """
 
+import numpy as np
 import pytest
 from decimal import Decimal
 from datetime import date
 
 from app.modules.backtest.services.analysis_service import ResultsAnalysisService
-from app.modules.backtest.exceptions import ResourceNotFoundError
+from app.modules.backtest.services.result_store import BacktestResultStore
+from app.modules.backtest.exceptions import InvalidConfigError, ResourceNotFoundError
 
 
 class TestMetricsCalculation:
@@ -94,9 +98,11 @@ class TestTradeAnalysis:
         # ACT
         trade_stats = await analysis_service.analyze_trades(result.id)
 
-        # ASSERT
+        # ASSERT - Without trade data the P/L ratio is not derived from the win rate
         assert trade_stats["win_rate"] == Decimal("0.0")
-        assert trade_stats["profit_loss_ratio"] == Decimal("0.0")  # P/L ratio should be 0
+        assert trade_stats["profit_loss_ratio"] is None
+        assert trade_stats["total_trades"] == 0
+        assert trade_stats["round_trips"] is None
 
     @pytest.mark.asyncio
     async def test_analyze_trades_with_perfect_win_rate(self, analysis_service: ResultsAnalysisService, db_session):
@@ -134,6 +140,44 @@ class TestTradeAnalysis:
         assert trade_stats["win_rate"] == Decimal("1.0")
         assert trade_stats["profit_loss_ratio"] is None  # P/L ratio is undefined for 100% win rate
 
+    @pytest.mark.asyncio
+    async def test_analyze_trades_from_round_trips(self, backtest_repository, sample_result_id: str, tmp_path):
+        """Test round trip statistics computed from the stored round trips."""
+        # ARRANGE - Two closed round trips (one win, one loss) and one open
+        store = BacktestResultStore(tmp_path / "results")
+        store.write(sample_result_id, {
+            "round_trips": {
+                "date": np.array(["2023-01-02", "2023-01-03", "2023-01-05"], dtype="datetime64[D]"),
+                "direction": np.array([1, -1, 1], dtype=np.int8),
+                "holding_period": np.array([2, 4, 3], dtype=np.int32),
+                "pnl": np.array([30.0, -10.0, 5.0]),
+                "return": np.array([0.03, -0.01, 0.005]),
+                "mae": np.array([0.01, 0.02, 0.0]),
+                "mfe": np.array([0.05, 0.0, 0.01]),
+                "closed": np.array([True, True, False]),
+            },
+        })
+        await backtest_repository.update_result(sample_result_id, {
+            "artifact_path": sample_result_id,
+            "trades": {"total_trades": 5, "profit_loss_ratio": 9.0},
+        })
+        service = ResultsAnalysisService(backtest_repository, result_store=store)
+
+        # ACT
+        trade_stats = await service.analyze_trades(sample_result_id)
+
+        # ASSERT
+        trips = trade_stats["round_trips"]
+        assert trade_stats["total_trades"] == 5
+        assert trade_stats["profit_loss_ratio"] == pytest.approx(3.0)
+        assert (trips["round_trips"], trips["closed_trips"], trips["open_trips"]) == (3, 2, 1)
+        assert (trips["long_trips"], trips["short_trips"]) == (2, 1)
+        assert trips["win_rate"] == 0.5
+        assert trips["expectancy"] == pytest.approx(10.0)
+        assert trips["largest_loss"] == -10.0
+        assert trips["avg_holding_period"] == pytest.approx(3.0)
+        assert trips["avg_mfe"] == pytest.approx(0.02)
+
 
 class TestPerformanceStatistics:
     """Test performance statistics functionality."""
@@ -149,3 +193,71 @@ class TestPerformanceStatistics:
         assert "trades" in summary
         assert summary["metrics"]["total_return"] is not None
         assert summary["trades"]["win_rate"] is not None
+
+
+class TestStoredSeries:
+    """Test reading stored time series of results."""
+
+    @pytest.mark.asyncio
+    async def test_get_series_projection(self, backtest_repository, sample_result_id: str, tmp_path):
+        """Test reading some columns of a date range from the result store."""
+        # ARRANGE - Store an equity curve for the sample result
+        store = BacktestResultStore(tmp_path / "results")
+        dates = np.arange("2023-01-02", 5, dtype="datetime64[D]")
+        store.write(sample_result_id, {
+            "equity": {"date": dates, "equity": np.array([100.0, 101.0, np.nan, 103.0, 104.0])},
+        })
+        await backtest_repository.update_result(sample_result_id, {"artifact_path": sample_result_id})
+        service = ResultsAnalysisService(backtest_repository, result_store=store)
+
+        # ACT
+        series = await service.get_series(
+            sample_result_id, "equity", ["date", "equity"], start_date="2023-01-03", limit=3
+        )
+
+        # ASSERT
+        assert series["rows"] == 3
+        assert series["columns"]["date"] == ["2023-01-03", "2023-01-04", "2023-01-05"]
+        assert series["columns"]["equity"] == [101.0, None, 103.0]
+
+    @pytest.mark.asyncio
+    async def test_get_series_errors(self, analysis_service: ResultsAnalysisService, sample_result_id: str):
+        """Test unknown series and results without stored series."""
+        with pytest.raises(InvalidConfigError):
+            await analysis_service.get_series(sample_result_id, "orders")
+        with pytest.raises(ResourceNotFoundError):
+            await analysis_service.get_series(sample_result_id, "round_trips")
+        with pytest.raises(ResourceNotFoundError):
+            await analysis_service.get_series(sample_result_id, "positions")
+        with pytest.raises(ResourceNotFoundError):
+            await analysis_service.get_series("nonexistent_id", "equity")
+
+
+class TestDeleteResult:
+    """Test deleting results and their stored files."""
+
+    @pytest.mark.asyncio
+    async def test_delete_keeps_shared_artifacts(self, backtest_repository, sample_result_id: str, tmp_path):
+        """Test that artifacts are removed once no remaining result reads them."""
+        # ARRANGE - A second result reuses the sample result's artifacts
+        store = BacktestResultStore(tmp_path / "results")
+        store.write(sample_result_id, {"equity": {"date": np.arange("2023-01-02", 3, dtype="datetime64[D]")}})
+        source = await backtest_repository.update_result(sample_result_id, {"artifact_path": sample_result_id})
+        reused = await backtest_repository.create_result({
+            "config_id": source.config_id, "status": "COMPLETED", "artifact_path": sample_result_id,
+        })
+        service = ResultsAnalysisService(backtest_repository, result_store=store)
+
+        # ACT & ASSERT - The source goes, its files stay for the reused result
+        await service.delete_result(sample_result_id)
+        assert await backtest_repository.get_result_by_id(sample_result_id) is None
+        assert (await service.get_series(reused.id, "equity"))["rows"] == 3
+
+        await service.delete_result(reused.id)
+        assert not (tmp_path / "results" / sample_result_id).exists()
+
+    @pytest.mark.asyncio
+    async def test_delete_not_found(self, analysis_service: ResultsAnalysisService):
+        """Test deleting a non-existent result."""
+        with pytest.raises(ResourceNotFoundError):
+            await analysis_service.delete_result("nonexistent_id")
@@ -0,0 +1,322 @@
+"""
+Tests for the vectorized backtest engine
+
+Test Coverage:
+- Signal -> target weights (top k, long-short, weight mode, rebalance period)
+- Fills one date after the decision, with commission and slippage
+- Untradable instruments and forward-filled valuation
+- Realized P&L, trade statistics and performance metrics
+- Round trips rebuilt from the fills (flips, partial exits, excursions)
+- Batch simulation of several schedules on the same prices
+"""
+
+import numpy as np
+import pytest
+
+from app.modules.backtest.services.backtest_engine import (
+    RebalanceSchedule,
+    forward_fill,
+    performance_metrics,
+    position_history,
+    round_trip_statistics,
+    round_trips,
+    simulate,
+    simulate_batch,
+    target_weights,
+    trade_statistics,
+)
+
+
+class TestTargetWeights:
+    """Test signal to target weight conversion."""
+
+    def test_top_k_equal_weights(self):
+        """Test that the k highest signals share the capital equally."""
+        signal = np.array([[1.0, 3.0, 2.0, np.nan]])
+        prices = np.array([[10.0, 10.0, 10.0, 10.0]])
+
+        schedule = target_weights(signal, prices, top_k=2)
+
+        np.testing.assert_allclose(schedule.weights, [[0.0, 0.5, 0.5, 0.0]])
+        np.testing.assert_array_equal(schedule.rows, [0])
+
+    def test_long_short(self):
+        """Test that the lowest signals are shorted with half the capital per leg."""
+        signal = np.array([[1.0, 4.0, 2.0, 3.0]])
+        prices = np.ones((1, 4))
+
+        schedule = target_weights(signal, prices, top_k=1, long_short=True)
+
+        np.testing.assert_allclose(schedule.weights, [[-0.5, 0.5, 0.0, 0.0]])
+
+    def test_untradable_and_fewer_than_k(self):
+        """Test that instruments without a price are skipped and k shrinks."""
+        signal = np.array([[5.0, 1.0, 2.0]])
+        prices = np.array([[np.nan, 10.0, 10.0]])
+
+        schedule = target_weights(signal, prices, top_k=5)
+
+        np.testing.assert_allclose(schedule.weights, [[0.0, 0.5, 0.5]])
+
+    def test_weight_mode_scales_gross_exposure(self):
+        """Test that weight signals above 100% gross are scaled down."""
+        signal = np.array([[0.2, 0.3], [1.0, -1.0]])
+        prices = np.ones((2, 2))
+
+        schedule = target_weights(signal, prices, mode="weight")
+
+        np.testing.assert_allclose(schedule.weights, [[0.2, 0.3], [0.5, -0.5]])
+
+    def test_rebalance_period_and_empty_dates(self):
+        """Test rebalance spacing and that dates without signals are skipped."""
+        signal = np.ones((7, 2))
+        signal[2] = np.nan
+        prices = np.ones((7, 2))
+
+        schedule = target_weights(signal, prices, top_k=1, rebalance_period=2)
+
+        np.testing.assert_array_equal(schedule.rows, [0, 4, 6])
+
+    def test_invalid_mode(self):
+        """Test that unknown modes are rejected."""
+        with pytest.raises(ValueError):
+            target_weights(np.ones((1, 1)), np.ones((1, 1)), mode="unknown")
+
+
+class TestSimulate:
+    """Test the portfolio simulation."""
+
+    def test_fills_next_date_without_costs(self):
+        """Test that targets fill one date later and equity follows prices."""
+        prices = np.array([[10.0], [10.0], [11.0], [12.1]])
+        schedule = RebalanceSchedule(rows=np.array([0]), weights=np.array([[1.0]]))
+
+        run = simulate(prices, schedule, 1000.0)
+
+        np.testing.assert_allclose(run.equity, [1000.0, 1000.0, 1100.0, 1210.0])
+        np.testing.assert_allclose(run.returns, [0.0, 0.0, 0.1, 0.1])
+        np.testing.assert_allclose(run.positions, [100.0])
+        assert run.trades["date_index"].tolist() == [1]
+        assert run.turnover[1] == pytest.approx(1.0)
+
+    def test_commission_and_slippage(self):
+        """Test fill prices and commissions on a buy and a sell."""
+        prices = np.array([[10.0], [10.0], [10.0]])
+        schedule = RebalanceSchedule(rows=np.array([0, 1]), weights=np.array([[1.0], [0.0]]))
+
+        run = simulate(prices, schedule, 1000.0, commission_rate=0.01, slippage=0.01)
+
+        trades = run.trades
+        sizing = 1.0 / 1.02
+        bought = 1000.0 * sizing / 10.0
+        np.testing.assert_allclose(trades["quantity"], [bought, -bought])
+        np.testing.assert_allclose(trades["price"], [10.1, 9.9])
+        np.testing.assert_allclose(trades["commission"], [bought * 10.1 * 0.01, bought * 9.9 * 0.01])
+        assert np.isnan(trades["pnl"][0])
+        assert trades["pnl"][1] == pytest.approx(bought * (9.9 - 10.1) - bought * 9.9 * 0.01)
+
+        expected_cash = 1000.0 - bought * 10.1 * 1.01 + bought * 9.9 * 0.99
+        assert run.cash[-1] == pytest.approx(expected_cash)
+        assert run.positions[0] == 0.0
+        assert run.equity[-1] == pytest.approx(expected_cash)
+
+    def test_untradable_position_is_held_and_marked_at_last_price(self):
+        """Test that a suspended instrument is neither sold nor revalued."""
+        prices = np.array([[10.0, 10.0], [10.0, 10.0], [np.nan, 20.0], [np.nan, 20.0]])
+        schedule = RebalanceSchedule(
+            rows=np.array([0, 1]), weights=np.array([[0.5, 0.5], [0.0, 1.0]])
+        )
+
+        run = simulate(prices, schedule, 1000.0)
+
+        # Instrument 0 is suspended on the second fill date and keeps its shares
+        np.testing.assert_allclose(run.positions[0], 50.0)
+        np.testing.assert_allclose(run.equity[-1], 500.0 + 50.0 * 20.0)
+
+    def test_short_position_profit(self):
+        """Test realized P&L of covering a short after a price drop."""
+        prices = np.array([[10.0], [10.0], [8.0]])
+        schedule = RebalanceSchedule(rows=np.array([0, 1]), weights=np.array([[-1.0], [0.0]]))
+
+        run = simulate(prices, schedule, 1000.0)
+
+        np.testing.assert_allclose(run.trades["quantity"], [-100.0, 100.0])
+        assert run.trades["pnl"][1] == pytest.approx(200.0)
+        assert run.equity[-1] == pytest.approx(1200.0)
+
+    def test_matches_weighted_returns_when_rebalanced_daily(self):
+        """Test that daily rebalancing without costs earns the weighted return."""
+        rng = np.random.default_rng(5)
+        prices = 10 * np.exp(rng.normal(0, 0.02, size=(30, 6)).cumsum(axis=0))
+        weights = rng.dirichlet(np.ones(6), size=30)
+        schedule = RebalanceSchedule(rows=np.arange(30), weights=weights)
+
+        run = simulate(prices, schedule, 1e6)
+
+        asset_returns = prices[1:] / prices[:-1] - 1
+        expected = (weights[:-2] * asset_returns[1:]).sum(axis=1)
+        np.testing.assert_allclose(run.returns[2:], expected, atol=1e-9)
+
+    def test_position_history(self):
+        """Test that holdings rebuilt from trades end at the final positions."""
+        rng = np.random.default_rng(3)
+        prices = 10 * np.exp(rng.normal(0, 0.02, size=(40, 6)).cumsum(axis=0))
+        schedule = target_weights(rng.normal(size=prices.shape), prices, "score", 2, False, 5)
+        run = simulate(prices, schedule, 1e5, commission_rate=0.001)
+
+        holdings = position_history(run.trades, 40)
+
+        assert np.all(np.diff(holdings["date_index"]) >= 0)
+        last = holdings["date_index"] == 39
+        final = np.zeros(6)
+        final[holdings["instrument_index"][last]] = holdings["shares"][last]
+        np.testing.assert_allclose(final, run.positions, atol=1e-9)
+        assert not np.any(holdings["date_index"] == 0)
+
+    def test_progress(self):
+        """Test that progress ends at 1."""
+        seen = []
+        prices = np.ones((40, 2))
+        schedule = RebalanceSchedule(rows=np.array([0]), weights=np.array([[0.5, 0.5]]))
+
+        simulate(prices, schedule, 1000.0, progress=seen.append)
+
+        assert seen[-1] == 1.0
+
+    def test_checkpoint_stops_early(self):
+        """Test that a checkpoint returning False truncates the run."""
+        seen = []
+        prices = np.linspace(10.0, 14.0, 40)[:, None] * np.ones((1, 2))
+        schedule = RebalanceSchedule(rows=np.array([0]), weights=np.array([[0.5, 0.5]]))
+        full = simulate(prices, schedule, 1000.0)
+
+        def checkpoint(simulated, equity):
+            seen.append((simulated, len(equity)))
+            return simulated < 10
+
+        run = simulate(prices, schedule, 1000.0, checkpoint=checkpoint)
+
+        assert seen[-1] == (10, 10)
+        assert len(run.equity) == len(run.returns) == len(run.turnover) == 10
+        np.testing.assert_allclose(run.equity, full.equity[:10])
+
+
+class TestSimulateBatch:
+    """Test simulating several schedules as one stacked array."""
+
+    def test_matches_individual_simulations(self):
+        """Test that each batch run equals simulating its schedule alone."""
+        rng = np.random.default_rng(7)
+        prices = 10 * np.exp(rng.normal(0, 0.02, size=(60, 8)).cumsum(axis=0))
+        prices[:10, 3] = np.nan
+        prices[30:35, 5] = np.nan
+        signal = rng.normal(size=prices.shape)
+        schedules = [
+            target_weights(signal, prices, "score", 2, False, 1),
+            target_weights(-signal, prices, "score", 3, True, 5),
+            target_weights(signal, prices, "score", 4, False, 10),
+        ]
+
+        runs = simulate_batch(prices, schedules, 1e6, commission_rate=0.001, slippage=0.0005)
+
+        assert len(runs) == 3
+        for schedule, run in zip(schedules, runs):
+            single = simulate(prices, schedule, 1e6, commission_rate=0.001, slippage=0.0005)
+            np.testing.assert_allclose(run.equity, single.equity, rtol=1e-9)
+            np.testing.assert_allclose(run.cash, single.cash, rtol=1e-9, atol=1e-6)
+            np.testing.assert_allclose(run.positions, single.positions, rtol=1e-9, atol=1e-9)
+            np.testing.assert_allclose(run.turnover, single.turnover, rtol=1e-9, atol=1e-12)
+            for key in ("date_index", "instrument_index"):
+                np.testing.assert_array_equal(run.trades[key], single.trades[key])
+            np.testing.assert_allclose(run.trades["quantity"], single.trades["quantity"], rtol=1e-9)
+            np.testing.assert_allclose(run.trades["pnl"], single.trades["pnl"], rtol=1e-6, atol=1e-6)
+
+    def test_empty_batch(self):
+        """Test that no schedules give no runs."""
+        assert simulate_batch(np.ones((5, 2)), [], 1000.0) == []
+
+
+class TestStatistics:
+    """Test trade statistics and performance metrics."""
+
+    def test_forward_fill(self):
+        """Test that gaps carry the last price and leading gaps stay NaN."""
+        prices = np.array([[np.nan, 1.0], [2.0, np.nan], [np.nan, 3.0]])
+
+        filled = forward_fill(prices)
+
+        np.testing.assert_array_equal(np.isnan(filled), [[True, False], [False, False], [False, False]])
+        np.testing.assert_allclose(filled[1:], [[2.0, 1.0], [2.0, 3.0]])
+
+    def test_trade_statistics(self):
+        """Test win rate over closing trades."""
+        trades = {
+            "quantity": np.array([10.0, -5.0, -5.0, 3.0]),
+            "commission": np.array([1.0, 1.0, 1.0, 1.0]),
+            "pnl": np.array([np.nan, 20.0, -10.0, np.nan]),
+        }
+
+        stats = trade_statistics(trades)
+
+        assert stats["total_trades"] == 4
+        assert stats["closing_trades"] == 2
+        assert stats["win_rate"] == 0.5
+        assert stats["profit_loss_ratio"] == pytest.approx(2.0)
+        assert stats["total_commission"] == 4.0
+
+    def test_round_trips(self):
+        """Test partial exits, a flip to short and a position left open."""
+        prices = np.array([[10.0, 20.0], [12.0, 18.0], [8.0, np.nan], [11.0, 22.0], [15.0, 25.0]])
+        trades = {
+            "date_index": np.array([0, 1, 1, 2, 3], dtype=np.int32),
+            "instrument_index": np.array([0, 0, 1, 0, 0], dtype=np.int32),
+            "quantity": np.array([100.0, -50.0, 10.0, -150.0, 100.0]),
+            "price": np.array([10.0, 12.0, 18.0, 8.0, 11.0]),
+            "commission": np.ones(5),
+            "pnl": np.array([np.nan, 99.0, np.nan, -101.0, -301.0]),
+        }
+
+        trips = round_trips(trades, prices)
+
+        # Sorted by entry: long 0 (closed by the flip), long 1 (open), short 0
+        np.testing.assert_array_equal(trips["entry_index"], [0, 1, 2])
+        np.testing.assert_array_equal(trips["exit_index"], [2, -1, 3])
+        np.testing.assert_array_equal(trips["instrument_index"], [0, 1, 0])
+        np.testing.assert_array_equal(trips["direction"], [1, 1, -1])
+        np.testing.assert_array_equal(trips["closed"], [True, False, True])
+        np.testing.assert_allclose(trips["quantity"], [100.0, 10.0, 100.0])
+        np.testing.assert_allclose(trips["entry_price"], [10.0, 18.0, 8.0])
+        np.testing.assert_allclose(trips["exit_price"], [10.0, 25.0, 11.0])
+        np.testing.assert_array_equal(trips["holding_period"], [2, 3, 1])
+        # Open trip: unrealized (25 - 18) * 10 less its entry commission
+        np.testing.assert_allclose(trips["pnl"], [-3.0, 69.0, -301.0])
+        np.testing.assert_allclose(trips["commission"], [3.0, 1.0, 1.0])
+        np.testing.assert_allclose(trips["mfe"], [0.2, 25.0 / 18.0 - 1.0, 0.0])
+        np.testing.assert_allclose(trips["mae"], [0.2, 0.0, 0.375])
+
+    def test_round_trips_match_simulation(self):
+        """Test that round trip pnl adds up to the run's profit."""
+        rng = np.random.default_rng(3)
+        prices = 10.0 * np.exp(np.cumsum(rng.normal(0, 0.02, (120, 6)), axis=0))
+        schedule = target_weights(rng.normal(size=(120, 6)), prices, "score", 2, True, 5)
+        run = simulate(prices, schedule, 10000.0, commission_rate=0.001)
+
+        trips = round_trips(run.trades, prices)
+        stats = round_trip_statistics(trips)
+
+        assert trips["pnl"].sum() == pytest.approx(run.equity[-1] - 10000.0)
+        assert stats["round_trips"] == stats["closed_trips"] + stats["open_trips"]
+        assert stats["long_trips"] > 0 and stats["short_trips"] > 0
+        assert round_trips({name: column[:0] for name, column in run.trades.items()}, prices)["pnl"].size == 0
+
+    def test_performance_metrics(self):
+        """Test headline metrics of a simple run."""
+        prices = np.array([[10.0], [10.0], [12.0], [9.0], [10.0]])
+        schedule = RebalanceSchedule(rows=np.array([0, 3]), weights=np.array([[1.0], [0.0]]))
+
+        metrics = performance_metrics(simulate(prices, schedule, 1000.0))
+
+        assert metrics["total_return"] == pytest.approx(0.0)
+        assert metrics["max_drawdown"] == pytest.approx(0.25)
+        assert metrics["win_rate"] == 0.0
+        assert metrics["final_equity"] == pytest.approx(1000.0)
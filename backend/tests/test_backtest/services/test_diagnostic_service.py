@@ -2,17 +2,30 @@
 TDD Tests for Diagnostic Service
 
 Test coverage for:
-- Risk analysis (volatility, VaR, CVaR)
+- Risk analysis (volatility, VaR, CVaR) from the stored return series
 - Return analysis (return sources, distribution)
-- Overfitting detection (in-sample vs out-sample comparison)
+- Vectorized risk analytics and the cached report
+- Overfitting detection (walk-forward folds, deflated Sharpe ratio, heuristic fallback)
+- Monte Carlo stationary block bootstrap
 - Optimization suggestions
 """
 
+import numpy as np
 import pytest
 from decimal import Decimal
+from statistics import NormalDist
 
 from app.modules.backtest.services.diagnostic_service import DiagnosticService
-from app.modules.backtest.exceptions import ResourceNotFoundError
+from app.modules.backtest.services.monte_carlo import MAX_PATHS, bootstrap_report, stationary_bootstrap_indices
+from app.modules.backtest.services.risk_analytics import risk_report, rolling_volatility, value_at_risk
+from app.modules.backtest.services.walk_forward import (
+    deflated_sharpe_ratio,
+    expected_max_sharpe,
+    overfitting_score,
+    probabilistic_sharpe_ratio,
+    walk_forward_folds,
+)
+from app.modules.backtest.exceptions import InvalidConfigError, ResourceNotFoundError
 
 
 class TestRiskAnalysis:
@@ -30,6 +43,46 @@ class TestRiskAnalysis:
         assert "cvar_95" in risk_metrics  # Conditional VaR at 95%
         assert isinstance(risk_metrics["volatility"], (Decimal, float))
 
+    @pytest.mark.asyncio
+    async def test_risk_metrics_from_return_series(
+        self, diagnostic_service: DiagnosticService, sample_result_id: str, backtest_repository
+    ):
+        """Test that risk metrics are computed from the daily returns."""
+        # ARRANGE
+        result = await backtest_repository.get_result_by_id(sample_result_id)
+        returns = np.array(result.metrics["returns"])
+
+        # ACT
+        risk_metrics = await diagnostic_service.calculate_risk_metrics(sample_result_id)
+
+        # ASSERT
+        assert risk_metrics["n_periods"] == 120
+        assert risk_metrics["volatility"] == pytest.approx(returns.std(ddof=1) * np.sqrt(252))
+        assert risk_metrics["var_95"] == pytest.approx(-np.quantile(returns, 0.05))
+        assert risk_metrics["cvar_95"] >= risk_metrics["var_95"]
+        assert risk_metrics["var_99"] >= risk_metrics["var_95"]
+        assert risk_metrics["parametric"]["cvar_95"] > risk_metrics["parametric"]["var_95"]
+        assert risk_metrics["sortino_ratio"] is not None
+        rolling = risk_metrics["rolling_volatility"]
+        assert len(rolling["values"]) == len(rolling["dates"]) == 120
+        assert rolling["values"][:19] == [None] * 19
+
+    @pytest.mark.asyncio
+    async def test_risk_report_is_cached(self, diagnostic_service: DiagnosticService, sample_result_id: str):
+        """Test that the report is computed once and then read from the cache."""
+        # ARRANGE
+        first = await diagnostic_service.get_risk_report(sample_result_id)
+        cached = diagnostic_service.result_store.read_document(sample_result_id, "risk")
+        cached["report"]["risk"]["volatility"] = -1.0
+        diagnostic_service.result_store.write_document(sample_result_id, "risk", cached)
+
+        # ACT
+        second = await diagnostic_service.get_risk_report(sample_result_id)
+
+        # ASSERT
+        assert first["risk"]["volatility"] > 0
+        assert second["risk"]["volatility"] == -1.0
+
     @pytest.mark.asyncio
     async def test_risk_analysis_not_found(self, diagnostic_service: DiagnosticService):
         """Test risk analysis for non-existent result."""
@@ -53,6 +106,21 @@ class TestReturnAnalysis:
         assert "positive_days" in return_analysis
         assert "negative_days" in return_analysis
 
+    @pytest.mark.asyncio
+    async def test_return_distribution_counts_days(
+        self, diagnostic_service: DiagnosticService, sample_result_id: str
+    ):
+        """Test that day counts and the histogram cover every return."""
+        # ACT
+        return_analysis = await diagnostic_service.analyze_return_sources(sample_result_id)
+
+        # ASSERT
+        days = return_analysis["positive_days"] + return_analysis["negative_days"] + return_analysis["flat_days"]
+        assert days == 120
+        assert return_analysis["flat_days"] >= 1
+        assert sum(return_analysis["histogram"]["counts"]) == 120
+        assert len(return_analysis["histogram"]["edges"]) == len(return_analysis["histogram"]["counts"]) + 1
+
     @pytest.mark.asyncio
     async def test_return_analysis_not_found(self, diagnostic_service: DiagnosticService):
         """Test return analysis for non-existent result."""
@@ -61,6 +129,51 @@ class TestReturnAnalysis:
             await diagnostic_service.analyze_return_sources("nonexistent_id")
 
 
+class TestRiskAnalytics:
+    """Test the vectorized risk statistics."""
+
+    def test_value_at_risk_of_normal_returns(self):
+        """Test that historical and parametric VaR agree on normal returns."""
+        returns = np.random.default_rng(0).normal(0.0, 0.01, 200000)
+
+        var = value_at_risk(returns, 0.95)
+
+        z = NormalDist().inv_cdf(0.05)
+        assert var["parametric_var"] == pytest.approx(-z * 0.01, rel=0.01)
+        assert var["historical_var"] == pytest.approx(var["parametric_var"], rel=0.02)
+        assert var["historical_cvar"] == pytest.approx(var["parametric_cvar"], rel=0.02)
+
+    def test_rolling_volatility_matches_windows(self):
+        """Test the rolling volatility against explicit windows."""
+        returns = np.random.default_rng(1).normal(0.0, 0.01, 30)
+
+        rolling = rolling_volatility(returns, window=5, periods_per_year=1)
+
+        assert np.isnan(rolling[:4]).all()
+        assert rolling[10] == pytest.approx(returns[6:11].std(ddof=1))
+
+    def test_ratios(self):
+        """Test downside deviation, Sortino and Calmar on a known series."""
+        returns = np.array([0.01, -0.02, 0.03, -0.01, 0.02])
+
+        risk = risk_report(returns, periods_per_year=1)["risk"]
+
+        downside = np.sqrt(np.mean(np.minimum(returns, 0) ** 2))
+        assert risk["downside_deviation"] == pytest.approx(downside)
+        assert risk["sortino_ratio"] == pytest.approx(returns.mean() / downside)
+        assert risk["max_drawdown"] == pytest.approx(0.02)
+        assert risk["calmar_ratio"] == pytest.approx(risk["annual_return"] / risk["max_drawdown"])
+
+    def test_empty_series(self):
+        """Test that an empty series gives empty statistics."""
+        report = risk_report(np.zeros(0))
+
+        assert report["risk"]["n_periods"] == 0
+        assert report["risk"]["volatility"] is None
+        assert report["risk"]["historical_var_95"] is None
+        assert report["distribution"]["histogram"]["counts"] == []
+
+
 class TestOverfittingDetection:
     """Test overfitting detection functionality."""
 
@@ -83,6 +196,213 @@ class TestOverfittingDetection:
         with pytest.raises(ResourceNotFoundError):
             await diagnostic_service.detect_overfitting("nonexistent_id")
 
+    @pytest.mark.asyncio
+    async def test_detect_overfitting_uses_walk_forward_report(
+        self, diagnostic_service: DiagnosticService, sample_result_id: str
+    ):
+        """Test that a cached walk-forward report replaces the heuristic."""
+        # ARRANGE
+        summary = {
+            "completed_folds": 5,
+            "degradation_ratio": 0.2,
+            "deflated_sharpe": {"deflated_sharpe_ratio": 0.4},
+        }
+        diagnostic_service.result_store.write_document(
+            sample_result_id, "walk_forward", {"version": 1, "report": {"options": {}, "summary": summary}}
+        )
+
+        # ACT
+        analysis = await diagnostic_service.detect_overfitting(sample_result_id)
+
+        # ASSERT
+        assert analysis["method"] == "walk_forward"
+        assert analysis["overfitting_score"] == Decimal("0.7")
+        assert analysis["stability_score"] == Decimal("0.3")
+        assert "out-of-sample" in analysis["recommendation"]
+
+    @pytest.mark.asyncio
+    async def test_heuristic_without_walk_forward_report(
+        self, diagnostic_service: DiagnosticService, sample_result_id: str
+    ):
+        """Test the win rate / Sharpe heuristic when no walk-forward analysis ran."""
+        analysis = await diagnostic_service.detect_overfitting(sample_result_id)
+
+        assert analysis["method"] == "heuristic"
+        assert analysis["walk_forward"] is None
+        assert analysis["overfitting_score"] == Decimal("0.0")
+
+
+class TestWalkForwardStatistics:
+    """Test walk-forward folds and Sharpe ratio statistics."""
+
+    def test_rolling_folds_tile_the_period(self):
+        """Test that OOS windows tile the end and IS windows keep their length."""
+        folds = walk_forward_folds(122, 5, 0.75)
+
+        assert folds[0] == {"in_sample_start": 0, "in_sample_stop": 47, "out_of_sample_stop": 62}
+        assert folds[-1]["out_of_sample_stop"] == 122
+        for previous, fold in zip(folds, folds[1:]):
+            assert fold["in_sample_stop"] == previous["out_of_sample_stop"]
+            assert fold["in_sample_stop"] - fold["in_sample_start"] == 47
+
+    def test_anchored_folds_grow_from_the_start(self):
+        """Test that anchored in-sample windows all start at the first date."""
+        folds = walk_forward_folds(100, 4, 0.5, anchored=True)
+
+        assert {fold["in_sample_start"] for fold in folds} == {0}
+        assert [fold["in_sample_stop"] for fold in folds] == [20, 40, 60, 80]
+
+    def test_invalid_folds(self):
+        """Test that too short periods and invalid options are rejected."""
+        with pytest.raises(InvalidConfigError, match="too few"):
+            walk_forward_folds(30, 10, 0.75)
+        with pytest.raises(InvalidConfigError, match="in_sample_ratio"):
+            walk_forward_folds(100, 3, 1.0)
+        with pytest.raises(InvalidConfigError, match="n_folds"):
+            walk_forward_folds(100, 0, 0.5)
+
+    def test_probabilistic_sharpe_ratio(self):
+        """Test the PSR against its normal-returns closed form."""
+        assert probabilistic_sharpe_ratio(0.1, 101) == pytest.approx(
+            NormalDist().cdf(0.1 * 10 / np.sqrt(1 + 0.5 * 0.01))
+        )
+        assert probabilistic_sharpe_ratio(0.0, 50) == pytest.approx(0.5)
+        # Negative skew and fat tails widen the Sharpe ratio's error
+        assert probabilistic_sharpe_ratio(0.1, 101, -1.0, 5.0) < probabilistic_sharpe_ratio(0.1, 101)
+        assert probabilistic_sharpe_ratio(0.1, 1) is None
+
+    def test_deflated_sharpe_ratio_penalizes_trials(self):
+        """Test that more trials raise the bar the Sharpe ratio must clear."""
+        returns = np.random.default_rng(5).normal(0.001, 0.01, 500)
+
+        single = deflated_sharpe_ratio(returns, 1, 0.01)
+        many = deflated_sharpe_ratio(returns, 100, 0.01)
+
+        assert expected_max_sharpe(1, 0.01) == 0.0
+        assert expected_max_sharpe(100, 0.01) > expected_max_sharpe(10, 0.01) > 0
+        assert single["deflated_sharpe_ratio"] == pytest.approx(single["probabilistic_sharpe_ratio"])
+        assert many["deflated_sharpe_ratio"] < single["deflated_sharpe_ratio"]
+        assert many["sharpe_ratio"] == pytest.approx(returns.mean() / returns.std(ddof=1) * np.sqrt(252))
+
+    def test_overfitting_score(self):
+        """Test the score combining degradation and the deflated Sharpe ratio."""
+        summary = {"completed_folds": 3, "degradation_ratio": 1.2, "deflated_sharpe": {"deflated_sharpe_ratio": 0.9}}
+        assert overfitting_score(summary) == pytest.approx(0.05)
+        summary["degradation_ratio"] = None
+        assert overfitting_score(summary) == pytest.approx(0.55)
+        summary["completed_folds"] = 0
+        assert overfitting_score(summary) is None
+
+
+class TestMonteCarlo:
+    """Test the stationary block bootstrap."""
+
+    def test_indices_follow_blocks(self):
+        """Test that paths continue blocks with the expected mean length."""
+        indices = stationary_bootstrap_indices(100, 2000, 100, 10.0, np.random.default_rng(0))
+
+        steps = np.diff(indices, axis=1)
+        continued = (steps == 1) | (steps == -99)
+        assert indices.shape == (2000, 100)
+        assert indices.min() == 0 and indices.max() == 99
+        assert 1.0 / (1.0 - continued.mean()) == pytest.approx(10.0, rel=0.05)
+
+    def test_block_size_one_is_iid(self):
+        """Test that unit blocks draw every step independently."""
+        indices = stationary_bootstrap_indices(50, 1000, 50, 1.0, np.random.default_rng(1))
+
+        counts = np.bincount(indices.ravel(), minlength=50)
+        assert counts.min() > 0.8 * counts.mean()
+
+    def test_report_intervals(self):
+        """Test that intervals bracket the observed statistics of a positive drift."""
+        returns = np.random.default_rng(2).normal(0.001, 0.01, 252)
+
+        report = bootstrap_report(returns, 2000, seed=3)
+
+        terminal = report["terminal_return"]
+        assert terminal["observed"] == pytest.approx(np.prod(1 + returns) - 1)
+        assert terminal["lower"] < terminal["percentiles"]["50"] < terminal["upper"]
+        assert terminal["lower"] < terminal["observed"] < terminal["upper"]
+        assert 0 <= report["max_drawdown"]["lower"] <= report["max_drawdown"]["upper"] < 1
+        assert report["sharpe_ratio"]["observed"] == pytest.approx(
+            returns.mean() / returns.std(ddof=1) * np.sqrt(252)
+        )
+        assert 0 <= report["probability_of_loss"] < 0.5
+        assert report["block_size"] == pytest.approx(252 ** (1 / 3), abs=0.1)
+        assert bootstrap_report(returns, 2000, seed=3) == report
+
+    def test_additive_trade_pnl(self):
+        """Test that trade P&L accumulates additively."""
+        report = bootstrap_report(np.array([0.01, -0.02, 0.03]), 100, additive=True)
+
+        assert report["terminal_return"]["observed"] == pytest.approx(0.02)
+        assert report["max_drawdown"]["observed"] == pytest.approx(0.02 / 1.01)
+
+    def test_invalid_parameters(self):
+        """Test parameter validation and short series."""
+        with pytest.raises(ValueError, match="n_paths"):
+            bootstrap_report(np.zeros(10), 0)
+        with pytest.raises(ValueError, match="n_paths"):
+            bootstrap_report(np.zeros(10), MAX_PATHS + 1)
+        with pytest.raises(ValueError, match="block_size"):
+            bootstrap_report(np.zeros(10), 10, block_size=0.5)
+        assert bootstrap_report(np.array([0.01]), 10)["terminal_return"]["mean"] is None
+
+    @pytest.mark.asyncio
+    async def test_monte_carlo_of_result_is_cached(
+        self, diagnostic_service: DiagnosticService, sample_result_id: str
+    ):
+        """Test that a result's report is computed once per parameter set."""
+        # ACT
+        first = await diagnostic_service.get_monte_carlo(sample_result_id, n_paths=500)
+        cached = diagnostic_service.result_store.read_document(sample_result_id, "monte_carlo")
+        cached["report"]["probability_of_loss"] = -1.0
+        diagnostic_service.result_store.write_document(sample_result_id, "monte_carlo", cached)
+        second = await diagnostic_service.get_monte_carlo(sample_result_id, n_paths=500)
+        other = await diagnostic_service.get_monte_carlo(sample_result_id, n_paths=600)
+
+        # ASSERT
+        assert first["source"] == "returns"
+        assert first["n_observations"] == 120
+        assert second["probability_of_loss"] == -1.0
+        assert other["n_paths"] == 600 and other["probability_of_loss"] >= 0
+
+    @pytest.mark.asyncio
+    async def test_monte_carlo_of_trade_pnl(
+        self, diagnostic_service: DiagnosticService, sample_result_id: str, backtest_repository
+    ):
+        """Test resampling the realized P&L of the stored trades."""
+        # ARRANGE
+        pnl = np.array([np.nan, 1000.0, np.nan, -500.0, 2500.0])
+        diagnostic_service.result_store.write(sample_result_id, {"trades": {
+            "date": np.arange("2023-01-02", "2023-01-07", dtype="datetime64[D]"),
+            "instrument": np.array(["A"] * 5),
+            "pnl": pnl,
+        }})
+        await backtest_repository.update_result(
+            sample_result_id, {"artifact_path": sample_result_id, "metrics": {"n_dates": 126}}
+        )
+
+        # ACT
+        report = await diagnostic_service.get_monte_carlo(sample_result_id, n_paths=200, source="trades")
+
+        # ASSERT
+        assert report["source"] == "trades"
+        assert report["n_observations"] == 3
+        assert report["terminal_return"]["observed"] == pytest.approx(0.03)
+        assert report["max_drawdown"]["observed"] == pytest.approx(0.005 / 1.01)
+
+    @pytest.mark.asyncio
+    async def test_monte_carlo_errors(self, diagnostic_service: DiagnosticService, sample_result_id: str):
+        """Test unknown sources, invalid parameters and missing results."""
+        with pytest.raises(InvalidConfigError, match="source"):
+            await diagnostic_service.get_monte_carlo(sample_result_id, source="prices")
+        with pytest.raises(InvalidConfigError, match="confidence"):
+            await diagnostic_service.get_monte_carlo(sample_result_id, confidence=1.5)
+        with pytest.raises(ResourceNotFoundError):
+            await diagnostic_service.get_monte_carlo("nonexistent_id")
+
 
 class TestOptimizationSuggestions:
     """Test optimization suggestions functionality."""
@@ -6,18 +6,36 @@ Tests execution management logic including:
 - Status tracking
 - Result storage
 - Error handling
+- Reuse of identical runs and batch backtests
+- Benchmark-relative metrics of runs and of stored results in bulk
 """
 
 import pytest
 from datetime import date
 from decimal import Decimal
-
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import numpy as np
+import pandas as pd
+
+from app.modules.backtest.services import backtest_engine
+from app.modules.backtest.services.benchmark import (
+    EQUAL_WEIGHT,
+    RELATIVE_METRICS,
+    benchmark_returns,
+    clear_benchmark_cache,
+    relative_metrics,
+)
 from app.modules.backtest.services.execution_service import BacktestExecutionService
+from app.modules.backtest.services.result_store import BacktestResultStore
 from app.modules.backtest.exceptions import (
     BacktestExecutionError,
+    InvalidConfigError,
     ResourceNotFoundError
 )
 from app.database.models.backtest import BacktestStatus
+from app.modules.data_management.services.dataset_panel import DatasetPanel
 
 
 class TestStartBacktest:
@@ -226,3 +244,620 @@ class TestFailBacktest:
         assert failed.status == BacktestStatus.FAILED.value
         assert failed.metrics is not None
         assert "error" in failed.metrics
+
+
+@pytest.fixture
+def price_dataset(tmp_path):
+    """Dataset record backed by a CSV with 80 dates x 12 instruments."""
+    rng = np.random.default_rng(11)
+    dates = pd.bdate_range("2023-01-02", periods=80)
+    instruments = [f"SH{600000 + i}" for i in range(12)]
+    close = 10 * np.exp(rng.normal(0, 0.02, size=(80, 12)).cumsum(axis=0))
+    frame = pd.DataFrame({
+        "date": np.repeat(dates, 12),
+        "symbol": np.tile(instruments, 80),
+        "close": close.ravel(),
+    })
+    path = tmp_path / "prices.csv"
+    frame.to_csv(path, index=False)
+    return SimpleNamespace(id="dataset-1", file_path=str(path), version="960@v1")
+
+
+@pytest.fixture
+def engine_service(backtest_repository, price_dataset, tmp_path):
+    """Execution service reading the CSV dataset."""
+    strategy = SimpleNamespace(parameters={"signal": {"formula": "-$close", "top_k": 2}})
+    return BacktestExecutionService(
+        backtest_repository,
+        dataset_repo=Mock(get=AsyncMock(return_value=price_dataset)),
+        strategy_repo=Mock(get=AsyncMock(return_value=strategy)),
+        result_store=BacktestResultStore(tmp_path / "results"),
+    )
+
+
+class TestRunBacktest:
+    """Test running the engine through the service."""
+
+    async def _start(self, config_service, execution_service, config_params=None):
+        config = await config_service.create_config({
+            "strategy_id": "strategy-123",
+            "dataset_id": "dataset-1",
+            "start_date": date(2023, 1, 15),
+            "end_date": date(2023, 4, 10),
+            "initial_capital": Decimal("1000000.00"),
+            "commission_rate": Decimal("0.001"),
+            "slippage": Decimal("0.0005"),
+            "config_params": config_params,
+        })
+        return await execution_service.start_backtest(config.id)
+
+    @pytest.mark.asyncio
+    async def test_run_backtest_stores_results(self, engine_service, config_service):
+        """Test that a run stores metrics, the equity curve and trades."""
+        config_params = {
+            "signal": {"formula": "$close / Ref($close, 5) - 1", "top_k": 3, "rebalance_period": 5}
+        }
+        result = await self._start(config_service, engine_service, config_params)
+
+        completed = await engine_service.run_backtest(result.id)
+
+        assert completed.status == BacktestStatus.COMPLETED.value
+        metrics = completed.metrics
+        assert metrics["start_date"] >= "2023-01-15"
+        assert metrics["end_date"] <= "2023-04-10"
+        assert "equity_curve" not in metrics
+        assert metrics["dataset_version"] == "960@v1"
+        assert metrics["signal"]["top_k"] == 3
+        assert completed.total_return == Decimal(str(round(metrics["total_return"], 6)))
+        assert completed.max_drawdown >= 0
+
+        assert completed.trades["total_trades"] > 0
+        assert "trades" not in completed.trades
+
+        store = engine_service.result_store
+        curve = store.read(completed.artifact_path, "equity")
+        assert len(curve["date"]) == metrics["n_dates"]
+        assert str(curve["date"][0]) == metrics["start_date"]
+        assert curve["equity"][0] == 1000000.0
+        trades = store.read(completed.artifact_path, "trades", ["instrument", "quantity"])
+        assert len(trades["quantity"]) == completed.trades["total_trades"]
+        assert set(trades["instrument"]) <= {f"SH{600000 + i}" for i in range(12)}
+        positions = store.read(completed.artifact_path, "positions", start_date=metrics["end_date"])
+        assert 0 < len(positions["shares"]) <= 3
+        trips = store.read(completed.artifact_path, "round_trips")
+        assert trips["closed"].any() and not trips["closed"].all()
+        assert np.all(np.diff(trips["date"]) >= np.timedelta64(0, "D"))
+        assert np.all(trips["exit_date"][trips["closed"]] > trips["date"][trips["closed"]])
+        assert np.isnat(trips["exit_date"][~trips["closed"]]).all()
+        assert np.all(trips["mae"] >= 0) and np.all(trips["mfe"] >= 0)
+
+    @pytest.mark.asyncio
+    async def test_signal_from_strategy_parameters(self, engine_service, config_service):
+        """Test that the strategy's signal is used when the config has none."""
+        result = await self._start(config_service, engine_service)
+
+        completed = await engine_service.run_backtest(result.id)
+
+        assert completed.metrics["signal"]["formula"] == "-$close"
+        assert completed.metrics["signal"]["top_k"] == 2
+
+    @pytest.mark.asyncio
+    async def test_invalid_signal_fails_backtest(self, engine_service, config_service):
+        """Test that configuration errors mark the result as failed."""
+        result = await self._start(
+            config_service, engine_service, {"signal": {"formula": "Unknown($close)"}}
+        )
+
+        with pytest.raises(InvalidConfigError):
+            await engine_service.run_backtest(result.id)
+
+        assert await engine_service.get_backtest_status(result.id) == BacktestStatus.FAILED.value
+
+    @pytest.mark.asyncio
+    async def test_missing_signal(self, engine_service, config_service):
+        """Test that a backtest without any signal is rejected."""
+        engine_service.strategy_repo.get = AsyncMock(return_value=None)
+        result = await self._start(config_service, engine_service)
+
+        with pytest.raises(InvalidConfigError, match="No signal configured"):
+            await engine_service.run_backtest(result.id)
+
+
+class TestResultReuse:
+    """Test reusing completed results of identical runs."""
+
+    async def _config(self, config_service, **overrides):
+        return await config_service.create_config({
+            "strategy_id": "strategy-123",
+            "dataset_id": "dataset-1",
+            "start_date": date(2023, 1, 15),
+            "end_date": date(2023, 4, 10),
+            "initial_capital": Decimal("1000000.00"),
+            "commission_rate": Decimal("0.001"),
+            "slippage": Decimal("0.0005"),
+            **overrides,
+        })
+
+    @pytest.mark.asyncio
+    async def test_identical_run_is_returned_completed(self, engine_service, config_service):
+        """Test that starting an already computed run completes immediately."""
+        config = await self._config(config_service)
+        first = await engine_service.run_backtest((await engine_service.start_backtest(config.id)).id)
+        assert first.fingerprint is not None
+
+        other_config = await self._config(config_service)
+        reused = await engine_service.start_backtest(other_config.id)
+
+        assert reused.id != first.id
+        assert reused.config_id == other_config.id
+        assert reused.status == BacktestStatus.COMPLETED.value
+        assert reused.fingerprint == first.fingerprint
+        assert reused.total_return == first.total_return
+        assert reused.metrics["reused_from"] == first.id
+        assert reused.artifact_path == first.artifact_path
+
+    @pytest.mark.asyncio
+    async def test_changed_inputs_are_recomputed(self, engine_service, config_service):
+        """Test that different costs, parameters or data versions do not match."""
+        config = await self._config(config_service)
+        await engine_service.run_backtest((await engine_service.start_backtest(config.id)).id)
+
+        for overrides in ({"commission_rate": Decimal("0.002")}, {"config_params": {"benchmark": "SH000300"}}):
+            changed = await self._config(config_service, **overrides)
+            assert (await engine_service.start_backtest(changed.id)).status == BacktestStatus.PENDING.value
+
+        engine_service.dataset_repo.get.return_value.version = "961@v2"
+        assert (await engine_service.start_backtest(config.id)).status == BacktestStatus.PENDING.value
+
+    @pytest.mark.asyncio
+    async def test_pending_run_reuses_result_completed_meanwhile(self, engine_service, config_service):
+        """Test that a queued run copies an identical run that finished first."""
+        config = await self._config(config_service)
+        first = await engine_service.start_backtest(config.id)
+        second = await engine_service.start_backtest(config.id)
+        first = await engine_service.run_backtest(first.id)
+
+        second = await engine_service.run_backtest(second.id)
+
+        assert second.status == BacktestStatus.COMPLETED.value
+        assert second.metrics["reused_from"] == first.id
+
+    @pytest.mark.asyncio
+    async def test_fingerprint_covers_generated_code(self, engine_service, config_service):
+        """Test that regenerating the strategy's code changes the fingerprint."""
+        config = await self._config(config_service)
+        dataset = await engine_service.dataset_repo.get(config.dataset_id)
+        spec = await engine_service._resolve_signal(config)
+        engine_service.code_generation_repo = Mock(get_latest_by_instance=AsyncMock(return_value=None))
+        before = await engine_service.backtest_fingerprint(config, spec, dataset)
+
+        engine_service.code_generation_repo.get_latest_by_instance.return_value = SimpleNamespace(code_hash="ab" * 32)
+        after = await engine_service.backtest_fingerprint(config, spec, dataset)
+
+        assert before != after
+        assert len(after) == 64
+
+    @pytest.mark.asyncio
+    async def test_fingerprint_covers_engine_version(self, engine_service, config_service, monkeypatch):
+        """Test that bumping the engine version stops reuse of older results."""
+        config = await self._config(config_service)
+        dataset = await engine_service.dataset_repo.get(config.dataset_id)
+        spec = await engine_service._resolve_signal(config)
+        before = await engine_service.backtest_fingerprint(config, spec, dataset)
+
+        monkeypatch.setattr(backtest_engine, "ENGINE_VERSION", backtest_engine.ENGINE_VERSION + 1)
+
+        assert await engine_service.backtest_fingerprint(config, spec, dataset) != before
+
+
+class TestBatchBacktest:
+    """Test running several strategies on one data load."""
+
+    STRATEGIES = {
+        "strategy-123": {"formula": "-$close", "top_k": 2},
+        "strategy-momentum": {"formula": "$close / Ref($close, 5) - 1", "top_k": 3},
+        "strategy-broken": {"formula": "Unknown($close)"},
+    }
+
+    @pytest.fixture
+    def batch_service(self, engine_service):
+        """Engine service resolving each strategy's own signal."""
+        async def get_strategy(strategy_id):
+            return SimpleNamespace(parameters={"signal": self.STRATEGIES[strategy_id]})
+
+        engine_service.strategy_repo.get = AsyncMock(side_effect=get_strategy)
+        return engine_service
+
+    async def _config(self, config_service, strategy_id="strategy-123", config_params=None):
+        return await config_service.create_config({
+            "strategy_id": strategy_id,
+            "dataset_id": "dataset-1",
+            "start_date": date(2023, 1, 15),
+            "end_date": date(2023, 4, 10),
+            "initial_capital": Decimal("1000000.00"),
+            "commission_rate": Decimal("0.001"),
+            "slippage": Decimal("0.0005"),
+            "config_params": config_params,
+        })
+
+    @pytest.mark.asyncio
+    async def test_batch_matches_single_backtests(self, batch_service, config_service):
+        """Test that each strategy's batch result equals its single backtest."""
+        # A distinct config_params label keeps the batch from reusing this run
+        single_config = await self._config(config_service, "strategy-momentum", {"label": "single"})
+        single = await batch_service.start_backtest(single_config.id)
+        single = await batch_service.run_backtest(single.id)
+        config = await self._config(config_service)
+        results = await batch_service.start_batch_backtest(
+            config.id, ["strategy-123", "strategy-momentum"]
+        )
+        assert results[0].config_id == config.id
+        assert all(result.status == BacktestStatus.PENDING.value for result in results)
+        batch_service.dataset_repo.get.reset_mock()
+
+        completed = await batch_service.run_batch_backtest([result.id for result in results])
+
+        assert [result.status for result in completed] == [BacktestStatus.COMPLETED.value] * 2
+        assert batch_service.dataset_repo.get.await_count == 1
+        assert "reused_from" not in completed[1].metrics
+        assert completed[1].metrics["signal"]["top_k"] == 3
+        assert completed[1].total_return == single.total_return
+        store = batch_service.result_store
+        np.testing.assert_allclose(
+            store.read(completed[1].artifact_path, "equity")["equity"],
+            store.read(single.artifact_path, "equity")["equity"],
+        )
+        assert completed[1].trades["total_trades"] == single.trades["total_trades"]
+
+    @pytest.mark.asyncio
+    async def test_invalid_strategy_fails_alone(self, batch_service, config_service):
+        """Test that one strategy's bad signal does not stop the others."""
+        config = await self._config(config_service)
+        results = await batch_service.start_batch_backtest(
+            config.id, ["strategy-123", "strategy-broken"]
+        )
+
+        completed = await batch_service.run_batch_backtest([result.id for result in results])
+
+        assert completed[0].status == BacktestStatus.COMPLETED.value
+        assert completed[1].status == BacktestStatus.FAILED.value
+        assert "Invalid signal" in completed[1].metrics["error"]
+
+    @pytest.mark.asyncio
+    async def test_batch_reuses_completed_runs(self, batch_service, config_service):
+        """Test that a strategy already run with the same inputs is not recomputed."""
+        config = await self._config(config_service)
+        first = await batch_service.start_batch_backtest(config.id, ["strategy-123"])
+        first = (await batch_service.run_batch_backtest([first[0].id]))[0]
+
+        results = await batch_service.start_batch_backtest(config.id, ["strategy-123", "strategy-momentum"])
+        completed = await batch_service.run_batch_backtest([result.id for result in results])
+
+        assert completed[0].metrics["reused_from"] == first.id
+        assert completed[0].fingerprint == first.fingerprint
+        assert "reused_from" not in completed[1].metrics
+
+    @pytest.mark.asyncio
+    async def test_batch_relative_metrics(self, batch_service, config_service):
+        """Test that batch strategies get relative metrics against the shared benchmark."""
+        config = await self._config(config_service, config_params={"benchmark": EQUAL_WEIGHT})
+        results = await batch_service.start_batch_backtest(config.id, ["strategy-123", "strategy-momentum"])
+
+        completed = await batch_service.run_batch_backtest([result.id for result in results])
+        bulk = await batch_service.compute_relative_metrics([result.id for result in results])
+
+        assert [result.benchmark for result in completed] == [EQUAL_WEIGHT] * 2
+        assert all(result.information_ratio is not None for result in completed)
+        assert [r.information_ratio for r in bulk] == [r.information_ratio for r in completed]
+
+    @pytest.mark.asyncio
+    async def test_start_requires_config_and_strategies(self, batch_service, config_service):
+        """Test that unknown configurations and empty batches are rejected."""
+        with pytest.raises(ResourceNotFoundError):
+            await batch_service.start_batch_backtest("missing", ["strategy-123"])
+        config = await self._config(config_service)
+        with pytest.raises(InvalidConfigError):
+            await batch_service.start_batch_backtest(config.id, [])
+
+
+class TestRelativeMetrics:
+    """Test benchmark-relative metrics of runs and stored results."""
+
+    @pytest.fixture(autouse=True)
+    def _fresh_benchmarks(self):
+        clear_benchmark_cache()
+
+    def test_relative_metrics_match_per_series(self):
+        """Test the vectorized metrics against a per-series computation."""
+        rng = np.random.default_rng(3)
+        b = rng.normal(0.0005, 0.01, 120)
+        b[0] = np.nan
+        r = 0.3 * b + 1.2 * rng.normal(0.001, 0.01, (3, 120))
+        r[1, :40] = np.nan
+
+        values = relative_metrics(r, b, periods_per_year=252)
+
+        for i in range(3):
+            mask = ~np.isnan(r[i]) & ~np.isnan(b)
+            ri, bi = r[i, mask], b[mask]
+            beta = np.cov(ri, bi)[0, 1] / np.var(bi, ddof=1)
+            active = ri - bi
+            tracking = active.std(ddof=1) * np.sqrt(252)
+            assert values["beta"][i] == pytest.approx(beta)
+            assert values["alpha"][i] == pytest.approx((ri.mean() - beta * bi.mean()) * 252)
+            assert values["tracking_error"][i] == pytest.approx(tracking)
+            assert values["information_ratio"][i] == pytest.approx(active.mean() * 252 / tracking)
+        constant = relative_metrics(np.ones((1, 5)), np.zeros(5))
+        assert np.isnan(constant["beta"][0]) and np.isnan(constant["alpha"][0])
+
+    def test_benchmark_returns(self):
+        """Test instrument and equal-weight benchmarks on the panel calendar."""
+        close = np.array([[10.0, 20.0], [11.0, 20.0], [11.0, np.nan], [12.1, 22.0]])
+        panel = DatasetPanel(
+            dates=np.asarray(pd.bdate_range("2023-01-02", periods=4), dtype="datetime64[ns]"),
+            instruments=np.array(["A", "B"], dtype=object),
+            fields={"close": close},
+        )
+
+        np.testing.assert_allclose(benchmark_returns(panel, "A"), [np.nan, 0.1, 0.0, 0.1])
+        np.testing.assert_allclose(benchmark_returns(panel, EQUAL_WEIGHT), [np.nan, 0.05, 0.0, 0.1])
+        with pytest.raises(InvalidConfigError):
+            benchmark_returns(panel, "C")
+
+    async def _run(self, config_service, service, config_params):
+        config = await config_service.create_config({
+            "strategy_id": "strategy-123",
+            "dataset_id": "dataset-1",
+            "start_date": date(2023, 1, 15),
+            "end_date": date(2023, 4, 10),
+            "initial_capital": Decimal("1000000.00"),
+            "commission_rate": Decimal("0.001"),
+            "slippage": Decimal("0.0005"),
+            "config_params": config_params,
+        })
+        result = await service.start_backtest(config.id)
+        return await service.run_backtest(result.id)
+
+    @pytest.mark.asyncio
+    async def test_run_with_benchmark(self, engine_service, config_service):
+        """Test that a configured benchmark adds the relative metrics to the result."""
+        completed = await self._run(config_service, engine_service, {"benchmark": "SH600003"})
+        plain = await self._run(config_service, engine_service, {"label": "no benchmark"})
+
+        assert completed.benchmark == "SH600003"
+        assert completed.beta is not None and completed.information_ratio is not None
+        assert completed.tracking_error > 0
+        assert plain.benchmark is None and plain.information_ratio is None
+
+    @pytest.mark.asyncio
+    async def test_bulk_matches_run(self, engine_service, config_service):
+        """Test that bulk metrics of stored results equal those computed at run time."""
+        with_benchmark = await self._run(config_service, engine_service, {"benchmark": EQUAL_WEIGHT})
+        plain = await self._run(config_service, engine_service, {"label": "no benchmark"})
+        other = await self._run(
+            config_service, engine_service, {"signal": {"formula": "$close / Ref($close, 5) - 1", "top_k": 3}}
+        )
+        engine_service.dataset_repo.get.reset_mock()
+
+        updated = await engine_service.compute_relative_metrics([plain.id, other.id], EQUAL_WEIGHT)
+
+        assert engine_service.dataset_repo.get.await_count == 1
+        assert [result.benchmark for result in updated] == [EQUAL_WEIGHT] * 2
+        for metric in RELATIVE_METRICS:
+            assert getattr(updated[0], metric) == getattr(with_benchmark, metric)
+        assert updated[1].information_ratio != updated[0].information_ratio
+
+    @pytest.mark.asyncio
+    async def test_bulk_defaults_and_errors(self, engine_service, config_service):
+        """Test the configured benchmark default and rejected results."""
+        completed = await self._run(config_service, engine_service, {"benchmark": "SH600001"})
+        plain = await self._run(config_service, engine_service, {"label": "no benchmark"})
+        pending = await engine_service.repository.create_result(
+            {"config_id": plain.config_id, "status": BacktestStatus.PENDING.value}
+        )
+
+        updated = await engine_service.compute_relative_metrics([completed.id, plain.id])
+
+        assert updated[0].benchmark == "SH600001"
+        assert updated[1].benchmark is None
+        with pytest.raises(InvalidConfigError):
+            await engine_service.compute_relative_metrics([pending.id])
+        with pytest.raises(InvalidConfigError):
+            await engine_service.compute_relative_metrics([plain.id], "SH699999")
+        with pytest.raises(ResourceNotFoundError):
+            await engine_service.compute_relative_metrics(["missing"])
+
+
+class TestRunOptimization:
+    """Test parameter sweeps through the service."""
+
+    @pytest.mark.asyncio
+    async def test_grid_over_formula_placeholders(self, engine_service):
+        """Test a grid sweep ranking candidates and reporting progress."""
+        engine_service.strategy_repo.get = AsyncMock(return_value=SimpleNamespace(
+            parameters={"signal": {"formula": "$close / Ref($close, {window}) - 1", "top_k": 2}}
+        ))
+        seen = []
+
+        async def progress(done, total, leaderboard):
+            seen.append(done)
+
+        result = await engine_service.run_optimization(
+            "strategy-123", "dataset-1",
+            {"grid": {"window": [3, 10], "top_k": [2, 4]}, "start_date": "2023-02-01",
+             "max_workers": 1},
+            progress=progress,
+        )
+
+        assert result["search"] == "grid"
+        assert result["start_date"] >= "2023-02-01"
+        assert result["dataset_version"] == "960@v1"
+        assert result["summary"]["completed"] == 4
+        assert seen[-1] == 4
+        sharpes = [entry["metrics"]["sharpe_ratio"] for entry in result["leaderboard"]]
+        assert sharpes == sorted(sharpes, reverse=True)
+        assert {tuple(sorted(e["params"].items())) for e in result["leaderboard"]} == {
+            (("top_k", k), ("window", w)) for k in (2, 4) for w in (3, 10)
+        }
+
+    @pytest.mark.asyncio
+    async def test_random_search_with_fixed_signal(self, engine_service):
+        """Test random search over signal options of a formula without placeholders."""
+        result = await engine_service.run_optimization(
+            "strategy-123", "dataset-1",
+            {"space": {"top_k": {"low": 1, "high": 6}, "rebalance_period": [1, 5]},
+             "n_samples": 6, "seed": 3, "objective": "max_drawdown", "max_workers": 1},
+        )
+
+        assert result["search"] == "random"
+        assert result["signal"]["formula"] == "-$close"
+        drawdowns = [entry["metrics"]["max_drawdown"] for entry in result["leaderboard"]]
+        assert drawdowns == sorted(drawdowns)
+
+    @pytest.mark.asyncio
+    async def test_successive_halving(self, engine_service):
+        """Test that halving records its promotions."""
+        result = await engine_service.run_optimization(
+            "strategy-123", "dataset-1",
+            {"grid": {"top_k": [1, 2, 3, 4, 5, 6]}, "search_mode": "halving",
+             "eta": 2, "min_window": 10, "max_workers": 1},
+        )
+
+        assert result["search_mode"] == "halving"
+        assert [rung["candidates"] for rung in result["history"]] == [6, 3, 2, 1]
+        assert result["summary"]["cost_ratio"] > 1
+        assert len(result["leaderboard"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_invalid_options(self, engine_service):
+        """Test that option errors are raised before any data is loaded."""
+        with pytest.raises(InvalidConfigError, match="exactly one of grid or space"):
+            await engine_service.run_optimization("strategy-123", "dataset-1", {})
+        with pytest.raises(InvalidConfigError, match="Unknown optimization options"):
+            await engine_service.run_optimization("strategy-123", "dataset-1", {"grid": {}, "foo": 1})
+        with pytest.raises(InvalidConfigError, match="search_mode"):
+            await engine_service.run_optimization(
+                "strategy-123", "dataset-1", {"grid": {"top_k": [1]}, "search_mode": "bayes"}
+            )
+        with pytest.raises(InvalidConfigError, match="top_k must be a positive integer"):
+            await engine_service.run_optimization(
+                "strategy-123", "dataset-1", {"grid": {"top_k": [0, 2]}}
+            )
+        engine_service.dataset_repo.get.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_missing_strategy(self, engine_service):
+        """Test that an unknown strategy is reported."""
+        engine_service.strategy_repo.get = AsyncMock(return_value=None)
+
+        with pytest.raises(ResourceNotFoundError):
+            await engine_service.run_optimization(
+                "missing", "dataset-1", {"grid": {"top_k": [1]}}
+            )
+
+
+class TestRunWalkForward:
+    """Test walk-forward analysis through the service."""
+
+    async def _completed(self, config_service, engine_service, config_params=None):
+        config = await config_service.create_config({
+            "strategy_id": "strategy-123",
+            "dataset_id": "dataset-1",
+            "start_date": date(2023, 1, 15),
+            "end_date": date(2023, 4, 10),
+            "initial_capital": Decimal("1000000.00"),
+            "commission_rate": Decimal("0.001"),
+            "slippage": Decimal("0.0005"),
+            "config_params": config_params,
+        })
+        result = await engine_service.start_backtest(config.id)
+        return await engine_service.run_backtest(result.id)
+
+    @pytest.mark.asyncio
+    async def test_folds_rerun_the_strategy(self, engine_service, config_service):
+        """Test that each fold backtests the result's own signal in and out of sample."""
+        result = await self._completed(config_service, engine_service)
+        seen = []
+
+        async def progress(done, total, fold):
+            seen.append((done, total))
+
+        report = await engine_service.run_walk_forward(
+            result.id, {"n_folds": 3, "in_sample_ratio": 0.5, "max_workers": 1}, progress=progress
+        )
+
+        folds = report["folds"]
+        assert seen == [(1, 3), (2, 3), (3, 3)]
+        assert [fold["fold"] for fold in folds] == [1, 2, 3]
+        assert folds[0]["in_sample_start"] == report["start_date"]
+        assert folds[-1]["out_of_sample_end"] == report["end_date"]
+        for previous, fold in zip(folds, folds[1:]):
+            assert fold["in_sample_end"] < fold["out_of_sample_start"]
+            assert previous["out_of_sample_end"] < fold["out_of_sample_start"]
+        assert all(fold["params"] == {} and "out_of_sample_returns" not in fold for fold in folds)
+
+        summary = report["summary"]
+        assert summary["completed_folds"] == 3
+        assert summary["out_of_sample"]["n_periods"] == sum(fold["out_of_sample_dates"] for fold in folds)
+        deflated = summary["deflated_sharpe"]
+        assert deflated["n_trials"] == 1
+        assert deflated["n_periods"] == result.metrics["n_dates"]
+        assert deflated["deflated_sharpe_ratio"] == pytest.approx(deflated["probabilistic_sharpe_ratio"])
+
+    @pytest.mark.asyncio
+    async def test_grid_selects_in_sample(self, engine_service, config_service):
+        """Test that a grid's best in-sample candidate is tested out of sample and deflated."""
+        result = await self._completed(
+            config_service, engine_service,
+            {"signal": {"formula": "$close / Ref($close, 5) - 1", "top_k": 2}}
+        )
+
+        report = await engine_service.run_walk_forward(
+            result.id,
+            {"n_folds": 2, "grid": {"top_k": [1, 2, 4], "rebalance_period": [1, 5]}, "max_workers": 1},
+        )
+
+        for fold in report["folds"]:
+            assert len(fold["in_sample_sharpes"]) == 6
+            assert fold["in_sample"]["sharpe_ratio"] == max(fold["in_sample_sharpes"])
+            assert set(fold["params"]) == {"top_k", "rebalance_period"}
+        assert report["summary"]["deflated_sharpe"]["n_trials"] == 6
+        assert report["summary"]["deflated_sharpe"]["expected_max_sharpe"] > 0
+
+    @pytest.mark.asyncio
+    async def test_invalid_options(self, engine_service, config_service):
+        """Test that option errors are raised before the folds run."""
+        result = await self._completed(config_service, engine_service)
+
+        with pytest.raises(InvalidConfigError, match="Unknown walk-forward options"):
+            await engine_service.run_walk_forward(result.id, {"folds": 3})
+        with pytest.raises(InvalidConfigError, match="too few"):
+            await engine_service.run_walk_forward(result.id, {"n_folds": 20})
+        with pytest.raises(ResourceNotFoundError):
+            await engine_service.run_walk_forward("missing")
+
+    @pytest.mark.asyncio
+    async def test_diagnostic_walk_forward_reports_progress(self, engine_service, config_service, backtest_repository):
+        """Test that the diagnostic service reports fold progress and caches the report."""
+        from app.modules.backtest.services.diagnostic_service import DiagnosticService
+
+        result = await self._completed(config_service, engine_service)
+        service = DiagnosticService(
+            backtest_repository,
+            result_store=engine_service.result_store,
+            execution_service=engine_service,
+        )
+        options = {"n_folds": 3, "max_workers": 1}
+        progress = AsyncMock()
+
+        assert await service.get_cached_walk_forward(result.id, options) is None
+        report = await service.run_walk_forward(result.id, options, progress=progress)
+        again = await service.run_walk_forward(result.id, options, progress=progress)
+        analysis = await service.detect_overfitting(result.id)
+
+        assert again == report
+        assert await service.get_cached_walk_forward(result.id, options) == report
+        assert progress.await_count == 3
+        assert progress.await_args_list[-1].args[:2] == (3, 3)
+        assert analysis["method"] == "walk_forward"
+        assert analysis["walk_forward"] == report["summary"]
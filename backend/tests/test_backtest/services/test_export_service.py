@@ -6,14 +6,21 @@ Test coverage for:
 - Excel data export
 - Chart export (PNG/SVG)
 - Export format validation
+- Cached reports in the result store and build progress
 """
 
+import asyncio
 import pytest
 from pathlib import Path
 from decimal import Decimal
 
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
 from app.modules.backtest.services.export_service import ExportService
-from app.modules.backtest.exceptions import ResourceNotFoundError
+from app.modules.backtest.exceptions import InvalidConfigError, ResourceNotFoundError
+from app.modules.backtest.services import report_writer
 
 
 class TestPDFExport:
@@ -43,9 +50,13 @@ class TestPDFExport:
         result_path = await export_service.generate_pdf_report(sample_result_id, str(output_path))
 
         # ASSERT
-        assert Path(result_path).exists()
-        # PDF should contain metrics (we'll verify file size as proxy)
-        assert Path(result_path).stat().st_size > 100  # At least 100 bytes
+        content = Path(result_path).read_bytes()
+        assert content.startswith(b"%PDF-1.4")
+        assert content.rstrip().endswith(b"%%EOF")
+        # The cross-reference table points at the objects
+        xref = int(content.rsplit(b"startxref", 1)[1].split()[0])
+        assert content[xref:xref + 4] == b"xref"
+        assert b"/FlateDecode" in content
 
     @pytest.mark.asyncio
     async def test_pdf_export_not_found(self, export_service: ExportService, tmp_path: Path):
@@ -91,6 +102,15 @@ class TestExcelExport:
             header = f.read(4)
             # Excel files start with PK (ZIP format)
             assert header[:2] == b'PK'
+        workbook = load_workbook(result_path, read_only=True)
+        assert workbook.sheetnames == ["Summary", "Equity"]
+        rows = workbook["Summary"].iter_rows(min_row=2, values_only=True)
+        # Read-only sheets drop trailing empty cells
+        summary = {row[0]: row[1] for row in rows if len(row) > 1}
+        assert summary["Total return"] == pytest.approx(0.15)
+        equity = list(workbook["Equity"].iter_rows(values_only=True))
+        assert equity[0][:2] == ("date", "equity")
+        assert len(equity) == 121
 
     @pytest.mark.asyncio
     async def test_excel_export_not_found(self, export_service: ExportService, tmp_path: Path):
@@ -103,6 +123,122 @@ class TestExcelExport:
             await export_service.export_to_excel("nonexistent_id", str(output_path))
 
 
+class TestReportWriter:
+    """Test the report file writers."""
+
+    def test_excel_streams_long_series_over_sheets(self, tmp_path: Path, monkeypatch):
+        """Test chunked rows, sheet continuation and empty cells for NaN/NaT."""
+        monkeypatch.setattr(report_writer, "EXCEL_CHUNK_ROWS", 3)
+        monkeypatch.setattr(report_writer, "EXCEL_MAX_ROWS", 4)
+        dates = np.arange("2024-01-01", 6, dtype="datetime64[D]")
+        exits = dates.copy()
+        exits[1] = np.datetime64("NaT")
+        columns = {"date": dates, "exit_date": exits, "pnl": np.array([1.0, np.nan, 3.0, 4.0, 5.0, 6.0])}
+        progress = []
+
+        report_writer.write_excel_report(
+            tmp_path / "r.xlsx", [("Sharpe ratio", 1.5)],
+            [report_writer.ReportSheet("Trades", columns)],
+            lambda fraction, step: progress.append(fraction)
+        )
+
+        workbook = load_workbook(tmp_path / "r.xlsx", read_only=True)
+        assert workbook.sheetnames == ["Summary", "Trades", "Trades (2)"]
+        rows = list(workbook["Trades"].iter_rows(values_only=True))
+        assert rows[2][0] == "2024-01-02" and not any(rows[2][1:])
+        assert len(rows) == 5 and len(list(workbook["Trades (2)"].iter_rows())) == 3
+        assert progress[-1] == 1.0
+
+    def test_chart_points_keep_extremes(self):
+        """Test that reducing a long series keeps its minimum and maximum."""
+        values = np.sin(np.linspace(0, 20, 10000))
+        values[1234] = -5.0
+
+        positions, points = report_writer.chart_points(values, max_points=100)
+
+        assert len(points) <= 100
+        assert points.min() == -5.0 and points.max() == values.max()
+        assert np.all(np.diff(positions) > 0)
+
+
+class TestReportCache:
+    """Test building and reusing reports in the result store."""
+
+    @pytest.mark.asyncio
+    async def test_build_report_is_cached(self, export_service: ExportService, sample_result_id: str):
+        """Test that a second build reuses the stored report."""
+        steps = []
+
+        async def progress(fraction, step):
+            steps.append(step)
+
+        built = await export_service.build_report(sample_result_id, "html", progress=progress)
+        again = await export_service.build_report(sample_result_id, "html")
+
+        assert built["cached"] is False and again["cached"] is True
+        assert again["path"] == built["path"]
+        content = Path(built["path"]).read_text()
+        assert content.count("<svg") == 2 and "Total return" in content
+        assert steps[0] == "Reading series"
+        assert (await export_service.get_cached_report(sample_result_id, "pdf")) is None
+
+    @pytest.mark.asyncio
+    async def test_progress_is_awaited_in_order(self, export_service: ExportService, sample_result_id: str):
+        """Test that progress updates never overlap and all finish before the build returns."""
+        fractions = []
+        running = 0
+
+        async def progress(fraction, step):
+            nonlocal running
+            running += 1
+            assert running == 1
+            await asyncio.sleep(0.01)
+            fractions.append(fraction)
+            running -= 1
+
+        await export_service.build_report(sample_result_id, "html", progress=progress)
+
+        assert fractions[-1] == 1.0
+        assert fractions == sorted(fractions)
+
+    @pytest.mark.asyncio
+    async def test_changed_result_is_rebuilt(self, export_service: ExportService, sample_result_id: str):
+        """Test that a report of a result that changed since is not reused."""
+        await export_service.build_report(sample_result_id, "xlsx")
+        await export_service.repository.update_result(
+            sample_result_id, {"benchmark": "equal_weight", "information_ratio": Decimal("0.8")}
+        )
+
+        assert (await export_service.get_cached_report(sample_result_id, "xlsx")) is None
+        rebuilt = await export_service.build_report(sample_result_id, "xlsx")
+        assert rebuilt["cached"] is False
+
+    @pytest.mark.asyncio
+    async def test_stored_series_are_exported(self, export_service: ExportService, sample_result_id: str):
+        """Test the trades and round trips sheets of a result with stored artifacts."""
+        dates = np.asarray(pd.bdate_range("2024-01-01", periods=5), dtype="datetime64[D]")
+        key = export_service.result_store.write(sample_result_id, {
+            "equity": {"date": dates, "equity": np.linspace(1e5, 1.1e5, 5)},
+            "trades": {"date": dates[:2], "instrument": np.array(["SH600000", "SH600001"]),
+                       "quantity": np.array([100.0, 200.0])},
+        })
+        await export_service.repository.update_result(sample_result_id, {"artifact_path": key})
+
+        report = await export_service.build_report(sample_result_id, "xlsx")
+
+        workbook = load_workbook(report["path"], read_only=True)
+        assert workbook.sheetnames == ["Summary", "Equity", "Trades"]
+        assert list(workbook["Trades"].iter_rows(values_only=True))[1] == ("2024-01-01", "SH600000", 100.0)
+
+    @pytest.mark.asyncio
+    async def test_build_errors(self, export_service: ExportService, sample_result_id: str):
+        """Test unknown formats and results."""
+        with pytest.raises(InvalidConfigError):
+            await export_service.build_report(sample_result_id, "docx")
+        with pytest.raises(ResourceNotFoundError):
+            await export_service.build_report("nonexistent_id", "pdf")
+
+
 class TestChartExport:
     """Test chart export functionality."""
 
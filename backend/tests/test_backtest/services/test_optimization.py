@@ -0,0 +1,309 @@
+"""
+Tests for parameter optimization
+
+Test Coverage:
+- Grid expansion and random search spaces
+- Applying parameters to signal options and formula placeholders
+- Leaderboard ranking
+- Sweeps inline, on a thread pool and on a process pool over shared memory
+- Successive halving and Hyperband over growing windows
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.modules.backtest.exceptions import InvalidConfigError
+from app.modules.backtest.services import backtest_engine
+from app.modules.backtest.services.execution_service import SIGNAL_DEFAULTS
+from app.modules.backtest.services.optimization import (
+    Leaderboard,
+    ParameterSweep,
+    apply_parameters,
+    chunk_candidates,
+    expand_grid,
+    formula_placeholders,
+    halving_windows,
+    hyperband_brackets,
+    sample_space,
+)
+from app.modules.data_management.services.dataset_panel import DatasetPanel
+from app.modules.indicator.services.factor_compiler import compile_formula
+
+
+@pytest.fixture
+def panel():
+    """Panel with 120 dates x 10 instruments."""
+    rng = np.random.default_rng(3)
+    close = 10 * np.exp(rng.normal(0, 0.02, size=(120, 10)).cumsum(axis=0))
+    return DatasetPanel(
+        dates=pd.bdate_range("2023-01-02", periods=120).values,
+        instruments=np.array([f"SH{600000 + i}" for i in range(10)], dtype=object),
+        fields={"close": close, "volume": rng.uniform(1, 2, size=(120, 10))},
+    )
+
+
+def _specs(base, candidates):
+    return [apply_parameters({**SIGNAL_DEFAULTS, **base}, params) for params in candidates]
+
+
+class TestSearchSpaces:
+    """Test candidate generation."""
+
+    def test_expand_grid(self):
+        """Test that every combination is produced."""
+        candidates = expand_grid({"top_k": [1, 2], "window": [5, 10, 20]})
+
+        assert len(candidates) == 6
+        assert candidates[0] == {"top_k": 1, "window": 5}
+        assert candidates[-1] == {"top_k": 2, "window": 20}
+
+    def test_expand_grid_rejects_empty_values(self):
+        """Test that a parameter without values is rejected."""
+        with pytest.raises(InvalidConfigError):
+            expand_grid({"top_k": []})
+
+    def test_sample_space_is_reproducible_and_in_range(self):
+        """Test seeded draws from choices, integer, float and log ranges."""
+        space = {
+            "top_k": [1, 3, 5],
+            "window": {"low": 5, "high": 60},
+            "threshold": {"low": 0.1, "high": 0.5},
+            "decay": {"low": 0.001, "high": 1.0, "log": True},
+        }
+
+        first = sample_space(space, 30, seed=7)
+        second = sample_space(space, 30, seed=7)
+
+        assert first == second
+        assert all(c["top_k"] in (1, 3, 5) for c in first)
+        assert all(isinstance(c["window"], int) and 5 <= c["window"] <= 60 for c in first)
+        assert all(0.1 <= c["threshold"] <= 0.5 for c in first)
+        assert all(0.001 <= c["decay"] <= 1.0 for c in first)
+
+    def test_sample_space_drops_duplicates(self):
+        """Test that a small discrete space yields distinct candidates."""
+        candidates = sample_space({"top_k": [1, 2]}, 50, seed=1)
+
+        assert sorted(c["top_k"] for c in candidates) == [1, 2]
+
+    def test_sample_space_rejects_bad_range(self):
+        """Test that malformed ranges are rejected."""
+        with pytest.raises(InvalidConfigError):
+            sample_space({"window": {"low": 10, "high": 5}}, 10)
+
+
+class TestApplyParameters:
+    """Test building candidate signal configurations."""
+
+    def test_placeholders_and_signal_options(self):
+        """Test that placeholders are filled and signal options overridden."""
+        spec = {**SIGNAL_DEFAULTS, "formula": "Mean($close, {window}) / $close - {shift}"}
+
+        resolved = apply_parameters(spec, {"window": 10, "shift": 1, "top_k": 3})
+
+        assert formula_placeholders(spec["formula"]) == ["window", "shift"]
+        assert resolved["formula"] == "Mean($close, 10) / $close - 1"
+        assert resolved["top_k"] == 3
+        assert spec["top_k"] == SIGNAL_DEFAULTS["top_k"]
+
+    def test_unknown_parameter(self):
+        """Test that parameters matching nothing are rejected."""
+        spec = {**SIGNAL_DEFAULTS, "formula": "-$close"}
+
+        with pytest.raises(InvalidConfigError, match="neither signal options"):
+            apply_parameters(spec, {"window": 10})
+
+    def test_missing_placeholder_value(self):
+        """Test that every placeholder needs a value."""
+        spec = {**SIGNAL_DEFAULTS, "formula": "Mean($close, {window})"}
+
+        with pytest.raises(InvalidConfigError, match="without a value"):
+            apply_parameters(spec, {"top_k": 2})
+
+
+class TestLeaderboard:
+    """Test candidate ranking."""
+
+    def test_keeps_best_entries(self):
+        """Test that only the best entries are kept, best first."""
+        board = Leaderboard("sharpe_ratio", size=2)
+        for i, sharpe in enumerate([0.5, 1.5, float("nan"), 1.0]):
+            board.add({"params": {"i": i}, "metrics": {"sharpe_ratio": sharpe}})
+
+        ranked = board.to_list()
+
+        assert [entry["params"]["i"] for entry in ranked] == [1, 3]
+        assert [entry["rank"] for entry in ranked] == [1, 2]
+        assert board.best["params"]["i"] == 1
+
+    def test_lower_is_better_objective(self):
+        """Test that drawdown is minimized."""
+        board = Leaderboard("max_drawdown")
+        board.add({"params": {"i": 0}, "metrics": {"max_drawdown": 0.3}})
+        board.add({"params": {"i": 1}, "metrics": {"max_drawdown": 0.1}})
+
+        assert board.best["params"]["i"] == 1
+
+    def test_unknown_objective(self):
+        """Test that unknown objectives are rejected."""
+        with pytest.raises(InvalidConfigError):
+            Leaderboard("profit")
+
+
+class TestParameterSweep:
+    """Test running sweeps."""
+
+    def test_chunks_group_by_formula(self):
+        """Test that chunks never mix formulas and respect the chunk size."""
+        candidates = expand_grid({"window": [5, 10], "top_k": [1, 2, 3]})
+        specs = _specs({"formula": "Mean($close, {window})"}, candidates)
+
+        chunks = chunk_candidates(specs, 2)
+
+        assert sorted(i for chunk in chunks for i in chunk) == list(range(6))
+        assert all(len(chunk) <= 2 for chunk in chunks)
+        assert all(len({specs[i]["formula"] for i in chunk}) == 1 for chunk in chunks)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("workers", [1, 2])
+    async def test_sweep_matches_single_backtests(self, panel, workers):
+        """Test that sweep metrics equal running each candidate on its own."""
+        candidates = expand_grid({"window": [3, 8], "top_k": [2, 4]})
+        specs = _specs({"formula": "$close / Ref($close, {window}) - 1"}, candidates)
+        seen = []
+
+        async def progress(done, total, leaderboard):
+            seen.append((done, total, len(leaderboard)))
+
+        result = await ParameterSweep(max_workers=workers, chunk_size=1).run(
+            panel, specs, candidates, (20, 120), (1e6, 0.001, 0.0005), progress=progress
+        )
+
+        assert result["summary"]["completed"] == 4
+        assert seen[0] == (0, 4, 0) and seen[-1] == (4, 4, 4)
+        for entry in result["leaderboard"]:
+            params = entry["params"]
+            signal = compile_formula(
+                f"$close / Ref($close, {params['window']}) - 1"
+            ).evaluate(panel)["factor"][20:]
+            prices = panel.field("close")[20:]
+            run = backtest_engine.simulate(
+                prices, backtest_engine.target_weights(signal, prices, top_k=params["top_k"]),
+                1e6, 0.001, 0.0005
+            )
+            expected = backtest_engine.performance_metrics(run)["sharpe_ratio"]
+            assert entry["metrics"]["sharpe_ratio"] == pytest.approx(expected)
+        sharpes = [entry["metrics"]["sharpe_ratio"] for entry in result["leaderboard"]]
+        assert sharpes == sorted(sharpes, reverse=True)
+
+    @pytest.mark.asyncio
+    async def test_shared_signal_and_failures(self, panel):
+        """Test a precomputed signal and a candidate whose formula fails."""
+        candidates = [{"top_k": 1}, {"top_k": 3}]
+        specs = [{**spec, "formula": None} for spec in _specs({"formula": "-$close"}, candidates)]
+        specs.append({**specs[0], "formula": "Unknown($close)"})
+        candidates.append({"top_k": 1})
+
+        result = await ParameterSweep(max_workers=1).run(
+            panel, specs, candidates, (0, 120), (1e6, 0.0, 0.0), signal=-panel.field("close")
+        )
+
+        assert result["summary"]["completed"] == 2
+        assert result["summary"]["failed"] == 1
+        assert result["failed"][0]["index"] == 2
+
+    @pytest.mark.asyncio
+    async def test_daemon_uses_threads(self, panel, monkeypatch):
+        """Test that a daemonic worker process falls back to threads."""
+        import multiprocessing
+
+        monkeypatch.setattr(multiprocessing.current_process(), "daemon", True, raising=False)
+        candidates = expand_grid({"top_k": [1, 2, 3]})
+        specs = _specs({"formula": "-$close"}, candidates)
+
+        result = await ParameterSweep(max_workers=2, chunk_size=1).run(
+            panel, specs, candidates, (0, 120), (1e6, 0.0, 0.0)
+        )
+
+        assert result["summary"]["completed"] == 3
+
+
+class TestSuccessiveHalving:
+    """Test adaptive search over growing windows."""
+
+    def test_halving_windows(self):
+        """Test that windows grow by eta and end at the full range."""
+        assert halving_windows(1000, 60, 3) == [111, 333, 1000]
+        assert halving_windows(100, 60, 3) == [100]
+
+    def test_hyperband_brackets(self):
+        """Test that every candidate lands in exactly one bracket."""
+        brackets = hyperband_brackets(40, 3, 3)
+
+        assert [first for first, _ in brackets] == [0, 1, 2]
+        assert sorted(i for _, indices in brackets for i in indices) == list(range(40))
+        sizes = [len(indices) for _, indices in brackets]
+        assert sizes == sorted(sizes, reverse=True)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("hyperband", [False, True])
+    async def test_run_halving(self, panel, hyperband):
+        """Test promotions, history and that only full-range results are ranked."""
+        candidates = expand_grid({"window": [2, 5, 10], "top_k": [1, 3, 5]})
+        specs = _specs({"formula": "$close / Ref($close, {window}) - 1"}, candidates)
+        seen = []
+
+        async def progress(done, total, leaderboard):
+            seen.append((done, total))
+
+        result = await ParameterSweep(max_workers=1).run_halving(
+            panel, specs, candidates, (20, 120), (1e6, 0.0, 0.0),
+            eta=3, min_window=10, hyperband=hyperband, progress=progress
+        )
+
+        summary = result["summary"]
+        assert summary["windows"] == [11, 33, 100]
+        assert summary["evaluated_dates"] < summary["full_search_dates"]
+        assert seen[-1][0] == seen[-1][1]
+        history = result["history"]
+        first = history[0]
+        assert first["start_date"] == str(panel.dates[20])[:10]
+        assert first["dates"] == 11
+        assert len(first["promoted"]) == -(-first["candidates"] // 3)
+        for rung in history[:-1]:
+            scores = [r["sharpe_ratio"] for r in rung["results"]]
+            assert scores == sorted(scores, reverse=True)
+        final = [entry for entry in history if entry["dates"] == 100]
+        assert {e["index"] for e in result["leaderboard"]} == {
+            r["index"] for entry in final for r in entry["results"]
+        }
+        assert summary["completed"] == len(result["leaderboard"])
+
+    @pytest.mark.asyncio
+    async def test_halving_keeps_clear_winner(self, panel):
+        """Test that a candidate best on every window reaches the top."""
+        candidates = [{"top_k": k} for k in (1, 2, 3, 4, 5, 6, 7, 8, 9)]
+        # Perfect foresight of the return after the fill: the single best name wins
+        close = panel.field("close")
+        future = np.vstack([close[2:] / close[1:-1] - 1, np.full((2, 10), np.nan)])
+        specs = [{**spec, "formula": None} for spec in _specs({"formula": "-$close"}, candidates)]
+
+        full = await ParameterSweep(max_workers=1).run(
+            panel, specs, candidates, (0, 120), (1e6, 0.0, 0.0),
+            leaderboard=Leaderboard("total_return"), signal=future
+        )
+        halving = await ParameterSweep(max_workers=1).run_halving(
+            panel, specs, candidates, (0, 120), (1e6, 0.0, 0.0),
+            leaderboard=Leaderboard("total_return"), min_window=10, signal=future
+        )
+
+        assert halving["leaderboard"][0]["params"] == full["leaderboard"][0]["params"] == {"top_k": 1}
+
+    @pytest.mark.asyncio
+    async def test_invalid_eta(self, panel):
+        """Test that eta below 2 is rejected."""
+        with pytest.raises(InvalidConfigError):
+            await ParameterSweep(max_workers=1).run_halving(
+                panel, [], [], (0, 120), (1e6, 0.0, 0.0), eta=1
+            )
@@ -0,0 +1,159 @@
+"""
+Tests for the backtest result store
+
+Test Coverage:
+- Write/read round trip of compressed and memory-mapped columnar artifacts
+- Column projection, date ranges and row paging
+- Replacing a result's artifacts
+- Derived files stored next to the artifacts
+- Results with series stored inline in the JSON columns
+"""
+
+import shutil
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.modules.backtest.services.result_store import BacktestResultStore, result_columns
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Result store in a temporary directory."""
+    return BacktestResultStore(tmp_path / "results")
+
+
+def make_artifacts(n_dates: int = 10) -> dict:
+    """Equity curve and two trades per date."""
+    dates = np.arange("2024-01-01", n_dates, dtype="datetime64[D]")
+    equity = 1000.0 + np.arange(n_dates)
+    return {
+        "equity": {
+            "date": dates,
+            "equity": equity,
+            "returns": np.r_[0.0, equity[1:] / equity[:-1] - 1],
+        },
+        "trades": {
+            "date": np.repeat(dates, 2),
+            "instrument": np.tile(np.array(["SH600000", "SZ000001"]), n_dates),
+            "pnl": np.arange(2 * n_dates, dtype=float),
+        },
+    }
+
+
+class TestResultStore:
+    """Test reading and writing result artifacts."""
+
+    def test_round_trip(self, store):
+        """Test that all columns are read back with their types."""
+        artifacts = make_artifacts()
+        key = store.write("result-1", artifacts)
+
+        curve = store.read(key, "equity")
+
+        assert list(curve) == ["date", "equity", "returns"]
+        np.testing.assert_array_equal(curve["date"], artifacts["equity"]["date"])
+        np.testing.assert_allclose(curve["equity"], artifacts["equity"]["equity"])
+        assert store.count(key, "trades") == 20
+        assert store.columns(key, "trades") == ["date", "instrument", "pnl"]
+
+    def test_projection_and_ranges(self, store):
+        """Test column projection, date ranges and paging within the range."""
+        store.write("result-1", make_artifacts())
+
+        trades = store.read(
+            "result-1", "trades", ["instrument", "pnl"],
+            start_date="2024-01-03", end_date="2024-01-05", offset=1, limit=3
+        )
+
+        assert list(trades) == ["instrument", "pnl"]
+        np.testing.assert_allclose(trades["pnl"], [5.0, 6.0, 7.0])
+        assert store.read("result-1", "trades", ["pnl"], start_date="2024-02-01")["pnl"].size == 0
+
+    def test_paged_artifacts_are_memory_mapped(self, store):
+        """Test that trades are column files read through memory maps, and old archives still read."""
+        artifacts = make_artifacts()
+        store.write("result-1", artifacts)
+        directory = store.root / "result-1"
+
+        assert (directory / "equity.npz").is_file()
+        assert sorted(p.name for p in (directory / "trades").iterdir()) == [
+            "date.npy", "instrument.npy", "pnl.npy"
+        ]
+        page = store.read("result-1", "trades", ["instrument", "pnl"], offset=4, limit=2)
+        assert not isinstance(page["pnl"], np.memmap)
+        np.testing.assert_array_equal(page["instrument"], ["SH600000", "SZ000001"])
+
+        # Stores written before the paged layout hold an npz archive
+        shutil.rmtree(directory / "trades")
+        np.savez_compressed(directory / "trades.npz", **artifacts["trades"])
+        np.testing.assert_allclose(store.read("result-1", "trades", ["pnl"], offset=4, limit=2)["pnl"], [4.0, 5.0])
+
+    def test_unknown_column_and_missing_artifact(self, store):
+        """Test that bad columns raise and missing artifacts read as None."""
+        store.write("result-1", make_artifacts())
+
+        with pytest.raises(KeyError):
+            store.read("result-1", "equity", ["volume"])
+        assert store.read("result-1", "positions") is None
+        assert store.read("result-2", "equity") is None
+
+    def test_rewrite_replaces_artifacts(self, store):
+        """Test that writing a key again replaces its files."""
+        store.write("result-1", make_artifacts(10))
+        store.write("result-1", {"equity": make_artifacts(4)["equity"]})
+
+        assert store.count("result-1", "equity") == 4
+        assert store.read("result-1", "trades") is None
+        assert store.delete("result-1") is True
+        assert store.read("result-1", "equity") is None
+
+    def test_derived_files_are_dropped_on_rewrite(self, store):
+        """Test that a derived file is written atomically and dropped with the artifacts."""
+        store.write("result-1", make_artifacts())
+
+        path = store.write_file("result-1", "report.html", lambda target: target.write_text("<html/>"))
+
+        assert path == store.file_path("result-1", "report.html")
+        assert path.read_text() == "<html/>"
+        assert [p.name for p in path.parent.iterdir() if p.name.startswith(".")] == []
+        store.write("result-1", make_artifacts())
+        assert not path.exists()
+        for name in ("equity.xlsx", "report.json", "../report.pdf", "report"):
+            with pytest.raises(ValueError):
+                store.file_path("result-1", name)
+
+    def test_rejects_keys_outside_the_store(self, store):
+        """Test that keys cannot escape the store directory."""
+        with pytest.raises(ValueError):
+            store.write("../escape", make_artifacts())
+
+
+class TestResultColumns:
+    """Test reading series of result records."""
+
+    def test_stored_result(self, store):
+        """Test that results with an artifact path read from the store."""
+        store.write("result-1", make_artifacts())
+        result = SimpleNamespace(artifact_path="result-1", metrics={}, trades={})
+
+        curve = result_columns(store, result, "equity", ["equity"], limit=2)
+
+        np.testing.assert_allclose(curve["equity"], [1000.0, 1001.0])
+
+    def test_inline_result(self, store):
+        """Test that series stored in the JSON columns are still readable."""
+        result = SimpleNamespace(
+            artifact_path=None,
+            metrics={"dates": ["2024-01-01", "2024-01-02", "2024-01-03"], "equity_curve": [1.0, 2.0, 3.0]},
+            trades={"trades": [{"date": "2024-01-02", "instrument": "SH600000", "quantity": 5, "pnl": None}]},
+        )
+
+        curve = result_columns(store, result, "equity", start_date="2024-01-02")
+        trades = result_columns(store, result, "trades", ["instrument", "pnl"])
+
+        np.testing.assert_allclose(curve["equity"], [2.0, 3.0])
+        assert trades["instrument"].tolist() == ["SH600000"]
+        assert np.isnan(trades["pnl"][0])
+        assert result_columns(store, result, "positions") is None
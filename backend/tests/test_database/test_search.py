@@ -0,0 +1,117 @@
+"""
+Tests for Full-Text Search
+
+Tests tokenization, the in-process inverted index and the MySQL FULLTEXT
+declaration of searchable models.
+"""
+
+import pytest
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.dialects import mysql
+from sqlalchemy.schema import CreateIndex
+
+from app.database.base import Base
+from app.database.models import CustomFactor
+from app.database.search import InvertedIndex, query_terms, tokenize
+
+
+class TestTokenize:
+    """Tests for tokenize and query_terms"""
+
+    def test_english_words_and_parts(self):
+        """Test lowercased words, camelCase parts and separators"""
+        assert tokenize("MovingAverage of SMA_20") == [
+            "movingaverage", "moving", "average", "of", "sma", "20"
+        ]
+
+    def test_chinese_unigrams_and_bigrams(self):
+        """Test that Chinese runs yield characters and bigrams"""
+        assert tokenize("移动平均") == ["移", "动", "平", "均", "移动", "动平", "平均"]
+
+    def test_mixed_text_and_full_width(self):
+        """Test mixed scripts and full-width characters"""
+        assert tokenize("ＭＡ指标") == ["ma", "指", "标", "指标"]
+
+    def test_query_terms(self):
+        """Test that words match as substrings and Chinese by bigram"""
+        assert query_terms("Mov 移动平均 移") == [
+            ("mov", True), ("移动", False), ("动平", False), ("平均", False), ("移", False)
+        ]
+        assert query_terms(" %_ ") == []
+
+
+class TestInvertedIndex:
+    """Tests for InvertedIndex"""
+
+    @pytest.fixture
+    def index(self):
+        index = InvertedIndex({"name": 3.0, "description": 1.0})
+        index.add("1", {"name": "Momentum", "description": "20 day price change"})
+        index.add("2", {"name": "Price volume", "description": "momentum of volume"})
+        index.add("3", {"name": "动量因子", "description": None})
+        return index
+
+    def test_field_weights_rank_name_matches_first(self, index):
+        """Test that a name match outranks a description match"""
+        scores = index.search("momentum")
+
+        assert set(scores) == {"1", "2"}
+        assert scores["1"] > scores["2"]
+
+    def test_prefix_and_all_terms_required(self, index):
+        """Test prefix matching with AND semantics across terms"""
+        assert set(index.search("mom")) == {"1", "2"}
+        assert set(index.search("mom vol")) == {"2"}
+        assert index.search("momentum missing") == {}
+
+    def test_substring_matches(self):
+        """Test that words match inside indexed words, ranked below exact and prefix matches"""
+        index = InvertedIndex({"name": 1.0})
+        index.add("sma", {"name": "SMA"})
+        index.add("ma", {"name": "MA"})
+        index.add("macd", {"name": "MACD"})
+        index.add("avg", {"name": "Moving average"})
+
+        scores = index.search("ma")
+        assert set(scores) == {"sma", "ma", "macd"}
+        assert scores["ma"] > scores["macd"] > scores["sma"]
+        assert set(index.search("verage")) == {"avg"}
+
+    def test_chinese(self, index):
+        """Test Chinese substring queries"""
+        assert set(index.search("动量")) == {"3"}
+        assert set(index.search("因")) == {"3"}
+        assert index.search("量动") == {}
+
+    def test_update_and_remove(self, index):
+        """Test that re-adding replaces a document and remove drops it"""
+        index.add("1", {"name": "Reversal", "description": None})
+        assert set(index.search("momentum")) == {"2"}
+        assert set(index.search("rev")) == {"1"}
+
+        index.remove("1")
+        index.remove("missing")
+        assert index.search("rev") == {}
+        assert len(index) == 2
+
+
+class TestFulltextIndexDeclaration:
+    """Tests for the FULLTEXT index added by searchable"""
+
+    def test_mysql_ngram_index(self):
+        """Test that the index is FULLTEXT with the ngram parser"""
+        index = next(i for i in CustomFactor.__table__.indexes if i.name == "ft_custom_factors_search")
+        ddl = str(CreateIndex(index).compile(dialect=mysql.dialect()))
+
+        assert "FULLTEXT" in ddl and "WITH PARSER ngram" in ddl
+        assert [c.name for c in index.columns] == ["factor_name", "description"]
+        assert CustomFactor.__search_fields__ == {"factor_name": 3.0, "description": 1.0}
+
+    def test_not_created_on_other_databases(self):
+        """Test that create_all skips the index outside MySQL"""
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+
+        indexes = {i["name"] for i in inspect(engine).get_indexes("custom_factors")}
+        assert "ft_custom_factors_search" not in indexes
+        assert "idx_factor_user_status" in indexes
@@ -0,0 +1,141 @@
+"""
+Tests for Write-Behind Usage Counters
+
+Tests buffering, batched flushes, last_used_at updates and that increments
+survive a failed flush.
+"""
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.database.base import Base
+from app.database.models import CustomFactor, IndicatorComponent, UserFactorLibrary
+from app.database.models.indicator import IndicatorCategory, IndicatorSource
+from app.database.repositories.indicator_repository import IndicatorRepository
+from app.database.usage_counter import MemoryCounterStore, UsageCounter
+from app.modules.indicator.services.indicator_service import IndicatorService
+
+
+@pytest_asyncio.fixture
+async def session_maker():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def db_session(session_maker):
+    async with session_maker() as session:
+        yield session
+
+
+@pytest_asyncio.fixture
+async def indicator(db_session):
+    indicator = IndicatorComponent(
+        code="SMA",
+        name_zh="简单移动平均",
+        name_en="Simple Moving Average",
+        category=IndicatorCategory.TREND.value,
+        source=IndicatorSource.TALIB.value,
+        usage_count=3,
+    )
+    db_session.add(indicator)
+    await db_session.commit()
+    return indicator
+
+
+@pytest_asyncio.fixture
+async def library_item(db_session):
+    factor = CustomFactor(user_id="user123", factor_name="Momentum", formula="Ref($close, 20)")
+    db_session.add(factor)
+    await db_session.flush()
+    item = UserFactorLibrary(user_id="user123", factor_id=factor.id, usage_count=0)
+    db_session.add(item)
+    await db_session.commit()
+    return item
+
+
+@pytest.mark.asyncio
+class TestUsageCounter:
+    """Tests for UsageCounter"""
+
+    async def test_increments_are_aggregated_into_one_flush(self, db_session, indicator):
+        """Test that buffered increments are written together on flush"""
+        counter = UsageCounter(MemoryCounterStore())
+        for _ in range(5):
+            await counter.increment(IndicatorComponent, indicator.id)
+        await counter.increment(IndicatorComponent, indicator.id, amount=2)
+
+        await db_session.refresh(indicator)
+        assert indicator.usage_count == 3
+
+        assert await counter.flush(db_session) == 1
+        await db_session.refresh(indicator)
+        assert indicator.usage_count == 10
+
+        # Nothing left to write
+        assert await counter.flush(db_session) == 0
+
+    async def test_flush_sets_last_used_at(self, db_session, library_item, indicator):
+        """Test that models with last_used_at get the latest use time"""
+        assert library_item.last_used_at is None
+        counter = UsageCounter(MemoryCounterStore())
+        await counter.increment(UserFactorLibrary, library_item.id)
+        await counter.increment(IndicatorComponent, indicator.id)
+
+        assert await counter.flush(db_session) == 2
+        await db_session.refresh(library_item)
+        assert library_item.usage_count == 1
+        assert library_item.last_used_at is not None
+
+    async def test_failed_flush_keeps_increments(self, session_maker, db_session, indicator):
+        """Test that increments are restored when the write fails"""
+        counter = UsageCounter(MemoryCounterStore())
+        await counter.increment(IndicatorComponent, indicator.id, amount=4)
+
+        class BrokenSession:
+            async def execute(self, *args, **kwargs):
+                raise RuntimeError("connection lost")
+
+            async def rollback(self):
+                pass
+
+        with pytest.raises(RuntimeError):
+            await counter.flush(BrokenSession())
+        await counter.increment(IndicatorComponent, indicator.id)
+
+        async with session_maker() as session:
+            assert await counter.flush(session) == 1
+        await db_session.refresh(indicator)
+        assert indicator.usage_count == 8
+
+    async def test_unknown_table_is_dropped(self, db_session):
+        """Test that counts for an unmapped table do not block the flush"""
+        store = MemoryCounterStore()
+        await store.add("no_such_table", "1", 1, 0.0)
+        counter = UsageCounter(store)
+
+        assert await counter.flush(db_session) == 1
+        assert await counter.flush(db_session) == 0
+
+    async def test_service_buffers_until_flush(self, db_session, indicator):
+        """Test that IndicatorService with a counter defers the write"""
+        counter = UsageCounter(MemoryCounterStore())
+        service = IndicatorService(IndicatorRepository(db_session), counter)
+
+        assert await service.increment_usage(indicator.id) is True
+        assert await service.increment_usage("missing-id") is False
+        await db_session.refresh(indicator)
+        assert indicator.usage_count == 3
+
+        await counter.flush(db_session)
+        await db_session.refresh(indicator)
+        assert indicator.usage_count == 4
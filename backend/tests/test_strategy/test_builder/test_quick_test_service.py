@@ -0,0 +1,251 @@
+"""
+Tests for QuickTestService
+
+Test Coverage:
+- Pre-slicing panels to a date range and a liquidity-ranked stock pool
+- LRU panel cache with a memory budget
+- Running a quick test (metrics, cached panels, completion message)
+- Time budget: partial results when the simulation is cut short, failure
+  when it runs out before the simulation
+- Configuration errors and other users' private factors fail the test
+- Timeout sweeper
+"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.repositories.quick_test_repository import QuickTestRepository
+from app.modules.data_management.services.dataset_panel import DatasetPanel
+from app.modules.strategy.exceptions import QuickTestError
+from app.modules.strategy.services.quick_test_service import (
+    QuickTestPanelCache,
+    QuickTestService,
+    slice_quick_test_panel,
+)
+
+
+def _panel(n_dates: int = 200, n_instruments: int = 6) -> DatasetPanel:
+    rng = np.random.default_rng(5)
+    close = 10 * np.exp(rng.normal(0, 0.02, size=(n_dates, n_instruments)).cumsum(axis=0))
+    # Instrument i trades 10^i x 1000 shares a day
+    volume = np.tile(10.0 ** np.arange(n_instruments) * 1000.0, (n_dates, 1))
+    return DatasetPanel(
+        dates=np.asarray(pd.bdate_range("2023-01-02", periods=n_dates), dtype="datetime64[ns]"),
+        instruments=np.array([f"SH{600000 + i}" for i in range(n_instruments)], dtype=object),
+        fields={"close": close, "volume": volume},
+    )
+
+
+class TestSlicePanel:
+    """Test pre-slicing of quick test panels."""
+
+    def test_window_and_warmup(self):
+        """Test that the window is the last dates with warm-up history before it."""
+        panel = _panel()
+
+        sliced = slice_quick_test_panel(panel, "3M", "ALL_A_SHARES", warmup=10)
+
+        assert len(sliced.panel.dates) == 63 + 10
+        assert sliced.window_start == 10
+        assert sliced.panel.dates[-1] == panel.dates[-1]
+        assert len(sliced.panel.instruments) == 6
+        assert not np.shares_memory(sliced.panel.field("close"), panel.field("close"))
+
+    def test_pool_by_liquidity(self, monkeypatch):
+        """Test that pools take instruments by traded value rank."""
+        from app.modules.strategy.services import quick_test_service
+        monkeypatch.setitem(quick_test_service.STOCK_POOL_RANKS, "CSI300", (0, 2))
+        monkeypatch.setitem(quick_test_service.STOCK_POOL_RANKS, "CSI500", (2, 5))
+        panel = _panel()
+
+        top = slice_quick_test_panel(panel, "1M", "CSI300")
+        next_ = slice_quick_test_panel(panel, "1M", "CSI500")
+
+        assert set(top.panel.instruments) == {"SH600004", "SH600005"}
+        assert set(next_.panel.instruments) == {"SH600001", "SH600002", "SH600003"}
+
+    def test_invalid_options(self):
+        """Test unknown date ranges and pools."""
+        with pytest.raises(QuickTestError):
+            slice_quick_test_panel(_panel(), "2Y", "CSI300")
+        with pytest.raises(QuickTestError):
+            slice_quick_test_panel(_panel(), "3M", "SP500")
+
+
+class TestPanelCache:
+    """Test the pre-sliced panel cache."""
+
+    def test_hits_and_eviction(self):
+        """Test hits, misses and LRU eviction beyond the memory budget."""
+        sliced = slice_quick_test_panel(_panel(), "3M", "ALL_A_SHARES")
+        cache = QuickTestPanelCache(max_bytes=int(sliced.nbytes * 1.5))
+        load = Mock(return_value=sliced)
+
+        first, cached_first = cache.get_or_load(("ds", "v1", "3M", "ALL"), load)
+        _, cached_again = cache.get_or_load(("ds", "v1", "3M", "ALL"), load)
+        cache.put(("ds", "v2", "3M", "ALL"), sliced)
+
+        assert first is sliced
+        assert (cached_first, cached_again) == (False, True)
+        assert load.call_count == 1
+        assert cache.get(("ds", "v1", "3M", "ALL")) is None
+        assert cache.stats()["evictions"] == 1
+        assert cache.invalidate_dataset("ds") == 1
+
+
+@pytest.fixture
+def quick_test_dataset(tmp_path):
+    """Dataset record backed by a CSV with 150 dates x 8 instruments."""
+    rng = np.random.default_rng(11)
+    dates = pd.bdate_range("2023-01-02", periods=150)
+    instruments = [f"SH{600000 + i}" for i in range(8)]
+    close = 10 * np.exp(rng.normal(0, 0.02, size=(150, 8)).cumsum(axis=0))
+    frame = pd.DataFrame({
+        "date": np.repeat(dates, 8),
+        "symbol": np.tile(instruments, 150),
+        "close": close.ravel(),
+        "volume": rng.integers(1000, 5000, size=150 * 8),
+    })
+    path = tmp_path / "prices.csv"
+    frame.to_csv(path, index=False)
+    return SimpleNamespace(id="dataset-1", file_path=str(path), version="1200@v1")
+
+
+def _service(db_session, dataset, parameters, budget_seconds=30.0):
+    strategy = SimpleNamespace(parameters=parameters)
+    return QuickTestService(
+        QuickTestRepository(db_session),
+        strategy_repo=Mock(get=AsyncMock(return_value=strategy)),
+        dataset_repo=Mock(get=AsyncMock(return_value=dataset)),
+        cache=QuickTestPanelCache(max_bytes=64 * 1024 * 1024),
+        connection_manager=Mock(send_metrics_update=AsyncMock(), send_completion=AsyncMock()),
+        budget_seconds=budget_seconds,
+    )
+
+
+async def _create(db_session, instance, **config):
+    return await QuickTestRepository(db_session).create({
+        "instance_id": instance.id,
+        "user_id": "user-001",
+        "test_config": {"date_range": "3M", "stock_pool": "ALL_A_SHARES", "initial_capital": 100000.0, **config},
+        "logic_flow_snapshot": {},
+        "status": "PENDING",
+    })
+
+
+@pytest.mark.asyncio
+class TestRunQuickTest:
+    """Test running quick tests."""
+
+    async def test_run_completes(self, db_session: AsyncSession, sample_strategy_instance, quick_test_dataset):
+        """Test metrics of a completed quick test and the cached panel on reruns."""
+        service = _service(
+            db_session, quick_test_dataset,
+            {"signal": {"formula": "-$close", "top_k": 2}, "dataset_id": "dataset-1"},
+        )
+        first = await _create(db_session, sample_strategy_instance)
+        second = await _create(db_session, sample_strategy_instance)
+
+        completed = await service.run(first.id)
+        rerun = await service.run(second.id)
+
+        assert completed.status == "COMPLETED"
+        assert set(completed.metrics_summary) == {
+            "total_return", "annual_return", "sharpe_ratio", "max_drawdown", "win_rate"
+        }
+        assert completed.test_result["coverage"] == 1.0
+        assert completed.test_result["partial"] is False
+        assert len(completed.test_result["equity_curve"]) == 63
+        assert completed.test_result["panel_cached"] is False
+        assert rerun.test_result["panel_cached"] is True
+        assert rerun.metrics_summary == completed.metrics_summary
+        assert completed.execution_time >= 0
+        service.connection_manager.send_completion.assert_any_await(first.id, "COMPLETED")
+
+    async def test_budget_cuts_run_short(
+        self, db_session: AsyncSession, sample_strategy_instance, quick_test_dataset, monkeypatch
+    ):
+        """Test that an exhausted time budget returns metrics of the simulated part."""
+        from app.modules.strategy.services import quick_test_service
+        # Let the run reach the simulation, whose checkpoints then stop it
+        monkeypatch.setattr(quick_test_service, "check_deadline", lambda deadline, stage: None)
+        service = _service(
+            db_session, quick_test_dataset, {"signal": {"formula": "-$close", "top_k": 2}}, budget_seconds=0.0
+        )
+        quick_test = await _create(db_session, sample_strategy_instance, dataset_id="dataset-1")
+
+        completed = await service.run(quick_test.id)
+
+        assert completed.status == "COMPLETED"
+        assert completed.test_result["partial"] is True
+        assert 0 < completed.test_result["coverage"] < 1
+        assert len(completed.test_result["equity_curve"]) < 63
+
+    async def test_budget_exhausted_before_simulation_fails(
+        self, db_session: AsyncSession, sample_strategy_instance, quick_test_dataset
+    ):
+        """Test that a budget used up by the panel load fails the test."""
+        service = _service(
+            db_session, quick_test_dataset, {"signal": {"formula": "-$close", "top_k": 2}}, budget_seconds=0.0
+        )
+        quick_test = await _create(db_session, sample_strategy_instance, dataset_id="dataset-1")
+
+        failed = await service.run(quick_test.id)
+
+        assert failed.status == "FAILED"
+        assert "time budget exceeded while loading the dataset" in failed.error_message
+
+    async def test_private_factor_of_other_user_fails(
+        self, db_session: AsyncSession, sample_strategy_instance, quick_test_dataset
+    ):
+        """Test that a factor_id signal cannot use another user's private factor."""
+        service = _service(db_session, quick_test_dataset, {"signal": {"factor_id": "factor-1", "top_k": 2}})
+        factor = SimpleNamespace(
+            id="factor-1", user_id="user-002", is_public=False, formula="-$close", formula_language="qlib_alpha"
+        )
+        service.custom_factor_repo = Mock(get=AsyncMock(return_value=factor))
+        private = await _create(db_session, sample_strategy_instance, dataset_id="dataset-1")
+
+        failed = await service.run(private.id)
+        factor.is_public = True
+        public = await service.run((await _create(db_session, sample_strategy_instance, dataset_id="dataset-1")).id)
+
+        assert failed.status == "FAILED"
+        assert "Factor factor-1 not found" in failed.error_message
+        assert public.status == "COMPLETED"
+
+    async def test_missing_signal_fails(self, db_session: AsyncSession, sample_strategy_instance, quick_test_dataset):
+        """Test that a strategy without a signal fails the test."""
+        service = _service(db_session, quick_test_dataset, {})
+        quick_test = await _create(db_session, sample_strategy_instance, dataset_id="dataset-1")
+
+        failed = await service.run(quick_test.id)
+
+        assert failed.status == "FAILED"
+        assert "parameters.signal" in failed.error_message
+        assert failed.completed_at is not None
+
+    async def test_sweep_timeouts(self, db_session: AsyncSession, sample_strategy_instance, quick_test_dataset):
+        """Test that tests PENDING or RUNNING past the timeout are failed."""
+        service = _service(db_session, quick_test_dataset, {})
+        stuck = await _create(db_session, sample_strategy_instance)
+        stuck.status = "RUNNING"
+        stuck.created_at = datetime.utcnow() - timedelta(minutes=30)
+        never_started = await _create(db_session, sample_strategy_instance)
+        never_started.created_at = datetime.utcnow() - timedelta(minutes=30)
+        running = await _create(db_session, sample_strategy_instance)
+        running.status = "RUNNING"
+        await db_session.commit()
+
+        swept = await service.sweep_timeouts(timeout_minutes=10)
+
+        assert swept == 2
+        assert (await service.repository.get(stuck.id)).status == "FAILED"
+        assert (await service.repository.get(never_started.id)).status == "FAILED"
+        assert (await service.repository.get(running.id)).status == "RUNNING"
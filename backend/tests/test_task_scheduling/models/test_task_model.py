@@ -12,6 +12,8 @@ import pytest
 from datetime import datetime
 from decimal import Decimal
 
+from sqlalchemy import Enum, String
+
 from app.database.models.task import Task, TaskType, TaskStatus, TaskPriority
 
 
@@ -86,6 +88,17 @@ class TestTaskModel:
         assert TaskType.DATA_PREPROCESSING == "DATA_PREPROCESSING"
         assert TaskType.FACTOR_BACKTEST == "FACTOR_BACKTEST"
         assert TaskType.CUSTOM_CODE == "CUSTOM_CODE"
+        assert TaskType.FACTOR_BATCH == "FACTOR_BATCH"
+        assert TaskType.FACTOR_CORRELATION == "FACTOR_CORRELATION"
+        assert TaskType.REPORT_EXPORT == "REPORT_EXPORT"
+        assert TaskType.WALK_FORWARD == "WALK_FORWARD"
+
+    def test_task_type_column_is_plain_string(self):
+        """Test that task types are stored as strings, so new types need no migration."""
+        column = Task.__table__.c.type
+
+        assert isinstance(column.type, String) and not isinstance(column.type, Enum)
+        assert all(len(task_type.value) <= column.type.length for task_type in TaskType)
 
     def test_task_priority_enum_values(self):
         """Test TaskPriority enum has correct integer values."""